@@ -24,6 +24,7 @@ from core.prompt_context import PromptContextService
 from core.style import StyleManager
 from llm.boot import BootManager
 from llm.llm_server_client import LlamaServerClient, LlamaServerConfig
+from llm.response_cache import model_identity, response_cache_from_config
 from memory.chat_state import ChatState
 from memory.user_runtime import (
     ActiveUserBrainProxy,
@@ -238,9 +239,10 @@ class _HarnessDataOverlay:
             path = data_debug_path(self.data_dir, rel_path)
             if path.exists():
                 path.unlink()
-        stats_path = self.data_dir / "stats.jsonl"
-        if stats_path.exists():
-            stats_path.unlink()
+        for stats_name in ("stats.jsonl", "stats.checkpoint.json"):
+            stats_path = self.data_dir / stats_name
+            if stats_path.exists():
+                stats_path.unlink()
         change_journal_path = self.data_dir / "change_journal.json"
         if change_journal_path.exists():
             change_journal_path.unlink()
@@ -294,7 +296,9 @@ class PiperHarness:
                 debug_path=data_debug_path(self.data_dir, "llm_http_payload_debug.txt")
                 if CFG.DEBUG_LLM_HTTP_PAYLOADS
                 else None,
-            )
+                model_key=model_identity(str(getattr(CFG, "LLAMA_SERVER_MODEL", "qwen")), getattr(CFG, "MODEL_PATH", None)),
+            ),
+            response_cache=response_cache_from_config(CFG),
         )
         self.user_runtime = ActiveUserRuntime(
             self.data_dir,
@@ -402,6 +406,7 @@ class PiperHarness:
             self.boot_mgr.shutdown()
         finally:
             self.tts.shutdown()
+            self.img_gen.shutdown()
             self._data_overlay.close()
             self.kept_data_dir = self._data_overlay.kept_data_dir
 
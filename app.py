@@ -95,10 +95,13 @@ from core.environment_service import EnvironmentService
 from core.instructions_loader import InstructionLoader
 from core.operational_state_service import OperationalStateService
 from core.prompt_context import PromptContextService
+from core.search import readability
 from core.search.searxng_service import SearXNGService
 from core.style import StyleManager
 from llm.boot import BootManager
 from llm.llm_server_client import LlamaServerClient, LlamaServerConfig
+from llm.response_cache import model_identity, response_cache_from_config
+from memory import extraction_queue
 from memory.chat_state import ChatState
 from memory.user_runtime import (
     ActiveUserBrainProxy,
@@ -138,6 +141,17 @@ def build_controller() -> PiperController:
             backend=str(getattr(CFG, "TTS_BACKEND", "auto")),
             voice=getattr(CFG, "TTS_VOICE", "af_heart"),
             speed=float(getattr(CFG, "TTS_SPEED", 0.85)),
+            streaming_sink=bool(getattr(CFG, "TTS_STREAMING_SINK", True)),
+            sink_buffer_s=float(getattr(CFG, "TTS_SINK_BUFFER_S", 8.0)),
+            sink_crossfade_ms=float(getattr(CFG, "TTS_SINK_CROSSFADE_MS", 6.0)),
+            audio_cache=bool(getattr(CFG, "TTS_AUDIO_CACHE_ENABLED", True)),
+            audio_cache_dir=CFG.TTS_AUDIO_CACHE_DIR,
+            audio_cache_max_mb=float(getattr(CFG, "TTS_AUDIO_CACHE_MAX_MB", 64.0)),
+            audio_cache_max_chars=int(getattr(CFG, "TTS_AUDIO_CACHE_MAX_CHARS", 160)),
+            audio_cache_disk_entries=int(getattr(CFG, "TTS_AUDIO_CACHE_DISK_ENTRIES", 2000)),
+            synth_ahead=int(getattr(CFG, "TTS_SYNTH_AHEAD", 2)),
+            synth_workers=int(getattr(CFG, "TTS_SYNTH_WORKERS", 0)),
+            onnx_intra_op_threads=int(getattr(CFG, "TTS_ONNX_INTRA_OP_THREADS", 0)),
         )
     )
 
@@ -150,7 +164,14 @@ def build_controller() -> PiperController:
             timeout_s=float(getattr(CFG, "LLAMA_SERVER_TIMEOUT_S", 300.0)),
             stream_read_timeout_s=float(getattr(CFG, "LLAMA_SERVER_STREAM_READ_TIMEOUT_S", 30.0)),
             debug_path=CFG.LLM_HTTP_PAYLOAD_DEBUG_PATH if CFG.DEBUG_LLM_HTTP_PAYLOADS else None,
-        )
+            thinking_budgets={
+                role: int(getattr(CFG, f"LLM_THINKING_BUDGET_{role.upper()}", 0))
+                for role in ("router", "clarifier", "planner", "inspector", "reporter", "persona")
+            },
+            thinking_overflow=str(getattr(CFG, "LLM_THINKING_OVERFLOW", "no_think")),
+            model_key=model_identity(str(getattr(CFG, "LLAMA_SERVER_MODEL", "qwen")), getattr(CFG, "MODEL_PATH", None)),
+        ),
+        response_cache=response_cache_from_config(CFG),
     )
 
     user_runtime = ActiveUserRuntime(
@@ -215,18 +236,50 @@ def build_controller() -> PiperController:
     )
     live_screen = LiveScreenSession(CFG.DATA_DIR)
 
+    def _warm_tts() -> None:
+        tts.warm_up()
+        # Event notices are spoken with the active style's voice; cache them up front.
+        style_state = style_mgr.load(
+            float(getattr(CFG, "TEMPERATURE", 0.7)),
+            str(getattr(CFG, "TTS_VOICE", "af_heart")),
+            float(getattr(CFG, "TTS_SPEED", 0.85)),
+        )
+        tts.presynthesize(
+            list(getattr(CFG, "TTS_PRESYNTH_PHRASES", []) or []),
+            voice=style_state.tts_voice,
+            speed=style_state.tts_speed,
+        )
+
+    searxng_service = SearXNGService()
+
+    def _ensure_searxng() -> str:
+        result = searxng_service.ensure_available()
+        if not result.ok:
+            raise RuntimeError(result.message)
+        return f"SearXNG: {result.message}"
+
+    def _start_page_extractors() -> None:
+        # Worker start-up (slow under Windows spawn) stays off the first search.
+        readability.start_extractor_pool(max(0, int(getattr(CFG, "SEARCH_EXTRACT_WORKERS", 2) or 0)))
+
     boot_mgr = BootManager(
         ui_queue,
         background_boot_tasks=[
-            ("Warming TTS engine...", tts.warm_up),
+            ("Warming TTS engine...", _warm_tts),
+            ("Warming browser pool...", agent_brain.prewarm_browser),
+            ("Checking SearXNG...", _ensure_searxng),
+            ("Starting page extractors...", _start_page_extractors),
         ]
     )
     img_gen = ImageGenerator(CFG.DATA_DIR)
 
-    searxng_service = SearXNGService()
-    searxng_service.ensure_available()
-
     def _shutdown_all():
+        # First, while the LLM server is still up: queued world-model
+        # refreshes live on daemon threads and would die with the process.
+        try:
+            extraction_queue.drain_all(float(getattr(CFG, "WORLD_MODEL_EXTRACTION_SHUTDOWN_FLUSH_S", 5.0)))
+        except Exception as e:
+            logging.getLogger(__name__).debug("World-model extraction drain failed: %s", e)
         try:
             agent_brain.shutdown()
         except Exception as e:
@@ -235,6 +288,10 @@ def build_controller() -> PiperController:
             live_screen.stop()
         except Exception as e:
             logging.getLogger(__name__).debug("Live screen stop failed: %s", e)
+        try:
+            img_gen.shutdown()
+        except Exception as e:
+            logging.getLogger(__name__).debug("Image generator shutdown failed: %s", e)
         try:
             boot_mgr.shutdown()
         except Exception as e:
@@ -243,6 +300,10 @@ def build_controller() -> PiperController:
             searxng_service.shutdown()
         except Exception as e:
             logging.getLogger(__name__).debug("SearXNG shutdown failed: %s", e)
+        try:
+            readability.shutdown_extractor_pool()
+        except Exception as e:
+            logging.getLogger(__name__).debug("Extractor pool shutdown failed: %s", e)
 
     _shutdown_dispatcher.add(_shutdown_all)
 
@@ -479,6 +479,141 @@ def _resolve_mmproj_path(model_path: Path) -> Path | None:
                     return path
     return None
 
+
+def _resolve_llama_server_exe() -> Path:
+    # Allow env override so newer llama.cpp builds can be tested safely before
+    # they become the default runtime.
+    env_llama = os.environ.get("PIPER_LLAMA_SERVER_EXE", "").strip()
+    env_llama_path = _coerce_existing_path(env_llama) if env_llama else None
+    if env_llama_path:
+        return env_llama_path
+    local_newer_llama = ROOT_DIR / "runtime" / "llama.cpp" / "llama-server.exe"
+    if local_newer_llama.exists():
+        return local_newer_llama
+    hard_llama = r"F:\llama.cpp\llama-server.exe"
+    if _safe_path_exists(hard_llama):
+        return Path(hard_llama)
+    return ROOT_DIR / "llama-server.exe"
+
+
+def _raw_llama_server_url() -> str:
+    return os.environ.get("PIPER_LLAMA_SERVER_URL", "http://127.0.0.1:8080").strip() or "http://127.0.0.1:8080"
+
+
+# --- LAZY SECTIONS ---
+# Settings that probe the filesystem or the host (install locations, model
+# discovery, WSL bridging) are resolved on first access and memoized, so
+# importing config stays cheap for scripts and workers that never read them.
+
+
+class ConfigSection:
+    """A group of settings resolved together on first access, memoized until invalidated."""
+
+    def __init__(self, name: str, resolver: Callable[[], dict[str, Any]]) -> None:
+        self.name = name
+        self._resolver = resolver
+        self._values: dict[str, Any] | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def resolved(self) -> bool:
+        return self._values is not None
+
+    def values(self) -> dict[str, Any]:
+        values = self._values
+        if values is None:
+            with self._lock:
+                if self._values is None:
+                    self._values = dict(self._resolver())
+                values = self._values
+        return values
+
+    def invalidate(self) -> bool:
+        """Drop the memoized values; returns True if they had been resolved."""
+        with self._lock:
+            was_resolved = self._values is not None
+            self._values = None
+        return was_resolved
+
+
+CONFIG_SECTIONS: dict[str, ConfigSection] = {}
+
+
+def _config_section(name: str):
+    def _register(resolver: Callable[[], dict[str, Any]]) -> Callable[[], dict[str, Any]]:
+        CONFIG_SECTIONS[name] = ConfigSection(name, resolver)
+        return resolver
+
+    return _register
+
+
+@_config_section("paths")
+def _resolve_paths_section() -> dict[str, Any]:
+    # Check if the hardcoded ComfyUI path exists, otherwise look locally
+    hard_comfy = r"F:\ComfyUI_windows_portable"
+    return {"COMFY_DIR": Path(hard_comfy) if _safe_path_exists(hard_comfy) else ROOT_DIR / "ComfyUI"}
+
+
+@_config_section("models")
+def _resolve_models_section() -> dict[str, Any]:
+    # Prefer a valid Qwen 3.5 4B GGUF when present. Otherwise stay on the
+    # working Qwen 2.5 14B model. `PIPER_MODEL_PATH` can override both.
+    model_path = _resolve_llama_model_path()
+    return {
+        "MODEL_PATH": model_path,
+        "MMPROJ_PATH": _resolve_mmproj_path(model_path),
+        "LLAMA_SERVER_REASONING_BUDGET": int(
+            os.environ.get("PIPER_LLM_REASONING_BUDGET", str(_default_reasoning_budget(model_path)))
+        ),
+    }
+
+
+@_config_section("llm_server")
+def _resolve_llm_server_section() -> dict[str, Any]:
+    server_exe = _resolve_llama_server_exe()
+    raw_url = _raw_llama_server_url()
+    return {
+        "LLAMA_SERVER_EXE": server_exe,
+        "LLAMA_SERVER_BIND_HOST": _resolve_llama_server_bind_host(raw_url, server_exe),
+        "LLAMA_SERVER_URL": _resolve_llama_server_url(raw_url, server_exe),
+    }
+
+
+@_config_section("audio")
+def _resolve_audio_section() -> dict[str, Any]:
+    hard_kokoro = r"C:\Piper\models\kokoro"
+    return {"KOKORO_DIR": Path(hard_kokoro) if _safe_path_exists(hard_kokoro) else ROOT_DIR / "models" / "kokoro"}
+
+
+class _SectionValue:
+    """Config class attribute whose value comes from a lazily resolved section."""
+
+    def __init__(self, section: str) -> None:
+        self.section = section
+        self.name = ""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: object, owner: type | None = None) -> Any:
+        return CONFIG_SECTIONS[self.section].values()[self.name]
+
+
+def invalidate_config_sections(*names: str) -> list[str]:
+    """Forget memoized section values (all sections when none are named).
+
+    Returns the setting names whose cached values were dropped.
+    """
+    unknown = [name for name in names if name not in CONFIG_SECTIONS]
+    if unknown:
+        raise KeyError(f"unknown config section(s): {', '.join(unknown)}")
+    dropped: list[str] = []
+    for name in names or tuple(CONFIG_SECTIONS):
+        if CONFIG_SECTIONS[name].invalidate():
+            dropped.extend(key for key, section in _SECTION_KEYS.items() if section == name)
+    return dropped
+
+
 @dataclass(frozen=True)
 class Config:
     # Where Piper Core lives
@@ -548,6 +683,18 @@ class Config:
     def VECTOR_STORE_DIR(self) -> Path:
         return self.DATA_DIR / "vector_store"
 
+    @property
+    def SEARCH_PAGE_CACHE_DIR(self) -> Path:
+        return self.DATA_DIR / "cache" / "search_pages"
+
+    @property
+    def TTS_AUDIO_CACHE_DIR(self) -> Path:
+        return self.DATA_DIR / "cache" / "tts_audio"
+
+    @property
+    def LLM_RESPONSE_CACHE_DIR(self) -> Path:
+        return self.DATA_DIR / "cache" / "llm_responses"
+
     @property
     def WORKSPACE_DIR(self) -> Path:
         return self.DATA_DIR / "workspace"
@@ -584,6 +731,26 @@ class Config:
     def INTENT_STATE_PATH(self) -> Path:
         return data_state_path(self.DATA_DIR, "intent_state.json")
 
+    @property
+    def STATE_DB_PATH(self) -> Path:
+        return data_state_path(self.DATA_DIR, "state.sqlite3")
+
+    STATE_STORE_BACKEND: str = field(
+        default_factory=lambda: os.environ.get("PIPER_STATE_STORE_BACKEND", "json").strip().lower() or "json"
+    )
+    MAX_RESIDENT_USERS: int = field(default_factory=lambda: int(os.environ.get("PIPER_MAX_RESIDENT_USERS", "4")))
+    # World-model refreshes are queued and extracted in one batch once no new
+    # turn has arrived for the debounce window and the LLM is idle.
+    WORLD_MODEL_EXTRACTION_DEBOUNCE_S: float = field(
+        default_factory=lambda: float(os.environ.get("PIPER_WORLD_MODEL_EXTRACTION_DEBOUNCE_S", "2.0"))
+    )
+    WORLD_MODEL_EXTRACTION_MAX_MESSAGES: int = field(
+        default_factory=lambda: int(os.environ.get("PIPER_WORLD_MODEL_EXTRACTION_MAX_MESSAGES", "24"))
+    )
+    WORLD_MODEL_EXTRACTION_SHUTDOWN_FLUSH_S: float = field(
+        default_factory=lambda: float(os.environ.get("PIPER_WORLD_MODEL_EXTRACTION_SHUTDOWN_FLUSH_S", "5.0"))
+    )
+
     @property
     def INGESTED_DOCUMENTS_PATH(self) -> Path:
         return data_state_path(self.DATA_DIR, "ingested_documents.json")
@@ -650,6 +817,11 @@ class Config:
     def TTS_DEBUG_PATH(self) -> Path:
         return data_debug_path(self.DATA_DIR, "tts_debug.txt")
 
+    @property
+    def TRACE_DIR(self) -> Path:
+        """Per-turn Chrome trace-event files (open in Perfetto)."""
+        return data_debug_path(self.DATA_DIR, "traces")
+
     @property
     def LANGGRAPH_TRACE_PATH(self) -> Path:
         return data_debug_path(self.DATA_DIR, "langgraph_trace.jsonl")
@@ -696,7 +868,6 @@ class Config:
 
     # Preferred backend (current): llama.cpp server (OpenAI-compatible HTTP)
     # You start the server separately (llama-server.exe) and Piper connects to it.
-    _raw_llama_server_url: str = os.environ.get("PIPER_LLAMA_SERVER_URL", "http://127.0.0.1:8080").strip() or "http://127.0.0.1:8080"
     LLAMA_SERVER_MODEL: str = "qwen"
     LLAMA_SERVER_TIMEOUT_S: float = 300.0
     LLAMA_SERVER_STREAM_READ_TIMEOUT_S: float = float(os.environ.get("PIPER_LLM_STREAM_READ_TIMEOUT_S", "30"))
@@ -712,6 +883,26 @@ class Config:
     REPORTER_MAX_TOKENS: int = int(os.environ.get("PIPER_REPORTER_MAX_TOKENS", "700"))
     PERSONA_MAX_TOKENS: int = int(os.environ.get("PIPER_PERSONA_MAX_TOKENS", "700"))
     CONVERSATION_SUMMARY_MAX_TOKENS: int = int(os.environ.get("PIPER_CONVERSATION_SUMMARY_MAX_TOKENS", "500"))
+    # Client-side reasoning caps per LLM role (0 = unbounded). Once a role's
+    # <think>/reasoning_content tokens hit the cap the stream is aborted and
+    # resumed per LLM_THINKING_OVERFLOW ("no_think" or "continue").
+    LLM_THINKING_BUDGET_ROUTER: int = int(os.environ.get("PIPER_LLM_THINKING_BUDGET_ROUTER", "256"))
+    LLM_THINKING_BUDGET_CLARIFIER: int = int(os.environ.get("PIPER_LLM_THINKING_BUDGET_CLARIFIER", "128"))
+    LLM_THINKING_BUDGET_PLANNER: int = int(os.environ.get("PIPER_LLM_THINKING_BUDGET_PLANNER", "512"))
+    LLM_THINKING_BUDGET_INSPECTOR: int = int(os.environ.get("PIPER_LLM_THINKING_BUDGET_INSPECTOR", "128"))
+    LLM_THINKING_BUDGET_REPORTER: int = int(os.environ.get("PIPER_LLM_THINKING_BUDGET_REPORTER", "384"))
+    LLM_THINKING_BUDGET_PERSONA: int = int(os.environ.get("PIPER_LLM_THINKING_BUDGET_PERSONA", "768"))
+    LLM_THINKING_OVERFLOW: str = os.environ.get("PIPER_LLM_THINKING_OVERFLOW", "no_think").strip().lower() or "no_think"
+    # Temperature-0 calls from these roles are answered from a persistent cache
+    # under LLM_RESPONSE_CACHE_DIR when the model and rendered prompt match.
+    LLM_RESPONSE_CACHE_ENABLED: bool = field(
+        default_factory=lambda: _env_flag("PIPER_LLM_RESPONSE_CACHE_ENABLED", True)
+    )
+    LLM_RESPONSE_CACHE_TTL_S: float = float(os.environ.get("PIPER_LLM_RESPONSE_CACHE_TTL_S", "604800"))
+    LLM_RESPONSE_CACHE_MAX_ENTRIES: int = int(os.environ.get("PIPER_LLM_RESPONSE_CACHE_MAX_ENTRIES", "2000"))
+    LLM_RESPONSE_CACHE_ROLES: str = os.environ.get(
+        "PIPER_LLM_RESPONSE_CACHE_ROLES", "world_model,memory_consolidation,summarizer"
+    )
     EXECUTOR_MAX_STEPS: int = int(os.environ.get("PIPER_EXECUTOR_MAX_STEPS", "12"))
     EXECUTOR_MAX_STAGE_RUNTIME_S: float = float(os.environ.get("PIPER_EXECUTOR_MAX_STAGE_RUNTIME_S", "120"))
     EXECUTOR_MAX_ACTIONS_PER_STAGE: int = int(os.environ.get("PIPER_EXECUTOR_MAX_ACTIONS_PER_STAGE", "15"))
@@ -740,6 +931,21 @@ class Config:
             ["example.com", "iana.org", "apache.org", "w3.org", "python.org", "rfc-editor.org", "localhost", "127.0.0.1"],
         )
     )
+    COMPUTER_USE_PREWARM_BROWSER: bool = _env_flag("PIPER_COMPUTER_USE_PREWARM_BROWSER", True)
+    COMPUTER_USE_IDLE_CONTEXTS: int = int(os.environ.get("PIPER_COMPUTER_USE_IDLE_CONTEXTS", "2"))
+    COMPUTER_USE_BLOCKED_RESOURCE_TYPES: list[str] = field(
+        default_factory=lambda: [
+            token.strip().lower()
+            for token in re.split(
+                r"[,\s;]+",
+                os.environ.get("PIPER_COMPUTER_USE_BLOCKED_RESOURCE_TYPES", "image,media,font"),
+            )
+            if token.strip()
+        ]
+    )
+    COMPUTER_USE_NAV_WAIT_UNTIL: str = (
+        os.environ.get("PIPER_COMPUTER_USE_NAV_WAIT_UNTIL", "domcontentloaded").strip().lower() or "domcontentloaded"
+    )
     LOG_LEVEL: str = os.environ.get("PIPER_LOG_LEVEL", "INFO").upper()
     DEBUG_LLM_HTTP_PAYLOADS: bool = _env_flag("PIPER_DEBUG_LLM_HTTP_PAYLOADS", False)
     # Prompt debug is light enough to keep on by default; full HTTP payload dumps stay opt-in.
@@ -750,49 +956,29 @@ class Config:
     # Stream pipeline trace: prints [PIPE-IN], [FILTER-OUT], [QUEUE-PUT] per token.
     # Disable in production — enable only when debugging streaming regressions.
     DEBUG_STREAMING_PIPELINE: bool = _env_flag("PIPER_DEBUG_STREAMING_PIPELINE", False)
+    # Span tracing: sampled turns are exported to TRACE_DIR as trace-event JSON.
+    TRACE_ENABLED: bool = _env_flag("PIPER_TRACE_ENABLED", False)
+    TRACE_SAMPLE_RATE: float = float(os.environ.get("PIPER_TRACE_SAMPLE_RATE", "1.0"))
+    TRACE_MAX_FILES: int = int(os.environ.get("PIPER_TRACE_MAX_FILES", "50"))
+    TRACE_MAX_EVENTS: int = int(os.environ.get("PIPER_TRACE_MAX_EVENTS", "20000"))
+    TRACE_TAIL_S: float = float(os.environ.get("PIPER_TRACE_TAIL_S", "15.0"))
     LANGGRAPH_TRACE_HISTORY_LIMIT: int = int(os.environ.get("PIPER_LANGGRAPH_TRACE_HISTORY_LIMIT", "500"))
     LANGGRAPH_CHECKPOINT_HISTORY_LIMIT: int = int(os.environ.get("PIPER_LANGGRAPH_CHECKPOINT_HISTORY_LIMIT", "500"))
     MODELS_DIR = ROOT_DIR / "models"
 
-    # --- PATH RESOLUTION (Safe & Simple) ---
-
-    # 1. Llama Server EXE
-    # Allow env override so newer llama.cpp builds can be tested safely before
-    # they become the default runtime.
-    _env_llama = os.environ.get("PIPER_LLAMA_SERVER_EXE", "").strip()
-    _hard_llama = r"F:\llama.cpp\llama-server.exe"
-    _local_newer_llama = ROOT_DIR / "runtime" / "llama.cpp" / "llama-server.exe"
-    _env_llama_path = _coerce_existing_path(_env_llama) if _env_llama else None
-    if _env_llama_path:
-        LLAMA_SERVER_EXE = _env_llama_path
-    elif _local_newer_llama.exists():
-        LLAMA_SERVER_EXE = _local_newer_llama
-    elif _safe_path_exists(_hard_llama):
-        LLAMA_SERVER_EXE = Path(_hard_llama)
-    else:
-        LLAMA_SERVER_EXE = ROOT_DIR / "llama-server.exe"
-
-    # 2. Model Path
-    # Prefer a valid Qwen 3.5 4B GGUF when present. Otherwise stay on the
-    # working Qwen 2.5 14B model. `PIPER_MODEL_PATH` can override both.
-    MODEL_PATH = _resolve_llama_model_path()
-    MMPROJ_PATH = _resolve_mmproj_path(MODEL_PATH)
-    LLAMA_SERVER_BIND_HOST: str = _resolve_llama_server_bind_host(_raw_llama_server_url, LLAMA_SERVER_EXE)
-    LLAMA_SERVER_URL: str = _resolve_llama_server_url(_raw_llama_server_url, LLAMA_SERVER_EXE)
-    LLAMA_SERVER_REASONING_BUDGET: int = int(
-        os.environ.get(
-            "PIPER_LLM_REASONING_BUDGET",
-            str(_default_reasoning_budget(MODEL_PATH)),
-        )
-    )
-
-    # 3. ComfyUI
-    # Check if the hardcoded path exists, otherwise look locally
-    _hard_comfy = r"F:\ComfyUI_windows_portable"
-    if _safe_path_exists(_hard_comfy):
-        COMFY_DIR = Path(_hard_comfy)
-    else:
-        COMFY_DIR = ROOT_DIR / "ComfyUI"
+    # --- PATH RESOLUTION (lazy, see CONFIG_SECTIONS) ---
+    LLAMA_SERVER_EXE = _SectionValue("llm_server")
+    LLAMA_SERVER_BIND_HOST = _SectionValue("llm_server")
+    LLAMA_SERVER_URL = _SectionValue("llm_server")
+    MODEL_PATH = _SectionValue("models")
+    MMPROJ_PATH = _SectionValue("models")
+    LLAMA_SERVER_REASONING_BUDGET = _SectionValue("models")
+    COMFY_DIR = _SectionValue("paths")
+
+    COMFY_KEEP_WARM: bool = _env_flag("PIPER_COMFY_KEEP_WARM", True)
+    COMFY_IDLE_TIMEOUT_S: float = float(os.environ.get("PIPER_COMFY_IDLE_TIMEOUT_S", "300"))
+    COMFY_VRAM_MIN_FREE_FRACTION: float = float(os.environ.get("PIPER_COMFY_VRAM_MIN_FREE_FRACTION", "0.10"))
+    COMFY_JOB_TIMEOUT_S: float = float(os.environ.get("PIPER_COMFY_JOB_TIMEOUT_S", "180"))
     
     # -----------------------------------------------
 
@@ -830,26 +1016,57 @@ class Config:
     KOKORO_TORCH_MODEL: str = "kokoro-v1_0.pth"
     KOKORO_TORCH_CONFIG: str = "config.json"
     BOOT_SCREEN_MIN_VISIBLE_S: float = 0.75
+    BOOT_WARM_TASK_TIMEOUT_S: float = float(os.environ.get("PIPER_BOOT_WARM_TASK_TIMEOUT_S", "180.0"))
+    BOOT_TIMELINE_ENABLED: bool = field(
+        default_factory=lambda: _env_flag("PIPER_BOOT_TIMELINE_ENABLED", True)
+    )
     TTS_LANG: str = "en-us"
+    TTS_STREAMING_SINK: bool = field(
+        default_factory=lambda: _env_flag("PIPER_TTS_STREAMING_SINK", True)
+    )
+    TTS_SINK_BUFFER_S: float = float(os.environ.get("PIPER_TTS_SINK_BUFFER_S", "8.0"))
+    TTS_SINK_CROSSFADE_MS: float = float(os.environ.get("PIPER_TTS_SINK_CROSSFADE_MS", "6.0"))
+    TTS_AUDIO_CACHE_ENABLED: bool = field(
+        default_factory=lambda: _env_flag("PIPER_TTS_AUDIO_CACHE_ENABLED", True)
+    )
+    TTS_AUDIO_CACHE_MAX_MB: float = float(os.environ.get("PIPER_TTS_AUDIO_CACHE_MAX_MB", "64"))
+    TTS_AUDIO_CACHE_MAX_CHARS: int = int(os.environ.get("PIPER_TTS_AUDIO_CACHE_MAX_CHARS", "160"))
+    TTS_AUDIO_CACHE_DISK_ENTRIES: int = int(os.environ.get("PIPER_TTS_AUDIO_CACHE_DISK_ENTRIES", "2000"))
+    TTS_SYNTH_AHEAD: int = int(os.environ.get("PIPER_TTS_SYNTH_AHEAD", "2"))
+    TTS_SYNTH_WORKERS: int = int(os.environ.get("PIPER_TTS_SYNTH_WORKERS", "0"))
+    TTS_ONNX_INTRA_OP_THREADS: int = int(os.environ.get("PIPER_TTS_ONNX_INTRA_OP_THREADS", "0"))
+    TTS_PRESYNTH_PHRASES: list[str] = field(
+        default_factory=lambda: [
+            "Systems online.",
+            "Search complete.",
+            "Done.",
+            "Canceled.",
+            "Reminder canceled.",
+            "Status: Error",
+            "Status: Canceled",
+            "Status: Restarting...",
+            "Status: Mic error",
+        ]
+    )
     LIVE_SCREEN_INTERVAL_S: float = 10.0
     LIVE_SCREEN_FILENAME: str = "live_screen.jpg"
     LIVE_SCREEN_FOCUS_FILENAME: str = "live_focus.jpg"
     LIVE_SCREEN_SOURCE_MODE: str = "display"
     LIVE_SCREEN_MAX_STALE_S: float = 30.0
+    LIVE_SCREEN_CHANGE_THRESHOLD: float = 0.002
+    LIVE_SCREEN_ADAPTIVE: bool = True
+    LIVE_SCREEN_MIN_INTERVAL_S: float = 1.0
+    LIVE_SCREEN_IDLE_MAX_FACTOR: float = 3.0
     SCREEN_CAPTURE_MAX_DIM: int = 1920
     SCREEN_POINTER_FOCUS_WIDTH: int = 1400
     SCREEN_POINTER_FOCUS_HEIGHT: int = 900
 
-    _hard_kokoro = r"C:\Piper\models\kokoro"
-    if _safe_path_exists(_hard_kokoro):
-        KOKORO_DIR = Path(_hard_kokoro)
-    else:
-        KOKORO_DIR = ROOT_DIR / "models" / "kokoro"
+    KOKORO_DIR = _SectionValue("audio")
     KOKORO_MODEL: str = "kokoro-v1.0.onnx"
     KOKORO_VOICES: str = "voices-v1.0.bin"
 
     # ---------------------------------------------------------------------
-    # Web Search (DuckDuckGo + Jina.ai Reader)
+    # Web Search (SearXNG/DuckDuckGo + local page extraction)
     # ---------------------------------------------------------------------
 
     SEARCH_BACKEND: str = "searxng"
@@ -873,6 +1090,25 @@ class Config:
     SEARCH_DEEP_DIVE_LINKS_LIMIT: int = 6
     SEARCH_CONTENT_SLICE_LENGTH: int = 1500
     SEARCH_FETCH_WALL_TIMEOUT_S: float = float(os.environ.get("PIPER_SEARCH_FETCH_WALL_TIMEOUT_S", "10.0"))
+    SEARCH_DEEP_DIVE_CANDIDATES: int = int(os.environ.get("PIPER_SEARCH_DEEP_DIVE_CANDIDATES", "8"))
+    SEARCH_DEEP_DIVE_WORKERS: int = int(os.environ.get("PIPER_SEARCH_DEEP_DIVE_WORKERS", "6"))
+    SEARCH_DEEP_DIVE_DEADLINE_S: float = float(os.environ.get("PIPER_SEARCH_DEEP_DIVE_DEADLINE_S", "15.0"))
+    SEARCH_EXTRACT_WORKERS: int = int(os.environ.get("PIPER_SEARCH_EXTRACT_WORKERS", "2"))
+    SEARCH_EXTRACT_TIMEOUT_S: float = float(os.environ.get("PIPER_SEARCH_EXTRACT_TIMEOUT_S", "3.0"))
+    SEARCH_REMOTE_READER_FALLBACK: bool = field(
+        default_factory=lambda: _env_flag("PIPER_SEARCH_REMOTE_READER_FALLBACK", False)
+    )
+    SEARCH_PAGE_CACHE_ENABLED: bool = field(
+        default_factory=lambda: _env_flag("PIPER_SEARCH_PAGE_CACHE_ENABLED", True)
+    )
+    SEARCH_PAGE_CACHE_TTL_S: float = float(os.environ.get("PIPER_SEARCH_PAGE_CACHE_TTL_S", "3600"))
+    SEARCH_PAGE_CACHE_MAX_ENTRIES: int = int(os.environ.get("PIPER_SEARCH_PAGE_CACHE_MAX_ENTRIES", "500"))
+    SEARCH_RESULT_CACHE_ENABLED: bool = field(
+        default_factory=lambda: _env_flag("PIPER_SEARCH_RESULT_CACHE_ENABLED", True)
+    )
+    SEARCH_RESULT_CACHE_TTL_S: float = float(os.environ.get("PIPER_SEARCH_RESULT_CACHE_TTL_S", "1800"))
+    SEARCH_RESULT_CACHE_NEWS_TTL_S: float = float(os.environ.get("PIPER_SEARCH_RESULT_CACHE_NEWS_TTL_S", "300"))
+    SEARCH_RESULT_CACHE_MAX_ENTRIES: int = int(os.environ.get("PIPER_SEARCH_RESULT_CACHE_MAX_ENTRIES", "256"))
 
     # -----------------------------------------------------------------
     # Web UI bridge (default; DearPyGui remains available as fallback)
@@ -898,6 +1134,9 @@ class Config:
     WEB_MIC_FFMPEG_TIMEOUT_S: int = field(
         default_factory=lambda: int(os.environ.get("PIPER_WEB_MIC_FFMPEG_TIMEOUT_S", "30"))
     )
+    WEB_MIC_STREAM_SILENCE_S: float = field(
+        default_factory=lambda: float(os.environ.get("PIPER_WEB_MIC_STREAM_SILENCE_S", "0.6"))
+    )
     WEB_UI_MAX_WS_MESSAGE_BYTES: int = field(
         default_factory=lambda: int(os.environ.get("PIPER_WEB_UI_MAX_WS_MESSAGE_BYTES", str(20 * 1024 * 1024)))
     )
@@ -920,6 +1159,11 @@ class Config:
     )
 
 
+_SECTION_KEYS: dict[str, str] = {
+    name: value.section for name, value in vars(Config).items() if isinstance(value, _SectionValue)
+}
+
+
 class LiveConfig:
     """Mutable config holder wrapping a frozen Config.
 
@@ -946,7 +1190,7 @@ class LiveConfig:
         for name, value in vars(type(source)).items():
             if name.startswith("_") or name in values:
                 continue
-            if isinstance(value, property) or callable(value):
+            if isinstance(value, (property, _SectionValue)) or callable(value):
                 continue
             values[name] = getattr(source, name)
         return values
@@ -957,6 +1201,8 @@ class LiveConfig:
         with self._lock:
             if name in self._data:
                 return self._data[name]
+        if name in _SECTION_KEYS:
+            return CONFIG_SECTIONS[_SECTION_KEYS[name]].values()[name]
         class_value = getattr(self._config_class, name, None)
         if class_value is not None and not isinstance(class_value, property) and not callable(class_value):
             return class_value
@@ -977,10 +1223,14 @@ class LiveConfig:
         for key, value in overrides.items():
             if key.startswith("_"):
                 continue
-            if key not in self._data:
+            if key in self._data:
+                current = self._data[key]
+            elif key in _SECTION_KEYS:
+                current = getattr(self, key)
+            else:
                 continue
-            coerced = self._coerce_override_value(self._data[key], value)
-            if self._data[key] != coerced:
+            coerced = self._coerce_override_value(current, value)
+            if current != coerced:
                 with self._lock:
                     self._data[key] = coerced
                 changed.append(key)
@@ -988,6 +1238,18 @@ class LiveConfig:
             self._notify(changed)
         return changed
 
+    def invalidate(self, *sections: str) -> list[str]:
+        """Re-probe lazily resolved sections on next access (all when none are named).
+
+        Listeners are told about dropped settings that are not overridden.
+        """
+        dropped = invalidate_config_sections(*sections)
+        with self._lock:
+            changed = [key for key in dropped if key not in self._data]
+        if changed:
+            self._notify(changed)
+        return changed
+
     def on_change(self, listener: Callable[[list[str]], None]) -> None:
         self._listeners.append(listener)
 
@@ -1046,6 +1308,13 @@ class LiveConfig:
                 if name in self._data and self._data[name] != default_value:
                     self._data[name] = default_value
                     changed.append(name)
+            overridden_lazy = [name for name in _SECTION_KEYS if name in self._data]
+        for name in overridden_lazy:
+            default_value = getattr(self._config_class, name)
+            with self._lock:
+                current = self._data.pop(name, default_value)
+            if current != default_value:
+                changed.append(name)
         if changed:
             self._notify(changed)
         return changed
@@ -79,6 +79,9 @@ class AgentBrain:
         except Exception:
             _LOG.debug("Computer-use engine shutdown failed", exc_info=True)
 
+    def prewarm_browser(self) -> str:
+        return self.computer_use_engine.prewarm()
+
     def suspend_runtime_sessions(self) -> None:
         try:
             if self._computer_use_engine is not None:
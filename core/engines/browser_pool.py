@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Optional, TypeVar
+
+try:
+    from playwright.sync_api import sync_playwright
+except Exception:  # pragma: no cover - optional dependency
+    sync_playwright = None
+
+
+_LOG = logging.getLogger(__name__)
+_T = TypeVar("_T")
+
+DEFAULT_BLOCKED_RESOURCE_TYPES = ("image", "media", "font")
+
+
+class BrowserPoolUnavailable(RuntimeError):
+    pass
+
+
+def _default_launcher(headless: bool) -> tuple[Any, Any]:
+    if sync_playwright is None:
+        raise BrowserPoolUnavailable(
+            "Playwright is not installed in this environment yet. Local file:// fixture pages still work, "
+            "but live browser navigation requires the Playwright package and browser binaries."
+        )
+    playwright = sync_playwright().start()
+    try:
+        browser = playwright.chromium.launch(headless=headless)
+    except Exception:
+        try:
+            playwright.stop()
+        except Exception:
+            pass
+        raise
+    return playwright, browser
+
+
+class BrowserContextPool:
+    """Owns one Playwright driver and browser on a dedicated worker thread.
+
+    The sync Playwright API is bound to the thread that started it, so every
+    browser call goes through `run()`. That lets the browser be launched ahead
+    of time (boot warm-up) and survive across turns that run on different
+    threads. A released context is closed and a fresh one is opened in its
+    place, so the next `acquire()` finds a ready page but no cookies, storage
+    or permission grants left by the previous session. Each context aborts
+    requests for heavy resource types that text extraction never looks at.
+    """
+
+    def __init__(
+        self,
+        *,
+        blocked_resource_types: Iterable[str] = DEFAULT_BLOCKED_RESOURCE_TYPES,
+        max_idle_contexts: int = 2,
+        headless: bool = True,
+        launcher: Callable[[bool], tuple[Any, Any]] | None = None,
+    ) -> None:
+        self.blocked_resource_types = frozenset(
+            str(item or "").strip().lower() for item in blocked_resource_types if str(item or "").strip()
+        )
+        self.max_idle_contexts = max(0, int(max_idle_contexts))
+        self.headless = bool(headless)
+        self._launcher = launcher or _default_launcher
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+        self._worker_thread: threading.Thread | None = None
+        self._playwright = None
+        self._browser = None
+        self._idle: list[tuple[Any, Any]] = []
+        self.stats: dict[str, int] = {
+            "launches": 0,
+            "contexts_created": 0,
+            "contexts_reused": 0,
+            "contexts_recycled": 0,
+            "blocked_requests": 0,
+        }
+
+    # ── worker thread ────────────────────────────────────────────────
+
+    def _ensure_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1,
+                    thread_name_prefix="piper-browser",
+                    initializer=self._bind_worker_thread,
+                )
+            return self._executor
+
+    def _bind_worker_thread(self) -> None:
+        self._worker_thread = threading.current_thread()
+
+    def on_worker_thread(self) -> bool:
+        return self._worker_thread is not None and threading.current_thread() is self._worker_thread
+
+    def submit(self, fn: Callable[..., _T], *args: Any, **kwargs: Any) -> Future:
+        return self._ensure_executor().submit(fn, *args, **kwargs)
+
+    def run(self, fn: Callable[..., _T], *args: Any, **kwargs: Any) -> _T:
+        if self.on_worker_thread():
+            return fn(*args, **kwargs)
+        return self.submit(fn, *args, **kwargs).result()
+
+    # ── browser lifecycle (worker thread only) ───────────────────────
+
+    @property
+    def browser_ready(self) -> bool:
+        return self._browser is not None
+
+    def _browser_connected(self) -> bool:
+        browser = self._browser
+        if browser is None:
+            return False
+        try:
+            return bool(browser.is_connected())
+        except Exception:
+            return False
+
+    def _ensure_browser(self) -> Any:
+        if self._browser_connected():
+            return self._browser
+        if self._browser is not None:
+            _LOG.info("Browser pool: browser disconnected, relaunching.")
+            self._close_browser()
+        self._playwright, self._browser = self._launcher(self.headless)
+        self.stats["launches"] += 1
+        return self._browser
+
+    def _route_request(self, route: Any) -> None:
+        try:
+            resource_type = str(route.request.resource_type or "").strip().lower()
+            if resource_type in self.blocked_resource_types:
+                self.stats["blocked_requests"] += 1
+                route.abort()
+                return
+            route.continue_()
+        except Exception:  # pragma: no cover - route may already be handled on navigation races
+            _LOG.debug("Browser pool: request routing failed", exc_info=True)
+
+    def _new_context(self) -> tuple[Any, Any]:
+        browser = self._ensure_browser()
+        context = browser.new_context(accept_downloads=True)
+        if self.blocked_resource_types:
+            context.route("**/*", self._route_request)
+        page = context.new_page()
+        self.stats["contexts_created"] += 1
+        return context, page
+
+    def _warm(self) -> str:
+        self._ensure_browser()
+        if not self._idle and self.max_idle_contexts > 0:
+            self._idle.append(self._new_context())
+        return f"Browser pool warm ({len(self._idle)} idle context(s))."
+
+    def warm(self) -> str:
+        return self.run(self._warm)
+
+    def warm_async(self) -> Future:
+        return self.submit(self._warm)
+
+    def acquire(self) -> tuple[Any, Any]:
+        """Return a `(context, page)` pair, reusing a recycled context when possible."""
+        if not self.on_worker_thread():
+            return self.run(self.acquire)
+        while self._idle:
+            context, page = self._idle.pop()
+            if not self._browser_connected():
+                self._close_handles(page, context)
+                break
+            try:
+                if page.is_closed():
+                    page = context.new_page()
+            except Exception:
+                self._close_handles(page, context)
+                continue
+            self.stats["contexts_reused"] += 1
+            return context, page
+        self._idle.clear()
+        return self._new_context()
+
+    def release(self, context: Any, page: Any) -> None:
+        """Close a used context and, when the pool has room, queue a fresh one.
+
+        Cookies are only part of what a session leaves behind: localStorage,
+        sessionStorage, IndexedDB, service workers and permission grants all
+        live in the context too. Closing it discards every one of them, and a
+        new context costs milliseconds against an already-running browser.
+        """
+        if context is None:
+            return
+        if not self.on_worker_thread():
+            self.run(self.release, context, page)
+            return
+        self._close_handles(page, context)
+        if len(self._idle) >= self.max_idle_contexts or not self._browser_connected():
+            return
+        try:
+            self._idle.append(self._new_context())
+        except Exception:
+            _LOG.debug("Browser pool: replacement context failed", exc_info=True)
+            return
+        self.stats["contexts_recycled"] += 1
+
+    @staticmethod
+    def _close_handles(*handles: Optional[Any]) -> None:
+        for handle in handles:
+            if handle is None:
+                continue
+            try:
+                handle.close()
+            except Exception:
+                pass
+
+    def _close_browser(self) -> None:
+        for context, page in self._idle:
+            self._close_handles(page, context)
+        self._idle.clear()
+        browser = self._browser
+        playwright = self._playwright
+        self._browser = None
+        self._playwright = None
+        self._close_handles(browser)
+        if playwright is not None:
+            try:
+                playwright.stop()
+            except Exception:
+                pass
+
+    def shutdown(self) -> None:
+        with self._executor_lock:
+            executor = self._executor
+        if executor is None:
+            return
+        try:
+            self.run(self._close_browser)
+        except Exception:
+            _LOG.debug("Browser pool: close failed", exc_info=True)
+        on_worker = self.on_worker_thread()
+        with self._executor_lock:
+            self._executor = None
+            self._worker_thread = None
+        executor.shutdown(wait=not on_worker)
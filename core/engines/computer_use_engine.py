@@ -15,6 +15,7 @@ from typing import Any, Optional
 import requests
 
 from config import CFG
+from core.engines.browser_pool import BrowserContextPool, BrowserPoolUnavailable
 from core.runtime_control import CancellationToken
 
 try:
@@ -75,6 +76,7 @@ _BROWSER_CHROME_RE = re.compile(
     r"(?i)\b(index|modules|previous|next|navigation|contents|skip to|breadcrumb|sidebar|menu)\b"
 )
 _LOCAL_HTML_PAGE_SUFFIXES = {".html", ".htm"}
+_NAV_WAIT_UNTIL_VALUES = {"commit", "domcontentloaded", "load", "networkidle"}
 _DOWNLOAD_HINT_STOPWORDS = {
     "a",
     "an",
@@ -133,6 +135,102 @@ _DOWNLOAD_IDENTITY_STOPWORDS = _DOWNLOAD_HINT_STOPWORDS | {
 }
 
 
+_PLAYWRIGHT_SNAPSHOT_SCRIPT = """(args) => {
+    const knownKey = String((args && args.known_key) || "");
+    const candidateLimit = Number((args && args.candidate_limit) || 80);
+    const blockLimit = Number((args && args.block_limit) || 120);
+    let tracker = window.__piperSnapshotTracker;
+    if (!tracker) {
+      tracker = { docId: Math.random().toString(36).slice(2) + Date.now().toString(36), version: 0 };
+      try {
+        const observer = new MutationObserver(() => {
+          tracker.version += 1;
+        });
+        observer.observe(document.documentElement || document, {
+          subtree: true,
+          childList: true,
+          attributes: true,
+          characterData: true,
+        });
+      } catch (err) {
+        tracker.version = -1;
+      }
+      window.__piperSnapshotTracker = tracker;
+    }
+    const key = tracker.version < 0 ? "" : `${tracker.docId}:${tracker.version}:${location.href}`;
+    if (key && key === knownKey) {
+      return { unchanged: true, key };
+    }
+    const root =
+      document.querySelector("main, article, [role='main'], .body, .document, .main-content") ||
+      document.body ||
+      document.documentElement;
+    const isVisible = (el) => {
+      const style = window.getComputedStyle(el);
+      if (!style) return false;
+      if (style.display === "none" || style.visibility === "hidden") return false;
+      if (el.hasAttribute("hidden") || el.getAttribute("aria-hidden") === "true") return false;
+      const rects = el.getClientRects();
+      return Boolean(rects && rects.length);
+    };
+    const textOf = (el) => String((el.innerText || el.textContent || "")).replace(/\\s+/g, " ").trim();
+    const candidates = Array.from(
+      root.querySelectorAll("a, button, input, textarea, select, [data-testid], [id], [name], h1, h2, h3")
+    )
+      .filter((el) => {
+        const tag = String(el.tagName || "").toLowerCase();
+        if (!tag || ["html", "head", "title", "meta", "link", "script", "style"].includes(tag)) {
+          return false;
+        }
+        if (["a", "button", "input", "textarea", "select", "h1", "h2", "h3"].includes(tag) && !isVisible(el)) {
+          return false;
+        }
+        const id = String(el.getAttribute("id") || "");
+        const dataTestid = String(el.getAttribute("data-testid") || "");
+        const name = String(el.getAttribute("name") || "");
+        const href = String(el.getAttribute("href") || "");
+        return Boolean(id || dataTestid || name || href || textOf(el));
+      })
+      .slice(0, candidateLimit)
+      .map((el) => ({
+        tag: String(el.tagName || "").toLowerCase(),
+        id: String(el.getAttribute("id") || ""),
+        data_testid: String(el.getAttribute("data-testid") || ""),
+        name: String(el.getAttribute("name") || ""),
+        href: String(el.getAttribute("href") || ""),
+        type: String(el.getAttribute("type") || ""),
+        download: String(el.getAttribute("download") || ""),
+        text: textOf(el),
+      }));
+    const blockRoot =
+      document.querySelector("main, article, [role='main'], .body, .document, .main-content") ||
+      document.body;
+    const textBlocks = blockRoot
+      ? Array.from(blockRoot.querySelectorAll("h1, h2, h3, h4, p, li, dt, dd, pre, blockquote"))
+          .slice(0, blockLimit)
+          .map((el) => {
+            const tag = String((el.tagName || "")).toLowerCase();
+            const id = String(el.getAttribute("id") || "");
+            const dataTestid = String(el.getAttribute("data-testid") || "");
+            const name = String(el.getAttribute("name") || "");
+            let selector = tag;
+            if (id) selector = `#${id}`;
+            else if (dataTestid) selector = `[data-testid='${dataTestid}']`;
+            else if (name) selector = `[name='${name}']`;
+            return { tag, selector, text: textOf(el) };
+          })
+      : [];
+    return {
+      unchanged: false,
+      key,
+      title: String(document.title || ""),
+      body_text: document.body ? String(document.body.innerText || "") : "",
+      text_blocks: textBlocks,
+      candidates,
+    };
+}"""
+
+
 class BrowserOpError(RuntimeError):
     pass
 
@@ -193,6 +291,43 @@ class _SimplePageParser(HTMLParser):
                 self.nodes[idx].text_parts.append(text)
 
 
+@dataclass
+class _NodeIndex:
+    source: Optional[list[_Node]] = None
+    by_id: dict[str, _Node] = field(default_factory=dict)
+    by_attr: dict[tuple[str, str], _Node] = field(default_factory=dict)
+    by_tag: dict[str, list[tuple[_Node, str]]] = field(default_factory=dict)
+    by_text: dict[str, _Node] = field(default_factory=dict)
+    haystacks: list[tuple[_Node, str]] = field(default_factory=list)
+
+    @classmethod
+    def build(cls, nodes: list[_Node]) -> "_NodeIndex":
+        index = cls(source=nodes)
+        for node in nodes:
+            index.by_id.setdefault(str(node.attrs.get("id") or ""), node)
+            for attr_name in ("data-testid", "name"):
+                attr_value = str(node.attrs.get(attr_name) or "")
+                if attr_value:
+                    index.by_attr.setdefault((attr_name, attr_value), node)
+            node_text = node.text
+            if node_text:
+                index.by_text.setdefault(node_text, node)
+            entry = (node, ComputerUseEngine._node_match_haystack(node))
+            index.haystacks.append(entry)
+            index.by_tag.setdefault(node.tag, []).append(entry)
+        return index
+
+
+@dataclass
+class _PlaywrightSnapshot:
+    key: str = ""
+    url: str = ""
+    title: str = ""
+    body_text: str = ""
+    text_blocks: list[dict[str, Any]] = field(default_factory=list)
+    candidates: list[tuple[int, dict[str, str]]] = field(default_factory=list)
+
+
 @dataclass
 class _BrowserSessionState:
     backend: str = "none"
@@ -205,31 +340,67 @@ class _BrowserSessionState:
     field_values: dict[str, str] = field(default_factory=dict)
     history: list[str] = field(default_factory=list)
     history_index: int = -1
+    node_index: Optional[_NodeIndex] = None
 
 
 class ComputerUseEngine:
-    def __init__(self, *, data_dir: Path, workspace: Path) -> None:
+    def __init__(
+        self,
+        *,
+        data_dir: Path,
+        workspace: Path,
+        browser_pool: BrowserContextPool | None = None,
+    ) -> None:
         self.data_dir = Path(data_dir)
         self.workspace = Path(workspace).resolve()
         self.workspace.mkdir(parents=True, exist_ok=True)
         self.session_dir = self.data_dir / "computer_use"
         self.session_dir.mkdir(parents=True, exist_ok=True)
         self._session = _BrowserSessionState()
-        self._playwright = None
-        self._browser = None
+        self._browser_pool = browser_pool or BrowserContextPool(
+            blocked_resource_types=getattr(CFG, "COMPUTER_USE_BLOCKED_RESOURCE_TYPES", ("image", "media", "font")),
+            max_idle_contexts=int(getattr(CFG, "COMPUTER_USE_IDLE_CONTEXTS", 2)),
+        )
         self._context = None
         self._page = None
         self._playwright_owner_thread: threading.Thread | None = None
         self._playwright_lock = threading.RLock()
+        self._snapshot: _PlaywrightSnapshot | None = None
+        self.snapshot_stats: dict[str, int] = {"captured": 0, "reused": 0}
 
-    def shutdown(self) -> None:
+    @property
+    def browser_pool(self) -> BrowserContextPool:
+        return self._browser_pool
+
+    def _suspend_locked(self) -> None:
         with self._playwright_lock:
             self._reset_playwright_session()
-            self._session = _BrowserSessionState()
+
+    def shutdown(self) -> None:
+        if self._page is not None:
+            self._browser_pool.run(self._suspend_locked)
+        self._session = _BrowserSessionState()
+        self._browser_pool.shutdown()
 
     def suspend(self) -> None:
-        with self._playwright_lock:
-            self._reset_playwright_session()
+        if self._page is not None:
+            self._browser_pool.run(self._suspend_locked)
+
+    def prewarm(self) -> str:
+        """Launch the pooled browser ahead of the first browser action."""
+        if not bool(getattr(CFG, "COMPUTER_USE_ENABLED", True)):
+            return "Browser warm-up skipped: computer use is disabled by configuration."
+        if not bool(getattr(CFG, "COMPUTER_USE_PREWARM_BROWSER", True)):
+            return "Browser warm-up skipped: PIPER_COMPUTER_USE_PREWARM_BROWSER is off."
+        if sync_playwright is None:
+            return "Browser warm-up skipped: Playwright is not installed."
+        self._prepare_playwright_linux_lib_path()
+        return self._browser_pool.warm()
+
+    @staticmethod
+    def _navigation_wait_until() -> str:
+        value = str(getattr(CFG, "COMPUTER_USE_NAV_WAIT_UNTIL", "domcontentloaded") or "").strip().lower()
+        return value if value in _NAV_WAIT_UNTIL_VALUES else "domcontentloaded"
 
     @staticmethod
     def _raise_if_cancelled(cancel_token: CancellationToken | None) -> None:
@@ -660,61 +831,10 @@ class ComputerUseEngine:
                 break
         return inventory
 
-    def _capture_playwright_interaction_candidates(self, *, limit: int = 60) -> list[dict[str, str]]:
-        page = self._ensure_playwright_page()
-        try:
-            raw_items = page.evaluate(
-                """(limit) => {
-                    const root =
-                      document.querySelector("main, article, [role='main'], .body, .document, .main-content") ||
-                      document.body ||
-                      document.documentElement;
-                    const isVisible = (el) => {
-                      const style = window.getComputedStyle(el);
-                      if (!style) return false;
-                      if (style.display === "none" || style.visibility === "hidden") return false;
-                      if (el.hasAttribute("hidden") || el.getAttribute("aria-hidden") === "true") return false;
-                      const rects = el.getClientRects();
-                      return Boolean(rects && rects.length);
-                    };
-                    const nodes = Array.from(
-                      root.querySelectorAll("a, button, input, textarea, select, [data-testid], [id], [name], h1, h2, h3")
-                    )
-                      .filter((el) => {
-                        const tag = String(el.tagName || "").toLowerCase();
-                        if (!tag || ["html", "head", "title", "meta", "link", "script", "style"].includes(tag)) {
-                          return false;
-                        }
-                        if (["a", "button", "input", "textarea", "select", "h1", "h2", "h3"].includes(tag) && !isVisible(el)) {
-                          return false;
-                        }
-                        const id = String(el.getAttribute("id") || "");
-                        const dataTestid = String(el.getAttribute("data-testid") || "");
-                        const name = String(el.getAttribute("name") || "");
-                        const href = String(el.getAttribute("href") || "");
-                        const text = String((el.innerText || el.textContent || "")).replace(/\\s+/g, " ").trim();
-                        return Boolean(id || dataTestid || name || href || text);
-                      })
-                      .slice(0, limit);
-                    return nodes.map((el) => {
-                      const tag = String(el.tagName || "").toLowerCase();
-                      const id = String(el.getAttribute("id") || "");
-                      const dataTestid = String(el.getAttribute("data-testid") || "");
-                      const name = String(el.getAttribute("name") || "");
-                      const href = String(el.getAttribute("href") || "");
-                      const type = String(el.getAttribute("type") || "");
-                      const download = String(el.getAttribute("download") || "");
-                      const text = String((el.innerText || el.textContent || "")).replace(/\\s+/g, " ").trim();
-                      return { tag, id, data_testid: dataTestid, name, href, type, download, text };
-                    });
-                }""",
-                limit,
-            )
-        except Exception:  # pragma: no cover - best effort only
-            return []
-        candidates: list[dict[str, str]] = []
+    def _parse_playwright_candidates(self, raw_items: Any) -> list[tuple[int, dict[str, str]]]:
+        candidates: list[tuple[int, dict[str, str]]] = []
         seen: set[str] = set()
-        for item in raw_items or []:
+        for raw_index, item in enumerate(raw_items or []):
             if not isinstance(item, dict):
                 continue
             tag = str(item.get("tag") or "").strip().lower()
@@ -749,12 +869,86 @@ class ComputerUseEngine:
             text_value = self._compact_text(str(item.get("text") or ""), limit=180)
             if text_value:
                 entry["text"] = text_value
-            candidates.append(entry)
+            candidates.append((raw_index, entry))
         return candidates
 
-    def _capture_playwright_element_inventory(self) -> list[dict[str, str]]:
+    @staticmethod
+    def _parse_playwright_text_blocks(raw_items: Any) -> list[dict[str, Any]]:
+        blocks: list[dict[str, Any]] = []
+        for item in raw_items or []:
+            if not isinstance(item, dict):
+                continue
+            tag = str(item.get("tag") or "").strip().lower()
+            text = re.sub(r"\s+", " ", str(item.get("text") or "")).strip()
+            selector = str(item.get("selector") or "").strip()
+            if tag not in _TOPIC_CANDIDATE_TAGS or len(text) < 8:
+                continue
+            blocks.append({"tag": tag, "selector": selector or tag, "text": text})
+        return blocks
+
+    def _capture_playwright_snapshot(self, *, restore_current_url: bool = True) -> _PlaywrightSnapshot:
+        """Return the active page snapshot, re-scanning the DOM only when it mutated.
+
+        Title, body text, topic blocks and interaction candidates come back from a
+        single injected script. The script tracks DOM mutations per document, so an
+        unchanged page answers with its snapshot key and the cached parse is reused.
+        """
+        page = self._ensure_playwright_page(restore_current_url=restore_current_url)
+        cached = self._snapshot
+        current_url = str(page.url or "").strip()
+        try:
+            raw = page.evaluate(
+                _PLAYWRIGHT_SNAPSHOT_SCRIPT,
+                {
+                    "known_key": cached.key if cached is not None else "",
+                    "candidate_limit": 80,
+                    "block_limit": 120,
+                },
+            )
+        except Exception:  # pragma: no cover - best effort only
+            raw = None
+        if not isinstance(raw, dict):
+            self._snapshot = None
+            title = ""
+            try:
+                title = str(page.title() or "").strip()
+            except Exception:  # pragma: no cover - best effort only
+                title = ""
+            return _PlaywrightSnapshot(url=current_url, title=title)
+        key = str(raw.get("key") or "")
+        if raw.get("unchanged") and cached is not None and key and key == cached.key:
+            self.snapshot_stats["reused"] += 1
+            cached.url = current_url
+            return cached
+        snapshot = _PlaywrightSnapshot(
+            key=key,
+            url=current_url,
+            title=str(raw.get("title") or "").strip(),
+            body_text=str(raw.get("body_text") or "").strip(),
+            text_blocks=self._parse_playwright_text_blocks(raw.get("text_blocks")),
+            candidates=self._parse_playwright_candidates(raw.get("candidates")),
+        )
+        self.snapshot_stats["captured"] += 1
+        self._snapshot = snapshot if key else None
+        return snapshot
+
+    def _capture_playwright_interaction_candidates(
+        self,
+        *,
+        limit: int = 60,
+        snapshot: _PlaywrightSnapshot | None = None,
+    ) -> list[dict[str, str]]:
+        if snapshot is None:
+            snapshot = self._capture_playwright_snapshot()
+        return [dict(entry) for raw_index, entry in snapshot.candidates if raw_index < limit]
+
+    def _capture_playwright_element_inventory(
+        self,
+        *,
+        snapshot: _PlaywrightSnapshot | None = None,
+    ) -> list[dict[str, str]]:
         inventory: list[dict[str, str]] = []
-        for item in self._capture_playwright_interaction_candidates(limit=60):
+        for item in self._capture_playwright_interaction_candidates(limit=60, snapshot=snapshot):
             tag = str(item.get("tag") or "").strip().lower()
             selector = str(item.get("selector") or "").strip()
             id_value = str(item.get("id") or "").strip()
@@ -1093,48 +1287,20 @@ class ComputerUseEngine:
         return blocks
 
     def _capture_playwright_text_blocks(self) -> list[dict[str, Any]]:
-        page = self._ensure_playwright_page()
-        try:
-            raw_items = page.evaluate(
-                """() => {
-                    const root =
-                      document.querySelector("main, article, [role='main'], .body, .document, .main-content") ||
-                      document.body;
-                    const nodes = Array.from(
-                      root.querySelectorAll("h1, h2, h3, h4, p, li, dt, dd, pre, blockquote")
-                    ).slice(0, 120);
-                    return nodes.map((el) => {
-                      const tag = String((el.tagName || "")).toLowerCase();
-                      const id = String(el.getAttribute("id") || "");
-                      const dataTestid = String(el.getAttribute("data-testid") || "");
-                      const name = String(el.getAttribute("name") || "");
-                      const text = String((el.innerText || el.textContent || "")).replace(/\\s+/g, " ").trim();
-                      let selector = tag;
-                      if (id) selector = `#${id}`;
-                      else if (dataTestid) selector = `[data-testid='${dataTestid}']`;
-                      else if (name) selector = `[name='${name}']`;
-                      return { tag, selector, text };
-                    });
-                }"""
-            )
-        except Exception:  # pragma: no cover - best effort only
-            return []
-        blocks: list[dict[str, Any]] = []
-        for item in raw_items or []:
-            if not isinstance(item, dict):
-                continue
-            tag = str(item.get("tag") or "").strip().lower()
-            text = re.sub(r"\s+", " ", str(item.get("text") or "")).strip()
-            selector = str(item.get("selector") or "").strip()
-            if tag not in _TOPIC_CANDIDATE_TAGS or len(text) < 8:
-                continue
-            blocks.append({"tag": tag, "selector": selector or tag, "text": text})
-        return blocks
+        return [dict(block) for block in self._capture_playwright_snapshot().text_blocks]
+
+    def _node_index(self) -> _NodeIndex:
+        nodes = self._session.nodes
+        index = self._session.node_index
+        if index is None or index.source is not nodes:
+            index = _NodeIndex.build(nodes)
+            self._session.node_index = index
+        return index
 
     def _find_node(self, *, selector: str = "", text: str = "") -> tuple[Optional[_Node], str]:
         selector = self._normalize_selector_for_current_page(selector)
         text = str(text or "").strip()
-        nodes = list(self._session.nodes)
+        index = self._node_index()
         if selector:
             has_text_match = _HAS_TEXT_SELECTOR_RE.match(selector)
             if has_text_match:
@@ -1142,42 +1308,40 @@ class ComputerUseEngine:
                 needle = str(has_text_match.group("value") or "").strip().lower()
                 if needle:
                     for require_tag in ((True, False) if target_tag else (False,)):
-                        for node in nodes:
-                            if require_tag and node.tag != target_tag:
-                                continue
-                            haystack = self._node_match_haystack(node)
+                        entries = index.by_tag.get(target_tag, []) if require_tag else index.haystacks
+                        for node, haystack in entries:
                             if needle in haystack:
                                 return node, "has_text"
             simple_tag = selector.lower()
             if re.fullmatch(r"[a-z][a-z0-9_-]*", simple_tag):
-                for node in nodes:
-                    if node.tag == simple_tag:
-                        return node, "tag"
+                tagged = index.by_tag.get(simple_tag)
+                if tagged:
+                    return tagged[0][0], "tag"
             if selector.startswith("#"):
-                target = selector[1:]
-                for node in nodes:
-                    if str(node.attrs.get("id") or "") == target:
-                        return node, "id"
+                node = index.by_id.get(selector[1:])
+                if node is not None:
+                    return node, "id"
             attr_match = _ATTR_SELECTOR_RE.match(selector)
             if attr_match:
                 attr_name = str(attr_match.group("name") or "").strip()
                 attr_value = str(attr_match.group("value") or "").strip()
-                for node in nodes:
-                    if str(node.attrs.get(attr_name) or "") == attr_value:
-                        return node, attr_name
+                node = index.by_attr.get((attr_name, attr_value))
+                if node is not None:
+                    return node, attr_name
             text_selector = _TEXT_SELECTOR_RE.match(selector)
             if text_selector:
                 needle = str(text_selector.group("value") or "").strip().lower()
-                for node in nodes:
-                    if needle and needle in self._node_match_haystack(node):
-                        return node, "text"
-            for node in nodes:
-                if selector and selector == node.text:
-                    return node, "text"
+                if needle:
+                    for node, haystack in index.haystacks:
+                        if needle in haystack:
+                            return node, "text"
+            node = index.by_text.get(selector)
+            if node is not None:
+                return node, "text"
         if text:
             needle = text.lower()
-            for node in nodes:
-                if needle in self._node_match_haystack(node):
+            for node, haystack in index.haystacks:
+                if needle in haystack:
                     return node, "text"
         return None, ""
 
@@ -1310,26 +1474,15 @@ class ComputerUseEngine:
     def _reset_playwright_session(self) -> None:
         page = self._page
         context = self._context
-        browser = self._browser
-        playwright = self._playwright
 
         self._page = None
         self._context = None
-        self._browser = None
-        self._playwright = None
         self._playwright_owner_thread = None
+        self._snapshot = None
 
-        for handle in (page, context, browser):
-            if handle is None:
-                continue
-            try:
-                handle.close()
-            except Exception:
-                pass
-
-        if playwright is not None:
+        if context is not None:
             try:
-                playwright.stop()
+                self._browser_pool.release(context, page)
             except Exception:
                 pass
 
@@ -1357,17 +1510,14 @@ class ComputerUseEngine:
                 return self._page
             try:
                 self._prepare_playwright_linux_lib_path()
-                self._playwright = sync_playwright().start()
-                self._browser = self._playwright.chromium.launch(headless=True)
-                self._context = self._browser.new_context(accept_downloads=True)
-                self._page = self._context.new_page()
+                self._context, self._page = self._browser_pool.acquire()
                 self._playwright_owner_thread = current_thread
                 if rehydrate_url:
                     if self._session.allowed_domains:
                         self._enforce_scope(rehydrate_url, self._session.allowed_domains)
-                    self._page.goto(rehydrate_url, wait_until="domcontentloaded", timeout=15000)
+                    self._page.goto(rehydrate_url, wait_until=self._navigation_wait_until(), timeout=15000)
                 return self._page
-            except PlaywrightError as exc:  # pragma: no cover - depends on local install
+            except (PlaywrightError, BrowserPoolUnavailable) as exc:  # pragma: no cover - depends on local install
                 self._reset_playwright_session()
                 raise BrowserOpError(f"Could not start the browser automation backend: {exc}") from exc
 
@@ -1478,24 +1628,17 @@ class ComputerUseEngine:
         return save_path
 
     def _capture_playwright_state(self) -> dict[str, Any]:
-        page = self._ensure_playwright_page(restore_current_url=False)
-        body_text = ""
-        try:
-            body_text = str(page.locator("body").inner_text(timeout=5000) or "").strip()
-        except Exception:  # pragma: no cover - best effort only
-            body_text = ""
-        current_url = str(page.url or "").strip()
-        current_title = str(page.title() or "").strip()
+        snapshot = self._capture_playwright_snapshot(restore_current_url=False)
         self._session.backend = "playwright"
-        self._session.current_url = current_url
-        self._session.current_title = current_title
-        self._session.page_text = body_text
+        self._session.current_url = snapshot.url
+        self._session.current_title = snapshot.title
+        self._session.page_text = snapshot.body_text
         self._session.nodes = []
-        element_inventory = self._capture_playwright_element_inventory()
+        element_inventory = self._capture_playwright_element_inventory(snapshot=snapshot)
         return {
-            "current_url": current_url,
-            "title": current_title,
-            "text_preview": body_text[:400],
+            "current_url": snapshot.url,
+            "title": snapshot.title,
+            "text_preview": snapshot.body_text[:400],
             "element_inventory": element_inventory,
         }
 
@@ -1532,14 +1675,7 @@ class ComputerUseEngine:
             )
 
         try:
-            if action not in {"goto_url", "open_page"} and not str(self._session.current_url or "").strip():
-                self._ensure_active_page_for_action(payload, cancel_token=cancel_token)
-            handler = getattr(self, f"_handle_{action}", None)
-            if handler is None:
-                raise BrowserOpError(f"Unsupported BROWSER_OP action: {action}")
-            result = handler(payload, cancel_token=cancel_token)
-            self._raise_if_cancelled(cancel_token)
-            return result
+            return self._browser_pool.run(self._dispatch_browser_action, action, payload, cancel_token)
         except BrowserScopeError as exc:
             return self._result(status="BLOCKED", action=action, summary=str(exc), backend=self._session.backend or "")
         except BrowserOpError as exc:
@@ -1551,6 +1687,21 @@ class ComputerUseEngine:
         except Exception as exc:
             return self._result(status="FAILED", action=action, summary=f"Unexpected browser action failure: {exc}", backend=self._session.backend or "")
 
+    def _dispatch_browser_action(
+        self,
+        action: str,
+        payload: dict[str, Any],
+        cancel_token: CancellationToken | None,
+    ) -> dict[str, Any]:
+        if action not in {"goto_url", "open_page"} and not str(self._session.current_url or "").strip():
+            self._ensure_active_page_for_action(payload, cancel_token=cancel_token)
+        handler = getattr(self, f"_handle_{action}", None)
+        if handler is None:
+            raise BrowserOpError(f"Unsupported BROWSER_OP action: {action}")
+        result = handler(payload, cancel_token=cancel_token)
+        self._raise_if_cancelled(cancel_token)
+        return result
+
     def _ensure_active_page_for_action(
         self,
         payload: dict[str, Any],
@@ -1599,7 +1750,7 @@ class ComputerUseEngine:
 
         self._enforce_scope(url, allowed_domains)
         page = self._ensure_playwright_page()
-        page.goto(url, wait_until="domcontentloaded", timeout=15000)
+        page.goto(url, wait_until=self._navigation_wait_until(), timeout=15000)
         self._session.allowed_domains = allowed_domains
         state = self._capture_playwright_state()
         self._enforce_scope(str(state.get("current_url") or url), self._session.allowed_domains)
@@ -1903,15 +2054,15 @@ class ComputerUseEngine:
             page = self._ensure_playwright_page()
             history_scope_domains = self._history_navigation_scope_domains(current_url_before_action, previous_url)
             try:
-                page.go_back(wait_until="domcontentloaded", timeout=10000)
+                page.go_back(wait_until=self._navigation_wait_until(), timeout=10000)
             except PlaywrightTimeoutError:
-                page.goto(previous_url, wait_until="domcontentloaded", timeout=15000)
+                page.goto(previous_url, wait_until=self._navigation_wait_until(), timeout=15000)
             state = self._capture_playwright_state()
             current_url = str(state.get("current_url") or "").strip()
             if not current_url:
                 raise BrowserOpError("Browser history navigation did not yield an active page.")
             if current_url != previous_url:
-                page.goto(previous_url, wait_until="domcontentloaded", timeout=15000)
+                page.goto(previous_url, wait_until=self._navigation_wait_until(), timeout=15000)
                 state = self._capture_playwright_state()
                 current_url = str(state.get("current_url") or "").strip()
             self._enforce_scope(current_url, history_scope_domains)
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import datetime as dt
 import threading
+import time
 from pathlib import Path
 from typing import Any, Callable, Sequence
 
@@ -19,24 +21,61 @@ from core.services.reminders import (
 )
 
 
+class _ScheduleStopEvent:
+    """Stop flag whose `wait` sleeps on the reminder schedule's condition.
+
+    Adding or firing a reminder through any `ReminderStore` on the same file
+    wakes the waiter early, so the loop re-plans against the new earliest
+    deadline instead of polling.
+    """
+
+    def __init__(self, store: ReminderStore) -> None:
+        self._store = store
+        self._flag = False
+
+    def is_set(self) -> bool:
+        return self._flag
+
+    def set(self) -> None:
+        self._flag = True
+        self._store.schedule.notify()
+
+    def clear(self) -> None:
+        self._flag = False
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._store.schedule.wait_for_change(timeout, stop=self.is_set)
+
+
 class ProactiveMonitor:
+    """Dispatches due reminders from the in-memory reminder heap.
+
+    `poll_interval_s` only bounds a single sleep now (it is how quickly
+    edits made to the reminders file outside the store API are noticed);
+    reminders added through the store fire at their deadline.
+    """
+
     def __init__(
         self,
         reminders_path: Path,
         *,
         poll_interval_s: float = 15.0,
+        retry_interval_s: float = 1.0,
         can_dispatch: Callable[[], bool],
         is_inflight: Callable[[str], bool],
         dispatch_callback: Callable[[dict[str, Any]], bool],
         log_callback: Callable[[str], None] | None = None,
+        clock: Callable[[], float] = time.time,
     ) -> None:
         self.store = ReminderStore(reminders_path)
         self.poll_interval_s = max(0.05, float(poll_interval_s or 15.0))
+        self.retry_interval_s = max(0.01, min(self.poll_interval_s, float(retry_interval_s or 1.0)))
         self.can_dispatch = can_dispatch
         self.is_inflight = is_inflight
         self.dispatch_callback = dispatch_callback
         self.log_callback = log_callback or (lambda text: None)
-        self._stop_event = threading.Event()
+        self.clock = clock
+        self._stop_event = _ScheduleStopEvent(self.store)
         self._thread: threading.Thread | None = None
 
     def start(self) -> None:
@@ -51,20 +90,36 @@ class ProactiveMonitor:
         if self._thread is not None and self._thread.is_alive():
             self._thread.join(timeout=min(self.poll_interval_s, 1.0))
 
+    def _dispatch_due(self) -> float:
+        """Dispatch at most one due reminder; return seconds until the next check."""
+        ready = self.can_dispatch()
+        now_ts = float(self.clock())
+        next_ts = self.store.next_fire_ts()
+        if next_ts is None:
+            return self.poll_interval_s
+        if next_ts > now_ts:
+            return min(self.poll_interval_s, next_ts - now_ts)
+        if not ready:
+            return self.retry_interval_s
+        now_utc = dt.datetime.fromtimestamp(now_ts, tz=dt.timezone.utc)
+        for entry in self.store.due_entries(now_utc=now_utc):
+            reminder_id = str(entry.get("id") or "").strip()
+            if reminder_id and self.is_inflight(reminder_id):
+                continue
+            if self.dispatch_callback(dict(entry)):
+                break
+        # Dispatched reminders stay due until the proactive turn marks them
+        # fired, which wakes the wait early.
+        return self.retry_interval_s
+
     def _run_loop(self) -> None:
         while not self._stop_event.is_set():
+            wait_s = self.poll_interval_s
             try:
-                if self.can_dispatch():
-                    due = self.store.due_entries()
-                    for entry in due:
-                        reminder_id = str(entry.get("id") or "").strip()
-                        if reminder_id and self.is_inflight(reminder_id):
-                            continue
-                        if self.dispatch_callback(dict(entry)):
-                            break
+                wait_s = self._dispatch_due()
             except Exception as exc:
                 self.log_callback(f"[PROACTIVE MONITOR] {exc}")
-            self._stop_event.wait(self.poll_interval_s)
+            self._stop_event.wait(max(0.0, wait_s))
 
 
 @register_route_interceptor
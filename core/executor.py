@@ -11,9 +11,10 @@ from pathlib import Path
 from typing import Any, List, Tuple
 
 from config import CFG
+from core import tracing
 from core.prompting import ScratchpadFormatter, PromptBuilder
 from core.debug_tools import log_prompt_debug
-from llm.llm_server_client import LLMClientError
+from llm.llm_server_client import LLMClientError, llm_role
 from core.contracts import FileCheckDecision, PlannerDecision, StageCard
 from core.planner_boundary import PlannerBoundary
 from core.json_utils import normalize_tool_invocation, parse_json_response
@@ -296,7 +297,29 @@ class StageExecutor:
         Executes one stage.
         Returns: (success_bool, log_entries_list)
         """
-        
+        stage_span = tracing.span(
+            "executor.stage",
+            cat="executor",
+            stage=stage_num,
+            goal=str(stage.get("stage_goal", "") or "")[:120],
+        )
+        self._step_span = tracing.NOOP_SPAN
+        success = False
+        try:
+            success, log_entries = self._run_stage(stage, stage_num, total_stages)
+            stage_span.set(**dict(getattr(self, "_last_stage_metrics", {}) or {}))
+            return success, log_entries
+        finally:
+            self._step_span.end()
+            self._step_span = tracing.NOOP_SPAN
+            stage_span.end(success=bool(success))
+
+    def _trace_step(self, stage_num: int, step: int) -> None:
+        """Close the previous step's span and open one for `step`."""
+        self._step_span.end()
+        self._step_span = tracing.span("executor.step", cat="executor", stage=stage_num, step=step)
+
+    def _run_stage(self, stage: StageCard, stage_num: int, total_stages: int) -> Tuple[bool, List[str]]:
         # 1. Inject Header
         header = ScratchpadFormatter.format_stage_header(stage_num, stage)
         self.scratchpad.append(header)
@@ -405,6 +428,7 @@ class StageExecutor:
         while step_count < max_steps:
             self._raise_if_cancelled()
             step_count += 1
+            self._trace_step(stage_num, step_count)
             self.ui.put(("status_widget_mode", "THINKING"))
             self.ui.put(("status_widget_step", f"Stage {stage_num}/{total_stages} | Step {step_count}"))
 
@@ -494,12 +518,13 @@ class StageExecutor:
             # Generate
             try:
                 planner_started_at = time.perf_counter()
-                raw = self.llm.generate(
-                    messages,
-                    temperature=0.0,
-                    max_tokens=int(getattr(CFG, "PLANNER_MAX_TOKENS", 700)),
-                    cancel_token=self.cancel_token,
-                )
+                with llm_role("planner"):
+                    raw = self.llm.generate(
+                        messages,
+                        temperature=0.0,
+                        max_tokens=int(getattr(CFG, "PLANNER_MAX_TOKENS", 700)),
+                        cancel_token=self.cancel_token,
+                    )
                 planner_time_s += max(0.0, time.perf_counter() - planner_started_at)
             except LLMClientError as e:
                 self._emit_runtime_signal(
@@ -1012,7 +1037,8 @@ class StageExecutor:
                 self.ui.put(("agent_log", f"   -> Installing package: {pkg_name or 'unknown'}"))
             if base_tag == "BROWSER_OP":
                 tool_tag = self._inject_browser_stage_context(tool_tag, stage)
-            action = self.brain.parse_and_execute(tool_tag, cancel_token=self.cancel_token)
+            with tracing.span("tool.call", cat="tool", tool=base_tag):
+                action = self.brain.parse_and_execute(tool_tag, cancel_token=self.cancel_token)
             self._raise_if_cancelled()
             action_count += 1
             self._stage_action_count = action_count
@@ -1040,10 +1066,11 @@ class StageExecutor:
 
                 try:
                     self._raise_if_cancelled()
-                    if action.tag == "CREATE_IMAGE":
-                        result = self.img_gen.generate(action.payload or "art", cancel_token=self.cancel_token)
-                    else:
-                        result = self.img_gen.edit_image(action.payload or "enhance", cancel_token=self.cancel_token)
+                    with tracing.span("tool.call", cat="tool", tool=action.tag):
+                        if action.tag == "CREATE_IMAGE":
+                            result = self.img_gen.generate(action.payload or "art", cancel_token=self.cancel_token)
+                        else:
+                            result = self.img_gen.edit_image(action.payload or "enhance", cancel_token=self.cancel_token)
                 finally:
                     self.boot.resume_server()
                 self._raise_if_cancelled()
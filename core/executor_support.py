@@ -10,6 +10,7 @@ from core.contracts import PlannerDecision, StageCard
 from core.json_utils import parse_json_response
 from core.prompting import PromptBuilder
 from core.runtime_control import CancellationToken, OperationCancelled
+from llm.llm_server_client import llm_role
 
 
 MODULE_PACKAGE_ALIASES = {
@@ -214,12 +215,13 @@ def run_inspector(*, llm, ui, scratchpad: list[str], stage: StageCard, cancel_to
             {"role": "system", "content": sys_prompt},
             {"role": "user", "content": "Return the inspector decision JSON for the stage above."},
         ]
-        raw = llm.generate(
-            messages,
-            temperature=0.0,
-            max_tokens=int(getattr(CFG, "INSPECTOR_MAX_TOKENS", 120)),
-            cancel_token=cancel_token,
-        )
+        with llm_role("inspector"):
+            raw = llm.generate(
+                messages,
+                temperature=0.0,
+                max_tokens=int(getattr(CFG, "INSPECTOR_MAX_TOKENS", 120)),
+                cancel_token=cancel_token,
+            )
         if cancel_token is not None:
             cancel_token.raise_if_cancelled()
         ui.put(("agent_log", f"[INSPECTOR] {raw.strip()}"))
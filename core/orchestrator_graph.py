@@ -16,7 +16,7 @@ from core.contracts import StageOutcomePack
 from core.services.verification import VerificationResult
 from core.orchestrator import Orchestrator, OrchestratorConfig
 from core.runtime_control import OperationCancelled
-from memory.storage import append_jsonl, ensure_parent
+from memory.storage import append_jsonl_file, ensure_parent
 
 _LOG = logging.getLogger(__name__)
 
@@ -612,7 +612,7 @@ def _write_graph_trace(
         "checkpoint_path": _relative_debug_path(checkpoint_path) if checkpoint_path else "",
         "checkpoint_history_limit": int(checkpoint_history_limit or 0),
     }
-    append_jsonl(
+    append_jsonl_file(
         trace_path,
         payload,
         max_lines=int(getattr(CFG, "LANGGRAPH_TRACE_HISTORY_LIMIT", 500) or 500),
@@ -50,7 +50,8 @@ from core.search_contracts import (
 from core.skills import apply_route_skill_layer
 from core.stage_policy import stage_requires_user_approval, stage_requires_user_input, stage_is_explicit_proposal
 from core.stream_filter import stream_thinking_filter
-from llm.llm_server_client import LLMClientError
+from core import tracing
+from llm.llm_server_client import LLMClientError, llm_role
 from core.runtime_control import OperationCancelled
 from tools.vision import VisionError, generate_stream_with_image_attachment, generate_with_image_attachment
 
@@ -996,23 +997,24 @@ def _run_route_core(orc) -> None:
         orc.ui.put(("status", "Routing..."))
         if CFG.DEBUG_LLM_PROMPTS:
             log_prompt_debug(CFG.ROUTER_DEBUG_PATH, messages, "SECRETARY")
-        if live_screen_path is not None:
-            raw = generate_with_image_attachment(
-                orc.llm,
-                messages=messages,
-                image_path=live_screen_path,
-                attachment_text=_LIVE_SCREEN_ROUTER_ATTACHMENT,
-                temperature=0.1,
-                max_tokens=int(getattr(CFG, "ROUTER_MAX_TOKENS", 400)),
-                cancel_token=orc.cancel_token,
-            )
-        else:
-            raw = orc.llm.generate(
-                messages,
-                temperature=0.1,
-                max_tokens=int(getattr(CFG, "ROUTER_MAX_TOKENS", 400)),
-                cancel_token=orc.cancel_token,
-            )
+        with llm_role("router"):
+            if live_screen_path is not None:
+                raw = generate_with_image_attachment(
+                    orc.llm,
+                    messages=messages,
+                    image_path=live_screen_path,
+                    attachment_text=_LIVE_SCREEN_ROUTER_ATTACHMENT,
+                    temperature=0.1,
+                    max_tokens=int(getattr(CFG, "ROUTER_MAX_TOKENS", 400)),
+                    cancel_token=orc.cancel_token,
+                )
+            else:
+                raw = orc.llm.generate(
+                    messages,
+                    temperature=0.1,
+                    max_tokens=int(getattr(CFG, "ROUTER_MAX_TOKENS", 400)),
+                    cancel_token=orc.cancel_token,
+                )
         orc.ui.put(("agent_log", f"   -> Secretary Raw: {raw}"))
         try:
             parsed: RouteDecision = RouterBoundary.validate(raw)
@@ -1074,22 +1076,23 @@ def _run_route_core(orc) -> None:
                         orc.ui.put(("agent_log", f"   -> Router identity intent: {identity_name}. Clarification required."))
                 except Exception as exc:
                     orc.ui.put(("agent_log", f"   -> Identity switch from router failed: {exc}"))
-        normalized = normalize_route_decision(parsed, orc.user_msg, router_history)
-        followup_resolved = _resolve_followup_route_with_llm(orc, normalized, followup_history)
-        if followup_resolved is not None and followup_resolved != normalized:
-            normalized = followup_resolved
-            orc.ui.put(("agent_log", "   -> Follow-up resolver refined ambiguous continuation route."))
-        clarified = _refine_ambiguous_task_route_with_llm(orc, normalized, router_history)
-        if clarified is not None and clarified != normalized:
-            normalized = clarified
-            orc.ui.put(("agent_log", "   -> Ambiguous task route converted into clarification pause."))
-        normalized = annotate_file_stage_kinds(normalized)
-        skilled = apply_route_skill_layer(
-            normalized,
-            orc.user_msg,
-            router_history,
-            enabled=bool(getattr(CFG, "SKILL_LAYER_ENABLED", True)),
-        )
+        with tracing.span("route.normalize", cat="route"):
+            normalized = normalize_route_decision(parsed, orc.user_msg, router_history)
+            followup_resolved = _resolve_followup_route_with_llm(orc, normalized, followup_history)
+            if followup_resolved is not None and followup_resolved != normalized:
+                normalized = followup_resolved
+                orc.ui.put(("agent_log", "   -> Follow-up resolver refined ambiguous continuation route."))
+            clarified = _refine_ambiguous_task_route_with_llm(orc, normalized, router_history)
+            if clarified is not None and clarified != normalized:
+                normalized = clarified
+                orc.ui.put(("agent_log", "   -> Ambiguous task route converted into clarification pause."))
+            normalized = annotate_file_stage_kinds(normalized)
+            skilled = apply_route_skill_layer(
+                normalized,
+                orc.user_msg,
+                router_history,
+                enabled=bool(getattr(CFG, "SKILL_LAYER_ENABLED", True)),
+            )
         orc.route_decision = normalized
         if skilled != normalized:
             orc.route_decision = skilled
@@ -1384,12 +1387,13 @@ def phase_search(orc) -> None:
         try:
             _search_trace(f"[SEARCH BG] Starting search for: {query}")
             orc.raise_if_cancelled()
-            data = perform_search(
-                query,
-                CFG.DATA_DIR,
-                log_callback=_search_trace,
-                cancel_token=orc.cancel_token,
-            )
+            with tracing.span("tool.search", cat="tool"):
+                data = perform_search(
+                    query,
+                    CFG.DATA_DIR,
+                    log_callback=_search_trace,
+                    cancel_token=orc.cancel_token,
+                )
             _search_trace(f"[SEARCH BG] perform_search returned. Length={len(str(data))}")
             if is_search_error_result(data):
                 raise RuntimeError(normalize_search_error(data))
@@ -1433,7 +1437,7 @@ def phase_search(orc) -> None:
             _search_trace(f"[SEARCH BG] Thread exiting. queued_result={queued_result}")
 
     try:
-        worker = threading.Thread(target=_do_search, daemon=True)
+        worker = threading.Thread(target=tracing.wrap(_do_search), daemon=True)
         worker.start()
     except Exception:
         orc.release_search_in_flight()
@@ -1532,12 +1536,13 @@ def phase_reporter(orc) -> None:
                 {"role": "system", "content": sys_prompt},
                 {"role": "user", "content": f"Summarize the search findings for '{query}' using the instructions above."},
             ]
-            summary = orc.llm.generate(
-                reporter_messages,
-                temperature=0.1,
-                max_tokens=int(getattr(CFG, "REPORTER_MAX_TOKENS", 700)),
-                cancel_token=orc.cancel_token,
-            )
+            with llm_role("reporter"):
+                summary = orc.llm.generate(
+                    reporter_messages,
+                    temperature=0.1,
+                    max_tokens=int(getattr(CFG, "REPORTER_MAX_TOKENS", 700)),
+                    cancel_token=orc.cancel_token,
+                )
             orc.ui.put(("agent_log", f"   -> Reporter Summary: {summary[:100]}..."))
         except OperationCancelled:
             raise
@@ -2138,6 +2143,7 @@ def _debug_log_stream(tokens, label: str):
         yield token
 
 
+@llm_role("persona")
 def _stream_or_capture_persona_answer(orc, messages, *, allow_recall: bool) -> tuple[str, bool]:
     full_answer = ""
     visible_stream_started = False
@@ -2207,6 +2213,7 @@ def _stream_or_capture_persona_answer(orc, messages, *, allow_recall: bool) -> t
                 _LOG.debug("stream.close() failed: %s", e, exc_info=True)
 
 
+@llm_role("persona")
 def _stream_or_capture_persona_answer_text_only(orc, messages, *, allow_recall: bool) -> tuple[str, bool]:
     full_answer = ""
     visible_stream_started = False
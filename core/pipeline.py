@@ -15,6 +15,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Callable, List, Optional
 from config import CFG
+from core import tracing
 from tools.registry import get_registered_tool_names
 from tools.tts import log_tts_error
 
@@ -254,6 +255,7 @@ class ChatPipeline:
         self._tag_scrubber = TagScrubber()
         self._stream_started_at: float | None = None
         self._tts_started_at: float | None = None
+        self._stream_chunks = 0
         self._completed_stream_metrics: List[dict[str, float | str]] = []
 
     @property
@@ -272,17 +274,41 @@ class ChatPipeline:
         ended_at = time.perf_counter()
         stream_ms = round(max(0.0, ended_at - self._stream_started_at) * 1000.0, 3)
         tts_ms = 0.0
+        first_audio_ms = 0.0
         if self._tts_started_at is not None:
             tts_ms = round(max(0.0, ended_at - self._tts_started_at) * 1000.0, 3)
+            first_audio_ms = round(max(0.0, self._tts_started_at - self._stream_started_at) * 1000.0, 3)
+        tracing.complete(
+            "persona.stream",
+            self._stream_started_at,
+            ended_at,
+            cat="tts",
+            trace=tracing.active_turn(),
+            ended=str(ended_kind or ""),
+            chunks=int(self._stream_chunks),
+        )
+        playback: dict = {}
+        try:
+            playback = dict(getattr(self.tts, "consume_playback_metrics", lambda: {})() or {})
+        except Exception as exc:
+            _LOG.debug("TTS playback metrics unavailable: %s", exc)
         self._completed_stream_metrics.append(
             {
                 "ended_kind": str(ended_kind or ""),
                 "stream_ms": stream_ms,
                 "tts_ms": tts_ms,
+                "tts_underruns": int(playback.get("underruns") or 0),
+                "tts_gap_ms": round(float(playback.get("gap_ms") or 0.0), 3),
+                "tts_cache_hits": int(playback.get("cache_hits") or 0),
+                "tts_cache_misses": int(playback.get("cache_misses") or 0),
+                "tts_cache_saved_ms": round(float(playback.get("cache_saved_ms") or 0.0), 3),
+                "tts_first_audio_ms": first_audio_ms,
+                "stream_chunks": int(self._stream_chunks),
             }
         )
         self._stream_started_at = None
         self._tts_started_at = None
+        self._stream_chunks = 0
 
     @staticmethod
     def _clean_numbers_for_tts(text: str) -> str:
@@ -317,6 +343,7 @@ class ChatPipeline:
             self._tag_scrubber.reset()
             self._stream_started_at = time.perf_counter()
             self._tts_started_at = None
+            self._stream_chunks = 0
             self.set_status("Generating…")
             # tts.stream_start() is deferred to the first delta so a long
             # <think>…</think> preamble does not leave the TTS connection stale.
@@ -332,11 +359,13 @@ class ChatPipeline:
             if not self._tts_started:
                 self._tts_started = True
                 self._tts_started_at = time.perf_counter()
+                tracing.instant("tts.first_text", cat="tts", trace=tracing.active_turn())
                 try:
                     self.tts.stream_start(voice=self._tts_voice, speed=self._tts_speed)
                 except Exception as exc:
                     _log_stream_tts_error("stream_start", exc)
 
+            self._stream_chunks += 1
             self._stream_buffer += payload
             clean_payload = self._tag_scrubber.process_delta(payload)
             self._clean_stream_buffer += clean_payload
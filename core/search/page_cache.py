@@ -0,0 +1,191 @@
+"""Persistent cache for deep-dive page text fetched during web search.
+
+One JSON file per URL under the cache directory. Entries younger than the
+TTL are served without touching the network; stale entries keep their
+ETag/Last-Modified validators so the fetcher can revalidate them with a
+conditional request instead of downloading the page again.
+
+This module does no filesystem work during import.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+_LOG = logging.getLogger(__name__)
+
+_PRUNE_EVERY_WRITES = 32
+
+
+@dataclass(frozen=True)
+class CachedPage:
+    url: str
+    content: str
+    fetched_at: float
+    etag: str = ""
+    last_modified: str = ""
+
+    def age_s(self, now: float | None = None) -> float:
+        return max(0.0, (time.time() if now is None else now) - self.fetched_at)
+
+    @property
+    def has_validators(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class SearchPageCache:
+    """URL-keyed page cache with TTL freshness and bounded entry count."""
+
+    def __init__(self, root: Path, *, ttl_s: float, max_entries: int = 500) -> None:
+        self.root = Path(root)
+        self.ttl_s = max(0.0, float(ttl_s))
+        self.max_entries = max(1, int(max_entries))
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+        self.stats: dict[str, int] = {
+            "fresh_hits": 0,
+            "stale": 0,
+            "revalidated": 0,
+            "misses": 0,
+            "stores": 0,
+        }
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(str(url or "").strip().encode("utf-8")).hexdigest()
+
+    def _path(self, url: str) -> Path:
+        return self.root / f"{self._key(url)}.json"
+
+    def _note(self, stat: str) -> None:
+        with self._lock:
+            self.stats[stat] = self.stats.get(stat, 0) + 1
+
+    def get(self, url: str) -> CachedPage | None:
+        path = self._path(url)
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except Exception:
+            _LOG.debug("search page cache: unreadable entry %s", path, exc_info=True)
+            return None
+        if not isinstance(payload, dict) or payload.get("url") != str(url or "").strip():
+            return None
+        try:
+            return CachedPage(
+                url=str(payload["url"]),
+                content=str(payload.get("content") or ""),
+                fetched_at=float(payload.get("fetched_at") or 0.0),
+                etag=str(payload.get("etag") or ""),
+                last_modified=str(payload.get("last_modified") or ""),
+            )
+        except Exception:
+            return None
+
+    def is_fresh(self, entry: CachedPage, now: float | None = None) -> bool:
+        return entry.age_s(now) < self.ttl_s
+
+    def lookup(self, url: str) -> tuple[CachedPage | None, bool]:
+        """Return `(entry, fresh)` and count the outcome."""
+        entry = self.get(url)
+        if entry is None:
+            self._note("misses")
+            return None, False
+        if self.is_fresh(entry):
+            self._note("fresh_hits")
+            return entry, True
+        self._note("stale")
+        return entry, False
+
+    def put(self, url: str, content: str, *, etag: str = "", last_modified: str = "") -> CachedPage:
+        entry = CachedPage(
+            url=str(url or "").strip(),
+            content=str(content or ""),
+            fetched_at=time.time(),
+            etag=str(etag or ""),
+            last_modified=str(last_modified or ""),
+        )
+        self._write(entry)
+        self._note("stores")
+        return entry
+
+    def touch(self, entry: CachedPage) -> CachedPage:
+        """Mark a revalidated (304) entry as fresh again."""
+        refreshed = CachedPage(
+            url=entry.url,
+            content=entry.content,
+            fetched_at=time.time(),
+            etag=entry.etag,
+            last_modified=entry.last_modified,
+        )
+        self._write(refreshed)
+        self._note("revalidated")
+        return refreshed
+
+    def _write(self, entry: CachedPage) -> None:
+        path = self._path(entry.url)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                    json.dump(asdict(entry), handle, ensure_ascii=False)
+                os.replace(tmp_name, path)
+            except Exception:
+                try:
+                    os.unlink(tmp_name)
+                except Exception:
+                    pass
+                raise
+        except Exception:
+            _LOG.debug("search page cache: write failed for %s", entry.url, exc_info=True)
+            return
+        with self._lock:
+            self._writes_since_prune += 1
+            should_prune = self._writes_since_prune >= _PRUNE_EVERY_WRITES
+            if should_prune:
+                self._writes_since_prune = 0
+        if should_prune:
+            self.prune()
+
+    def prune(self) -> int:
+        """Drop the oldest entries beyond `max_entries`. Returns the number removed."""
+        try:
+            entries = [(item.stat().st_mtime, item) for item in self.root.glob("*.json")]
+        except Exception:
+            return 0
+        if len(entries) <= self.max_entries:
+            return 0
+        entries.sort(key=lambda pair: pair[0])
+        removed = 0
+        for _mtime, item in entries[: len(entries) - self.max_entries]:
+            try:
+                item.unlink()
+                removed += 1
+            except Exception:
+                continue
+        return removed
+
+    def clear(self) -> None:
+        for item in self.root.glob("*.json"):
+            try:
+                item.unlink()
+            except Exception:
+                continue
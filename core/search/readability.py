@@ -0,0 +1,681 @@
+"""Local readability-style extraction of article text from fetched HTML.
+
+Deep-dive pages used to be routed through a remote reader service; this
+module does the same job in process with the stdlib HTML parser:
+
+1. `decode_html` sniffs the charset (BOM, Content-Type header, <meta>, then
+   a UTF-8 attempt, then charset-normalizer when installed, then cp1252).
+2. The page is parsed into a light tree. Scripts, styles, navigation,
+   footers, forms and blocks whose class/id looks like chrome (sidebars,
+   share bars, cookie banners, comments) are dropped while parsing.
+3. Paragraph-like blocks score their ancestors by text length and commas,
+   scaled by tag and class/id weights and by (1 - link density). The best
+   container and its qualifying siblings are taken as the main content.
+4. The content is rendered as Markdown: headings, nested lists, pipe tables,
+   fenced <pre> blocks and quotes survive; inline markup collapses to text.
+
+`extract_main_text` is a pure function of its arguments so it can run in a
+process pool; `deadline_s` bounds the parse cooperatively. `extract_page`
+runs it on a process pool (parsing is CPU-bound Python, so the deep-dive
+fetch threads would otherwise serialize on the GIL) and falls back to running
+inline when the pool is disabled or broken. The app starts the pool at boot
+with `start_extractor_pool` and stops it with `shutdown_extractor_pool`.
+
+This module does no filesystem or network work.
+"""
+
+from __future__ import annotations
+
+import codecs
+import logging
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from html.parser import HTMLParser
+from typing import Iterable
+
+_LOG = logging.getLogger(__name__)
+
+_SKIP_TAGS = frozenset(
+    {
+        "script", "style", "noscript", "svg", "math", "iframe", "template",
+        "canvas", "object", "embed", "video", "audio", "picture",
+    }
+)
+_DROP_TAGS = frozenset({"nav", "footer", "aside", "form", "button", "select", "dialog", "menu"})
+_VOID_TAGS = frozenset(
+    {
+        "area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+        "meta", "param", "source", "track", "wbr",
+    }
+)
+_BLOCK_TAGS = frozenset(
+    {
+        "address", "article", "blockquote", "body", "center", "dd", "details",
+        "div", "dl", "dt", "figcaption", "figure", "h1", "h2", "h3", "h4", "h5",
+        "h6", "header", "hr", "li", "main", "ol", "p", "pre", "section",
+        "summary", "table", "tbody", "td", "tfoot", "th", "thead", "tr", "ul",
+    }
+)
+# Opening one of these implicitly closes an open <p>, as browsers do.
+_CLOSES_P = _BLOCK_TAGS - {"li", "td", "th", "tr", "tbody", "thead", "tfoot", "dd", "dt"}
+_HEADINGS = {"h1": 1, "h2": 2, "h3": 3, "h4": 4, "h5": 5, "h6": 6}
+_PARAGRAPH_TAGS = frozenset({"p", "pre", "td", "blockquote", "dd", "li"})
+
+_UNLIKELY_RE = re.compile(
+    r"-ad-|ad-break|advert|agegate|banner|breadcrumb|combx|comment|community|cookie|consent|"
+    r"disqus|footer|gdpr|masthead|menu|modal|newsletter|nav|pager|pagination|popup|promo|"
+    r"related|remark|replies|rss|share|shoutbox|sidebar|skip|social|sponsor|subscribe|toolbar",
+    re.IGNORECASE,
+)
+_MAYBE_RE = re.compile(r"and|article|body|column|content|main|post|story|text", re.IGNORECASE)
+_POSITIVE_RE = re.compile(
+    r"article|body|content|entry|hentry|main|page|post|prose|story|text|blog", re.IGNORECASE
+)
+_NEGATIVE_RE = re.compile(
+    r"-ad-|hidden|^hid$| hid$| hid |^hid |banner|combx|comment|contact|footer|footnote|masthead|"
+    r"media|meta|outbrain|promo|related|scroll|share|shoutbox|sidebar|skyscraper|sponsor|"
+    r"shopping|tags|taboola|tool|widget",
+    re.IGNORECASE,
+)
+_HIDDEN_STYLE_RE = re.compile(r"display\s*:\s*none|visibility\s*:\s*hidden", re.IGNORECASE)
+_META_CHARSET_RE = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([A-Za-z0-9_.:-]+)""", re.IGNORECASE)
+_HEADER_CHARSET_RE = re.compile(r"charset\s*=\s*[\"']?([A-Za-z0-9_.:-]+)", re.IGNORECASE)
+_HTML_SNIFF_RE = re.compile(r"<(?:!doctype\s+html|html|head|body|div|p|article|main|title)\b", re.IGNORECASE)
+_WS_RE = re.compile(r"\s+")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+_BR = "\x00"
+_PARAGRAPH_BREAK_RE = re.compile(r"\x00\s*\x00[\s\x00]*")
+
+_FEED_SLICE = 64 * 1024
+_MIN_ARTICLE_CHARS = 250
+_MIN_PARAGRAPH_CHARS = 25
+
+
+class ExtractionTimeout(TimeoutError):
+    """Raised when parsing a page runs past its time budget."""
+
+
+# -- charset ---------------------------------------------------------------
+
+
+def _known_codec(name: str) -> str:
+    try:
+        return codecs.lookup(name.strip().strip("\"'")).name
+    except (LookupError, AttributeError):
+        return ""
+
+
+def sniff_charset(raw: bytes, content_type: str = "") -> str:
+    """Best-effort encoding of an HTML byte string."""
+    if raw.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if raw.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+    match = _HEADER_CHARSET_RE.search(content_type or "")
+    if match and (codec := _known_codec(match.group(1))):
+        return codec
+    match = _META_CHARSET_RE.search(raw[:4096])
+    if match and (codec := _known_codec(match.group(1).decode("ascii", "ignore"))):
+        return codec
+    try:
+        raw.decode("utf-8")
+        return "utf-8"
+    except UnicodeDecodeError as exc:
+        # A cut at the byte budget can split the last multi-byte character.
+        if exc.start >= len(raw) - 3:
+            return "utf-8"
+    try:
+        from charset_normalizer import from_bytes
+    except ImportError:
+        return "cp1252"
+    best = from_bytes(raw[:65536]).best()
+    return _known_codec(best.encoding) if best is not None else "cp1252"
+
+
+def decode_html(raw: bytes, content_type: str = "") -> str:
+    encoding = sniff_charset(raw, content_type) or "utf-8"
+    # iso-8859-1 labels are cp1252 in practice (WHATWG encoding spec).
+    if encoding in ("iso8859-1", "latin-1", "ascii"):
+        encoding = "cp1252"
+    return raw.decode(encoding, errors="replace")
+
+
+def looks_like_html(text: str, content_type: str = "") -> bool:
+    kind = (content_type or "").split(";", 1)[0].strip().casefold()
+    if kind:
+        return kind in ("text/html", "application/xhtml+xml")
+    return bool(_HTML_SNIFF_RE.search(text[:2048]))
+
+
+# -- parse -----------------------------------------------------------------
+
+
+class _Node:
+    __slots__ = ("tag", "hint", "children", "parent", "score", "scored")
+
+    def __init__(self, tag: str, hint: str = "", parent: "_Node | None" = None) -> None:
+        self.tag = tag
+        self.hint = hint
+        self.children: list[_Node | str] = []
+        self.parent = parent
+        self.score = 0.0
+        self.scored = False
+
+    def iter_nodes(self) -> Iterable["_Node"]:
+        stack: list[_Node] = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed([child for child in node.children if isinstance(child, _Node)]))
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.root = _Node("body")
+        self.stack: list[_Node] = [self.root]
+        self.title_parts: list[str] = []
+        self._skip_tag = ""
+        self._skip_depth = 0
+        self._in_title = False
+
+    def _close(self, tag: str, *, scope: frozenset[str] = frozenset()) -> bool:
+        for index in range(len(self.stack) - 1, 0, -1):
+            found = self.stack[index].tag
+            if found == tag:
+                del self.stack[index:]
+                return True
+            if found in scope:
+                return False
+        return False
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if self._skip_tag:
+            if tag == self._skip_tag:
+                self._skip_depth += 1
+            return
+        if tag == "title":
+            self._in_title = True
+            return
+        if tag in ("html", "head", "body"):
+            return
+        values = {name: (value or "") for name, value in attrs}
+        hint = f"{values.get('class', '')} {values.get('id', '')}".strip()
+        hidden = (
+            "hidden" in values
+            or values.get("aria-hidden", "").casefold() == "true"
+            or bool(_HIDDEN_STYLE_RE.search(values.get("style", "")))
+        )
+        unlikely = (
+            bool(hint)
+            and tag not in ("article", "main", "td", "th", "tr", "tbody", "table", "pre", "code")
+            and _UNLIKELY_RE.search(hint) is not None
+            and _MAYBE_RE.search(hint) is None
+        )
+        if tag in _SKIP_TAGS or tag in _DROP_TAGS or hidden or unlikely:
+            if tag not in _VOID_TAGS:
+                self._skip_tag, self._skip_depth = tag, 1
+            return
+        if tag == "header" and not any(node.tag in ("article", "main") for node in self.stack):
+            self._skip_tag, self._skip_depth = tag, 1
+            return
+        if tag in _CLOSES_P:
+            self._close("p", scope=frozenset({"div", "section", "article", "main", "td", "li", "blockquote"}))
+        if tag == "li":
+            self._close("li", scope=frozenset({"ul", "ol"}))
+        elif tag in ("td", "th"):
+            self._close("td", scope=frozenset({"tr", "table"}))
+            self._close("th", scope=frozenset({"tr", "table"}))
+        elif tag == "tr":
+            self._close("tr", scope=frozenset({"table"}))
+        elif tag in ("dd", "dt"):
+            self._close("dd", scope=frozenset({"dl"}))
+            self._close("dt", scope=frozenset({"dl"}))
+        node = _Node(tag, hint, self.stack[-1])
+        self.stack[-1].children.append(node)
+        if tag not in _VOID_TAGS:
+            self.stack.append(node)
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self.handle_starttag(tag, attrs)
+        if tag not in _VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        if self._skip_tag:
+            if tag == self._skip_tag:
+                self._skip_depth -= 1
+                if self._skip_depth <= 0:
+                    self._skip_tag, self._skip_depth = "", 0
+            return
+        if tag == "title":
+            self._in_title = False
+            return
+        if tag == "p" and not self._close("p"):
+            # A stray </p> renders as an empty paragraph; keep the break.
+            self.stack[-1].children.append(_Node("br", parent=self.stack[-1]))
+            return
+        self._close(tag)
+
+    def handle_data(self, data: str) -> None:
+        if self._skip_tag:
+            return
+        if self._in_title:
+            self.title_parts.append(data)
+            return
+        children = self.stack[-1].children
+        if children and isinstance(children[-1], str):
+            children[-1] += data
+        else:
+            children.append(data)
+
+
+def _parse(html: str, deadline: float | None) -> _TreeBuilder:
+    builder = _TreeBuilder()
+    for offset in range(0, len(html), _FEED_SLICE):
+        if deadline is not None and time.monotonic() > deadline:
+            raise ExtractionTimeout("page extraction exceeded its time budget")
+        builder.feed(html[offset:offset + _FEED_SLICE])
+    builder.close()
+    return builder
+
+
+# -- scoring ---------------------------------------------------------------
+
+
+def _collapse(text: str) -> str:
+    return _WS_RE.sub(" ", text).strip()
+
+
+def _raw_text(node: _Node) -> str:
+    parts: list[str] = []
+    stack: list[_Node | str] = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            parts.append(item)
+        elif item.tag == "br":
+            parts.append("\n")
+        else:
+            stack.extend(reversed(item.children))
+    return "".join(parts)
+
+
+def _text_length(node: _Node) -> int:
+    return len(_collapse(_raw_text(node)))
+
+
+def _link_density(node: _Node) -> float:
+    total = _text_length(node)
+    if total <= 0:
+        return 0.0
+    linked = sum(_text_length(child) for child in node.iter_nodes() if child.tag == "a")
+    return min(1.0, linked / total)
+
+
+def _class_weight(node: _Node) -> float:
+    if not node.hint:
+        return 0.0
+    weight = 0.0
+    if _NEGATIVE_RE.search(node.hint):
+        weight -= 25.0
+    if _POSITIVE_RE.search(node.hint):
+        weight += 25.0
+    return weight
+
+
+def _tag_weight(tag: str) -> float:
+    if tag in ("div", "article", "main", "section"):
+        return 5.0
+    if tag in ("pre", "td", "blockquote"):
+        return 3.0
+    if tag in ("address", "ol", "ul", "dl", "dd", "dt", "li", "form"):
+        return -3.0
+    if tag in _HEADINGS or tag == "th":
+        return -5.0
+    return 0.0
+
+
+def _has_block_children(node: _Node) -> bool:
+    return any(isinstance(child, _Node) and child.tag in _BLOCK_TAGS for child in node.children)
+
+
+def _score_candidates(root: _Node) -> list[_Node]:
+    candidates: list[_Node] = []
+    for node in root.iter_nodes():
+        if node.tag not in _PARAGRAPH_TAGS and not (node.tag == "div" and not _has_block_children(node)):
+            continue
+        text = _collapse(_raw_text(node))
+        if len(text) < _MIN_PARAGRAPH_CHARS:
+            continue
+        content_score = 1.0 + text.count(",") + min(len(text) / 100.0, 3.0)
+        ancestor, level = node.parent, 0
+        while ancestor is not None and level < 3:
+            if not ancestor.scored:
+                ancestor.score = _tag_weight(ancestor.tag) + _class_weight(ancestor)
+                ancestor.scored = True
+                candidates.append(ancestor)
+            ancestor.score += content_score / (1.0 if level == 0 else 2.0 if level == 1 else level * 3.0)
+            ancestor, level = ancestor.parent, level + 1
+    for candidate in candidates:
+        candidate.score *= 1.0 - _link_density(candidate)
+    return candidates
+
+
+def _select_content(root: _Node) -> list[_Node]:
+    candidates = _score_candidates(root)
+    if not candidates:
+        return [root]
+    top = max(candidates, key=lambda node: node.score)
+    # A lone child container holding all the text is the same article; climb
+    # to the parent so sibling sections come along.
+    while top.parent is not None and top.parent is not root and sum(
+        1 for child in top.parent.children if isinstance(child, _Node) or child.strip()
+    ) == 1:
+        top = top.parent
+    parent = top.parent
+    if parent is None:
+        return [top]
+    threshold = max(10.0, top.score * 0.2)
+    selected: list[_Node] = []
+    headings: list[_Node] = []
+    for sibling in parent.children:
+        if not isinstance(sibling, _Node):
+            continue
+        if sibling is top:
+            selected.extend(headings)
+            headings = []
+            selected.append(sibling)
+            continue
+        if sibling.tag in _HEADINGS:
+            # Section headings travel with the content that follows them.
+            headings.append(sibling)
+            continue
+        bonus = top.score * 0.2 if sibling.hint and sibling.hint == top.hint else 0.0
+        keep = sibling.scored and sibling.score + bonus >= threshold
+        if not keep and sibling.tag == "p":
+            text = _collapse(_raw_text(sibling))
+            density = _link_density(sibling)
+            keep = (len(text) > 80 and density < 0.25) or (0 < len(text) <= 80 and density == 0 and text.endswith("."))
+        if keep:
+            selected.extend(headings)
+            headings = []
+            selected.append(sibling)
+    return selected
+
+
+def _is_link_farm(node: _Node) -> bool:
+    if node.tag not in ("ul", "ol", "div", "section", "table", "dl"):
+        return False
+    length = _text_length(node)
+    if length == 0:
+        return False
+    density = _link_density(node)
+    return (density > 0.5 and length < 400) or density > 0.8
+
+
+# -- render ----------------------------------------------------------------
+
+
+def _escape_cell(text: str) -> str:
+    return text.replace("|", "\\|")
+
+
+class _MarkdownRenderer:
+    def __init__(self) -> None:
+        self.blocks: list[str] = []
+        self._inline: list[str] = []
+
+    def flush(self) -> None:
+        if not self._inline:
+            return
+        # Two or more <br> in a row separate paragraphs; a single one is a line break.
+        for paragraph in _PARAGRAPH_BREAK_RE.split("".join(self._inline)):
+            lines = (_collapse(line) for line in paragraph.split(_BR))
+            text = "\n".join(line for line in lines if line)
+            if text:
+                self.blocks.append(text)
+        self._inline = []
+
+    def render(self, node: _Node) -> "_MarkdownRenderer":
+        for child in node.children:
+            if isinstance(child, str):
+                self._inline.append(child)
+            else:
+                self._render_node(child)
+        return self
+
+    def _render_node(self, node: _Node) -> None:
+        tag = node.tag
+        if tag == "br":
+            self._inline.append(_BR)
+        elif tag in ("img", "hr", "input"):
+            self.flush()
+        elif _is_link_farm(node):
+            return
+        elif tag in _HEADINGS:
+            self.flush()
+            text = _collapse(_raw_text(node))
+            if text:
+                self.blocks.append(f"{'#' * _HEADINGS[tag]} {text}")
+        elif tag in ("ul", "ol"):
+            self.flush()
+            lines = _list_lines(node, 0)
+            if lines:
+                self.blocks.append("\n".join(lines))
+        elif tag == "table":
+            self.flush()
+            self.blocks.extend(_table_blocks(node))
+        elif tag == "pre":
+            self.flush()
+            code = _raw_text(node).strip("\n")
+            if code.strip():
+                self.blocks.append(f"```\n{code}\n```")
+        elif tag == "blockquote":
+            self.flush()
+            inner = "\n\n".join(_MarkdownRenderer().render(node).finish())
+            if inner:
+                self.blocks.append("\n".join(f"> {line}" if line else ">" for line in inner.split("\n")))
+        elif tag == "code":
+            text = _collapse(_raw_text(node))
+            if text:
+                self._inline.append(f"`{text}`")
+        elif tag in _BLOCK_TAGS:
+            self.flush()
+            self.render(node)
+            self.flush()
+        else:
+            self.render(node)
+
+    def finish(self) -> list[str]:
+        self.flush()
+        return self.blocks
+
+
+def _list_lines(node: _Node, level: int) -> list[str]:
+    lines: list[str] = []
+    indent = "  " * level
+    number = 0
+    for item in node.children:
+        if not isinstance(item, _Node):
+            continue
+        if item.tag in ("ul", "ol"):
+            lines.extend(_list_lines(item, level + 1))
+            continue
+        number += 1
+        marker = f"{number}." if node.tag == "ol" else "-"
+        renderer = _MarkdownRenderer()
+        nested: list[str] = []
+        for child in item.children:
+            if isinstance(child, _Node) and child.tag in ("ul", "ol"):
+                renderer.flush()
+                nested.extend(_list_lines(child, level + 1))
+            elif isinstance(child, str):
+                renderer._inline.append(child)
+            else:
+                renderer._render_node(child)
+        text = " ".join(block.replace("\n", " ") for block in renderer.finish())
+        if text:
+            lines.append(f"{indent}{marker} {text}")
+        lines.extend(nested)
+    return lines
+
+
+def _table_rows(table: _Node) -> list[list[str]]:
+    rows: list[list[str]] = []
+    stack: list[_Node] = [child for child in reversed(table.children) if isinstance(child, _Node)]
+    while stack:
+        node = stack.pop()
+        if node.tag == "table":
+            continue
+        if node.tag == "tr":
+            cells = [
+                _escape_cell(" ".join(block.replace("\n", " ") for block in _MarkdownRenderer().render(cell).finish()))
+                for cell in node.children
+                if isinstance(cell, _Node) and cell.tag in ("td", "th")
+            ]
+            if any(cells):
+                rows.append(cells)
+            continue
+        stack.extend(child for child in reversed(node.children) if isinstance(child, _Node))
+    return rows
+
+
+def _table_blocks(table: _Node) -> list[str]:
+    rows = _table_rows(table)
+    width = max((len(row) for row in rows), default=0)
+    if width <= 1:
+        # Layout table: render its content as ordinary blocks.
+        renderer = _MarkdownRenderer()
+        for node in table.iter_nodes():
+            if node.tag in ("td", "th"):
+                renderer.render(node)
+                renderer.flush()
+        return renderer.finish()
+    padded = [row + [""] * (width - len(row)) for row in rows]
+    lines = [
+        "| " + " | ".join(padded[0]) + " |",
+        "| " + " | ".join(["---"] * width) + " |",
+    ]
+    lines.extend("| " + " | ".join(row) + " |" for row in padded[1:])
+    return ["\n".join(lines)]
+
+
+# -- public ----------------------------------------------------------------
+
+
+def extract_main_text(html: str, *, deadline_s: float | None = None, max_chars: int = 0) -> str:
+    """Markdown rendering of the main content of `html`, prefixed by its title.
+
+    Returns an empty string when the page has no readable text. Raises
+    `ExtractionTimeout` when `deadline_s` (seconds from now) runs out.
+    """
+    deadline = time.monotonic() + deadline_s if deadline_s else None
+    builder = _parse(html, deadline)
+    root = builder.root
+    selected = _select_content(root)
+    renderer = _MarkdownRenderer()
+    for node in selected:
+        if deadline is not None and time.monotonic() > deadline:
+            raise ExtractionTimeout("page extraction exceeded its time budget")
+        if node is root:
+            renderer.render(node)
+        else:
+            renderer._render_node(node)
+    blocks = renderer.finish()
+    if sum(len(block) for block in blocks) < _MIN_ARTICLE_CHARS and selected != [root]:
+        fallback = _MarkdownRenderer().render(root).finish()
+        if sum(len(block) for block in fallback) > sum(len(block) for block in blocks):
+            blocks = fallback
+    body = _BLANK_LINES_RE.sub("\n\n", "\n\n".join(blocks)).strip()
+    title = _collapse("".join(builder.title_parts))
+    if not body:
+        return ""
+    text = f"Title: {title}\n\n{body}" if title else body
+    if max_chars and len(text) > max_chars:
+        text = text[:max_chars].rsplit(" ", 1)[0]
+    return text
+
+
+# -- worker pool -------------------------------------------------------------
+
+_POOL: ProcessPoolExecutor | None = None
+_POOL_WORKERS = 0
+_POOL_LOCK = threading.Lock()
+# Slack on top of the cooperative deadline for pickling and process hops.
+_POOL_GRACE_S = 0.5
+# Spawning workers (a fresh interpreter each on Windows) can take seconds.
+_POOL_START_TIMEOUT_S = 30.0
+
+
+def _worker_ready() -> bool:
+    return True
+
+
+def _extractor_pool(workers: int) -> ProcessPoolExecutor:
+    """The shared pool with all `workers` processes already running.
+
+    Worker start-up happens here, before any page is submitted, so it never
+    counts against a page's extraction budget.
+    """
+    global _POOL, _POOL_WORKERS
+    with _POOL_LOCK:
+        if _POOL is None or _POOL_WORKERS != workers:
+            if _POOL is not None:
+                _POOL.shutdown(wait=False, cancel_futures=True)
+                _POOL, _POOL_WORKERS = None, 0
+            pool = ProcessPoolExecutor(max_workers=workers)
+            try:
+                # One no-op per worker: fork-based pools spawn on demand.
+                for future in [pool.submit(_worker_ready) for _ in range(workers)]:
+                    future.result(timeout=_POOL_START_TIMEOUT_S)
+            except Exception as exc:
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise RuntimeError(f"extractor pool did not start: {exc}") from exc
+            _POOL, _POOL_WORKERS = pool, workers
+        return _POOL
+
+
+def start_extractor_pool(workers: int) -> bool:
+    """Start the pool ahead of the first search (app boot); True when it is up."""
+    if workers <= 0:
+        return False
+    try:
+        _extractor_pool(workers)
+    except (BrokenProcessPool, RuntimeError, OSError) as exc:
+        _LOG.warning("[Search] Extractor pool unavailable (%s); pages will be extracted inline.", exc)
+        return False
+    return True
+
+
+def shutdown_extractor_pool() -> None:
+    global _POOL, _POOL_WORKERS
+    with _POOL_LOCK:
+        pool, _POOL, _POOL_WORKERS = _POOL, None, 0
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def extract_page(html: str, *, workers: int = 0, timeout_s: float = 5.0, max_chars: int = 0) -> str:
+    """`extract_main_text` under a per-page time budget, on the pool when `workers` > 0.
+
+    Raises `ExtractionTimeout` when the page does not finish within `timeout_s`.
+    """
+    budget = max(0.05, float(timeout_s))
+    if workers <= 0:
+        return extract_main_text(html, deadline_s=budget, max_chars=max_chars)
+    try:
+        future = _extractor_pool(workers).submit(extract_main_text, html, deadline_s=budget, max_chars=max_chars)
+        return future.result(timeout=budget + _POOL_GRACE_S)
+    except ExtractionTimeout:
+        raise
+    except FutureTimeout:
+        future.cancel()
+        raise ExtractionTimeout("page extraction exceeded its time budget") from None
+    except (BrokenProcessPool, RuntimeError, OSError) as exc:
+        _LOG.warning("[Search] Extractor pool unavailable (%s); extracting inline.", exc)
+        shutdown_extractor_pool()
+        return extract_main_text(html, deadline_s=budget, max_chars=max_chars)
@@ -0,0 +1,107 @@
+"""In-process cache for search backend results.
+
+Entries are keyed by kind, backend, mode and a normalized query, so a
+follow-up turn that refocuses the same topic (or produces an overlapping
+query variant) reuses the earlier backend answer instead of asking again.
+News-like lookups expire much sooner than general ones.
+"""
+
+from __future__ import annotations
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable
+
+
+def normalize_cache_query(query: str) -> str:
+    return " ".join(str(query or "").casefold().split()).strip(" .?!")
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires_at: float
+
+
+class SearchResultCache:
+    """TTL + LRU cache for search attempts and collected result sets."""
+
+    def __init__(
+        self,
+        *,
+        ttl_s: float = 1800.0,
+        news_ttl_s: float = 300.0,
+        max_entries: int = 256,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_s = max(0.0, float(ttl_s))
+        self.news_ttl_s = max(0.0, float(news_ttl_s))
+        self.max_entries = max(1, int(max_entries))
+        self._clock = clock
+        self._entries: OrderedDict[tuple[str, str, str, str], _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats: dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "expired": 0,
+            "evictions": 0,
+        }
+
+    def ttl_for(self, mode: str, *, news: bool = False) -> float:
+        if news or str(mode or "").strip().lower() == "news":
+            return self.news_ttl_s
+        return self.ttl_s
+
+    @staticmethod
+    def _key(kind: str, backend: str, mode: str, query: str) -> tuple[str, str, str, str]:
+        return (
+            str(kind or ""),
+            str(backend or "").strip().lower(),
+            str(mode or "").strip().lower(),
+            normalize_cache_query(query),
+        )
+
+    def get(self, kind: str, backend: str, mode: str, query: str) -> Any | None:
+        key = self._key(kind, backend, mode, query)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= self._clock():
+                del self._entries[key]
+                self.stats["expired"] += 1
+                entry = None
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return copy.deepcopy(entry.value)
+
+    def put(self, kind: str, backend: str, mode: str, query: str, value: Any, *, news: bool = False) -> None:
+        ttl_s = self.ttl_for(mode, news=news)
+        if ttl_s <= 0:
+            return
+        key = self._key(kind, backend, mode, query)
+        with self._lock:
+            self._entries[key] = _Entry(value=copy.deepcopy(value), expires_at=self._clock() + ttl_s)
+            self._entries.move_to_end(key)
+            self.stats["stores"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "entries": len(self._entries),
+                "hit_rate": (self.stats["hits"] / lookups) if lookups else 0.0,
+            }
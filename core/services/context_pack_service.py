@@ -11,6 +11,7 @@ from __future__ import annotations
 from dataclasses import dataclass, field, replace
 from typing import Any, Dict, List
 
+from core import tracing
 from core.contracts import (
     PERSONA_CONTEXT_ARBITRATION_TABLE,
     PersonaArbitrationProfile,
@@ -53,29 +54,37 @@ class ContextPackService:
         brain_limit: int = 9,
         document_limit: int = 5,
     ) -> PersonaContextPack:
-        instructions = self.instruction_loader.load()
+        # Each source gets its own span so a slow pack shows which one stalled.
+        with tracing.span("context.instructions", cat="context"):
+            instructions = self.instruction_loader.load()
         active_user_block = ""
         if self.user_runtime is not None and hasattr(self.user_runtime, "render_active_user_block"):
             try:
-                active_user_block = str(self.user_runtime.render_active_user_block() or "").strip()
+                with tracing.span("context.active_user", cat="context"):
+                    active_user_block = str(self.user_runtime.render_active_user_block() or "").strip()
             except Exception:
                 active_user_block = ""
         situational_state = ""
         intent_state = ""
-        if knowledge_enabled and self.transient_state_mgr is not None:
-            situational_state = self.transient_state_mgr.render_situational_state(user_msg)
-            intent_state = self.transient_state_mgr.render_intent_state(user_msg)
-        elif knowledge_enabled:
-            situational_state = self.knowledge_mgr.render_situational_state(user_msg)
-        knowledge = self.knowledge_mgr.load() if knowledge_enabled else {}
-        world_state = self.knowledge_mgr.render_prompt_state(user_msg) if knowledge_enabled else ""
-        operational_state = self.operational_state_service.render_block(query=user_msg) if knowledge_enabled else ""
-        env_block = self.environment_service.render_block()
+        with tracing.span("context.transient_state", cat="context"):
+            if knowledge_enabled and self.transient_state_mgr is not None:
+                situational_state = self.transient_state_mgr.render_situational_state(user_msg)
+                intent_state = self.transient_state_mgr.render_intent_state(user_msg)
+            elif knowledge_enabled:
+                situational_state = self.knowledge_mgr.render_situational_state(user_msg)
+        with tracing.span("context.knowledge", cat="context"):
+            knowledge = self.knowledge_mgr.load() if knowledge_enabled else {}
+            world_state = self.knowledge_mgr.render_prompt_state(user_msg) if knowledge_enabled else ""
+        with tracing.span("context.operational_state", cat="context"):
+            operational_state = self.operational_state_service.render_block(query=user_msg) if knowledge_enabled else ""
+        with tracing.span("context.environment", cat="context"):
+            env_block = self.environment_service.render_block()
 
         brain_hits: List[Dict[str, Any]] = []
         if knowledge_enabled and user_msg:
             try:
-                brain_hits = self.brain.recall(user_msg, n_results=max(int(brain_limit), 0))
+                with tracing.span("context.brain_recall", cat="context"):
+                    brain_hits = self.brain.recall(user_msg, n_results=max(int(brain_limit), 0))
             except Exception:
                 brain_hits = []
 
@@ -123,10 +132,11 @@ class ContextPackService:
         document_hits: List[Dict[str, Any]] = []
         if knowledge_enabled and int(document_limit) > 0:
             try:
-                raw_hits = self.document_memory.render_prompt_hits(
-                    user_msg,
-                    limit=max(int(document_limit), 0),
-                )
+                with tracing.span("context.document_hits", cat="context"):
+                    raw_hits = self.document_memory.render_prompt_hits(
+                        user_msg,
+                        limit=max(int(document_limit), 0),
+                    )
                 # Filter out low-relevance hits.
                 # Threshold 0.35: cosine distance ≥ 0.35 means the query has no
                 # meaningful overlap with the document chunk.  0.45 was too loose —
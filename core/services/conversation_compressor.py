@@ -7,6 +7,7 @@ from pathlib import Path
 from typing import Any
 
 from config import CFG
+from llm.llm_server_client import llm_role
 
 _TOKEN_RE = re.compile(r"\S+")
 _SUMMARY_HEADERS = (
@@ -129,12 +130,13 @@ class ConversationCompressor:
             },
         ]
         try:
-            raw = llm.generate(
-                messages,
-                temperature=0.1,
-                max_tokens=int(getattr(CFG, "CONVERSATION_SUMMARY_MAX_TOKENS", 500)),
-                cancel_token=cancel_token,
-            )
+            with llm_role("summarizer"):
+                raw = llm.generate(
+                    messages,
+                    temperature=0.0,
+                    max_tokens=int(getattr(CFG, "CONVERSATION_SUMMARY_MAX_TOKENS", 500)),
+                    cancel_token=cancel_token,
+                )
         except Exception:
             return self._truncate_to_budget(candidate)
         summary = self._normalize_summary(raw)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import datetime as dt
+import heapq
 import json
 import os
 import re
@@ -9,7 +10,7 @@ import threading
 import uuid
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 from core.routing.route_dates import extract_date_phrase, resolve_date_phrase
 from core.routing.route_patterns import REMINDER_REQUEST_RE
@@ -101,18 +102,179 @@ class ReminderParseResult:
     error: str = ""
 
 
+def _parse_fire_at_ts(raw: Any) -> float | None:
+    text = str(raw or "").strip()
+    if not text:
+        return None
+    try:
+        return dt.datetime.fromisoformat(text.replace("Z", "+00:00")).astimezone(dt.timezone.utc).timestamp()
+    except Exception:
+        return None
+
+
+class ReminderSchedule:
+    """In-memory index of one reminders file.
+
+    Entries keep their file order; unfired entries with a parseable fire time
+    sit in a min-heap keyed by (fire timestamp, insertion order). Heap items
+    are invalidated lazily, so `mark_fired` and replacements stay O(log n).
+    Waiters block on `changed` and are woken whenever the index changes.
+    """
+
+    def __init__(self) -> None:
+        self.changed = threading.Condition(threading.RLock())
+        self.generation = 0
+        self.file_signature: tuple[int, int] | None = None
+        self._entries: list[dict[str, Any]] = []
+        self._by_id: dict[str, dict[str, Any]] = {}
+        self._heap: list[tuple[float, int, str]] = []
+        self._seq = 0
+
+    def replace(self, entries: list[dict[str, Any]]) -> None:
+        with self.changed:
+            self._entries = [dict(item) for item in entries]
+            self._by_id = {}
+            self._heap = []
+            for entry in self._entries:
+                item = self._index(entry)
+                if item is not None:
+                    self._heap.append(item)
+            heapq.heapify(self._heap)
+            self._bump()
+
+    def append(self, entry: dict[str, Any]) -> None:
+        with self.changed:
+            entry = dict(entry)
+            self._entries.append(entry)
+            item = self._index(entry)
+            if item is not None:
+                heapq.heappush(self._heap, item)
+            self._bump()
+
+    def _index(self, entry: dict[str, Any]) -> tuple[float, int, str] | None:
+        reminder_id = str(entry.get("id") or "").strip()
+        if reminder_id:
+            self._by_id.setdefault(reminder_id, entry)
+        self._seq += 1
+        if bool(entry.get("fired")) or not reminder_id:
+            return None
+        fire_ts = _parse_fire_at_ts(entry.get("fire_at"))
+        if fire_ts is None:
+            return None
+        return (fire_ts, self._seq, reminder_id)
+
+    def _bump(self) -> None:
+        self.generation += 1
+        self.changed.notify_all()
+
+    def _live(self, item: tuple[float, int, str]) -> bool:
+        entry = self._by_id.get(item[2])
+        return entry is not None and not bool(entry.get("fired"))
+
+    def entries(self) -> list[dict[str, Any]]:
+        with self.changed:
+            return [dict(item) for item in self._entries]
+
+    def mark_fired(self, reminder_id: str) -> bool:
+        with self.changed:
+            entry = self._by_id.get(reminder_id)
+            if entry is None or bool(entry.get("fired")):
+                return False
+            entry["fired"] = True
+            self._bump()
+            return True
+
+    def fired_count(self) -> int:
+        with self.changed:
+            return sum(1 for entry in self._entries if bool(entry.get("fired")))
+
+    def next_fire_ts(self) -> float | None:
+        with self.changed:
+            while self._heap and not self._live(self._heap[0]):
+                heapq.heappop(self._heap)
+            return self._heap[0][0] if self._heap else None
+
+    def due(self, now_ts: float) -> list[dict[str, Any]]:
+        """Unfired entries due at `now_ts`, earliest first. Does not consume them."""
+        with self.changed:
+            popped: list[tuple[float, int, str]] = []
+            while self._heap and self._heap[0][0] <= now_ts:
+                item = heapq.heappop(self._heap)
+                if self._live(item):
+                    popped.append(item)
+            for item in popped:
+                heapq.heappush(self._heap, item)
+            return [dict(self._by_id[item[2]]) for item in popped]
+
+    def wait_for_change(self, timeout: float | None, *, stop: Callable[[], bool] = lambda: False) -> bool:
+        """Block until the index changes, `stop()` turns true, or `timeout` passes."""
+        with self.changed:
+            generation = self.generation
+            self.changed.wait_for(lambda: stop() or self.generation != generation, timeout)
+            return stop()
+
+    def notify(self) -> None:
+        with self.changed:
+            self.changed.notify_all()
+
+
+_SCHEDULES: dict[str, ReminderSchedule] = {}
+_SCHEDULES_LOCK = threading.Lock()
+
+
+def _schedule_for(path: Path) -> ReminderSchedule:
+    key = os.path.normcase(str(path.resolve()))
+    with _SCHEDULES_LOCK:
+        schedule = _SCHEDULES.get(key)
+        if schedule is None:
+            schedule = _SCHEDULES[key] = ReminderSchedule()
+        return schedule
+
+
+def _file_signature(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
 class ReminderStore:
-    def __init__(self, path: Path) -> None:
+    """Reminders JSON file fronted by a process-wide `ReminderSchedule`.
+
+    The file is parsed once per process and again only when its mtime/size
+    changes underneath us. Fired entries beyond `keep_fired` are compacted
+    into a sibling archive file once `compact_after` of them accumulate.
+    """
+
+    def __init__(self, path: Path, *, compact_after: int = 32, keep_fired: int = 8) -> None:
         self.path = Path(path)
-        self._lock = threading.Lock()
+        self.archive_path = self.path.with_name(f"{self.path.stem}.archive{self.path.suffix}")
+        self.compact_after = max(1, int(compact_after))
+        self.keep_fired = max(0, int(keep_fired))
+        self.schedule = _schedule_for(self.path)
+        self._lock = self.schedule.changed
+
+    def _sync(self) -> ReminderSchedule:
+        signature = _file_signature(self.path)
+        with self._lock:
+            if signature != self.schedule.file_signature:
+                self.schedule.replace(_load_json_list(self.path))
+                self.schedule.file_signature = signature
+        return self.schedule
+
+    def _write(self, entries: list[dict[str, Any]]) -> None:
+        _atomic_write_json(self.path, list(entries))
+        self.schedule.file_signature = _file_signature(self.path)
 
     def load(self) -> list[dict[str, Any]]:
         with self._lock:
-            return _load_json_list(self.path)
+            return self._sync().entries()
 
     def save(self, entries: list[dict[str, Any]]) -> None:
         with self._lock:
-            _atomic_write_json(self.path, list(entries))
+            self._write(entries)
+            self.schedule.replace(list(entries))
 
     def add(self, *, message: str, fire_at_utc: str) -> dict[str, Any]:
         entry = {
@@ -121,45 +283,51 @@ class ReminderStore:
             "message": str(message or "").strip(),
             "fired": False,
         }
-        entries = self.load()
-        entries.append(entry)
-        self.save(entries)
+        with self._lock:
+            entries = self._sync().entries()
+            entries.append(entry)
+            self._write(entries)
+            self.schedule.append(entry)
         return entry
 
     def due_entries(self, *, now_utc: dt.datetime | None = None) -> list[dict[str, Any]]:
         current = (now_utc or dt.datetime.now(dt.timezone.utc)).astimezone(dt.timezone.utc)
-        due: list[dict[str, Any]] = []
-        for entry in self.load():
-            if bool(entry.get("fired")):
-                continue
-            raw_fire_at = str(entry.get("fire_at") or "").strip()
-            if not raw_fire_at:
-                continue
-            try:
-                fire_at = dt.datetime.fromisoformat(raw_fire_at.replace("Z", "+00:00")).astimezone(dt.timezone.utc)
-            except Exception:
-                continue
-            if fire_at <= current:
-                due.append(entry)
-        due.sort(key=lambda item: str(item.get("fire_at") or ""))
-        return due
+        return self._sync().due(current.timestamp())
+
+    def next_fire_ts(self) -> float | None:
+        return self._sync().next_fire_ts()
 
     def mark_fired(self, reminder_id: str) -> bool:
         clean_id = str(reminder_id or "").strip()
         if not clean_id:
             return False
-        entries = self.load()
-        changed = False
-        for entry in entries:
-            if str(entry.get("id") or "").strip() != clean_id:
-                continue
-            if not bool(entry.get("fired")):
-                entry["fired"] = True
-                changed = True
-            break
-        if changed:
-            self.save(entries)
-        return changed
+        with self._lock:
+            schedule = self._sync()
+            if not schedule.mark_fired(clean_id):
+                return False
+            self._write(schedule.entries())
+            if schedule.fired_count() >= self.compact_after:
+                self.compact()
+        return True
+
+    def compact(self, *, keep_fired: int | None = None) -> int:
+        """Move older fired entries into the archive file; returns how many moved."""
+        keep = self.keep_fired if keep_fired is None else max(0, int(keep_fired))
+        with self._lock:
+            entries = self._sync().entries()
+            fired_positions = [index for index, entry in enumerate(entries) if bool(entry.get("fired"))]
+            archived_positions = set(fired_positions[: max(0, len(fired_positions) - keep)])
+            if not archived_positions:
+                return 0
+            archived = [entry for index, entry in enumerate(entries) if index in archived_positions]
+            kept = [entry for index, entry in enumerate(entries) if index not in archived_positions]
+            _atomic_write_json(self.archive_path, _load_json_list(self.archive_path) + archived)
+            self._write(kept)
+            self.schedule.replace(kept)
+            return len(archived)
+
+    def load_archive(self) -> list[dict[str, Any]]:
+        return _load_json_list(self.archive_path)
 
 
 def _strip_reminder_prefix(text: str) -> str:
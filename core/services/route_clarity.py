@@ -12,6 +12,7 @@ from core.route_boundary import RouteClarifierBoundary
 from core.runtime_context import extract_latest_runtime_context_fields
 from core.routing.route_patterns import COMPLETION_HINT_RE
 from core.routing.route_dates import resolve_date_phrase
+from llm.llm_server_client import llm_role
 
 _RETRY_HINT_RE = re.compile(
     r"(?i)^\s*(?:"
@@ -148,12 +149,13 @@ class RouteClarifier:
             user_msg=user_msg,
             recent_history=recent_history or [],
         )
-        raw = llm.generate(
-            messages,
-            temperature=0.0,
-            max_tokens=int(getattr(CFG, "ROUTE_CLARIFIER_MAX_TOKENS", 120)),
-            cancel_token=cancel_token,
-        )
+        with llm_role("clarifier"):
+            raw = llm.generate(
+                messages,
+                temperature=0.0,
+                max_tokens=int(getattr(CFG, "ROUTE_CLARIFIER_MAX_TOKENS", 120)),
+                cancel_token=cancel_token,
+            )
         parsed = RouteClarifierBoundary.validate(raw)
         return self._build_route_from_resolution(parsed, user_msg=user_msg)
 
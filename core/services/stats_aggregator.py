@@ -0,0 +1,473 @@
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import tempfile
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any, Iterable
+
+from memory.storage import ensure_parent
+
+
+_LOG = logging.getLogger(__name__)
+
+PHASE_FIELDS = ("route", "manager", "reporter", "persona", "tts", "total", "planner_total", "executor_total")
+DERIVED_FIELDS = ("persona_tokens_per_s", "persona_chunks_per_s", "tts_first_audio_ms")
+QUANTILES = (50, 95, 99)
+_CHECKPOINT_VERSION = 1
+
+
+def phase_bucket(record: dict[str, Any]) -> dict[str, Any]:
+    bucket = dict(record.get("phase_ms") or {})
+    bucket["planner_total"] = record.get("planner_total_ms", 0.0)
+    bucket["executor_total"] = record.get("executor_total_ms", 0.0)
+    bucket["stage_count"] = len(record.get("stages") or [])
+    return bucket
+
+
+def _float_or_none(value: Any) -> float | None:
+    try:
+        return float(value)
+    except Exception:
+        return None
+
+
+def _per_second(count: float | None, duration_ms: float) -> float | None:
+    if not count or not duration_ms or duration_ms <= 0.0:
+        return None
+    return round(count / (duration_ms / 1000.0), 3)
+
+
+class QuantileSketch:
+    """Log-bucketed quantile sketch with bounded relative error.
+
+    Values are counted in buckets whose bounds grow by `gamma`, so any
+    quantile is reported within `relative_accuracy` of a true sample value.
+    Buckets are plain counters, which makes the sketch mergeable, JSON
+    serializable and able to forget values again (needed for a rolling
+    window). Values at or below `min_value` share one zero bucket.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, *, min_value: float = 1e-6) -> None:
+        self.relative_accuracy = min(0.5, max(1e-4, float(relative_accuracy)))
+        self.gamma = (1.0 + self.relative_accuracy) / (1.0 - self.relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.min_value = float(min_value)
+        self.buckets: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+
+    def _index(self, value: float) -> int:
+        return int(math.ceil(math.log(value) / self._log_gamma))
+
+    def add(self, value: float, weight: int = 1) -> None:
+        value = float(value)
+        if value <= self.min_value:
+            self.zero_count += weight
+        else:
+            index = self._index(value)
+            self.buckets[index] = self.buckets.get(index, 0) + weight
+        self.count += weight
+        self.total += value * weight
+
+    def remove(self, value: float) -> None:
+        value = float(value)
+        if value <= self.min_value:
+            if self.zero_count <= 0:
+                return
+            self.zero_count -= 1
+        else:
+            index = self._index(value)
+            remaining = self.buckets.get(index, 0) - 1
+            if remaining < 0:
+                return
+            if remaining:
+                self.buckets[index] = remaining
+            else:
+                self.buckets.pop(index, None)
+        self.count -= 1
+        self.total -= value
+        if self.count <= 0:
+            self.count = 0
+            self.total = 0.0
+
+    def merge(self, other: "QuantileSketch") -> None:
+        for index, weight in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + weight
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, percentile: float) -> float:
+        if self.count <= 0:
+            return 0.0
+        rank = (self.count - 1) * max(0.0, min(100.0, float(percentile))) / 100.0
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                return 2.0 * self.gamma ** index / (self.gamma + 1.0)
+        return 2.0 * self.gamma ** max(self.buckets) / (self.gamma + 1.0)
+
+    def summary(self) -> dict[str, float]:
+        result = {"count": int(self.count), "mean": round(self.mean(), 3)}
+        for percentile in QUANTILES:
+            result[f"p{percentile}"] = round(self.quantile(percentile), 3)
+        return result
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "min_value": self.min_value,
+            "buckets": {str(index): weight for index, weight in self.buckets.items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "total": self.total,
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> "QuantileSketch":
+        sketch = cls(
+            float(payload.get("relative_accuracy") or 0.01),
+            min_value=float(payload.get("min_value") or 1e-6),
+        )
+        sketch.buckets = {int(index): int(weight) for index, weight in dict(payload.get("buckets") or {}).items()}
+        sketch.zero_count = int(payload.get("zero_count") or 0)
+        sketch.count = int(payload.get("count") or 0)
+        sketch.total = float(payload.get("total") or 0.0)
+        return sketch
+
+
+def compact_record(record: dict[str, Any]) -> dict[str, Any]:
+    """The slice of a stats record the dashboard, report and alerts need."""
+    bucket = phase_bucket(record)
+    values: dict[str, float | None] = {field: _float_or_none(bucket.get(field)) for field in PHASE_FIELDS}
+    persona_ms = values.get("persona") or 0.0
+    tokens = _float_or_none((record.get("llm_tokens") or {}).get("persona"))
+    chunks = _float_or_none(record.get("persona_chunks"))
+    values["persona_tokens_per_s"] = _per_second(tokens, persona_ms)
+    values["persona_chunks_per_s"] = _per_second(chunks, persona_ms)
+    first_audio = _float_or_none(record.get("tts_first_audio_ms"))
+    values["tts_first_audio_ms"] = first_audio if first_audio and first_audio > 0.0 else None
+    return {
+        "turn_id": str(record.get("turn_id") or ""),
+        "timestamp": str(record.get("timestamp") or ""),
+        "decision": str(record.get("decision") or "CHAT"),
+        "outcome": str(record.get("outcome") or ""),
+        "model": str(record.get("model") or ""),
+        "pre_llm_bypass": str(record.get("pre_llm_bypass") or "").strip(),
+        "router_reroute_fired": bool(record.get("router_reroute_fired")),
+        "values": values,
+    }
+
+
+class StatsAggregator:
+    """Rolling in-memory view of the last `window` stats records.
+
+    Keeps quantile sketches per (scope, group, field) for scope in
+    all/route/model, updated on every record and decremented when a record
+    leaves the window, so dashboard reads never re-parse stats.jsonl. A
+    checkpoint next to the JSONL file lets a restart resume from the last
+    consumed byte offset instead of replaying the file.
+    """
+
+    def __init__(
+        self,
+        stats_path: Path,
+        *,
+        window: int = 500,
+        checkpoint_every: int = 25,
+        relative_accuracy: float = 0.01,
+    ) -> None:
+        self.stats_path = Path(stats_path)
+        self.checkpoint_path = self.stats_path.with_name(f"{self.stats_path.stem}.checkpoint.json")
+        self.window = max(1, int(window))
+        self.checkpoint_every = max(1, int(checkpoint_every))
+        self.relative_accuracy = float(relative_accuracy)
+        self.lock = threading.RLock()
+        self.version = 0
+        self._entries: deque[dict[str, Any]] = deque()
+        self._raw_lines: deque[str | None] = deque()
+        self._sketches: dict[tuple[str, str, str], QuantileSketch] = {}
+        self._offset = 0
+        self._signature: tuple[int, int] | None = None
+        self._since_checkpoint = 0
+        self._loaded = False
+
+    # -- sketch bookkeeping -------------------------------------------------
+
+    def _groups(self, entry: dict[str, Any]) -> Iterable[tuple[str, str]]:
+        yield ("all", "")
+        yield ("route", entry["decision"])
+        if entry["model"]:
+            yield ("model", entry["model"])
+
+    def _apply(self, entry: dict[str, Any], *, remove: bool = False) -> None:
+        for scope, group in self._groups(entry):
+            for field, value in entry["values"].items():
+                if value is None:
+                    continue
+                key = (scope, group, field)
+                sketch = self._sketches.get(key)
+                if sketch is None:
+                    if remove:
+                        continue
+                    sketch = QuantileSketch(self.relative_accuracy)
+                    self._sketches[key] = sketch
+                if remove:
+                    sketch.remove(value)
+                    if sketch.count == 0:
+                        self._sketches.pop(key, None)
+                else:
+                    sketch.add(value)
+
+    def _push(self, record: dict[str, Any], raw_line: str | None) -> None:
+        entry = compact_record(record)
+        self._entries.append(entry)
+        self._raw_lines.append(raw_line)
+        self._apply(entry)
+        while len(self._entries) > self.window:
+            self._apply(self._entries.popleft(), remove=True)
+            self._raw_lines.popleft()
+        self.version += 1
+
+    def _reset(self) -> None:
+        self._entries.clear()
+        self._raw_lines.clear()
+        self._sketches.clear()
+        self._offset = 0
+        self.version += 1
+
+    # -- file sync ----------------------------------------------------------
+
+    def _file_signature(self) -> tuple[int, int] | None:
+        try:
+            stat = self.stats_path.stat()
+        except OSError:
+            return None
+        return (stat.st_size, stat.st_mtime_ns)
+
+    def _consume_from(self, offset: int) -> None:
+        with self.stats_path.open("rb") as handle:
+            handle.seek(offset)
+            data = handle.read()
+        complete = data.rfind(b"\n") + 1
+        for raw in data[:complete].splitlines():
+            line = raw.decode("utf-8", errors="replace")
+            try:
+                payload = json.loads(line)
+            except Exception:
+                continue
+            if isinstance(payload, dict):
+                self._push(payload, line)
+        self._offset = offset + complete
+
+    def _rebuild(self) -> None:
+        self._reset()
+        if self.stats_path.exists():
+            self._consume_from(0)
+        self._signature = self._file_signature()
+
+    def sync(self) -> None:
+        """Bring the view up to date with stats.jsonl (cheap when unchanged)."""
+        with self.lock:
+            if not self._loaded:
+                self._loaded = True
+                if not self._restore_checkpoint():
+                    self._rebuild()
+                return
+            signature = self._file_signature()
+            if signature == self._signature:
+                return
+            if signature is None:
+                self._reset()
+            elif signature[0] > self._offset and self._tail_matches():
+                # Appended by another writer: consume only the new bytes.
+                self._consume_from(self._offset)
+            else:
+                self._rebuild()
+            self._signature = self._file_signature()
+
+    def _tail_matches(self) -> bool:
+        last = self._raw_lines[-1] if self._raw_lines else None
+        if last is None:
+            return self._offset == 0
+        encoded = (last + "\n").encode("utf-8")
+        if self._offset < len(encoded):
+            return False
+        try:
+            with self.stats_path.open("rb") as handle:
+                handle.seek(self._offset - len(encoded))
+                return handle.read(len(encoded)) == encoded
+        except OSError:
+            return False
+
+    def note_appended(self, record: dict[str, Any], line: str) -> bool:
+        """Account for a record this process just appended to stats.jsonl.
+
+        Returns True when the window overflowed, i.e. the file now holds more
+        lines than the window and should be trimmed.
+        """
+        with self.lock:
+            overflowed = len(self._entries) >= self.window
+            self._push(record, line)
+            self._offset += len((line + "\n").encode("utf-8"))
+            self._signature = self._file_signature()
+            self._since_checkpoint += 1
+            if self._since_checkpoint >= self.checkpoint_every:
+                self.write_checkpoint()
+            return overflowed
+
+    def rewrite_window(self) -> bool:
+        """Trim stats.jsonl to the in-memory window without re-reading it."""
+        with self.lock:
+            if any(line is None for line in self._raw_lines):
+                return False
+            text = "".join(f"{line}\n" for line in self._raw_lines)
+            ensure_parent(self.stats_path)
+            fd, tmp_name = tempfile.mkstemp(
+                prefix=f".{self.stats_path.name}.",
+                suffix=".tmp",
+                dir=str(self.stats_path.parent),
+                text=True,
+            )
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8", newline="\n") as handle:
+                    handle.write(text)
+                os.replace(tmp_name, self.stats_path)
+            except Exception:
+                try:
+                    os.unlink(tmp_name)
+                except Exception:
+                    pass
+                return False
+            self._offset = len(text.encode("utf-8"))
+            self._signature = self._file_signature()
+            return True
+
+    def adopt_file_lines(self) -> None:
+        """Re-align raw lines after an external prune (fills checkpoint gaps)."""
+        with self.lock:
+            try:
+                lines = self.stats_path.read_text(encoding="utf-8").splitlines()
+            except Exception:
+                return
+            if len(lines) == len(self._raw_lines):
+                self._raw_lines = deque(lines)
+                self._offset = sum(len((line + "\n").encode("utf-8")) for line in lines)
+                self._signature = self._file_signature()
+            else:
+                self._rebuild()
+
+    # -- checkpoints --------------------------------------------------------
+
+    def write_checkpoint(self) -> None:
+        with self.lock:
+            payload = {
+                "version": _CHECKPOINT_VERSION,
+                "window": self.window,
+                "offset": self._offset,
+                "tail_line": next((line for line in reversed(self._raw_lines) if line is not None), None),
+                "entries": list(self._entries),
+                "sketches": [
+                    {"scope": scope, "group": group, "field": field, "sketch": sketch.to_dict()}
+                    for (scope, group, field), sketch in self._sketches.items()
+                ],
+            }
+            self._since_checkpoint = 0
+        try:
+            ensure_parent(self.checkpoint_path)
+            fd, tmp_name = tempfile.mkstemp(
+                prefix=f".{self.checkpoint_path.name}.",
+                suffix=".tmp",
+                dir=str(self.checkpoint_path.parent),
+                text=True,
+            )
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(payload, handle, ensure_ascii=False)
+            os.replace(tmp_name, self.checkpoint_path)
+        except Exception as exc:
+            _LOG.debug("stats checkpoint write failed: %s", exc)
+
+    def _restore_checkpoint(self) -> bool:
+        try:
+            payload = json.loads(self.checkpoint_path.read_text(encoding="utf-8"))
+        except Exception:
+            return False
+        if not isinstance(payload, dict) or payload.get("version") != _CHECKPOINT_VERSION:
+            return False
+        if int(payload.get("window") or 0) != self.window:
+            return False
+        offset = int(payload.get("offset") or 0)
+        tail_line = payload.get("tail_line")
+        signature = self._file_signature()
+        if signature is None or signature[0] < offset or not tail_line:
+            return False
+        encoded = (str(tail_line) + "\n").encode("utf-8")
+        try:
+            with self.stats_path.open("rb") as handle:
+                handle.seek(max(0, offset - len(encoded)))
+                if handle.read(len(encoded)) != encoded:
+                    return False
+        except OSError:
+            return False
+        try:
+            entries = [dict(item) for item in payload.get("entries") or []]
+            sketches = {
+                (str(item["scope"]), str(item["group"]), str(item["field"])): QuantileSketch.from_dict(item["sketch"])
+                for item in payload.get("sketches") or []
+            }
+        except Exception:
+            return False
+        self._entries = deque(entries)
+        self._raw_lines = deque([None] * len(entries))
+        if entries:
+            self._raw_lines[-1] = str(tail_line)
+        self._sketches = sketches
+        self._offset = offset
+        self.version += 1
+        if signature[0] > offset:
+            self._consume_from(offset)
+        self._signature = self._file_signature()
+        return True
+
+    # -- reads --------------------------------------------------------------
+
+    def entries(self, limit: int | None = None) -> list[dict[str, Any]]:
+        with self.lock:
+            if limit is None or limit >= len(self._entries):
+                return list(self._entries)
+            count = max(0, int(limit))
+            return list(self._entries)[-count:] if count else []
+
+    def field_values(self, field: str, *, limit: int | None = None) -> list[float]:
+        return [
+            value
+            for entry in self.entries(limit)
+            if (value := entry["values"].get(field)) is not None
+        ]
+
+    def sketch(self, field: str, *, scope: str = "all", group: str = "") -> QuantileSketch | None:
+        with self.lock:
+            return self._sketches.get((scope, group, field))
+
+    def percentile_table(self) -> dict[str, Any]:
+        """{scope: {group: {field: {count, mean, p50, p95, p99}}}}."""
+        table: dict[str, Any] = {"all": {}, "route": {}, "model": {}}
+        with self.lock:
+            for (scope, group, field), sketch in sorted(self._sketches.items()):
+                if scope == "all":
+                    table["all"][field] = sketch.summary()
+                else:
+                    table[scope].setdefault(group, {})[field] = sketch.summary()
+        return table
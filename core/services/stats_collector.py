@@ -7,14 +7,17 @@ import time
 from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any, Callable, Iterable
 
-from memory.storage import append_jsonl, ensure_parent, prune_jsonl_tail
+from core import tracing
+from core.services.stats_aggregator import PHASE_FIELDS, StatsAggregator, phase_bucket as _phase_bucket
+from memory.storage import ensure_parent, prune_jsonl_tail
 
 
 _PENDING_SEARCH_ATTR = "_piper_pending_search_turn_stats"
 _PENDING_SEARCH_OWNER_ATTR = "_piper_pending_search_turn_stats_owner"
 _STARTUP_CHECKED_PATHS: set[str] = set()
+_AGGREGATORS: dict[tuple[str, int], StatsAggregator] = {}
 _LOG = logging.getLogger(__name__)
 
 
@@ -63,12 +66,14 @@ def _upper_control_bound(values: list[float]) -> float:
     return round(mean + (2.0 * stddev), 3)
 
 
-def _phase_bucket(record: dict[str, Any]) -> dict[str, Any]:
-    bucket = dict(record.get("phase_ms") or {})
-    bucket["planner_total"] = record.get("planner_total_ms", 0.0)
-    bucket["executor_total"] = record.get("executor_total_ms", 0.0)
-    bucket["stage_count"] = len(record.get("stages") or [])
-    return bucket
+def _default_model_name() -> str:
+    try:
+        from config import CFG
+
+        model_path = getattr(CFG, "MODEL_PATH", None)
+    except Exception:
+        return ""
+    return Path(str(model_path)).stem if model_path else ""
 
 
 @dataclass
@@ -104,6 +109,15 @@ class TurnStatsState:
     executor_total_ms: float = 0.0
     router_tokens: int | None = None
     persona_tokens: int | None = None
+    persona_chunks: int = 0
+    tts_underruns: int = 0
+    tts_gap_ms: float = 0.0
+    tts_cache_hits: int = 0
+    tts_cache_misses: int = 0
+    tts_cache_saved_ms: float = 0.0
+    tts_first_audio_ms: float | None = None
+    model: str = ""
+    trace: tracing.TurnTrace | None = field(default=None, repr=False, compare=False)
 
     def finalize(self) -> None:
         self.phase_ms["total"] = _duration_ms(self.started_at_monotonic)
@@ -115,6 +129,7 @@ class TurnStatsState:
             "timestamp": self.timestamp,
             "user_msg": self.user_msg,
             "decision": self.decision or "CHAT",
+            "model": self.model or "",
             "source_scope": self.source_scope or "",
             "confidence": self.confidence or "",
             "pre_llm_bypass": self.pre_llm_bypass or "",
@@ -132,6 +147,19 @@ class TurnStatsState:
                 "router": self.router_tokens,
                 "persona": self.persona_tokens,
             },
+            "persona_chunks": int(self.persona_chunks or 0),
+            "tts_playback": {
+                "underruns": int(self.tts_underruns or 0),
+                "gap_ms": round(float(self.tts_gap_ms or 0.0), 3),
+            },
+            "tts_first_audio_ms": (
+                round(float(self.tts_first_audio_ms), 3) if self.tts_first_audio_ms is not None else None
+            ),
+            "tts_cache": {
+                "hits": int(self.tts_cache_hits or 0),
+                "misses": int(self.tts_cache_misses or 0),
+                "saved_ms": round(float(self.tts_cache_saved_ms or 0.0), 3),
+            },
         }
 
 
@@ -144,12 +172,30 @@ class StatsCollector:
         rolling_window: int = 120,
         history_limit: int = 500,
         min_samples_for_alerts: int = 8,
+        checkpoint_every: int = 25,
+        model_name_fn: Callable[[], str] | None = None,
     ) -> None:
         self.stats_path = Path(stats_path)
         self.alerts_path = Path(alerts_path)
         self.rolling_window = max(10, int(rolling_window or 120))
         self.history_limit = max(20, int(history_limit or 500))
         self.min_samples_for_alerts = max(5, int(min_samples_for_alerts or 8))
+        self.checkpoint_every = max(1, int(checkpoint_every or 25))
+        self.model_name_fn = model_name_fn or _default_model_name
+        self._snapshot_cache: tuple[tuple, dict[str, Any]] | None = None
+        self._alerts_cache: tuple[tuple[int, int] | None, list[str]] = (None, [])
+
+    def aggregator(self) -> StatsAggregator:
+        """Shared rolling view of this stats file (one per path and window)."""
+        key = (str(self.stats_path.resolve()), self.history_limit)
+        aggregator = _AGGREGATORS.get(key)
+        if aggregator is None:
+            aggregator = _AGGREGATORS.setdefault(
+                key,
+                StatsAggregator(self.stats_path, window=self.history_limit, checkpoint_every=self.checkpoint_every),
+            )
+        aggregator.sync()
+        return aggregator
 
     def startup_check_once(self) -> None:
         key = str(self.stats_path.resolve())
@@ -176,8 +222,11 @@ class StatsCollector:
                 except Exception:
                     pass
             pending.record_deferred = False
+            tracing.activate(pending.trace)
             return pending
-        return TurnStatsState()
+        state = TurnStatsState()
+        state.trace = tracing.start_turn(state.turn_id)
+        return state
 
     def defer_search_turn(self, state: TurnStatsState, cancel_token: Any = None, *, fallback_owner: Any = None) -> None:
         state.record_deferred = True
@@ -198,6 +247,8 @@ class StatsCollector:
         key = str(phase_name or "").strip().lower()
         started_at = state.phase_started_at.pop(key, None)
         elapsed_ms = _duration_ms(started_at)
+        if state.trace is not None and started_at is not None:
+            tracing.complete(f"phase.{key}", started_at, cat="phase", trace=state.trace)
         if key in state.phase_ms:
             state.phase_ms[key] = round(float(state.phase_ms.get(key, 0.0) or 0.0) + elapsed_ms, 3)
         return elapsed_ms
@@ -281,10 +332,27 @@ class StatsCollector:
         if state is None or not metrics:
             return
         total = 0.0
+        underruns = 0
+        gap_ms = 0.0
+        chunks = 0
         for metric in metrics:
             total += float(metric.get("tts_ms") or 0.0)
+            underruns += int(metric.get("tts_underruns") or 0)
+            gap_ms += float(metric.get("tts_gap_ms") or 0.0)
+            state.tts_cache_hits += int(metric.get("tts_cache_hits") or 0)
+            state.tts_cache_misses += int(metric.get("tts_cache_misses") or 0)
+            state.tts_cache_saved_ms = round(state.tts_cache_saved_ms + float(metric.get("tts_cache_saved_ms") or 0.0), 3)
+            chunks += int(metric.get("stream_chunks") or 0)
+            first_audio = _safe_float(metric.get("tts_first_audio_ms"))
+            if state.tts_first_audio_ms is None and first_audio is not None and first_audio > 0.0:
+                state.tts_first_audio_ms = round(first_audio, 3)
         if total > 0.0:
             state.phase_ms["tts"] = round(float(state.phase_ms.get("tts", 0.0) or 0.0) + total, 3)
+        state.tts_underruns = int(state.tts_underruns or 0) + underruns
+        state.tts_gap_ms = round(float(state.tts_gap_ms or 0.0) + gap_ms, 3)
+        # Streamed deltas are server-sent chunks, not tokens: a chunk can carry
+        # several tokens, so they are kept apart from persona_tokens.
+        state.persona_chunks = int(state.persona_chunks or 0) + chunks
 
     def add_stage(
         self,
@@ -352,10 +420,29 @@ class StatsCollector:
         if state is None or state.record_deferred:
             return None
         self.finalize_outcome(state, outcome=outcome, detail=detail)
+        if not state.model:
+            try:
+                state.model = str(self.model_name_fn() or "")
+            except Exception:
+                state.model = ""
         record = state.to_record()
-        append_jsonl(self.stats_path, record)
-        if prune_jsonl_tail(self.stats_path, max_lines=self.history_limit):
-            _LOG.debug("stats.jsonl pruned to %d lines", self.history_limit)
+        line = json.dumps(record, ensure_ascii=False)
+        aggregator = self.aggregator()
+        with aggregator.lock:
+            ensure_parent(self.stats_path)
+            with self.stats_path.open("a", encoding="utf-8", newline="\n") as handle:
+                handle.write(line + "\n")
+            if aggregator.note_appended(record, line):
+                # Trim from the in-memory window; fall back to re-reading the
+                # file only when lines restored from a checkpoint are unknown.
+                if aggregator.rewrite_window():
+                    _LOG.debug("stats.jsonl pruned to %d lines", self.history_limit)
+                elif prune_jsonl_tail(self.stats_path, max_lines=self.history_limit):
+                    aggregator.adopt_file_lines()
+                    _LOG.debug("stats.jsonl pruned to %d lines", self.history_limit)
+        if state.trace is not None:
+            tracing.finish_turn(state.trace, decision=record["decision"], outcome=record["outcome"])
+            state.trace = None
         self._check_latest_record(reason="turn")
         return record
 
@@ -391,29 +478,36 @@ class StatsCollector:
         return records
 
     def load_alert_lines(self, *, limit: int = 12) -> list[str]:
-        if not self.alerts_path.exists():
-            return []
         try:
-            lines = [line.rstrip() for line in self.alerts_path.read_text(encoding="utf-8").splitlines() if line.strip()]
-        except Exception:
+            stat = self.alerts_path.stat()
+        except OSError:
             return []
-        return lines[-max(1, int(limit or 12)) :]
+        signature = (stat.st_size, stat.st_mtime_ns)
+        cached_signature, cached_lines = self._alerts_cache
+        if cached_signature != signature:
+            try:
+                cached_lines = [
+                    line.rstrip() for line in self.alerts_path.read_text(encoding="utf-8").splitlines() if line.strip()
+                ]
+            except Exception:
+                return []
+            self._alerts_cache = (signature, cached_lines)
+        return cached_lines[-max(1, int(limit or 12)) :]
 
     def build_readonly_report(self, *, limit: int | None = None, alert_limit: int = 10) -> str:
-        records = self.load_records(limit=limit or self.history_limit)
+        aggregator = self.aggregator()
         alerts = self.load_alert_lines(limit=alert_limit)
-        return self._build_readonly_report_from_records(records, alerts)
+        return self._build_readonly_report(aggregator, limit, alerts)
 
-    def _recent_turns(self, records: list[dict[str, Any]], limit: int = 12) -> list[dict[str, Any]]:
+    def _recent_turns(self, entries: list[dict[str, Any]], limit: int = 12) -> list[dict[str, Any]]:
         turns: list[dict[str, Any]] = []
-        for record in records[-max(1, int(limit)) :]:
-            phase_ms = dict(record.get("phase_ms") or {})
+        for entry in entries[-max(1, int(limit)) :]:
             turns.append(
                 {
-                    "timestamp": str(record.get("timestamp") or ""),
-                    "decision": str(record.get("decision") or "CHAT"),
-                    "outcome": str(record.get("outcome") or ""),
-                    "total_ms": round(float(phase_ms.get("total") or 0.0), 3),
+                    "timestamp": entry["timestamp"],
+                    "decision": entry["decision"],
+                    "outcome": entry["outcome"],
+                    "total_ms": round(float(entry["values"].get("total") or 0.0), 3),
                 }
             )
         return turns
@@ -425,11 +519,31 @@ class StatsCollector:
         alert_limit: int = 10,
         graph_limit: int = 60,
     ) -> dict[str, Any]:
-        records = self.load_records(limit=limit or self.history_limit)
+        """Dashboard payload from the rolling aggregator.
+
+        Reuses the previous snapshot until a record lands or the alerts file
+        changes, so periodic refreshes cost a couple of stat() calls.
+        """
+        aggregator = self.aggregator()
         alerts = self.load_alert_lines(limit=alert_limit)
-        summary_text = self._build_readonly_report_from_records(records, alerts)
-        recent_turns = self._recent_turns(records, limit=graph_limit)
-        if not records:
+        cache_key = (id(aggregator), aggregator.version, limit, alert_limit, graph_limit, self._alerts_cache[0])
+        if self._snapshot_cache is not None and self._snapshot_cache[0] == cache_key:
+            return dict(self._snapshot_cache[1])
+        snapshot = self._build_dashboard_snapshot(aggregator, limit, alerts, graph_limit)
+        self._snapshot_cache = (cache_key, snapshot)
+        return dict(snapshot)
+
+    def _build_dashboard_snapshot(
+        self,
+        aggregator: StatsAggregator,
+        limit: int | None,
+        alerts: list[str],
+        graph_limit: int,
+    ) -> dict[str, Any]:
+        entries = aggregator.entries(limit or self.history_limit)
+        summary_text = self._build_readonly_report(aggregator, limit, alerts)
+        recent_turns = self._recent_turns(entries, limit=graph_limit)
+        if not entries:
             return {
                 "summary_text": summary_text,
                 "alerts": alerts,
@@ -449,21 +563,22 @@ class StatsCollector:
                 "planner_total_ms": [],
                 "executor_total_ms": [],
                 "recent_turns": [],
+                "percentiles": aggregator.percentile_table(),
             }
 
-        recent_records = records[-max(12, int(graph_limit or 60)) :]
-        turn_numbers = [float(index + 1) for index in range(len(recent_records))]
-        total_values = [self._record_field_value(record, "total") for record in recent_records]
+        recent_entries = entries[-max(12, int(graph_limit or 60)) :]
+        turn_numbers = [float(index + 1) for index in range(len(recent_entries))]
+        total_values = [self._entry_field_value(entry, "total") for entry in recent_entries]
         total_upper = _upper_control_bound(total_values)
         return {
             "summary_text": summary_text,
             "alerts": alerts,
-            "record_count": len(records),
-            "graph_window_count": len(recent_records),
+            "record_count": len(entries),
+            "graph_window_count": len(recent_entries),
             "turn_numbers": turn_numbers,
-            "turn_labels": [self._short_turn_label(record) for record in recent_records],
+            "turn_labels": [self._short_turn_label(entry) for entry in recent_entries],
             "total_ms": total_values,
-            "total_upper_ms": [total_upper for _ in recent_records],
+            "total_upper_ms": [total_upper for _ in recent_entries],
             "total_outlier_x": [
                 turn_numbers[index]
                 for index, value in enumerate(total_values)
@@ -474,16 +589,85 @@ class StatsCollector:
                 for value in total_values
                 if total_upper > 0.0 and float(value or 0.0) > total_upper
             ],
-            "route_ms": [self._record_field_value(record, "route") for record in recent_records],
-            "manager_ms": [self._record_field_value(record, "manager") for record in recent_records],
-            "reporter_ms": [self._record_field_value(record, "reporter") for record in recent_records],
-            "persona_ms": [self._record_field_value(record, "persona") for record in recent_records],
-            "tts_ms": [self._record_field_value(record, "tts") for record in recent_records],
-            "planner_total_ms": [self._record_field_value(record, "planner_total") for record in recent_records],
-            "executor_total_ms": [self._record_field_value(record, "executor_total") for record in recent_records],
+            "route_ms": [self._entry_field_value(entry, "route") for entry in recent_entries],
+            "manager_ms": [self._entry_field_value(entry, "manager") for entry in recent_entries],
+            "reporter_ms": [self._entry_field_value(entry, "reporter") for entry in recent_entries],
+            "persona_ms": [self._entry_field_value(entry, "persona") for entry in recent_entries],
+            "tts_ms": [self._entry_field_value(entry, "tts") for entry in recent_entries],
+            "planner_total_ms": [self._entry_field_value(entry, "planner_total") for entry in recent_entries],
+            "executor_total_ms": [self._entry_field_value(entry, "executor_total") for entry in recent_entries],
             "recent_turns": recent_turns,
+            "percentiles": aggregator.percentile_table(),
         }
 
+    def _build_readonly_report(self, aggregator: StatsAggregator, limit: int | None, alerts: list[str]) -> str:
+        if limit and int(limit) < aggregator.window:
+            return self._build_readonly_report_from_records(
+                self.load_records(limit=limit),
+                alerts,
+            )
+        entries = aggregator.entries()
+        if not entries:
+            return "No stats recorded yet."
+        lines: list[str] = []
+        if alerts:
+            lines.append("Alerts")
+            lines.extend(f"- {line}" for line in alerts)
+            lines.append("")
+
+        lines.append("Phase Latency")
+        for field in PHASE_FIELDS:
+            sketch = aggregator.sketch(field)
+            if sketch is None or not sketch.count:
+                continue
+            lines.append(
+                f"- {field}: avg {round(sketch.mean(), 3)} ms | p95 {round(sketch.quantile(95), 3)} ms"
+            )
+
+        route_lines: list[str] = []
+        table = aggregator.percentile_table()
+        for scope in ("route", "model"):
+            for group, fields in table[scope].items():
+                total = fields.get("total")
+                if not total:
+                    continue
+                route_lines.append(
+                    f"- {scope} {group}: total p50 {total['p50']} | p95 {total['p95']} | "
+                    f"p99 {total['p99']} ms (n={total['count']})"
+                )
+        throughput = table["all"].get("persona_tokens_per_s")
+        if throughput:
+            route_lines.append(
+                f"- persona throughput: p50 {throughput['p50']} | p95 {throughput['p95']} | "
+                f"p99 {throughput['p99']} tok/s (mean {throughput['mean']})"
+            )
+        chunk_rate = table["all"].get("persona_chunks_per_s")
+        if chunk_rate:
+            route_lines.append(
+                f"- persona stream: p50 {chunk_rate['p50']} | p95 {chunk_rate['p95']} | "
+                f"p99 {chunk_rate['p99']} chunks/s (mean {chunk_rate['mean']})"
+            )
+        first_audio = table["all"].get("tts_first_audio_ms")
+        if first_audio:
+            route_lines.append(
+                f"- tts first audio: p50 {first_audio['p50']} | p95 {first_audio['p95']} | p99 {first_audio['p99']} ms"
+            )
+        if route_lines:
+            lines.append("")
+            lines.append("Percentiles")
+            lines.extend(route_lines)
+
+        lines.append("")
+        lines.append("Recent Turns")
+        for entry in entries[-12:]:
+            timestamp = entry["timestamp"].replace("T", " ")[:23]
+            total_ms = round(float(entry["values"].get("total") or 0.0), 3)
+            bypass = entry["pre_llm_bypass"]
+            reroute = " reroute" if entry["router_reroute_fired"] else ""
+            suffix = f" | bypass={bypass}" if bypass else ""
+            lines.append(f"- {timestamp} | {entry['decision']} | {entry['outcome']} | total {total_ms} ms{reroute}{suffix}")
+        return "\n".join(lines).strip()
+
     def _build_readonly_report_from_records(self, records: list[dict[str, Any]], alerts: list[str]) -> str:
         if not records:
             return "No stats recorded yet."
@@ -494,7 +678,7 @@ class StatsCollector:
             lines.append("")
 
         lines.append("Phase Latency")
-        for field in ("route", "manager", "reporter", "persona", "tts", "total", "planner_total", "executor_total"):
+        for field in PHASE_FIELDS:
             values = self._field_values(records, field)
             if not values:
                 continue
@@ -519,6 +703,9 @@ class StatsCollector:
     def _record_field_value(self, record: dict[str, Any], field: str) -> float:
         return round(float(_phase_bucket(record).get(field) or 0.0), 3)
 
+    def _entry_field_value(self, entry: dict[str, Any], field: str) -> float:
+        return round(float(entry["values"].get(field) or 0.0), 3)
+
     def _short_turn_label(self, record: dict[str, Any]) -> str:
         timestamp = str(record.get("timestamp") or "").replace("T", " ")
         if len(timestamp) >= 19:
@@ -549,16 +736,16 @@ class StatsCollector:
         return "VERIFIED"
 
     def _check_latest_record(self, *, reason: str) -> None:
-        records = self.load_records(limit=self.rolling_window + 1)
-        if len(records) < self.min_samples_for_alerts + 1:
+        entries = self.aggregator().entries(self.rolling_window + 1)
+        if len(entries) < self.min_samples_for_alerts + 1:
             return
-        current = records[-1]
-        history = records[:-1]
-        for field in ("route", "manager", "reporter", "persona", "tts", "total", "planner_total", "executor_total"):
-            previous_values = self._field_values(history, field)
+        current = entries[-1]
+        history = entries[:-1]
+        for field in PHASE_FIELDS:
+            previous_values = [value for entry in history if (value := entry["values"].get(field)) is not None]
             if len(previous_values) < self.min_samples_for_alerts:
                 continue
-            current_value = _safe_float(_phase_bucket(current).get(field))
+            current_value = current["values"].get(field)
             if current_value is None:
                 continue
             mean = sum(previous_values) / len(previous_values)
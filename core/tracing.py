@@ -0,0 +1,344 @@
+"""core/tracing.py
+
+In-process span tracing for sampled turns, exported as Chrome trace-event
+JSON (open the files in Perfetto or chrome://tracing).
+
+A turn trace is started by the stats collector and carried in a context
+variable, so `span()` calls anywhere below the orchestrator attach to it
+without threading a handle through every signature. Worker threads do not
+inherit context variables; submit their callables through `wrap()` (or pass
+`trace=` explicitly) when their work should show up in the turn. Consumers
+that run on the UI thread (stream pipeline, TTS) use `active_turn()`.
+
+Closing a turn records the root span but keeps the trace open for
+TRACE_TAIL_S seconds so speech that is still being synthesized lands in the
+same file; the next turn flushes it early.
+
+When tracing is disabled or the turn was not sampled, `span()` returns a
+shared no-op object after one context-variable lookup.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import itertools
+import json
+import logging
+import os
+import random
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+_LOG = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+_CURRENT: contextvars.ContextVar["TurnTrace | None"] = contextvars.ContextVar("piper_turn_trace", default=None)
+_EPOCH = time.perf_counter()
+_PID = os.getpid()
+_SEQUENCE = itertools.count(1)
+_LATEST: "TurnTrace | None" = None
+_PENDING: dict[int, "TurnTrace"] = {}
+_PENDING_LOCK = threading.Lock()
+
+
+def _us(perf_s: float) -> float:
+    return round((perf_s - _EPOCH) * 1_000_000.0, 3)
+
+
+class TurnTrace:
+    """Trace events of one sampled turn."""
+
+    def __init__(self, turn_id: str, *, max_events: int = 20_000) -> None:
+        self.turn_id = str(turn_id or "")
+        self.started_at = time.perf_counter()
+        self.max_events = max(1, int(max_events))
+        self.events: list[dict[str, Any]] = []
+        self.thread_names: dict[int, str] = {}
+        self.dropped = 0
+        self.closed = False
+        self.finished = False
+
+    def emit(self, event: dict[str, Any]) -> None:
+        if self.finished:
+            return
+        if len(self.events) >= self.max_events:
+            self.dropped += 1
+            return
+        tid = threading.get_native_id()
+        if tid not in self.thread_names:
+            self.thread_names[tid] = threading.current_thread().name
+        event["pid"] = _PID
+        event["tid"] = tid
+        self.events.append(event)
+
+    def to_chrome(self) -> dict[str, Any]:
+        metadata = [
+            {"ph": "M", "name": "process_name", "pid": _PID, "tid": 0, "args": {"name": "piper"}},
+        ]
+        metadata.extend(
+            {"ph": "M", "name": "thread_name", "pid": _PID, "tid": tid, "args": {"name": name}}
+            for tid, name in self.thread_names.items()
+        )
+        return {
+            "traceEvents": metadata + self.events,
+            "displayTimeUnit": "ms",
+            "otherData": {"turn_id": self.turn_id, "dropped_events": self.dropped},
+        }
+
+
+class Span:
+    __slots__ = ("trace", "name", "cat", "args", "started_at")
+
+    def __init__(self, trace: TurnTrace, name: str, cat: str, args: dict[str, Any]) -> None:
+        self.trace = trace
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.started_at = time.perf_counter()
+
+    def __enter__(self) -> "Span":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.end()
+
+    def set(self, **args: Any) -> None:
+        self.args.update(args)
+
+    def end(self, **args: Any) -> None:
+        if args:
+            self.args.update(args)
+        ended_at = time.perf_counter()
+        event: dict[str, Any] = {
+            "ph": "X",
+            "name": self.name,
+            "cat": self.cat,
+            "ts": _us(self.started_at),
+            "dur": round((ended_at - self.started_at) * 1_000_000.0, 3),
+        }
+        if self.args:
+            event["args"] = self.args
+        self.trace.emit(event)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    def set(self, **args: Any) -> None:
+        return None
+
+    def end(self, **args: Any) -> None:
+        return None
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+# -- recording -------------------------------------------------------------
+
+
+def current_trace() -> TurnTrace | None:
+    return _CURRENT.get()
+
+
+def active_turn() -> TurnTrace | None:
+    """The most recently started trace that still accepts events, if any."""
+    trace = _LATEST
+    return None if trace is None or trace.finished else trace
+
+
+def activate(trace: TurnTrace | None) -> None:
+    """Make `trace` the current trace of this context (resumed deferred turns)."""
+    _CURRENT.set(trace)
+
+
+def span(name: str, *, cat: str = "turn", trace: TurnTrace | None = None, **args: Any) -> Span | _NoopSpan:
+    target = trace if trace is not None else _CURRENT.get()
+    if target is None or target.finished:
+        return NOOP_SPAN
+    return Span(target, name, cat, args)
+
+
+def complete(
+    name: str,
+    started_at: float,
+    ended_at: float | None = None,
+    *,
+    cat: str = "turn",
+    trace: TurnTrace | None = None,
+    **args: Any,
+) -> None:
+    """Record a span after the fact from two `time.perf_counter()` readings."""
+    target = trace if trace is not None else _CURRENT.get()
+    if target is None or target.finished or started_at is None:
+        return
+    finish = time.perf_counter() if ended_at is None else ended_at
+    event: dict[str, Any] = {
+        "ph": "X",
+        "name": name,
+        "cat": cat,
+        "ts": _us(started_at),
+        "dur": round(max(0.0, finish - started_at) * 1_000_000.0, 3),
+    }
+    if args:
+        event["args"] = args
+    target.emit(event)
+
+
+def instant(name: str, *, cat: str = "turn", trace: TurnTrace | None = None, **args: Any) -> None:
+    target = trace if trace is not None else _CURRENT.get()
+    if target is None or target.finished:
+        return
+    event: dict[str, Any] = {"ph": "i", "s": "t", "name": name, "cat": cat, "ts": _us(time.perf_counter())}
+    if args:
+        event["args"] = args
+    target.emit(event)
+
+
+def wrap(fn: Callable[..., _T]) -> Callable[..., _T]:
+    """Bind `fn` to the caller's trace context for use on another thread."""
+    if _CURRENT.get() is None:
+        return fn
+    context = contextvars.copy_context()
+
+    def _run(*args: Any, **kwargs: Any) -> _T:
+        return context.run(fn, *args, **kwargs)
+
+    return _run
+
+
+# -- turn lifecycle ----------------------------------------------------------
+
+
+def _settings() -> dict[str, Any]:
+    try:
+        from config import CFG
+
+        return {
+            "enabled": bool(getattr(CFG, "TRACE_ENABLED", False)),
+            "sample_rate": float(getattr(CFG, "TRACE_SAMPLE_RATE", 1.0)),
+            "max_files": int(getattr(CFG, "TRACE_MAX_FILES", 50)),
+            "max_events": int(getattr(CFG, "TRACE_MAX_EVENTS", 20_000)),
+            "tail_s": float(getattr(CFG, "TRACE_TAIL_S", 15.0)),
+            "directory": Path(CFG.TRACE_DIR),
+        }
+    except Exception:
+        return {"enabled": False}
+
+
+def start_turn(turn_id: str, *, sample_rate: float | None = None) -> TurnTrace | None:
+    """Start (or skip, per sampling) the trace of a new turn in this context."""
+    global _LATEST
+    flush_pending()
+    settings = _settings()
+    rate = float(settings.get("sample_rate", 0.0)) if sample_rate is None else float(sample_rate)
+    if not settings.get("enabled") or rate <= 0.0 or (rate < 1.0 and random.random() >= rate):
+        _CURRENT.set(None)
+        return None
+    trace = TurnTrace(turn_id, max_events=settings.get("max_events") or 20_000)
+    _CURRENT.set(trace)
+    _LATEST = trace
+    return trace
+
+
+def finish_turn(trace: TurnTrace | None, **args: Any) -> None:
+    """Close the root turn span and schedule the export.
+
+    The trace keeps accepting late spans (TTS chunks still playing out) until
+    it is exported after TRACE_TAIL_S, or earlier when the next turn starts.
+    """
+    if trace is None or trace.closed:
+        return
+    complete("turn", trace.started_at, cat="turn", trace=trace, turn_id=trace.turn_id, **args)
+    trace.closed = True
+    if _CURRENT.get() is trace:
+        _CURRENT.set(None)
+    tail_s = float(_settings().get("tail_s", 0.0))
+    if tail_s <= 0.0:
+        export_trace(trace)
+        return
+    with _PENDING_LOCK:
+        _PENDING[id(trace)] = trace
+    timer = threading.Timer(tail_s, export_trace, args=(trace,))
+    timer.daemon = True
+    timer.start()
+
+
+def flush_pending() -> None:
+    """Export every closed trace still waiting out its tail."""
+    with _PENDING_LOCK:
+        pending = list(_PENDING.values())
+    for trace in pending:
+        export_trace(trace)
+
+
+def export_trace(trace: TurnTrace) -> Path | None:
+    with _PENDING_LOCK:
+        if trace.finished:
+            return None
+        trace.finished = True
+        _PENDING.pop(id(trace), None)
+    settings = _settings()
+    directory = settings.get("directory")
+    if directory is None:
+        return None
+    return exporter_for(directory, max_files=settings.get("max_files", 50)).export(trace)
+
+
+# -- export ----------------------------------------------------------------
+
+
+class ChromeTraceExporter:
+    """Writes one trace-event JSON file per turn and keeps the newest few."""
+
+    def __init__(self, directory: Path, *, max_files: int = 50) -> None:
+        self.directory = Path(directory)
+        self.max_files = max(1, int(max_files))
+        self._lock = threading.Lock()
+
+    def export(self, trace: TurnTrace) -> Path | None:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = self.directory / f"turn-{stamp}-{next(_SEQUENCE):05d}.trace.json"
+        try:
+            with self._lock:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_suffix(".tmp")
+                tmp_path.write_text(json.dumps(trace.to_chrome(), separators=(",", ":")), encoding="utf-8")
+                os.replace(tmp_path, path)
+                self._rotate()
+        except OSError as exc:
+            _LOG.warning("[Trace] Could not write %s: %s", path.name, exc)
+            return None
+        return path
+
+    def _rotate(self) -> None:
+        files = sorted(self.directory.glob("turn-*.trace.json"))
+        for stale in files[: max(0, len(files) - self.max_files)]:
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+
+
+_EXPORTERS: dict[str, ChromeTraceExporter] = {}
+
+
+def exporter_for(directory: Path, *, max_files: int = 50) -> ChromeTraceExporter:
+    key = str(Path(directory).resolve())
+    exporter = _EXPORTERS.get(key)
+    if exporter is None:
+        exporter = _EXPORTERS.setdefault(key, ChromeTraceExporter(Path(directory), max_files=max_files))
+    exporter.max_files = max(1, int(max_files))
+    return exporter
@@ -8,13 +8,13 @@ import os
 import re
 import subprocess
 import time
-import threading
 from collections.abc import Callable, Sequence
 import urllib.request
 import urllib.error
 from pathlib import Path
 from urllib.parse import urlparse
 from config import CFG, data_debug_path
+from llm.boot_graph import STAGE_INTERACTIVE, STAGE_WARM, BootGraph, BootTask, BootTimeline
 
 try:
     import psutil
@@ -22,7 +22,7 @@ except ImportError:
     psutil = None
 
 
-PostBootTask = tuple[str, Callable[[], object]]
+PostBootTask = tuple[str, Callable[[], object]] | BootTask
 _LOG = logging.getLogger(__name__)
 
 class BootManager:
@@ -40,6 +40,9 @@ class BootManager:
         self.post_boot_tasks = list(post_boot_tasks or [])
         self.background_boot_tasks = list(background_boot_tasks or [])
         self._server_log_handle = None
+        self._brain = None
+        self.warm = False
+        self.timeline: BootTimeline | None = None
 
     def pause_server(self):
         """Stops the LLM server to free VRAM."""
@@ -261,6 +264,7 @@ class BootManager:
         try:
             from memory.brain import get_brain
             brain = get_brain(CFG.DATA_DIR)
+            self._brain = brain
             if getattr(brain, "vector_ready", False):
                 self.log("Brain Model Loaded.")
             elif getattr(brain, "vector_warmup_pending", False):
@@ -274,51 +278,70 @@ class BootManager:
             self.brain_ready = False
             return False
 
-    def _run_post_boot_tasks(self) -> None:
-        for label, callback in self.post_boot_tasks:
-            self._run_named_task(label, callback)
+    def _brain_vectors_ready(self) -> bool:
+        brain = self._brain
+        return brain is None or bool(getattr(brain, "vector_ready", False)) or not getattr(brain, "vector_warmup_pending", False)
 
-    def _run_named_task(self, label: str, callback: Callable[[], object]) -> None:
-        self.log(label)
+    @staticmethod
+    def _as_boot_task(entry: PostBootTask, *, stage: str, timeout_s: float | None) -> BootTask:
+        if isinstance(entry, BootTask):
+            return entry
+        label, callback = entry
+        return BootTask(name=label, run=callback, stage=stage, timeout_s=timeout_s, label=label)
+
+    def boot_tasks(self, *, run_post_boot_tasks: bool = True) -> list[BootTask]:
+        """The boot graph: the LLM server and brain gate interactivity, warm-ups run beside them."""
+        tasks = [
+            BootTask(name="llm_server", run=self._wait_for_server, required=True),
+            BootTask(name="brain", run=self._init_brain, required=True),
+        ]
+        if not run_post_boot_tasks:
+            return tasks
+        warm_timeout_s = float(getattr(CFG, "BOOT_WARM_TASK_TIMEOUT_S", 180.0))
+        tasks.extend(self._as_boot_task(entry, stage=STAGE_INTERACTIVE, timeout_s=None) for entry in self.post_boot_tasks)
+        tasks.append(
+            BootTask(
+                name="brain_vectors",
+                run=lambda: None,
+                deps=("brain",),
+                stage=STAGE_WARM,
+                timeout_s=warm_timeout_s,
+                probe=self._brain_vectors_ready,
+                probe_interval_s=0.5,
+            )
+        )
+        tasks.extend(self._as_boot_task(entry, stage=STAGE_WARM, timeout_s=warm_timeout_s) for entry in self.background_boot_tasks)
+        return tasks
+
+    def _write_timeline(self, timeline: BootTimeline) -> None:
+        if not getattr(CFG, "BOOT_TIMELINE_ENABLED", True):
+            return
         try:
-            result = callback()
-            if isinstance(result, str) and result.strip():
-                self.log(result.strip())
-            else:
-                self.log(f"{label} OK")
-        except Exception as exc:
-            self.log(f"{label} FAILED: {exc}")
-
-    def _start_background_boot_tasks(self) -> None:
-        for label, callback in self.background_boot_tasks:
-            threading.Thread(
-                target=self._run_named_task,
-                args=(label, callback),
-                daemon=True,
-            ).start()
+            timeline.write_json(data_debug_path(CFG.DATA_DIR, "boot_timeline.json"))
+        except Exception as e:
+            _LOG.debug("Boot timeline write failed: %s", e)
+
+    def _on_warm(self, timeline: BootTimeline) -> None:
+        self.warm = True
+        self._write_timeline(timeline)
+        path = " -> ".join(timeline.critical_path(STAGE_WARM))
+        _LOG.info("[Boot] Fully warmed in %.1fs (critical path: %s)", timeline.warm_s or 0.0, path)
 
     def run_sequence(self, *, run_post_boot_tasks: bool = True):
         self.ready = False
         self.server_ready = False
         self.brain_ready = False
-        
-        server_thread = threading.Thread(target=self._wait_for_server)
-        brain_thread = threading.Thread(target=self._init_brain)
-        post_boot_thread = None
-        
-        server_thread.start()
-        if run_post_boot_tasks and self.post_boot_tasks:
-            post_boot_thread = threading.Thread(target=self._run_post_boot_tasks)
-            post_boot_thread.start()
-        if run_post_boot_tasks and self.background_boot_tasks:
-            self._start_background_boot_tasks()
-        brain_thread.start()
-        
-        server_thread.join()
-        brain_thread.join()
-        if post_boot_thread is not None:
-            post_boot_thread.join()
-        
+        self.warm = False
+
+        run = BootGraph(self.boot_tasks(run_post_boot_tasks=run_post_boot_tasks)).start(
+            log=self.log,
+            on_warm=self._on_warm,
+        )
+        self.timeline = run.timeline
+        # Warm-stage tasks keep running after the UI becomes interactive.
+        run.wait_interactive()
+        self._write_timeline(run.timeline)
+
         process_running = self.process and self.process.poll() is None
         if self.server_ready and self.brain_ready and (process_running or self.process is None):
             self.log("System Ready.")
@@ -327,6 +350,7 @@ class BootManager:
                 self.ui_queue.put(("boot_ready", ""))
         else:
             self.log("System Failed.")
+        return run
 
     def shutdown(self):
         killed = False
@@ -0,0 +1,355 @@
+"""Dependency-graph boot scheduler with a startup timeline.
+
+Boot work is declared as ``BootTask`` entries with explicit dependencies. Every
+task whose dependencies have finished starts on its own thread, so unrelated
+warm-ups overlap instead of adding up.
+
+- ``stage="interactive"`` tasks gate the "UI interactive" milestone;
+  ``stage="warm"`` tasks only gate "fully warmed".
+- A task fails if it raises or returns ``False``; dependents of a failed or
+  timed-out task are skipped.
+- ``probe`` is polled after ``run`` returns until it reports ready, within
+  the task's ``timeout_s``.
+- A timed-out task is abandoned (its thread keeps running as a daemon), not
+  killed.
+
+``BootTimeline`` records task start/end offsets and the critical path to each
+milestone and serialises to JSON.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+STAGE_INTERACTIVE = "interactive"
+STAGE_WARM = "warm"
+_STAGES = (STAGE_INTERACTIVE, STAGE_WARM)
+
+_FINISHED = {"ok", "failed", "timeout", "skipped"}
+
+
+@dataclass(frozen=True)
+class BootTask:
+    name: str
+    run: Callable[[], object]
+    deps: Tuple[str, ...] = ()
+    stage: str = STAGE_INTERACTIVE
+    required: bool = False
+    timeout_s: Optional[float] = None
+    probe: Optional[Callable[[], bool]] = None
+    probe_interval_s: float = 0.25
+    label: str = ""
+
+
+@dataclass
+class BootTaskRecord:
+    name: str
+    stage: str
+    deps: Tuple[str, ...]
+    required: bool
+    status: str = "pending"
+    start_s: Optional[float] = None
+    end_s: Optional[float] = None
+    detail: str = ""
+
+    @property
+    def finished(self) -> bool:
+        return self.status in _FINISHED
+
+    @property
+    def duration_s(self) -> Optional[float]:
+        if self.start_s is None or self.end_s is None:
+            return None
+        return self.end_s - self.start_s
+
+
+@dataclass
+class BootTimeline:
+    started_at: float
+    tasks: Dict[str, BootTaskRecord] = field(default_factory=dict)
+    interactive_s: Optional[float] = None
+    interactive_ok: bool = False
+    warm_s: Optional[float] = None
+
+    def critical_path(self, stage: str = STAGE_WARM) -> List[str]:
+        """Chain of tasks that determined when *stage* was reached.
+
+        Starts from the last task to finish and walks back through the
+        dependency that finished last, i.e. the one that gated each start.
+        """
+        names = [
+            name
+            for name, record in self.tasks.items()
+            if record.end_s is not None and (stage == STAGE_WARM or record.stage == STAGE_INTERACTIVE)
+        ]
+        if not names:
+            return []
+        current = max(names, key=lambda name: self.tasks[name].end_s or 0.0)
+        path = [current]
+        while True:
+            deps = [dep for dep in self.tasks[current].deps if self.tasks[dep].end_s is not None]
+            if not deps:
+                break
+            current = max(deps, key=lambda dep: self.tasks[dep].end_s or 0.0)
+            path.append(current)
+        return path[::-1]
+
+    def to_dict(self) -> dict:
+        def _round(value: Optional[float]) -> Optional[float]:
+            return None if value is None else round(value, 4)
+
+        return {
+            "started_at": datetime.fromtimestamp(self.started_at).isoformat(timespec="milliseconds"),
+            "interactive_s": _round(self.interactive_s),
+            "interactive_ok": self.interactive_ok,
+            "warm_s": _round(self.warm_s),
+            "critical_path": {
+                STAGE_INTERACTIVE: self.critical_path(STAGE_INTERACTIVE),
+                STAGE_WARM: self.critical_path(STAGE_WARM),
+            },
+            "tasks": [
+                {
+                    "name": record.name,
+                    "stage": record.stage,
+                    "deps": list(record.deps),
+                    "required": record.required,
+                    "status": record.status,
+                    "start_s": _round(record.start_s),
+                    "end_s": _round(record.end_s),
+                    "duration_s": _round(record.duration_s),
+                    "detail": record.detail,
+                }
+                for record in sorted(self.tasks.values(), key=lambda item: (item.start_s is None, item.start_s or 0.0))
+            ],
+        }
+
+    def write_json(self, path: Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.tmp")
+        tmp.write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+        tmp.replace(path)
+        return path
+
+
+def _validate(tasks: Iterable[BootTask]) -> Dict[str, BootTask]:
+    by_name: Dict[str, BootTask] = {}
+    for task in tasks:
+        if task.name in by_name:
+            raise ValueError(f"duplicate boot task {task.name!r}")
+        if task.stage not in _STAGES:
+            raise ValueError(f"boot task {task.name!r} has unknown stage {task.stage!r}")
+        by_name[task.name] = task
+    for task in by_name.values():
+        for dep in task.deps:
+            if dep not in by_name:
+                raise ValueError(f"boot task {task.name!r} depends on unknown task {dep!r}")
+            if task.stage == STAGE_INTERACTIVE and by_name[dep].stage == STAGE_WARM:
+                raise ValueError(f"interactive boot task {task.name!r} cannot wait on warm task {dep!r}")
+    visiting: set[str] = set()
+    done: set[str] = set()
+
+    def _visit(name: str) -> None:
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"boot task dependency cycle through {name!r}")
+        visiting.add(name)
+        for dep in by_name[name].deps:
+            _visit(dep)
+        visiting.discard(name)
+        done.add(name)
+
+    for name in by_name:
+        _visit(name)
+    return by_name
+
+
+class BootRun:
+    """One execution of a ``BootGraph``; milestones can be awaited separately."""
+
+    def __init__(
+        self,
+        tasks: Dict[str, BootTask],
+        *,
+        log: Optional[Callable[[str], None]],
+        on_interactive: Optional[Callable[[BootTimeline], None]],
+        on_warm: Optional[Callable[[BootTimeline], None]],
+        clock: Callable[[], float],
+    ) -> None:
+        self._tasks = tasks
+        self._log = log
+        self._on_interactive = on_interactive
+        self._on_warm = on_warm
+        self._clock = clock
+        self._t0 = clock()
+        self.timeline = BootTimeline(
+            started_at=time.time(),
+            tasks={
+                name: BootTaskRecord(name=name, stage=task.stage, deps=tuple(task.deps), required=task.required)
+                for name, task in tasks.items()
+            },
+        )
+        self._cond = threading.Condition()
+        self._deadlines: Dict[str, float] = {}
+        self._version = 0
+        self._interactive = threading.Event()
+        self._warm = threading.Event()
+        self._scheduler = threading.Thread(target=self._schedule, name="boot-graph", daemon=True)
+        self._scheduler.start()
+
+    def wait_interactive(self, timeout: Optional[float] = None) -> bool:
+        """Block until every interactive task finished; True if all required ones succeeded."""
+        self._interactive.wait(timeout)
+        return self.timeline.interactive_ok
+
+    def wait_warm(self, timeout: Optional[float] = None) -> bool:
+        return self._warm.wait(timeout)
+
+    def _now(self) -> float:
+        return self._clock() - self._t0
+
+    def _emit(self, message: str) -> None:
+        if self._log is not None:
+            try:
+                self._log(message)
+            except Exception:
+                pass
+
+    def _schedule(self) -> None:
+        records = self.timeline.tasks
+        with self._cond:
+            while True:
+                now = self._now()
+                for name, deadline in list(self._deadlines.items()):
+                    if now >= deadline and records[name].status == "running":
+                        self._finish(name, "timeout", f"no result after {self._tasks[name].timeout_s:g}s")
+                progressed = True
+                while progressed:
+                    progressed = False
+                    for name, record in records.items():
+                        if record.status != "pending":
+                            continue
+                        deps = [records[dep] for dep in record.deps]
+                        if not all(dep.finished for dep in deps):
+                            continue
+                        blocked = [dep.name for dep in deps if dep.status != "ok"]
+                        if blocked:
+                            record.start_s = record.end_s = self._now()
+                            self._finish(name, "skipped", f"dependency {', '.join(blocked)} did not finish")
+                        else:
+                            self._launch(name)
+                        progressed = True
+                seen = self._version
+                if self._check_milestones():
+                    return
+                if self._version != seen:
+                    continue  # tasks finished while a milestone callback ran
+                waits = [deadline - self._now() for name, deadline in self._deadlines.items() if records[name].status == "running"]
+                self._cond.wait(timeout=max(0.0, min(waits)) if waits else None)
+
+    def _launch(self, name: str) -> None:
+        task = self._tasks[name]
+        record = self.timeline.tasks[name]
+        record.status = "running"
+        record.start_s = self._now()
+        if task.timeout_s is not None:
+            self._deadlines[name] = record.start_s + float(task.timeout_s)
+        threading.Thread(target=self._work, args=(task,), name=f"boot-{name}", daemon=True).start()
+
+    def _work(self, task: BootTask) -> None:
+        if task.label:
+            self._emit(task.label)
+        status, detail = "ok", ""
+        try:
+            result = task.run()
+            if result is False:
+                status, detail = "failed", "reported failure"
+            elif isinstance(result, str) and result.strip():
+                detail = result.strip()
+            if status == "ok" and task.probe is not None:
+                status, detail = self._await_probe(task, detail)
+        except Exception as exc:
+            status, detail = "failed", str(exc) or type(exc).__name__
+        if task.label:
+            if status == "ok":
+                self._emit(detail or f"{task.label} OK")
+            else:
+                self._emit(f"{task.label} FAILED: {detail}")
+        with self._cond:
+            if self.timeline.tasks[task.name].status == "running":
+                self._finish(task.name, status, detail)
+
+    def _await_probe(self, task: BootTask, detail: str) -> Tuple[str, str]:
+        with self._cond:
+            deadline = self._deadlines.get(task.name)
+        while True:
+            try:
+                if task.probe():
+                    return "ok", detail
+            except Exception as exc:
+                return "failed", f"probe error: {exc}"
+            if deadline is not None and self._now() >= deadline:
+                return "timeout", "probe never reported ready"
+            with self._cond:
+                if self.timeline.tasks[task.name].status != "running":
+                    return "timeout", "probe never reported ready"
+            time.sleep(max(0.001, float(task.probe_interval_s)))
+
+    def _finish(self, name: str, status: str, detail: str) -> None:
+        record = self.timeline.tasks[name]
+        record.status = status
+        record.detail = detail
+        record.end_s = self._now()
+        self._deadlines.pop(name, None)
+        self._version += 1
+        self._cond.notify_all()
+
+    def _check_milestones(self) -> bool:
+        records = self.timeline.tasks.values()
+        if not self._interactive.is_set() and all(r.finished for r in records if r.stage == STAGE_INTERACTIVE):
+            self.timeline.interactive_s = self._now()
+            self.timeline.interactive_ok = all(r.status == "ok" for r in records if r.stage == STAGE_INTERACTIVE and r.required)
+            self._fire(self._on_interactive)
+            self._interactive.set()
+        if all(r.finished for r in records):
+            self.timeline.warm_s = self._now()
+            self._fire(self._on_warm)
+            self._warm.set()
+            return True
+        return False
+
+    def _fire(self, callback: Optional[Callable[[BootTimeline], None]]) -> None:
+        if callback is None:
+            return
+        # Callbacks may block (UI queue, file writes); don't hold up workers.
+        self._cond.release()
+        try:
+            callback(self.timeline)
+        except Exception as exc:
+            self._emit(f"[Boot] milestone callback failed: {exc}")
+        finally:
+            self._cond.acquire()
+
+
+class BootGraph:
+    """Validated set of boot tasks; ``start()`` runs them."""
+
+    def __init__(self, tasks: Iterable[BootTask], *, clock: Callable[[], float] = time.monotonic) -> None:
+        self.tasks = _validate(tasks)
+        self._clock = clock
+
+    def start(
+        self,
+        *,
+        log: Optional[Callable[[str], None]] = None,
+        on_interactive: Optional[Callable[[BootTimeline], None]] = None,
+        on_warm: Optional[Callable[[BootTimeline], None]] = None,
+    ) -> BootRun:
+        return BootRun(self.tasks, log=log, on_interactive=on_interactive, on_warm=on_warm, clock=self._clock)
@@ -8,12 +8,17 @@ import socket
 import threading
 import time
 import urllib.error
-from dataclasses import dataclass
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Iterator, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import urllib.request
 
+from core import tracing
 from core.runtime_control import CancellationToken, OperationCancelled
+from core.stream_filter import stream_thinking_filter
+from llm.response_cache import LLMResponseCache, response_cache_key
 
 _LOG = logging.getLogger(__name__)
 
@@ -35,6 +40,119 @@ class LlamaServerConfig:
     # plus a local rendering of the chat template (ChatML) for human inspection.
     debug_path: Optional[Path] = None
 
+    # Per-role cap on reasoning tokens (reasoning_content deltas or an inline
+    # <think> block). A missing role or 0 leaves that role unbounded.
+    thinking_budgets: Dict[str, int] = field(default_factory=dict)
+    # What happens once a budget runs out: "no_think" re-issues the request with
+    # reasoning disabled, "continue" resumes after the partial reasoning with a
+    # forced </think> so llama-server can reuse the cached prompt.
+    thinking_overflow: str = "no_think"
+
+    # Identity of the loaded weights (see ``response_cache.model_identity``).
+    # Part of every response-cache key; empty falls back to ``model``.
+    model_key: str = ""
+
+
+THINKING_OVERFLOW_MODES = ("no_think", "continue")
+
+_DEFAULT_ROLE = "default"
+_ACTIVE_ROLE: ContextVar[Optional[str]] = ContextVar("llm_role", default=None)
+
+
+@contextmanager
+def llm_role(role: str) -> Iterator[None]:
+    """Tag LLM requests issued inside the block with *role* (router, planner, ...).
+
+    The role picks the thinking budget and the bucket reasoning stats land in.
+    It is read when ``generate``/``generate_stream`` is called, so a stream
+    created inside the block keeps its role while it is consumed elsewhere.
+    Also usable as a decorator for helpers that create streams lazily.
+    """
+    token = _ACTIVE_ROLE.set(str(role or "").strip().lower() or None)
+    try:
+        yield
+    finally:
+        _ACTIVE_ROLE.reset(token)
+
+
+_BACKGROUND_TOKEN: ContextVar[Optional[CancellationToken]] = ContextVar("llm_background_token", default=None)
+
+
+@contextmanager
+def background_llm_request(cancel_token: CancellationToken) -> Iterator[None]:
+    """Mark LLM requests issued inside the block as preemptible background work.
+
+    When an interactive request has to wait for the shared request lock while
+    a background request holds it, *cancel_token* is cancelled so the
+    background stream stops at its next chunk and hands the server over.
+    """
+    token = _BACKGROUND_TOKEN.set(cancel_token)
+    try:
+        yield
+    finally:
+        _BACKGROUND_TOKEN.reset(token)
+
+
+@dataclass
+class ThinkingStats:
+    requests: int = 0
+    reasoning_tokens: int = 0
+    content_tokens: int = 0
+    reasoning_ms: float = 0.0
+    answer_ms: float = 0.0
+    budget_aborts: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "reasoning_tokens": self.reasoning_tokens,
+            "content_tokens": self.content_tokens,
+            "reasoning_ms": round(self.reasoning_ms, 3),
+            "answer_ms": round(self.answer_ms, 3),
+            "budget_aborts": self.budget_aborts,
+        }
+
+
+class _InlineThinkTracker:
+    """Tracks whether inline content deltas are still inside a leading <think> block.
+
+    Mirrors the opening/closing decisions of ``stream_thinking_filter`` but only
+    classifies tokens; it never buffers or rewrites them.
+    """
+
+    _OPEN = "<think>"
+    _CLOSE = "</think>"
+
+    def __init__(self) -> None:
+        self.state = "start"
+        self._buf = ""
+
+    @property
+    def in_think(self) -> bool:
+        return self.state == "think"
+
+    def feed(self, text: str) -> bool:
+        """Return True when *text* belongs to the reasoning preamble."""
+        if self.state == "answer":
+            return False
+        self._buf += text
+        if self.state == "start":
+            head = self._buf.lstrip().lower()
+            if not head or (len(head) < len(self._OPEN) and self._OPEN.startswith(head)):
+                return True
+            if not head.startswith(self._OPEN):
+                self.state = "answer"
+                self._buf = ""
+                return False
+            self.state = "think"
+            self._buf = head[len(self._OPEN):]
+        if self._CLOSE in self._buf.lower():
+            self.state = "answer"
+            self._buf = ""
+            return True
+        self._buf = self._buf[-len(self._CLOSE):]
+        return True
+
 def _render_message_content(content: object) -> str:
     if isinstance(content, str):
         return content
@@ -135,23 +253,93 @@ class LlamaServerClient:
       data: [DONE]
     """
 
-    def __init__(self, cfg: LlamaServerConfig):
+    def __init__(self, cfg: LlamaServerConfig, *, response_cache: Optional[LLMResponseCache] = None):
         self.cfg = cfg
+        self.response_cache = response_cache
         self._request_lock = threading.Lock()
+        # Token of the background request holding the lock (None when the
+        # holder is interactive) and when the lock was last released.
+        self._lock_holder_token: CancellationToken | None = None
+        self._last_release_at = 0.0
+        self.background_preemptions = 0
+        self._stats_lock = threading.Lock()
+        self._thinking_stats: Dict[str, ThinkingStats] = {}
 
     def reconnect(self, new_cfg: LlamaServerConfig) -> None:
         """Hot-swap the server config for the next request."""
         with self._request_lock:
+            previous_model = self._model_key()
             self.cfg = new_cfg
+        current_model = self._model_key()
+        if self.response_cache is not None and current_model != previous_model:
+            removed = self.response_cache.purge_other_models(current_model)
+            if removed:
+                _LOG.info("[LLM] Dropped %d cached responses from the previous model", removed)
+
+    def _model_key(self) -> str:
+        return str(self.cfg.model_key or self.cfg.model or "")
+
+    def _response_cache_key(
+        self,
+        messages: List[Dict[str, Any]],
+        *,
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        role: str,
+    ) -> Optional[str]:
+        """Cache key for a deterministic call of an opted-in role, else None."""
+        cache = self.response_cache
+        if cache is None or not cache.caches_role(role):
+            return None
+        effective_temperature = float(self.cfg.temperature if temperature is None else temperature)
+        if effective_temperature != 0.0:
+            return None
+        mt = self.cfg.max_tokens if max_tokens is None else max_tokens
+        params = {
+            "temperature": effective_temperature,
+            "max_tokens": int(mt) if mt is not None and int(mt) > 0 else None,
+            "thinking_budget": self.thinking_budget(role),
+            "thinking_overflow": self.cfg.thinking_overflow if self.thinking_budget(role) else "",
+        }
+        try:
+            prompt = json.dumps(messages, ensure_ascii=False, sort_keys=True)
+        except (TypeError, ValueError):
+            return None
+        return response_cache_key(model_key=self._model_key(), params=params, prompt=prompt)
 
     def _acquire_request_lock(self, cancel_token: CancellationToken | None = None) -> None:
         # llama.cpp shares KV/cache state across slots; overlapping Piper requests
         # can trip "Context size has been exceeded" even when each prompt is valid.
+        background_token = _BACKGROUND_TOKEN.get()
         while True:
             if cancel_token is not None:
                 cancel_token.raise_if_cancelled()
+            if self._request_lock.acquire(blocking=False):
+                break
+            if background_token is None:
+                self._preempt_background_holder()
             if self._request_lock.acquire(timeout=0.1):
-                return
+                break
+        self._lock_holder_token = background_token
+
+    def _release_request_lock(self) -> None:
+        self._lock_holder_token = None
+        self._last_release_at = time.monotonic()
+        self._request_lock.release()
+
+    def _preempt_background_holder(self) -> None:
+        holder = self._lock_holder_token
+        if holder is not None and not holder.is_cancelled:
+            holder.cancel("Preempted by an interactive LLM request.")
+            self.background_preemptions += 1
+
+    def idle_for_s(self) -> float:
+        """Seconds since the last request released the server; 0.0 while one runs."""
+        if self._request_lock.locked():
+            return 0.0
+        if not self._last_release_at:
+            return float("inf")
+        return max(0.0, time.monotonic() - self._last_release_at)
 
     @staticmethod
     def _messages_with_no_think_suffix(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -183,6 +371,32 @@ class LlamaServerClient:
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
         cancel_token: CancellationToken | None = None,
+        role: Optional[str] = None,
+    ) -> str:
+        role = self._resolve_role(role)
+        cache_key = self._response_cache_key(messages, temperature=temperature, max_tokens=max_tokens, role=role)
+        if cache_key is not None:
+            model_key = self._model_key()
+            cached = self.response_cache.get(model_key, cache_key)
+            if cached is not None:
+                return cached
+            result = self._generate_uncached(
+                messages, temperature=temperature, max_tokens=max_tokens, cancel_token=cancel_token, role=role
+            )
+            self.response_cache.put(model_key, cache_key, result, role=role)
+            return result
+        return self._generate_uncached(
+            messages, temperature=temperature, max_tokens=max_tokens, cancel_token=cancel_token, role=role
+        )
+
+    def _generate_uncached(
+        self,
+        messages: List[Dict[str, Any]],
+        *,
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        cancel_token: CancellationToken | None,
+        role: str,
     ) -> str:
         out = []
         for d in self.generate_stream(
@@ -190,6 +404,7 @@ class LlamaServerClient:
             temperature=temperature,
             max_tokens=max_tokens,
             cancel_token=cancel_token,
+            role=role,
         ):
             out.append(d)
         result = "".join(out).strip()
@@ -206,10 +421,47 @@ class LlamaServerClient:
             temperature=temperature,
             max_tokens=max_tokens,
             cancel_token=cancel_token,
+            role=role,
         ):
             retry_out.append(d)
         return "".join(retry_out).strip()
 
+    @staticmethod
+    def _resolve_role(role: Optional[str]) -> str:
+        value = str(role or "").strip().lower()
+        return value or _ACTIVE_ROLE.get() or _DEFAULT_ROLE
+
+    def thinking_budget(self, role: str) -> int:
+        budgets = self.cfg.thinking_budgets or {}
+        try:
+            return max(0, int(budgets.get(role, 0) or 0))
+        except (TypeError, ValueError):
+            return 0
+
+    def thinking_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Reasoning vs answer tokens and wall time, per role, since startup."""
+        with self._stats_lock:
+            return {role: stats.as_dict() for role, stats in sorted(self._thinking_stats.items())}
+
+    def _record_thinking(
+        self,
+        role: str,
+        *,
+        reasoning_tokens: int,
+        content_tokens: int,
+        reasoning_s: float,
+        answer_s: float,
+        aborted: bool,
+    ) -> None:
+        with self._stats_lock:
+            stats = self._thinking_stats.setdefault(role, ThinkingStats())
+            stats.requests += 1
+            stats.reasoning_tokens += reasoning_tokens
+            stats.content_tokens += content_tokens
+            stats.reasoning_ms += reasoning_s * 1000.0
+            stats.answer_ms += answer_s * 1000.0
+            stats.budget_aborts += int(aborted)
+
     def generate_stream(
         self,
         messages: List[Dict[str, Any]],
@@ -217,7 +469,165 @@ class LlamaServerClient:
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
         cancel_token: CancellationToken | None = None,
+        role: Optional[str] = None,
+    ) -> Iterator[str]:
+        """Stream visible content deltas, enforcing the role's thinking budget.
+
+        Inline ``<think>`` content is passed through for ``stream_thinking_filter``
+        to strip; ``reasoning_content`` deltas are only counted. When the budget
+        runs out mid-reasoning the request is aborted (a ``</think>`` is emitted
+        if an inline block was open) and resumed per ``thinking_overflow``.
+        """
+        return self._budgeted_stream(
+            messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            cancel_token=cancel_token,
+            role=self._resolve_role(role),
+        )
+
+    def _budgeted_stream(
+        self,
+        messages: List[Dict[str, Any]],
+        *,
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        cancel_token: CancellationToken | None,
+        role: str,
     ) -> Iterator[str]:
+        budget = self.thinking_budget(role)
+        tracker = _InlineThinkTracker()
+        reasoning: List[str] = []
+        reasoning_tokens = 0
+        content_tokens = 0
+        reasoning_started_at: float | None = None
+        reasoning_ended_at: float | None = None
+        answer_started_at: float | None = None
+        aborted = False
+
+        def _note_reasoning(text: str) -> None:
+            nonlocal reasoning_tokens, reasoning_started_at, reasoning_ended_at
+            reasoning_tokens += 1
+            reasoning.append(text)
+            now = time.perf_counter()
+            if reasoning_started_at is None:
+                reasoning_started_at = now
+            reasoning_ended_at = now
+
+        def _note_content() -> None:
+            nonlocal content_tokens, answer_started_at
+            content_tokens += 1
+            if answer_started_at is None:
+                answer_started_at = time.perf_counter()
+
+        try:
+            deltas = self._stream_deltas(
+                messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                cancel_token=cancel_token,
+            )
+            try:
+                for kind, text in deltas:
+                    if kind == "reasoning" or tracker.feed(text):
+                        _note_reasoning(text)
+                        if kind == "content":
+                            yield text
+                        if budget and reasoning_tokens >= budget and content_tokens == 0:
+                            aborted = True
+                            break
+                        continue
+                    _note_content()
+                    yield text
+            finally:
+                # Closing the generator closes the HTTP response, which is how
+                # llama-server notices the client is gone and frees the slot.
+                deltas.close()
+
+            if not aborted:
+                return
+
+            _LOG.info(
+                "LLM %s thinking budget exhausted after %d reasoning tokens; resuming with %s",
+                role,
+                reasoning_tokens,
+                self.cfg.thinking_overflow,
+            )
+            if tracker.in_think:
+                yield "</think>"
+            resume_messages, extra_payload = self._overflow_request(messages, "".join(reasoning))
+
+            def _resumed_content() -> Iterator[str]:
+                resumed = self._stream_deltas(
+                    resume_messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    cancel_token=cancel_token,
+                    extra_payload=extra_payload,
+                )
+                try:
+                    for kind, text in resumed:
+                        if kind == "reasoning":
+                            _note_reasoning(text)
+                            continue
+                        _note_content()
+                        yield text
+                finally:
+                    resumed.close()
+
+            # Reasoning-disabled templates still open with an empty think block.
+            yield from stream_thinking_filter(_resumed_content())
+        finally:
+            finished_at = time.perf_counter()
+            reasoning_s = 0.0
+            if reasoning_started_at is not None and reasoning_ended_at is not None:
+                reasoning_s = reasoning_ended_at - reasoning_started_at
+                tracing.complete(
+                    "llm.reasoning",
+                    reasoning_started_at,
+                    reasoning_ended_at,
+                    cat="llm",
+                    role=role,
+                    tokens=reasoning_tokens,
+                    budget=budget or None,
+                    aborted=aborted,
+                )
+            answer_s = finished_at - answer_started_at if answer_started_at is not None else 0.0
+            self._record_thinking(
+                role,
+                reasoning_tokens=reasoning_tokens,
+                content_tokens=content_tokens,
+                reasoning_s=reasoning_s,
+                answer_s=answer_s,
+                aborted=aborted,
+            )
+
+    def _overflow_request(
+        self,
+        messages: List[Dict[str, Any]],
+        reasoning: str,
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        if str(self.cfg.thinking_overflow or "").strip().lower() == "continue":
+            # Same prompt prefix plus the reasoning so far, closed for it: with
+            # cache_prompt the server only has to prefill the appended tail.
+            prefill = "<think>\n" + reasoning.replace("<think>", "").replace("</think>", "").strip() + "\n</think>\n\n"
+            return [dict(item) for item in (messages or [])] + [{"role": "assistant", "content": prefill}], {
+                "cache_prompt": True
+            }
+        return self._messages_with_no_think_suffix(messages), {
+            "chat_template_kwargs": {"enable_thinking": False}
+        }
+
+    def _stream_deltas(
+        self,
+        messages: List[Dict[str, Any]],
+        *,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        cancel_token: CancellationToken | None = None,
+        extra_payload: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[Tuple[str, str]]:
+        """Yield ``("reasoning" | "content", text)`` deltas from one SSE request."""
         if cancel_token is not None:
             cancel_token.raise_if_cancelled()
 
@@ -234,6 +644,8 @@ class LlamaServerClient:
         # llama-server supports many OpenAI-ish params; harmless if ignored.
         if mt is not None and int(mt) > 0:
             payload["max_tokens"] = int(mt)
+        if extra_payload:
+            payload.update(extra_payload)
 
         # Debug: dump the exact HTTP JSON we send + a local rendering of the chat template.
         if self.cfg.debug_path:
@@ -256,7 +668,27 @@ class LlamaServerClient:
             method="POST",
         )
 
-        self._acquire_request_lock(cancel_token)
+        # Queue wait (the shared request lock), prefill (time to first token)
+        # and decode are recorded as separate spans when the turn is traced.
+        request_span = tracing.span(
+            "llm.request",
+            cat="llm",
+            messages=len(messages or []),
+            max_tokens=payload.get("max_tokens"),
+        )
+        queued_at = time.perf_counter()
+        try:
+            self._acquire_request_lock(cancel_token)
+        except BaseException as exc:
+            request_span.end(
+                error=type(exc).__name__,
+                queue_wait_ms=round((time.perf_counter() - queued_at) * 1000.0, 3),
+            )
+            raise
+        acquired_at = time.perf_counter()
+        tracing.complete("llm.queue_wait", queued_at, acquired_at, cat="llm")
+        first_token_at: float | None = None
+        chunks = 0
         try:
             with urllib.request.urlopen(req, timeout=self.cfg.timeout_s) as resp:
                 if self.cfg.stream_read_timeout_s and self.cfg.stream_read_timeout_s > 0:
@@ -302,13 +734,23 @@ class LlamaServerClient:
                     delta = (choices[0].get("delta") or {})
                     content = delta.get("content")
                     # reasoning_content carries thinking tokens on split-mode servers;
-                    # skip it. For inline-mode servers (thinking=0) all tokens arrive
-                    # in content — the consuming layer filters the <think>…</think>
-                    # preamble so the generator is never blocked.
+                    # it is only counted against the thinking budget. For inline-mode
+                    # servers (thinking=0) all tokens arrive in content — the consuming
+                    # layer filters the <think>…</think> preamble.
+                    reasoning_delta = delta.get("reasoning_content")
+                    if reasoning_delta:
+                        if first_token_at is None:
+                            first_token_at = time.perf_counter()
+                            tracing.complete("llm.prefill", acquired_at, first_token_at, cat="llm")
+                        yield ("reasoning", str(reasoning_delta))
                     if content:
                         if cancel_token is not None:
                             cancel_token.raise_if_cancelled()
-                        yield str(content)
+                        if first_token_at is None:
+                            first_token_at = time.perf_counter()
+                            tracing.complete("llm.prefill", acquired_at, first_token_at, cat="llm")
+                        chunks += 1
+                        yield ("content", str(content))
 
         except OperationCancelled:
             raise
@@ -327,4 +769,12 @@ class LlamaServerClient:
             _LOG.error("LLM request failed: %s", e)
             raise LLMClientError(f"LLM_REQUEST_FAILED: {e}") from e
         finally:
-            self._request_lock.release()
+            self._release_request_lock()
+            finished_at = time.perf_counter()
+            if first_token_at is not None:
+                tracing.complete("llm.decode", first_token_at, finished_at, cat="llm", chunks=chunks)
+            request_span.end(
+                chunks=chunks,
+                queue_wait_ms=round((acquired_at - queued_at) * 1000.0, 3),
+                ttft_ms=round((first_token_at - acquired_at) * 1000.0, 3) if first_token_at is not None else None,
+            )
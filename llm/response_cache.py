@@ -0,0 +1,232 @@
+"""llm/response_cache.py
+
+Persistent cache for deterministic background LLM calls.
+
+World-model extraction, memory consolidation and conversation summaries run
+at temperature 0 and often see the same rendered prompt again (a restart
+replays the last turn, a summary candidate has not changed since the last
+compaction). Those calls are answered from disk instead of llama-server.
+
+Only roles listed in `roles` are cached, and only when the effective
+temperature is 0. The key covers the model identity (name plus a fingerprint
+of the weights file), the sampler parameters that reach the server and the
+fully rendered prompt. Entries live in one directory per model identity, so
+swapping the model both misses every old key and lets `purge_other_models`
+drop the old directory wholesale.
+
+This module does no filesystem work during import.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+_LOG = logging.getLogger(__name__)
+
+_PRUNE_EVERY_WRITES = 32
+
+DEFAULT_CACHED_ROLES = ("world_model", "memory_consolidation", "summarizer")
+
+
+def response_cache_key(*, model_key: str, params: Dict[str, Any], prompt: str) -> str:
+    payload = json.dumps(
+        [str(model_key or ""), params, str(prompt or "")],
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _model_dir_name(model_key: str) -> str:
+    return hashlib.sha256(str(model_key or "").encode("utf-8")).hexdigest()[:16]
+
+
+class LLMResponseCache:
+    """Disk-backed response cache with TTL freshness and bounded entry count."""
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        ttl_s: float,
+        max_entries: int = 2000,
+        roles: Iterable[str] = DEFAULT_CACHED_ROLES,
+    ) -> None:
+        self.root = Path(root)
+        self.ttl_s = max(0.0, float(ttl_s))
+        self.max_entries = max(1, int(max_entries))
+        self.roles = frozenset(str(role or "").strip().lower() for role in roles if str(role or "").strip())
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+        self.stats: dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "stores": 0,
+            "purged": 0,
+        }
+
+    def caches_role(self, role: str) -> bool:
+        return str(role or "").strip().lower() in self.roles
+
+    def _path(self, model_key: str, key: str) -> Path:
+        return self.root / _model_dir_name(model_key) / f"{key}.json"
+
+    def _note(self, stat: str, count: int = 1) -> None:
+        with self._lock:
+            self.stats[stat] = self.stats.get(stat, 0) + count
+
+    def get(self, model_key: str, key: str) -> Optional[str]:
+        path = self._path(model_key, key)
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            self._note("misses")
+            return None
+        except Exception:
+            _LOG.debug("llm response cache: unreadable entry %s", path, exc_info=True)
+            self._note("misses")
+            return None
+        if not isinstance(payload, dict) or payload.get("key") != key or payload.get("model") != model_key:
+            self._note("misses")
+            return None
+        try:
+            stored_at = float(payload.get("stored_at") or 0.0)
+        except (TypeError, ValueError):
+            stored_at = 0.0
+        if time.time() - stored_at >= self.ttl_s:
+            self._note("expired")
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            return None
+        text = payload.get("text")
+        if not isinstance(text, str) or not text:
+            self._note("misses")
+            return None
+        self._note("hits")
+        return text
+
+    def put(self, model_key: str, key: str, text: str, *, role: str = "") -> None:
+        if not text:
+            return
+        path = self._path(model_key, key)
+        entry = {
+            "key": key,
+            "model": model_key,
+            "role": str(role or ""),
+            "stored_at": time.time(),
+            "text": text,
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                    json.dump(entry, handle, ensure_ascii=False)
+                os.replace(tmp_name, path)
+            except Exception:
+                try:
+                    os.unlink(tmp_name)
+                except Exception:
+                    pass
+                raise
+        except Exception:
+            _LOG.debug("llm response cache: write failed for %s", path, exc_info=True)
+            return
+        self._note("stores")
+        with self._lock:
+            self._writes_since_prune += 1
+            should_prune = self._writes_since_prune >= _PRUNE_EVERY_WRITES
+            if should_prune:
+                self._writes_since_prune = 0
+        if should_prune:
+            self.prune()
+
+    def purge_other_models(self, model_key: str) -> int:
+        """Delete every entry not written for `model_key`. Returns the number removed."""
+        keep = _model_dir_name(model_key)
+        removed = 0
+        try:
+            children = [child for child in self.root.iterdir() if child.is_dir() and child.name != keep]
+        except OSError:
+            return 0
+        for child in children:
+            removed += sum(1 for _ in child.glob("*.json"))
+            shutil.rmtree(child, ignore_errors=True)
+        if removed:
+            self._note("purged", removed)
+        return removed
+
+    def prune(self) -> int:
+        """Drop expired entries, then the oldest beyond `max_entries`. Returns the number removed."""
+        try:
+            entries = [(item.stat().st_mtime, item) for item in self.root.glob("*/*.json")]
+        except Exception:
+            return 0
+        cutoff = time.time() - self.ttl_s
+        entries.sort(key=lambda pair: pair[0])
+        overflow = max(0, len(entries) - self.max_entries)
+        removed = 0
+        for index, (mtime, item) in enumerate(entries):
+            if index >= overflow and mtime >= cutoff:
+                continue
+            try:
+                item.unlink()
+                removed += 1
+            except Exception:
+                continue
+        return removed
+
+    def clear(self) -> None:
+        for item in self.root.glob("*/*.json"):
+            try:
+                item.unlink()
+            except Exception:
+                continue
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+        return {
+            "roles": sorted(self.roles),
+            "ttl_s": self.ttl_s,
+            "max_entries": self.max_entries,
+            **stats,
+        }
+
+
+def model_identity(model: str, model_path: Optional[Path] = None) -> str:
+    """Model name plus a cheap fingerprint (name, size, mtime) of the weights file."""
+    from tools.tts_audio_cache import model_fingerprint
+
+    fingerprint = model_fingerprint(Path(model_path)) if model_path else ""
+    return f"{str(model or '').strip()}|{fingerprint}"
+
+
+def response_cache_from_config(cfg: Any = None) -> Optional[LLMResponseCache]:
+    """Build the cache described by `LLM_RESPONSE_CACHE_*`, or None when disabled."""
+    if cfg is None:
+        from config import CFG as cfg
+    if not bool(getattr(cfg, "LLM_RESPONSE_CACHE_ENABLED", True)):
+        return None
+    raw_roles = str(getattr(cfg, "LLM_RESPONSE_CACHE_ROLES", ",".join(DEFAULT_CACHED_ROLES)) or "")
+    roles = [role for role in (part.strip().lower() for part in raw_roles.split(",")) if role]
+    if not roles:
+        return None
+    return LLMResponseCache(
+        Path(getattr(cfg, "LLM_RESPONSE_CACHE_DIR", Path(cfg.DATA_DIR) / "cache" / "llm_responses")),
+        ttl_s=float(getattr(cfg, "LLM_RESPONSE_CACHE_TTL_S", 7 * 24 * 3600.0)),
+        max_entries=int(getattr(cfg, "LLM_RESPONSE_CACHE_MAX_ENTRIES", 2000)),
+        roles=roles,
+    )
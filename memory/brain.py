@@ -15,6 +15,8 @@ import time
 from pathlib import Path
 from typing import List, Dict, Optional
 
+from memory.resource_pool import SharedEmbeddingFunction, chroma_client, release_chroma_client
+
 _LOG = logging.getLogger(__name__)
 
 def _get_deterministic_id(text: str) -> str:
@@ -34,51 +36,8 @@ def _tokenize(text: str) -> set[str]:
     }
 
 
-class _QuietSentenceTransformerEmbeddingFunction:
-    def __init__(self, model_name: str) -> None:
-        self.model_name = str(model_name or "").strip() or "all-MiniLM-L6-v2"
-        self._model = None
-        self._lock = threading.Lock()
-
-    @staticmethod
-    def name() -> str:
-        # Keep Chroma embedding-function identity compatible with the original
-        # SentenceTransformer wrapper so persisted collections remain reusable.
-        return "sentence_transformer"
-
-    @staticmethod
-    def build_from_config(config: Dict[str, object]) -> "_QuietSentenceTransformerEmbeddingFunction":
-        model_name = str((config or {}).get("model_name") or "all-MiniLM-L6-v2")
-        return _QuietSentenceTransformerEmbeddingFunction(model_name)
-
-    def get_config(self) -> Dict[str, object]:
-        return {"model_name": self.model_name}
-
-    def _ensure_model(self):
-        if self._model is not None:
-            return self._model
-        with self._lock:
-            if self._model is None:
-                from sentence_transformers import SentenceTransformer
-
-                self._model = SentenceTransformer(self.model_name)
-        return self._model
-
-    def __call__(self, input: list[str]) -> list[list[float]]:
-        model = self._ensure_model()
-        texts = [str(item or "") for item in (input or [])]
-        vectors = model.encode(texts, show_progress_bar=False, convert_to_numpy=True)
-        if hasattr(vectors, "tolist"):
-            return vectors.tolist()
-        return [list(vector) for vector in vectors]
-
-    def embed_documents(self, texts: list[str] | None = None, *, input: list[str] | None = None) -> list[list[float]]:
-        items = texts if texts is not None else input
-        return self.__call__(items or [])
-
-    def embed_query(self, text: str | None = None, *, input: str | None = None) -> list[list[float]]:
-        query_text = text if text is not None else input
-        return self.__call__([query_text or ""])
+# Kept under its old name; the embedder behind it is shared process-wide.
+_QuietSentenceTransformerEmbeddingFunction = SharedEmbeddingFunction
 
 class PiperBrain:
     def __init__(self, data_dir: Path):
@@ -149,7 +108,7 @@ class PiperBrain:
 
     def _initialize_vector_backend(self) -> None:
         try:
-            import chromadb
+            import chromadb  # noqa: F401
         except Exception as exc:
             with self._vector_init_lock:
                 self._vector_init_failed = True
@@ -161,7 +120,7 @@ class PiperBrain:
 
         try:
             embedding_func = _QuietSentenceTransformerEmbeddingFunction("all-MiniLM-L6-v2")
-            client = chromadb.PersistentClient(path=str(self.db_path))
+            client = chroma_client(self.db_path)
             collection = client.get_or_create_collection(
                 name="piper_memory",
                 embedding_function=embedding_func,
@@ -186,6 +145,15 @@ class PiperBrain:
             _LOG.warning("[Brain] Vector warm-up failed. Staying on lightweight fallback memory.")
             _LOG.warning("[Brain] Vector init error: %s", exc)
 
+    def close(self) -> None:
+        """Detach from the vector backend; the next use warms it up again."""
+        with self._vector_init_lock:
+            self.collection = None
+            self.client = None
+            self.embedding_func = None
+            self._vector_ready = False
+            self._vector_init_started = False
+
     def _maybe_retry_vector_backend(self) -> None:
         """Attempt to re-initialize the vector backend if in fallback mode."""
         if self._vector_memory_available and self.vector_ready:
@@ -459,3 +427,13 @@ def get_brain(data_dir: Path = None) -> PiperBrain:
         brain = PiperBrain(Path(data_dir))
         _brains[resolved] = brain
     return brain
+
+
+def release_brain(data_dir: Path) -> bool:
+    """Forget the cached brain for `data_dir` and release its Chroma client."""
+    brain = _brains.pop(str(Path(data_dir).resolve()), None)
+    if brain is None:
+        return False
+    brain.close()
+    release_chroma_client(brain.db_path)
+    return True
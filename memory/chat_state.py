@@ -21,7 +21,7 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List
 
-from .storage import append_jsonl, load_recent_turns, now_ts
+from .storage import append_jsonl, clear_jsonl, load_recent_turns, now_ts
 
 _LOG = logging.getLogger(__name__)
 
@@ -161,9 +161,7 @@ class ChatState:
             return
 
         try:
-            self.memory_path.parent.mkdir(parents=True, exist_ok=True)
-            with self.memory_path.open("w", encoding="utf-8") as f:
-                f.write("")
+            clear_jsonl(self.memory_path)
         except Exception as e:
             _LOG.warning("[ChatState] Error wiping memory file: %s", e)
 
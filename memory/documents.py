@@ -10,14 +10,13 @@ from pathlib import Path
 from typing import Any, Dict, List
 
 from config import data_state_path
+from memory.resource_pool import SharedEmbeddingFunction, chroma_client
 from memory.stores import JsonDictStore
 
 try:
     import chromadb
-    from chromadb.utils import embedding_functions
 except ImportError:
     chromadb = None
-    embedding_functions = None
 
 try:
     from pypdf import PdfReader
@@ -350,14 +349,17 @@ class DocumentMemoryManager:
     def _ensure_client(self) -> None:
         if self._client is not None and self._embedding_func is not None:
             return
-        if chromadb is None or embedding_functions is None:
+        if chromadb is None:
             raise RuntimeError("chromadb is not installed.")
-        vector_dir = self.data_dir / "vector_store"
-        vector_dir.mkdir(parents=True, exist_ok=True)
-        self._embedding_func = embedding_functions.SentenceTransformerEmbeddingFunction(
-            model_name="all-MiniLM-L6-v2"
-        )
-        self._client = chromadb.PersistentClient(path=str(vector_dir))
+        self._embedding_func = SharedEmbeddingFunction("all-MiniLM-L6-v2")
+        self._client = chroma_client(self.data_dir / "vector_store")
+
+    def close(self) -> None:
+        """Drop collection handles; the pooled client is released by the owner."""
+        self._client = None
+        self._collection = None
+        self._chunk_collection = None
+        self._embedding_func = None
 
     def _ensure_collection(self):
         if self._collection is not None:
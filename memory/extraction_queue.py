@@ -0,0 +1,234 @@
+"""memory/extraction_queue.py
+
+Coalescing queue for background world-model extraction.
+
+Qualifying turns used to start one thread and one LLM call each. During a
+busy conversation those calls queued on the LLM client's request lock ahead
+of the next interactive turn, and each one rewrote the whole graph.
+
+``ExtractionQueue`` collects the submitted chat windows instead. One worker
+thread waits until no window has arrived for ``debounce_s`` and the LLM
+client has been idle for ``idle_grace_s``, then hands every pending window to
+``run_batch`` at once. The batch runs under ``background_llm_request`` so an
+interactive request that needs the server cancels it; a cancelled batch goes
+back to the front of the queue and is retried on the next idle window. A
+batch preempted part-way raises ``BatchPreempted`` with only the unfinished
+part, so the retry does not redo chunks that were already applied.
+Each preemption doubles the idle time the retry waits for (up to
+``_MAX_IDLE_GRACE_S``), so a batch that keeps losing to a lively conversation
+stops burning server time until the conversation pauses.
+
+Workers are daemon threads, so ``drain_all`` is called at app shutdown to
+run whatever is still queued (including queues of evicted users) within a
+bounded wait.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, List, Optional
+
+from core.runtime_control import CancellationToken, OperationCancelled
+
+_LOG = logging.getLogger(__name__)
+
+ChatWindow = List[Dict[str, str]]
+
+_MAX_IDLE_GRACE_S = 8.0
+
+_QUEUES: "weakref.WeakSet[ExtractionQueue]" = weakref.WeakSet()
+
+
+class BatchPreempted(OperationCancelled):
+    """A batch was preempted after part of it had been applied and saved."""
+
+    def __init__(self, remaining: List[ChatWindow]) -> None:
+        super().__init__("preempted")
+        self.remaining = remaining
+
+
+def merge_chat_windows(windows: List[ChatWindow]) -> ChatWindow:
+    """Join overlapping recent-message windows into one chronological history.
+
+    Consecutive windows are sliding views of the same chat, so each window is
+    appended after the longest suffix of the merged history it repeats.
+    """
+    merged: ChatWindow = []
+    for window in windows:
+        items = [dict(item) for item in (window or []) if isinstance(item, dict)]
+        overlap = 0
+        for size in range(min(len(merged), len(items)), 0, -1):
+            if merged[-size:] == items[:size]:
+                overlap = size
+                break
+        merged.extend(items[overlap:])
+    return merged
+
+
+class ExtractionQueue:
+    """Debounced, idle-gated, preemptible batches of chat windows."""
+
+    def __init__(
+        self,
+        run_batch: Callable[[List[ChatWindow], CancellationToken], Any],
+        *,
+        llm_client: Any = None,
+        debounce_s: float = 2.0,
+        idle_grace_s: float = 0.5,
+        poll_s: float = 0.05,
+        name: str = "WorldModelExtraction",
+    ) -> None:
+        self._run_batch = run_batch
+        self.llm_client = llm_client
+        self.debounce_s = max(0.0, float(debounce_s))
+        self.idle_grace_s = max(0.0, float(idle_grace_s))
+        self._preempt_streak = 0
+        self.poll_s = max(0.005, float(poll_s))
+        self.name = name
+        self._cond = threading.Condition()
+        self._pending: List[ChatWindow] = []
+        self._last_submit_at = 0.0
+        self._running = False
+        self._flushing = 0
+        self._closed = False
+        self._worker: Optional[threading.Thread] = None
+        self.stats: dict[str, int] = {
+            "submitted": 0,
+            "batches": 0,
+            "preempted": 0,
+            "failed": 0,
+        }
+        _QUEUES.add(self)
+
+    @property
+    def pending_count(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def submit(self, window: ChatWindow) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            self._pending.append(list(window or []))
+            self._last_submit_at = time.monotonic()
+            self.stats["submitted"] += 1
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._worker_loop, name=self.name, daemon=True)
+                self._worker.start()
+            self._cond.notify_all()
+
+    def flush(self, timeout_s: Optional[float] = None) -> bool:
+        """Run pending windows without waiting out the debounce; True once drained."""
+        deadline = None if timeout_s is None else time.monotonic() + max(0.0, float(timeout_s))
+        with self._cond:
+            self._flushing += 1
+            self._cond.notify_all()
+            try:
+                while self._pending or self._running:
+                    if self._worker is None or not self._worker.is_alive():
+                        return False
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._cond.wait(self.poll_s if remaining is None else min(self.poll_s, remaining))
+                return True
+            finally:
+                self._flushing -= 1
+
+    def close(self) -> None:
+        """Refuse new windows; the worker drains what is queued, then exits.
+
+        Does not block, so evicting a user silo never waits on the LLM. Use
+        ``flush`` first when the caller needs the graph written.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def _llm_idle_for_s(self) -> float:
+        idle_for = getattr(self.llm_client, "idle_for_s", None)
+        if not callable(idle_for):
+            return float("inf")
+        try:
+            return float(idle_for())
+        except Exception:
+            return float("inf")
+
+    def _effective_grace_s(self) -> float:
+        if not self._preempt_streak:
+            return self.idle_grace_s
+        backoff = max(self.idle_grace_s, 0.05) * (2.0 ** min(self._preempt_streak, 8))
+        return min(_MAX_IDLE_GRACE_S, backoff)
+
+    def _take_batch(self) -> Optional[List[ChatWindow]]:
+        with self._cond:
+            while True:
+                if not self._pending:
+                    if self._closed:
+                        return None
+                    self._cond.wait()
+                    continue
+                if not (self._flushing or self._closed):
+                    quiet_for = time.monotonic() - self._last_submit_at
+                    if quiet_for < self.debounce_s:
+                        self._cond.wait(self.debounce_s - quiet_for)
+                        continue
+                if self._llm_idle_for_s() < self._effective_grace_s():
+                    self._cond.wait(self.poll_s)
+                    continue
+                batch, self._pending = self._pending, []
+                self._running = True
+                return batch
+
+    def _worker_loop(self) -> None:
+        while True:
+            batch = self._take_batch()
+            if batch is None:
+                return
+            token = CancellationToken()
+            try:
+                self._run_batch(batch, token)
+                with self._cond:
+                    self.stats["batches"] += 1
+                    self._preempt_streak = 0
+            except OperationCancelled as exc:
+                with self._cond:
+                    self._pending[:0] = exc.remaining if isinstance(exc, BatchPreempted) else batch
+                    self.stats["preempted"] += 1
+                    self._preempt_streak += 1
+            except Exception:
+                _LOG.warning("[%s] batch of %d windows failed", self.name, len(batch), exc_info=True)
+                with self._cond:
+                    self.stats["failed"] += 1
+            finally:
+                with self._cond:
+                    self._running = False
+                    self._cond.notify_all()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "pending": len(self._pending),
+                "running": self._running,
+                "debounce_s": self.debounce_s,
+                "idle_grace_s": self._effective_grace_s(),
+                **self.stats,
+            }
+
+
+def drain_all(timeout_s: float) -> bool:
+    """Close every live queue and wait, within one shared deadline, for each to drain.
+
+    Returns True when nothing was left pending.
+    """
+    deadline = time.monotonic() + max(0.0, float(timeout_s))
+    drained = True
+    for queue in list(_QUEUES):
+        queue.close()
+        if not queue.flush(timeout_s=max(0.0, deadline - time.monotonic())):
+            _LOG.warning("[%s] %d window(s) still pending at shutdown", queue.name, queue.pending_count)
+            drained = False
+    return drained
@@ -0,0 +1,200 @@
+"""memory/resource_pool.py
+
+Process-wide vector-memory resources shared by every user silo.
+
+- ``shared_embedder(model_name)`` returns one ``SharedEmbedder`` per model
+  name. The SentenceTransformer loads once, on first use, and concurrent
+  ``encode`` calls from different silos are coalesced into one model call.
+- ``SharedEmbeddingFunction`` is the Chroma adapter over that embedder; its
+  ``name()`` stays ``sentence_transformer`` so persisted collections reopen.
+- ``chroma_client(path)`` returns one Chroma ``PersistentClient`` per storage
+  directory, so a silo's brain and document memory use the same client.
+  ``release_chroma_client(path)`` drops it when the silo is evicted.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+_LOG = logging.getLogger(__name__)
+
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+
+def _load_sentence_transformer(model_name: str) -> Any:
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(model_name)
+
+
+@dataclass
+class _EncodeRequest:
+    texts: list[str]
+    done: threading.Event = field(default_factory=threading.Event)
+    vectors: list[list[float]] = field(default_factory=list)
+    error: Optional[BaseException] = None
+
+
+class SharedEmbedder:
+    """One embedding model, safe to call from any thread.
+
+    Callers queue their texts; whichever caller takes the model lock encodes
+    everything queued so far in one batch and hands each caller its slice.
+    """
+
+    def __init__(self, model_name: str = DEFAULT_EMBEDDING_MODEL, *, batch_size: int = 32) -> None:
+        self.model_name = str(model_name or "").strip() or DEFAULT_EMBEDDING_MODEL
+        self.batch_size = max(1, int(batch_size))
+        self._model: Any = None
+        self._load_lock = threading.Lock()
+        self._model_lock = threading.Lock()
+        self._pending_lock = threading.Lock()
+        self._pending: list[_EncodeRequest] = []
+        self.requests = 0
+        self.model_calls = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    def _ensure_model(self) -> Any:
+        if self._model is not None:
+            return self._model
+        with self._load_lock:
+            if self._model is None:
+                self._model = _load_sentence_transformer(self.model_name)
+        return self._model
+
+    def encode(self, texts: list[str]) -> list[list[float]]:
+        request = _EncodeRequest([str(item or "") for item in (texts or [])])
+        if not request.texts:
+            return []
+        with self._pending_lock:
+            self._pending.append(request)
+            self.requests += 1
+        while not request.done.is_set():
+            with self._model_lock:
+                if request.done.is_set():
+                    break
+                with self._pending_lock:
+                    batch, self._pending = self._pending, []
+                self._encode_batch(batch)
+        if request.error is not None:
+            raise request.error
+        return request.vectors
+
+    def _encode_batch(self, batch: list[_EncodeRequest]) -> None:
+        texts = [text for request in batch for text in request.texts]
+        try:
+            model = self._ensure_model()
+            self.model_calls += 1
+            vectors = model.encode(texts, batch_size=self.batch_size, show_progress_bar=False, convert_to_numpy=True)
+            rows = vectors.tolist() if hasattr(vectors, "tolist") else [list(vector) for vector in vectors]
+        except BaseException as exc:
+            for request in batch:
+                request.error = exc
+                request.done.set()
+            return
+        offset = 0
+        for request in batch:
+            request.vectors = rows[offset : offset + len(request.texts)]
+            offset += len(request.texts)
+            request.done.set()
+
+
+_EMBEDDERS: Dict[str, SharedEmbedder] = {}
+_EMBEDDERS_LOCK = threading.Lock()
+
+
+def shared_embedder(model_name: str = DEFAULT_EMBEDDING_MODEL) -> SharedEmbedder:
+    """Return the process-wide embedder for `model_name`."""
+    key = str(model_name or "").strip() or DEFAULT_EMBEDDING_MODEL
+    with _EMBEDDERS_LOCK:
+        embedder = _EMBEDDERS.get(key)
+        if embedder is None:
+            embedder = SharedEmbedder(key)
+            _EMBEDDERS[key] = embedder
+        return embedder
+
+
+class SharedEmbeddingFunction:
+    """Chroma embedding function backed by the shared embedder."""
+
+    def __init__(self, model_name: str = DEFAULT_EMBEDDING_MODEL) -> None:
+        self.model_name = str(model_name or "").strip() or DEFAULT_EMBEDDING_MODEL
+
+    @staticmethod
+    def name() -> str:
+        # Keep Chroma embedding-function identity compatible with the original
+        # SentenceTransformer wrapper so persisted collections remain reusable.
+        return "sentence_transformer"
+
+    @staticmethod
+    def build_from_config(config: Dict[str, object]) -> "SharedEmbeddingFunction":
+        return SharedEmbeddingFunction(str((config or {}).get("model_name") or DEFAULT_EMBEDDING_MODEL))
+
+    def get_config(self) -> Dict[str, object]:
+        return {"model_name": self.model_name}
+
+    def __call__(self, input: list[str]) -> list[list[float]]:
+        return shared_embedder(self.model_name).encode(list(input or []))
+
+    def embed_documents(self, texts: list[str] | None = None, *, input: list[str] | None = None) -> list[list[float]]:
+        items = texts if texts is not None else input
+        return self.__call__(items or [])
+
+    def embed_query(self, text: str | None = None, *, input: str | None = None) -> list[list[float]]:
+        query_text = text if text is not None else input
+        return self.__call__([query_text or ""])
+
+
+_CLIENTS: Dict[str, Any] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def chroma_client(path: Path) -> Any:
+    """Return the process-wide Chroma client for the store at `path`."""
+    resolved = str(Path(path).resolve())
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(resolved)
+        if client is None:
+            import chromadb
+
+            Path(path).mkdir(parents=True, exist_ok=True)
+            client = chromadb.PersistentClient(path=str(path))
+            _CLIENTS[resolved] = client
+        return client
+
+
+def release_chroma_client(path: Path) -> bool:
+    """Drop the pooled client for `path`; True when one was open."""
+    resolved = str(Path(path).resolve())
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.pop(resolved, None)
+    if client is None:
+        return False
+    # PersistentClient keeps its System in a class-level cache keyed by path;
+    # stop and forget it so the segment files and HNSW indexes are released.
+    try:
+        registry = getattr(type(client), "_identifier_to_system", None)
+        identifier = getattr(client, "_identifier", None)
+        if isinstance(registry, dict) and identifier in registry:
+            registry.pop(identifier).stop()
+    except Exception as exc:
+        _LOG.warning("[ResourcePool] Chroma client release failed for %s: %s", resolved, exc)
+    return True
+
+
+def pool_stats() -> Dict[str, Any]:
+    with _EMBEDDERS_LOCK:
+        embedders = {
+            name: {"loaded": embedder.loaded, "requests": embedder.requests, "model_calls": embedder.model_calls}
+            for name, embedder in _EMBEDDERS.items()
+        }
+    with _CLIENTS_LOCK:
+        clients = sorted(_CLIENTS)
+    return {"embedders": embedders, "chroma_clients": clients}
@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+_LOG = logging.getLogger(__name__)
+
+# Rows are keyed by (store, section, key) and read back in rowid order, which
+# keeps dict insertion order across upserts the way the JSON files did.
+# Top-level keys of a store's dict live in section "". A top-level dict listed
+# in a store's row sections (for example `entries` or `nodes`) is exploded
+# into one row per child so a single changed entry rewrites one row instead of
+# the whole document.
+_TOP = ""
+_SECTION_MARKER = '{"__rows__": true}'
+_SECTION_VALUE = {"__rows__": True}
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS state_rows (
+        store TEXT NOT NULL,
+        section TEXT NOT NULL,
+        key TEXT NOT NULL,
+        value TEXT NOT NULL,
+        PRIMARY KEY (store, section, key)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS state_stores (
+        store TEXT PRIMARY KEY,
+        revision INTEGER NOT NULL DEFAULT 0,
+        imported_from TEXT,
+        imported_at INTEGER
+    )
+    """,
+)
+
+RowKey = Tuple[str, str]
+
+
+def _encode(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def flatten_rows(data: Dict[str, Any], sections: Iterable[str] = ()) -> Dict[RowKey, str]:
+    """Map a store dict to {(section, key): encoded value}."""
+    section_names = set(sections)
+    rows: Dict[RowKey, str] = {}
+    for key, value in data.items():
+        key = str(key)
+        if key in section_names and isinstance(value, dict):
+            rows[(_TOP, key)] = _SECTION_MARKER
+            for child_key, child in value.items():
+                rows[(key, str(child_key))] = _encode(child)
+        else:
+            rows[(_TOP, key)] = _encode(value)
+    return rows
+
+
+def section_documents(rows: Iterable[Tuple[str, str, str]]) -> Dict[str, str]:
+    """Splice row values (already JSON text) into one JSON object per section."""
+    parts: Dict[str, list[str]] = {}
+    encode_key = json.encoder.encode_basestring
+    for section, key, value in rows:
+        parts.setdefault(section, []).append(f"{encode_key(key)}:{value}")
+    return {name: "{" + ",".join(items) + "}" for name, items in parts.items()}
+
+
+def assemble_documents(documents: Dict[str, str]) -> Dict[str, Any]:
+    sections = {name: json.loads(text) for name, text in documents.items()}
+    data: Dict[str, Any] = sections.pop(_TOP, {})
+    for key, value in list(data.items()):
+        if value == _SECTION_VALUE:
+            data[key] = sections.pop(key, {})
+    data.update(sections)
+    return data
+
+
+def unflatten_rows(rows: Iterable[Tuple[str, str, str]]) -> Dict[str, Any]:
+    return assemble_documents(section_documents(rows))
+
+
+class SqliteStateDatabase:
+    """WAL-mode SQLite file shared by the JsonDictStore family.
+
+    One connection per thread; writes go through `transaction()` which takes
+    the write lock up front (BEGIN IMMEDIATE) so read-modify-write sequences
+    from several threads or processes cannot lose updates. Every write bumps a
+    per-store revision that in-memory caches use to detect foreign changes.
+    """
+
+    def __init__(self, path: Path, *, busy_timeout_ms: int = 5000) -> None:
+        self.path = Path(path)
+        self.busy_timeout_ms = int(busy_timeout_ms)
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+        self._documents: Dict[str, Tuple[int, Dict[str, str]]] = {}
+
+    # -- connection -----------------------------------------------------------
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            return connection
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(self.path), isolation_level=None, timeout=self.busy_timeout_ms / 1000.0)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
+        with self._init_lock:
+            if not self._initialized:
+                for statement in _SCHEMA:
+                    connection.execute(statement)
+                self._initialized = True
+        self._local.connection = connection
+        self._local.depth = 0
+        return connection
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        connection = self._connection()
+        if self._local.depth:
+            self._local.depth += 1
+            try:
+                yield connection
+            finally:
+                self._local.depth -= 1
+            return
+        connection.execute("BEGIN IMMEDIATE")
+        self._local.depth = 1
+        try:
+            yield connection
+        except BaseException:
+            self._local.depth = 0
+            connection.execute("ROLLBACK")
+            raise
+        self._local.depth = 0
+        connection.execute("COMMIT")
+
+    def close(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    # -- reads ----------------------------------------------------------------
+
+    def load(self, store: str) -> Dict[str, Any]:
+        """Whole-store read; the spliced JSON is reused until the revision moves."""
+        revision = self.revision(store)
+        cached = self._documents.get(store)
+        if cached is not None and cached[0] == revision:
+            return assemble_documents(cached[1])
+        rows = self._connection().execute(
+            "SELECT section, key, value FROM state_rows WHERE store = ? ORDER BY rowid",
+            (store,),
+        ).fetchall()
+        documents = section_documents(rows)
+        # Inside a transaction the revision is not final (it may roll back).
+        if not self._local.depth:
+            self._documents[store] = (revision, documents)
+        return assemble_documents(documents)
+
+    def get(self, store: str, key: str, section: str = _TOP, default: Any = None) -> Optional[Any]:
+        """Decoded row value, or `default` when the row does not exist.
+
+        A stored JSON ``null`` decodes to None, so callers that must tell the
+        two apart pass a sentinel as `default`.
+        """
+        row = self._connection().execute(
+            "SELECT value FROM state_rows WHERE store = ? AND section = ? AND key = ?",
+            (store, section, str(key)),
+        ).fetchone()
+        if row is None:
+            return default
+        return {} if section == _TOP and row[0] == _SECTION_MARKER else json.loads(row[0])
+
+    def keys(self, store: str, section: str = _TOP) -> list[str]:
+        rows = self._connection().execute(
+            "SELECT key FROM state_rows WHERE store = ? AND section = ? ORDER BY rowid",
+            (store, section),
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def revision(self, store: str) -> int:
+        row = self._connection().execute(
+            "SELECT revision FROM state_stores WHERE store = ?",
+            (store,),
+        ).fetchone()
+        return int(row[0]) if row else 0
+
+    def has_store(self, store: str) -> bool:
+        row = self._connection().execute(
+            "SELECT 1 FROM state_stores WHERE store = ?",
+            (store,),
+        ).fetchone()
+        return row is not None
+
+    # -- writes ---------------------------------------------------------------
+
+    def _bump(self, connection: sqlite3.Connection, store: str) -> None:
+        connection.execute(
+            "INSERT INTO state_stores (store, revision) VALUES (?, 1) "
+            "ON CONFLICT(store) DO UPDATE SET revision = revision + 1",
+            (store,),
+        )
+
+    def put(self, store: str, key: str, value: Any, section: str = _TOP) -> None:
+        with self.transaction() as connection:
+            connection.execute(
+                "INSERT INTO state_rows (store, section, key, value) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(store, section, key) DO UPDATE SET value = excluded.value",
+                (store, section, str(key), _encode(value)),
+            )
+            self._bump(connection, store)
+
+    def delete(self, store: str, key: str, section: str = _TOP) -> bool:
+        with self.transaction() as connection:
+            cursor = connection.execute(
+                "DELETE FROM state_rows WHERE store = ? AND section = ? AND key = ?",
+                (store, section, str(key)),
+            )
+            if section == _TOP:
+                connection.execute(
+                    "DELETE FROM state_rows WHERE store = ? AND section = ?",
+                    (store, str(key)),
+                )
+            if cursor.rowcount:
+                self._bump(connection, store)
+            return bool(cursor.rowcount)
+
+    def replace(self, store: str, data: Dict[str, Any], sections: Iterable[str] = ()) -> int:
+        """Make the store's rows equal `data`, touching only changed rows.
+
+        Returns the number of rows written or deleted.
+        """
+        wanted = flatten_rows(data, sections)
+        with self.transaction() as connection:
+            current = {
+                (section, key): value
+                for section, key, value in connection.execute(
+                    "SELECT section, key, value FROM state_rows WHERE store = ?",
+                    (store,),
+                )
+            }
+            stale = [row_key for row_key in current if row_key not in wanted]
+            changed = [
+                (store, section, key, value)
+                for (section, key), value in wanted.items()
+                if current.get((section, key)) != value
+            ]
+            if stale:
+                connection.executemany(
+                    "DELETE FROM state_rows WHERE store = ? AND section = ? AND key = ?",
+                    [(store, section, key) for section, key in stale],
+                )
+            if changed:
+                connection.executemany(
+                    "INSERT INTO state_rows (store, section, key, value) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(store, section, key) DO UPDATE SET value = excluded.value",
+                    changed,
+                )
+            if stale or changed or store not in self._known_stores(connection, store):
+                self._bump(connection, store)
+            return len(stale) + len(changed)
+
+    @staticmethod
+    def _known_stores(connection: sqlite3.Connection, store: str) -> set[str]:
+        row = connection.execute("SELECT store FROM state_stores WHERE store = ?", (store,)).fetchone()
+        return {row[0]} if row else set()
+
+    # -- legacy import --------------------------------------------------------
+
+    def import_json_once(
+        self,
+        store: str,
+        sources: Iterable[Path],
+        *,
+        sections: Iterable[str] = (),
+    ) -> bool:
+        """Copy the first readable legacy JSON file into `store`, once.
+
+        Sources are tried in order (primary, then `.bak`). The JSON files are
+        left untouched so the previous backend stays usable as a rollback.
+        Returns True when rows were imported by this call.
+        """
+        section_names = tuple(sections)
+        with self.transaction() as connection:
+            if self._known_stores(connection, store):
+                return False
+            imported_from: Optional[Path] = None
+            data: Dict[str, Any] = {}
+            for source in sources:
+                source = Path(source)
+                if not source.exists():
+                    continue
+                try:
+                    loaded = json.loads(source.read_text(encoding="utf-8"))
+                except Exception as exc:
+                    _LOG.warning("[SqliteState] Skipping unreadable legacy store %s: %s", source.name, exc)
+                    continue
+                if isinstance(loaded, dict):
+                    data = loaded
+                    imported_from = source
+                    break
+            if data:
+                self.replace(store, data, section_names)
+            connection.execute(
+                "INSERT INTO state_stores (store, revision, imported_from, imported_at) VALUES (?, 1, ?, ?) "
+                "ON CONFLICT(store) DO UPDATE SET imported_from = excluded.imported_from, "
+                "imported_at = excluded.imported_at",
+                (store, str(imported_from) if imported_from else None, int(time.time())),
+            )
+        if imported_from is not None:
+            _LOG.info("[SqliteState] Imported %s into %s (%s).", imported_from.name, self.path.name, store)
+        return imported_from is not None
+
+
+_DATABASES: Dict[str, SqliteStateDatabase] = {}
+_DATABASES_LOCK = threading.Lock()
+
+
+def state_database_for(path: Path) -> SqliteStateDatabase:
+    """Return the process-wide database handle for `path`."""
+    resolved = str(Path(path).resolve())
+    with _DATABASES_LOCK:
+        database = _DATABASES.get(resolved)
+        if database is None:
+            database = SqliteStateDatabase(Path(path))
+            _DATABASES[resolved] = database
+        return database
@@ -3,7 +3,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
 
-from config import data_state_path
+from config import CFG, data_state_path
+from memory.sqlite_store import state_database_for
 from memory.stores import (
     EventStore,
     IntentStateStore,
@@ -25,14 +26,19 @@ class SharedStateOwner:
     intent_state_store: IntentStateStore
 
     @classmethod
-    def for_data_dir(cls, data_dir: Path) -> "SharedStateOwner":
+    def for_data_dir(cls, data_dir: Path, *, backend: str | None = None) -> "SharedStateOwner":
         base = Path(data_dir)
+        selected = str(backend or getattr(CFG, "STATE_STORE_BACKEND", "json") or "json").strip().lower()
+        database = state_database_for(data_state_path(base, "state.sqlite3")) if selected == "sqlite" else None
         return cls(
             data_dir=base,
-            task_store=TaskStore(data_state_path(base, "tasks.json")),
-            event_store=EventStore(data_state_path(base, "events.json")),
-            knowledge_store=KnowledgeStore(data_state_path(base, "knowledge.json")),
-            world_model_store=WorldModelStore(data_state_path(base, "world_model.json")),
-            situational_state_store=SituationalStateStore(data_state_path(base, "situational_state.json")),
-            intent_state_store=IntentStateStore(data_state_path(base, "intent_state.json")),
+            task_store=TaskStore(data_state_path(base, "tasks.json"), database=database),
+            event_store=EventStore(data_state_path(base, "events.json"), database=database),
+            knowledge_store=KnowledgeStore(data_state_path(base, "knowledge.json"), database=database),
+            world_model_store=WorldModelStore(data_state_path(base, "world_model.json"), database=database),
+            situational_state_store=SituationalStateStore(
+                data_state_path(base, "situational_state.json"),
+                database=database,
+            ),
+            intent_state_store=IntentStateStore(data_state_path(base, "intent_state.json"), database=database),
         )
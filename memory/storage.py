@@ -1,7 +1,9 @@
 ﻿# core/memory.py
 import json
 import os
+import shutil
 import tempfile
+import threading
 import time
 from pathlib import Path
 from typing import Dict, Any, List
@@ -40,19 +42,271 @@ def prune_jsonl_tail(path: Path, *, max_lines: int) -> bool:
             pass
         return False
 
+SEGMENT_DIR_SUFFIX = ".segments"
+_MANIFEST_NAME = "manifest.json"
+_MANIFEST_VERSION = 1
+_DEFAULT_SEGMENT_LINES = 4096
+_TAIL_BLOCK = 64 * 1024
+
+
+def default_segment_lines(max_lines: int | None) -> int:
+    """Segment size for a log capped at `max_lines`: retention overshoots by < 25%."""
+    if max_lines is None or int(max_lines or 0) <= 0:
+        return _DEFAULT_SEGMENT_LINES
+    return max(16, int(max_lines) // 4)
+
+
+def _count_lines(path: Path) -> int:
+    count = 0
+    try:
+        with path.open("rb") as handle:
+            for block in iter(lambda: handle.read(_TAIL_BLOCK), b""):
+                count += block.count(b"\n")
+    except FileNotFoundError:
+        return 0
+    return count
+
+
+def _tail_lines(path: Path, limit: int) -> List[bytes]:
+    """Last `limit` lines of `path`, read backwards in blocks."""
+    if limit <= 0:
+        return []
+    try:
+        handle = path.open("rb")
+    except FileNotFoundError:
+        return []
+    with handle:
+        position = handle.seek(0, os.SEEK_END)
+        buffer = b""
+        while position > 0 and buffer.count(b"\n") <= limit:
+            step = min(_TAIL_BLOCK, position)
+            position -= step
+            handle.seek(position)
+            buffer = handle.read(step) + buffer
+    lines = buffer.split(b"\n")
+    if lines and lines[-1] == b"":
+        lines.pop()
+    if position > 0:
+        # The first piece may be cut mid-line; enough whole lines follow it.
+        lines = lines[1:]
+    return lines[-limit:]
+
+
+class SegmentedJsonlLog:
+    """Append-only JSONL log split into fixed-size segments.
+
+    The newest segment is the file at `path` itself, so appends are plain
+    appends and a legacy single-file log is simply an oversized newest
+    segment. Sealed segments live in `<path>.segments/` next to a small
+    manifest; retention drops whole sealed segments, oldest first.
+
+    Rotation writes the manifest before moving the segment and the manifest
+    is reconciled with the directory on open, so a crash between the two
+    steps neither loses lines nor resurrects dropped ones.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.segment_dir = self.path.with_name(self.path.name + SEGMENT_DIR_SUFFIX)
+        self._lock = threading.Lock()
+        self._segments: List[Dict[str, Any]] = []
+        self._next_index = 1
+        self._active_lines: int | None = None
+        self._active_size = -1
+        self._load_manifest()
+
+    # -- manifest -------------------------------------------------------------
+
+    def _manifest_path(self) -> Path:
+        return self.segment_dir / _MANIFEST_NAME
+
+    def _load_manifest(self) -> None:
+        try:
+            payload = json.loads(self._manifest_path().read_text(encoding="utf-8"))
+        except Exception:
+            payload = {}
+        segments = [
+            {"name": str(item.get("name") or ""), "lines": int(item.get("lines") or 0)}
+            for item in (payload.get("segments") or [])
+            if isinstance(item, dict) and item.get("name")
+        ]
+        present = [item for item in segments if (self.segment_dir / item["name"]).exists()]
+        self._segments = present
+        self._next_index = max(int(payload.get("next") or 1), 1)
+        if self.segment_dir.is_dir():
+            listed = {item["name"] for item in present}
+            for child in self.segment_dir.glob("*.jsonl"):
+                if child.name not in listed:
+                    child.unlink(missing_ok=True)
+        if present != segments:
+            self._save_manifest()
+
+    def _save_manifest(self) -> None:
+        if not self._segments and not self.segment_dir.exists():
+            return
+        self.segment_dir.mkdir(parents=True, exist_ok=True)
+        payload = {"version": _MANIFEST_VERSION, "next": self._next_index, "segments": self._segments}
+        fd, tmp_name = tempfile.mkstemp(prefix=".manifest.", suffix=".tmp", dir=str(self.segment_dir), text=True)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8", newline="\n") as handle:
+                handle.write(json.dumps(payload, ensure_ascii=False))
+            os.replace(tmp_name, self._manifest_path())
+        except Exception:
+            try:
+                os.unlink(tmp_name)
+            except Exception:
+                pass
+            raise
+
+    # -- writes ---------------------------------------------------------------
+
+    @property
+    def total_lines(self) -> int:
+        with self._lock:
+            return self._sealed_lines() + self._current_active_lines()
+
+    def _sealed_lines(self) -> int:
+        return sum(item["lines"] for item in self._segments)
+
+    def _current_active_lines(self) -> int:
+        if self._segments and not self.segment_dir.is_dir():
+            # The whole log was removed behind our back (e.g. a silo reset).
+            self._segments = []
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if self._active_lines is None or size != self._active_size:
+            # First use, or the file was changed behind our back.
+            self._active_lines = _count_lines(self.path)
+            self._active_size = size
+        return self._active_lines
+
+    def append(self, line: str, *, max_lines: int | None = None, segment_lines: int | None = None) -> None:
+        segment_lines = max(1, int(segment_lines or default_segment_lines(max_lines)))
+        data = (line.rstrip("\n") + "\n").encode("utf-8")
+        with self._lock:
+            active_lines = self._current_active_lines()
+            ensure_parent(self.path)
+            with self.path.open("ab") as handle:
+                handle.write(data)
+                self._active_size = handle.tell()
+            self._active_lines = active_lines + 1
+            if self._active_lines >= segment_lines:
+                self._seal_active(segment_lines)
+            if max_lines is not None and int(max_lines or 0) > 0:
+                self._apply_retention(int(max_lines))
+
+    def _seal_active(self, segment_lines: int) -> None:
+        if self._active_lines and self._active_lines > segment_lines:
+            self._split_oversized_active(segment_lines)
+        name = f"{self._next_index:08d}.jsonl"
+        self._next_index += 1
+        self._segments.append({"name": name, "lines": int(self._active_lines or 0)})
+        self._save_manifest()
+        os.replace(self.path, self.segment_dir / name)
+        self.path.touch()
+        self._active_lines = 0
+        self._active_size = 0
+
+    def _split_oversized_active(self, segment_lines: int) -> None:
+        """One-time migration of a legacy log: seal all but the newest lines."""
+        lines = self.path.read_bytes().splitlines(keepends=True)
+        head, tail = lines[: len(lines) - segment_lines], lines[len(lines) - segment_lines :]
+        self.segment_dir.mkdir(parents=True, exist_ok=True)
+        for start in range(0, len(head), segment_lines):
+            chunk = head[start : start + segment_lines]
+            name = f"{self._next_index:08d}.jsonl"
+            self._next_index += 1
+            (self.segment_dir / name).write_bytes(b"".join(chunk))
+            self._segments.append({"name": name, "lines": len(chunk)})
+        self._save_manifest()
+        fd, tmp_name = tempfile.mkstemp(prefix=f".{self.path.name}.", suffix=".tmp", dir=str(self.path.parent))
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(b"".join(tail))
+        os.replace(tmp_name, self.path)
+        self._active_lines = len(tail)
+        self._active_size = self.path.stat().st_size
+
+    def _apply_retention(self, max_lines: int) -> None:
+        total = self._sealed_lines() + int(self._active_lines or 0)
+        dropped: List[Dict[str, Any]] = []
+        while self._segments and total - self._segments[0]["lines"] >= max_lines:
+            segment = self._segments.pop(0)
+            total -= segment["lines"]
+            dropped.append(segment)
+        if not dropped:
+            return
+        self._save_manifest()
+        for segment in dropped:
+            (self.segment_dir / segment["name"]).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            ensure_parent(self.path)
+            self.path.write_bytes(b"")
+            self._active_lines = 0
+            self._active_size = 0
+            self._segments = []
+            if self.segment_dir.exists():
+                shutil.rmtree(self.segment_dir, ignore_errors=True)
+
+    # -- reads ----------------------------------------------------------------
+
+    def tail(self, limit: int) -> List[str]:
+        """Last `limit` lines, newest segment first, oldest line first in the result."""
+        limit = int(limit or 0)
+        if limit <= 0:
+            return []
+        with self._lock:
+            self._current_active_lines()
+            lines = _tail_lines(self.path, limit)
+            for segment in reversed(self._segments):
+                if len(lines) >= limit:
+                    break
+                lines = _tail_lines(self.segment_dir / segment["name"], limit - len(lines)) + lines
+        return [line.decode("utf-8", errors="replace").rstrip("\r") for line in lines]
+
+
+_LOGS: Dict[str, SegmentedJsonlLog] = {}
+_LOGS_LOCK = threading.Lock()
+
+
+def segmented_log_for(path: Path) -> SegmentedJsonlLog:
+    """Return the process-wide segmented log for `path`."""
+    resolved = str(Path(path).resolve())
+    with _LOGS_LOCK:
+        log = _LOGS.get(resolved)
+        if log is None:
+            log = SegmentedJsonlLog(Path(path))
+            _LOGS[resolved] = log
+        return log
+
+
 def append_jsonl(path: Path, obj: Dict[str, Any], *, max_lines: int | None = None) -> None:
+    segmented_log_for(path).append(json.dumps(obj, ensure_ascii=False), max_lines=max_lines)
+
+
+def append_jsonl_file(path: Path, obj: Dict[str, Any], *, max_lines: int | None = None) -> None:
+    """Append to one plain JSONL file, pruning its head past `max_lines`.
+
+    For small debug logs read by external tools that expect a single file;
+    every prune rewrites the file, so large logs use `append_jsonl`.
+    """
     ensure_parent(path)
     with path.open("a", encoding="utf-8") as f:
         f.write(json.dumps(obj, ensure_ascii=False) + "\n")
     if max_lines is not None and int(max_lines or 0) > 0:
         prune_jsonl_tail(path, max_lines=int(max_lines))
 
+
+def clear_jsonl(path: Path) -> None:
+    segmented_log_for(path).clear()
+
+
 def load_recent_turns(path: Path, limit: int = 20) -> List[Dict[str, Any]]:
-    if not path.exists():
-        return []
-    lines = path.read_text(encoding="utf-8").splitlines()
     turns = []
-    for ln in lines[-limit:]:
+    for ln in segmented_log_for(path).tail(limit):
         try:
             turns.append(json.loads(ln))
         except Exception:
@@ -1,14 +1,19 @@
 from __future__ import annotations
 
 import datetime as _dt
+import heapq
 import json
 import logging
 import os
 import threading
 import time
 import tempfile
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional
+
+if TYPE_CHECKING:
+    from memory.sqlite_store import SqliteStateDatabase
 
 _LOG = logging.getLogger(__name__)
 
@@ -17,11 +22,45 @@ class JsonStoreError(RuntimeError):
     pass
 
 
+_MISSING = object()
+
+
 class JsonDictStore:
-    def __init__(self, path: Path):
+    """Dict persisted as one JSON document, or as rows of a shared SQLite file.
+
+    With `database` set, `load` / `save` keep their dict contract but read and
+    diff rows, and the item methods (`get_item`, `put_item`, `update_item`,
+    `delete_item`, `pop_item`) touch a single row. Top-level keys named in `ROW_SECTIONS` are
+    stored one row per child. The legacy JSON file (or its `.bak`) is imported
+    once on first use.
+    """
+
+    ROW_SECTIONS: tuple[str, ...] = ()
+
+    def __init__(self, path: Path, *, database: "SqliteStateDatabase | None" = None):
         self.path = Path(path)
         self._lock = threading.Lock()
+        self._mutation_lock = threading.RLock()
         self.backup_path = self.path.with_suffix(f"{self.path.suffix}.bak")
+        self.database = database
+        self.store_name = self.path.stem
+        self._imported = False
+
+    @property
+    def backend(self) -> str:
+        return "sqlite" if self.database is not None else "json"
+
+    def _db(self) -> "SqliteStateDatabase":
+        database = self.database
+        assert database is not None
+        if not self._imported:
+            database.import_json_once(
+                self.store_name,
+                (self.path, self.backup_path),
+                sections=self.ROW_SECTIONS,
+            )
+            self._imported = True
+        return database
 
     def _load_dict_file(self, path: Path) -> Dict[str, Any]:
         with path.open("r", encoding="utf-8") as handle:
@@ -64,6 +103,8 @@ class JsonDictStore:
         return archived
 
     def load(self) -> Dict[str, Any]:
+        if self.database is not None:
+            return self._db().load(self.store_name)
         if not self.path.exists():
             return {}
         try:
@@ -92,34 +133,84 @@ class JsonDictStore:
             raise JsonStoreError(f"Failed to load JSON store {self.path}: {exc}") from exc
 
     def save(self, data: Dict[str, Any]) -> None:
+        if self.database is not None:
+            self._db().replace(self.store_name, data, self.ROW_SECTIONS)
+            return
         self.path.parent.mkdir(parents=True, exist_ok=True)
         payload = json.dumps(data, indent=2, ensure_ascii=False)
         with self._lock:
             self._atomic_write_text(self.path, payload)
             self._atomic_write_text(self.backup_path, payload)
 
+    @contextmanager
+    def mutation(self) -> Iterator["JsonDictStore"]:
+        """Group a read-modify-write so concurrent writers cannot interleave."""
+        with self._mutation_lock:
+            if self.database is None:
+                yield self
+                return
+            with self._db().transaction():
+                yield self
+
+    def get_item(self, key: str, default: Any = None) -> Any:
+        if self.database is not None:
+            return self._db().get(self.store_name, str(key), default=default)
+        return self.load().get(key, default)
+
+    def put_item(self, key: str, value: Any) -> None:
+        with self.mutation():
+            if self.database is not None:
+                self._db().put(self.store_name, str(key), value)
+                return
+            data = self.load()
+            data[key] = value
+            self.save(data)
+
+    def update_item(self, key: str, update: Callable[[Any], Any], default: Any = None) -> Any:
+        """Store `update(current)` under `key`; one read and one write per call.
+
+        `current` is `default` when the key is absent. Returns the new value.
+        """
+        with self.mutation():
+            if self.database is not None:
+                value = update(self._db().get(self.store_name, str(key), default=default))
+                self._db().put(self.store_name, str(key), value)
+                return value
+            data = self.load()
+            value = update(data.get(key, default))
+            data[key] = value
+            self.save(data)
+            return value
+
+    def delete_item(self, key: str) -> bool:
+        return self.pop_item(key, _MISSING) is not _MISSING
+
+    def pop_item(self, key: str, default: Any = None) -> Any:
+        with self.mutation():
+            if self.database is not None:
+                value = self._db().get(self.store_name, str(key), default=_MISSING)
+                if value is _MISSING:
+                    return default
+                self._db().delete(self.store_name, str(key))
+                return value
+            data = self.load()
+            if key not in data:
+                return default
+            value = data.pop(key)
+            self.save(data)
+            return value
+
 
 class TaskStore(JsonDictStore):
     def add(self, task_name: str, status: str = "pending") -> None:
-        data = self.load()
-        data[task_name] = status
-        self.save(data)
+        self.put_item(task_name, status)
 
     def pop(self, task_name: str) -> Optional[str]:
-        data = self.load()
-        if task_name not in data:
-            return None
-        value = str(data.pop(task_name))
-        self.save(data)
-        return value
+        value = self.pop_item(task_name, _MISSING)
+        return None if value is _MISSING else str(value)
 
     def remove(self, task_name: str) -> bool:
-        data = self.load()
-        if task_name not in data:
-            return False
-        del data[task_name]
-        self.save(data)
-        return True
+        return self.delete_item(task_name)
 
     def pending_names(self) -> List[str]:
         data = self.load()
@@ -139,33 +230,24 @@ class EventStore(JsonDictStore):
         return str(value or ""), None
 
     def add(self, name: str, date_str: str, time_str: Optional[str] = None) -> None:
-        data = self.load()
         if time_str:
-            data[name] = {"date": date_str, "time": time_str}
-        else:
+            self.put_item(name, {"date": date_str, "time": time_str})
+            return
+
+        def _merge(existing: Any) -> Any:
             # Preserve existing time if entry already has one
-            existing = data.get(name)
             if isinstance(existing, dict) and existing.get("time"):
-                data[name] = {"date": date_str, "time": existing["time"]}
-            else:
-                data[name] = date_str
-        self.save(data)
+                return {"date": date_str, "time": existing["time"]}
+            return date_str
+
+        self.update_item(name, _merge)
 
     def pop(self, name: str) -> Optional[str]:
-        data = self.load()
-        if name not in data:
-            return None
-        value = str(data.pop(name))
-        self.save(data)
-        return value
+        value = self.pop_item(name, _MISSING)
+        return None if value is _MISSING else str(value)
 
     def remove(self, name: str) -> bool:
-        data = self.load()
-        if name not in data:
-            return False
-        del data[name]
-        self.save(data)
-        return True
+        return self.delete_item(name)
 
     def upcoming(self, *, now: Optional[_dt.datetime] = None) -> List[Dict[str, str]]:
         data = self.load()
@@ -233,19 +315,41 @@ class KnowledgeStore(JsonDictStore):
         return active
 
     def upsert_value(self, key: str, value: str, *, expires_at: Optional[int] = None) -> None:
-        data = self.load()
-        if expires_at is None:
-            existing = data.get(key)
+        if expires_at is not None:
+            self.put_item(key, {"value": value, "expires_at": expires_at})
+            return
+
+        def _merge(existing: Any) -> Dict[str, Any]:
+            expiry: Optional[int] = None
             if isinstance(existing, dict) and self._is_entry_active(existing):
-                expires_at = existing.get("expires_at")
+                expiry = existing.get("expires_at")
             elif any(str(key).strip().lower().startswith(prefix) for prefix in self._TRANSIENT_KEY_PREFIXES):
-                expires_at = int(time.time()) + self._DEFAULT_TRANSIENT_TTL_S
-        data[key] = {"value": value, "expires_at": expires_at}
-        self.save(data)
+                expiry = int(time.time()) + self._DEFAULT_TRANSIENT_TTL_S
+            return {"value": value, "expires_at": expiry}
+
+        self.update_item(key, _merge)
 
 
 class StructuredEntryStore(JsonDictStore):
+    """Entry store held in memory behind an expiry min-heap.
+
+    The payload is read from disk once and re-read only when the file's
+    mtime/size (or the SQLite store revision) changes underneath the store.
+    `load_payload` / `save_payload` remain the raw storage API; the entry methods work on the in-memory copy and
+    flush immediately, or once on exit when wrapped in `batch()`.
+    """
+
     SCHEMA_VERSION = 1
+    ROW_SECTIONS = ("entries",)
+
+    def __init__(self, path: Path, *, database: "SqliteStateDatabase | None" = None):
+        super().__init__(path, database=database)
+        self._state_lock = threading.RLock()
+        self._payload: Optional[Dict[str, Any]] = None
+        self._signature: Optional[tuple[int, ...]] = None
+        self._expiry_heap: List[tuple[int, str]] = []
+        self._batch_depth = 0
+        self._dirty = False
 
     @classmethod
     def default_payload(cls) -> Dict[str, Any]:
@@ -293,60 +397,134 @@ class StructuredEntryStore(JsonDictStore):
             data["metadata"] = {}
         data["metadata"]["updated_at"] = int(time.time())
         self.save(data)
+        with self._state_lock:
+            if self._payload is not None and self._payload is not payload:
+                self._payload = None
+            self._signature = self._file_signature()
+
+    def _file_signature(self) -> Optional[tuple[int, ...]]:
+        if self.database is not None:
+            return (self._db().revision(self.store_name),)
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _resolve_expires_at(self, entry: Dict[str, Any]) -> "int | None":
+        return entry.get("expires_at")
+
+    def _heap_key(self, entry: Dict[str, Any]) -> Optional[int]:
+        expires_at = self._resolve_expires_at(entry)
+        if expires_at is None:
+            return None
+        try:
+            return int(expires_at)
+        except Exception:
+            # Unparseable expiry: prune on the next pass, as before.
+            return 0
+
+    def _state(self) -> Dict[str, Any]:
+        with self._state_lock:
+            signature = self._file_signature()
+            if self._payload is None or (signature != self._signature and not self._dirty):
+                self._payload = self.load_payload()
+                self._signature = signature
+                self._rebuild_expiry_heap()
+            return self._payload
+
+    def _rebuild_expiry_heap(self) -> None:
+        self._expiry_heap = []
+        for key, entry in (self._payload or {}).get("entries", {}).items():
+            expiry = self._heap_key(entry)
+            if expiry is not None:
+                self._expiry_heap.append((expiry, key))
+        heapq.heapify(self._expiry_heap)
+
+    def _mark_dirty(self) -> None:
+        self._dirty = True
+        if self._batch_depth == 0:
+            self.flush()
+
+    @contextmanager
+    def batch(self) -> Iterator["StructuredEntryStore"]:
+        """Coalesce entry mutations into a single flush on exit."""
+        with self._state_lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._state_lock:
+                self._batch_depth -= 1
+                if self._batch_depth == 0 and self._dirty:
+                    self.flush()
+
+    def flush(self) -> None:
+        with self._state_lock:
+            if not self._dirty or self._payload is None:
+                return
+            self.save_payload(self._payload)
+            self._dirty = False
+
+    def _is_active(self, entry: Dict[str, Any], now_ts: int) -> bool:
+        expires_at = self._resolve_expires_at(entry)
+        if expires_at is None:
+            return True
+        try:
+            return int(expires_at) > now_ts
+        except Exception:
+            return False
 
     def load_active_entries(self) -> Dict[str, Dict[str, Any]]:
-        payload = self.load_payload()
         now_ts = int(time.time())
-        active: Dict[str, Dict[str, Any]] = {}
-        for key, entry in (payload.get("entries") or {}).items():
-            expires_at = entry.get("expires_at")
-            if expires_at is not None:
-                try:
-                    if int(expires_at) <= now_ts:
-                        continue
-                except Exception:
-                    continue
-            active[str(key)] = dict(entry)
-        return active
+        with self._state_lock:
+            entries = self._state()["entries"]
+            return {
+                str(key): dict(entry)
+                for key, entry in entries.items()
+                if self._is_active(entry, now_ts)
+            }
 
     def upsert_entry(self, key: str, entry: Dict[str, Any]) -> None:
-        payload = self.load_payload()
-        entries = dict(payload.get("entries") or {})
-        entries[str(key)] = dict(entry)
-        payload["entries"] = entries
-        self.save_payload(payload)
+        with self._state_lock:
+            entries = self._state()["entries"]
+            stored = dict(entry)
+            entries[str(key)] = stored
+            expiry = self._heap_key(stored)
+            if expiry is not None:
+                heapq.heappush(self._expiry_heap, (expiry, str(key)))
+            if len(self._expiry_heap) > 2 * len(entries) + 64:
+                self._rebuild_expiry_heap()
+            self._mark_dirty()
 
     def remove_entry(self, key: str) -> bool:
-        payload = self.load_payload()
-        entries = dict(payload.get("entries") or {})
-        if str(key) not in entries:
-            return False
-        del entries[str(key)]
-        payload["entries"] = entries
-        self.save_payload(payload)
-        return True
+        with self._state_lock:
+            entries = self._state()["entries"]
+            if str(key) not in entries:
+                return False
+            del entries[str(key)]
+            self._mark_dirty()
+            return True
 
     def prune_expired(self) -> int:
-        payload = self.load_payload()
-        entries = dict(payload.get("entries") or {})
+        """Drop expired entries; only touches heap items that are due."""
         now_ts = int(time.time())
-        kept: Dict[str, Dict[str, Any]] = {}
-        removed = 0
-        for key, entry in entries.items():
-            expires_at = entry.get("expires_at")
-            if expires_at is not None:
-                try:
-                    if int(expires_at) <= now_ts:
-                        removed += 1
-                        continue
-                except Exception:
-                    removed += 1
+        with self._state_lock:
+            entries = self._state()["entries"]
+            removed = 0
+            heap = self._expiry_heap
+            while heap and heap[0][0] <= now_ts:
+                _expiry, key = heapq.heappop(heap)
+                entry = entries.get(key)
+                # Stale heap item: the entry was removed or re-upserted with a
+                # later expiry (which pushed its own item).
+                if entry is None or self._is_active(entry, now_ts):
                     continue
-            kept[key] = entry
-        if removed:
-            payload["entries"] = kept
-            self.save_payload(payload)
-        return removed
+                del entries[key]
+                removed += 1
+            if removed:
+                self._mark_dirty()
+            return removed
 
 
 class SituationalStateStore(StructuredEntryStore):
@@ -376,47 +554,10 @@ class IntentStateStore(StructuredEntryStore):
                     return None
         return expires_at
 
-    def load_active_entries(self) -> Dict[str, Dict[str, Any]]:
-        payload = self.load_payload()
-        now_ts = int(time.time())
-        active: Dict[str, Dict[str, Any]] = {}
-        for key, entry in (payload.get("entries") or {}).items():
-            expires_at = self._resolve_expires_at(entry)
-            if expires_at is not None:
-                try:
-                    if int(expires_at) <= now_ts:
-                        continue
-                except Exception:
-                    continue
-            active[str(key)] = dict(entry)
-        return active
-
-    def prune_expired(self) -> int:
-        """Override to apply DEFAULT_TTL_SECONDS to entries without explicit expires_at."""
-        payload = self.load_payload()
-        entries = dict(payload.get("entries") or {})
-        now_ts = int(time.time())
-        kept: Dict[str, Dict[str, Any]] = {}
-        removed = 0
-        for key, entry in entries.items():
-            expires_at = self._resolve_expires_at(entry)
-            if expires_at is not None:
-                try:
-                    if int(expires_at) <= now_ts:
-                        removed += 1
-                        continue
-                except Exception:
-                    removed += 1
-                    continue
-            kept[key] = entry
-        if removed:
-            payload["entries"] = kept
-            self.save_payload(payload)
-        return removed
-
 
 class WorldModelStore(JsonDictStore):
     SCHEMA_VERSION = 1
+    ROW_SECTIONS = ("nodes",)
     ROOT_ENTITY_ID = "person:user"
 
     @classmethod
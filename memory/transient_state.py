@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import re
+import threading
 import time
+from contextlib import ExitStack
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, Dict, Iterable, List
 
@@ -96,6 +98,12 @@ _DISPOSITION_EXCLUDE_RE = re.compile(
 )
 
 
+# World-model files whose legacy situational attributes were already drained
+# in this process.
+_LEGACY_MIGRATED: set[str] = set()
+_LEGACY_MIGRATED_LOCK = threading.Lock()
+
+
 def _slugify(text: str) -> str:
     cleaned = re.sub(r"[^a-z0-9]+", "-", str(text or "").strip().lower())
     cleaned = re.sub(r"-{2,}", "-", cleaned).strip("-")
@@ -166,22 +174,30 @@ class TransientStateManager:
         if not cleaned:
             return
 
-        self._migrate_legacy_world_model_state()
-        self.situational_store.prune_expired()
-        self.intent_store.prune_expired()
-
         # Route disposition/personality traits to the durable world model so
         # they are not discarded when short-TTL situational state is pruned.
         self._try_ingest_disposition(cleaned)
 
-        for entry in self._extract_situational_entries(cleaned):
-            self.situational_store.upsert_entry(entry.key, entry.as_payload())
+        with self._batched():
+            self.situational_store.prune_expired()
+            self.intent_store.prune_expired()
+
+            for entry in self._extract_situational_entries(cleaned):
+                self.situational_store.upsert_entry(entry.key, entry.as_payload())
 
-        for entry in self._extract_intent_entries(cleaned):
-            self.intent_store.upsert_entry(entry.key, entry.as_payload())
+            for entry in self._extract_intent_entries(cleaned):
+                self.intent_store.upsert_entry(entry.key, entry.as_payload())
+
+    def _batched(self) -> ExitStack:
+        """One flush per store for everything done inside the block."""
+        stack = ExitStack()
+        for store in (self.situational_store, self.intent_store):
+            batch = getattr(store, "batch", None)
+            if callable(batch):
+                stack.enter_context(batch())
+        return stack
 
     def render_situational_state(self, query: str = "", *, max_items: int = 4) -> str:
-        self._migrate_legacy_world_model_state()
         self.situational_store.prune_expired()
         entries = self._rank_entries(self.situational_store.load_active_entries().values(), query=query)
         if not entries:
@@ -211,7 +227,6 @@ class TransientStateManager:
         return "\n".join(lines)
 
     def list_situational_entries(self) -> Dict[str, Dict[str, Any]]:
-        self._migrate_legacy_world_model_state()
         self.situational_store.prune_expired()
         return self.situational_store.load_active_entries()
 
@@ -230,21 +245,22 @@ class TransientStateManager:
     ) -> int:
         if str(kind or "").strip().lower() not in {"task", "event"}:
             return 0
-        self.intent_store.prune_expired()
-        active_entries = self.intent_store.load_active_entries()
         removed = 0
-        for key, entry in active_entries.items():
-            if not self._intent_matches_operational_target(
-                entry,
-                kind=kind,
-                action=action,
-                name=name,
-                source_text=source_text,
-                scheduled_date=scheduled_date,
-            ):
-                continue
-            if self.intent_store.remove_entry(key):
-                removed += 1
+        with self._batched():
+            self.intent_store.prune_expired()
+            active_entries = self.intent_store.load_active_entries()
+            for key, entry in active_entries.items():
+                if not self._intent_matches_operational_target(
+                    entry,
+                    kind=kind,
+                    action=action,
+                    name=name,
+                    source_text=source_text,
+                    scheduled_date=scheduled_date,
+                ):
+                    continue
+                if self.intent_store.remove_entry(key):
+                    removed += 1
         return removed
 
     def _try_ingest_disposition(self, text: str) -> None:
@@ -276,10 +292,26 @@ class TransientStateManager:
         except Exception:
             pass
 
+    def _legacy_migration_key(self) -> str:
+        store_path = getattr(getattr(self.knowledge_mgr, "store", None), "path", None)
+        if store_path is not None:
+            return str(store_path)
+        return f"id:{id(self.knowledge_mgr)}"
+
     def _migrate_legacy_world_model_state(self) -> None:
+        """Drain situational attributes out of the world model, once per process."""
         if self.knowledge_mgr is None or not hasattr(self.knowledge_mgr, "drain_legacy_situational_entries"):
             return
+        migration_key = self._legacy_migration_key()
+        with _LEGACY_MIGRATED_LOCK:
+            if migration_key in _LEGACY_MIGRATED:
+                return
+            _LEGACY_MIGRATED.add(migration_key)
         migrated = list(self.knowledge_mgr.drain_legacy_situational_entries() or [])
+        with self._batched():
+            self._store_legacy_entries(migrated)
+
+    def _store_legacy_entries(self, migrated: List[Dict[str, Any]]) -> None:
         for item in migrated:
             value = _clean_fragment(str(item.get("value") or ""))
             if not value:
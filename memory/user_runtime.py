@@ -10,12 +10,14 @@ import shutil
 import threading
 import time
 import unicodedata
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-from config import data_state_path
+from config import CFG, data_state_path
 from memory.state_owner import SharedStateOwner
+from memory.storage import clear_jsonl
 from memory.stores import JsonDictStore, WorldModelStore
 
 if TYPE_CHECKING:
@@ -1084,6 +1086,7 @@ class ActiveUserRuntime:
         admin_user_id: str = DEFAULT_ADMIN_USER_ID,
         admin_name: str = DEFAULT_ADMIN_NAME,
         default_style_filename: str = "default.style",
+        max_resident_users: int | None = None,
     ) -> None:
         self.data_dir = Path(data_dir)
         self.llm_client = llm_client
@@ -1098,6 +1101,12 @@ class ActiveUserRuntime:
         self._knowledge_managers: dict[str, WorldModelManager] = {}
         self._transient_managers: dict[str, TransientStateManager] = {}
         self._document_managers: dict[str, DocumentMemoryManager] = {}
+        # Silos with live managers, least recently used first. The active user
+        # and the admin are never evicted.
+        self._resident_users: OrderedDict[str, None] = OrderedDict()
+        if max_resident_users is None:
+            max_resident_users = int(getattr(CFG, "MAX_RESIDENT_USERS", 4))
+        self.max_resident_users = max(2, int(max_resident_users))
         self._admin_unlocked = False
         self._pending_admin_password_user_id = ""
         self._normalize_boot_identity_state()
@@ -1748,14 +1757,14 @@ class ActiveUserRuntime:
         except FileNotFoundError:
             return
         except Exception:
-            for child in (
-                target_dir / "state" / "memory.jsonl",
-                target_dir / "conversation_summary.json",
-            ):
-                try:
-                    child.unlink(missing_ok=True)
-                except Exception:
-                    pass
+            try:
+                clear_jsonl(target_dir / "state" / "memory.jsonl")
+            except Exception:
+                pass
+            try:
+                (target_dir / "conversation_summary.json").unlink(missing_ok=True)
+            except Exception:
+                pass
 
     def _initialize_profile_state(self, profile: UserProfile) -> None:
         user_data_dir = profile.resolved_data_dir(self.data_dir)
@@ -1803,6 +1812,7 @@ class ActiveUserRuntime:
     def state_owner_for(self, user_id: str) -> SharedStateOwner:
         key = _slugify(user_id)
         with self._lock:
+            self._touch_resident_user(key)
             owner = self._state_owners.get(key)
             if owner is not None:
                 return owner
@@ -1819,6 +1829,7 @@ class ActiveUserRuntime:
     def knowledge_manager_for(self, user_id: str) -> WorldModelManager:
         key = _slugify(user_id)
         with self._lock:
+            self._touch_resident_user(key)
             manager = self._knowledge_managers.get(key)
             if manager is not None:
                 return manager
@@ -1833,6 +1844,8 @@ class ActiveUserRuntime:
                 self.llm_client,
                 world_model_store=owner.world_model_store,
                 knowledge_store=owner.knowledge_store,
+                extraction_debounce_s=float(getattr(CFG, "WORLD_MODEL_EXTRACTION_DEBOUNCE_S", 2.0)),
+                extraction_max_messages=int(getattr(CFG, "WORLD_MODEL_EXTRACTION_MAX_MESSAGES", 24)),
             )
             if hasattr(manager, "set_graph_saved_callback"):
                 if key not in {self.registry.admin_user_id, DEFAULT_GUEST_USER_ID}:
@@ -1853,6 +1866,7 @@ class ActiveUserRuntime:
     def transient_state_manager_for(self, user_id: str) -> TransientStateManager:
         key = _slugify(user_id)
         with self._lock:
+            self._touch_resident_user(key)
             manager = self._transient_managers.get(key)
             if manager is not None:
                 return manager
@@ -1873,6 +1887,7 @@ class ActiveUserRuntime:
     def document_manager_for(self, user_id: str) -> DocumentMemoryManager:
         key = _slugify(user_id)
         with self._lock:
+            self._touch_resident_user(key)
             manager = self._document_managers.get(key)
             if manager is not None:
                 return manager
@@ -1894,11 +1909,73 @@ class ActiveUserRuntime:
             raise KeyError(f"Unknown user_id: {user_id}")
         from memory.brain import get_brain
 
-        return get_brain(profile.resolved_data_dir(self.data_dir))
+        with self._lock:
+            self._touch_resident_user(_slugify(user_id))
+            return get_brain(profile.resolved_data_dir(self.data_dir))
 
     def current_brain(self) -> Any:
         return self.brain_for(self.active_profile().user_id)
 
+    def resident_users(self) -> list[str]:
+        """User ids with live managers, least recently used first."""
+        with self._lock:
+            return list(self._resident_users)
+
+    def _touch_resident_user(self, key: str) -> None:
+        self._resident_users[key] = None
+        self._resident_users.move_to_end(key)
+        if len(self._resident_users) <= self.max_resident_users:
+            return
+        pinned = {key, self.registry.admin_user_id, _slugify(self.active_profile().user_id)}
+        for candidate in list(self._resident_users):
+            if len(self._resident_users) <= self.max_resident_users:
+                break
+            if candidate not in pinned:
+                self.evict_user(candidate)
+
+    def evict_user(self, user_id: str) -> bool:
+        """Flush and drop one silo's managers, brain and pooled Chroma client.
+
+        The next ``*_for`` call rebuilds them from disk.
+        """
+        key = _slugify(user_id)
+        with self._lock:
+            was_resident = key in self._resident_users
+            self._resident_users.pop(key, None)
+            owner = self._state_owners.pop(key, None)
+            knowledge = self._knowledge_managers.pop(key, None)
+            self._transient_managers.pop(key, None)
+            documents = self._document_managers.pop(key, None)
+        close_knowledge = getattr(knowledge, "close", None)
+        if callable(close_knowledge):
+            # Already-queued world-model refreshes still drain in the background;
+            # app exit waits for them through extraction_queue.drain_all().
+            close_knowledge()
+        if owner is not None:
+            for store in (
+                owner.task_store,
+                owner.event_store,
+                owner.knowledge_store,
+                owner.world_model_store,
+                owner.situational_state_store,
+                owner.intent_state_store,
+            ):
+                flush = getattr(store, "flush", None)
+                if callable(flush):
+                    flush()
+        if documents is not None:
+            documents.close()
+        profile = self.registry.profile_for_id(key)
+        if profile is not None:
+            from memory.brain import release_brain
+            from memory.resource_pool import release_chroma_client
+
+            silo_dir = profile.resolved_data_dir(self.data_dir)
+            released = release_brain(silo_dir)
+            released = release_chroma_client(silo_dir / "vector_store") or released
+            was_resident = was_resident or released
+        return was_resident
+
     def _active_public_profile_gap_lines(self, profile: UserProfile) -> list[str]:
         if profile.is_admin:
             return []
@@ -9,6 +9,10 @@ import time
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
 
+from core.runtime_control import CancellationToken, OperationCancelled
+from llm.llm_server_client import background_llm_request, llm_role
+
+from .extraction_queue import BatchPreempted, ExtractionQueue, merge_chat_windows
 from .knowledge_policy import (
     PROFILE_REFRESH_EVERY_CALLS,
     default_expiry_for_transient_fact,
@@ -270,6 +274,8 @@ class WorldModelManager:
         world_model_store: WorldModelStore,
         knowledge_store: Optional[KnowledgeStore] = None,
         memory_brain: Any | None = None,
+        extraction_debounce_s: float = 2.0,
+        extraction_max_messages: int = 24,
     ):
         self.data_dir = Path(data_dir)
         self.llm = llm_client
@@ -283,6 +289,12 @@ class WorldModelManager:
         self._graph_saved_callback = None
         self._profile_refresh_counter = 0
         self._last_profile_digest = ""
+        self.extraction_max_messages = max(8, int(extraction_max_messages))
+        self.extraction_queue = ExtractionQueue(
+            self._run_extraction_batch,
+            llm_client=llm_client,
+            debounce_s=extraction_debounce_s,
+        )
 
         self.store.save_graph(self.store.load_graph())
         self._migrate_legacy_knowledge_if_needed()
@@ -601,33 +613,74 @@ class WorldModelManager:
                 self._profile_refresh_counter = 0
             self._last_profile_digest = digest
 
-        self._log("[WorldModel] Refreshing world model...")
-        thread = threading.Thread(target=self._do_update_world_model, args=(recent_history,), daemon=True)
-        thread.start()
+        self._log("[WorldModel] World model refresh queued.")
+        self.extraction_queue.submit(recent_history)
 
     def update_world_model_async(self, recent_history: List[Dict[str, str]]) -> None:
         self.update_knowledge_async(recent_history)
 
-    def _do_update_world_model(self, history: List[Dict[str, str]]) -> None:
+    def flush_pending_extraction(self, timeout_s: Optional[float] = None) -> bool:
+        return self.extraction_queue.flush(timeout_s)
+
+    def close(self) -> None:
+        self.extraction_queue.close()
+
+    def _run_extraction_batch(self, windows: List[List[Dict[str, str]]], cancel_token: CancellationToken) -> None:
         try:
-            current_graph = self.load_graph()
-            user_history_text = history_user_text(history)
-            prompt = build_world_model_extraction_prompt(current_graph, history)
-            result = self.llm.generate([{"role": "user", "content": prompt}], temperature=0.1)
+            self._extract_world_model_batch(windows, cancel_token)
+        except OperationCancelled:
+            self._log("[WorldModel] Extraction yielded to an interactive request; will retry when idle.")
+            raise
+        except Exception as exc:
+            self._log(f"[WorldModel] Update failed: {exc}")
+            raise
+
+    def _extract_world_model_batch(
+        self,
+        windows: List[List[Dict[str, str]]],
+        cancel_token: CancellationToken,
+    ) -> None:
+        """Extract from every queued chat window and save the graph once.
+
+        Overlapping windows are merged into one history and sent in chunks of
+        at most ``extraction_max_messages``; each chunk sees the graph as
+        patched by the previous one. When an interactive request preempts a
+        chunk, the chunks already applied are saved and ``BatchPreempted``
+        carries only the rest of the history back to the queue; a half-run
+        chunk is never written.
+        """
+        history = merge_chat_windows(windows)
+        if not history:
+            return
+        current_graph = self.load_graph()
+        chunk_size = self.extraction_max_messages
+        changed = False
+        for start in range(0, len(history), chunk_size):
+            chunk = history[start : start + chunk_size]
+            prompt = build_world_model_extraction_prompt(current_graph, chunk, max_messages=chunk_size)
+            try:
+                with llm_role("world_model"), background_llm_request(cancel_token):
+                    result = self.llm.generate(
+                        [{"role": "user", "content": prompt}],
+                        temperature=0.0,
+                        cancel_token=cancel_token,
+                    )
+            except OperationCancelled as exc:
+                if changed:
+                    self._save_graph(current_graph)
+                raise BatchPreempted([history[start:]]) from exc
             parsed = self._parse_json_result(result)
             if not parsed:
                 self._log("[WorldModel] Extractor returned no JSON.")
-                return
-
-            changed = self._apply_patch(current_graph, parsed, user_history_text=user_history_text)
-            if not changed:
-                self._log("[WorldModel] No graph changes detected.")
-                return
+                continue
+            if self._apply_patch(current_graph, parsed, user_history_text=history_user_text(chunk)):
+                changed = True
 
-            self._save_graph(current_graph)
-            self._log("[WorldModel] world_model.json updated.")
-        except Exception as exc:
-            self._log(f"[WorldModel] Update failed: {exc}")
+        if not changed:
+            self._log("[WorldModel] No graph changes detected.")
+            return
+        self._save_graph(current_graph)
+        self._log(f"[WorldModel] world_model.json updated from {len(windows)} queued refresh(es).")
 
     def _apply_patch(self, graph: Dict[str, Any], payload: Dict[str, Any], *, user_history_text: str) -> bool:
         changed = False
@@ -1413,7 +1466,8 @@ class WorldModelManager:
                 text_history += f"{role}: {content}\n"
 
             prompt = build_memory_archivist_prompt(text_history)
-            result = self.llm.generate([{"role": "user", "content": prompt}], temperature=0.1)
+            with llm_role("memory_consolidation"):
+                result = self.llm.generate([{"role": "user", "content": prompt}], temperature=0.0)
 
             facts: list[str] = []
             try:
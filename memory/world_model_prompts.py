@@ -54,8 +54,13 @@ def _graph_digest(current_graph: Dict[str, Any]) -> str:
     return json.dumps(payload, indent=2, ensure_ascii=False)
 
 
-def build_world_model_extraction_prompt(current_graph: Dict[str, Any], history: List[Dict[str, Any]]) -> str:
-    history_slice = history[-8:]
+def build_world_model_extraction_prompt(
+    current_graph: Dict[str, Any],
+    history: List[Dict[str, Any]],
+    *,
+    max_messages: int = 8,
+) -> str:
+    history_slice = history[-max(1, int(max_messages)):]
     history_text = "\n".join(
         f"{m.get('role', 'user')}: {m.get('content', '')}"
         for m in history_slice
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from _bootstrap import ROOT_DIR
+
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from core.engines.browser_pool import BrowserContextPool
+from core.engines.computer_use_engine import ComputerUseEngine
+from scripts.computer_use_fixture_server import FIXTURE_ROOT, running_fixture_server
+
+
+_MEDIA_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="utf-8" />
+  <title>Media Heavy Fixture</title>
+</head>
+<body>
+  <h1 id="headline">Media Heavy Fixture</h1>
+  <p id="status">Text that extraction actually needs.</p>
+  {images}
+  <a id="home-link" href="index.html">Home</a>
+</body>
+</html>
+"""
+
+
+@dataclass
+class PoolScenarioResult:
+    name: str
+    prewarm_ms: float = 0.0
+    first_action_ms: float = 0.0
+    per_action_ms_p50: float = 0.0
+    per_action_ms_max: float = 0.0
+    next_turn_first_action_ms: float = 0.0
+    launches: int = 0
+    contexts_reused: int = 0
+    blocked_requests: int = 0
+    failures: list[str] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class BrowserPoolBenchmarkReport:
+    success: bool
+    playwright_available: bool
+    iterations: int
+    scenarios: list[dict]
+    note: str = ""
+
+
+def _build_fixture_root(target: Path, *, image_count: int, image_kb: int) -> Path:
+    shutil.copytree(FIXTURE_ROOT, target)
+    media_dir = target / "media"
+    media_dir.mkdir(parents=True, exist_ok=True)
+    tags = []
+    for index in range(image_count):
+        name = f"blob-{index:02d}.png"
+        (media_dir / name).write_bytes(os.urandom(image_kb * 1024))
+        tags.append(f'<img src="media/{name}" alt="" width="32" height="32" />')
+    (target / "media_heavy.html").write_text(_MEDIA_PAGE.format(images="\n  ".join(tags)), encoding="utf-8")
+    return target
+
+
+def _timed(engine: ComputerUseEngine, payload: dict, failures: list[str]) -> float:
+    started = time.perf_counter()
+    result = engine.exec_browser_op(json.dumps(payload, ensure_ascii=False))
+    elapsed_ms = (time.perf_counter() - started) * 1000.0
+    if str(result.get("status") or "").upper() != "EXECUTED":
+        failures.append(f"{payload.get('action')}: {result.get('summary')}")
+    return elapsed_ms
+
+
+def _run_scenario(
+    *,
+    name: str,
+    base_url: str,
+    temp_root: Path,
+    prewarm: bool,
+    blocked_types: tuple[str, ...],
+    idle_contexts: int,
+    iterations: int,
+) -> PoolScenarioResult:
+    result = PoolScenarioResult(name=name)
+    pool = BrowserContextPool(blocked_resource_types=blocked_types, max_idle_contexts=idle_contexts)
+    workspace = temp_root / name / "workspace"
+    engine = ComputerUseEngine(data_dir=temp_root / name / "data", workspace=workspace, browser_pool=pool)
+    allowed = ["127.0.0.1"]
+    try:
+        if prewarm:
+            started = time.perf_counter()
+            try:
+                pool.warm()
+            except Exception as exc:
+                result.failures.append(f"prewarm: {exc}")
+                return result
+            result.prewarm_ms = (time.perf_counter() - started) * 1000.0
+
+        result.first_action_ms = _timed(
+            engine,
+            {"action": "goto_url", "url": f"{base_url}/media_heavy.html", "allowed_domains": allowed},
+            result.failures,
+        )
+        samples: list[float] = []
+        for _ in range(iterations):
+            samples.append(_timed(engine, {"action": "extract_text", "selector": "#status"}, result.failures))
+            samples.append(_timed(engine, {"action": "click", "selector": "#home-link"}, result.failures))
+            samples.append(_timed(engine, {"action": "go_back"}, result.failures))
+        if samples:
+            result.per_action_ms_p50 = statistics.median(samples)
+            result.per_action_ms_max = max(samples)
+
+        # End-of-turn suspend followed by the next turn's first navigation.
+        engine.suspend()
+        result.next_turn_first_action_ms = _timed(
+            engine,
+            {"action": "goto_url", "url": f"{base_url}/media_heavy.html", "allowed_domains": allowed},
+            result.failures,
+        )
+        result.launches = pool.stats["launches"]
+        result.contexts_reused = pool.stats["contexts_reused"]
+        result.blocked_requests = pool.stats["blocked_requests"]
+    finally:
+        engine.shutdown()
+    return result
+
+
+def run_benchmark(*, iterations: int, image_count: int, image_kb: int) -> BrowserPoolBenchmarkReport:
+    try:
+        from playwright.sync_api import sync_playwright  # noqa: F401
+    except Exception:
+        return BrowserPoolBenchmarkReport(
+            success=False,
+            playwright_available=False,
+            iterations=iterations,
+            scenarios=[],
+            note="Playwright is not installed; nothing to measure.",
+        )
+    temp_root = Path(tempfile.mkdtemp(prefix="piper-browser-pool-bench-"))
+    try:
+        fixture_root = _build_fixture_root(temp_root / "site", image_count=image_count, image_kb=image_kb)
+        scenarios: list[PoolScenarioResult] = []
+        with running_fixture_server(fixture_root) as base_url:
+            for name, prewarm, blocked, idle in (
+                ("cold_unfiltered_no_recycle", False, (), 0),
+                ("pool_cold_filtered", False, ("image", "media", "font"), 2),
+                ("pool_prewarmed_filtered", True, ("image", "media", "font"), 2),
+            ):
+                scenarios.append(
+                    _run_scenario(
+                        name=name,
+                        base_url=base_url,
+                        temp_root=temp_root,
+                        prewarm=prewarm,
+                        blocked_types=blocked,
+                        idle_contexts=idle,
+                        iterations=iterations,
+                    )
+                )
+        success = all(not item.failures for item in scenarios)
+        return BrowserPoolBenchmarkReport(
+            success=success,
+            playwright_available=True,
+            iterations=iterations,
+            scenarios=[asdict(item) for item in scenarios],
+        )
+    finally:
+        shutil.rmtree(temp_root, ignore_errors=True)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Measure first-action and per-action browser latency with and without the warm context pool."
+    )
+    parser.add_argument("--iterations", type=int, default=5, help="Extract/click/back rounds per scenario.")
+    parser.add_argument("--images", type=int, default=24, help="Image count on the media-heavy fixture page.")
+    parser.add_argument("--image-kb", type=int, default=256, help="Size of each fixture image in KiB.")
+    parser.add_argument("--json", action="store_true", dest="as_json", help="Print the final report as JSON.")
+    return parser
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    report = run_benchmark(iterations=max(1, args.iterations), image_count=max(0, args.images), image_kb=max(1, args.image_kb))
+    if args.as_json:
+        print(json.dumps(asdict(report), indent=2, ensure_ascii=False))
+    else:
+        print(f"SUCCESS: {report.success}")
+        if report.note:
+            print(f"NOTE: {report.note}")
+        for item in report.scenarios:
+            print(
+                f"{item['name']}: prewarm={item['prewarm_ms']:.1f}ms first={item['first_action_ms']:.1f}ms "
+                f"p50={item['per_action_ms_p50']:.1f}ms max={item['per_action_ms_max']:.1f}ms "
+                f"next_turn={item['next_turn_first_action_ms']:.1f}ms launches={item['launches']} "
+                f"reused={item['contexts_reused']} blocked={item['blocked_requests']}"
+            )
+            for failure in item["failures"]:
+                print(f"  FAILURE: {failure}")
+    return 0 if report.success else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+from _bootstrap import ROOT_DIR
+
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+_SECTION_TIMER = """
+import json, sys, time
+sys.path.insert(0, sys.argv[1])
+import config
+timings = {}
+for name, section in config.CONFIG_SECTIONS.items():
+    started = time.perf_counter()
+    section.values()
+    timings[name] = round((time.perf_counter() - started) * 1000.0, 3)
+print(json.dumps(timings))
+"""
+
+
+@dataclass(frozen=True)
+class ModuleImportCost:
+    module: str
+    self_ms: float
+    cumulative_ms: float
+    depth: int
+
+
+@dataclass
+class ImportProfileReport:
+    success: bool
+    target: str
+    wall_ms: float
+    total_ms: float
+    module_count: int
+    top_cumulative: list[ModuleImportCost] = field(default_factory=list)
+    top_self: list[ModuleImportCost] = field(default_factory=list)
+    config_sections_ms: Optional[dict[str, float]] = None
+    error: str = ""
+
+
+def parse_importtime(stderr: str) -> list[ModuleImportCost]:
+    """Parse ``python -X importtime`` output into per-module costs."""
+    costs: list[ModuleImportCost] = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        costs.append(
+            ModuleImportCost(
+                module=module,
+                self_ms=round(int(self_us) / 1000.0, 3),
+                cumulative_ms=round(int(cumulative_us) / 1000.0, 3),
+                depth=max(0, (len(indent) - 1) // 2),
+            )
+        )
+    return costs
+
+
+def profile_import(target: str, *, top: int = 25) -> ImportProfileReport:
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True,
+        text=True,
+        cwd=str(ROOT_DIR),
+    )
+    wall_ms = (time.perf_counter() - started) * 1000.0
+    costs = parse_importtime(completed.stderr)
+    roots = [cost for cost in costs if cost.depth == 0]
+    error = ""
+    if completed.returncode != 0:
+        error = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else f"exit code {completed.returncode}"
+    return ImportProfileReport(
+        success=completed.returncode == 0,
+        target=target,
+        wall_ms=round(wall_ms, 2),
+        total_ms=round(sum(cost.cumulative_ms for cost in roots), 2),
+        module_count=len(costs),
+        top_cumulative=sorted(costs, key=lambda cost: cost.cumulative_ms, reverse=True)[:top],
+        top_self=sorted(costs, key=lambda cost: cost.self_ms, reverse=True)[:top],
+        error=error,
+    )
+
+
+def time_config_sections() -> Optional[dict[str, float]]:
+    completed = subprocess.run(
+        [sys.executable, "-c", _SECTION_TIMER, str(ROOT_DIR)],
+        capture_output=True,
+        text=True,
+        cwd=str(ROOT_DIR),
+    )
+    if completed.returncode != 0:
+        return None
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Report cumulative import cost per module (python -X importtime) for a Piper module."
+    )
+    parser.add_argument("module", nargs="?", default="config", help="Module to import, e.g. config, core.orchestrator, app.")
+    parser.add_argument("--top", type=int, default=25, help="Number of modules listed per ranking.")
+    parser.add_argument(
+        "--config-sections",
+        action="store_true",
+        help="Also time the first resolution of each lazy config section.",
+    )
+    parser.add_argument("--json", action="store_true", dest="as_json", help="Print the final report as JSON.")
+    return parser
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    report = profile_import(args.module, top=max(1, args.top))
+    if args.config_sections:
+        report.config_sections_ms = time_config_sections()
+    if args.as_json:
+        print(json.dumps(asdict(report), indent=2, ensure_ascii=False))
+    else:
+        print(f"SUCCESS: {report.success}")
+        print(f"import {report.target}: {report.total_ms:.1f} ms in {report.module_count} modules (wall {report.wall_ms:.1f} ms)")
+        if report.error:
+            print(f"error: {report.error}")
+        print("\nby cumulative time:")
+        for cost in report.top_cumulative:
+            print(f"  {cost.cumulative_ms:9.2f} ms  {'  ' * cost.depth}{cost.module}")
+        print("\nby self time:")
+        for cost in report.top_self:
+            print(f"  {cost.self_ms:9.2f} ms  {cost.module}")
+        if report.config_sections_ms is not None:
+            print("\nconfig sections (first access):")
+            for name, elapsed_ms in report.config_sections_ms.items():
+                print(f"  {elapsed_ms:9.3f} ms  {name}")
+    return 0 if report.success else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from _bootstrap import ROOT_DIR
+
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from memory.storage import SegmentedJsonlLog, ensure_parent, prune_jsonl_tail  # noqa: E402
+
+
+@dataclass(frozen=True)
+class JsonlLogCase:
+    lines: int
+    legacy_append_ms: float
+    legacy_tail_ms: float
+    segmented_migrate_ms: float
+    segmented_append_ms: float
+    segmented_tail_ms: float
+    segments: int
+    tail_matches: bool
+
+
+@dataclass
+class JsonlLogBenchmarkReport:
+    success: bool
+    tail_limit: int
+    appends: int
+    cases: list[JsonlLogCase] = field(default_factory=list)
+
+
+def _turn(index: int) -> str:
+    return json.dumps({"ts": 1_700_000_000.0 + index, "role": "user" if index % 2 else "assistant", "content": f"turn {index} " + "x" * 48})
+
+
+def _write_legacy(path: Path, count: int) -> None:
+    ensure_parent(path)
+    with path.open("w", encoding="utf-8", newline="\n") as handle:
+        for start in range(0, count, 10_000):
+            handle.write("".join(_turn(index) + "\n" for index in range(start, min(count, start + 10_000))))
+
+
+def _legacy_append(path: Path, line: str, max_lines: int) -> None:
+    # What append_jsonl did before segmentation: append, then prune the tail.
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write(line + "\n")
+    prune_jsonl_tail(path, max_lines=max_lines)
+
+
+def _legacy_tail(path: Path, limit: int) -> list[str]:
+    return path.read_text(encoding="utf-8").splitlines()[-limit:]
+
+
+def _median_ms(samples: list[float]) -> float:
+    return round(statistics.median(samples) * 1000.0, 4)
+
+
+def run_case(lines: int, *, appends: int, tail_limit: int, legacy_appends: int) -> JsonlLogCase:
+    with tempfile.TemporaryDirectory(prefix="piper-jsonl-log-") as raw_tmp:
+        legacy_path = Path(raw_tmp) / "legacy" / "memory.jsonl"
+        _write_legacy(legacy_path, lines)
+        legacy_append: list[float] = []
+        for index in range(legacy_appends):
+            started = time.perf_counter()
+            _legacy_append(legacy_path, _turn(lines + index), lines)
+            legacy_append.append(time.perf_counter() - started)
+        legacy_tail: list[float] = []
+        for _ in range(5):
+            started = time.perf_counter()
+            expected = _legacy_tail(legacy_path, tail_limit)
+            legacy_tail.append(time.perf_counter() - started)
+
+        segmented_path = Path(raw_tmp) / "segmented" / "memory.jsonl"
+        _write_legacy(segmented_path, lines)
+        log = SegmentedJsonlLog(segmented_path)
+        started = time.perf_counter()
+        # First append on a legacy file splits it into segments (one-time cost).
+        for index in range(legacy_appends):
+            log.append(_turn(lines + index), max_lines=lines)
+        migrate_s = time.perf_counter() - started
+        segmented_append: list[float] = []
+        for index in range(appends):
+            started = time.perf_counter()
+            log.append(_turn(lines + legacy_appends + index), max_lines=lines)
+            segmented_append.append(time.perf_counter() - started)
+        segmented_tail: list[float] = []
+        for _ in range(5):
+            started = time.perf_counter()
+            tail = log.tail(tail_limit)
+            segmented_tail.append(time.perf_counter() - started)
+        expected_after = [_turn(lines + legacy_appends + index) for index in range(appends)][-tail_limit:]
+        matches = tail[-len(expected_after):] == expected_after and len(tail) == len(expected)
+        segments = len(log._segments)
+
+    return JsonlLogCase(
+        lines=lines,
+        legacy_append_ms=_median_ms(legacy_append),
+        legacy_tail_ms=_median_ms(legacy_tail),
+        segmented_migrate_ms=round(migrate_s * 1000.0, 2),
+        segmented_append_ms=_median_ms(segmented_append),
+        segmented_tail_ms=_median_ms(segmented_tail),
+        segments=segments,
+        tail_matches=matches,
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Compare prune-on-append JSONL with the segmented log for appends and recent-turn reads."
+    )
+    parser.add_argument("--lines", type=int, nargs="+", default=[1_000, 100_000, 1_000_000], help="Log sizes (also the retention cap).")
+    parser.add_argument("--appends", type=int, default=500, help="Timed appends on the segmented log per size.")
+    parser.add_argument("--legacy-appends", type=int, default=5, help="Timed prune-on-append writes per size (slow at 1M).")
+    parser.add_argument("--tail", type=int, default=50, help="Recent turns read per tail query.")
+    parser.add_argument("--json", action="store_true", dest="as_json", help="Print the final report as JSON.")
+    return parser
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    tail_limit = max(1, args.tail)
+    appends = max(tail_limit, args.appends)
+    cases = [
+        run_case(max(tail_limit, lines), appends=appends, tail_limit=tail_limit, legacy_appends=max(1, args.legacy_appends))
+        for lines in args.lines
+    ]
+    report = JsonlLogBenchmarkReport(
+        success=all(case.tail_matches for case in cases),
+        tail_limit=tail_limit,
+        appends=appends,
+        cases=cases,
+    )
+    if args.as_json:
+        print(json.dumps(asdict(report), indent=2, ensure_ascii=False))
+    else:
+        print(f"SUCCESS: {report.success}")
+        for case in report.cases:
+            print(
+                f"{case.lines:>9} lines: append {case.legacy_append_ms:.3f} -> {case.segmented_append_ms:.3f} ms  "
+                f"tail({report.tail_limit}) {case.legacy_tail_ms:.3f} -> {case.segmented_tail_ms:.3f} ms  "
+                f"migration {case.segmented_migrate_ms:.1f} ms  segments {case.segments}"
+            )
+    return 0 if report.success else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
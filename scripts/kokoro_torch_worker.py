@@ -1,13 +1,9 @@
 from __future__ import annotations
 
-import json
 import os
 import shutil
-import subprocess
 import sys
-import tempfile
 import traceback
-import wave
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -16,6 +12,7 @@ if str(ROOT) not in sys.path:
 
 from config import CFG  # noqa: E402
 from tools.tts import _load_kokoro_torch_model_class, _patch_platform_for_windows_torch_import  # noqa: E402
+from tools.tts_worker_ipc import claim_stdout, serve, write_frame  # noqa: E402
 
 
 def _configure_worker_logging() -> None:
@@ -83,21 +80,6 @@ def _load_model():
     return torch, model, pipeline, torch_dir
 
 
-def _write_wav(path: Path, samples, sample_rate: int) -> None:
-    import numpy as np  # noqa: PLC0415
-
-    arr = np.asarray(samples, dtype=np.float32)
-    if arr.ndim > 1:
-        arr = arr.mean(axis=1)
-    arr = np.clip(arr, -1.0, 1.0)
-    pcm = (arr * 32767.0).astype(np.int16)
-    with wave.open(str(path), "wb") as wf:
-        wf.setnchannels(1)
-        wf.setsampwidth(2)
-        wf.setframerate(int(sample_rate))
-        wf.writeframes(pcm.tobytes())
-
-
 def _pause_samples_for_text(text: str, sample_rate: int) -> int:
     raw = str(text or "")
     stripped = raw.rstrip()
@@ -121,6 +103,8 @@ def _pause_samples_for_text(text: str, sample_rate: int) -> int:
 
 
 def main() -> int:
+    # Frames go to the original stdout; stray prints from the model stack land on stderr.
+    out = claim_stdout()
     _configure_worker_logging()
     try:
         espeak_dir = str(Path(_resolve_espeak_cli()).parent)
@@ -130,86 +114,44 @@ def main() -> int:
     try:
         torch, model, pipeline, torch_dir = _load_model()
     except Exception as exc:
-        print(json.dumps({"type": "error", "error": f"load_failed: {exc}"}), flush=True)
+        write_frame(out, {"type": "error", "error": f"load_failed: {exc}"})
         traceback.print_exc(file=sys.stderr)
         return 1
 
+    import numpy as np  # noqa: PLC0415
+
     voices: dict[str, object] = {}
-    print(json.dumps({"type": "ready"}), flush=True)
-
-    for raw in sys.stdin:
-        raw = str(raw or "").strip()
-        if not raw:
-            continue
-        try:
-            req = json.loads(raw)
-            req_id = str(req.get("id") or "")
-            text = str(req.get("text") or "").strip()
-            voice = str(req.get("voice") or getattr(CFG, "TTS_VOICE", "af_heart")).strip() or "af_heart"
-            speed = float(req.get("speed") or getattr(CFG, "TTS_SPEED", 0.85))
-            wav_path = Path(str(req.get("wav_path") or (Path(tempfile.gettempdir()) / f"piper_kokoro_worker_{req_id}.wav")))
-            if not text:
-                raise RuntimeError("empty_text")
-            pack = voices.get(voice)
-            if pack is None:
-                voice_path = torch_dir / "voices" / f"{voice}.pt"
-                if not voice_path.exists():
-                    raise RuntimeError(f"voice_missing: {voice_path}")
-                pack = torch.load(str(voice_path), map_location="cpu", weights_only=True)
-                voices[voice] = pack
-            outputs = list(pipeline(text, voice=pack, speed=speed))
-            audios = []
-            sample_rate = int(getattr(CFG, "sample_rate", 24000) or 24000)
-            for idx, result in enumerate(outputs):
-                output = getattr(result, "output", None)
-                audio = None if output is None else getattr(output, "audio", None)
-                if audio is None:
-                    continue
-                if hasattr(audio, "detach"):
-                    audio = audio.detach().cpu().numpy()
-                audios.append(audio)
-                if idx < len(outputs) - 1:
-                    import numpy as np  # noqa: PLC0415
-
-                    gap = _pause_samples_for_text(getattr(result, "graphemes", ""), sample_rate)
-                    if gap > 0:
-                        audios.append(np.zeros(gap, dtype=np.float32))
-            if not audios:
-                raise RuntimeError("empty_audio")
-            if len(audios) == 1:
-                audio = audios[0]
-            else:
-                import numpy as np  # noqa: PLC0415
-
-                audio = np.concatenate(audios)
-            wav_path.parent.mkdir(parents=True, exist_ok=True)
-            _write_wav(wav_path, audio, sample_rate)
-            print(
-                json.dumps(
-                    {
-                        "type": "result",
-                        "id": req_id,
-                        "ok": True,
-                        "wav_path": str(wav_path),
-                        "sample_rate": 24000,
-                    }
-                ),
-                flush=True,
-            )
-        except Exception as exc:
-            print(
-                json.dumps(
-                    {
-                        "type": "result",
-                        "id": str(req.get("id") or "") if "req" in locals() else "",
-                        "ok": False,
-                        "error": str(exc),
-                    }
-                ),
-                flush=True,
-            )
-            traceback.print_exc(file=sys.stderr)
-    return 0
+    sample_rate = int(getattr(CFG, "sample_rate", 24000) or 24000)
+
+    def _synthesize(text: str, voice: str, speed: float):
+        voice = voice.strip() or str(getattr(CFG, "TTS_VOICE", "af_heart")).strip() or "af_heart"
+        speed = float(speed or getattr(CFG, "TTS_SPEED", 0.85))
+        pack = voices.get(voice)
+        if pack is None:
+            voice_path = torch_dir / "voices" / f"{voice}.pt"
+            if not voice_path.exists():
+                raise RuntimeError(f"voice_missing: {voice_path}")
+            pack = torch.load(str(voice_path), map_location="cpu", weights_only=True)
+            voices[voice] = pack
+        outputs = list(pipeline(text, voice=pack, speed=speed))
+        audios = []
+        for idx, result in enumerate(outputs):
+            output = getattr(result, "output", None)
+            audio = None if output is None else getattr(output, "audio", None)
+            if audio is None:
+                continue
+            if hasattr(audio, "detach"):
+                audio = audio.detach().cpu().numpy()
+            audios.append(np.clip(np.asarray(audio, dtype=np.float32), -1.0, 1.0))
+            if idx < len(outputs) - 1:
+                gap = _pause_samples_for_text(getattr(result, "graphemes", ""), sample_rate)
+                if gap > 0:
+                    audios.append(np.zeros(gap, dtype=np.float32))
+        if not audios:
+            raise RuntimeError("empty_audio")
+        return (audios[0] if len(audios) == 1 else np.concatenate(audios)), sample_rate
+
+    return serve(_synthesize, stdout=out)
 
 
 if __name__ == "__main__":
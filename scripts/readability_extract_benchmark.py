@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from _bootstrap import ROOT_DIR
+
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from core.search import readability  # noqa: E402
+
+
+_CORPUS_DIR = ROOT_DIR / "tests" / "golden" / "readability"
+
+
+@dataclass(frozen=True)
+class ReadabilityExtractBenchmarkReport:
+    success: bool
+    corpus_pages: int
+    corpus_matches: int
+    pages_per_run: int
+    mean_page_kb: float
+    workers: int
+    inline_pages_per_s: float
+    pool_pages_per_s: float
+    inline_p95_ms: float
+    timeouts: int
+
+
+def _load_pages(scale: int) -> list[tuple[str, str]]:
+    """Corpus pages plus a padded copy of each (large pages with long chrome)."""
+    pages: list[tuple[str, str]] = []
+    for path in sorted(_CORPUS_DIR.glob("*.html")):
+        html = readability.decode_html(path.read_bytes())
+        pages.append((path.stem, html))
+        chrome = "".join(
+            f"<div class='sidebar'><ul>{''.join(f'<li><a href=/x{i}>Link {i}</a></li>' for i in range(40))}</ul></div>"
+            for _ in range(scale)
+        )
+        body = html.replace("</body>", chrome + "</body>")
+        pages.append((f"{path.stem}-padded", body))
+    return pages
+
+
+def _run_inline(pages: list[str], timeout_s: float) -> tuple[list[float], int]:
+    durations: list[float] = []
+    timeouts = 0
+    for html in pages:
+        started = time.perf_counter()
+        try:
+            readability.extract_page(html, workers=0, timeout_s=timeout_s)
+        except readability.ExtractionTimeout:
+            timeouts += 1
+        durations.append(time.perf_counter() - started)
+    return durations, timeouts
+
+
+def _run_pool(pages: list[str], *, workers: int, fetchers: int, timeout_s: float) -> tuple[float, int]:
+    # Deep-dive fetch threads hand pages to the extractor pool concurrently.
+    timeouts = 0
+
+    def _one(html: str) -> None:
+        nonlocal timeouts
+        try:
+            readability.extract_page(html, workers=workers, timeout_s=timeout_s)
+        except readability.ExtractionTimeout:
+            timeouts += 1
+
+    readability.extract_page(pages[0], workers=workers, timeout_s=timeout_s)  # start the pool
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=fetchers) as executor:
+        list(executor.map(_one, pages))
+    return time.perf_counter() - started, timeouts
+
+
+def run_benchmark(*, rounds: int, workers: int, fetchers: int, scale: int, timeout_s: float) -> ReadabilityExtractBenchmarkReport:
+    corpus = sorted(_CORPUS_DIR.glob("*.html"))
+    matches = sum(
+        1
+        for path in corpus
+        if readability.extract_main_text(readability.decode_html(path.read_bytes()))
+        == path.with_suffix(".md").read_text(encoding="utf-8").strip()
+    )
+    pages = [html for _name, html in _load_pages(scale)] * rounds
+    inline_durations, inline_timeouts = _run_inline(pages, timeout_s)
+    inline_total = sum(inline_durations)
+    pool_wall = 0.0
+    pool_timeouts = 0
+    if workers > 0:
+        try:
+            pool_wall, pool_timeouts = _run_pool(pages, workers=workers, fetchers=fetchers, timeout_s=timeout_s)
+        finally:
+            readability.shutdown_extractor_pool()
+    p95 = statistics.quantiles(inline_durations, n=20)[-1] if len(inline_durations) >= 2 else inline_total
+    return ReadabilityExtractBenchmarkReport(
+        success=matches == len(corpus) and inline_timeouts + pool_timeouts == 0,
+        corpus_pages=len(corpus),
+        corpus_matches=matches,
+        pages_per_run=len(pages),
+        mean_page_kb=round(statistics.fmean(len(html.encode("utf-8")) for html in pages) / 1024.0, 1),
+        workers=workers,
+        inline_pages_per_s=round(len(pages) / max(inline_total, 1e-9), 1),
+        pool_pages_per_s=round(len(pages) / pool_wall, 1) if pool_wall else 0.0,
+        inline_p95_ms=round(p95 * 1000.0, 2),
+        timeouts=inline_timeouts + pool_timeouts,
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Measure local HTML-to-Markdown extraction throughput on the readability fixture corpus."
+    )
+    parser.add_argument("--rounds", type=int, default=20, help="Passes over the corpus (plain and padded pages).")
+    parser.add_argument("--workers", type=int, default=2, help="Extractor processes for the pooled run (0 skips it).")
+    parser.add_argument("--fetchers", type=int, default=6, help="Concurrent fetch threads feeding the pool.")
+    parser.add_argument("--scale", type=int, default=20, help="Sidebar blocks appended to each padded page.")
+    parser.add_argument("--timeout-s", type=float, default=3.0, help="Per-page extraction budget.")
+    parser.add_argument("--json", action="store_true", dest="as_json", help="Print the final report as JSON.")
+    return parser
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    report = run_benchmark(
+        rounds=max(1, args.rounds),
+        workers=max(0, args.workers),
+        fetchers=max(1, args.fetchers),
+        scale=max(0, args.scale),
+        timeout_s=float(args.timeout_s),
+    )
+    if args.as_json:
+        print(json.dumps(asdict(report), indent=2, ensure_ascii=False))
+    else:
+        print(f"SUCCESS: {report.success} (corpus {report.corpus_matches}/{report.corpus_pages} match)")
+        print(f"pages/run: {report.pages_per_run}  mean page: {report.mean_page_kb:.1f} KiB")
+        print(f"inline: {report.inline_pages_per_s:.1f} pages/s  p95 {report.inline_p95_ms:.2f} ms")
+        if report.workers:
+            print(f"pool ({report.workers} workers): {report.pool_pages_per_s:.1f} pages/s")
+    return 0 if report.success else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
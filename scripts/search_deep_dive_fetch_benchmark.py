@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator
+
+from _bootstrap import ROOT_DIR
+
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import tools.search as search_module
+from core.search.page_cache import SearchPageCache
+
+
+_ORIGIN = "https://bench.test/"
+_PAGE_BODY = "Readable stub article about the benchmark topic. It carries enough text to pass the reader threshold. "
+
+
+@dataclass
+class _StubCounters:
+    requests: int = 0
+    not_modified: int = 0
+    connections: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def bump(self, name: str) -> None:
+        with self.lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+@dataclass
+class FetchScenarioResult:
+    name: str
+    wall_ms: float = 0.0
+    pages_kept: int = 0
+    kept_order: list[int] = field(default_factory=list)
+    stub_requests: int = 0
+    stub_not_modified: int = 0
+    stub_connections: int = 0
+    failures: list[str] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class DeepDiveFetchBenchmarkReport:
+    success: bool
+    latencies_s: list[float]
+    links_limit: int
+    deadline_s: float
+    scenarios: list[dict]
+
+
+def _make_handler(latencies: list[float], counters: _StubCounters):
+    class _ReaderStubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self) -> None:
+            super().setup()
+            counters.bump("connections")
+
+        def do_GET(self) -> None:  # noqa: N802 - stdlib signature
+            counters.bump("requests")
+            page_id = int(self.path.rstrip("/").rsplit("-", 1)[-1])
+            etag = f'"page-{page_id}"'
+            if self.headers.get("If-None-Match") == etag:
+                counters.bump("not_modified")
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            time.sleep(latencies[page_id])
+            body = (f"Page {page_id}. " + _PAGE_BODY * 6).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args) -> None:  # noqa: A003 - stdlib signature
+            del format, args
+
+    return _ReaderStubHandler
+
+
+@contextlib.contextmanager
+def running_reader_stub(latencies: list[float], counters: _StubCounters) -> Iterator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(latencies, counters))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/"
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(timeout=5.0)
+
+
+def _run_scenario(
+    *,
+    name: str,
+    latencies: list[float],
+    links_limit: int,
+    deadline_s: float,
+    workers: int,
+    cache: SearchPageCache | None,
+) -> FetchScenarioResult:
+    result = FetchScenarioResult(name=name)
+    counters = _StubCounters()
+    results = [
+        {"title": f"Result {index}", "body": "snippet", "href": f"{_ORIGIN}page-{index}"}
+        for index in range(len(latencies))
+    ]
+    cfg = search_module.CFG
+    overrides = {
+        "SEARCH_DEEP_DIVE_LINKS_LIMIT": links_limit,
+        "SEARCH_DEEP_DIVE_CANDIDATES": len(latencies),
+        "SEARCH_DEEP_DIVE_WORKERS": workers,
+        "SEARCH_DEEP_DIVE_DEADLINE_S": deadline_s,
+        "SEARCH_PAGE_CACHE_ENABLED": cache is not None,
+    }
+    if cache is not None:
+        overrides["SEARCH_PAGE_CACHE_DIR"] = cache.root
+        overrides["SEARCH_PAGE_CACHE_TTL_S"] = cache.ttl_s
+    originals = {key: getattr(cfg, key, None) for key in overrides}
+    original_open_page = search_module._open_page
+    original_require_public_url = search_module._require_public_url
+    original_cache = search_module._PAGE_CACHE
+    try:
+        for key, value in overrides.items():
+            setattr(cfg, key, value)
+        search_module._PAGE_CACHE = cache
+        search_module._HTTP_SESSION = None
+        with running_reader_stub(latencies, counters) as base_url:
+            # Pages are fetched straight from the origin; route bench.test to the
+            # stub, which lives on loopback and so skips the public-address check.
+            search_module._require_public_url = lambda url: None
+            search_module._open_page = lambda url, **kwargs: original_open_page(
+                url.replace(_ORIGIN, base_url, 1), **kwargs
+            )
+            started = time.perf_counter()
+            pages = search_module._deep_dive_pages(
+                results,
+                "benchmark topic",
+                log=lambda msg: None,
+                clean_url=lambda url: url,
+            )
+            result.wall_ms = (time.perf_counter() - started) * 1000.0
+        result.pages_kept = len(pages)
+        result.kept_order = [int(link.rsplit("-", 1)[-1]) for link, _content in pages]
+        if result.kept_order != sorted(result.kept_order):
+            result.failures.append(f"pages out of rank order: {result.kept_order}")
+    finally:
+        search_module._open_page = original_open_page
+        search_module._require_public_url = original_require_public_url
+        search_module._PAGE_CACHE = original_cache
+        search_module._HTTP_SESSION = None
+        for key, value in originals.items():
+            setattr(cfg, key, value)
+    result.stub_requests = counters.requests
+    result.stub_not_modified = counters.not_modified
+    result.stub_connections = counters.connections
+    return result
+
+
+def run_benchmark(*, latencies: list[float], links_limit: int, deadline_s: float, workers: int) -> DeepDiveFetchBenchmarkReport:
+    temp_root = Path(tempfile.mkdtemp(prefix="piper-deep-dive-bench-"))
+    try:
+        cache = SearchPageCache(temp_root / "search_pages", ttl_s=3600.0)
+        stale_cache = SearchPageCache(temp_root / "search_pages", ttl_s=0.0)
+        scenarios = [
+            # One worker with a generous deadline walks the ranks one page at a
+            # time, which is what the deep dive did before pages were fetched
+            # concurrently.
+            _run_scenario(
+                name="sequential_no_cache",
+                latencies=latencies,
+                links_limit=links_limit,
+                deadline_s=max(deadline_s, sum(latencies) + 5.0),
+                workers=1,
+                cache=None,
+            ),
+            _run_scenario(
+                name="parallel_cold_cache",
+                latencies=latencies,
+                links_limit=links_limit,
+                deadline_s=deadline_s,
+                workers=workers,
+                cache=cache,
+            ),
+            _run_scenario(
+                name="parallel_fresh_cache",
+                latencies=latencies,
+                links_limit=links_limit,
+                deadline_s=deadline_s,
+                workers=workers,
+                cache=cache,
+            ),
+            _run_scenario(
+                name="parallel_revalidated_cache",
+                latencies=latencies,
+                links_limit=links_limit,
+                deadline_s=deadline_s,
+                workers=workers,
+                cache=stale_cache,
+            ),
+        ]
+        success = all(not item.failures for item in scenarios) and all(item.pages_kept > 0 for item in scenarios)
+        return DeepDiveFetchBenchmarkReport(
+            success=success,
+            latencies_s=latencies,
+            links_limit=links_limit,
+            deadline_s=deadline_s,
+            scenarios=[asdict(item) for item in scenarios],
+        )
+    finally:
+        shutil.rmtree(temp_root, ignore_errors=True)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Measure deep-dive wall time for sequential, concurrent, cached and revalidated page fetches."
+    )
+    parser.add_argument(
+        "--latencies",
+        default="0.4,1.2,0.3,0.8,6.0,0.2,0.6,0.5",
+        help="Comma-separated per-page stub latencies in seconds, in rank order.",
+    )
+    parser.add_argument("--links", type=int, default=6, help="Readable pages to keep (deep-dive links limit).")
+    parser.add_argument("--deadline", type=float, default=3.0, help="Global deep-dive deadline in seconds.")
+    parser.add_argument("--workers", type=int, default=6, help="Concurrent fetch workers.")
+    parser.add_argument("--json", action="store_true", dest="as_json", help="Print the final report as JSON.")
+    return parser
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    latencies = [max(0.0, float(item)) for item in str(args.latencies).split(",") if item.strip()]
+    report = run_benchmark(
+        latencies=latencies,
+        links_limit=max(1, args.links),
+        deadline_s=max(0.1, args.deadline),
+        workers=max(1, args.workers),
+    )
+    if args.as_json:
+        print(json.dumps(asdict(report), indent=2, ensure_ascii=False))
+    else:
+        print(f"SUCCESS: {report.success}")
+        for item in report.scenarios:
+            print(
+                f"{item['name']}: wall={item['wall_ms']:.1f}ms kept={item['pages_kept']} order={item['kept_order']} "
+                f"requests={item['stub_requests']} 304s={item['stub_not_modified']} "
+                f"connections={item['stub_connections']}"
+            )
+            for failure in item["failures"]:
+                print(f"  FAILURE: {failure}")
+    return 0 if report.success else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
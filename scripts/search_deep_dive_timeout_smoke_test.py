@@ -25,7 +25,7 @@ from core.runtime_control import CancellationToken, OperationCancelled
 
 
 class FakeHTTPResponse:
-    """Mock urllib response with controllable read behaviour."""
+    """Mock page response with controllable read behaviour."""
 
     def __init__(self, chunks: list[bytes], delay_s: float = 0.0):
         self._chunks = chunks
@@ -49,11 +49,16 @@ class FakeHTTPResponse:
 
 
 class TestFetchCleanTextWallTimeout(unittest.TestCase):
+    def setUp(self):
+        cache_patch = patch.object(search_module.CFG, "SEARCH_PAGE_CACHE_ENABLED", False, create=True)
+        cache_patch.start()
+        self.addCleanup(cache_patch.stop)
+
     def test_returns_timeout_error_when_wall_clock_exceeded(self):
         """A slow trickle that stays under the socket timeout but exceeds wall timeout must return an error."""
         with patch.object(search_module.CFG, "SEARCH_FETCH_WALL_TIMEOUT_S", 0.2):
             with patch.object(search_module.CFG, "SEARCH_URL_FETCH_TIMEOUT_S", 10.0):
-                with patch("urllib.request.urlopen") as mock_open:
+                with patch("tools.search._open_page") as mock_open:
                     # Each chunk arrives quickly (0s) but we emit many chunks so total > wall timeout
                     mock_open.return_value = FakeHTTPResponse(
                         [b"x"] * 200, delay_s=0.01
@@ -65,7 +70,7 @@ class TestFetchCleanTextWallTimeout(unittest.TestCase):
     def test_normal_fetch_succeeds_within_deadline(self):
         with patch.object(search_module.CFG, "SEARCH_FETCH_WALL_TIMEOUT_S", 5.0):
             with patch.object(search_module.CFG, "SEARCH_URL_FETCH_TIMEOUT_S", 10.0):
-                with patch("urllib.request.urlopen") as mock_open:
+                with patch("tools.search._open_page") as mock_open:
                     mock_open.return_value = FakeHTTPResponse(
                         [b"This is a long enough article body to pass the min-length check. " * 10]
                     )
@@ -77,7 +82,7 @@ class TestFetchCleanTextWallTimeout(unittest.TestCase):
         token = CancellationToken()
         token.cancel()
         with patch.object(search_module.CFG, "SEARCH_FETCH_WALL_TIMEOUT_S", 5.0):
-            with patch("urllib.request.urlopen") as mock_open:
+            with patch("tools.search._open_page") as mock_open:
                 mock_open.return_value = FakeHTTPResponse([b"x"] * 100, delay_s=0.05)
                 with self.assertRaises(OperationCancelled):
                     search_module.fetch_clean_text("https://example.test/cancel", cancel_token=token)
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from _bootstrap import ROOT_DIR
+
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from memory.state_owner import SharedStateOwner  # noqa: E402
+
+
+_OPS = (
+    ("task_add", 0.20),
+    ("task_pop", 0.10),
+    ("event_add", 0.10),
+    ("event_read", 0.05),
+    ("knowledge_upsert", 0.20),
+    ("knowledge_read", 0.10),
+    ("situational_upsert", 0.15),
+    ("world_model_attribute", 0.10),
+)
+
+
+@dataclass
+class BackendResult:
+    backend: str
+    operations: int = 0
+    seed_keys: int = 0
+    elapsed_s: float = 0.0
+    ops_per_s: float = 0.0
+    per_op_ms: dict[str, float] = field(default_factory=dict)
+    final_state: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class StateStoreBackendReport:
+    success: bool
+    operations: int
+    seed_keys: int
+    speedup: float
+    backends: list[dict]
+
+
+def _seed(owner: SharedStateOwner, seed_keys: int) -> None:
+    owner.knowledge_store.save(
+        {f"fact_{index}": {"value": f"value {index}", "expires_at": None} for index in range(seed_keys)}
+    )
+    owner.task_store.save({f"seed task {index}": "pending" for index in range(seed_keys // 4)})
+    graph = owner.world_model_store.load_graph()
+    for index in range(seed_keys // 4):
+        graph["nodes"][f"thing:{index}"] = {"id": f"thing:{index}", "type": "thing", "label": str(index), "attributes": {}}
+    owner.world_model_store.save_graph(graph)
+
+
+def _run_op(owner: SharedStateOwner, op: str, index: int, rng: random.Random) -> None:
+    if op == "task_add":
+        owner.task_store.add(f"task {index}")
+    elif op == "task_pop":
+        owner.task_store.pop(f"task {rng.randrange(max(1, index))}")
+    elif op == "event_add":
+        owner.event_store.add(f"event {index % 200}", "2099-01-01", "10:00" if index % 2 else None)
+    elif op == "event_read":
+        owner.event_store.upcoming()
+    elif op == "knowledge_upsert":
+        owner.knowledge_store.upsert_value(f"fact_{rng.randrange(index + 1)}", f"updated {index}")
+    elif op == "knowledge_read":
+        owner.knowledge_store.load_active()
+    elif op == "situational_upsert":
+        owner.situational_state_store.upsert_entry(
+            f"state:{index % 64}",
+            {"value": f"state {index}", "updated_at": int(time.time()), "expires_at": int(time.time()) + 3600},
+        )
+    elif op == "world_model_attribute":
+        graph = owner.world_model_store.load_graph()
+        graph["nodes"][graph["root_entity_id"]]["attributes"][f"attr_{index % 32}"] = {"value": str(index)}
+        owner.world_model_store.save_graph(graph)
+
+
+def run_backend(backend: str, *, operations: int, seed_keys: int, seed: int) -> BackendResult:
+    result = BackendResult(backend=backend, operations=operations, seed_keys=seed_keys)
+    rng = random.Random(seed)
+    names = [name for name, _weight in _OPS]
+    weights = [weight for _name, weight in _OPS]
+    plan = rng.choices(names, weights=weights, k=operations)
+    timings: dict[str, float] = {name: 0.0 for name in names}
+    counts: dict[str, int] = {name: 0 for name in names}
+    with tempfile.TemporaryDirectory(prefix=f"piper-state-{backend}-") as tmp:
+        owner = SharedStateOwner.for_data_dir(Path(tmp), backend=backend)
+        _seed(owner, seed_keys)
+        started = time.perf_counter()
+        for index, op in enumerate(plan):
+            op_started = time.perf_counter()
+            _run_op(owner, op, index, rng)
+            timings[op] += time.perf_counter() - op_started
+            counts[op] += 1
+        result.elapsed_s = round(time.perf_counter() - started, 4)
+        result.final_state = {
+            "tasks": len(owner.task_store.load()),
+            "events": len(owner.event_store.load()),
+            "knowledge": len(owner.knowledge_store.load()),
+            "situational": len(owner.situational_state_store.load_payload()["entries"]),
+            "world_model_attributes": len(
+                owner.world_model_store.load_graph()["nodes"]["person:user"]["attributes"]
+            ),
+        }
+        if owner.task_store.database is not None:
+            owner.task_store.database.close()
+    result.ops_per_s = round(operations / max(result.elapsed_s, 1e-9), 1)
+    result.per_op_ms = {
+        name: round(timings[name] * 1000.0 / counts[name], 4)
+        for name in names
+        if counts[name]
+    }
+    return result
+
+
+def run_benchmark(*, operations: int, seed_keys: int, seed: int) -> StateStoreBackendReport:
+    json_result = run_backend("json", operations=operations, seed_keys=seed_keys, seed=seed)
+    sqlite_result = run_backend("sqlite", operations=operations, seed_keys=seed_keys, seed=seed)
+    speedup = round(json_result.elapsed_s / max(sqlite_result.elapsed_s, 1e-9), 2)
+    return StateStoreBackendReport(
+        success=json_result.final_state == sqlite_result.final_state,
+        operations=operations,
+        seed_keys=seed_keys,
+        speedup=speedup,
+        backends=[asdict(json_result), asdict(sqlite_result)],
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Run the same mixed store workload against the JSON and SQLite state backends."
+    )
+    parser.add_argument("--operations", type=int, default=10_000, help="Mixed operations per backend.")
+    parser.add_argument("--seed-keys", type=int, default=2_000, help="Knowledge rows preloaded before timing.")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed for the operation mix.")
+    parser.add_argument("--json", action="store_true", dest="as_json", help="Print the final report as JSON.")
+    return parser
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    report = run_benchmark(
+        operations=max(1, args.operations),
+        seed_keys=max(0, args.seed_keys),
+        seed=args.seed,
+    )
+    if args.as_json:
+        print(json.dumps(asdict(report), indent=2, ensure_ascii=False))
+    else:
+        print(f"SUCCESS: {report.success} (sqlite speedup x{report.speedup:.2f})")
+        for item in report.backends:
+            print(f"{item['backend']}: {item['elapsed_s']:.2f}s  {item['ops_per_s']:.0f} ops/s")
+            for name, value in item["per_op_ms"].items():
+                print(f"  {name}: {value:.3f} ms")
+    return 0 if report.success else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from _bootstrap import ROOT_DIR
+
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from core.services import stats_collector as stats_module  # noqa: E402
+from core.services.stats_collector import StatsCollector  # noqa: E402
+
+
+_ROUTES = ("CHAT", "SEARCH", "TASK", "MEMORY")
+_MODELS = ("small", "large")
+
+
+@dataclass(frozen=True)
+class StatsDashboardReport:
+    success: bool
+    records: int
+    refreshes: int
+    full_reread_ms: float
+    cached_refresh_ms: float
+    refresh_after_turn_ms: float
+    cold_start_replay_ms: float
+    cold_start_checkpoint_ms: float
+    refresh_speedup: float
+
+
+def _seed_records(stats_path: Path, count: int, seed: int) -> None:
+    rng = random.Random(seed)
+    lines = []
+    for index in range(count):
+        persona = rng.lognormvariate(6.5, 0.6)
+        total = persona + rng.lognormvariate(5.5, 0.7)
+        lines.append(
+            json.dumps(
+                {
+                    "turn_id": f"seed-{index}",
+                    "timestamp": "2026-01-01T00:00:00",
+                    "decision": rng.choice(_ROUTES),
+                    "model": rng.choice(_MODELS),
+                    "outcome": "VERIFIED",
+                    "llm_tokens": {"router": None, "persona": int(persona / 20.0)},
+                    "tts_first_audio_ms": round(rng.uniform(150.0, 900.0), 3),
+                    "phase_ms": {"persona": round(persona, 3), "total": round(total, 3)},
+                }
+            )
+        )
+    stats_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def _timed_ms(fn, repeats: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - started) * 1000.0 / max(1, repeats)
+
+
+def run_benchmark(*, records: int, refreshes: int, seed: int) -> StatsDashboardReport:
+    with tempfile.TemporaryDirectory(prefix="piper-stats-") as tmp:
+        stats_path = Path(tmp) / "stats.jsonl"
+        alerts_path = Path(tmp) / "alerts.log"
+        _seed_records(stats_path, records, seed)
+
+        stats_module._AGGREGATORS.clear()
+        collector = StatsCollector(stats_path, alerts_path, history_limit=records)
+        cold_replay_ms = _timed_ms(collector.aggregator, 1)
+        collector.build_dashboard_snapshot()
+        collector.aggregator().write_checkpoint()
+
+        def full_reread() -> None:
+            collector._build_readonly_report_from_records(collector.load_records(), [])
+
+        full_reread_ms = _timed_ms(full_reread, refreshes)
+        cached_ms = _timed_ms(collector.build_dashboard_snapshot, refreshes)
+
+        def turn_then_refresh() -> None:
+            state = stats_module.TurnStatsState()
+            state.decision = "CHAT"
+            state.phase_ms["total"] = 900.0
+            collector.record_turn(state)
+            collector.build_dashboard_snapshot()
+
+        after_turn_ms = _timed_ms(turn_then_refresh, max(1, refreshes // 10))
+        expected = collector.aggregator().percentile_table()
+        collector.aggregator().write_checkpoint()
+
+        stats_module._AGGREGATORS.clear()
+        restored = StatsCollector(stats_path, alerts_path, history_limit=records)
+        cold_checkpoint_ms = _timed_ms(restored.aggregator, 1)
+        success = restored.aggregator().percentile_table() == expected
+        stats_module._AGGREGATORS.clear()
+
+    return StatsDashboardReport(
+        success=success,
+        records=records,
+        refreshes=refreshes,
+        full_reread_ms=round(full_reread_ms, 3),
+        cached_refresh_ms=round(cached_ms, 4),
+        refresh_after_turn_ms=round(after_turn_ms, 3),
+        cold_start_replay_ms=round(cold_replay_ms, 3),
+        cold_start_checkpoint_ms=round(cold_checkpoint_ms, 3),
+        refresh_speedup=round(full_reread_ms / max(cached_ms, 1e-9), 1),
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Compare full stats.jsonl re-reads with the rolling aggregator's dashboard refresh."
+    )
+    parser.add_argument("--records", type=int, default=2_000, help="Turns seeded into stats.jsonl.")
+    parser.add_argument("--refreshes", type=int, default=50, help="Dashboard refreshes timed per mode.")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed for the synthetic turns.")
+    parser.add_argument("--json", action="store_true", dest="as_json", help="Print the final report as JSON.")
+    return parser
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    report = run_benchmark(records=max(20, args.records), refreshes=max(1, args.refreshes), seed=args.seed)
+    if args.as_json:
+        print(json.dumps(asdict(report), indent=2, ensure_ascii=False))
+    else:
+        print(f"SUCCESS: {report.success} (refresh speedup x{report.refresh_speedup:.1f})")
+        print(f"full re-read: {report.full_reread_ms:.3f} ms")
+        print(f"cached refresh: {report.cached_refresh_ms:.4f} ms")
+        print(f"turn + refresh: {report.refresh_after_turn_ms:.3f} ms")
+        print(f"cold start: replay {report.cold_start_replay_ms:.1f} ms, checkpoint {report.cold_start_checkpoint_ms:.1f} ms")
+    return 0 if report.success else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
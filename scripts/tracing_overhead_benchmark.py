@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from _bootstrap import ROOT_DIR
+
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from config import CFG  # noqa: E402
+from core import tracing  # noqa: E402
+from core.services.stats_collector import StatsCollector  # noqa: E402
+from llm import llm_server_client  # noqa: E402
+from llm.llm_server_client import LlamaServerClient, LlamaServerConfig  # noqa: E402
+
+
+_CONTEXT_SOURCES = (
+    "instructions",
+    "active_user",
+    "transient_state",
+    "knowledge",
+    "operational_state",
+    "environment",
+    "brain_recall",
+    "document_hits",
+)
+
+
+@dataclass(frozen=True)
+class TracingOverheadReport:
+    success: bool
+    turns: int
+    token_delay_ms: float
+    untraced_turn_ms: float
+    traced_turn_ms: float
+    overhead_pct: float
+    spans_per_turn: int
+    span_cost_us: float
+    noop_span_cost_us: float
+    trace_file_bytes: int
+
+
+class _StubStream(io.BytesIO):
+    """SSE body that sleeps per token like a (very fast) decoding server."""
+
+    def __init__(self, tokens: int, delay_s: float) -> None:
+        chunk = json.dumps({"choices": [{"delta": {"content": "tok "}}]})
+        super().__init__((f"data: {chunk}\n" * tokens + "data: [DONE]\n").encode("utf-8"))
+        self.delay_s = delay_s
+
+    def readline(self, *args) -> bytes:
+        if self.delay_s:
+            time.sleep(self.delay_s)
+        return super().readline(*args)
+
+    def __enter__(self) -> "_StubStream":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def _stub_turn(collector: StatsCollector, client: LlamaServerClient, install, *, steps: int) -> None:
+    messages = [{"role": "user", "content": "hello"}]
+    state = collector.resume_or_start_turn()
+    collector.start_phase(state, "route")
+    install(24)
+    client.generate(messages)
+    with tracing.span("route.normalize", cat="route"):
+        pass
+    collector.end_phase(state, "route")
+
+    collector.start_phase(state, "manager")
+    for step in range(1, steps + 1):
+        with tracing.span("executor.step", cat="executor", stage=1, step=step):
+            install(48)
+            client.generate(messages)
+            with tracing.span("tool.call", cat="tool", tool="FILE_OP"):
+                time.sleep(0.002)
+    collector.end_phase(state, "manager")
+
+    collector.start_phase(state, "persona")
+    for source in _CONTEXT_SOURCES:
+        with tracing.span(f"context.{source}", cat="context"):
+            pass
+    install(160)
+    client.generate(messages)
+    collector.end_phase(state, "persona")
+    collector.record_turn(state)
+
+
+def _span_cost_us(iterations: int) -> tuple[float, float]:
+    trace = tracing.TurnTrace("bench", max_events=iterations + 1)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        with tracing.span("bench", cat="bench", trace=trace):
+            pass
+    traced = (time.perf_counter() - started) * 1_000_000.0 / iterations
+    tracing.activate(None)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        with tracing.span("bench", cat="bench"):
+            pass
+    noop = (time.perf_counter() - started) * 1_000_000.0 / iterations
+    return traced, noop
+
+
+def run_benchmark(*, turns: int, token_delay_ms: float, steps: int) -> TracingOverheadReport:
+    delay_s = max(0.0, token_delay_ms) / 1000.0
+    original_urlopen = llm_server_client.urllib.request.urlopen
+    pending_tokens = [0]
+
+    def install(tokens: int) -> None:
+        pending_tokens[0] = tokens
+
+    llm_server_client.urllib.request.urlopen = lambda *args, **kwargs: _StubStream(pending_tokens[0], delay_s)
+    client = LlamaServerClient(LlamaServerConfig(base_url="http://stub", model="stub"))
+    saved = {name: getattr(CFG, name) for name in ("TRACE_ENABLED", "TRACE_SAMPLE_RATE", "TRACE_TAIL_S")}
+    untraced: list[float] = []
+    traced: list[float] = []
+    try:
+        with tempfile.TemporaryDirectory(prefix="piper-trace-") as tmp:
+            tmp_path = Path(tmp)
+            CFG.TRACE_DIR = tmp_path / "traces"
+            CFG.TRACE_SAMPLE_RATE = 1.0
+            CFG.TRACE_TAIL_S = 0.0
+            collector = StatsCollector(tmp_path / "stats.jsonl", tmp_path / "alerts.log")
+            for index in range(turns * 2 + 2):
+                enabled = index % 2 == 1
+                CFG.TRACE_ENABLED = enabled
+                started = time.perf_counter()
+                _stub_turn(collector, client, install, steps=steps)
+                elapsed_ms = (time.perf_counter() - started) * 1000.0
+                if index >= 2:
+                    (traced if enabled else untraced).append(elapsed_ms)
+            files = sorted((tmp_path / "traces").glob("turn-*.trace.json"))
+            sample = json.loads(files[-1].read_text(encoding="utf-8")) if files else {"traceEvents": []}
+            spans_per_turn = sum(1 for event in sample["traceEvents"] if event.get("ph") == "X")
+            file_bytes = files[-1].stat().st_size if files else 0
+    finally:
+        llm_server_client.urllib.request.urlopen = original_urlopen
+        for name, value in saved.items():
+            setattr(CFG, name, value)
+        try:
+            del CFG.TRACE_DIR
+        except AttributeError:
+            pass
+
+    span_cost, noop_cost = _span_cost_us(20_000)
+    untraced_ms = statistics.median(untraced)
+    traced_ms = statistics.median(traced)
+    overhead = (traced_ms - untraced_ms) / max(untraced_ms, 1e-9) * 100.0
+    return TracingOverheadReport(
+        success=spans_per_turn > 0 and overhead < 1.0,
+        turns=turns,
+        token_delay_ms=token_delay_ms,
+        untraced_turn_ms=round(untraced_ms, 3),
+        traced_turn_ms=round(traced_ms, 3),
+        overhead_pct=round(overhead, 3),
+        spans_per_turn=spans_per_turn,
+        span_cost_us=round(span_cost, 3),
+        noop_span_cost_us=round(noop_cost, 3),
+        trace_file_bytes=file_bytes,
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Measure span tracing overhead on a stubbed turn (router, 3 executor steps, persona)."
+    )
+    parser.add_argument("--turns", type=int, default=15, help="Turns timed per mode (traced and untraced).")
+    parser.add_argument("--token-delay-ms", type=float, default=1.0, help="Stub decode delay per streamed token.")
+    parser.add_argument("--steps", type=int, default=3, help="Executor steps per stubbed turn.")
+    parser.add_argument("--json", action="store_true", dest="as_json", help="Print the final report as JSON.")
+    return parser
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    report = run_benchmark(
+        turns=max(1, args.turns),
+        token_delay_ms=float(args.token_delay_ms),
+        steps=max(1, args.steps),
+    )
+    if args.as_json:
+        print(json.dumps(asdict(report), indent=2, ensure_ascii=False))
+    else:
+        print(f"SUCCESS: {report.success} (overhead {report.overhead_pct:.3f}%)")
+        print(f"untraced turn: {report.untraced_turn_ms:.1f} ms  traced turn: {report.traced_turn_ms:.1f} ms")
+        print(f"spans/turn: {report.spans_per_turn}  trace file: {report.trace_file_bytes} bytes")
+        print(f"span cost: {report.span_cost_us:.2f} us  no-op span: {report.noop_span_cost_us:.2f} us")
+    return 0 if report.success else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
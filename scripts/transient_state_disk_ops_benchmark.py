@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Iterator
+
+from _bootstrap import ROOT_DIR
+
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from memory import KnowledgeManager  # noqa: E402
+from memory.state_owner import SharedStateOwner  # noqa: E402
+from memory.stores import JsonDictStore  # noqa: E402
+from memory.transient_state import TransientStateManager  # noqa: E402
+
+
+_TURNS = (
+    "I'm hungry and tired.",
+    "We're watching Ironman.",
+    "Maybe I should create a fuzzy words code.",
+    "I'm trying to say your name, but it's just not picking up.",
+    "I need to bike loot tomorrow.",
+    "My biggest project is currently working on you, Piper.",
+)
+
+
+class _DummyLLM:
+    def generate(self, messages, temperature: float = 0.1):
+        return "{}"
+
+
+@dataclass
+class _DiskCounter:
+    reads: int = 0
+    writes: int = 0
+
+
+@dataclass
+class DiskOpsScenarioResult:
+    name: str
+    turns: int = 0
+    reads_per_turn: float = 0.0
+    writes_per_turn: float = 0.0
+    wall_ms_per_turn: float = 0.0
+    situational_keys: list[str] = field(default_factory=list)
+    intent_keys: list[str] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class TransientStateDiskOpsReport:
+    success: bool
+    turns: int
+    scenarios: list[dict]
+
+
+@contextlib.contextmanager
+def counting_disk_ops() -> Iterator[_DiskCounter]:
+    counter = _DiskCounter()
+    original_read = JsonDictStore._load_dict_file
+    original_write = JsonDictStore._atomic_write_text
+
+    def _read(self, path):
+        counter.reads += 1
+        return original_read(self, path)
+
+    def _write(self, path, text):
+        counter.writes += 1
+        return original_write(self, path, text)
+
+    JsonDictStore._load_dict_file = _read
+    JsonDictStore._atomic_write_text = _write
+    try:
+        yield counter
+    finally:
+        JsonDictStore._load_dict_file = original_read
+        JsonDictStore._atomic_write_text = original_write
+
+
+def _legacy_call_pattern(manager: TransientStateManager, text: str) -> None:
+    """Store traffic of one turn as the manager issued it before the in-memory
+    stores: every prune/upsert/render went through load_payload/save_payload
+    and the legacy world-model drain ran on each ingest and situational call."""
+    situational = manager.situational_store
+    intent = manager.intent_store
+    knowledge_mgr = manager.knowledge_mgr
+
+    def prune(store) -> None:
+        payload = store.load_payload()
+        now_ts = int(time.time())
+        kept = {
+            key: entry
+            for key, entry in payload["entries"].items()
+            if store._is_active(entry, now_ts)
+        }
+        if len(kept) != len(payload["entries"]):
+            payload["entries"] = kept
+            store.save_payload(payload)
+
+    def upsert(store, key: str, entry: dict) -> None:
+        payload = store.load_payload()
+        payload["entries"][key] = dict(entry)
+        store.save_payload(payload)
+
+    # ingest_user_turn
+    knowledge_mgr.drain_legacy_situational_entries()
+    prune(situational)
+    prune(intent)
+    for entry in manager._extract_situational_entries(text):
+        upsert(situational, entry.key, entry.as_payload())
+    for entry in manager._extract_intent_entries(text):
+        upsert(intent, entry.key, entry.as_payload())
+    # render_situational_state + render_intent_state for the context pack
+    knowledge_mgr.drain_legacy_situational_entries()
+    prune(situational)
+    situational.load_payload()
+    prune(intent)
+    intent.load_payload()
+
+
+def _current_call_pattern(manager: TransientStateManager, text: str) -> None:
+    manager.ingest_user_turn(text)
+    manager.render_situational_state(text)
+    manager.render_intent_state(text)
+
+
+def _run_scenario(name: str, *, turns: int, legacy: bool) -> DiskOpsScenarioResult:
+    result = DiskOpsScenarioResult(name=name, turns=turns)
+    with tempfile.TemporaryDirectory(prefix="piper-transient-bench-") as tmp:
+        data_dir = Path(tmp)
+        owner = SharedStateOwner.for_data_dir(data_dir)
+        knowledge_mgr = KnowledgeManager(
+            data_dir,
+            _DummyLLM(),
+            world_model_store=owner.world_model_store,
+            knowledge_store=owner.knowledge_store,
+        )
+        manager = TransientStateManager(
+            situational_store=owner.situational_state_store,
+            intent_store=owner.intent_state_store,
+            knowledge_mgr=knowledge_mgr,
+        )
+        step = _legacy_call_pattern if legacy else _current_call_pattern
+        # Warm-up turn: first touch of each store reads it from disk once.
+        step(manager, _TURNS[0])
+        with counting_disk_ops() as counter:
+            started = time.perf_counter()
+            for index in range(turns):
+                step(manager, _TURNS[index % len(_TURNS)])
+            elapsed = time.perf_counter() - started
+        result.reads_per_turn = round(counter.reads / turns, 3)
+        result.writes_per_turn = round(counter.writes / turns, 3)
+        result.wall_ms_per_turn = round(elapsed * 1000.0 / turns, 3)
+        result.situational_keys = sorted(owner.situational_state_store.load_payload()["entries"])
+        result.intent_keys = sorted(owner.intent_state_store.load_payload()["entries"])
+    return result
+
+
+def run_benchmark(*, turns: int) -> TransientStateDiskOpsReport:
+    legacy = _run_scenario("legacy_per_call_io", turns=turns, legacy=True)
+    current = _run_scenario("in_memory_batched", turns=turns, legacy=False)
+    success = (
+        legacy.situational_keys == current.situational_keys
+        and legacy.intent_keys == current.intent_keys
+        and current.reads_per_turn < legacy.reads_per_turn
+        and current.writes_per_turn < legacy.writes_per_turn
+    )
+    return TransientStateDiskOpsReport(
+        success=success,
+        turns=turns,
+        scenarios=[asdict(legacy), asdict(current)],
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Count per-turn disk reads/writes of transient state before and after in-memory batching."
+    )
+    parser.add_argument("--turns", type=int, default=60, help="Measured turns per scenario.")
+    parser.add_argument("--json", action="store_true", dest="as_json", help="Print the final report as JSON.")
+    return parser
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    report = run_benchmark(turns=max(1, args.turns))
+    if args.as_json:
+        print(json.dumps(asdict(report), indent=2, ensure_ascii=False))
+    else:
+        print(f"SUCCESS: {report.success}")
+        for item in report.scenarios:
+            print(
+                f"{item['name']}: reads/turn={item['reads_per_turn']:.2f} "
+                f"writes/turn={item['writes_per_turn']:.2f} wall/turn={item['wall_ms_per_turn']:.2f}ms"
+            )
+    return 0 if report.success else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
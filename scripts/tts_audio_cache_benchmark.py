@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from _bootstrap import ROOT_DIR
+
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import numpy as np  # noqa: E402
+
+from tools.tts_audio_cache import TTSAudioCache, audio_cache_key  # noqa: E402
+
+
+_SR = 24000
+_SYSTEM_PHRASES = (
+    "Systems online.",
+    "Search complete.",
+    "Done.",
+    "Canceled.",
+    "Reminder canceled.",
+    "Status: Error",
+    "Status: Searching",
+)
+
+
+@dataclass(frozen=True)
+class TTSAudioCacheBenchmarkReport:
+    success: bool
+    segments: int
+    repeat_fraction: float
+    hit_ratio: float
+    synth_ms_uncached: float
+    synth_ms_cached: float
+    saved_ms: float
+    disk_entries: int
+    disk_kib: float
+    restart_hit_ratio: float
+
+
+def _fake_synth(text: str, synth_ms_per_char: float) -> tuple[np.ndarray, int, float]:
+    cost_ms = max(20.0, len(text) * synth_ms_per_char)
+    samples = np.sin(np.linspace(0.0, len(text) * 40.0, int(_SR * len(text) * 0.06), dtype=np.float32)) * 0.3
+    return samples, _SR, cost_ms
+
+
+def _workload(segments: int, repeat_fraction: float, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    texts: list[str] = []
+    for index in range(segments):
+        if rng.random() < repeat_fraction:
+            texts.append(rng.choice(_SYSTEM_PHRASES))
+        else:
+            texts.append(f"Reply sentence number {index} with some unique detail {rng.randint(0, 10**6)}.")
+    return texts
+
+
+def _key(text: str) -> str:
+    return audio_cache_key(text, voice="af_heart", speed=0.85, backend="default", model_id="bench")
+
+
+def run_benchmark(*, segments: int, repeat_fraction: float, synth_ms_per_char: float, seed: int) -> TTSAudioCacheBenchmarkReport:
+    texts = _workload(segments, repeat_fraction, seed)
+    uncached_ms = sum(_fake_synth(text, synth_ms_per_char)[2] for text in texts)
+    with tempfile.TemporaryDirectory(prefix="tts-audio-cache-") as tmp:
+        root = Path(tmp)
+        cache = TTSAudioCache(root)
+        cached_ms = 0.0
+        for text in texts:
+            key = _key(text)
+            if not cache.cacheable(text) or cache.get(key) is None:
+                samples, sr, cost_ms = _fake_synth(text, synth_ms_per_char)
+                cached_ms += cost_ms
+                if cache.cacheable(text):
+                    cache.put(key, samples, sr, cost_ms)
+        cache.close()
+        snapshot = cache.snapshot()
+        files = list(root.glob("*.npz"))
+        disk_kib = sum(path.stat().st_size for path in files) / 1024.0
+
+        restarted = TTSAudioCache(root)
+        started = time.perf_counter()
+        for phrase in _SYSTEM_PHRASES:
+            restarted.get(_key(phrase))
+        restart_lookup_s = time.perf_counter() - started
+        restart_ratio = restarted.hit_ratio()
+    return TTSAudioCacheBenchmarkReport(
+        success=snapshot["hit_ratio"] > 0.0 and restart_ratio == 1.0 and restart_lookup_s < 1.0,
+        segments=len(texts),
+        repeat_fraction=repeat_fraction,
+        hit_ratio=float(snapshot["hit_ratio"]),
+        synth_ms_uncached=round(uncached_ms, 1),
+        synth_ms_cached=round(cached_ms, 1),
+        saved_ms=round(float(snapshot["saved_ms"]), 1),
+        disk_entries=len(files),
+        disk_kib=round(disk_kib, 1),
+        restart_hit_ratio=restart_ratio,
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Replay a mixed reply/system-phrase workload through the TTS audio cache and report saved synth time."
+    )
+    parser.add_argument("--segments", type=int, default=400, help="Spoken segments in the workload.")
+    parser.add_argument("--repeat-fraction", type=float, default=0.35, help="Share of segments that are system phrases.")
+    parser.add_argument("--synth-ms-per-char", type=float, default=2.5, help="Modeled synthesis cost per character.")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", action="store_true", dest="as_json", help="Print the final report as JSON.")
+    return parser
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    report = run_benchmark(
+        segments=max(1, args.segments),
+        repeat_fraction=min(1.0, max(0.0, args.repeat_fraction)),
+        synth_ms_per_char=max(0.0, args.synth_ms_per_char),
+        seed=args.seed,
+    )
+    if args.as_json:
+        print(json.dumps(asdict(report), indent=2, ensure_ascii=False))
+    else:
+        print(f"SUCCESS: {report.success}")
+        print(f"segments: {report.segments}  hit ratio: {report.hit_ratio:.1%}")
+        print(f"synth ms: {report.synth_ms_uncached:.0f} uncached -> {report.synth_ms_cached:.0f} cached (saved {report.saved_ms:.0f})")
+        print(f"disk: {report.disk_entries} entries, {report.disk_kib:.1f} KiB  restart hit ratio: {report.restart_hit_ratio:.0%}")
+    return 0 if report.success else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
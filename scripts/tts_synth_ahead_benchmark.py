@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+
+from _bootstrap import ROOT_DIR
+
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import numpy as np  # noqa: E402
+
+from tools.tts import TTS, TTSConfig  # noqa: E402
+
+
+_SR = 24000
+# Streaming chunk sizes for a long persona answer: a short opener, then the
+# phase 2 chunks of up to 320 chars.
+_CHUNK_CHARS = (48, 140, 300, 320, 280, 320, 310, 220)
+_AUDIO_S_PER_CHAR = 0.065
+
+
+@dataclass(frozen=True)
+class TTSSynthAheadBenchmarkReport:
+    success: bool
+    chunks: int
+    workers: int
+    ahead: int
+    audio_s: float
+    sequential_underrun_ms: float
+    parallel_underrun_ms: float
+    sequential_first_audio_ms: float
+    parallel_first_audio_ms: float
+    sequential_wall_ms: float
+    parallel_wall_ms: float
+    in_order: bool
+
+
+class _FakeEngine:
+    """Deterministic engine: synth and playback sleep for scripted durations."""
+
+    parallel_synthesis = True
+
+    def __init__(self, synth_s: dict[str, float], audio_s: dict[str, float]) -> None:
+        self.synth_s = synth_s
+        self.audio_s = audio_s
+        self.played: list[tuple[str, float, float]] = []
+        self._labels: dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def synthesize(self, text: str, voice=None, speed=None):
+        time.sleep(self.synth_s[text])
+        with self._lock:
+            label = len(self._labels) + 1
+            self._labels[label] = text
+        samples = np.zeros(int(_SR * self.audio_s[text]) + 1, dtype=np.float32)
+        samples[0] = label
+        return samples, _SR
+
+    def play(self, samples, sr: int) -> None:
+        text = self._labels[int(samples[0])]
+        started = time.perf_counter()
+        time.sleep(self.audio_s[text])
+        self.played.append((text, started, time.perf_counter()))
+
+    def list_voices(self) -> list[str]:
+        return []
+
+    def stop(self) -> None:
+        pass
+
+
+def _script(seed: int, time_scale: float, slow_factor: float) -> tuple[list[str], dict[str, float], dict[str, float]]:
+    rng = random.Random(seed)
+    texts: list[str] = []
+    synth_s: dict[str, float] = {}
+    audio_s: dict[str, float] = {}
+    slow_index = len(_CHUNK_CHARS) // 2
+    for index, chars in enumerate(_CHUNK_CHARS):
+        text = f"chunk {index} ({chars} chars)"
+        audio = chars * _AUDIO_S_PER_CHAR * time_scale
+        # Typical real-time factor around 0.7, with one chunk far slower than
+        # its own audio (long words, numbers, a cold voice pack).
+        rtf = rng.uniform(0.55, 0.85) * (slow_factor if index == slow_index else 1.0)
+        texts.append(text)
+        audio_s[text] = audio
+        synth_s[text] = audio * rtf
+    return texts, synth_s, audio_s
+
+
+def _run(texts: list[str], synth_s: dict[str, float], audio_s: dict[str, float], *, workers: int, ahead: int) -> tuple[float, float, float, bool]:
+    engine = _FakeEngine(synth_s, audio_s)
+    tts = TTS(TTSConfig(backend="kokoro", streaming_sink=False, audio_cache=False, synth_ahead=ahead, synth_workers=workers))
+    tts.engine = engine
+    tts.start()
+    try:
+        queued_at = time.perf_counter()
+        epoch = tts._get_epoch()
+        utterance_id = tts._next_utterance_id()
+        for text in texts:
+            tts._queue_text_job(epoch, utterance_id, text, None, None)
+        deadline = queued_at + 10.0 + sum(synth_s.values()) + sum(audio_s.values())
+        while len(engine.played) < len(texts) and time.perf_counter() < deadline:
+            time.sleep(0.002)
+    finally:
+        tts.shutdown()
+    played = list(engine.played)
+    underrun_s = sum(max(0.0, played[i][1] - played[i - 1][2]) for i in range(1, len(played)))
+    first_audio_s = played[0][1] - queued_at if played else 0.0
+    wall_s = played[-1][2] - queued_at if played else 0.0
+    in_order = [text for text, _start, _end in played] == texts
+    return underrun_s * 1000.0, first_audio_s * 1000.0, wall_s * 1000.0, in_order
+
+
+def run_benchmark(*, workers: int, ahead: int, seed: int, time_scale: float, slow_factor: float) -> TTSSynthAheadBenchmarkReport:
+    texts, synth_s, audio_s = _script(seed, time_scale, slow_factor)
+    seq_underrun, seq_first, seq_wall, seq_order = _run(texts, synth_s, audio_s, workers=1, ahead=ahead)
+    par_underrun, par_first, par_wall, par_order = _run(texts, synth_s, audio_s, workers=workers, ahead=ahead)
+    return TTSSynthAheadBenchmarkReport(
+        success=seq_order and par_order and par_underrun <= seq_underrun,
+        chunks=len(texts),
+        workers=workers,
+        ahead=ahead,
+        audio_s=round(sum(audio_s.values()), 3),
+        sequential_underrun_ms=round(seq_underrun, 1),
+        parallel_underrun_ms=round(par_underrun, 1),
+        sequential_first_audio_ms=round(seq_first, 1),
+        parallel_first_audio_ms=round(par_first, 1),
+        sequential_wall_ms=round(seq_wall, 1),
+        parallel_wall_ms=round(par_wall, 1),
+        in_order=seq_order and par_order,
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Compare playback underrun of sequential vs synth-ahead TTS on a scripted multi-chunk reply."
+    )
+    parser.add_argument("--workers", type=int, default=2, help="Synth workers for the parallel run.")
+    parser.add_argument("--ahead", type=int, default=3, help="Chunks allowed in flight ahead of playback.")
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--time-scale", type=float, default=0.04, help="Scale on modeled audio/synth durations.")
+    parser.add_argument("--slow-factor", type=float, default=2.5, help="Real-time-factor multiplier for the slow chunk.")
+    parser.add_argument("--json", action="store_true", dest="as_json", help="Print the final report as JSON.")
+    return parser
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    report = run_benchmark(
+        workers=max(2, args.workers),
+        ahead=max(2, args.ahead),
+        seed=args.seed,
+        time_scale=max(0.01, args.time_scale),
+        slow_factor=max(1.0, args.slow_factor),
+    )
+    if args.as_json:
+        print(json.dumps(asdict(report), indent=2, ensure_ascii=False))
+    else:
+        print(f"SUCCESS: {report.success} (in order: {report.in_order})")
+        print(f"chunks: {report.chunks}  audio: {report.audio_s:.2f}s  workers: {report.workers}  ahead: {report.ahead}")
+        print(
+            f"underrun: {report.sequential_underrun_ms:.1f} ms sequential -> {report.parallel_underrun_ms:.1f} ms synth-ahead"
+        )
+        print(
+            f"first audio: {report.sequential_first_audio_ms:.1f} / {report.parallel_first_audio_ms:.1f} ms  "
+            f"wall: {report.sequential_wall_ms:.1f} / {report.parallel_wall_ms:.1f} ms"
+        )
+    return 0 if report.success else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
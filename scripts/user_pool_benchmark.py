@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from _bootstrap import ROOT_DIR
+
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+_NAMES = ("Alice", "Bruno", "Chloe", "Deniz", "Emre", "Farah", "Goran", "Hana", "Ines", "Jonas", "Kemal", "Lena")
+
+
+@dataclass(frozen=True)
+class UserPoolCase:
+    users: int
+    max_resident_users: int
+    vector_backend: bool
+    rss_before_mib: Optional[float]
+    rss_after_mib: Optional[float]
+    first_switch_ms: float
+    switch_median_ms: float
+    switch_p95_ms: float
+    resident_users: int
+    embedding_models_loaded: int
+    chroma_clients: int
+    error: str = ""
+
+
+@dataclass
+class UserPoolBenchmarkReport:
+    success: bool
+    rounds: int
+    cases: list[UserPoolCase] = field(default_factory=list)
+
+
+def _rss_mib() -> Optional[float]:
+    try:
+        import psutil
+
+        return round(psutil.Process().memory_info().rss / (1024.0 * 1024.0), 1)
+    except Exception:
+        pass
+    try:
+        import resource
+
+        # ru_maxrss is the peak, in KiB on Linux.
+        return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0, 1)
+    except Exception:
+        return None
+
+
+def _wait_for_vector(brain, timeout_s: float) -> None:
+    deadline = time.monotonic() + timeout_s
+    while brain.vector_warmup_pending and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+
+def _switch(runtime, name: str, *, vector_wait_s: float) -> float:
+    started = time.perf_counter()
+    runtime.switch_active_user(name)
+    runtime.current_knowledge_manager()
+    runtime.current_transient_state_manager()
+    runtime.current_document_manager().list_documents()
+    brain = runtime.current_brain()
+    _wait_for_vector(brain, vector_wait_s)
+    brain.recall("what did we plan for the weekend", n_results=3)
+    return (time.perf_counter() - started) * 1000.0
+
+
+def run_case(users: int, *, rounds: int, max_resident_users: int, vector_wait_s: float) -> UserPoolCase:
+    from memory.brain import PiperBrain
+    from memory.resource_pool import pool_stats
+    from memory.user_runtime import ActiveUserRuntime
+
+    rss_before = _rss_mib()
+    names = [_NAMES[index % len(_NAMES)] + ("" if index < len(_NAMES) else str(index)) for index in range(users)]
+    with tempfile.TemporaryDirectory(prefix="piper-user-pool-") as raw_tmp:
+        runtime = ActiveUserRuntime(
+            Path(raw_tmp) / "data",
+            llm_client=None,
+            admin_user_id="admin_baris",
+            admin_name="Baris",
+            max_resident_users=max_resident_users,
+        )
+        first = [_switch(runtime, name, vector_wait_s=vector_wait_s) for name in names]
+        for name in names:
+            runtime.current_brain().remember(f"{name} is planning a hike on Saturday.", metadata={"type": "fact"})
+        samples = [_switch(runtime, name, vector_wait_s=vector_wait_s) for _ in range(rounds) for name in names]
+        stats = pool_stats()
+        resident = len(runtime.resident_users())
+    ordered = sorted(samples)
+    return UserPoolCase(
+        users=users,
+        max_resident_users=max_resident_users,
+        vector_backend=PiperBrain._vector_backend_dependencies_available(),
+        rss_before_mib=rss_before,
+        rss_after_mib=_rss_mib(),
+        first_switch_ms=round(statistics.median(first), 2),
+        switch_median_ms=round(statistics.median(ordered), 2),
+        switch_p95_ms=round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+        resident_users=resident,
+        embedding_models_loaded=sum(1 for item in stats["embedders"].values() if item["loaded"]),
+        chroma_clients=len(stats["chroma_clients"]),
+    )
+
+
+def _run_case_subprocess(users: int, *, rounds: int, max_resident_users: int, vector_wait_s: float) -> UserPoolCase:
+    # One interpreter per case so resident memory is not inherited from the previous one.
+    completed = subprocess.run(
+        [
+            sys.executable,
+            str(Path(__file__).resolve()),
+            "--case",
+            str(users),
+            "--rounds",
+            str(rounds),
+            "--max-resident-users",
+            str(max_resident_users),
+            "--vector-wait-s",
+            str(vector_wait_s),
+        ],
+        capture_output=True,
+        text=True,
+        cwd=str(ROOT_DIR),
+    )
+    lines = completed.stdout.strip().splitlines()
+    if completed.returncode != 0 or not lines:
+        error = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else f"exit code {completed.returncode}"
+        return UserPoolCase(users, max_resident_users, False, None, None, 0.0, 0.0, 0.0, 0, 0, 0, error=error)
+    return UserPoolCase(**json.loads(lines[-1]))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Measure resident memory and user-switch latency with the shared vector-memory pool."
+    )
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 4, 8], help="User counts to benchmark.")
+    parser.add_argument("--rounds", type=int, default=5, help="Round-robin passes over all users per case.")
+    parser.add_argument(
+        "--max-resident-users",
+        type=int,
+        default=0,
+        help="Silo cap passed to ActiveUserRuntime (0 = MAX_RESIDENT_USERS from config).",
+    )
+    parser.add_argument(
+        "--vector-wait-s",
+        type=float,
+        default=60.0,
+        help="How long a switch waits for vector warm-up when chromadb is installed.",
+    )
+    parser.add_argument("--case", type=int, default=0, help=argparse.SUPPRESS)
+    parser.add_argument("--json", action="store_true", dest="as_json", help="Print the final report as JSON.")
+    return parser
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    if args.max_resident_users > 0:
+        cap = args.max_resident_users
+    else:
+        from config import CFG
+
+        cap = int(getattr(CFG, "MAX_RESIDENT_USERS", 4))
+    rounds = max(1, args.rounds)
+    if args.case:
+        case = run_case(args.case, rounds=rounds, max_resident_users=cap, vector_wait_s=args.vector_wait_s)
+        print(json.dumps(asdict(case), ensure_ascii=False))
+        return 0
+    cases = [
+        _run_case_subprocess(max(1, users), rounds=rounds, max_resident_users=cap, vector_wait_s=args.vector_wait_s)
+        for users in args.users
+    ]
+    report = UserPoolBenchmarkReport(
+        success=all(not case.error and case.embedding_models_loaded <= 1 for case in cases),
+        rounds=rounds,
+        cases=cases,
+    )
+    if args.as_json:
+        print(json.dumps(asdict(report), indent=2, ensure_ascii=False))
+    else:
+        print(f"SUCCESS: {report.success}")
+        for case in report.cases:
+            if case.error:
+                print(f"{case.users} users: error: {case.error}")
+                continue
+            rss = f"{case.rss_before_mib} -> {case.rss_after_mib} MiB" if case.rss_after_mib is not None else "unavailable"
+            print(
+                f"{case.users} users (cap {case.max_resident_users}, vector={'on' if case.vector_backend else 'fallback'}): "
+                f"rss {rss}  first switch {case.first_switch_ms:.1f} ms  "
+                f"switch median {case.switch_median_ms:.2f} ms p95 {case.switch_p95_ms:.2f} ms  "
+                f"resident {case.resident_users}  models {case.embedding_models_loaded}  chroma clients {case.chroma_clients}"
+            )
+    return 0 if report.success else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional
+
+from _bootstrap import ROOT_DIR
+
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import numpy as np  # noqa: E402
+
+import tools.vision as vision  # noqa: E402
+from tools.vision_image import DataUrlCache, downscale_to_jpeg  # noqa: E402
+
+
+@dataclass(frozen=True)
+class VisionDownscaleBenchmarkReport:
+    success: bool
+    width: int
+    height: int
+    max_dim: int
+    in_process_ms: float
+    cached_ms: float
+    subprocess_ms: Optional[float]
+    speedup: Optional[float]
+    jpeg_kib: float
+
+
+def _screenshot_like(width: int, height: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    yy, xx = np.mgrid[0:height, 0:width]
+    image = np.empty((height, width, 3), dtype=np.uint8)
+    image[:] = (236, 238, 242)
+    image[: height // 18] = (40, 44, 52)
+    for _ in range(60):
+        y0, x0 = int(rng.integers(0, height - 40)), int(rng.integers(0, width - 200))
+        image[y0 : y0 + int(rng.integers(8, 40)), x0 : x0 + int(rng.integers(40, 200))] = rng.integers(0, 256, size=3)
+    # Text-like high-frequency rows.
+    text_rows = (yy % 22 < 9) & (xx % 7 < 4) & (xx > width // 5)
+    image[text_rows] = (30, 30, 30)
+    return image
+
+
+def _write_bmp(path: Path, pixels: np.ndarray) -> None:
+    height, width = pixels.shape[:2]
+    row_pad = (-width * 3) % 4
+    rows = np.ascontiguousarray(pixels[::-1, :, ::-1])
+    body = b"".join(row.tobytes() + b"\x00" * row_pad for row in rows)
+    header = b"BM" + (54 + len(body)).to_bytes(4, "little") + b"\x00\x00\x00\x00" + (54).to_bytes(4, "little")
+    info = (
+        (40).to_bytes(4, "little")
+        + width.to_bytes(4, "little", signed=True)
+        + height.to_bytes(4, "little", signed=True)
+        + (1).to_bytes(2, "little")
+        + (24).to_bytes(2, "little")
+        + b"\x00" * 24
+    )
+    path.write_bytes(header + info + body)
+
+
+def _median_ms(fn, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return statistics.median(samples)
+
+
+def run_benchmark(*, width: int, height: int, max_dim: int, quality: int, repeats: int, seed: int) -> VisionDownscaleBenchmarkReport:
+    pixels = _screenshot_like(width, height, seed)
+    with tempfile.TemporaryDirectory(prefix="vision-downscale-") as tmp:
+        source = Path(tmp) / "screen.bmp"
+        _write_bmp(source, pixels)
+
+        jpeg = downscale_to_jpeg(source, max_dim=max_dim, quality=quality)
+        in_process_ms = _median_ms(lambda: downscale_to_jpeg(source, max_dim=max_dim, quality=quality), repeats)
+
+        vision._DATA_URL_CACHE = DataUrlCache()
+        vision.encode_image_data_url(source, max_dim=max_dim, quality=quality)
+        cached_ms = _median_ms(lambda: vision.encode_image_data_url(source, max_dim=max_dim, quality=quality), repeats)
+
+        subprocess_ms: Optional[float] = None
+        try:
+            vision._resize_image_to_temp_jpeg(source, max_dim=max_dim).unlink(missing_ok=True)
+
+            def _subprocess() -> None:
+                resized = vision._resize_image_to_temp_jpeg(source, max_dim=max_dim)
+                try:
+                    resized.read_bytes()
+                finally:
+                    resized.unlink(missing_ok=True)
+
+            subprocess_ms = _median_ms(_subprocess, repeats)
+        except Exception:
+            subprocess_ms = None
+
+    speedup = round(subprocess_ms / in_process_ms, 2) if subprocess_ms and in_process_ms > 0 else None
+    return VisionDownscaleBenchmarkReport(
+        success=jpeg[:2] == b"\xff\xd8" and cached_ms < in_process_ms and (subprocess_ms is None or in_process_ms < subprocess_ms),
+        width=width,
+        height=height,
+        max_dim=max_dim,
+        in_process_ms=round(in_process_ms, 2),
+        cached_ms=round(cached_ms, 3),
+        subprocess_ms=round(subprocess_ms, 2) if subprocess_ms is not None else None,
+        speedup=speedup,
+        jpeg_kib=round(len(jpeg) / 1024.0, 1),
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Compare in-process (Pillow) vision downscale/JPEG encoding with the PowerShell resize path."
+    )
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--max-dim", type=int, default=1280, help="Long-side limit of the downscaled JPEG.")
+    parser.add_argument("--quality", type=int, default=85)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=4)
+    parser.add_argument("--json", action="store_true", dest="as_json", help="Print the final report as JSON.")
+    return parser
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        print("SUCCESS: False")
+        print("Pillow is not installed; the in-process path needs it (pip install Pillow).")
+        return 1
+    report = run_benchmark(
+        width=max(64, args.width),
+        height=max(64, args.height),
+        max_dim=max(16, args.max_dim),
+        quality=min(100, max(1, args.quality)),
+        repeats=max(1, args.repeats),
+        seed=args.seed,
+    )
+    if args.as_json:
+        print(json.dumps(asdict(report), indent=2, ensure_ascii=False))
+    else:
+        print(f"SUCCESS: {report.success}")
+        print(f"frame: {report.width}x{report.height} -> max {report.max_dim}px  jpeg: {report.jpeg_kib:.1f} KiB")
+        subprocess_text = f"{report.subprocess_ms:.1f} ms" if report.subprocess_ms is not None else "unavailable"
+        print(f"in-process: {report.in_process_ms:.1f} ms  cached: {report.cached_ms:.3f} ms  subprocess: {subprocess_text}")
+        if report.speedup is not None:
+            print(f"speedup vs subprocess: {report.speedup:.1f}x")
+    return 0 if report.success else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
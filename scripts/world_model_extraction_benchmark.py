@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+from _bootstrap import ROOT_DIR
+
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from llm.llm_server_client import LlamaServerClient, LlamaServerConfig, llm_role  # noqa: E402
+from memory.knowledge_policy import history_user_text  # noqa: E402
+from memory.stores import WorldModelStore  # noqa: E402
+from memory.world_model import WorldModelManager  # noqa: E402
+from memory.world_model_prompts import build_world_model_extraction_prompt  # noqa: E402
+
+_FACT_RE = re.compile(r"Turn (\d+): I enjoy (sport\d+)")
+_CHUNK_S = 0.01
+_PREEMPT_ALLOWANCE_MS = 50.0
+
+
+@dataclass(frozen=True)
+class ExtractionModeResult:
+    mode: str
+    turns: int
+    interactive_wait_median_ms: float
+    interactive_wait_max_ms: float
+    extraction_calls: int
+    extraction_busy_s: float
+    graph_writes: int
+    preemptions: int
+    drain_s: float
+    windows_per_call: float
+
+
+@dataclass
+class ExtractionBenchmarkReport:
+    success: bool
+    turns: int
+    interactive_ms: float
+    extraction_ms: float
+    gap_ms: float
+    results: list[ExtractionModeResult] = field(default_factory=list)
+
+
+class _FakeLatencyClient(LlamaServerClient):
+    """Real request lock; each request streams for a fixed time per role."""
+
+    def __init__(self, *, interactive_s: float, extraction_s: float) -> None:
+        super().__init__(LlamaServerConfig(base_url="http://stub", model="stub"))
+        self.interactive_s = interactive_s
+        self.extraction_s = extraction_s
+        self.waits: Dict[str, List[float]] = {}
+        self.busy_s: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        self._record_lock = threading.Lock()
+
+    def _stream_deltas(
+        self, messages, *, temperature=None, max_tokens=None, cancel_token=None, extra_payload=None
+    ) -> Iterator[Tuple[str, str]]:
+        role = self._resolve_role(None)
+        queued_at = time.perf_counter()
+        self._acquire_request_lock(cancel_token)
+        acquired_at = time.perf_counter()
+        try:
+            latency_s = self.extraction_s if role == "world_model" else self.interactive_s
+            deadline = acquired_at + latency_s
+            while time.perf_counter() < deadline:
+                time.sleep(min(_CHUNK_S, max(0.0, deadline - time.perf_counter())))
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+            with self._record_lock:
+                self.calls[role] = self.calls.get(role, 0) + 1
+            yield "content", _extraction_patch(messages) if role == "world_model" else "ok"
+        finally:
+            with self._record_lock:
+                self.waits.setdefault(role, []).append(acquired_at - queued_at)
+                self.busy_s[role] = self.busy_s.get(role, 0.0) + (time.perf_counter() - acquired_at)
+            self._release_request_lock()
+
+
+def _extraction_patch(messages: List[Dict[str, Any]]) -> str:
+    # Answer like a well-behaved extractor: one interest per user turn in the prompt.
+    prompt = str((messages or [{}])[-1].get("content") or "")
+    recent = prompt.rsplit("RECENT CHAT:", 1)[-1]
+    interests = sorted({match.group(2) for match in _FACT_RE.finditer(recent)})
+    attributes = [{"name": "interests", "value": value, "mode": "add", "ttl": "forever"} for value in interests]
+    return json.dumps(
+        {
+            "entities": [{"id": "person:user", "type": "person", "label": "User", "attributes": attributes}],
+            "relationships": [],
+        }
+    )
+
+
+def _window(end: int) -> List[Dict[str, str]]:
+    messages: List[Dict[str, str]] = []
+    for index in range(max(0, end - 3), end + 1):
+        messages.append({"role": "user", "content": f"Turn {index}: I enjoy sport{index}."})
+        messages.append({"role": "assistant", "content": f"Reply {index}."})
+    return messages[-8:]
+
+
+def _run_legacy_extraction(manager: WorldModelManager, window: List[Dict[str, str]]) -> None:
+    # What each per-turn thread did before the queue: one non-preemptible
+    # request for this window alone, then a full graph write.
+    graph = manager.load_graph()
+    prompt = build_world_model_extraction_prompt(graph, window)
+    with llm_role("world_model"):
+        result = manager.llm.generate([{"role": "user", "content": prompt}], temperature=0.0)
+    parsed = manager._parse_json_result(result)
+    if parsed and manager._apply_patch(graph, parsed, user_history_text=history_user_text(window)):
+        manager._save_graph(graph)
+
+
+def run_mode(
+    mode: str, *, turns: int, interactive_s: float, extraction_s: float, gap_s: float, debounce_s: float
+) -> ExtractionModeResult:
+    client = _FakeLatencyClient(interactive_s=interactive_s, extraction_s=extraction_s)
+    writes = [0]
+    with tempfile.TemporaryDirectory(prefix="piper-wm-extract-") as raw_tmp:
+        root = Path(raw_tmp)
+        manager = WorldModelManager(
+            root,
+            client,
+            world_model_store=WorldModelStore(root / "world_model.json"),
+            extraction_debounce_s=debounce_s,
+        )
+        manager.set_graph_saved_callback(lambda _graph: writes.__setitem__(0, writes[0] + 1))
+        legacy_threads: List[threading.Thread] = []
+        for turn in range(turns):
+            with llm_role("router"):
+                client.generate([{"role": "user", "content": f"turn {turn}"}])
+            if mode == "legacy":
+                thread = threading.Thread(target=_run_legacy_extraction, args=(manager, _window(turn)), daemon=True)
+                thread.start()
+                legacy_threads.append(thread)
+            else:
+                manager.update_knowledge_async(_window(turn))
+            time.sleep(gap_s)
+        drain_started = time.perf_counter()
+        for thread in legacy_threads:
+            thread.join()
+        manager.flush_pending_extraction()
+        drain_s = time.perf_counter() - drain_started
+        manager.close()
+        preemptions = client.background_preemptions
+
+    waits_ms = [wait * 1000.0 for wait in client.waits.get("router", [])]
+    calls = client.calls.get("world_model", 0)
+    return ExtractionModeResult(
+        mode=mode,
+        turns=turns,
+        interactive_wait_median_ms=round(statistics.median(waits_ms), 2),
+        interactive_wait_max_ms=round(max(waits_ms), 2),
+        extraction_calls=calls,
+        extraction_busy_s=round(client.busy_s.get("world_model", 0.0), 3),
+        graph_writes=writes[0],
+        preemptions=preemptions,
+        drain_s=round(drain_s, 3),
+        windows_per_call=round(turns / calls, 2) if calls else 0.0,
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Compare per-turn world-model extraction threads with the batched, preemptible queue."
+    )
+    parser.add_argument("--turns", type=int, default=12, help="Qualifying turns in the simulated conversation.")
+    parser.add_argument("--interactive-ms", type=float, default=150.0, help="Fake latency of each interactive call.")
+    parser.add_argument("--extraction-ms", type=float, default=600.0, help="Fake latency of each extraction call.")
+    parser.add_argument("--gap-ms", type=float, default=400.0, help="User think time between turns.")
+    parser.add_argument("--debounce-s", type=float, default=0.3, help="Queue debounce window.")
+    parser.add_argument("--json", action="store_true", dest="as_json", help="Print the final report as JSON.")
+    return parser
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    turns = max(2, args.turns)
+    params = {
+        "turns": turns,
+        "interactive_s": max(0.0, args.interactive_ms) / 1000.0,
+        "extraction_s": max(0.0, args.extraction_ms) / 1000.0,
+        "gap_s": max(0.0, args.gap_ms) / 1000.0,
+        "debounce_s": max(0.0, args.debounce_s),
+    }
+    legacy = run_mode("legacy", **params)
+    queued = run_mode("queued", **params)
+    report = ExtractionBenchmarkReport(
+        success=(
+            queued.graph_writes <= legacy.graph_writes
+            and queued.extraction_calls <= legacy.extraction_calls
+            # A preempted extraction hands over at its next chunk.
+            and queued.interactive_wait_max_ms <= max(legacy.interactive_wait_max_ms, _PREEMPT_ALLOWANCE_MS)
+        ),
+        turns=turns,
+        interactive_ms=args.interactive_ms,
+        extraction_ms=args.extraction_ms,
+        gap_ms=args.gap_ms,
+        results=[legacy, queued],
+    )
+    if args.as_json:
+        print(json.dumps(asdict(report), indent=2, ensure_ascii=False))
+    else:
+        print(f"SUCCESS: {report.success}")
+        for result in report.results:
+            print(
+                f"{result.mode:>6}: interactive wait median {result.interactive_wait_median_ms:.1f} ms "
+                f"max {result.interactive_wait_max_ms:.1f} ms  extraction calls {result.extraction_calls} "
+                f"({result.windows_per_call:.1f} turns/call, {result.extraction_busy_s:.2f} s busy)  "
+                f"graph writes {result.graph_writes}  preemptions {result.preemptions}  drain {result.drain_s:.2f} s"
+            )
+    return 0 if report.success else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,342 @@
+"""Regression tests for the dependency-graph boot scheduler.
+
+These tests require no llama server, no brain and no TTS. Boot work is
+replaced by fake tasks that sleep for configured durations, so the checks are
+about scheduling: overlap, ordering, milestones, timeouts and the timeline.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+import llm.boot as boot
+from llm.boot import BootManager
+from llm.boot_graph import STAGE_INTERACTIVE, STAGE_WARM, BootGraph, BootTask
+
+
+# ── helpers ──────────────────────────────────────────────────────────
+
+
+def _sleeper(duration_s: float, calls: list[str] | None = None, name: str = ""):
+    def _run() -> None:
+        time.sleep(duration_s)
+        if calls is not None:
+            calls.append(name)
+
+    return _run
+
+
+def _task(name: str, duration_s: float, *, calls: list[str] | None = None, **kwargs) -> BootTask:
+    return BootTask(name=name, run=_sleeper(duration_s, calls, name), **kwargs)
+
+
+def _run_all(tasks: list[BootTask], **kwargs):
+    run = BootGraph(tasks).start(**kwargs)
+    assert run.wait_warm(timeout=10.0)
+    return run
+
+
+# ── 1. parallel scheduling ───────────────────────────────────────────
+
+
+class TestScheduling:
+    def test_independent_tasks_overlap(self) -> None:
+        started = time.monotonic()
+        run = _run_all([_task(f"t{i}", 0.2) for i in range(4)])
+        elapsed = time.monotonic() - started
+
+        assert elapsed < 0.6  # sequential would be 0.8s
+        assert run.timeline.warm_s == pytest.approx(0.2, abs=0.15)
+        assert all(record.status == "ok" for record in run.timeline.tasks.values())
+
+    def test_dependencies_start_after_their_prerequisites(self) -> None:
+        calls: list[str] = []
+        run = _run_all(
+            [
+                _task("server", 0.1, calls=calls),
+                _task("brain", 0.05, calls=calls),
+                _task("tools", 0.02, calls=calls, deps=("server", "brain")),
+            ]
+        )
+        records = run.timeline.tasks
+
+        assert calls[-1] == "tools"
+        assert records["tools"].start_s >= max(records["server"].end_s, records["brain"].end_s)
+
+    def test_critical_path_follows_the_gating_chain(self) -> None:
+        run = _run_all(
+            [
+                _task("server", 0.15),
+                _task("brain", 0.05),
+                _task("ui", 0.02, deps=("server", "brain")),
+                _task("tts", 0.3, stage=STAGE_WARM),
+                _task("presynth", 0.05, stage=STAGE_WARM, deps=("tts",)),
+            ]
+        )
+
+        assert run.timeline.critical_path(STAGE_INTERACTIVE) == ["server", "ui"]
+        assert run.timeline.critical_path(STAGE_WARM) == ["tts", "presynth"]
+
+
+# ── 2. milestones ────────────────────────────────────────────────────
+
+
+class TestMilestones:
+    def test_interactive_is_reached_before_warm_tasks_finish(self) -> None:
+        warm_done = threading.Event()
+
+        def _slow_warm() -> None:
+            time.sleep(0.4)
+            warm_done.set()
+
+        run = BootGraph(
+            [
+                _task("server", 0.05, required=True),
+                BootTask(name="tts", run=_slow_warm, stage=STAGE_WARM),
+            ]
+        ).start()
+
+        assert run.wait_interactive(timeout=5.0) is True
+        assert not warm_done.is_set()
+        assert run.timeline.interactive_s < 0.3
+        assert run.wait_warm(timeout=5.0)
+        assert run.timeline.warm_s >= run.timeline.interactive_s
+
+    def test_required_failure_is_reported_at_the_interactive_milestone(self) -> None:
+        def _broken() -> None:
+            raise RuntimeError("port in use")
+
+        run = _run_all(
+            [
+                BootTask(name="server", run=_broken, required=True),
+                _task("optional", 0.01),
+            ]
+        )
+
+        assert run.wait_interactive() is False
+        assert run.timeline.tasks["server"].status == "failed"
+        assert run.timeline.tasks["server"].detail == "port in use"
+
+    def test_callbacks_receive_the_timeline(self) -> None:
+        seen: list[tuple[str, float | None]] = []
+        run = _run_all(
+            [_task("server", 0.02), _task("tts", 0.05, stage=STAGE_WARM)],
+            on_interactive=lambda timeline: seen.append(("interactive", timeline.interactive_s)),
+            on_warm=lambda timeline: seen.append(("warm", timeline.warm_s)),
+        )
+
+        assert [name for name, _ in seen] == ["interactive", "warm"]
+        assert seen[1][1] == run.timeline.warm_s
+
+
+# ── 3. failures, timeouts and probes ─────────────────────────────────
+
+
+class TestFailures:
+    def test_timeout_marks_the_task_and_skips_dependents(self) -> None:
+        started = time.monotonic()
+        run = _run_all(
+            [
+                _task("hung", 2.0, stage=STAGE_WARM, timeout_s=0.1),
+                _task("after", 0.01, stage=STAGE_WARM, deps=("hung",)),
+                _task("other", 0.05, stage=STAGE_WARM),
+            ]
+        )
+        records = run.timeline.tasks
+
+        assert time.monotonic() - started < 1.0
+        assert records["hung"].status == "timeout"
+        assert records["after"].status == "skipped"
+        assert "hung" in records["after"].detail
+        assert records["other"].status == "ok"
+
+    def test_false_result_fails_the_task(self) -> None:
+        run = _run_all(
+            [
+                BootTask(name="server", run=lambda: False),
+                _task("ui", 0.01, deps=("server",)),
+            ]
+        )
+
+        assert run.timeline.tasks["server"].status == "failed"
+        assert run.timeline.tasks["ui"].status == "skipped"
+
+    def test_probe_is_polled_until_ready(self) -> None:
+        ready_at = time.monotonic() + 0.15
+        run = _run_all(
+            [
+                BootTask(
+                    name="vectors",
+                    run=lambda: None,
+                    stage=STAGE_WARM,
+                    probe=lambda: time.monotonic() >= ready_at,
+                    probe_interval_s=0.02,
+                    timeout_s=2.0,
+                )
+            ]
+        )
+
+        assert run.timeline.tasks["vectors"].status == "ok"
+        assert run.timeline.tasks["vectors"].duration_s >= 0.1
+
+    def test_probe_that_never_reports_ready_times_out(self) -> None:
+        run = _run_all(
+            [
+                BootTask(
+                    name="vectors",
+                    run=lambda: None,
+                    stage=STAGE_WARM,
+                    probe=lambda: False,
+                    probe_interval_s=0.02,
+                    timeout_s=0.1,
+                )
+            ]
+        )
+
+        assert run.timeline.tasks["vectors"].status == "timeout"
+
+    def test_labels_are_logged_like_the_old_sequencer(self) -> None:
+        lines: list[str] = []
+        _run_all(
+            [
+                BootTask(name="tts", run=lambda: None, label="Warming TTS engine..."),
+                BootTask(name="browser", run=lambda: "Browser pool ready", label="Warming browser pool..."),
+            ],
+            log=lines.append,
+        )
+
+        assert "Warming TTS engine..." in lines
+        assert "Warming TTS engine... OK" in lines
+        assert "Browser pool ready" in lines
+
+
+# ── 4. validation ────────────────────────────────────────────────────
+
+
+class TestValidation:
+    @pytest.mark.parametrize(
+        ("tasks", "message"),
+        [
+            ([_task("a", 0, deps=("b",)), _task("b", 0, deps=("a",))], "cycle"),
+            ([_task("a", 0, deps=("missing",))], "unknown task"),
+            ([_task("a", 0), _task("a", 0)], "duplicate"),
+            ([_task("a", 0, stage="eventually")], "unknown stage"),
+            ([_task("w", 0, stage=STAGE_WARM), _task("ui", 0, deps=("w",))], "cannot wait"),
+        ],
+    )
+    def test_invalid_graphs_are_rejected(self, tasks: list[BootTask], message: str) -> None:
+        with pytest.raises(ValueError, match=message):
+            BootGraph(tasks)
+
+
+# ── 5. timeline trace ────────────────────────────────────────────────
+
+
+class TestTimeline:
+    def test_json_trace_lists_tasks_and_critical_paths(self, tmp_path: Path) -> None:
+        run = _run_all(
+            [
+                _task("server", 0.05),
+                _task("ui", 0.01, deps=("server",)),
+                _task("tts", 0.1, stage=STAGE_WARM),
+            ]
+        )
+
+        path = run.timeline.write_json(tmp_path / "debug" / "boot_timeline.json")
+        trace = json.loads(path.read_text(encoding="utf-8"))
+
+        assert {task["name"] for task in trace["tasks"]} == {"server", "ui", "tts"}
+        assert trace["critical_path"] == {"interactive": ["server", "ui"], "warm": ["tts"]}
+        assert trace["interactive_ok"] is True
+        assert trace["warm_s"] >= trace["interactive_s"]
+        assert sorted(p.name for p in path.parent.iterdir()) == ["boot_timeline.json"]
+
+
+# ── 6. BootManager integration ───────────────────────────────────────
+
+
+@pytest.fixture
+def boot_manager(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(boot.CFG, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(boot.CFG, "BOOT_WARM_TASK_TIMEOUT_S", 5.0)
+    created: list[BootManager] = []
+
+    def _factory(*, server_s: float = 0.05, brain_s: float = 0.05, **kwargs) -> BootManager:
+        manager = BootManager(None, **kwargs)
+
+        def _server() -> bool:
+            time.sleep(server_s)
+            manager.server_ready = True
+            return True
+
+        def _brain() -> bool:
+            time.sleep(brain_s)
+            manager.brain_ready = True
+            return True
+
+        monkeypatch.setattr(manager, "_wait_for_server", _server)
+        monkeypatch.setattr(manager, "_init_brain", _brain)
+        created.append(manager)
+        return manager
+
+    yield _factory
+    for manager in created:
+        if manager.timeline is not None:
+            deadline = time.monotonic() + 5.0
+            while not manager.warm and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+
+class TestBootManager:
+    def test_ready_does_not_wait_for_background_warmups(self, boot_manager, tmp_path: Path) -> None:
+        manager = boot_manager(background_boot_tasks=[("Warming TTS engine...", _sleeper(0.5))])
+
+        started = time.monotonic()
+        manager.run_sequence()
+
+        assert manager.ready
+        assert time.monotonic() - started < 0.4
+        assert not manager.warm
+        deadline = time.monotonic() + 5.0
+        while not manager.warm and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert manager.warm
+        trace = json.loads((tmp_path / "debug" / "boot_timeline.json").read_text(encoding="utf-8"))
+        assert trace["critical_path"]["warm"] == ["Warming TTS engine..."]
+
+    def test_post_boot_tasks_run_beside_the_server(self, boot_manager) -> None:
+        manager = boot_manager(
+            server_s=0.2,
+            post_boot_tasks=[("Loading tools...", _sleeper(0.2)), ("Loading skills...", _sleeper(0.2))],
+        )
+
+        started = time.monotonic()
+        manager.run_sequence()
+
+        assert manager.ready
+        assert time.monotonic() - started < 0.5  # sequential would be 0.6s
+
+    def test_failed_server_is_reported_without_waiting_for_warmups(self, boot_manager) -> None:
+        manager = boot_manager(background_boot_tasks=[("Warming TTS engine...", _sleeper(0.3))])
+        manager._wait_for_server = lambda: False
+
+        manager.run_sequence()
+
+        assert not manager.ready
+        assert manager.timeline.tasks["llm_server"].status == "failed"
+
+    def test_resume_skips_post_boot_work(self, boot_manager) -> None:
+        calls: list[str] = []
+        manager = boot_manager(background_boot_tasks=[("Warming TTS engine...", _sleeper(0.0, calls, "tts"))])
+
+        run = manager.run_sequence(run_post_boot_tasks=False)
+
+        assert run.wait_warm(timeout=5.0)
+        assert manager.ready
+        assert set(manager.timeline.tasks) == {"llm_server", "brain"}
+        assert calls == []
@@ -0,0 +1,290 @@
+"""Guard tests for BrowserContextPool and its ComputerUseEngine wiring.
+
+These tests require no browser binaries. The Playwright driver is replaced by
+fakes so launch, recycle and request-blocking behavior can be checked directly.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+import core.engines.computer_use_engine as computer_use_module
+from core.engines.browser_pool import BrowserContextPool
+from core.engines.computer_use_engine import ComputerUseEngine
+
+
+# ── fakes ────────────────────────────────────────────────────────────
+
+
+class _FakePage:
+    def __init__(self, context: "_FakeContext") -> None:
+        self.context = context
+        self.closed = False
+        self.url = "about:blank"
+        self.threads: list[threading.Thread] = []
+
+    def evaluate(self, expression: str, arg: Any = None) -> Any:
+        # Just the localStorage calls the isolation test makes.
+        if "localStorage.setItem" in expression:
+            key, value = arg
+            self.context.local_storage[key] = value
+            return None
+        if "localStorage.getItem" in expression:
+            return self.context.local_storage.get(arg)
+        raise NotImplementedError(expression)
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    def close(self) -> None:
+        self.closed = True
+
+    def goto(self, url: str, **kwargs: Any) -> None:
+        self.threads.append(threading.current_thread())
+        self.url = url
+
+
+class _FakeContext:
+    def __init__(self) -> None:
+        self.pages: list[_FakePage] = []
+        self.routes: list[tuple[str, Any]] = []
+        self.local_storage: dict[str, str] = {}
+        self.closed = False
+
+    def route(self, pattern: str, handler: Any) -> None:
+        self.routes.append((pattern, handler))
+
+    def new_page(self) -> _FakePage:
+        page = _FakePage(self)
+        self.pages.append(page)
+        return page
+
+    def close(self) -> None:
+        self.closed = True
+        for page in self.pages:
+            page.closed = True
+
+
+class _FakeBrowser:
+    def __init__(self) -> None:
+        self.connected = True
+        self.contexts: list[_FakeContext] = []
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+    def new_context(self, **kwargs: Any) -> _FakeContext:
+        context = _FakeContext()
+        self.contexts.append(context)
+        return context
+
+    def close(self) -> None:
+        self.connected = False
+
+
+class _FakeLauncher:
+    def __init__(self) -> None:
+        self.browsers: list[_FakeBrowser] = []
+        self.threads: list[threading.Thread] = []
+
+    def __call__(self, headless: bool) -> tuple[Any, Any]:
+        self.threads.append(threading.current_thread())
+        browser = _FakeBrowser()
+        self.browsers.append(browser)
+        return SimpleNamespace(stop=lambda: None), browser
+
+
+class _FakeRoute:
+    def __init__(self, resource_type: str) -> None:
+        self.request = SimpleNamespace(resource_type=resource_type)
+        self.outcome = ""
+
+    def abort(self) -> None:
+        self.outcome = "abort"
+
+    def continue_(self) -> None:
+        self.outcome = "continue"
+
+
+@pytest.fixture
+def launcher() -> _FakeLauncher:
+    return _FakeLauncher()
+
+
+@pytest.fixture
+def pool(launcher: _FakeLauncher):
+    instance = BrowserContextPool(launcher=launcher, max_idle_contexts=2)
+    yield instance
+    instance.shutdown()
+
+
+# ── 1. pool lifecycle ────────────────────────────────────────────────
+
+
+class TestBrowserContextPool:
+    def test_warm_launches_once_on_worker_thread(self, pool: BrowserContextPool, launcher: _FakeLauncher) -> None:
+        pool.warm()
+        pool.warm()
+
+        assert pool.stats["launches"] == 1
+        assert pool.stats["contexts_created"] == 1
+        assert launcher.threads[0] is not threading.current_thread()
+        assert launcher.threads[0].name.startswith("piper-browser")
+
+    def test_acquire_reuses_warmed_context(self, pool: BrowserContextPool, launcher: _FakeLauncher) -> None:
+        pool.warm()
+        context, page = pool.acquire()
+
+        assert context is launcher.browsers[0].contexts[0]
+        assert page is context.pages[0]
+        assert pool.stats["contexts_reused"] == 1
+        assert pool.stats["contexts_created"] == 1
+
+    def test_release_replaces_context_with_a_fresh_one(self, pool: BrowserContextPool) -> None:
+        context, page = pool.acquire()
+        extra = context.new_page()
+        pool.release(context, page)
+
+        assert context.closed is True and extra.closed is True
+        assert pool.stats["contexts_recycled"] == 1
+        again_context, again_page = pool.acquire()
+        assert again_context is not context
+        assert again_page is again_context.pages[0]
+        assert pool.stats["contexts_reused"] == 1
+        assert pool.stats["launches"] == 1
+
+    def test_local_storage_does_not_survive_release(self, pool: BrowserContextPool) -> None:
+        context, page = pool.acquire()
+        page.goto("http://127.0.0.1/index.html")
+        page.evaluate("([key, value]) => localStorage.setItem(key, value)", ["token", "secret"])
+        assert page.evaluate("(key) => localStorage.getItem(key)", "token") == "secret"
+        pool.release(context, page)
+
+        _again_context, again_page = pool.acquire()
+        again_page.goto("http://127.0.0.1/index.html")
+
+        assert again_page.evaluate("(key) => localStorage.getItem(key)", "token") is None
+
+    def test_release_closes_when_idle_pool_is_full(self, launcher: _FakeLauncher) -> None:
+        pool = BrowserContextPool(launcher=launcher, max_idle_contexts=0)
+        try:
+            context, page = pool.acquire()
+            pool.release(context, page)
+            assert context.closed is True
+            assert pool.stats["contexts_recycled"] == 0
+        finally:
+            pool.shutdown()
+
+    def test_disconnected_browser_is_relaunched(self, pool: BrowserContextPool, launcher: _FakeLauncher) -> None:
+        pool.warm()
+        launcher.browsers[0].connected = False
+        context, _page = pool.acquire()
+
+        assert pool.stats["launches"] == 2
+        assert context is launcher.browsers[1].contexts[0]
+
+    def test_route_blocks_heavy_resource_types(self, pool: BrowserContextPool) -> None:
+        outcomes = {}
+        for resource_type in ("document", "script", "stylesheet", "image", "media", "font"):
+            route = _FakeRoute(resource_type)
+            pool._route_request(route)
+            outcomes[resource_type] = route.outcome
+
+        assert outcomes == {
+            "document": "continue",
+            "script": "continue",
+            "stylesheet": "continue",
+            "image": "abort",
+            "media": "abort",
+            "font": "abort",
+        }
+        assert pool.stats["blocked_requests"] == 3
+
+    def test_contexts_install_route_only_when_blocking(self, launcher: _FakeLauncher) -> None:
+        pool = BrowserContextPool(launcher=launcher, blocked_resource_types=())
+        try:
+            context, _page = pool.acquire()
+            assert context.routes == []
+        finally:
+            pool.shutdown()
+
+    def test_shutdown_closes_browser_and_allows_restart(self, pool: BrowserContextPool, launcher: _FakeLauncher) -> None:
+        pool.warm()
+        pool.shutdown()
+        assert launcher.browsers[0].connected is False
+        assert pool.browser_ready is False
+
+        pool.warm()
+        assert pool.stats["launches"] == 2
+
+
+# ── 2. engine wiring ─────────────────────────────────────────────────
+
+
+class TestEnginePoolWiring:
+    def _engine(self, tmp_path: Path, pool: BrowserContextPool, monkeypatch: pytest.MonkeyPatch) -> ComputerUseEngine:
+        monkeypatch.setattr(computer_use_module, "sync_playwright", object())
+        return ComputerUseEngine(data_dir=tmp_path / "data", workspace=tmp_path / "workspace", browser_pool=pool)
+
+    def test_suspend_recycles_instead_of_relaunching(
+        self,
+        tmp_path: Path,
+        pool: BrowserContextPool,
+        launcher: _FakeLauncher,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        engine = self._engine(tmp_path, pool, monkeypatch)
+        first_page = pool.run(engine._ensure_playwright_page)
+        engine.suspend()
+        second_page = pool.run(engine._ensure_playwright_page)
+
+        assert second_page is not first_page and first_page.closed
+        assert pool.stats["launches"] == 1
+        assert pool.stats["contexts_reused"] == 1
+        assert pool.stats["contexts_recycled"] == 1
+
+    def test_browser_ops_run_on_pool_thread(
+        self,
+        tmp_path: Path,
+        pool: BrowserContextPool,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        engine = self._engine(tmp_path, pool, monkeypatch)
+        seen: list[threading.Thread] = []
+        monkeypatch.setattr(
+            engine,
+            "_handle_capture_state",
+            lambda payload, cancel_token=None: seen.append(threading.current_thread()) or {"status": "EXECUTED"},
+        )
+        engine._session.current_url = "http://127.0.0.1/index.html"
+        result = engine.exec_browser_op(json.dumps({"action": "capture_state"}))
+
+        assert result == {"status": "EXECUTED"}
+        assert seen and seen[0].name.startswith("piper-browser")
+
+    def test_prewarm_respects_config_flag(
+        self,
+        tmp_path: Path,
+        pool: BrowserContextPool,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        engine = self._engine(tmp_path, pool, monkeypatch)
+        monkeypatch.setattr(computer_use_module.CFG, "COMPUTER_USE_PREWARM_BROWSER", False, raising=False)
+        assert "skipped" in engine.prewarm()
+        assert pool.browser_ready is False
+
+        monkeypatch.setattr(computer_use_module.CFG, "COMPUTER_USE_PREWARM_BROWSER", True, raising=False)
+        engine.prewarm()
+        assert pool.browser_ready is True
+
+    def test_navigation_wait_until_falls_back_on_invalid_value(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(computer_use_module.CFG, "COMPUTER_USE_NAV_WAIT_UNTIL", "whenever", raising=False)
+        assert ComputerUseEngine._navigation_wait_until() == "domcontentloaded"
+        monkeypatch.setattr(computer_use_module.CFG, "COMPUTER_USE_NAV_WAIT_UNTIL", "load", raising=False)
+        assert ComputerUseEngine._navigation_wait_until() == "load"
@@ -0,0 +1,510 @@
+"""Guard tests for the warm ComfyUI lifecycle and event-stream job tracking.
+
+These tests require no ComfyUI, no GPU and no model. A stub server imitates the
+ComfyUI HTTP endpoints (``/system_stats``, ``/prompt``, ``/history``, ``/view``,
+``/interrupt``, ``/queue``, ``/free``) and the ``/ws`` event stream on one port,
+running queued prompts one at a time like the real server.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import queue
+import struct
+import threading
+import time
+import urllib.parse
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from core.runtime_control import CancellationToken, OperationCancelled
+from tools.comfy_client import ComfyAPI, ComfyServerManager, copy_output_file
+from tools.image_gen import ImageGenerator
+
+
+_WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+# ── helpers ──────────────────────────────────────────────────────────
+
+
+def _ws_frame(opcode: int, payload: bytes) -> bytes:
+    size = len(payload)
+    if size < 126:
+        header = struct.pack("!BB", 0x80 | opcode, size)
+    elif size < 65536:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, size)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, size)
+    return header + payload
+
+
+def _read_ws_frame(rfile) -> tuple[int, bytes] | None:
+    head = rfile.read(2)
+    if len(head) < 2:
+        return None
+    opcode, size = head[0] & 0x0F, head[1] & 0x7F
+    if size == 126:
+        size = struct.unpack("!H", rfile.read(2))[0]
+    elif size == 127:
+        size = struct.unpack("!Q", rfile.read(8))[0]
+    mask = rfile.read(4) if head[1] & 0x80 else b"\x00\x00\x00\x00"
+    data = bytes(byte ^ mask[i % 4] for i, byte in enumerate(rfile.read(size)))
+    return opcode, data
+
+
+class _StubComfy:
+    """Single-port HTTP + websocket imitation of a ComfyUI server."""
+
+    def __init__(
+        self,
+        output_dir: Path,
+        *,
+        websocket: bool = True,
+        steps: int = 3,
+        step_delay_s: float = 0.01,
+        vram_free: float = 0.9,
+    ) -> None:
+        self.output_dir = output_dir
+        self.websocket = websocket
+        self.steps = steps
+        self.step_delay_s = step_delay_s
+        self.vram_free = vram_free
+        self.up = False
+        self.failing: set[str] = set()
+        self.submitted: list[tuple[str, float]] = []
+        self.completed: list[tuple[str, float]] = []
+        self.history_gets = 0
+        self.view_gets = 0
+        self.interrupts = 0
+        self.deleted: list[str] = []
+        self.frees: list[dict] = []
+        self._history: dict[str, dict] = {}
+        self._clients: dict[str, tuple[object, threading.Lock]] = {}
+        self._jobs: "queue.Queue[tuple[str, str, dict] | None]" = queue.Queue()
+        self._interrupted = threading.Event()
+        self._lock = threading.Lock()
+        self._counter = 0
+        stub = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *_args) -> None:
+                pass
+
+            def _json(self, payload, status: int = 200) -> None:
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self) -> None:  # noqa: N802
+                parsed = urllib.parse.urlparse(self.path)
+                if not stub.up:
+                    self._json({"error": "starting"}, status=503)
+                elif parsed.path == "/ws" and stub.websocket:
+                    self._serve_websocket(urllib.parse.parse_qs(parsed.query).get("clientId", [""])[0])
+                elif parsed.path == "/system_stats":
+                    self._json({"system": {}, "devices": [{"vram_total": 1000, "vram_free": int(stub.vram_free * 1000)}]})
+                elif parsed.path.startswith("/history/"):
+                    with stub._lock:
+                        stub.history_gets += 1
+                        prompt_id = parsed.path.rsplit("/", 1)[1]
+                        entry = stub._history.get(prompt_id)
+                    self._json({prompt_id: entry} if entry else {})
+                elif parsed.path == "/view":
+                    stub.view_gets += 1
+                    name = urllib.parse.parse_qs(parsed.query)["filename"][0]
+                    body = (stub.output_dir / name).read_bytes()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "image/png")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                else:
+                    self._json({"error": "not found"}, status=404)
+
+            def do_POST(self) -> None:  # noqa: N802
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if self.path == "/prompt":
+                    prompt_id = uuid.uuid4().hex
+                    with stub._lock:
+                        stub.submitted.append((prompt_id, time.monotonic()))
+                    stub._jobs.put((prompt_id, payload.get("client_id", ""), payload["prompt"]))
+                    self._json({"prompt_id": prompt_id, "number": len(stub.submitted)})
+                elif self.path == "/interrupt":
+                    stub.interrupts += 1
+                    stub._interrupted.set()
+                    self._json({})
+                elif self.path == "/queue":
+                    stub.deleted.extend(payload.get("delete") or [])
+                    self._json({})
+                elif self.path == "/free":
+                    stub.frees.append(payload)
+                    self._json({})
+                else:
+                    self._json({"error": "not found"}, status=404)
+
+            def _serve_websocket(self, client_id: str) -> None:
+                accept = base64.b64encode(
+                    hashlib.sha1((self.headers["Sec-WebSocket-Key"] + _WS_GUID).encode("ascii")).digest()
+                ).decode("ascii")
+                self.send_response(101, "Switching Protocols")
+                self.send_header("Upgrade", "websocket")
+                self.send_header("Connection", "Upgrade")
+                self.send_header("Sec-WebSocket-Accept", accept)
+                self.end_headers()
+                self.wfile.flush()
+                lock = threading.Lock()
+                with stub._lock:
+                    stub._clients[client_id] = (self.wfile, lock)
+                stub._send(client_id, {"type": "status", "data": {"status": {"exec_info": {"queue_remaining": 0}}}})
+                try:
+                    while True:
+                        frame = _read_ws_frame(self.rfile)
+                        if frame is None:
+                            break
+                        opcode, data = frame
+                        if opcode == 0x8:
+                            with lock:
+                                self.wfile.write(_ws_frame(0x8, data[:2]))
+                                self.wfile.flush()
+                            break
+                        if opcode == 0x9:
+                            with lock:
+                                self.wfile.write(_ws_frame(0xA, data))
+                                self.wfile.flush()
+                except (ConnectionError, OSError):
+                    pass
+                finally:
+                    with stub._lock:
+                        stub._clients.pop(client_id, None)
+                    self.close_connection = True
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self._httpd.server_address[1]}"
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        threading.Thread(target=self._worker, daemon=True).start()
+
+    def close(self) -> None:
+        self._jobs.put(None)
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _send(self, client_id: str, message: dict) -> None:
+        with self._lock:
+            target = self._clients.get(client_id)
+        if target is None:
+            return
+        wfile, lock = target
+        try:
+            with lock:
+                wfile.write(_ws_frame(0x1, json.dumps(message).encode("utf-8")))
+                wfile.flush()
+        except OSError:
+            pass
+
+    def _worker(self) -> None:
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            prompt_id, client_id, workflow = job
+            if prompt_id in self.deleted:
+                continue
+            self._interrupted.clear()
+            self._run(prompt_id, client_id, workflow)
+            with self._lock:
+                self.completed.append((prompt_id, time.monotonic()))
+
+    def _run(self, prompt_id: str, client_id: str, workflow: dict) -> None:
+        send = lambda kind, **data: self._send(client_id, {"type": kind, "data": {"prompt_id": prompt_id, **data}})  # noqa: E731
+        send("execution_start")
+        save_node, save = next((key, node) for key, node in workflow.items() if node["class_type"] == "SaveImage")
+        text = next((node["inputs"].get("text") for node in workflow.values() if node["class_type"] == "CLIPTextEncode"), "")
+        for step in range(1, self.steps + 1):
+            if self._interrupted.is_set():
+                send("execution_interrupted")
+                self._history[prompt_id] = {"status": {"status_str": "error", "completed": False}, "outputs": {}}
+                return
+            time.sleep(self.step_delay_s)
+            send("progress", value=step, max=self.steps)
+        if text in self.failing:
+            send("execution_error", exception_message="CUDA out of memory")
+            self._history[prompt_id] = {"status": {"status_str": "error", "completed": False}, "outputs": {}}
+            return
+        with self._lock:
+            self._counter += 1
+            filename = f"{save['inputs']['filename_prefix']}_{self._counter:05d}_.png"
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        (self.output_dir / filename).write_bytes(f"png:{text}".encode("utf-8") * 4096)
+        images = [{"filename": filename, "subfolder": "", "type": "output"}]
+        send("executed", node=save_node, output={"images": images})
+        send("execution_success")
+        send("executing", node=None)
+        self._history[prompt_id] = {
+            "status": {"status_str": "success", "completed": True},
+            "outputs": {save_node: {"images": images}},
+        }
+
+
+class _Harness:
+    def __init__(self, tmp_path: Path, **stub_kwargs) -> None:
+        self.comfy_dir = tmp_path / "comfy"
+        self.stub = _StubComfy(self.comfy_dir / "ComfyUI" / "output", **stub_kwargs)
+        self.starts = 0
+        self.stops = 0
+
+    def start(self) -> None:
+        self.starts += 1
+        self.stub.up = True
+
+    def stop(self) -> None:
+        self.stops += 1
+        self.stub.up = False
+
+    def manager(self, **kwargs) -> ComfyServerManager:
+        kwargs.setdefault("idle_timeout_s", 60.0)
+        kwargs.setdefault("monitor_interval_s", 0.02)
+        kwargs.setdefault("ready_timeout_s", 5.0)
+        return ComfyServerManager(ComfyAPI(self.stub.base_url), start_fn=self.start, stop_fn=self.stop, **kwargs)
+
+    def generator(self, tmp_path: Path, **kwargs) -> ImageGenerator:
+        gen = ImageGenerator(tmp_path / "data", comfy=self.manager(**kwargs))
+        gen.comfy_dir = self.comfy_dir
+        return gen
+
+
+@pytest.fixture
+def harness(tmp_path: Path):
+    created: list[_Harness] = []
+
+    def _factory(**stub_kwargs) -> _Harness:
+        item = _Harness(tmp_path, **stub_kwargs)
+        created.append(item)
+        return item
+
+    yield _factory
+    for item in created:
+        item.stub.close()
+
+
+def _wait_for(predicate, timeout_s: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        if predicate():
+            return
+        time.sleep(0.01)
+    raise AssertionError("condition not reached in time")
+
+
+# ── 1. warm lifecycle ────────────────────────────────────────────────
+
+
+class TestWarmLifecycle:
+    def test_server_stays_warm_across_jobs(self, harness, tmp_path: Path) -> None:
+        h = harness()
+        gen = h.generator(tmp_path)
+
+        first = gen.generate("a red fox")
+        second = gen.generate("a blue jay")
+
+        assert first.startswith("Image saved to: PiperGen_")
+        assert second.startswith("Image saved to: PiperGen_")
+        assert (h.starts, h.stops) == (1, 0)
+        assert h.stub.history_gets == 0
+        assert (gen.workspace / gen.last_image_name).read_bytes().startswith(b"png:a blue jay")
+        gen.shutdown()
+        assert h.stops == 1
+
+    def test_already_running_server_is_reused(self, harness) -> None:
+        h = harness()
+        h.stub.up = True
+        manager = h.manager()
+
+        with manager.lease():
+            pass
+
+        assert h.starts == 0
+        manager.shutdown()
+
+    def test_idle_timeout_stops_the_server(self, harness) -> None:
+        h = harness()
+        manager = h.manager(idle_timeout_s=0.1)
+
+        with manager.lease() as api:
+            api.run_prompts([{"9": {"class_type": "SaveImage", "inputs": {"filename_prefix": "PiperGen"}}}])
+        assert h.stops == 0
+
+        _wait_for(lambda: h.stops == 1)
+        assert not manager.is_ready()
+        with manager.lease():
+            pass
+        assert h.starts == 2
+        manager.shutdown()
+
+    def test_warm_server_that_died_between_jobs_is_restarted(self, harness, tmp_path: Path) -> None:
+        h = harness()
+        gen = h.generator(tmp_path)
+        assert gen.generate("a red fox").startswith("Image saved to: PiperGen_")
+
+        # The process goes away without the manager stopping it.
+        h.stub.up = False
+        second = gen.generate("a blue jay")
+
+        assert second.startswith("Image saved to: PiperGen_")
+        assert (h.starts, h.stops) == (2, 0)
+        assert gen.comfy.restarts == 1
+        assert gen.comfy.is_ready()
+        gen.shutdown()
+
+    def test_cold_mode_stops_after_each_job(self, harness, tmp_path: Path) -> None:
+        h = harness()
+        gen = h.generator(tmp_path, keep_warm=False)
+
+        gen.generate("one")
+        gen.generate("two")
+
+        assert (h.starts, h.stops) == (2, 2)
+
+    def test_server_that_never_starts_is_reported(self, harness, tmp_path: Path) -> None:
+        h = harness()
+        gen = h.generator(tmp_path, ready_timeout_s=0.3)
+        gen.comfy._start_fn = lambda: None
+
+        assert gen.generate("nothing") == "Error: ComfyUI did not start."
+        assert h.stops == 1
+
+
+# ── 2. VRAM pressure ─────────────────────────────────────────────────
+
+
+class TestVramPressure:
+    def test_idle_low_vram_unloads_models_then_stops(self, harness) -> None:
+        h = harness(vram_free=0.5)
+        manager = h.manager(vram_min_free_fraction=0.2)
+        with manager.lease():
+            pass
+        time.sleep(0.1)
+        assert h.stub.frees == [] and h.stops == 0
+
+        h.stub.vram_free = 0.05
+        _wait_for(lambda: h.stub.frees == [{"unload_models": True, "free_memory": True}])
+        _wait_for(lambda: h.stops == 1)
+        assert manager.evictions == 1
+
+    def test_no_eviction_while_a_job_holds_the_server(self, harness) -> None:
+        h = harness(vram_free=0.01)
+        manager = h.manager(vram_min_free_fraction=0.2)
+
+        with manager.lease():
+            time.sleep(0.15)
+            assert h.stub.frees == [] and h.stops == 0
+        manager.shutdown()
+
+
+# ── 3. event stream jobs ─────────────────────────────────────────────
+
+
+class TestEventStreamJobs:
+    def test_batch_is_queued_back_to_back(self, harness, tmp_path: Path) -> None:
+        h = harness(steps=4, step_delay_s=0.02)
+        gen = h.generator(tmp_path)
+
+        replies = gen.generate_batch(["cat", "dog", "owl"])
+
+        assert [reply.startswith("Image saved to: ") for reply in replies] == [True, True, True]
+        saved = [reply.split(": ", 1)[1] for reply in replies]
+        assert [(gen.workspace / name).read_bytes()[:7] for name in saved] == [b"png:cat", b"png:dog", b"png:owl"]
+        first_done = h.stub.completed[0][1]
+        assert all(submitted_at < first_done for _pid, submitted_at in h.stub.submitted)
+        assert h.stub.history_gets == 0
+        gen.shutdown()
+
+    def test_progress_events_are_reported(self, harness) -> None:
+        h = harness(steps=3)
+        manager = h.manager()
+        seen: list[tuple[int, int]] = []
+
+        with manager.lease() as api:
+            results = api.run_prompts(
+                [{"9": {"class_type": "SaveImage", "inputs": {"filename_prefix": "PiperGen"}}}],
+                on_progress=lambda _pid, value, maximum: seen.append((value, maximum)),
+            )
+
+        assert results[0].ok and results[0].images[0]["filename"].startswith("PiperGen_")
+        assert seen == [(1, 3), (2, 3), (3, 3)]
+        manager.shutdown()
+
+    def test_execution_error_fails_only_that_prompt(self, harness, tmp_path: Path) -> None:
+        h = harness()
+        h.stub.failing.add("broken")
+        gen = h.generator(tmp_path)
+
+        replies = gen.generate_batch(["fine", "broken", "also fine"])
+
+        assert replies[0].startswith("Image saved to: ")
+        assert replies[1] == "Error: CUDA out of memory"
+        assert replies[2].startswith("Image saved to: ")
+        gen.shutdown()
+
+    def test_history_polling_fallback_without_websocket(self, harness, tmp_path: Path) -> None:
+        h = harness(websocket=False)
+        gen = h.generator(tmp_path)
+
+        reply = gen.generate("polled")
+
+        assert reply.startswith("Image saved to: ")
+        assert h.stub.history_gets >= 1
+        gen.shutdown()
+
+    def test_cancel_interrupts_and_drops_queued_prompts(self, harness) -> None:
+        h = harness(steps=50, step_delay_s=0.02)
+        manager = h.manager()
+        token = CancellationToken()
+        threading.Timer(0.15, token.cancel).start()
+        workflow = {"9": {"class_type": "SaveImage", "inputs": {"filename_prefix": "PiperGen"}}}
+
+        with pytest.raises(OperationCancelled):
+            with manager.lease(cancel_token=token) as api:
+                api.run_prompts([workflow, workflow], cancel_token=token)
+
+        assert h.stub.interrupts == 1
+        assert len(h.stub.deleted) == 2
+        manager.shutdown()
+
+
+# ── 4. output copy ───────────────────────────────────────────────────
+
+
+class TestOutputCopy:
+    def test_streaming_copy_is_atomic_and_exact(self, tmp_path: Path) -> None:
+        src = tmp_path / "big.png"
+        src.write_bytes(bytes(range(256)) * 20000)
+
+        dest = copy_output_file(src, tmp_path / "out" / "big.png")
+
+        assert dest.read_bytes() == src.read_bytes()
+        assert sorted(p.name for p in dest.parent.iterdir()) == ["big.png"]
+
+    def test_remote_outputs_are_streamed_from_view(self, harness, tmp_path: Path) -> None:
+        h = harness()
+        gen = h.generator(tmp_path)
+        gen.comfy_dir = tmp_path / "elsewhere"
+
+        reply = gen.generate("remote")
+
+        assert reply.startswith("Image saved to: ")
+        assert h.stub.view_gets == 1
+        assert (gen.workspace / gen.last_image_name).read_bytes().startswith(b"png:remote")
+        gen.shutdown()
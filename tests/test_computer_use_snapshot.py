@@ -0,0 +1,231 @@
+"""Guard tests for ComputerUseEngine page snapshots and node lookup.
+
+These tests require no browser binaries, no LLM, and no web calls. Playwright
+pages are replaced by a fake that emulates the injected snapshot script.
+"""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import core.engines.computer_use_engine as computer_use_module
+from core.engines.computer_use_engine import ComputerUseEngine, _Node
+
+
+FIXTURE_ROOT = Path(__file__).resolve().parents[1] / "scripts" / "fixtures" / "computer_use"
+
+
+# ── helpers ──────────────────────────────────────────────────────────
+
+
+class _FakePage:
+    """Answers the snapshot script like a page whose DOM version is `version`."""
+
+    def __init__(self) -> None:
+        self.url = "http://127.0.0.1:8000/index.html"
+        self.version = 0
+        self.evaluate_calls = 0
+        self.full_scans = 0
+        self.title_calls = 0
+        self.candidates: list[dict[str, str]] = [
+            {"tag": "h1", "id": "headline", "text": "Fixture Home"},
+            {"tag": "a", "id": "next-link", "href": "next.html", "text": "Continue"},
+            {"tag": "a", "href": "downloads/report.txt", "download": "report.txt", "text": "Download report"},
+        ]
+
+    def evaluate(self, script: str, args: dict[str, Any]) -> dict[str, Any]:
+        self.evaluate_calls += 1
+        key = f"doc:{self.version}:{self.url}"
+        if args.get("known_key") == key:
+            return {"unchanged": True, "key": key}
+        self.full_scans += 1
+        return {
+            "unchanged": False,
+            "key": key,
+            "title": f"Fixture v{self.version}",
+            "body_text": f"Body text version {self.version}",
+            "text_blocks": [
+                {"tag": "h1", "selector": "#headline", "text": "Fixture Home heading"},
+                {"tag": "p", "selector": "p", "text": "short"},
+            ],
+            "candidates": list(self.candidates),
+        }
+
+    def title(self) -> str:
+        self.title_calls += 1
+        return "fallback"
+
+
+def _playwright_engine(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> tuple[ComputerUseEngine, _FakePage]:
+    monkeypatch.setattr(computer_use_module, "sync_playwright", object())
+    engine = ComputerUseEngine(data_dir=tmp_path / "data", workspace=tmp_path / "workspace")
+    page = _FakePage()
+    engine._page = page
+    engine._playwright_owner_thread = threading.current_thread()
+    engine._session.backend = "playwright"
+    return engine, page
+
+
+def _local_engine(tmp_path: Path) -> ComputerUseEngine:
+    engine = ComputerUseEngine(data_dir=tmp_path / "data", workspace=tmp_path / "workspace")
+    engine._load_local_page((FIXTURE_ROOT / "index.html").resolve().as_uri())
+    return engine
+
+
+# ── 1. single-roundtrip snapshot ─────────────────────────────────────
+
+
+class TestPlaywrightSnapshot:
+    def test_state_capture_uses_one_evaluate(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        engine, page = _playwright_engine(tmp_path, monkeypatch)
+        state = engine._capture_playwright_state()
+
+        assert page.evaluate_calls == 1
+        assert page.title_calls == 0
+        assert state["title"] == "Fixture v0"
+        assert state["current_url"] == page.url
+        assert state["text_preview"] == "Body text version 0"
+        assert [item["selector"] for item in state["element_inventory"]] == [
+            "#headline",
+            "#next-link",
+            "a[href='downloads/report.txt']",
+        ]
+
+    def test_unchanged_dom_reuses_cached_parse(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        engine, page = _playwright_engine(tmp_path, monkeypatch)
+        engine._capture_playwright_state()
+        engine._capture_playwright_text_blocks()
+        engine._capture_playwright_download_candidates()
+        engine._capture_playwright_state()
+
+        assert page.evaluate_calls == 4
+        assert page.full_scans == 1
+        assert engine.snapshot_stats == {"captured": 1, "reused": 3}
+
+    def test_dom_mutation_triggers_rescan(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        engine, page = _playwright_engine(tmp_path, monkeypatch)
+        engine._capture_playwright_state()
+        page.version += 1
+        state = engine._capture_playwright_state()
+
+        assert page.full_scans == 2
+        assert state["title"] == "Fixture v1"
+
+    def test_reset_session_drops_cached_snapshot(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        engine, page = _playwright_engine(tmp_path, monkeypatch)
+        engine._capture_playwright_state()
+        engine._reset_playwright_session()
+
+        assert engine._snapshot is None
+
+    def test_text_blocks_filter_short_entries(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        engine, _page = _playwright_engine(tmp_path, monkeypatch)
+        blocks = engine._capture_playwright_text_blocks()
+
+        assert blocks == [{"tag": "h1", "selector": "#headline", "text": "Fixture Home heading"}]
+
+    def test_candidate_limit_applies_to_raw_scan_order(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        engine, _page = _playwright_engine(tmp_path, monkeypatch)
+        limited = engine._capture_playwright_interaction_candidates(limit=2)
+
+        assert [item["tag"] for item in limited] == ["h1", "a"]
+        assert limited[1]["id"] == "next-link"
+
+    def test_failed_evaluate_falls_back_to_title(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        engine, page = _playwright_engine(tmp_path, monkeypatch)
+        monkeypatch.setattr(page, "evaluate", lambda script, args: None)
+        state = engine._capture_playwright_state()
+
+        assert state["title"] == "fallback"
+        assert state["element_inventory"] == []
+        assert engine._snapshot is None
+
+
+# ── 2. indexed node lookup ───────────────────────────────────────────
+
+
+class TestNodeIndexLookup:
+    @pytest.mark.parametrize(
+        ("selector", "text", "expected_id", "expected_strategy"),
+        [
+            ("#status", "", "status", "id"),
+            ("[data-testid='status']", "", "status", "data-testid"),
+            ("[name='email']", "", "email", "name"),
+            ("h1", "", "headline", "tag"),
+            ("a:has-text('download')", "", "download-link", "has_text"),
+            ("Continue", "", "next-link", "text"),
+        ],
+    )
+    def test_selector_forms_resolve(
+        self,
+        tmp_path: Path,
+        selector: str,
+        text: str,
+        expected_id: str,
+        expected_strategy: str,
+    ) -> None:
+        engine = _local_engine(tmp_path)
+        node, strategy = engine._find_node(selector=selector, text=text)
+
+        assert node is not None
+        assert node.attrs.get("id") == expected_id
+        assert strategy == expected_strategy
+
+    @pytest.mark.parametrize(
+        ("selector", "text"),
+        [
+            ("text=continue", ""),
+            ("", "download report"),
+            ("p:has-text('piper')", ""),
+            ("Hello from Piper fixture", ""),
+            ("input", ""),
+        ],
+    )
+    def test_matches_reference_linear_scan(self, tmp_path: Path, selector: str, text: str) -> None:
+        engine = _local_engine(tmp_path)
+        nodes = engine._session.nodes
+        node, _strategy = engine._find_node(selector=selector, text=text)
+
+        needle = (text or selector.split("=", 1)[-1]).lower()
+        if ":has-text(" in selector:
+            tag, _, rest = selector.partition(":has-text(")
+            needle = rest.strip("')").lower()
+            expected = next(n for n in nodes if n.tag == tag and needle in engine._node_match_haystack(n))
+        elif selector and not selector.startswith("text=") and " " in selector:
+            expected = next(n for n in nodes if n.text == selector)
+        elif selector and not selector.startswith("text="):
+            expected = next(n for n in nodes if n.tag == selector)
+        else:
+            expected = next(n for n in nodes if needle in engine._node_match_haystack(n))
+        assert node is expected
+
+    def test_missing_target_returns_none(self, tmp_path: Path) -> None:
+        engine = _local_engine(tmp_path)
+        assert engine._find_node(selector="#nope", text="") == (None, "")
+
+    def test_index_is_reused_until_nodes_change(self, tmp_path: Path) -> None:
+        engine = _local_engine(tmp_path)
+        engine._find_node(selector="#status")
+        index = engine._session.node_index
+        engine._find_node(selector="#email")
+        assert engine._session.node_index is index
+
+        engine._session.nodes = [_Node(tag="p", attrs={"id": "status"}, text_parts=["replaced"])]
+        node, _strategy = engine._find_node(selector="#status")
+        assert node is engine._session.nodes[0]
+        assert engine._session.node_index is not index
+
+    def test_first_document_order_match_wins(self, tmp_path: Path) -> None:
+        engine = _local_engine(tmp_path)
+        engine._session.nodes = [
+            _Node(tag="a", attrs={"name": "dup"}, text_parts=["first"]),
+            _Node(tag="a", attrs={"name": "dup"}, text_parts=["second"]),
+        ]
+        node, strategy = engine._find_node(selector="[name='dup']")
+
+        assert node is engine._session.nodes[0]
+        assert strategy == "name"
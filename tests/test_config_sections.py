@@ -0,0 +1,164 @@
+"""Guard tests for lazily resolved config sections.
+
+These tests require no llama.cpp install, no models and no ComfyUI. Import cost
+is checked in a fresh interpreter that records filesystem calls; section
+behaviour is checked against the live ``CFG`` with memoized values dropped
+before and after each test.
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import config
+from config import CFG, CONFIG_SECTIONS, Config, LiveConfig, invalidate_config_sections
+
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+
+_PROBE_SCRIPT = """
+import io, json, os, sys
+calls = []
+
+def _wrap(owner, attr):
+    original = getattr(owner, attr)
+
+    def _recorder(*args, **kwargs):
+        calls.append(str(args[0]) if args else "")
+        return original(*args, **kwargs)
+
+    setattr(owner, attr, _recorder)
+
+for attr in ("stat", "lstat", "listdir", "scandir"):
+    _wrap(os, attr)
+_wrap(io, "open")
+sys.path.insert(0, sys.argv[1])
+import config
+before = list(calls)
+config.CFG.MODEL_PATH
+print(json.dumps({"import": before, "after_access": calls[len(before):], "file": config.__file__}))
+"""
+
+
+# ── helpers ──────────────────────────────────────────────────────────
+
+
+@pytest.fixture(autouse=True)
+def _fresh_sections():
+    invalidate_config_sections()
+    yield
+    invalidate_config_sections()
+
+
+def _run_probe() -> dict:
+    completed = subprocess.run(
+        [sys.executable, "-c", _PROBE_SCRIPT, str(ROOT_DIR)],
+        capture_output=True,
+        text=True,
+        timeout=60,
+        cwd=str(ROOT_DIR),
+    )
+    assert completed.returncode == 0, completed.stderr
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+# ── 1. import cost ───────────────────────────────────────────────────
+
+
+class TestImportCost:
+    def test_importing_config_does_not_probe_the_filesystem(self) -> None:
+        report = _run_probe()
+        config_file = Path(report["file"])
+        # Resolving config.py's own location (ROOT_DIR) is the only allowed touch.
+        allowed = {str(config_file), *(str(parent) for parent in config_file.parents)}
+
+        assert [path for path in report["import"] if path not in allowed] == []
+        assert report["after_access"], "model discovery should run on first access"
+
+    def test_every_lazy_setting_belongs_to_a_registered_section(self) -> None:
+        assert set(CONFIG_SECTIONS) == {"paths", "models", "llm_server", "audio"}
+        assert set(config._SECTION_KEYS.values()) == set(CONFIG_SECTIONS)
+        for name, section in config._SECTION_KEYS.items():
+            assert name in CONFIG_SECTIONS[section].values()
+
+
+# ── 2. memoization and invalidation ──────────────────────────────────
+
+
+class TestSections:
+    def test_section_resolves_once_and_together(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        calls: list[str] = []
+        original = config._resolve_llama_server_exe
+
+        def _counting() -> Path:
+            calls.append("exe")
+            return original()
+
+        monkeypatch.setattr(config, "_resolve_llama_server_exe", _counting)
+
+        CFG.LLAMA_SERVER_EXE
+        CFG.LLAMA_SERVER_URL
+        CFG.LLAMA_SERVER_BIND_HOST
+
+        assert calls == ["exe"]
+        assert CONFIG_SECTIONS["llm_server"].resolved
+        assert not CONFIG_SECTIONS["models"].resolved
+
+    def test_invalidation_picks_up_environment_changes(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("PIPER_LLAMA_SERVER_URL", "http://10.1.2.3:8080")
+        assert CFG.LLAMA_SERVER_URL == "http://10.1.2.3:8080"
+
+        monkeypatch.setenv("PIPER_LLAMA_SERVER_URL", "http://10.1.2.4:9090")
+        assert CFG.LLAMA_SERVER_URL == "http://10.1.2.3:8080"
+        changed = CFG.invalidate("llm_server")
+
+        assert set(changed) == {"LLAMA_SERVER_EXE", "LLAMA_SERVER_BIND_HOST", "LLAMA_SERVER_URL"}
+        assert CFG.LLAMA_SERVER_URL == "http://10.1.2.4:9090"
+
+    def test_invalidation_notifies_listeners_of_resolved_settings_only(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        live = LiveConfig(Config())
+        seen: list[list[str]] = []
+        live.on_change(seen.append)
+        monkeypatch.setenv("PIPER_LLM_REASONING_BUDGET", "7")
+
+        assert live.invalidate("models") == []
+        assert live.LLAMA_SERVER_REASONING_BUDGET == 7
+        live.invalidate()
+
+        assert seen == [["MODEL_PATH", "MMPROJ_PATH", "LLAMA_SERVER_REASONING_BUDGET"]]
+
+    def test_unknown_section_is_rejected(self) -> None:
+        with pytest.raises(KeyError, match="search"):
+            invalidate_config_sections("search")
+
+
+# ── 3. backward compatibility ────────────────────────────────────────
+
+
+class TestCompatibility:
+    def test_frozen_config_and_class_access_still_resolve(self) -> None:
+        assert Config().KOKORO_DIR == CFG.KOKORO_DIR
+        assert Config.COMFY_DIR == CFG.COMFY_DIR
+        assert CFG.COMFY_OUTPUT_DIR == CFG.COMFY_DIR / "ComfyUI" / "output"
+        assert CFG.MMPROJ_PATH is None or isinstance(CFG.MMPROJ_PATH, Path)
+
+    def test_overrides_win_over_lazy_values_and_survive_invalidation(self, tmp_path: Path) -> None:
+        live = LiveConfig(Config())
+        override = tmp_path / "other.gguf"
+
+        assert live.update({"MODEL_PATH": str(override)}) == ["MODEL_PATH"]
+        live.invalidate("models")
+        assert live.MODEL_PATH == override
+
+        assert "MODEL_PATH" in live._revert_overrides()
+        assert live.MODEL_PATH == Config.MODEL_PATH
+
+    def test_monkeypatching_a_lazy_setting_still_works(self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+        monkeypatch.setattr(CFG, "KOKORO_DIR", tmp_path)
+
+        assert CFG.KOKORO_DIR == tmp_path
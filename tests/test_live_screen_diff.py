@@ -0,0 +1,291 @@
+"""Guard tests for change-aware live screen capture.
+
+These tests require no PowerShell, no Pillow and no model. Synthetic frame
+sequences are fed through an injected capture function that writes BMP files,
+and an injected frame reader decodes them back with numpy.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import tools.screen_diff as screen_diff
+from tools.live_screen import LiveScreenSession
+from tools.screen_diff import FrameSignature, compare_signatures, read_signature, signature_from_pixels
+
+
+# ── helpers ──────────────────────────────────────────────────────────
+
+
+def _desktop(width: int = 320, height: int = 180) -> np.ndarray:
+    frame = np.full((height, width, 3), 230, dtype=np.uint8)
+    frame[:12] = (40, 44, 52)
+    frame[40:140, 30:150] = (70, 120, 200)
+    return frame
+
+
+def _with_window(frame: np.ndarray, box: tuple[int, int, int, int], color=(200, 60, 60)) -> np.ndarray:
+    left, top, right, bottom = box
+    edited = frame.copy()
+    edited[top:bottom, left:right] = color
+    return edited
+
+
+def _write_bmp(path: Path, pixels: np.ndarray) -> None:
+    height, width = pixels.shape[:2]
+    row_pad = (-width * 3) % 4
+    body = b"".join(row.tobytes() + b"\x00" * row_pad for row in np.ascontiguousarray(pixels[::-1, :, ::-1]))
+    header = b"BM" + struct.pack("<I", 54 + len(body)) + b"\x00" * 4 + struct.pack("<I", 54)
+    info = struct.pack("<IiiHH", 40, width, height, 1, 24) + b"\x00" * 24
+    path.write_bytes(header + info + body)
+
+
+def _bmp_signature(path: Path) -> FrameSignature:
+    """Frame reader for the 24-bit bottom-up BMPs written by ``_write_bmp``."""
+    data = Path(path).read_bytes()
+    width, height = struct.unpack("<ii", data[18:26])
+    stride = (width * 3 + 3) & ~3
+    rows = np.frombuffer(data, dtype=np.uint8, count=stride * height, offset=54).reshape(height, stride)
+    pixels = rows[::-1, : width * 3].reshape(height, width, 3)[:, :, ::-1]
+    return signature_from_pixels(pixels, digest=hashlib.blake2b(data, digest_size=16).hexdigest())
+
+
+class _FrameFeed:
+    """Injectable capture function that plays back a fixed frame sequence."""
+
+    def __init__(self, frames: list[np.ndarray]) -> None:
+        self.frames = list(frames)
+        self.calls = 0
+        self.paths: list[Path] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, output_path: Path, *, mode: str) -> Path:
+        with self._lock:
+            frame = self.frames[min(self.calls, len(self.frames) - 1)]
+            self.calls += 1
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        _write_bmp(output_path, frame)
+        self.paths.append(output_path)
+        return output_path
+
+
+def _session(tmp_path: Path, feed: _FrameFeed, **kwargs) -> LiveScreenSession:
+    kwargs.setdefault("frame_reader", _bmp_signature)
+    return LiveScreenSession(tmp_path, capture_fn=feed, filename="live_screen.bmp", **kwargs)
+
+
+@pytest.fixture
+def without_pillow(monkeypatch: pytest.MonkeyPatch) -> None:
+    # A None entry makes `import PIL` raise ImportError.
+    monkeypatch.setitem(sys.modules, "PIL", None)
+    monkeypatch.setattr(screen_diff, "_DIGEST_ONLY_WARNED", False)
+
+
+# ── 1. frame comparison ──────────────────────────────────────────────
+
+
+class TestCompareSignatures:
+    def test_identical_frames_are_not_changes(self) -> None:
+        first = signature_from_pixels(_desktop())
+        second = signature_from_pixels(_desktop())
+
+        change = compare_signatures(first, second)
+
+        assert change.identical and not change.changed
+        assert change.bbox is None
+
+    def test_first_frame_is_a_full_frame_change(self) -> None:
+        change = compare_signatures(None, signature_from_pixels(_desktop()))
+
+        assert change.changed
+        assert change.bbox == (0, 0, 320, 180)
+
+    def test_changed_region_box_covers_the_edit(self) -> None:
+        box = (200, 100, 260, 150)
+        change = compare_signatures(
+            signature_from_pixels(_desktop()),
+            signature_from_pixels(_with_window(_desktop(), box)),
+        )
+
+        left, top, right, bottom = change.bbox
+        assert change.changed and not change.identical
+        assert left <= box[0] and top <= box[1] and right >= box[2] and bottom >= box[3]
+        assert (right - left) * (bottom - top) < 0.25 * 320 * 180
+        assert 0.0 < change.changed_fraction < 0.2
+
+    def test_small_edit_below_threshold_is_suppressed(self) -> None:
+        previous = signature_from_pixels(_desktop())
+        current = signature_from_pixels(_with_window(_desktop(), (300, 160, 306, 166)))
+
+        assert not compare_signatures(previous, current, threshold=0.05).changed
+        assert compare_signatures(previous, current, threshold=0.0001).changed
+
+    def test_faint_noise_does_not_count(self) -> None:
+        rng = np.random.default_rng(3)
+        noisy = np.clip(_desktop().astype(np.int16) + rng.integers(-2, 3, size=(180, 320, 3)), 0, 255).astype(np.uint8)
+
+        change = compare_signatures(signature_from_pixels(_desktop()), signature_from_pixels(noisy))
+
+        assert not change.identical and not change.changed
+
+    def test_undecodable_frames_fall_back_to_the_byte_digest(self, tmp_path: Path) -> None:
+        frame = tmp_path / "frame.jpg"
+        frame.write_bytes(b"\xff\xd8 not really a jpeg")
+        same = read_signature(frame)
+
+        assert not same.has_pixels
+        assert compare_signatures(same, read_signature(frame)).identical
+        frame.write_bytes(b"\xff\xd8 another frame")
+        assert compare_signatures(same, read_signature(frame)).changed
+        assert isinstance(same, FrameSignature)
+
+
+# ── 2. session deduplication ─────────────────────────────────────────
+
+
+class TestSessionDeduplication:
+    def test_identical_frames_are_not_republished(self, tmp_path: Path) -> None:
+        base = _desktop()
+        edited = _with_window(base, (200, 100, 260, 150))
+        feed = _FrameFeed([base, base, base, edited, edited])
+        session = _session(tmp_path, feed)
+        published: list[Path] = []
+        session.start(on_capture=published.append)
+        session.stop()
+        first_mtime = session.image_path.stat().st_mtime_ns
+
+        session.capture_once()
+        session.capture_once()
+        assert session.image_path.stat().st_mtime_ns == first_mtime
+        session.capture_once()
+        session.capture_once()
+
+        assert feed.calls == 5
+        assert published == [session.image_path, session.image_path]
+        state = session.state()
+        assert state.suppressed_frames == 3
+        assert state.last_change_ts > 0.0
+        assert np.array_equal(_bmp_signature(session.image_path).grid, signature_from_pixels(edited).grid)
+        assert sorted(p.name for p in session.image_path.parent.iterdir()) == ["live_screen.bmp"]
+
+    def test_suppressed_frames_keep_the_live_frame_fresh(self, tmp_path: Path) -> None:
+        feed = _FrameFeed([_desktop()])
+        session = _session(tmp_path, feed, max_stale_s=60.0)
+        session.start()
+        session.stop()
+        session._enabled = True
+        before = session.state().last_capture_ts
+
+        time.sleep(0.01)
+        session.capture_once()
+
+        assert session.state().last_capture_ts > before
+        assert session.current_image_path(require_fresh=True) == session.image_path
+
+    def test_drift_accumulates_against_the_published_frame(self, tmp_path: Path) -> None:
+        base = _desktop()
+        # Each step moves ~20 grid cells (under 1%), the pair moves ~40.
+        steps = [_with_window(base, (200, 100, 200 + width, 110)) for width in (50, 100)]
+        feed = _FrameFeed([base, *steps])
+        session = _session(tmp_path, feed)
+        published: list[Path] = []
+        session.start(on_capture=published.append)
+        session.stop()
+        session._change_threshold = 0.01
+
+        for _ in steps:
+            session.capture_once()
+
+        assert len(published) == 2
+        assert session.state().suppressed_frames == 1
+
+
+# ── 3. adaptive interval ─────────────────────────────────────────────
+
+
+class TestAdaptiveInterval:
+    def test_interval_tightens_on_change_and_backs_off_when_idle(self, tmp_path: Path) -> None:
+        base = _desktop()
+        feed = _FrameFeed([base, base, base, base, base, base, _with_window(base, (10, 20, 90, 80))])
+        session = _session(tmp_path, feed, interval_s=10.0, max_stale_s=40.0)
+        session.start()
+        session.stop()
+        assert session.next_interval_s() == 5.0
+
+        idle = []
+        for _ in range(5):
+            session.capture_once()
+            idle.append(session.next_interval_s())
+        assert idle == [7.5, 11.25, 16.875, 20.0, 20.0]
+
+        session.capture_once()
+        assert session.next_interval_s() == 5.0
+
+    def test_fixed_interval_when_adaptation_is_off(self, tmp_path: Path) -> None:
+        feed = _FrameFeed([_desktop()])
+        session = _session(tmp_path, feed, interval_s=4.0)
+        session._adaptive = False
+        session.start()
+        session.stop()
+        session.capture_once()
+
+        assert session.next_interval_s() == 4.0
+
+    def test_loop_only_notifies_on_changes(self, tmp_path: Path) -> None:
+        base = _desktop()
+        edited = _with_window(base, (200, 100, 260, 150))
+        feed = _FrameFeed([base, base, edited, edited, edited, edited])
+        session = _session(tmp_path, feed, interval_s=0.02)
+        published: list[Path] = []
+        session.start(on_capture=published.append)
+
+        deadline = time.monotonic() + 5.0
+        while feed.calls < 6 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        session.stop()
+
+        assert feed.calls >= 6
+        assert len(published) == 2
+
+
+# ── 4. digest-only fallback ──────────────────────────────────────────
+
+
+class TestDigestOnlyFallback:
+    def test_fallback_is_logged_once(self, tmp_path: Path, without_pillow, caplog: pytest.LogCaptureFixture) -> None:
+        frame = tmp_path / "frame.bmp"
+        _write_bmp(frame, _desktop())
+
+        with caplog.at_level("WARNING", logger="tools.screen_diff"):
+            read_signature(frame)
+            read_signature(frame)
+
+        warnings = [record.getMessage() for record in caplog.records]
+        assert len(warnings) == 1
+        assert "Pillow is not installed" in warnings[0] and "byte digest only" in warnings[0]
+
+    def test_session_suppresses_only_byte_identical_frames(self, tmp_path: Path, without_pillow) -> None:
+        base = _desktop()
+        faint = np.clip(base.astype(np.int16) + 1, 0, 255).astype(np.uint8)
+        feed = _FrameFeed([base, base, faint])
+        session = _session(tmp_path, feed, frame_reader=read_signature)
+        published: list[Path] = []
+        session.start(on_capture=published.append)
+        session.stop()
+
+        session.capture_once()
+        session.capture_once()
+
+        # A one-level brightness shift would be ignored with pixels; by digest it is a full-frame change.
+        assert len(published) == 2
+        state = session.state()
+        assert state.suppressed_frames == 1
+        assert state.change_bbox is None
@@ -0,0 +1,185 @@
+"""Tests for the persistent response cache behind deterministic LLM roles.
+
+These tests require no model and no llama-server. A counting fake backend
+replaces the SSE request, so every cache miss shows up as one backend call.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Tuple
+
+import pytest
+
+from llm import response_cache as response_cache_module
+from llm.llm_server_client import LlamaServerClient, LlamaServerConfig, llm_role
+from llm.response_cache import LLMResponseCache, model_identity, response_cache_from_config
+
+
+# ── helpers ──────────────────────────────────────────────────────────
+
+
+class _CountingClient(LlamaServerClient):
+    """Answers every request locally and records the payload fields it saw."""
+
+    def __init__(self, cfg: LlamaServerConfig, *, cache: LLMResponseCache | None, reply: str = "fresh answer") -> None:
+        super().__init__(cfg, response_cache=cache)
+        self.reply = reply
+        self.calls: List[Dict[str, Any]] = []
+
+    def _stream_deltas(
+        self, messages, *, temperature=None, max_tokens=None, cancel_token=None, extra_payload=None
+    ) -> Iterator[Tuple[str, str]]:
+        self.calls.append({"messages": messages, "temperature": temperature, "max_tokens": max_tokens})
+        if self.reply:
+            yield "content", f"{self.reply} #{len(self.calls)}"
+
+
+def _cache(tmp_path: Path, **kwargs: Any) -> LLMResponseCache:
+    kwargs.setdefault("ttl_s", 3600.0)
+    return LLMResponseCache(tmp_path / "llm_responses", **kwargs)
+
+
+def _client(cache: LLMResponseCache | None, *, model_key: str = "qwen|weights-a", **kwargs: Any) -> _CountingClient:
+    return _CountingClient(LlamaServerConfig(base_url="http://stub", model="qwen", model_key=model_key), cache=cache, **kwargs)
+
+
+def _ask(client: LlamaServerClient, prompt: str = "Extract facts from: I moved to Izmir.", **kwargs: Any) -> str:
+    kwargs.setdefault("temperature", 0.0)
+    with llm_role(kwargs.pop("role", "world_model")):
+        return client.generate([{"role": "user", "content": prompt}], **kwargs)
+
+
+# ── 1. hits and misses ───────────────────────────────────────────────
+
+
+class TestHitsAndMisses:
+    def test_repeated_deterministic_call_is_served_from_cache(self, tmp_path: Path) -> None:
+        cache = _cache(tmp_path)
+        client = _client(cache)
+
+        first = _ask(client)
+        second = _ask(client)
+
+        assert first == second == "fresh answer #1"
+        assert len(client.calls) == 1
+        assert cache.snapshot()["hits"] == 1
+        assert cache.snapshot()["stores"] == 1
+
+    def test_prompt_and_sampler_changes_miss(self, tmp_path: Path) -> None:
+        client = _client(_cache(tmp_path))
+
+        _ask(client)
+        _ask(client, prompt="Extract facts from: I moved to Ankara.")
+        _ask(client, max_tokens=64)
+        _ask(client, max_tokens=64)
+
+        assert len(client.calls) == 3
+
+    def test_cache_survives_a_restart_with_the_same_weights(self, tmp_path: Path) -> None:
+        _ask(_client(_cache(tmp_path)))
+        restarted = _client(_cache(tmp_path))
+
+        assert _ask(restarted) == "fresh answer #1"
+        assert restarted.calls == []
+
+
+# ── 2. opt-in rules ──────────────────────────────────────────────────
+
+
+class TestOptIn:
+    def test_nonzero_temperature_always_reaches_the_backend(self, tmp_path: Path) -> None:
+        client = _client(_cache(tmp_path))
+
+        _ask(client, temperature=0.1)
+        _ask(client, temperature=0.1)
+
+        assert len(client.calls) == 2
+
+    def test_roles_outside_the_opt_in_list_are_not_cached(self, tmp_path: Path) -> None:
+        client = _client(_cache(tmp_path, roles=("summarizer",)))
+
+        _ask(client, role="router")
+        _ask(client, role="router")
+        _ask(client, role="summarizer")
+        _ask(client, role="summarizer")
+
+        assert len(client.calls) == 3
+
+    def test_empty_answers_are_not_stored(self, tmp_path: Path) -> None:
+        cache = _cache(tmp_path)
+        client = _client(cache, reply="")
+
+        assert _ask(client) == ""
+        assert _ask(client) == ""
+        assert cache.snapshot()["stores"] == 0
+
+    def test_config_disables_the_cache_or_narrows_its_roles(self, tmp_path: Path) -> None:
+        cfg = SimpleNamespace(
+            DATA_DIR=tmp_path,
+            LLM_RESPONSE_CACHE_ENABLED=True,
+            LLM_RESPONSE_CACHE_ROLES=" Summarizer , ",
+            LLM_RESPONSE_CACHE_TTL_S=60,
+            LLM_RESPONSE_CACHE_MAX_ENTRIES=10,
+        )
+        cache = response_cache_from_config(cfg)
+
+        assert cache is not None and cache.roles == frozenset({"summarizer"})
+        assert cache.root == tmp_path / "cache" / "llm_responses"
+        cfg.LLM_RESPONSE_CACHE_ENABLED = False
+        assert response_cache_from_config(cfg) is None
+
+
+# ── 3. invalidation and bounds ───────────────────────────────────────
+
+
+class TestInvalidation:
+    def test_model_change_misses_and_purges_the_old_model(self, tmp_path: Path) -> None:
+        cache = _cache(tmp_path)
+        client = _client(cache)
+        _ask(client)
+
+        client.reconnect(LlamaServerConfig(base_url="http://stub", model="qwen", model_key="qwen|weights-b"))
+        answer = _ask(client)
+
+        assert answer == "fresh answer #2"
+        assert len(client.calls) == 2
+        assert cache.snapshot()["purged"] == 1
+        assert len(list(cache.root.iterdir())) == 1
+
+    def test_swapped_weights_change_the_model_identity(self, tmp_path: Path) -> None:
+        weights = tmp_path / "model.gguf"
+        weights.write_bytes(b"a" * 16)
+        before = model_identity("qwen", weights)
+        weights.write_bytes(b"b" * 32)
+
+        assert model_identity("qwen", weights) != before
+        assert model_identity("qwen") == "qwen|"
+
+    def test_expired_entries_are_refetched(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        cache = _cache(tmp_path, ttl_s=60.0)
+        client = _client(cache)
+        _ask(client)
+
+        real_time = response_cache_module.time.time
+        monkeypatch.setattr(response_cache_module.time, "time", lambda: real_time() + 120.0)
+        _ask(client)
+
+        assert len(client.calls) == 2
+        assert cache.snapshot()["expired"] == 1
+
+    def test_prune_keeps_the_newest_entries(self, tmp_path: Path) -> None:
+        cache = _cache(tmp_path, max_entries=3)
+        for index in range(5):
+            cache.put("qwen|a", f"key{index}", f"answer {index}")
+            path = next(cache.root.glob(f"*/key{index}.json"))
+            os.utime(path, (1_700_000_000 + index, 1_700_000_000 + index))
+        # Entries look old on disk; keep them inside the TTL for this check.
+        cache.ttl_s = 1e12
+
+        assert cache.prune() == 2
+        assert sorted(item.stem for item in cache.root.glob("*/*.json")) == ["key2", "key3", "key4"]
+        assert json.loads(next(cache.root.glob("*/key4.json")).read_text(encoding="utf-8"))["text"] == "answer 4"
@@ -0,0 +1,244 @@
+"""Guard tests for client-side per-role thinking budgets on llama-server streams.
+
+These tests require no model and no llama-server. A threaded fake SSE server
+emits long thinking blocks (inline ``<think>`` content or ``reasoning_content``
+deltas) token by token and records every request payload it receives.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from core.stream_filter import stream_thinking_filter
+from llm.llm_server_client import LlamaServerClient, LlamaServerConfig, _InlineThinkTracker, llm_role
+
+
+_THINK_TOKENS = 3000
+_ANSWER = ["The ", "answer ", "is ", "42."]
+
+
+# ── helpers ──────────────────────────────────────────────────────────
+
+
+class _FakeLlamaServer:
+    """Streams a scripted reply; thinking is skipped when the request disables it."""
+
+    def __init__(self, *, split_reasoning: bool = False, token_delay_s: float = 0.0005) -> None:
+        self.split_reasoning = split_reasoning
+        self.token_delay_s = token_delay_s
+        self.payloads: list[dict] = []
+        self.think_sent: list[int] = []
+        self.completed: list[bool] = []
+        self._lock = threading.Lock()
+        server = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def log_message(self, *_args) -> None:
+                pass
+
+            def do_POST(self) -> None:  # noqa: N802
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length).decode("utf-8"))
+                with server._lock:
+                    server.payloads.append(payload)
+                    index = len(server.payloads) - 1
+                    server.think_sent.append(0)
+                    server.completed.append(False)
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.end_headers()
+                try:
+                    server._stream(self.wfile, payload, index)
+                except (BrokenPipeError, ConnectionResetError):
+                    return
+                with server._lock:
+                    server.completed[index] = True
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self._httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _send(self, wfile, delta: dict) -> None:
+        chunk = {"choices": [{"index": 0, "finish_reason": None, "delta": delta}]}
+        wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+        wfile.flush()
+
+    def _stream(self, wfile, payload: dict, index: int) -> None:
+        thinking_disabled = (payload.get("chat_template_kwargs") or {}).get("enable_thinking") is False
+        messages = payload.get("messages") or []
+        prefilled = bool(messages) and messages[-1].get("role") == "assistant"
+        if thinking_disabled:
+            # Reasoning-off chat templates still open with an empty think block.
+            self._send(wfile, {"content": "<think>\n\n</think>\n\n"})
+        elif not prefilled:
+            if not self.split_reasoning:
+                self._send(wfile, {"content": "<think>\n"})
+            for step in range(_THINK_TOKENS):
+                key = "reasoning_content" if self.split_reasoning else "content"
+                self._send(wfile, {key: f"step{step} "})
+                with self._lock:
+                    self.think_sent[index] += 1
+                if self.token_delay_s:
+                    time.sleep(self.token_delay_s)
+            if not self.split_reasoning:
+                self._send(wfile, {"content": "</think>\n\n"})
+        for token in _ANSWER:
+            self._send(wfile, {"content": token})
+        wfile.write(b"data: [DONE]\n\n")
+        wfile.flush()
+
+
+@pytest.fixture
+def make_server():
+    servers: list[_FakeLlamaServer] = []
+
+    def _factory(**kwargs) -> _FakeLlamaServer:
+        server = _FakeLlamaServer(**kwargs)
+        servers.append(server)
+        return server
+
+    yield _factory
+    for server in servers:
+        server.close()
+
+
+def _client(server: _FakeLlamaServer, **cfg) -> LlamaServerClient:
+    return LlamaServerClient(LlamaServerConfig(base_url=server.base_url, timeout_s=10.0, stream_read_timeout_s=10.0, **cfg))
+
+
+def _ask(client: LlamaServerClient, **kwargs) -> list[str]:
+    return list(client.generate_stream([{"role": "user", "content": "What is the answer?"}], **kwargs))
+
+
+def _wait_for(predicate, timeout_s: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        if predicate():
+            return
+        time.sleep(0.005)
+    raise AssertionError("condition not reached in time")
+
+
+# ── 1. budget enforcement ────────────────────────────────────────────
+
+
+class TestThinkingBudget:
+    def test_inline_think_over_budget_is_cut_and_rebuilt_without_reasoning(self, make_server) -> None:
+        server = make_server()
+        client = _client(server, thinking_budgets={"router": 64})
+
+        raw = _ask(client, role="router")
+
+        assert "".join(stream_thinking_filter(raw)) == "The answer is 42."
+        assert raw.count("</think>") == 1
+        assert len(server.payloads) == 2
+        retry = server.payloads[1]
+        assert retry["chat_template_kwargs"] == {"enable_thinking": False}
+        assert retry["messages"][-1]["content"].endswith("/no_think")
+        _wait_for(lambda: len(server.completed) == 2 and server.completed[1])
+        assert not server.completed[0]
+        assert server.think_sent[0] < _THINK_TOKENS
+
+    def test_split_reasoning_over_budget_never_reaches_content(self, make_server) -> None:
+        server = make_server(split_reasoning=True)
+        client = _client(server, thinking_budgets={"planner": 40})
+
+        raw = _ask(client, role="planner")
+
+        assert "".join(raw) == "The answer is 42."
+        assert client.thinking_stats()["planner"]["budget_aborts"] == 1
+        assert client.thinking_stats()["planner"]["reasoning_tokens"] == 40
+
+    def test_continue_mode_resumes_after_the_partial_reasoning(self, make_server) -> None:
+        server = make_server()
+        client = _client(server, thinking_budgets={"persona": 32}, thinking_overflow="continue")
+
+        raw = _ask(client, role="persona")
+
+        assert "".join(stream_thinking_filter(raw)) == "The answer is 42."
+        resumed = server.payloads[1]
+        prefill = resumed["messages"][-1]
+        assert prefill["role"] == "assistant"
+        assert prefill["content"].startswith("<think>\nstep0 ")
+        assert prefill["content"].endswith("\n</think>\n\n")
+        assert prefill["content"].count("<think>") == 1
+        assert resumed["cache_prompt"] is True
+        assert resumed["messages"][:-1] == server.payloads[0]["messages"]
+
+    def test_unbudgeted_role_streams_the_full_thinking_block(self, make_server) -> None:
+        server = make_server(token_delay_s=0.0)
+        client = _client(server, thinking_budgets={"router": 16})
+
+        raw = _ask(client)
+
+        assert "".join(raw).endswith("</think>\n\nThe answer is 42.")
+        assert len(server.payloads) == 1
+        assert server.think_sent == [_THINK_TOKENS]
+
+
+# ── 2. roles and stats ───────────────────────────────────────────────
+
+
+class TestThinkingStats:
+    def test_role_context_selects_budget_and_bucket(self, make_server) -> None:
+        server = make_server(split_reasoning=True, token_delay_s=0.0)
+        client = _client(server, thinking_budgets={"inspector": 10})
+
+        with llm_role("inspector"):
+            stream = client.generate_stream([{"role": "user", "content": "check"}])
+        assert "".join(stream) == "The answer is 42."
+        assert client.generate([{"role": "user", "content": "again"}]) == "The answer is 42."
+
+        stats = client.thinking_stats()
+        assert stats["inspector"]["budget_aborts"] == 1
+        assert stats["default"] == {
+            **stats["default"],
+            "requests": 1,
+            "reasoning_tokens": _THINK_TOKENS,
+            "content_tokens": len(_ANSWER),
+            "budget_aborts": 0,
+        }
+        assert stats["default"]["reasoning_ms"] > 0.0
+
+    def test_decorated_helper_tags_lazily_created_streams(self, make_server) -> None:
+        server = make_server(split_reasoning=True, token_delay_s=0.0)
+        client = _client(server, thinking_budgets={"persona": 8})
+
+        def _lazy():
+            yield from client.generate_stream([{"role": "user", "content": "hi"}])
+
+        @llm_role("persona")
+        def _consume() -> str:
+            return "".join(_lazy())
+
+        assert _consume() == "The answer is 42."
+        assert set(client.thinking_stats()) == {"persona"}
+
+
+# ── 3. inline tracking ───────────────────────────────────────────────
+
+
+class TestInlineThinkTracker:
+    def test_tags_split_across_tokens_are_tracked(self) -> None:
+        tracker = _InlineThinkTracker()
+        flags = [tracker.feed(token) for token in ["\n", "<th", "ink>", "plan ", "</th", "ink>", "Hi"]]
+
+        assert flags == [True, True, True, True, True, True, False]
+        assert not tracker.in_think
+
+    def test_plain_answer_is_never_reasoning(self) -> None:
+        tracker = _InlineThinkTracker()
+
+        assert tracker.feed("Hello") is False
+        assert tracker.feed("<think>") is False
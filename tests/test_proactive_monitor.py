@@ -649,3 +649,183 @@ class TestProactiveMonitorLifecycle:
         monitor._run_loop()
 
         assert any("dispatch boom" in log for log in logs)
+
+
+# ── 8. Heap scheduler behavior ───────────────────────────────────────
+
+class _FakeClock:
+    def __init__(self, start: float) -> None:
+        self.now = float(start)
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _iso_at(ts: float) -> str:
+    return dt.datetime.fromtimestamp(ts, tz=dt.timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+class TestReminderSchedule:
+    def test_thousands_of_reminders_fire_in_order_at_their_deadline(self) -> None:
+        import random
+
+        base = dt.datetime(2026, 6, 1, tzinfo=dt.timezone.utc).timestamp()
+        rng = random.Random(31)
+        entries = [
+            {"id": f"r{index}", "fire_at": _iso_at(base + rng.randrange(0, 86_400)), "message": str(index), "fired": False}
+            for index in range(5000)
+        ]
+        schedule = rem.ReminderSchedule()
+        schedule.replace(entries)
+        clock = base - 1.0
+        fired: list[tuple[float, float]] = []
+
+        while (next_ts := schedule.next_fire_ts()) is not None:
+            clock = max(clock, next_ts)
+            for entry in schedule.due(clock):
+                assert schedule.mark_fired(entry["id"]) is True
+                fired.append((rem._parse_fire_at_ts(entry["fire_at"]), clock))
+
+        assert len(fired) == 5000
+        assert [fire_ts for fire_ts, _ in fired] == sorted(fire_ts for fire_ts, _ in fired)
+        assert max(at - fire_ts for fire_ts, at in fired) == 0.0
+
+    def test_fired_and_unparseable_entries_never_enter_the_heap(self) -> None:
+        schedule = rem.ReminderSchedule()
+        schedule.replace(
+            [
+                {"id": "a", "fire_at": "2000-01-01T00:00:00Z", "fired": True},
+                {"id": "b", "fire_at": "garbage", "fired": False},
+            ]
+        )
+        assert schedule.next_fire_ts() is None
+
+    def test_wait_for_change_wakes_on_append(self) -> None:
+        schedule = rem.ReminderSchedule()
+        woke = threading.Event()
+
+        def _waiter() -> None:
+            schedule.wait_for_change(5.0)
+            woke.set()
+
+        thread = threading.Thread(target=_waiter)
+        thread.start()
+        while not woke.is_set():
+            schedule.append({"id": "x", "fire_at": "2000-01-01T00:00:00Z", "fired": False})
+            woke.wait(0.05)
+        thread.join(timeout=1.0)
+        assert woke.is_set()
+
+
+class TestReminderStoreIndex:
+    def test_file_is_parsed_once_until_it_changes(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        path = tmp_path / "reminders.json"
+        rem.ReminderStore(path).add(message="x", fire_at_utc="2000-01-01T00:00:00Z")
+        loads: list[Path] = []
+        original = rem._load_json_list
+        monkeypatch.setattr(rem, "_load_json_list", lambda p: loads.append(p) or original(p))
+        store = rem.ReminderStore(path)
+
+        for _ in range(20):
+            store.due_entries()
+        assert loads == []
+
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        payload.append({"id": "external", "fire_at": "2000-01-01T00:00:01Z", "message": "edited", "fired": False})
+        path.write_text(json.dumps(payload), encoding="utf-8")
+        assert [entry["id"] for entry in store.due_entries()][-1] == "external"
+        assert len(loads) == 1
+
+    def test_stores_on_the_same_file_share_the_heap(self, tmp_path: Path) -> None:
+        path = tmp_path / "reminders.json"
+        first = rem.ReminderStore(path)
+        entry = first.add(message="x", fire_at_utc="2000-01-01T00:00:00Z")
+
+        rem.ReminderStore(path).mark_fired(entry["id"])
+
+        assert first.next_fire_ts() is None
+        assert first.due_entries() == []
+
+    def test_fired_entries_are_compacted_into_archive(self, tmp_path: Path) -> None:
+        store = rem.ReminderStore(tmp_path / "reminders.json", compact_after=5, keep_fired=2)
+        ids = [store.add(message=str(index), fire_at_utc="2000-01-01T00:00:00Z")["id"] for index in range(6)]
+        for reminder_id in ids[:5]:
+            store.mark_fired(reminder_id)
+
+        live = store.load()
+        assert [entry["message"] for entry in live] == ["3", "4", "5"]
+        assert [entry["message"] for entry in store.load_archive()] == ["0", "1", "2"]
+        assert [entry["id"] for entry in store.due_entries()] == [ids[5]]
+
+
+class TestProactiveMonitorScheduling:
+    def test_fake_clock_dispatches_in_order_with_zero_latency(self, tmp_path: Path) -> None:
+        import random
+
+        path = tmp_path / "reminders.json"
+        base = dt.datetime(2026, 6, 1, tzinfo=dt.timezone.utc).timestamp()
+        rng = random.Random(7)
+        rem.ReminderStore(path).save(
+            [
+                {"id": f"r{index}", "fire_at": _iso_at(base + rng.randrange(60, 7200)), "message": str(index), "fired": False}
+                for index in range(400)
+            ]
+        )
+        clock = _FakeClock(base)
+        dispatched: list[tuple[float, float]] = []
+        monitor: pm.ProactiveMonitor
+
+        def _dispatch(entry: dict[str, Any]) -> bool:
+            dispatched.append((rem._parse_fire_at_ts(entry["fire_at"]), clock.now))
+            monitor.store.mark_fired(entry["id"])
+            return True
+
+        monitor = pm.ProactiveMonitor(
+            path,
+            poll_interval_s=3600.0,
+            can_dispatch=lambda: True,
+            is_inflight=lambda _id: False,
+            dispatch_callback=_dispatch,
+            clock=clock,
+        )
+        while monitor.store.next_fire_ts() is not None:
+            generation = monitor.store.schedule.generation
+            wait_s = monitor._dispatch_due()
+            # A store change wakes the condition wait immediately.
+            if monitor.store.schedule.generation == generation:
+                clock.now += wait_s
+
+        assert len(dispatched) == 400
+        assert [fire_ts for fire_ts, _ in dispatched] == sorted(fire_ts for fire_ts, _ in dispatched)
+        assert max(at - fire_ts for fire_ts, at in dispatched) == pytest.approx(0.0, abs=1e-6)
+
+    def test_busy_app_retries_instead_of_waiting_a_full_poll(self, tmp_path: Path) -> None:
+        rem.ReminderStore(tmp_path / "reminders.json").add(message="x", fire_at_utc="2000-01-01T00:00:00Z")
+        monitor = pm.ProactiveMonitor(
+            tmp_path / "reminders.json",
+            poll_interval_s=15.0,
+            retry_interval_s=0.5,
+            can_dispatch=lambda: False,
+            is_inflight=lambda _id: False,
+            dispatch_callback=lambda _entry: True,
+        )
+        assert monitor._dispatch_due() == 0.5
+
+    def test_added_reminder_wakes_sleeping_loop(self, tmp_path: Path) -> None:
+        path = tmp_path / "reminders.json"
+        dispatched = threading.Event()
+        monitor = pm.ProactiveMonitor(
+            path,
+            poll_interval_s=60.0,
+            can_dispatch=lambda: True,
+            is_inflight=lambda _id: False,
+            dispatch_callback=lambda _entry: dispatched.set() or True,
+        )
+        monitor.start()
+        try:
+            soon = dt.datetime.now(dt.timezone.utc) + dt.timedelta(seconds=1)
+            rem.ReminderStore(path).add(message="x", fire_at_utc=_iso_at(soon.timestamp()))
+            assert dispatched.wait(3.0)
+        finally:
+            monitor.stop()
+        assert not monitor._thread.is_alive()
@@ -0,0 +1,283 @@
+"""Guard tests for local readability extraction of deep-dive pages.
+
+These tests require no network. The fixture corpus of saved pages lives in
+tests/golden/readability (``<name>.html`` with its expected ``<name>.md``);
+page fetches are served by in-process fakes.
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import tools.search as search_module
+from core.search import readability
+from core.search.readability import ExtractionTimeout, decode_html, extract_main_text, extract_page, sniff_charset
+
+
+_CORPUS_DIR = Path(__file__).resolve().parent / "golden" / "readability"
+_CORPUS = sorted(_CORPUS_DIR.glob("*.html"))
+
+_ARTICLE = (
+    "<html><head><title>Sample</title></head><body>"
+    "<nav><a href='/'>Home</a></nav>"
+    "<div class='content'><p>"
+    + "Local extraction keeps the article text, drops the page chrome, and stays in process. " * 4
+    + "</p></div><footer>Footer text</footer></body></html>"
+)
+
+
+# ── helpers ──────────────────────────────────────────────────────────
+
+
+class _FakePageResponse:
+    def __init__(self, body: bytes = b"", *, status: int = 200, headers: dict[str, str] | None = None) -> None:
+        self._data = body
+        self.status = status
+        self.headers = headers or {}
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = len(self._data)
+        chunk, self._data = self._data[:size], self._data[size:]
+        return chunk
+
+    def __enter__(self) -> "_FakePageResponse":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        pass
+
+
+class _FakeWeb:
+    """Serves the origin page and, under the reader prefix, a remote extract."""
+
+    def __init__(self, origin: _FakePageResponse, reader_text: str = "") -> None:
+        self.origin = origin
+        self.reader_text = reader_text
+        self.urls: list[str] = []
+
+    def __call__(self, url: str, *, headers: dict[str, str], timeout: float) -> _FakePageResponse:
+        self.urls.append(url)
+        if url.startswith(search_module._READER_PREFIX):
+            return _FakePageResponse(self.reader_text.encode("utf-8"))
+        return self.origin
+
+
+@pytest.fixture
+def no_page_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(search_module.CFG, "SEARCH_PAGE_CACHE_ENABLED", False, raising=False)
+    monkeypatch.setattr(search_module.CFG, "SEARCH_EXTRACT_WORKERS", 0, raising=False)
+
+
+class _SlowStartExecutor:
+    """Executor stand-in whose workers take a while to come up, then run inline."""
+
+    start_s = 0.4
+
+    def __init__(self, max_workers: int) -> None:
+        self.max_workers = max_workers
+
+    def submit(self, fn, *args: Any, **kwargs: Any) -> Future:
+        if fn is readability._worker_ready:
+            time.sleep(self.start_s / self.max_workers)
+        future: Future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        pass
+
+
+class _BrokenStartExecutor(_SlowStartExecutor):
+    def submit(self, fn, *args: Any, **kwargs: Any) -> Future:
+        future: Future = Future()
+        future.set_exception(OSError("cannot spawn worker"))
+        return future
+
+
+# ── 1. fixture corpus ────────────────────────────────────────────────
+
+
+class TestFixtureCorpus:
+    @pytest.mark.parametrize("page", _CORPUS, ids=lambda path: path.stem)
+    def test_extract_matches_expected_markdown(self, page: Path) -> None:
+        expected = page.with_suffix(".md").read_text(encoding="utf-8").strip()
+
+        assert extract_main_text(decode_html(page.read_bytes())) == expected
+
+    def test_boilerplate_is_removed(self) -> None:
+        text = extract_main_text(decode_html((_CORPUS_DIR / "news_article.html").read_bytes()))
+
+        for chrome in ("cookies", "Most read", "All rights reserved", "Comments (214)", "Share", "Sport"):
+            assert chrome not in text
+        assert text.startswith("Title: City council approves riverfront transit plan")
+
+
+# ── 2. charset sniffing ──────────────────────────────────────────────
+
+
+class TestCharsetSniffing:
+    def test_bom_wins_over_declarations(self) -> None:
+        raw = b"\xef\xbb\xbf<meta charset='latin-1'><p>caf\xc3\xa9</p>"
+
+        assert sniff_charset(raw, "text/html; charset=cp1252") == "utf-8-sig"
+
+    def test_header_then_meta(self) -> None:
+        raw = b"<meta charset='windows-1252'><p>caf\xe9</p>"
+
+        assert sniff_charset(raw, "text/html; charset=utf-8") == "utf-8"
+        assert sniff_charset(raw) == "cp1252"
+        assert "café" in decode_html(raw)
+
+    def test_utf8_cut_at_byte_budget_is_still_utf8(self) -> None:
+        raw = "<p>naïve café</p>".encode("utf-8")[:-6]
+
+        assert sniff_charset(raw) == "utf-8"
+
+    def test_undeclared_legacy_bytes_are_detected(self) -> None:
+        pytest.importorskip("charset_normalizer")
+        raw = ("<p>" + "Привет, это обычная страница на русском языке с новостями дня. " * 10 + "</p>").encode("cp1251")
+
+        assert sniff_charset(raw) == "cp1251"
+        assert "новостями" in decode_html(raw)
+
+
+# ── 3. markup handling ───────────────────────────────────────────────
+
+
+class TestMarkupHandling:
+    def test_hidden_and_script_content_is_dropped(self) -> None:
+        html = (
+            "<body><div class='article-body'>"
+            "<p>" + "Visible paragraph with enough words to count as content, and commas. " * 3 + "</p>"
+            "<p style='display:none'>Hidden teaser</p><div hidden>Hidden block</div>"
+            "<script>var leaked = 'script text';</script><style>p { color: red }</style>"
+            "</div></body>"
+        )
+        text = extract_main_text(html)
+
+        assert "Visible paragraph" in text
+        for hidden in ("Hidden teaser", "Hidden block", "leaked", "color"):
+            assert hidden not in text
+
+    def test_link_farm_inside_article_is_dropped(self) -> None:
+        links = "".join(f"<li><a href='/t{i}'>Tag {i}</a></li>" for i in range(8))
+        html = (
+            "<article><p>" + "The body of the story goes here, with several clauses, and more detail. " * 3 + "</p>"
+            f"<ul>{links}</ul></article>"
+        )
+        text = extract_main_text(html)
+
+        assert "The body of the story" in text
+        assert "Tag 3" not in text
+
+    def test_layout_table_renders_as_paragraphs(self) -> None:
+        html = (
+            "<table><tr><td><p>" + "Single column layout tables hold plain article text, not data. " * 3
+            + "</p></td></tr></table>"
+        )
+        text = extract_main_text(html)
+
+        assert "|" not in text
+        assert text.startswith("Single column layout tables")
+
+    def test_page_without_text_extracts_empty(self) -> None:
+        assert extract_main_text("<html><body><script>app()</script><div id='root'></div></body></html>") == ""
+
+    def test_max_chars_truncates_on_a_word_boundary(self) -> None:
+        text = extract_main_text(_ARTICLE, max_chars=60)
+
+        assert len(text) <= 60
+        assert not text.endswith(" ")
+
+
+# ── 4. budgets and the worker pool ───────────────────────────────────
+
+
+class TestExtractionBudget:
+    def test_deadline_interrupts_large_pages(self) -> None:
+        html = "<div><p>" + "word, " * 200_000 + "</p></div>"
+
+        with pytest.raises(ExtractionTimeout):
+            extract_main_text(html, deadline_s=1e-6)
+
+    def test_pool_matches_inline_extraction(self) -> None:
+        try:
+            pooled = extract_page(_ARTICLE, workers=1, timeout_s=10.0)
+        finally:
+            readability.shutdown_extractor_pool()
+
+        assert pooled == extract_page(_ARTICLE, workers=0, timeout_s=10.0)
+
+    def test_started_pool_has_every_worker_running(self) -> None:
+        try:
+            assert readability.start_extractor_pool(2)
+            assert len(readability._POOL._processes) == 2
+        finally:
+            readability.shutdown_extractor_pool()
+
+    def test_worker_start_up_is_not_charged_to_the_page_budget(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(readability, "ProcessPoolExecutor", _SlowStartExecutor)
+        try:
+            text = extract_page(_ARTICLE, workers=2, timeout_s=0.1)
+        finally:
+            readability.shutdown_extractor_pool()
+
+        assert "Local extraction keeps the article text" in text
+
+    def test_pool_that_never_starts_falls_back_inline(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(readability, "ProcessPoolExecutor", _BrokenStartExecutor)
+
+        assert not readability.start_extractor_pool(1)
+        assert readability._POOL is None
+        assert "Local extraction keeps the article text" in extract_page(_ARTICLE, workers=1, timeout_s=1.0)
+        readability.shutdown_extractor_pool()
+
+
+# ── 5. fetch_clean_text ──────────────────────────────────────────────
+
+
+class TestFetchCleanText:
+    def test_html_origin_is_extracted_locally(self, no_page_cache: None, monkeypatch: pytest.MonkeyPatch) -> None:
+        web = _FakeWeb(_FakePageResponse(_ARTICLE.encode("utf-8"), headers={"Content-Type": "text/html"}))
+        monkeypatch.setattr(search_module, "_open_page", web)
+
+        text = search_module.fetch_clean_text("https://example.test/story")
+
+        assert web.urls == ["https://example.test/story"]
+        assert text.startswith("Title: Sample\n\nLocal extraction keeps the article text")
+        assert "Footer text" not in text and "Home" not in text
+
+    def test_plain_text_passes_through(self, no_page_cache: None, monkeypatch: pytest.MonkeyPatch) -> None:
+        body = "Plain text page served as text/plain, long enough to clear the minimum length check. " * 2
+        web = _FakeWeb(_FakePageResponse(body.encode("utf-8"), headers={"Content-Type": "text/plain"}))
+        monkeypatch.setattr(search_module, "_open_page", web)
+
+        assert search_module.fetch_clean_text("https://example.test/notes.txt") == body
+
+    def test_remote_reader_is_not_used_by_default(self, no_page_cache: None, monkeypatch: pytest.MonkeyPatch) -> None:
+        web = _FakeWeb(_FakePageResponse(status=403), reader_text="Reader text " * 20)
+        monkeypatch.setattr(search_module, "_open_page", web)
+
+        result = search_module.fetch_clean_text("https://example.test/walled")
+
+        assert result == "Error reading page: HTTP Error 403"
+        assert len(web.urls) == 1
+
+    def test_remote_reader_fallback_for_blocked_and_script_pages(
+        self, no_page_cache: None, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(search_module.CFG, "SEARCH_REMOTE_READER_FALLBACK", True, raising=False)
+        reader_text = "Rendered by the remote reader with the full article text. " * 4
+        shell = b"<html><body><div id='root'></div><script>app()</script></body></html>"
+        for origin in (_FakePageResponse(status=403), _FakePageResponse(shell, headers={"Content-Type": "text/html"})):
+            web = _FakeWeb(origin, reader_text=reader_text)
+            monkeypatch.setattr(search_module, "_open_page", web)
+
+            assert search_module.fetch_clean_text("https://example.test/app") == reader_text
+            assert web.urls[-1] == f"{search_module._READER_PREFIX}https://example.test/app"
@@ -0,0 +1,401 @@
+"""Guard tests for concurrent deep-dive fetching and the search page cache.
+
+These tests require no network. Page fetches are served by in-process fakes
+and the cache lives in a temporary directory.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import tools.search as search_module
+from core.runtime_control import CancellationToken, OperationCancelled
+from core.search.page_cache import SearchPageCache
+
+
+_READABLE = "Readable article body about the query topic with plenty of detail. " * 4
+
+
+# ── helpers ──────────────────────────────────────────────────────────
+
+
+class _FakePageResponse:
+    def __init__(self, body: str = "", *, status: int = 200, headers: dict[str, str] | None = None) -> None:
+        self._data = body.encode("utf-8")
+        self.status = status
+        self.headers = headers or {}
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = len(self._data)
+        chunk, self._data = self._data[:size], self._data[size:]
+        return chunk
+
+    def __enter__(self) -> "_FakePageResponse":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        pass
+
+
+class _FakeOrigin:
+    """Answers `_open_page` like a reader that honours ETag revalidation."""
+
+    def __init__(self, body: str = _READABLE, etag: str = '"v1"') -> None:
+        self.body = body
+        self.etag = etag
+        self.requests: list[dict[str, str]] = []
+
+    def __call__(self, url: str, *, headers: dict[str, str], timeout: float) -> _FakePageResponse:
+        self.requests.append(dict(headers))
+        if self.etag and headers.get("If-None-Match") == self.etag:
+            return _FakePageResponse(status=304, headers={"ETag": self.etag})
+        return _FakePageResponse(self.body, headers={"ETag": self.etag} if self.etag else {})
+
+
+@pytest.fixture
+def page_cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    root = tmp_path / "search_pages"
+    monkeypatch.setattr(search_module.CFG, "SEARCH_PAGE_CACHE_ENABLED", True, raising=False)
+    monkeypatch.setattr(search_module.CFG, "SEARCH_PAGE_CACHE_TTL_S", 3600.0, raising=False)
+    monkeypatch.setattr(search_module, "_PAGE_CACHE", SearchPageCache(root, ttl_s=3600.0))
+    monkeypatch.setattr(search_module.CFG, "SEARCH_PAGE_CACHE_DIR", root, raising=False)
+    return root
+
+
+def _results(*names: str) -> list[dict]:
+    return [{"title": name, "body": f"{name} snippet", "href": f"https://example.test/{name}"} for name in names]
+
+
+def _run_deep_dive(monkeypatch: pytest.MonkeyPatch, fake_fetch, results: list[dict], **cfg: Any):
+    for key, value in cfg.items():
+        monkeypatch.setattr(search_module.CFG, key, value, raising=False)
+    monkeypatch.setattr(search_module, "fetch_clean_text", fake_fetch)
+    logs: list[str] = []
+    pages = search_module._deep_dive_pages(results, "query", log=logs.append, clean_url=lambda u: u)
+    return pages, logs
+
+
+# ── 1. page cache ────────────────────────────────────────────────────
+
+
+class TestSearchPageCache:
+    def test_fresh_entry_skips_network(self, page_cache_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        origin = _FakeOrigin()
+        monkeypatch.setattr(search_module, "_open_page", origin)
+
+        first = search_module.fetch_clean_text("https://example.test/a")
+        second = search_module.fetch_clean_text("https://example.test/a")
+
+        assert first == second == _READABLE
+        assert len(origin.requests) == 1
+        assert search_module._PAGE_CACHE.stats["fresh_hits"] == 1
+
+    def test_stale_entry_revalidates_with_etag(self, page_cache_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        origin = _FakeOrigin()
+        monkeypatch.setattr(search_module, "_open_page", origin)
+        search_module.fetch_clean_text("https://example.test/a")
+        monkeypatch.setattr(search_module.CFG, "SEARCH_PAGE_CACHE_TTL_S", 0.0, raising=False)
+
+        content = search_module.fetch_clean_text("https://example.test/a")
+
+        assert content == _READABLE
+        assert origin.requests[-1]["If-None-Match"] == '"v1"'
+        assert search_module._PAGE_CACHE.stats["revalidated"] == 1
+
+    def test_changed_page_replaces_entry(self, page_cache_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        origin = _FakeOrigin()
+        monkeypatch.setattr(search_module, "_open_page", origin)
+        search_module.fetch_clean_text("https://example.test/a")
+        monkeypatch.setattr(search_module.CFG, "SEARCH_PAGE_CACHE_TTL_S", 0.0, raising=False)
+        origin.body, origin.etag = _READABLE.upper(), '"v2"'
+
+        content = search_module.fetch_clean_text("https://example.test/a")
+
+        assert content == _READABLE.upper()
+        assert search_module._PAGE_CACHE.get("https://example.test/a").etag == '"v2"'
+
+    def test_errors_and_blocked_pages_are_not_cached(self, page_cache_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(
+            search_module,
+            "_open_page",
+            lambda url, **kwargs: _FakePageResponse("Checking your browser before accessing. " * 5),
+        )
+        search_module.fetch_clean_text("https://example.test/blocked")
+        monkeypatch.setattr(search_module, "_open_page", lambda url, **kwargs: _FakePageResponse(status=503))
+        result = search_module.fetch_clean_text("https://example.test/down")
+
+        assert "Error reading page: HTTP Error 503" in result
+        assert list(page_cache_dir.glob("*.json")) == []
+
+    def test_binary_bodies_are_not_decoded_or_cached(self, page_cache_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        pdf = _FakePageResponse("%PDF-1.7 " + "\x00\x01binary" * 40, headers={"Content-Type": "application/pdf"})
+        monkeypatch.setattr(search_module, "_open_page", lambda url, **kwargs: pdf)
+        monkeypatch.setattr(search_module.CFG, "SEARCH_REMOTE_READER_FALLBACK", False, raising=False)
+
+        result = search_module.fetch_clean_text("https://example.test/paper.pdf")
+
+        assert result == "Error reading page: unsupported content type application/pdf"
+        assert list(page_cache_dir.glob("*.json")) == []
+
+    def test_binary_bodies_go_to_the_remote_reader(self, page_cache_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        pdf = _FakePageResponse("%PDF-1.7 binary", headers={"Content-Type": "application/pdf"})
+        monkeypatch.setattr(search_module, "_open_page", lambda url, **kwargs: pdf)
+        monkeypatch.setattr(search_module.CFG, "SEARCH_REMOTE_READER_FALLBACK", True, raising=False)
+        monkeypatch.setattr(search_module, "_fetch_via_reader", lambda url, **kwargs: _READABLE)
+
+        assert search_module.fetch_clean_text("https://example.test/paper.pdf") == _READABLE
+
+    @pytest.mark.parametrize(
+        ("content_type", "local"),
+        [
+            ("text/html; charset=utf-8", True),
+            ("text/plain", True),
+            ("application/xhtml+xml", True),
+            ("application/ld+json", True),
+            ("", True),
+            ("application/pdf", False),
+            ("application/octet-stream", False),
+            ("image/png", False),
+        ],
+    )
+    def test_only_textual_types_are_decoded_locally(self, content_type: str, local: bool) -> None:
+        assert search_module._is_text_type(content_type) is local
+
+    def test_last_modified_is_sent_when_no_etag(self, tmp_path: Path) -> None:
+        cache = SearchPageCache(tmp_path, ttl_s=0.0)
+        cache.put("https://example.test/a", _READABLE, last_modified="Wed, 01 Jan 2025 00:00:00 GMT")
+        entry, fresh = cache.lookup("https://example.test/a")
+
+        assert fresh is False
+        assert entry.conditional_headers() == {"If-Modified-Since": "Wed, 01 Jan 2025 00:00:00 GMT"}
+
+    def test_prune_keeps_newest_entries(self, tmp_path: Path) -> None:
+        cache = SearchPageCache(tmp_path, ttl_s=60.0, max_entries=3)
+        for index in range(5):
+            cache.put(f"https://example.test/{index}", _READABLE)
+            path = cache._path(f"https://example.test/{index}")
+            stamp = 1_000_000 + index
+            os.utime(path, (stamp, stamp))
+
+        assert cache.prune() == 2
+        assert cache.get("https://example.test/0") is None
+        assert cache.get("https://example.test/4") is not None
+
+
+# ── 2. concurrent deep dive ──────────────────────────────────────────
+
+
+class TestConcurrentDeepDive:
+    def test_pages_fetch_in_parallel_and_keep_rank_order(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        delays = {"a": 0.30, "b": 0.05, "c": 0.20, "d": 0.10}
+
+        def fake_fetch(url: str, *, cancel_token=None) -> str:
+            time.sleep(delays[url.rsplit("/", 1)[-1]])
+            return f"{url} {_READABLE}"
+
+        started = time.monotonic()
+        pages, _logs = _run_deep_dive(
+            monkeypatch,
+            fake_fetch,
+            _results("a", "b", "c", "d"),
+            SEARCH_DEEP_DIVE_LINKS_LIMIT=4,
+            SEARCH_DEEP_DIVE_WORKERS=4,
+            SEARCH_DEEP_DIVE_DEADLINE_S=5.0,
+        )
+        elapsed = time.monotonic() - started
+
+        assert [link.rsplit("/", 1)[-1] for link, _content in pages] == ["a", "b", "c", "d"]
+        assert elapsed < 0.55
+
+    def test_rejected_pages_are_backfilled_from_lower_ranks(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        def fake_fetch(url: str, *, cancel_token=None) -> str:
+            if url.endswith("/b"):
+                return "Error reading page: HTTP Error 403"
+            return _READABLE
+
+        pages, logs = _run_deep_dive(
+            monkeypatch,
+            fake_fetch,
+            _results("a", "b", "c", "d"),
+            SEARCH_DEEP_DIVE_LINKS_LIMIT=2,
+            SEARCH_DEEP_DIVE_CANDIDATES=4,
+        )
+
+        assert [link for link, _content in pages] == ["https://example.test/a", "https://example.test/c"]
+        assert any("Skipped (fetch error): https://example.test/b" in line for line in logs)
+
+    def test_settles_without_waiting_for_lower_ranked_pages(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        release = threading.Event()
+
+        def fake_fetch(url: str, *, cancel_token=None) -> str:
+            if url.endswith("/c"):
+                release.wait(2.0)
+            return _READABLE
+
+        started = time.monotonic()
+        pages, logs = _run_deep_dive(
+            monkeypatch,
+            fake_fetch,
+            _results("a", "b", "c"),
+            SEARCH_DEEP_DIVE_LINKS_LIMIT=2,
+            SEARCH_DEEP_DIVE_CANDIDATES=3,
+            SEARCH_DEEP_DIVE_DEADLINE_S=5.0,
+        )
+        release.set()
+
+        assert len(pages) == 2
+        assert time.monotonic() - started < 1.0
+        assert any("settled early" in line for line in logs)
+
+    def test_global_deadline_drops_slow_pages_and_cancels_them(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        tokens: list[CancellationToken] = []
+
+        def fake_fetch(url: str, *, cancel_token=None) -> str:
+            if url.endswith("/a"):
+                tokens.append(cancel_token)
+                while not cancel_token.is_cancelled:
+                    time.sleep(0.01)
+                cancel_token.raise_if_cancelled()
+            return _READABLE
+
+        pages, logs = _run_deep_dive(
+            monkeypatch,
+            fake_fetch,
+            _results("a", "b"),
+            SEARCH_DEEP_DIVE_LINKS_LIMIT=2,
+            SEARCH_DEEP_DIVE_DEADLINE_S=0.3,
+        )
+
+        assert [link for link, _content in pages] == ["https://example.test/b"]
+        assert any("Skipped (deadline): https://example.test/a" in line for line in logs)
+        assert tokens and tokens[0].is_cancelled
+
+    def test_slow_top_ranked_page_only_gets_a_grace(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        def fake_fetch(url: str, *, cancel_token=None) -> str:
+            if url.endswith("/a"):
+                while not cancel_token.is_cancelled:
+                    time.sleep(0.01)
+                cancel_token.raise_if_cancelled()
+            return _READABLE
+
+        monkeypatch.setattr(search_module, "_DEEP_DIVE_STRAGGLER_GRACE_S", 0.1)
+        started = time.monotonic()
+        pages, _logs = _run_deep_dive(
+            monkeypatch,
+            fake_fetch,
+            _results("a", "b"),
+            SEARCH_DEEP_DIVE_LINKS_LIMIT=1,
+            SEARCH_DEEP_DIVE_DEADLINE_S=5.0,
+        )
+
+        assert [link for link, _content in pages] == ["https://example.test/b"]
+        assert time.monotonic() - started < 1.0
+
+    def test_parent_cancellation_propagates(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        token = CancellationToken()
+
+        def fake_fetch(url: str, *, cancel_token=None) -> str:
+            token.cancel()
+            cancel_token.raise_if_cancelled()
+            return _READABLE
+
+        monkeypatch.setattr(search_module, "fetch_clean_text", fake_fetch)
+        with pytest.raises(OperationCancelled):
+            search_module._deep_dive_pages(
+                _results("a", "b"),
+                "query",
+                log=lambda msg: None,
+                clean_url=lambda u: u,
+                cancel_token=token,
+            )
+
+
+# ── 3. origin fetch safety ───────────────────────────────────────────
+
+
+class _FakeHop:
+    def __init__(self, status: int, location: str = "") -> None:
+        self.status_code = status
+        self.headers = {"Location": location} if location else {}
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class _FakeSession:
+    def __init__(self, hops: list[_FakeHop]) -> None:
+        self.hops = hops
+        self.urls: list[str] = []
+
+    def get(self, url: str, **kwargs: Any) -> _FakeHop:
+        assert kwargs["allow_redirects"] is False
+        self.urls.append(url)
+        return self.hops.pop(0)
+
+
+def _resolve_to(monkeypatch: pytest.MonkeyPatch, table: dict[str, str]) -> None:
+    def fake_getaddrinfo(host: str, port: int, *args: Any, **kwargs: Any) -> list[tuple]:
+        return [(None, None, None, "", (table.get(host, host), port))]
+
+    monkeypatch.setattr(search_module.socket, "getaddrinfo", fake_getaddrinfo)
+
+
+class TestOriginFetchSafety:
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "http://127.0.0.1:8080/admin",
+            "http://169.254.169.254/latest/meta-data/",
+            "http://10.0.0.5/",
+            "http://192.168.1.1/",
+            "http://[::1]/",
+            "http://[::ffff:127.0.0.1]/",
+            "http://router.lan/",
+            "file:///etc/passwd",
+        ],
+    )
+    def test_non_public_targets_are_refused(self, monkeypatch: pytest.MonkeyPatch, url: str) -> None:
+        _resolve_to(monkeypatch, {"router.lan": "192.168.0.1"})
+
+        with pytest.raises(ValueError):
+            search_module._require_public_url(url)
+
+    def test_public_host_passes(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        _resolve_to(monkeypatch, {"example.com": "93.184.216.34"})
+
+        search_module._require_public_url("https://example.com/article")
+
+    def test_redirect_into_the_lan_is_refused_before_the_request(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        _resolve_to(monkeypatch, {"example.com": "93.184.216.34"})
+        first = _FakeHop(302, "http://169.254.169.254/latest/meta-data/")
+        session = _FakeSession([first, _FakeHop(200)])
+        monkeypatch.setattr(search_module, "_http_session", lambda: session)
+
+        with pytest.raises(ValueError):
+            search_module._open_page("https://example.com/a", headers={}, timeout=1.0)
+        assert session.urls == ["https://example.com/a"]
+        assert first.closed
+
+    def test_public_redirects_are_followed_relative_to_each_hop(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        _resolve_to(monkeypatch, {"example.com": "93.184.216.34", "www.example.com": "93.184.216.35"})
+        session = _FakeSession([_FakeHop(301, "https://www.example.com/a"), _FakeHop(302, "/b"), _FakeHop(200)])
+        monkeypatch.setattr(search_module, "_http_session", lambda: session)
+        monkeypatch.setattr(search_module, "_PooledResponse", lambda response: response)
+
+        response = search_module._open_page("http://example.com/a", headers={}, timeout=1.0)
+
+        assert response.status_code == 200
+        assert session.urls == ["http://example.com/a", "https://www.example.com/a", "https://www.example.com/b"]
+
+    def test_session_verifies_certificates(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(search_module, "_HTTP_SESSION", None)
+
+        assert search_module._http_session().verify is True
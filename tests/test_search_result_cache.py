@@ -0,0 +1,193 @@
+"""Guard tests for the search result cache in tools/search.py.
+
+These tests require no network. Backends are replaced by counting fakes and
+the cache clock is driven by hand.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+import tools.search as search_module
+from core.search.result_cache import SearchResultCache, normalize_cache_query
+
+
+# ── helpers ──────────────────────────────────────────────────────────
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _CountingBackend:
+    def __init__(self, results_by_query: dict[str, list[dict]]) -> None:
+        self.results_by_query = results_by_query
+        self.calls: list[str] = []
+
+    def __call__(self, query: str, **kwargs: Any) -> list[dict]:
+        self.calls.append(query)
+        return [dict(item) for item in self.results_by_query.get(normalize_cache_query(query), [])]
+
+
+def _hit(title: str, body: str, index: int) -> dict:
+    return {"title": title, "body": body, "href": f"https://example.test/{index}"}
+
+
+_AI_RESULTS = {
+    "recent developments in ai": [_hit("AI developments one", "Developments in AI research.", 1)],
+    "developments in ai": [
+        _hit("AI developments two", "Developments in AI tooling.", 2),
+        _hit("Cooking tips", "Unrelated pasta recipes.", 3),
+    ],
+    "latest developments in ai news": [_hit("AI news", "Latest developments in AI news.", 4)],
+}
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _Clock:
+    fake_clock = _Clock()
+    monkeypatch.setattr(search_module, "_RESULT_CACHE", SearchResultCache(clock=fake_clock))
+    monkeypatch.setattr(search_module.CFG, "SEARCH_RESULT_CACHE_ENABLED", True, raising=False)
+    monkeypatch.setattr(search_module.CFG, "SEARCH_RESULT_CACHE_TTL_S", 1800.0, raising=False)
+    monkeypatch.setattr(search_module.CFG, "SEARCH_RESULT_CACHE_NEWS_TTL_S", 300.0, raising=False)
+    return fake_clock
+
+
+@pytest.fixture
+def searxng(monkeypatch: pytest.MonkeyPatch, clock: _Clock) -> _CountingBackend:
+    backend = _CountingBackend(_AI_RESULTS)
+    monkeypatch.setattr(search_module.CFG, "SEARCH_BACKEND", "searxng", raising=False)
+    monkeypatch.setattr(search_module, "_run_searxng_search", backend)
+    return backend
+
+
+def _collect(query: str) -> tuple[tuple[list[dict], str, str], list[str]]:
+    logs: list[str] = []
+    return search_module._collect_search_results(query, log=logs.append), logs
+
+
+# ── 1. cache primitives ──────────────────────────────────────────────
+
+
+class TestSearchResultCache:
+    def test_query_normalization_shares_entries(self) -> None:
+        cache = SearchResultCache()
+        cache.put("attempt", "searxng", "searxng", "Developments in AI?", [1])
+
+        assert cache.get("attempt", "SearXNG", "searxng", "  developments   in ai ") == [1]
+
+    def test_news_entries_expire_sooner(self) -> None:
+        clock = _Clock()
+        cache = SearchResultCache(ttl_s=1800.0, news_ttl_s=300.0, clock=clock)
+        cache.put("attempt", "duckduckgo", "news", "python", ["news"])
+        cache.put("attempt", "duckduckgo", "text", "python", ["text"])
+        cache.put("attempt", "duckduckgo", "text", "latest python news", ["news-like"], news=True)
+        clock.now += 301.0
+
+        assert cache.get("attempt", "duckduckgo", "news", "python") is None
+        assert cache.get("attempt", "duckduckgo", "text", "latest python news") is None
+        assert cache.get("attempt", "duckduckgo", "text", "python") == ["text"]
+        assert cache.stats["expired"] == 2
+
+    def test_lru_evicts_oldest_entry(self) -> None:
+        cache = SearchResultCache(max_entries=2)
+        cache.put("attempt", "b", "m", "one", 1)
+        cache.put("attempt", "b", "m", "two", 2)
+        cache.get("attempt", "b", "m", "one")
+        cache.put("attempt", "b", "m", "three", 3)
+
+        assert cache.get("attempt", "b", "m", "two") is None
+        assert cache.get("attempt", "b", "m", "one") == 1
+        assert cache.stats["evictions"] == 1
+
+    def test_returned_values_are_isolated_copies(self) -> None:
+        cache = SearchResultCache()
+        cache.put("attempt", "b", "m", "q", [{"title": "a"}])
+        cache.get("attempt", "b", "m", "q")[0]["title"] = "mutated"
+
+        assert cache.get("attempt", "b", "m", "q") == [{"title": "a"}]
+
+    def test_snapshot_reports_hit_rate(self) -> None:
+        cache = SearchResultCache()
+        cache.put("attempt", "b", "m", "q", [1])
+        cache.get("attempt", "b", "m", "q")
+        cache.get("attempt", "b", "m", "other")
+
+        snapshot = cache.snapshot()
+        assert snapshot["hits"] == 1
+        assert snapshot["misses"] == 1
+        assert snapshot["hit_rate"] == pytest.approx(0.5)
+        assert snapshot["entries"] == 1
+
+
+# ── 2. collect_search_results reuse ──────────────────────────────────
+
+
+class TestCollectSearchResultsCache:
+    def test_repeat_query_answers_from_collected_cache(self, searxng: _CountingBackend) -> None:
+        (first, _label, _mode), _logs = _collect("recent developments in AI")
+        calls_after_first = len(searxng.calls)
+        (second, _label, _mode), logs = _collect("recent developments in AI")
+
+        assert calls_after_first >= 3
+        assert len(searxng.calls) == calls_after_first
+        assert second == first
+        assert any("Search cache hit (searxng)" in line for line in logs)
+
+    def test_refocused_variant_reuses_attempt_and_relevance_filter(self, searxng: _CountingBackend) -> None:
+        _collect("recent developments in AI")
+        searxng.calls.clear()
+        (results, _label, _mode), logs = _collect("developments in AI")
+
+        assert searxng.calls == []
+        assert [item["href"] for item in results] == ["https://example.test/2"]
+        assert any("Search cache hit (searxng): developments in AI" in line for line in logs)
+
+    def test_hit_rate_is_exposed(self, searxng: _CountingBackend) -> None:
+        _collect("recent developments in AI")
+        _collect("developments in AI")
+
+        stats = search_module.search_result_cache_stats()
+        assert stats["hits"] >= 1
+        assert 0.0 < stats["hit_rate"] < 1.0
+
+    def test_empty_results_are_not_cached(self, searxng: _CountingBackend) -> None:
+        _collect("quantum knitting")
+        _collect("quantum knitting")
+
+        assert searxng.calls == ["quantum knitting", "quantum knitting"]
+
+    def test_news_mode_entries_expire_on_news_ttl(self, monkeypatch: pytest.MonkeyPatch, clock: _Clock) -> None:
+        calls: list[tuple[str, str]] = []
+
+        def fake_run(*, query: str, mode: str, cancel_token=None) -> list[dict]:
+            calls.append((mode, query))
+            return [_hit("Llama.cpp benchmarks", "llama.cpp performance benchmarks news", 9)]
+
+        monkeypatch.setattr(search_module.CFG, "SEARCH_BACKEND", "duckduckgo", raising=False)
+        monkeypatch.setattr(search_module, "_run_search_query", fake_run)
+        _collect("latest llama.cpp benchmarks news")
+        first_calls = len(calls)
+        _collect("latest llama.cpp benchmarks news")
+        assert len(calls) == first_calls
+
+        clock.now += 301.0
+        _collect("latest llama.cpp benchmarks news")
+        assert len(calls) > first_calls
+
+    def test_disabled_cache_always_queries_backend(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        searxng: _CountingBackend,
+    ) -> None:
+        monkeypatch.setattr(search_module.CFG, "SEARCH_RESULT_CACHE_ENABLED", False, raising=False)
+        _collect("developments in AI")
+        _collect("developments in AI")
+
+        assert searxng.calls == ["developments in AI", "developments in AI"]
@@ -0,0 +1,177 @@
+"""Tests for the segmented JSONL log behind chat memory.
+
+These tests require no LLM and no UI. Each test uses its own temp dir;
+"restarting" is simulated by building a fresh ``SegmentedJsonlLog`` for the
+same path instead of going through the process-wide cache.
+"""
+
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from memory import storage
+from memory.chat_state import ChatState
+from memory.storage import (
+    SegmentedJsonlLog,
+    append_jsonl,
+    append_jsonl_file,
+    load_recent_turns,
+    segmented_log_for,
+)
+
+
+# ── helpers ──────────────────────────────────────────────────────────
+
+
+def _fill(path: Path, count: int, *, max_lines: int | None = None, start: int = 0) -> None:
+    for index in range(start, start + count):
+        append_jsonl(path, {"i": index}, max_lines=max_lines)
+
+
+def _indices(path: Path, limit: int) -> list[int]:
+    return [turn["i"] for turn in load_recent_turns(path, limit=limit)]
+
+
+def _manifest(path: Path) -> dict:
+    return json.loads((path.parent / (path.name + ".segments") / "manifest.json").read_text(encoding="utf-8"))
+
+
+# ── 1. appends and retention ─────────────────────────────────────────
+
+
+class TestAppendAndRetention:
+    def test_appends_rotate_into_fixed_size_segments(self, tmp_path: Path) -> None:
+        path = tmp_path / "memory.jsonl"
+        _fill(path, 90, max_lines=64)
+
+        manifest = _manifest(path)
+        assert {segment["lines"] for segment in manifest["segments"]} == {16}
+        assert len(path.read_text(encoding="utf-8").splitlines()) == 10
+        assert 64 <= segmented_log_for(path).total_lines < 80
+
+    def test_retention_drops_whole_segments_oldest_first(self, tmp_path: Path) -> None:
+        path = tmp_path / "memory.jsonl"
+        _fill(path, 205, max_lines=64)
+
+        log = segmented_log_for(path)
+        names = [segment["name"] for segment in _manifest(path)["segments"]]
+        assert names == sorted(names)
+        assert sorted(child.name for child in log.segment_dir.glob("*.jsonl")) == names
+        assert _indices(path, 64) == list(range(141, 205))
+
+    def test_without_a_cap_nothing_is_dropped(self, tmp_path: Path) -> None:
+        path = tmp_path / "trace.jsonl"
+        _fill(path, 50)
+
+        assert segmented_log_for(path).total_lines == 50
+        assert _indices(path, 100) == list(range(50))
+
+
+# ── 2. tail reads ────────────────────────────────────────────────────
+
+
+class TestTailReads:
+    def test_tail_spans_segments_in_order(self, tmp_path: Path) -> None:
+        path = tmp_path / "memory.jsonl"
+        _fill(path, 73, max_lines=400)
+
+        assert _indices(path, 5) == [68, 69, 70, 71, 72]
+        assert _indices(path, 30) == list(range(43, 73))
+        assert _indices(path, 1000) == list(range(73))
+        assert load_recent_turns(path, limit=0) == []
+
+    def test_tail_handles_lines_across_block_boundaries(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(storage, "_TAIL_BLOCK", 7)
+        path = tmp_path / "memory.jsonl"
+        for index in range(20):
+            append_jsonl(path, {"i": index, "pad": "x" * (index * 3)})
+
+        assert _indices(path, 6) == list(range(14, 20))
+
+    def test_missing_log_reads_empty(self, tmp_path: Path) -> None:
+        assert load_recent_turns(tmp_path / "absent.jsonl", limit=10) == []
+
+    def test_unparseable_lines_are_skipped(self, tmp_path: Path) -> None:
+        path = tmp_path / "memory.jsonl"
+        path.write_text('{"i": 0}\nnot json\n{"i": 2}\n', encoding="utf-8")
+
+        assert _indices(path, 3) == [0, 2]
+
+
+# ── 3. migration and recovery ────────────────────────────────────────
+
+
+class TestMigration:
+    def test_legacy_file_is_read_in_place_and_split_on_next_append(self, tmp_path: Path) -> None:
+        path = tmp_path / "memory.jsonl"
+        path.write_text("".join(json.dumps({"i": index}) + "\n" for index in range(1000)), encoding="utf-8")
+
+        assert _indices(path, 3) == [997, 998, 999]
+        append_jsonl(path, {"i": 1000}, max_lines=100)
+
+        assert 100 <= segmented_log_for(path).total_lines < 125
+        assert _indices(path, 100) == list(range(901, 1001))
+        assert len(path.read_text(encoding="utf-8").splitlines()) < 25
+
+    def test_manifest_is_reconciled_after_an_interrupted_rotation(self, tmp_path: Path) -> None:
+        path = tmp_path / "memory.jsonl"
+        _fill(path, 30, max_lines=64)
+        segment_dir = segmented_log_for(path).segment_dir
+        manifest = _manifest(path)
+        manifest["segments"].append({"name": "99999999.jsonl", "lines": 10})
+        (segment_dir / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+        (segment_dir / "orphan.jsonl").write_text('{"i": -1}\n', encoding="utf-8")
+
+        reopened = SegmentedJsonlLog(path)
+
+        assert [segment["name"] for segment in reopened._segments] == [item["name"] for item in manifest["segments"][:-1]]
+        assert not (segment_dir / "orphan.jsonl").exists()
+        assert [json.loads(line)["i"] for line in reopened.tail(30)] == list(range(30))
+
+    def test_external_truncation_and_removal_are_noticed(self, tmp_path: Path) -> None:
+        path = tmp_path / "state" / "memory.jsonl"
+        _fill(path, 25, max_lines=64)
+        log = segmented_log_for(path)
+        path.write_text("", encoding="utf-8")
+        assert log.total_lines == 16
+
+        shutil.rmtree(path.parent)
+        _fill(path, 3, max_lines=64, start=100)
+        assert _indices(path, 10) == [100, 101, 102]
+
+
+# ── 4. chat state ────────────────────────────────────────────────────
+
+
+class TestChatStateLog:
+    def test_persisted_turns_reload_and_fresh_session_wipes_every_segment(self, tmp_path: Path) -> None:
+        path = tmp_path / "state" / "memory.jsonl"
+        chat = ChatState(memory_path=path, history_limit=40)
+        for index in range(60):
+            chat.persist_turn("user", f"turn {index}")
+
+        reloaded = ChatState(memory_path=path)
+        reloaded.load_recent_memory(limit=3)
+        assert [message["content"] for message in reloaded.messages] == ["turn 57", "turn 58", "turn 59"]
+
+        chat.new_session()
+        assert load_recent_turns(path, limit=50) == []
+        assert not segmented_log_for(path).segment_dir.exists()
+
+
+# ── 5. plain trace file ──────────────────────────────────────────────
+
+
+class TestPlainTraceFile:
+    def test_trace_stays_one_capped_file_without_segments(self, tmp_path: Path) -> None:
+        path = tmp_path / "debug" / "langgraph_trace.jsonl"
+        for index in range(40):
+            append_jsonl_file(path, {"i": index}, max_lines=16)
+
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line)["i"] for line in lines] == list(range(24, 40))
+        assert not (path.parent / (path.name + ".segments")).exists()
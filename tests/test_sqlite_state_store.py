@@ -0,0 +1,209 @@
+"""Guard tests for the SQLite backend of the JsonDictStore family.
+
+These tests require no services. Every database lives in tmp_path and the
+same store API is exercised against both backends.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from memory.sqlite_store import SqliteStateDatabase, state_database_for
+from memory.state_owner import SharedStateOwner
+from memory.stores import (
+    EventStore,
+    IntentStateStore,
+    KnowledgeStore,
+    SituationalStateStore,
+    TaskStore,
+    WorldModelStore,
+)
+
+
+# ── helpers ──────────────────────────────────────────────────────────
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def backend(request: pytest.FixtureRequest) -> str:
+    return request.param
+
+
+def _store(cls, tmp_path: Path, backend: str, name: str):
+    database = SqliteStateDatabase(tmp_path / "state.sqlite3") if backend == "sqlite" else None
+    return cls(tmp_path / name, database=database)
+
+
+def _write_json(path: Path, data: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+# ── 1. API parity ────────────────────────────────────────────────────
+
+
+class TestStoreApiParity:
+    def test_task_store_round_trip(self, tmp_path: Path, backend: str) -> None:
+        store = _store(TaskStore, tmp_path, backend, "tasks.json")
+        store.add("laundry")
+        store.add("dishes")
+        store.add("taxes", status="done")
+        store.add("laundry", status="pending")
+
+        assert store.pending_names() == ["laundry", "dishes"]
+        assert store.pop("dishes") == "pending"
+        assert store.pop("dishes") is None
+        assert store.remove("taxes") is True
+        assert store.remove("taxes") is False
+        assert store.as_structured() == [{"name": "laundry", "status": "pending"}]
+
+    def test_event_store_keeps_time_on_date_change(self, tmp_path: Path, backend: str) -> None:
+        store = _store(EventStore, tmp_path, backend, "events.json")
+        store.add("dentist", "2099-01-02", "09:30")
+        store.add("dentist", "2099-01-03")
+        store.add("party", "2000-01-01")
+
+        assert store.upcoming() == [{"name": "dentist", "date": "2099-01-03", "time": "09:30"}]
+        assert store.cleanup_old_events() == 1
+        assert list(store.load()) == ["dentist"]
+
+    def test_knowledge_transient_prefix_gets_ttl(self, tmp_path: Path, backend: str) -> None:
+        store = _store(KnowledgeStore, tmp_path, backend, "knowledge.json")
+        store.upsert_value("favorite_color", "blue")
+        store.upsert_value("current_project", "piper")
+
+        active = store.load_active()
+        assert active["favorite_color"]["expires_at"] is None
+        assert active["current_project"]["expires_at"] is not None
+
+    def test_structured_entries_and_world_model(self, tmp_path: Path, backend: str) -> None:
+        situational = _store(SituationalStateStore, tmp_path, backend, "situational_state.json")
+        situational.upsert_entry("mood", {"value": "tired", "expires_at": None})
+        world = _store(WorldModelStore, tmp_path, backend, "world_model.json")
+        graph = world.load_graph()
+        graph["nodes"]["person:user"]["attributes"]["name"] = "Sam"
+        world.save_graph(graph)
+
+        assert situational.load_payload()["entries"]["mood"]["value"] == "tired"
+        assert world.load_graph()["nodes"]["person:user"]["attributes"] == {"name": "Sam"}
+
+    def test_stored_null_is_not_a_missing_key(self, tmp_path: Path, backend: str) -> None:
+        store = _store(TaskStore, tmp_path, backend, "tasks.json")
+        store.put_item("cleared", None)
+
+        assert store.get_item("cleared", "absent") is None
+        assert store.get_item("never-set", "absent") == "absent"
+        assert store.delete_item("cleared") is True
+        assert store.get_item("cleared", "absent") == "absent"
+
+    def test_read_modify_write_reads_and_writes_the_json_file_once(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        events = _store(EventStore, tmp_path, "json", "events.json")
+        knowledge = _store(KnowledgeStore, tmp_path, "json", "knowledge.json")
+        events.add("dentist", "2099-01-02", "09:30")
+        knowledge.upsert_value("current_project", "piper")
+        calls: list[str] = []
+        for store in (events, knowledge):
+            for name in ("load", "save"):
+                original = getattr(store, name)
+                monkeypatch.setattr(
+                    store, name, lambda *args, _name=name, _fn=original: calls.append(_name) or _fn(*args)
+                )
+
+        events.add("dentist", "2099-01-03")
+        knowledge.upsert_value("current_project", "piper v2")
+
+        assert calls == ["load", "save", "load", "save"]
+        assert events.get_item("dentist") == {"date": "2099-01-03", "time": "09:30"}
+        assert knowledge.get_item("current_project")["expires_at"] is not None
+        assert store.delete_item("cleared") is False
+
+
+# ── 2. SQLite rows ───────────────────────────────────────────────────
+
+
+class TestSqliteRows:
+    def test_save_rewrites_only_changed_rows(self, tmp_path: Path) -> None:
+        database = SqliteStateDatabase(tmp_path / "state.sqlite3")
+        store = IntentStateStore(tmp_path / "intent_state.json", database=database)
+        payload = store.default_payload()
+        payload["entries"] = {f"k{index}": {"value": str(index), "expires_at": None} for index in range(50)}
+        store.save(payload)
+
+        payload["entries"]["k7"]["value"] = "changed"
+        assert database.replace(store.store_name, payload, store.ROW_SECTIONS) == 1
+        assert store.load()["entries"]["k7"]["value"] == "changed"
+
+    def test_revision_invalidates_other_instances_cache(self, tmp_path: Path) -> None:
+        database = SqliteStateDatabase(tmp_path / "state.sqlite3")
+        first = SituationalStateStore(tmp_path / "situational_state.json", database=database)
+        second = SituationalStateStore(tmp_path / "situational_state.json", database=database)
+        first.upsert_entry("a", {"value": "one", "expires_at": None})
+        assert list(second.load_active_entries()) == ["a"]
+
+        first.upsert_entry("b", {"value": "two", "expires_at": None})
+        assert sorted(second.load_active_entries()) == ["a", "b"]
+
+    def test_concurrent_writers_do_not_lose_updates(self, tmp_path: Path) -> None:
+        database = SqliteStateDatabase(tmp_path / "state.sqlite3")
+        store = TaskStore(tmp_path / "tasks.json", database=database)
+
+        def worker(offset: int) -> None:
+            for index in range(25):
+                store.add(f"task-{offset}-{index}")
+
+        threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(store.load()) == 100
+
+    def test_failed_mutation_rolls_back(self, tmp_path: Path) -> None:
+        store = TaskStore(tmp_path / "tasks.json", database=SqliteStateDatabase(tmp_path / "state.sqlite3"))
+        store.add("keep")
+        with pytest.raises(RuntimeError):
+            with store.mutation():
+                store.add("discard")
+                raise RuntimeError("boom")
+
+        assert list(store.load()) == ["keep"]
+
+
+# ── 3. legacy import ─────────────────────────────────────────────────
+
+
+class TestLegacyImport:
+    def test_json_is_imported_once_and_left_untouched(self, tmp_path: Path) -> None:
+        path = tmp_path / "tasks.json"
+        _write_json(path, {"laundry": "pending"})
+        database = SqliteStateDatabase(tmp_path / "state.sqlite3")
+        store = TaskStore(path, database=database)
+
+        assert store.load() == {"laundry": "pending"}
+        store.remove("laundry")
+        assert TaskStore(path, database=database).load() == {}
+        assert json.loads(path.read_text(encoding="utf-8")) == {"laundry": "pending"}
+
+    def test_corrupt_primary_falls_back_to_backup(self, tmp_path: Path) -> None:
+        path = tmp_path / "knowledge.json"
+        path.write_text("{not json", encoding="utf-8")
+        _write_json(tmp_path / "knowledge.json.bak", {"name": {"value": "Sam", "expires_at": None}})
+        store = KnowledgeStore(path, database=SqliteStateDatabase(tmp_path / "state.sqlite3"))
+
+        assert store.load_active()["name"]["value"] == "Sam"
+
+    def test_shared_owner_uses_one_database(self, tmp_path: Path) -> None:
+        owner = SharedStateOwner.for_data_dir(tmp_path, backend="sqlite")
+        owner.task_store.add("laundry")
+        owner.world_model_store.save_graph(owner.world_model_store.load_graph())
+
+        assert owner.task_store.database is owner.world_model_store.database
+        assert owner.task_store.database is state_database_for(owner.task_store.database.path)
+        assert owner.task_store.backend == "sqlite"
+        assert not owner.task_store.path.exists()
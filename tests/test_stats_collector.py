@@ -332,3 +332,170 @@ class TestStartup:
         # clean up so other tests are not affected
         resolved = str(stats_path.resolve())
         sc_module._STARTUP_CHECKED_PATHS.discard(resolved)
+
+
+# ── 10. rolling aggregator ───────────────────────────────────────────
+
+
+def _synthetic(kind: str, count: int, seed: int = 11) -> list[float]:
+    import random
+
+    rng = random.Random(seed)
+    if kind == "lognormal":
+        return [rng.lognormvariate(6.0, 0.8) for _ in range(count)]
+    if kind == "bimodal":
+        return [rng.gauss(120.0, 10.0) if rng.random() < 0.8 else rng.gauss(2400.0, 300.0) for _ in range(count)]
+    return [rng.uniform(1.0, 5000.0) for _ in range(count)]
+
+
+def _lower_rank_value(values: list[float], percentile: float) -> float:
+    ordered = sorted(values)
+    return ordered[int((len(ordered) - 1) * percentile / 100.0)]
+
+
+class TestQuantileSketch:
+    @pytest.mark.parametrize("kind", ["lognormal", "bimodal", "uniform"])
+    def test_quantiles_within_relative_accuracy(self, kind: str) -> None:
+        from core.services.stats_aggregator import QuantileSketch
+
+        values = _synthetic(kind, 20_000)
+        sketch = QuantileSketch(0.01)
+        for value in values:
+            sketch.add(value)
+
+        for percentile in (50, 95, 99):
+            exact = _lower_rank_value(values, percentile)
+            assert sketch.quantile(percentile) == pytest.approx(exact, rel=0.0101)
+        assert sketch.mean() == pytest.approx(sum(values) / len(values))
+
+    def test_remove_restores_previous_distribution(self) -> None:
+        from core.services.stats_aggregator import QuantileSketch
+
+        base = _synthetic("lognormal", 500)
+        extra = _synthetic("uniform", 200, seed=3)
+        reference = QuantileSketch()
+        sketch = QuantileSketch()
+        for value in base:
+            reference.add(value)
+            sketch.add(value)
+        for value in extra:
+            sketch.add(value)
+        for value in extra:
+            sketch.remove(value)
+
+        assert sketch.buckets == reference.buckets
+        assert sketch.count == reference.count
+
+    def test_round_trips_through_dict(self) -> None:
+        from core.services.stats_aggregator import QuantileSketch
+
+        sketch = QuantileSketch()
+        for value in (0.0, 1.5, 20.0, 300.0):
+            sketch.add(value)
+        restored = QuantileSketch.from_dict(json.loads(json.dumps(sketch.to_dict())))
+
+        assert restored.summary() == sketch.summary()
+
+
+class TestStatsAggregator:
+    def _record(self, collector: StatsCollector, total_ms: float, *, decision: str = "CHAT", model: str = "m1") -> None:
+        state = _make_state(total_ms=total_ms)
+        state.decision = decision
+        state.model = model
+        collector.record_turn(state)
+
+    def test_rolling_window_matches_exact_tail_percentiles(self, tmp_path: Path) -> None:
+        collector = StatsCollector(tmp_path / "stats.jsonl", tmp_path / "alerts.log", history_limit=50)
+        values = _synthetic("lognormal", 140)
+        for value in values:
+            self._record(collector, value)
+
+        sketch = collector.aggregator().sketch("total")
+        window = [round(value, 3) for value in values[-50:]]
+        assert sketch.count == 50
+        assert sketch.quantile(95) == pytest.approx(_lower_rank_value(window, 95), rel=0.011)
+        assert len(collector.load_records()) == 50
+
+    def test_percentiles_are_grouped_by_route_and_model(self, tmp_path: Path) -> None:
+        collector = StatsCollector(tmp_path / "stats.jsonl", tmp_path / "alerts.log")
+        for _ in range(5):
+            self._record(collector, 100.0, decision="CHAT", model="small")
+            self._record(collector, 900.0, decision="SEARCH", model="big")
+
+        table = collector.build_dashboard_snapshot()["percentiles"]
+        assert table["route"]["CHAT"]["total"]["p50"] == pytest.approx(100.0, rel=0.011)
+        assert table["route"]["SEARCH"]["total"]["p99"] == pytest.approx(900.0, rel=0.011)
+        assert table["model"]["big"]["total"]["count"] == 5
+        assert table["all"]["total"]["count"] == 10
+
+    def test_throughput_and_first_audio_are_derived(self, tmp_path: Path) -> None:
+        collector = StatsCollector(tmp_path / "stats.jsonl", tmp_path / "alerts.log")
+        state = _make_state(persona_ms=2000.0, total_ms=2500.0)
+        state.persona_tokens = 120
+        collector.note_tts_metrics(state, [{"tts_ms": 10.0, "tts_first_audio_ms": 350.0, "stream_chunks": 80}])
+        collector.record_turn(state)
+
+        table = collector.aggregator().percentile_table()["all"]
+        assert table["persona_tokens_per_s"]["p50"] == pytest.approx(60.0, rel=0.011)
+        assert table["persona_chunks_per_s"]["p50"] == pytest.approx(40.0, rel=0.011)
+        assert table["tts_first_audio_ms"]["p50"] == pytest.approx(350.0, rel=0.011)
+        assert "tts first audio" in collector.build_readonly_report()
+
+    def test_stream_chunks_are_not_counted_as_persona_tokens(self, tmp_path: Path) -> None:
+        collector = StatsCollector(tmp_path / "stats.jsonl", tmp_path / "alerts.log")
+        state = _make_state(persona_ms=2000.0, total_ms=2500.0)
+        collector.note_tts_metrics(state, [{"stream_chunks": 50}, {"stream_chunks": 30}])
+        collector.record_turn(state)
+
+        assert state.persona_tokens is None
+        assert state.persona_chunks == 80
+        table = collector.aggregator().percentile_table()["all"]
+        assert "persona_tokens_per_s" not in table
+        assert table["persona_chunks_per_s"]["p50"] == pytest.approx(40.0, rel=0.011)
+        assert "chunks/s" in collector.build_readonly_report()
+
+    def test_dashboard_refresh_reuses_snapshot_without_reading_stats(self, tmp_path: Path, monkeypatch) -> None:
+        collector = StatsCollector(tmp_path / "stats.jsonl", tmp_path / "alerts.log")
+        for _ in range(3):
+            self._record(collector, 200.0)
+        first = collector.build_dashboard_snapshot()
+        monkeypatch.setattr(collector, "load_records", lambda **_: pytest.fail("stats.jsonl re-read"))
+
+        assert collector.build_dashboard_snapshot() == first
+        self._record(collector, 400.0)
+        assert collector.build_dashboard_snapshot()["record_count"] == 4
+
+    def test_checkpoint_restores_without_replaying_history(self, tmp_path: Path, monkeypatch) -> None:
+        from core.services import stats_collector as sc_module
+        from core.services.stats_aggregator import StatsAggregator
+
+        stats_path = tmp_path / "stats.jsonl"
+        collector = StatsCollector(stats_path, tmp_path / "alerts.log", checkpoint_every=5)
+        for index in range(12):
+            self._record(collector, 100.0 + index)
+        expected = collector.aggregator().percentile_table()
+
+        replayed: list[int] = []
+        original = StatsAggregator._consume_from
+
+        def _counting(self, offset: int) -> None:
+            replayed.append(offset)
+            original(self, offset)
+
+        monkeypatch.setattr(StatsAggregator, "_consume_from", _counting)
+        monkeypatch.setattr(sc_module, "_AGGREGATORS", {})
+        restored = StatsCollector(stats_path, tmp_path / "alerts.log")
+
+        assert restored.aggregator().percentile_table() == expected
+        assert replayed and all(offset > 0 for offset in replayed)
+
+    def test_external_append_is_consumed_incrementally(self, tmp_path: Path) -> None:
+        stats_path = tmp_path / "stats.jsonl"
+        collector = StatsCollector(stats_path, tmp_path / "alerts.log")
+        self._record(collector, 100.0)
+        with stats_path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps({"decision": "TASK", "phase_ms": {"total": 700.0}}) + "\n")
+
+        snapshot = collector.build_dashboard_snapshot()
+        assert snapshot["record_count"] == 2
+        assert snapshot["percentiles"]["route"]["TASK"]["total"]["count"] == 1
@@ -0,0 +1,221 @@
+"""Guard tests for turn span tracing and the Chrome trace exporter.
+
+These tests require no LLM. Traces are written to tmp_path and the stubbed
+llama-server stream is an in-memory SSE body.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from config import CFG
+from core import tracing
+from core.services.stats_collector import StatsCollector
+
+
+# ── helpers ──────────────────────────────────────────────────────────
+
+
+@pytest.fixture
+def trace_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    directory = tmp_path / "traces"
+    monkeypatch.setattr(CFG, "TRACE_ENABLED", True, raising=False)
+    monkeypatch.setattr(CFG, "TRACE_SAMPLE_RATE", 1.0, raising=False)
+    monkeypatch.setattr(CFG, "TRACE_TAIL_S", 0.0, raising=False)
+    monkeypatch.setattr(CFG, "TRACE_MAX_FILES", 50, raising=False)
+    monkeypatch.setattr(CFG, "TRACE_DIR", directory, raising=False)
+    monkeypatch.setattr(tracing, "_EXPORTERS", {})
+    return directory
+
+
+def _events(path: Path) -> list[dict]:
+    return json.loads(path.read_text(encoding="utf-8"))["traceEvents"]
+
+
+def _spans(path: Path) -> dict[str, dict]:
+    return {event["name"]: event for event in _events(path) if event.get("ph") == "X"}
+
+
+def _exported(directory: Path) -> list[Path]:
+    return sorted(directory.glob("turn-*.trace.json"))
+
+
+class _SseResponse(io.BytesIO):
+    def __init__(self, deltas: list[str]) -> None:
+        lines = [
+            f"data: {json.dumps({'choices': [{'delta': {'content': delta}}]})}\n".encode("utf-8")
+            for delta in deltas
+        ]
+        super().__init__(b"".join(lines) + b"data: [DONE]\n")
+
+    def __enter__(self) -> "_SseResponse":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+# ── 1. recording ─────────────────────────────────────────────────────
+
+
+class TestSpans:
+    def test_disabled_tracing_returns_shared_noop(self, trace_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(CFG, "TRACE_ENABLED", False, raising=False)
+
+        assert tracing.start_turn("t1") is None
+        assert tracing.span("anything") is tracing.NOOP_SPAN
+        assert tracing.wrap(len) is len
+
+    def test_sampling_skips_turns(self, trace_dir: Path) -> None:
+        assert tracing.start_turn("t1", sample_rate=0.0) is None
+        assert tracing.span("anything") is tracing.NOOP_SPAN
+
+    def test_nested_spans_are_exported_in_chrome_format(self, trace_dir: Path) -> None:
+        trace = tracing.start_turn("t1")
+        with tracing.span("outer", cat="test", step=1):
+            with tracing.span("inner", cat="test") as inner:
+                inner.set(items=3)
+            tracing.instant("marker", cat="test")
+        tracing.finish_turn(trace, decision="CHAT")
+
+        files = _exported(trace_dir)
+        assert len(files) == 1
+        spans = _spans(files[0])
+        outer, inner = spans["outer"], spans["inner"]
+        assert inner["ts"] >= outer["ts"]
+        assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"] + 0.01
+        assert inner["args"] == {"items": 3}
+        assert spans["turn"]["args"]["decision"] == "CHAT"
+        assert any(event["ph"] == "i" and event["name"] == "marker" for event in _events(files[0]))
+        assert any(event["ph"] == "M" and event["name"] == "thread_name" for event in _events(files[0]))
+        assert tracing.current_trace() is None
+
+    def test_failed_span_records_error(self, trace_dir: Path) -> None:
+        trace = tracing.start_turn("t1")
+        with pytest.raises(ValueError):
+            with tracing.span("boom"):
+                raise ValueError("bad")
+        tracing.finish_turn(trace)
+
+        assert _spans(_exported(trace_dir)[0])["boom"]["args"] == {"error": "ValueError"}
+
+    def test_wrapped_worker_thread_joins_the_turn(self, trace_dir: Path) -> None:
+        trace = tracing.start_turn("t1")
+
+        def _work() -> None:
+            with tracing.span("worker"):
+                time.sleep(0.001)
+
+        thread = threading.Thread(target=tracing.wrap(_work), name="trace-worker")
+        thread.start()
+        thread.join()
+        bare = threading.Thread(target=_work)
+        bare.start()
+        bare.join()
+        tracing.finish_turn(trace)
+
+        events = _events(_exported(trace_dir)[0])
+        workers = [event for event in events if event.get("name") == "worker"]
+        assert len(workers) == 1
+        names = {event["args"]["name"] for event in events if event.get("name") == "thread_name"}
+        assert "trace-worker" in names
+
+
+# ── 2. turn lifecycle ────────────────────────────────────────────────
+
+
+class TestTurnLifecycle:
+    def test_stats_collector_traces_phases_and_exports_on_record(self, trace_dir: Path, tmp_path: Path) -> None:
+        collector = StatsCollector(tmp_path / "stats.jsonl", tmp_path / "alerts.log")
+        state = collector.resume_or_start_turn()
+        collector.start_phase(state, "route")
+        with tracing.span("route.normalize", cat="route"):
+            pass
+        collector.end_phase(state, "route")
+        collector.record_turn(state)
+
+        spans = _spans(_exported(trace_dir)[0])
+        assert {"phase.route", "route.normalize", "turn"} <= set(spans)
+        assert state.trace is None
+
+    def test_tail_keeps_trace_open_for_late_tts_spans(self, trace_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(CFG, "TRACE_TAIL_S", 60.0, raising=False)
+        trace = tracing.start_turn("t1")
+        tracing.finish_turn(trace)
+        with tracing.span("tts.synth", cat="tts", trace=tracing.active_turn()):
+            pass
+        assert _exported(trace_dir) == []
+
+        tracing.start_turn("t2", sample_rate=0.0)
+        assert "tts.synth" in _spans(_exported(trace_dir)[0])
+
+    def test_exporter_keeps_newest_files(self, trace_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(CFG, "TRACE_MAX_FILES", 3, raising=False)
+        for index in range(5):
+            tracing.finish_turn(tracing.start_turn(f"t{index}"))
+
+        files = _exported(trace_dir)
+        assert len(files) == 3
+        turn_ids = [json.loads(path.read_text(encoding="utf-8"))["otherData"]["turn_id"] for path in files]
+        assert turn_ids == ["t2", "t3", "t4"]
+
+    def test_event_cap_counts_dropped_events(self, trace_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(CFG, "TRACE_MAX_EVENTS", 3, raising=False)
+        trace = tracing.start_turn("t1")
+        for _ in range(5):
+            tracing.instant("tick")
+        tracing.finish_turn(trace)
+
+        payload = json.loads(_exported(trace_dir)[0].read_text(encoding="utf-8"))
+        assert payload["otherData"]["dropped_events"] == 3
+
+
+# ── 3. LLM request spans ─────────────────────────────────────────────
+
+
+class TestLlmRequestSpans:
+    def test_stream_records_queue_prefill_and_decode(self, trace_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        from llm import llm_server_client
+        from llm.llm_server_client import LlamaServerClient, LlamaServerConfig
+
+        monkeypatch.setattr(
+            llm_server_client.urllib.request,
+            "urlopen",
+            lambda *args, **kwargs: _SseResponse(["Hel", "lo", "!"]),
+        )
+        client = LlamaServerClient(LlamaServerConfig(base_url="http://stub", model="stub"))
+        trace = tracing.start_turn("t1")
+        assert client.generate([{"role": "user", "content": "hi"}]) == "Hello!"
+        tracing.finish_turn(trace)
+
+        spans = _spans(_exported(trace_dir)[0])
+        assert {"llm.request", "llm.queue_wait", "llm.prefill", "llm.decode"} <= set(spans)
+        assert spans["llm.request"]["args"]["chunks"] == 3
+        assert spans["llm.decode"]["args"]["chunks"] == 3
+        assert spans["llm.request"]["args"]["ttft_ms"] is not None
+
+    def test_request_span_ends_when_the_lock_wait_is_cancelled(self, trace_dir: Path) -> None:
+        from core.runtime_control import CancellationToken, OperationCancelled
+        from llm.llm_server_client import LlamaServerClient, LlamaServerConfig
+
+        client = LlamaServerClient(LlamaServerConfig(base_url="http://stub", model="stub"))
+        token = CancellationToken()
+        client._request_lock.acquire()
+        threading.Timer(0.05, token.cancel).start()
+        trace = tracing.start_turn("t1")
+        try:
+            with pytest.raises(OperationCancelled):
+                client.generate([{"role": "user", "content": "hi"}], cancel_token=token)
+        finally:
+            client._request_lock.release()
+        tracing.finish_turn(trace)
+
+        spans = _spans(_exported(trace_dir)[0])
+        assert spans["llm.request"]["args"]["error"] == "OperationCancelled"
+        assert "llm.queue_wait" not in spans
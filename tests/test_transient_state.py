@@ -0,0 +1,224 @@
+"""Guard tests for the in-memory transient state stores.
+
+These tests require no LLM. Stores live in tmp_path and disk traffic is
+counted by wrapping the JsonDictStore read/write primitives.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import memory.transient_state as transient_module
+from memory.stores import IntentStateStore, JsonDictStore, SituationalStateStore
+from memory.transient_state import TransientStateManager
+
+
+# ── helpers ──────────────────────────────────────────────────────────
+
+
+class _DiskOps:
+    def __init__(self) -> None:
+        self.reads: list[str] = []
+        self.writes: list[str] = []
+
+
+@pytest.fixture
+def disk_ops(monkeypatch: pytest.MonkeyPatch) -> _DiskOps:
+    ops = _DiskOps()
+    original_read = JsonDictStore._load_dict_file
+    original_write = JsonDictStore._atomic_write_text
+
+    def _read(self, path):
+        ops.reads.append(Path(path).name)
+        return original_read(self, path)
+
+    def _write(self, path, text):
+        ops.writes.append(Path(path).name)
+        return original_write(self, path, text)
+
+    monkeypatch.setattr(JsonDictStore, "_load_dict_file", _read)
+    monkeypatch.setattr(JsonDictStore, "_atomic_write_text", _write)
+    return ops
+
+
+@pytest.fixture(autouse=True)
+def _fresh_migration_registry(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(transient_module, "_LEGACY_MIGRATED", set())
+
+
+class _Store:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+
+class _LegacyKnowledge:
+    def __init__(self, path: Path, legacy: list[dict[str, Any]] | None = None) -> None:
+        self.store = _Store(path)
+        self.legacy = list(legacy or [])
+        self.drain_calls = 0
+        self.facts: list[tuple[str, str]] = []
+
+    def drain_legacy_situational_entries(self) -> list[dict[str, Any]]:
+        self.drain_calls += 1
+        drained, self.legacy = self.legacy, []
+        return drained
+
+    def upsert_fact(self, attribute: str, value: str) -> None:
+        self.facts.append((attribute, value))
+
+
+def _entry(value: str, *, expires_in: int | None) -> dict[str, Any]:
+    now_ts = int(time.time())
+    return {
+        "kind": "test",
+        "label": "Test",
+        "value": value,
+        "updated_at": now_ts,
+        "expires_at": None if expires_in is None else now_ts + expires_in,
+    }
+
+
+def _manager(tmp_path: Path, knowledge: _LegacyKnowledge | None = None) -> TransientStateManager:
+    return TransientStateManager(
+        situational_store=SituationalStateStore(tmp_path / "situational_state.json"),
+        intent_store=IntentStateStore(tmp_path / "intent_state.json"),
+        knowledge_mgr=knowledge,
+    )
+
+
+# ── 1. expiry index ──────────────────────────────────────────────────
+
+
+class TestExpiryIndex:
+    def test_prune_removes_only_expired_entries(self, tmp_path: Path) -> None:
+        store = SituationalStateStore(tmp_path / "situational_state.json")
+        store.upsert_entry("stale", _entry("old", expires_in=-5))
+        store.upsert_entry("fresh", _entry("new", expires_in=600))
+        store.upsert_entry("forever", _entry("always", expires_in=None))
+
+        assert store.prune_expired() == 1
+        assert sorted(store.load_active_entries()) == ["forever", "fresh"]
+        assert sorted(SituationalStateStore(store.path).load_payload()["entries"]) == ["forever", "fresh"]
+
+    def test_prune_without_due_entries_does_not_write(self, tmp_path: Path, disk_ops: _DiskOps) -> None:
+        store = SituationalStateStore(tmp_path / "situational_state.json")
+        with store.batch():
+            for index in range(200):
+                store.upsert_entry(f"k{index}", _entry(str(index), expires_in=600))
+        disk_ops.writes.clear()
+
+        assert store.prune_expired() == 0
+        assert disk_ops.writes == []
+
+    def test_reupsert_with_later_expiry_survives_stale_heap_item(self, tmp_path: Path) -> None:
+        store = SituationalStateStore(tmp_path / "situational_state.json")
+        store.upsert_entry("mood", _entry("tired", expires_in=-5))
+        store.upsert_entry("mood", _entry("rested", expires_in=600))
+
+        assert store.prune_expired() == 0
+        assert store.load_active_entries()["mood"]["value"] == "rested"
+
+    def test_load_active_hides_expired_without_writing(self, tmp_path: Path, disk_ops: _DiskOps) -> None:
+        store = SituationalStateStore(tmp_path / "situational_state.json")
+        store.upsert_entry("stale", _entry("old", expires_in=-5))
+        disk_ops.writes.clear()
+
+        assert store.load_active_entries() == {}
+        assert disk_ops.writes == []
+
+    def test_intent_default_ttl_is_indexed(self, tmp_path: Path) -> None:
+        store = IntentStateStore(tmp_path / "intent_state.json")
+        old = int(time.time()) - IntentStateStore.DEFAULT_TTL_SECONDS - 10
+        store.upsert_entry("stale", {"value": "old plan", "updated_at": old, "expires_at": None})
+        store.upsert_entry("fresh", {"value": "new plan", "updated_at": int(time.time()), "expires_at": None})
+
+        assert store.prune_expired() == 1
+        assert list(store.load_active_entries()) == ["fresh"]
+
+
+# ── 2. cache coherence ───────────────────────────────────────────────
+
+
+class TestCacheCoherence:
+    def test_repeat_reads_are_served_from_memory(self, tmp_path: Path, disk_ops: _DiskOps) -> None:
+        store = SituationalStateStore(tmp_path / "situational_state.json")
+        store.upsert_entry("a", _entry("one", expires_in=600))
+        disk_ops.reads.clear()
+
+        for _ in range(5):
+            store.load_active_entries()
+            store.prune_expired()
+
+        assert disk_ops.reads == []
+
+    def test_external_file_change_is_reloaded(self, tmp_path: Path) -> None:
+        store = SituationalStateStore(tmp_path / "situational_state.json")
+        store.upsert_entry("a", _entry("one", expires_in=600))
+        payload = json.loads(store.path.read_text(encoding="utf-8"))
+        payload["entries"]["b"] = _entry("two", expires_in=600)
+        store.path.write_text(json.dumps(payload) + "\n" * 4, encoding="utf-8")
+
+        assert sorted(store.load_active_entries()) == ["a", "b"]
+
+    def test_raw_save_payload_replaces_cached_state(self, tmp_path: Path) -> None:
+        store = SituationalStateStore(tmp_path / "situational_state.json")
+        store.upsert_entry("a", _entry("one", expires_in=600))
+        payload = store.default_payload()
+        payload["entries"] = {"b": _entry("two", expires_in=600)}
+        store.save_payload(payload)
+
+        assert list(store.load_active_entries()) == ["b"]
+
+
+# ── 3. write coalescing ──────────────────────────────────────────────
+
+
+class TestTurnBatching:
+    def test_ingest_writes_each_store_at_most_once(self, tmp_path: Path, disk_ops: _DiskOps) -> None:
+        manager = _manager(tmp_path)
+        manager.ingest_user_turn("We're watching Ironman.")
+        disk_ops.reads.clear()
+        disk_ops.writes.clear()
+
+        manager.ingest_user_turn("I'm hungry and tired.")
+        manager.ingest_user_turn("Maybe I should create a fuzzy words code.")
+        manager.render_situational_state("tired")
+        manager.render_intent_state("code")
+
+        assert disk_ops.reads == []
+        assert disk_ops.writes.count("situational_state.json") == 1
+        assert disk_ops.writes.count("intent_state.json") == 1
+        assert sorted(manager.list_situational_entries()) == ["activity:current", "state:hungry", "state:tired"]
+
+    def test_nested_batches_flush_once_on_outer_exit(self, tmp_path: Path, disk_ops: _DiskOps) -> None:
+        store = SituationalStateStore(tmp_path / "situational_state.json")
+        with store.batch():
+            store.upsert_entry("a", _entry("one", expires_in=600))
+            with store.batch():
+                store.upsert_entry("b", _entry("two", expires_in=600))
+            assert disk_ops.writes == []
+
+        assert disk_ops.writes.count("situational_state.json") == 1
+
+
+# ── 4. legacy migration ──────────────────────────────────────────────
+
+
+class TestLegacyMigration:
+    def test_drain_runs_once_per_world_model(self, tmp_path: Path) -> None:
+        knowledge = _LegacyKnowledge(
+            tmp_path / "world_model.json",
+            [{"key": "mood", "label": "Mood", "value": "sleepy", "expires_at": int(time.time()) + 600}],
+        )
+        manager = _manager(tmp_path, knowledge)
+        manager.ingest_user_turn("We're watching Ironman.")
+        manager.render_situational_state()
+        _manager(tmp_path, knowledge).list_situational_entries()
+
+        assert knowledge.drain_calls == 1
+        assert any(key.startswith("legacy:mood:") for key in manager.list_situational_entries())
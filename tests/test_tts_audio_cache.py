@@ -0,0 +1,269 @@
+"""Guard tests for the synthesized-speech audio cache.
+
+These tests require no audio device and no TTS model. Synthesis is a fake
+engine that counts calls; the disk tier lives in tmp_path.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from core.services.stats_collector import StatsCollector, TurnStatsState
+from tools.tts import TTS, TTSConfig
+from tools.tts_audio_cache import TTSAudioCache, audio_cache_key
+
+
+_SR = 24000
+
+
+# ── helpers ──────────────────────────────────────────────────────────
+
+
+def _key(text: str = "Systems online.", **overrides) -> str:
+    params = {"voice": "af_heart", "speed": 0.85, "backend": "default", "model_id": "onnx:a"}
+    params.update(overrides)
+    return audio_cache_key(text, **params)
+
+
+def _pcm(seconds: float = 0.1, value: float = 0.25) -> np.ndarray:
+    return np.full(int(_SR * seconds), value, dtype=np.float32)
+
+
+class _FakeEngine:
+    def __init__(self, delay_s: float = 0.0) -> None:
+        self.delay_s = delay_s
+        self.synth_calls: list[tuple[str, str | None, float | None]] = []
+        self.played: list[np.ndarray] = []
+
+    def synthesize(self, text: str, voice=None, speed=None):
+        self.synth_calls.append((text, voice, speed))
+        if self.delay_s:
+            time.sleep(self.delay_s)
+        return _pcm(0.05, value=len(text) / 1000.0), _SR
+
+    def play(self, samples, sr: int) -> None:
+        self.played.append(np.asarray(samples))
+
+    def list_voices(self) -> list[str]:
+        return ["af_heart"]
+
+
+class _GatedEngine(_FakeEngine):
+    """Thread-safe fake whose pre-synthesis blocks until the gate opens."""
+
+    parallel_synthesis = True
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.gate = threading.Event()
+        self.gated = threading.Event()
+
+    def synthesize(self, text: str, voice=None, speed=None):
+        if text.startswith("Background"):
+            self.gated.set()
+            self.gate.wait(5.0)
+        return super().synthesize(text, voice=voice, speed=speed)
+
+
+def _wait_for(predicate, timeout_s: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        if predicate():
+            return
+        time.sleep(0.01)
+    raise AssertionError("condition not reached in time")
+
+
+@pytest.fixture
+def tts_with_fake_engine(tmp_path: Path):
+    tts = TTS(TTSConfig(backend="kokoro", streaming_sink=False, audio_cache_dir=tmp_path / "tts_audio"))
+    engine = _FakeEngine(delay_s=0.01)
+    tts.engine = engine
+    yield tts, engine
+    tts.shutdown()
+
+
+# ── 1. keys ──────────────────────────────────────────────────────────
+
+
+class TestAudioCacheKey:
+    def test_whitespace_is_normalized(self) -> None:
+        assert _key("Systems  online.\n") == _key(" Systems online.")
+
+    @pytest.mark.parametrize(
+        "override",
+        [{"voice": "am_adam"}, {"speed": 1.0}, {"backend": "torch"}, {"model_id": "onnx:b"}],
+    )
+    def test_voice_speed_backend_and_model_are_part_of_the_key(self, override: dict) -> None:
+        assert _key(**override) != _key()
+
+    def test_case_and_punctuation_change_prosody_so_they_stay_distinct(self) -> None:
+        assert _key("Done.") != _key("Done!")
+
+
+# ── 2. memory tier ───────────────────────────────────────────────────
+
+
+class TestMemoryTier:
+    def test_lru_byte_bound_evicts_least_recently_used(self) -> None:
+        one = _pcm(0.1).nbytes
+        cache = TTSAudioCache(max_bytes=int(one * 2.5))
+        cache.put("a", _pcm(0.1), _SR, 10.0)
+        cache.put("b", _pcm(0.1), _SR, 10.0)
+        assert cache.get("a") is not None
+        cache.put("c", _pcm(0.1), _SR, 10.0)
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None and cache.get("c") is not None
+        assert cache.snapshot()["bytes"] <= int(one * 2.5)
+
+    def test_cached_audio_is_read_only_copy(self) -> None:
+        cache = TTSAudioCache()
+        source = _pcm()
+        cache.put("a", source, _SR, 5.0)
+        source[:] = 0.0
+        samples, sr = cache.get("a")
+
+        assert sr == _SR
+        assert float(samples[0]) == pytest.approx(0.25)
+        with pytest.raises(ValueError):
+            samples[0] = 1.0
+
+    def test_long_segments_are_not_cacheable(self) -> None:
+        cache = TTSAudioCache(max_chars=20)
+
+        assert cache.cacheable("Search complete.")
+        assert not cache.cacheable("This reply sentence is far too long to be worth caching.")
+        assert not TTSAudioCache(max_bytes=0).cacheable("Done.")
+
+    def test_metrics_report_hits_misses_and_saved_time(self) -> None:
+        cache = TTSAudioCache()
+        cache.get("a")
+        cache.put("a", _pcm(), _SR, 120.0)
+        cache.get("a")
+        cache.get("a")
+
+        assert cache.consume_metrics() == {"hits": 2, "misses": 1, "saved_ms": 240.0}
+        assert cache.consume_metrics() == {"hits": 0, "misses": 0, "saved_ms": 0.0}
+        assert cache.hit_ratio() == pytest.approx(2 / 3, abs=1e-3)
+
+
+# ── 3. disk tier ─────────────────────────────────────────────────────
+
+
+class TestDiskTier:
+    def test_entries_survive_a_restart_as_compressed_pcm(self, tmp_path: Path) -> None:
+        first = TTSAudioCache(tmp_path)
+        audio = np.sin(np.linspace(0.0, 200.0, _SR, dtype=np.float32)) * 0.5
+        first.put(_key(), audio, _SR, 80.0)
+        first.close()
+        files = list(tmp_path.glob("*.npz"))
+
+        assert len(files) == 1
+        assert files[0].stat().st_size < audio.nbytes / 2
+
+        second = TTSAudioCache(tmp_path)
+        samples, sr = second.get(_key())
+        assert sr == _SR
+        assert np.max(np.abs(samples - audio)) < 1e-4
+        assert second.stats["disk_hits"] == 1
+        assert second.stats["saved_ms"] == pytest.approx(80.0)
+
+    def test_corrupt_entry_is_dropped(self, tmp_path: Path) -> None:
+        (tmp_path / f"{_key()}.npz").write_bytes(b"not an archive")
+        cache = TTSAudioCache(tmp_path)
+
+        assert cache.get(_key()) is None
+        assert list(tmp_path.glob("*.npz")) == []
+
+    def test_disk_store_is_pruned_to_its_entry_bound(self, tmp_path: Path) -> None:
+        cache = TTSAudioCache(tmp_path, max_disk_entries=5)
+        for index in range(40):
+            cache.put(f"k{index:02d}", _pcm(0.01), _SR, 1.0)
+        cache.flush()
+        cache._prune()
+
+        assert len(list(tmp_path.glob("*.npz"))) == 5
+
+
+# ── 4. synth loop ────────────────────────────────────────────────────
+
+
+class TestSynthLoopCache:
+    def test_repeated_phrase_is_synthesized_once(self, tts_with_fake_engine) -> None:
+        tts, engine = tts_with_fake_engine
+        tts.speak("Search complete.")
+        _wait_for(lambda: len(engine.played) == 1)
+        tts.speak("Search complete.")
+        _wait_for(lambda: len(engine.played) == 2)
+
+        assert len(engine.synth_calls) == 1
+        assert np.array_equal(engine.played[0], engine.played[1])
+        metrics = tts.consume_playback_metrics()
+        assert metrics["cache_hits"] == 1 and metrics["cache_misses"] == 1
+        assert metrics["cache_saved_ms"] > 0.0
+
+    def test_voice_change_misses_the_cache(self, tts_with_fake_engine) -> None:
+        tts, engine = tts_with_fake_engine
+        tts.speak("Done.", voice="af_heart")
+        _wait_for(lambda: len(engine.played) == 1)
+        tts.speak("Done.", voice="am_adam")
+        _wait_for(lambda: len(engine.played) == 2)
+
+        assert [call[1] for call in engine.synth_calls] == ["af_heart", "am_adam"]
+
+    def test_presynthesized_phrases_play_without_synthesis(self, tts_with_fake_engine) -> None:
+        tts, engine = tts_with_fake_engine
+        assert tts.presynthesize(["Systems online.", "Status: Error", "x" * 500]) == 2
+        _wait_for(lambda: tts.audio_cache_stats()["stored"] == 2)
+        assert not tts.is_busy()
+
+        tts.speak("Systems online.")
+        _wait_for(lambda: len(engine.played) == 1)
+
+        assert len(engine.synth_calls) == 2
+        assert tts.audio_cache_stats()["memory_hits"] == 1
+
+    def test_presynthesis_waits_while_a_reply_is_streaming(self, tts_with_fake_engine) -> None:
+        tts, engine = tts_with_fake_engine
+        tts.stream_start()
+        assert tts.presynthesize(["One moment.", "Got it."]) == 2
+        time.sleep(0.3)
+        assert engine.synth_calls == []
+
+        tts.stream_push("Live answer.")
+        tts.stream_end()
+        _wait_for(lambda: tts.audio_cache_stats()["stored"] == 3)
+
+        assert engine.synth_calls[0][0] == "Live answer."
+
+    def test_thread_safe_engine_speaks_while_presynthesis_runs(self, tmp_path: Path) -> None:
+        tts = TTS(TTSConfig(backend="kokoro", streaming_sink=False, audio_cache_dir=tmp_path / "tts_audio"))
+        engine = _GatedEngine()
+        tts.engine = engine
+        try:
+            assert tts.presynthesize(["Background phrase."]) == 1
+            _wait_for(engine.gated.is_set)
+            tts.speak("Live answer.")
+            _wait_for(lambda: len(engine.played) == 1)
+
+            assert not engine.gate.is_set()
+            engine.gate.set()
+            _wait_for(lambda: tts.audio_cache_stats()["stored"] == 2)
+        finally:
+            engine.gate.set()
+            tts.shutdown()
+
+    def test_turn_stats_record_cache_counters(self) -> None:
+        state = TurnStatsState(turn_id="t1", timestamp="now", user_msg="hi", started_at_monotonic=time.monotonic())
+        StatsCollector.__new__(StatsCollector).note_tts_metrics(
+            state,
+            [{"tts_ms": 50.0, "tts_cache_hits": 2, "tts_cache_misses": 1, "tts_cache_saved_ms": 310.5}],
+        )
+
+        assert state.to_record()["tts_cache"] == {"hits": 2, "misses": 1, "saved_ms": 310.5}
@@ -0,0 +1,267 @@
+"""Guard tests for the gapless TTS playback sink.
+
+These tests require no audio device. The output stream is a fake whose
+callback is pumped by hand, so underruns and gaps are fully deterministic.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from core.pipeline import ChatPipeline
+from core.services.stats_collector import StatsCollector, TurnStatsState
+from tools.audio_sink import PcmRingBuffer, StreamingAudioSink
+from tools.tts import TTS, TTSConfig
+
+
+_SR = 1000
+
+
+# ── helpers ──────────────────────────────────────────────────────────
+
+
+class _FakeStream:
+    def __init__(self, sample_rate: int, callback) -> None:
+        self.sample_rate = sample_rate
+        self.callback = callback
+        self.started = False
+        self.closed = False
+
+    def start(self) -> None:
+        self.started = True
+
+    def stop(self) -> None:
+        self.started = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _make_sink(
+    *, crossfade_ms: float = 0.0, buffer_s: float = 2.0, stall_timeout_s: float = 1.0
+) -> tuple[StreamingAudioSink, list[_FakeStream]]:
+    streams: list[_FakeStream] = []
+
+    def factory(sample_rate: int, callback) -> _FakeStream:
+        streams.append(_FakeStream(sample_rate, callback))
+        return streams[-1]
+
+    sink = StreamingAudioSink(
+        _SR, buffer_s=buffer_s, crossfade_ms=crossfade_ms, stream_factory=factory, stall_timeout_s=stall_timeout_s
+    )
+    return sink, streams
+
+
+def _write_in_background(sink: StreamingAudioSink, samples: np.ndarray, outcome: list | None = None) -> threading.Thread:
+    results = outcome if outcome is not None else []
+    writer = threading.Thread(target=lambda: results.append(sink.write(samples, _SR)), daemon=True)
+    writer.start()
+    deadline = time.monotonic() + 2.0
+    while sink._ring.free() > 0 and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return writer
+
+
+def _pull(stream: _FakeStream, frames: int) -> np.ndarray:
+    out = np.full((frames, 1), 9.0, dtype=np.float32)
+    stream.callback(out, frames, None, None)
+    return out.reshape(-1)
+
+
+def _ramp(start: float, count: int) -> np.ndarray:
+    return (start + np.arange(count, dtype=np.float32)) / 1000.0
+
+
+# ── 1. ring buffer ───────────────────────────────────────────────────
+
+
+class TestPcmRingBuffer:
+    def test_wraparound_preserves_order(self) -> None:
+        ring = PcmRingBuffer(8)
+        out = np.zeros(5, dtype=np.float32)
+        ring.write(_ramp(0, 6))
+        ring.read_into(out)
+        assert ring.write(_ramp(6, 10)) == 7
+
+        tail = np.zeros(8, dtype=np.float32)
+        assert ring.read_into(tail) == 8
+        np.testing.assert_allclose(tail, _ramp(5, 8))
+
+    def test_short_read_pads_with_silence(self) -> None:
+        ring = PcmRingBuffer(8)
+        ring.write(_ramp(1, 3))
+        out = np.ones(5, dtype=np.float32)
+
+        assert ring.read_into(out) == 3
+        assert out[3:].tolist() == [0.0, 0.0]
+
+
+# ── 2. streaming sink ────────────────────────────────────────────────
+
+
+class TestStreamingAudioSink:
+    def test_stream_is_opened_once_and_chunks_play_back_to_back(self) -> None:
+        sink, streams = _make_sink()
+        sink.write(_ramp(0, 30), _SR)
+        sink.write(_ramp(30, 30), _SR)
+
+        played = np.concatenate([_pull(streams[0], 20) for _ in range(3)])
+
+        assert len(streams) == 1 and streams[0].started
+        np.testing.assert_allclose(played, _ramp(0, 60))
+        assert sink.consume_metrics() == {"underruns": 0, "gap_ms": 0.0, "chunks": 2}
+
+    def test_crossfade_blends_seam_and_fades_out_released_tail(self) -> None:
+        sink, streams = _make_sink(crossfade_ms=10.0)
+        sink.write(np.ones(40, dtype=np.float32) * 0.5, _SR)
+        assert sink.holding_tail
+        sink.write(np.zeros(40, dtype=np.float32), _SR)
+        sink.end_segment()
+
+        played = _pull(streams[0], 80)
+
+        assert played[:30].tolist() == [0.5] * 30
+        seam = played[30:40]
+        assert seam[0] == pytest.approx(0.5)
+        assert np.all(np.diff(seam) < 0)
+        assert played[70] == pytest.approx(0.0)
+        assert np.count_nonzero(played[40:]) == 0
+        assert not sink.holding_tail
+
+    def test_flush_drops_queued_audio_on_next_callback(self) -> None:
+        sink, streams = _make_sink()
+        sink.write(np.ones(500, dtype=np.float32) * 0.25, _SR)
+        sink.flush()
+
+        assert np.count_nonzero(_pull(streams[0], 50)) == 0
+        assert not sink.is_playing()
+
+        sink.write(_ramp(1, 10), _SR)
+        np.testing.assert_allclose(_pull(streams[0], 10), _ramp(1, 10))
+
+    def test_write_after_flush_without_callback_still_discards_old_audio(self) -> None:
+        sink, streams = _make_sink()
+        sink.write(np.ones(100, dtype=np.float32), _SR)
+        sink.flush()
+        sink.write(_ramp(1, 10), _SR)
+
+        np.testing.assert_allclose(_pull(streams[0], 10), _ramp(1, 10))
+
+    def test_underrun_counts_once_per_starvation_and_measures_gap(self) -> None:
+        sink, streams = _make_sink()
+        sink.write(np.ones(30, dtype=np.float32), _SR)
+        _pull(streams[0], 20)
+        _pull(streams[0], 20)
+        _pull(streams[0], 20)
+        sink.write(np.ones(20, dtype=np.float32), _SR)
+        _pull(streams[0], 20)
+
+        assert sink.consume_metrics() == {"underruns": 1, "gap_ms": 30.0, "chunks": 2}
+        assert sink.consume_metrics()["underruns"] == 0
+
+    def test_draining_after_segment_end_is_not_an_underrun(self) -> None:
+        sink, streams = _make_sink()
+        sink.write(np.ones(30, dtype=np.float32), _SR)
+        sink.end_segment()
+        for _ in range(4):
+            _pull(streams[0], 20)
+
+        assert sink.consume_metrics()["underruns"] == 0
+        assert not sink.is_playing()
+
+    def test_other_sample_rates_are_resampled(self) -> None:
+        sink, streams = _make_sink()
+        sink.write(np.ones((40, 2), dtype=np.float32) * 0.5, _SR * 2)
+
+        assert sink.buffered_s() == pytest.approx(0.02)
+        assert _pull(streams[0], 20).tolist() == [0.5] * 20
+
+    def test_close_stops_stream_and_rejects_writes(self) -> None:
+        sink, streams = _make_sink()
+        sink.close()
+
+        assert streams[0].closed
+        assert sink.write(np.ones(10, dtype=np.float32), _SR) is False
+
+    def test_writer_blocked_on_full_ring_wakes_when_the_callback_drains(self) -> None:
+        sink, streams = _make_sink(buffer_s=0.5, stall_timeout_s=30.0)
+        writer = _write_in_background(sink, _ramp(0, 800))
+        assert writer.is_alive()
+
+        started = time.monotonic()
+        first = _pull(streams[0], 400)
+        writer.join(5.0)
+
+        assert not writer.is_alive()
+        assert time.monotonic() - started < 5.0
+        np.testing.assert_allclose(np.concatenate([first, _pull(streams[0], 400)]), _ramp(0, 800))
+        assert len(streams) == 1 and sink.reopens == 0
+
+    def test_stalled_stream_is_reopened_and_queued_audio_keeps_playing(self) -> None:
+        sink, streams = _make_sink(buffer_s=0.5, stall_timeout_s=0.3)
+        writer = _write_in_background(sink, _ramp(0, 800))
+
+        deadline = time.monotonic() + 5.0
+        while len(streams) < 2 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        played = _pull(streams[1], 500)
+        writer.join(5.0)
+
+        assert streams[0].closed and streams[1].started
+        assert sink.reopens == 1
+        np.testing.assert_allclose(np.concatenate([played, _pull(streams[1], 300)]), _ramp(0, 800))
+
+    def test_close_releases_a_writer_blocked_on_full_ring(self) -> None:
+        sink, _streams = _make_sink(buffer_s=0.5, stall_timeout_s=30.0)
+        outcome: list[bool] = []
+        writer = _write_in_background(sink, _ramp(0, 800), outcome)
+
+        sink.close()
+        writer.join(5.0)
+
+        assert outcome == [False]
+
+
+# ── 3. TTS / stats wiring ────────────────────────────────────────────
+
+
+class TestTtsPlaybackMetrics:
+    def test_stop_flushes_sink_and_busy_tracks_buffered_audio(self) -> None:
+        tts = TTS(TTSConfig(backend="kokoro"))
+        sink, streams = _make_sink()
+        tts._sink = sink
+        sink.write(np.ones(200, dtype=np.float32), _SR)
+
+        assert tts.is_busy()
+        tts.stop()
+        _pull(streams[0], 10)
+        assert not tts.is_busy()
+
+    def test_pipeline_forwards_playback_metrics_to_turn_stats(self) -> None:
+        tts = TTS(TTSConfig(backend="kokoro"))
+        sink, streams = _make_sink()
+        tts._sink = sink
+        sink.write(np.ones(10, dtype=np.float32), _SR)
+        _pull(streams[0], 20)
+        _pull(streams[0], 20)
+
+        pipeline = ChatPipeline(
+            tts=tts,
+            chat_append_fn=lambda role, text: None,
+            chat_upsert_fn=lambda role, text: None,
+            persist_turn_fn=lambda role, text: None,
+            set_status_fn=lambda text: None,
+        )
+        pipeline._stream_started_at = 0.0
+        pipeline._finalize_stream_metrics("end")
+        metrics = pipeline.consume_completed_stream_metrics()
+
+        state = TurnStatsState()
+        StatsCollector.__new__(StatsCollector).note_tts_metrics(state, metrics)
+        record = state.to_record()
+        assert metrics[0]["tts_underruns"] == 1
+        assert record["tts_playback"] == {"underruns": 1, "gap_ms": 30.0}
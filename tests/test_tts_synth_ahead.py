@@ -0,0 +1,280 @@
+"""Guard tests for parallel synth-ahead of multi-chunk TTS replies.
+
+These tests require no audio device and no TTS model. Synthesis is a fake
+engine with injected per-chunk delays; playback is recorded in order.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from tools.tts import TTS, TTSConfig, _KokoroEngine, plan_synth_threads
+
+
+_SR = 24000
+
+
+# ── helpers ──────────────────────────────────────────────────────────
+
+
+class _DelayedEngine:
+    """Synthesizes a constant tone per chunk after a per-text delay."""
+
+    parallel_synthesis = True
+
+    def __init__(self, delays: dict[str, float] | None = None, default_delay_s: float = 0.01) -> None:
+        self.delays = delays or {}
+        self.default_delay_s = default_delay_s
+        self.played: list[str] = []
+        self.synth_started: list[str] = []
+        self._lock = threading.Lock()
+        self._active = 0
+        self.max_concurrent = 0
+        self._labels: dict[float, str] = {}
+
+    def synthesize(self, text: str, voice=None, speed=None):
+        samples = np.full(240, 0.1, dtype=np.float32)
+        with self._lock:
+            self.synth_started.append(text)
+            self._active += 1
+            self.max_concurrent = max(self.max_concurrent, self._active)
+            samples[0] = np.float32(len(self.synth_started) / 1000.0)
+            self._labels[float(samples[0])] = text
+        try:
+            time.sleep(self.delays.get(text, self.default_delay_s))
+        finally:
+            with self._lock:
+                self._active -= 1
+        return samples, _SR
+
+    def play(self, samples, sr: int) -> None:
+        label = self._labels.get(float(samples[0]))
+        self.played.append(label if label is not None else "<sfx>")
+
+    def list_voices(self) -> list[str]:
+        return ["af_heart"]
+
+    def stop(self) -> None:
+        pass
+
+
+class _OverlapMeter:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._active = 0
+        self.calls = 0
+        self.max_concurrent = 0
+
+    def run(self, delay_s: float) -> None:
+        with self._lock:
+            self.calls += 1
+            self._active += 1
+            self.max_concurrent = max(self.max_concurrent, self._active)
+        try:
+            time.sleep(delay_s)
+        finally:
+            with self._lock:
+                self._active -= 1
+
+
+class _FakeKokoro:
+    """kokoro-onnx stand-in that measures overlapping phonemize/create calls."""
+
+    def __init__(self, *, with_tokenizer: bool) -> None:
+        self.phonemize_meter = _OverlapMeter()
+        self.create_meter = _OverlapMeter()
+        self.created_from: list[str] = []
+        if with_tokenizer:
+            self.tokenizer = type("_Tokenizer", (), {"phonemize": self._phonemize})()
+
+    def _phonemize(self, text: str, lang: str) -> str:
+        self.phonemize_meter.run(0.02)
+        return f"/{text}/"
+
+    def create(self, text: str, *, voice: str, speed: float, lang: str, is_phonemes: bool = False):
+        self.create_meter.run(0.05)
+        self.created_from.append("phonemes" if is_phonemes else "text")
+        return np.zeros(240, dtype=np.float32), _SR
+
+
+def _kokoro_engine(fake: _FakeKokoro) -> _KokoroEngine:
+    engine = _KokoroEngine(TTSConfig(backend="kokoro", streaming_sink=False, audio_cache=False))
+    engine._kokoro = fake
+    engine._loaded = True
+    return engine
+
+
+def _synthesize_concurrently(engine: _KokoroEngine, count: int = 4) -> None:
+    threads = [
+        threading.Thread(target=engine.synthesize, args=(f"chunk {index}", None, None)) for index in range(count)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5.0)
+
+
+def _make_tts(engine: _DelayedEngine, *, ahead: int = 3, workers: int = 3) -> TTS:
+    tts = TTS(
+        TTSConfig(backend="kokoro", streaming_sink=False, audio_cache=False, synth_ahead=ahead, synth_workers=workers)
+    )
+    tts.engine = engine
+    tts.start()
+    return tts
+
+
+def _queue(tts: TTS, *texts: str) -> None:
+    epoch = tts._get_epoch()
+    utterance_id = tts._next_utterance_id()
+    for text in texts:
+        tts._queue_text_job(epoch, utterance_id, text, None, None)
+
+
+def _wait_for(predicate, timeout_s: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        if predicate():
+            return
+        time.sleep(0.005)
+    raise AssertionError("condition not reached in time")
+
+
+@pytest.fixture
+def make_tts():
+    created: list[TTS] = []
+
+    def _factory(engine: _DelayedEngine, **kwargs) -> TTS:
+        tts = _make_tts(engine, **kwargs)
+        created.append(tts)
+        return tts
+
+    yield _factory
+    for tts in created:
+        tts.shutdown()
+
+
+# ── 1. sizing ────────────────────────────────────────────────────────
+
+
+class TestPlanSynthThreads:
+    def test_auto_splits_cores_between_workers_and_intra_op(self) -> None:
+        assert plan_synth_threads(ahead=2, cpu_count=8) == (2, 4)
+        assert plan_synth_threads(ahead=4, cpu_count=8) == (4, 2)
+
+    def test_fixed_intra_op_threads_bound_the_pool(self) -> None:
+        assert plan_synth_threads(ahead=3, intra_op_threads=1, cpu_count=8) == (3, 1)
+        assert plan_synth_threads(ahead=3, intra_op_threads=8, cpu_count=8) == (1, 8)
+
+    def test_single_core_or_single_chunk_window_is_sequential(self) -> None:
+        assert plan_synth_threads(ahead=2, cpu_count=1)[0] == 1
+        assert plan_synth_threads(ahead=1, workers=4, cpu_count=16)[0] == 1
+
+    def test_explicit_workers_get_an_even_core_share(self) -> None:
+        assert plan_synth_threads(ahead=4, workers=2, cpu_count=12) == (2, 6)
+
+
+# ── 2. ordering ──────────────────────────────────────────────────────
+
+
+class TestSynthAheadOrdering:
+    def test_chunks_synthesize_in_parallel_and_play_in_order(self, make_tts) -> None:
+        engine = _DelayedEngine({"one": 0.15, "two": 0.05, "three": 0.01})
+        tts = make_tts(engine)
+        _queue(tts, "one", "two", "three")
+        _wait_for(lambda: len(engine.played) == 3)
+
+        assert engine.played == ["one", "two", "three"]
+        assert engine.max_concurrent >= 2
+        _wait_for(lambda: not tts.is_busy())
+
+    def test_window_bounds_chunks_in_flight(self, make_tts) -> None:
+        engine = _DelayedEngine(default_delay_s=0.03)
+        tts = make_tts(engine, ahead=2, workers=2)
+        texts = [f"chunk {index}" for index in range(8)]
+        _queue(tts, *texts)
+        _wait_for(lambda: len(engine.played) == len(texts))
+
+        assert engine.played == texts
+        assert engine.max_concurrent == 2
+
+    def test_one_worker_keeps_strict_sequential_synthesis(self, make_tts) -> None:
+        engine = _DelayedEngine({"slow": 0.05})
+        tts = make_tts(engine, ahead=3, workers=1)
+        _queue(tts, "slow", "fast", "faster")
+        _wait_for(lambda: len(engine.played) == 3)
+
+        assert engine.played == ["slow", "fast", "faster"]
+        assert engine.max_concurrent == 1
+
+    def test_sfx_keeps_its_place_between_parallel_chunks(self, make_tts, tmp_path: Path) -> None:
+        chime = tmp_path / "chime.wav"
+        with wave.open(str(chime), "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(_SR)
+            wf.writeframes(np.zeros(240, dtype=np.int16).tobytes())
+        engine = _DelayedEngine({"before": 0.1, "after": 0.01})
+        tts = make_tts(engine)
+        _queue(tts, "before")
+        tts.play_wav(chime)
+        _queue(tts, "after")
+        _wait_for(lambda: len(engine.played) == 3)
+
+        assert engine.played == ["before", "<sfx>", "after"]
+
+
+# ── 3. cancellation ──────────────────────────────────────────────────
+
+
+class TestSynthAheadCancellation:
+    def test_stop_drops_stale_chunks_and_new_speech_is_not_held_back(self, make_tts) -> None:
+        engine = _DelayedEngine({"stale slow": 0.4}, default_delay_s=0.01)
+        tts = make_tts(engine)
+        _queue(tts, "stale slow", "stale a", "stale b")
+        _wait_for(lambda: "stale slow" in engine.synth_started)
+        tts.stop()
+        started = time.monotonic()
+        _queue(tts, "fresh")
+        _wait_for(lambda: "fresh" in engine.played)
+        fresh_latency_s = time.monotonic() - started
+        time.sleep(0.45)
+
+        assert engine.played == ["fresh"]
+        assert fresh_latency_s < 0.3
+
+
+# ── 4. kokoro thread safety ──────────────────────────────────────────
+
+
+class TestKokoroThreadSafety:
+    def test_phonemizer_calls_are_serialized_and_inference_overlaps(self) -> None:
+        fake = _FakeKokoro(with_tokenizer=True)
+        _synthesize_concurrently(_kokoro_engine(fake))
+
+        assert fake.phonemize_meter.calls == 4
+        assert fake.phonemize_meter.max_concurrent == 1
+        assert fake.created_from == ["phonemes"] * 4
+        assert fake.create_meter.max_concurrent >= 2
+
+    def test_create_is_serialized_when_it_phonemizes_internally(self) -> None:
+        fake = _FakeKokoro(with_tokenizer=False)
+        _synthesize_concurrently(_kokoro_engine(fake))
+
+        assert fake.created_from == ["text"] * 4
+        assert fake.create_meter.max_concurrent == 1
+
+    def test_engines_without_opt_in_synthesize_one_chunk_at_a_time(self, make_tts) -> None:
+        engine = _DelayedEngine(default_delay_s=0.03)
+        engine.parallel_synthesis = False
+        tts = make_tts(engine)
+        _queue(tts, "one", "two", "three")
+        _wait_for(lambda: len(engine.played) == 3)
+
+        assert engine.played == ["one", "two", "three"]
+        assert engine.max_concurrent == 1
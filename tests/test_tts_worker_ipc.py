@@ -0,0 +1,260 @@
+"""Guard tests for the framed PCM transport to the TTS worker subprocess.
+
+These tests require no TTS model. The worker is a stub script written to
+tmp_path that serves synthetic audio through the real `serve()` loop.
+"""
+
+from __future__ import annotations
+
+import io
+import struct
+import sys
+import textwrap
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from tools.tts import TTSConfig, TTSError, _KokoroTorchEngine
+from tools.tts_worker_ipc import (
+    FRAME_MAGIC,
+    WorkerClient,
+    WorkerError,
+    WorkerProtocolError,
+    pcm_from_bytes,
+    pcm_to_bytes,
+    read_frame,
+    write_frame,
+)
+
+
+_ROOT = Path(__file__).resolve().parents[1]
+
+_STUB_WORKER = textwrap.dedent(
+    """
+    import os
+    import sys
+    import time
+
+    sys.path.insert(0, {root!r})
+
+    import numpy as np
+
+    from tools.tts_worker_ipc import claim_stdout, serve, write_frame
+
+    mode = sys.argv[1] if len(sys.argv) > 1 else ""
+    out = claim_stdout()
+    print("model loader chatter on stdout")
+    if mode == "fail-load":
+        write_frame(out, {{"type": "error", "error": "load_failed: stub"}})
+        sys.exit(1)
+
+
+    def synthesize(text, voice, speed):
+        print("synth " + text, file=sys.stderr, flush=True)
+        if text.startswith("sleep "):
+            time.sleep(float(text.split()[1]))
+        if text == "crash":
+            os._exit(3)
+        if text == "boom":
+            raise RuntimeError("stub failure")
+        return np.arange(len(text), dtype=np.float32) * float(speed) / 100.0, 22050
+
+
+    sys.exit(serve(synthesize, stdout=out))
+    """
+)
+
+
+# ── helpers ──────────────────────────────────────────────────────────
+
+
+class _LogSink:
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, msg: str) -> None:
+        with self._lock:
+            self.lines.append(msg)
+
+    def synthesized(self) -> list[str]:
+        with self._lock:
+            return [line.split("synth ", 1)[1] for line in self.lines if "STDERR: synth " in line]
+
+
+@pytest.fixture
+def make_client(tmp_path: Path):
+    script = tmp_path / "stub_tts_worker.py"
+    script.write_text(_STUB_WORKER.format(root=str(_ROOT)), encoding="utf-8")
+    clients: list[WorkerClient] = []
+
+    def _factory(*args: str, **kwargs) -> tuple[WorkerClient, _LogSink]:
+        log = _LogSink()
+        client = WorkerClient([sys.executable, "-u", str(script), *args], log=log, **kwargs)
+        clients.append(client)
+        return client, log
+
+    yield _factory
+    for client in clients:
+        client.close()
+
+
+def _expected(text: str, speed: float = 1.0) -> np.ndarray:
+    return np.arange(len(text), dtype=np.float32) * speed / 100.0
+
+
+# ── 1. framing ───────────────────────────────────────────────────────
+
+
+class TestFraming:
+    def test_round_trip_carries_metadata_and_float32_pcm(self) -> None:
+        stream = io.BytesIO()
+        samples = np.linspace(-1.0, 1.0, 480, dtype=np.float32)
+        write_frame(stream, {"type": "result", "id": "7", "sample_rate": 24000}, pcm_to_bytes(samples))
+        write_frame(stream, {"type": "ready"})
+        stream.seek(0)
+
+        meta, payload = read_frame(stream)
+        assert meta == {"type": "result", "id": "7", "sample_rate": 24000}
+        assert np.array_equal(pcm_from_bytes(payload), samples)
+        assert read_frame(stream) == ({"type": "ready"}, b"")
+        assert read_frame(stream) is None
+
+    def test_stereo_is_downmixed(self) -> None:
+        stereo = np.stack([np.ones(4, dtype=np.float32), np.zeros(4, dtype=np.float32)], axis=1)
+
+        assert np.array_equal(pcm_from_bytes(pcm_to_bytes(stereo)), np.full(4, 0.5, dtype=np.float32))
+
+    def test_corrupt_streams_are_rejected(self) -> None:
+        with pytest.raises(WorkerProtocolError):
+            read_frame(io.BytesIO(b"not a frame at all"))
+        header = struct.pack("<4sII", FRAME_MAGIC, 10, 0)
+        with pytest.raises(WorkerProtocolError):
+            read_frame(io.BytesIO(header + b"{}"))
+
+
+# ── 2. requests ──────────────────────────────────────────────────────
+
+
+class TestWorkerRequests:
+    def test_synthesize_returns_pcm_despite_stdout_chatter(self, make_client) -> None:
+        client, _log = make_client()
+
+        assert client.wait_ready(10.0)
+        samples, sr = client.synthesize("hello there", voice="af_heart", speed=0.5, timeout_s=10.0)
+
+        assert sr == 22050
+        assert samples.dtype == np.float32
+        assert np.allclose(samples, _expected("hello there", 0.5))
+
+    def test_pipelined_results_match_their_requests(self, make_client) -> None:
+        client, log = make_client()
+        texts = ["sleep 0.05", "a", "bb", "ccc", "dddd"]
+        request_ids = [client.submit(text, voice="v", speed=1.0) for text in texts]
+
+        for request_id, text in reversed(list(zip(request_ids, texts))):
+            samples, _sr = client.result(request_id, timeout_s=10.0)
+            assert np.allclose(samples, _expected(text))
+        assert log.synthesized() == texts
+
+    def test_worker_errors_fail_only_their_request(self, make_client) -> None:
+        client, _log = make_client()
+
+        with pytest.raises(WorkerError, match="stub failure"):
+            client.synthesize("boom", voice="v", speed=1.0, timeout_s=10.0)
+        assert client.synthesize("ok", voice="v", speed=1.0, timeout_s=10.0)[1] == 22050
+
+
+# ── 3. cancellation ──────────────────────────────────────────────────
+
+
+class TestCancellation:
+    def test_cancelled_queued_request_is_never_synthesized(self, make_client) -> None:
+        client, log = make_client()
+        client.wait_ready(10.0)
+        busy = client.submit("sleep 0.3", voice="v", speed=1.0)
+        doomed = client.submit("never spoken", voice="v", speed=1.0)
+        client.cancel(doomed)
+        after = client.submit("after", voice="v", speed=1.0)
+
+        with pytest.raises(WorkerError):
+            client.result(doomed, timeout_s=1.0)
+        assert np.allclose(client.result(after, timeout_s=10.0)[0], _expected("after"))
+        client.result(busy, timeout_s=10.0)
+        assert "never spoken" not in log.synthesized()
+
+    def test_timeout_cancels_and_late_result_is_dropped(self, make_client) -> None:
+        client, _log = make_client()
+        client.wait_ready(10.0)
+        slow = client.submit("sleep 0.4", voice="v", speed=1.0)
+
+        with pytest.raises(WorkerError, match="timed out"):
+            client.result(slow, timeout_s=0.05)
+        assert np.allclose(client.synthesize("next", voice="v", speed=1.0, timeout_s=10.0)[0], _expected("next"))
+
+
+# ── 4. crashes and restarts ──────────────────────────────────────────
+
+
+class TestWorkerRestart:
+    def test_crashed_worker_fails_pending_and_restarts(self, make_client) -> None:
+        client, _log = make_client()
+        client.wait_ready(10.0)
+
+        with pytest.raises(WorkerError, match="exited with code 3"):
+            client.synthesize("crash", voice="v", speed=1.0, timeout_s=10.0)
+        assert client.wait_ready(10.0)
+        assert client.spawn_count == 2
+        assert np.allclose(client.synthesize("back", voice="v", speed=1.0, timeout_s=10.0)[0], _expected("back"))
+
+    def test_restart_budget_stops_crash_loops(self, make_client) -> None:
+        client, _log = make_client(max_restarts=1)
+        for _ in range(2):
+            client.wait_ready(10.0)
+            with pytest.raises(WorkerError):
+                client.synthesize("crash", voice="v", speed=1.0, timeout_s=10.0)
+
+        with pytest.raises(WorkerError, match="restarted 1 times"):
+            client.start()
+
+    def test_load_failure_is_reported_and_not_restarted(self, make_client) -> None:
+        client, _log = make_client("fail-load")
+
+        with pytest.raises(WorkerError, match="load_failed: stub"):
+            client.wait_ready(10.0)
+        assert client.spawn_count == 1
+
+
+# ── 5. torch engine ──────────────────────────────────────────────────
+
+
+class TestTorchEngineTransport:
+    def test_engine_reads_pcm_from_the_worker(self, make_client, monkeypatch: pytest.MonkeyPatch) -> None:
+        client, _log = make_client()
+        engine = _KokoroTorchEngine(TTSConfig(voice="af_heart", speed=0.85))
+        engine._worker = client
+        monkeypatch.setattr(engine, "_wait_until_ready", lambda _timeout_s: client.wait_ready(10.0))
+
+        samples, sr = engine._request_worker_pcm("from engine", voice=None, speed=None)
+
+        assert sr == 22050
+        assert np.allclose(samples, _expected("from engine", 0.85))
+        with pytest.raises(TTSError, match="stub failure"):
+            engine._request_worker_pcm("boom", voice=None, speed=None)
+
+    def test_stop_cancels_requests_but_keeps_the_worker_warm(self, make_client) -> None:
+        client, _log = make_client()
+        engine = _KokoroTorchEngine(TTSConfig())
+        engine._worker = client
+        client.wait_ready(10.0)
+        pending = client.submit("sleep 0.2", voice="v", speed=1.0)
+
+        engine.stop()
+
+        with pytest.raises(WorkerError):
+            client.result(pending, timeout_s=1.0)
+        assert engine._worker_ready and client.spawn_count == 1
+        engine.close()
+        assert not client.running
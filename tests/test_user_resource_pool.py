@@ -0,0 +1,239 @@
+"""Tests for the shared vector-memory pool and LRU eviction of user silos.
+
+These tests require no chromadb, no sentence-transformers and no LLM. The
+embedding model and Chroma module are replaced by small fakes; silo eviction
+runs against a real ``ActiveUserRuntime`` in a temp data dir.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+import types
+from pathlib import Path
+
+import pytest
+
+import memory.brain as brain_module
+from memory import resource_pool
+from memory.resource_pool import (
+    SharedEmbedder,
+    SharedEmbeddingFunction,
+    chroma_client,
+    release_chroma_client,
+    shared_embedder,
+)
+from memory.user_runtime import ActiveUserRuntime
+
+
+# ── helpers ──────────────────────────────────────────────────────────
+
+
+class _FakeModel:
+    """Embeds each text as [len(text)]; records the batch sizes it saw."""
+
+    def __init__(self, delay_s: float = 0.0) -> None:
+        self.delay_s = delay_s
+        self.batches: list[int] = []
+
+    def encode(self, texts, **_kwargs):
+        self.batches.append(len(texts))
+        time.sleep(self.delay_s)
+        return [[float(len(text))] for text in texts]
+
+
+class _FakeSystem:
+    def __init__(self) -> None:
+        self.stopped = False
+
+    def stop(self) -> None:
+        self.stopped = True
+
+
+class _FakePersistentClient:
+    _identifier_to_system: dict[str, _FakeSystem] = {}
+
+    def __init__(self, path: str) -> None:
+        self._identifier = path
+        self._identifier_to_system[path] = _FakeSystem()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_pool(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(brain_module.PiperBrain, "start_vector_warmup", lambda self: False)
+    resource_pool._EMBEDDERS.clear()
+    resource_pool._CLIENTS.clear()
+    brain_module._brains.clear()
+    yield
+    resource_pool._EMBEDDERS.clear()
+    resource_pool._CLIENTS.clear()
+    brain_module._brains.clear()
+
+
+@pytest.fixture
+def fake_chromadb(monkeypatch: pytest.MonkeyPatch):
+    module = types.ModuleType("chromadb")
+    module.PersistentClient = _FakePersistentClient
+    _FakePersistentClient._identifier_to_system = {}
+    monkeypatch.setitem(sys.modules, "chromadb", module)
+    return module
+
+
+def _runtime(tmp_path: Path, *, max_resident_users: int) -> ActiveUserRuntime:
+    return ActiveUserRuntime(
+        tmp_path / "data",
+        llm_client=None,
+        admin_user_id="admin_baris",
+        admin_name="Baris",
+        max_resident_users=max_resident_users,
+    )
+
+
+# ── 1. shared embedder ───────────────────────────────────────────────
+
+
+class TestSharedEmbedder:
+    def test_concurrent_callers_are_batched_into_fewer_model_calls(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        model = _FakeModel(delay_s=0.05)
+        monkeypatch.setattr(resource_pool, "_load_sentence_transformer", lambda _name: model)
+        embedder = SharedEmbedder("fake")
+        results: dict[int, list[list[float]]] = {}
+
+        def _call(index: int) -> None:
+            results[index] = embedder.encode(["x" * index, "y" * (index + 10)])
+
+        threads = [threading.Thread(target=_call, args=(index,)) for index in range(1, 7)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        assert results == {index: [[float(index)], [float(index + 10)]] for index in range(1, 7)}
+        assert embedder.requests == 6
+        assert embedder.model_calls < 6
+        assert sum(model.batches) == 12
+
+    def test_model_error_reaches_every_caller_in_the_batch(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        def _broken(_name: str):
+            raise RuntimeError("no weights")
+
+        monkeypatch.setattr(resource_pool, "_load_sentence_transformer", _broken)
+        embedder = SharedEmbedder("fake")
+
+        with pytest.raises(RuntimeError, match="no weights"):
+            embedder.encode(["hello"])
+        assert embedder.encode([]) == []
+
+    def test_one_model_per_name_shared_by_every_embedding_function(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        loads: list[str] = []
+
+        def _load(name: str) -> _FakeModel:
+            loads.append(name)
+            return _FakeModel()
+
+        monkeypatch.setattr(resource_pool, "_load_sentence_transformer", _load)
+        first = SharedEmbeddingFunction("all-MiniLM-L6-v2")
+        second = SharedEmbeddingFunction.build_from_config(first.get_config())
+
+        assert first(["ab"]) == [[2.0]]
+        assert second.embed_query("abc") == [[3.0]]
+        assert loads == ["all-MiniLM-L6-v2"]
+        assert shared_embedder("all-MiniLM-L6-v2") is shared_embedder("all-MiniLM-L6-v2")
+        assert SharedEmbeddingFunction.name() == "sentence_transformer"
+        assert brain_module._QuietSentenceTransformerEmbeddingFunction is SharedEmbeddingFunction
+
+
+# ── 2. pooled Chroma clients ─────────────────────────────────────────
+
+
+class TestChromaClients:
+    def test_one_client_per_storage_dir(self, fake_chromadb, tmp_path: Path) -> None:
+        first = chroma_client(tmp_path / "a" / "vector_store")
+        again = chroma_client(tmp_path / "a" / ".." / "a" / "vector_store")
+        other = chroma_client(tmp_path / "b" / "vector_store")
+
+        assert first is again
+        assert other is not first
+        assert (tmp_path / "a" / "vector_store").is_dir()
+
+    def test_release_stops_the_backing_system(self, fake_chromadb, tmp_path: Path) -> None:
+        path = tmp_path / "vector_store"
+        client = chroma_client(path)
+        system = _FakePersistentClient._identifier_to_system[client._identifier]
+
+        assert release_chroma_client(path) is True
+        assert system.stopped
+        assert release_chroma_client(path) is False
+        assert chroma_client(path) is not client
+
+    def test_brain_and_documents_share_their_silo_client(
+        self, fake_chromadb, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        from memory.documents import DocumentMemoryManager
+
+        monkeypatch.setattr("memory.documents.chromadb", fake_chromadb)
+        manager = DocumentMemoryManager(tmp_path)
+        manager._ensure_client()
+
+        assert manager._client is chroma_client(brain_module.PiperBrain(tmp_path).db_path)
+        assert isinstance(manager._embedding_func, SharedEmbeddingFunction)
+
+
+# ── 3. silo eviction ─────────────────────────────────────────────────
+
+
+class TestSiloEviction:
+    def test_idle_silos_are_evicted_least_recently_used_first(self, tmp_path: Path) -> None:
+        runtime = _runtime(tmp_path, max_resident_users=3)
+        for name in ("Alice", "Bruno", "Chloe"):
+            runtime.switch_active_user(name)
+            runtime.current_knowledge_manager()
+
+        assert runtime.resident_users() == ["bruno", "admin_baris", "chloe"]
+        assert "alice" not in runtime._knowledge_managers
+        assert "alice" not in runtime._state_owners
+
+        runtime.switch_active_user("Alice")
+
+        assert runtime.resident_users() == ["chloe", "alice", "admin_baris"]
+
+    def test_active_and_admin_silos_are_never_evicted(self, tmp_path: Path) -> None:
+        runtime = _runtime(tmp_path, max_resident_users=2)
+        for name in ("Alice", "Bruno", "Chloe"):
+            runtime.switch_active_user(name)
+        runtime.switch_active_user("Alice")
+
+        for user_id in ("bruno", "chloe"):
+            runtime.state_owner_for(user_id)
+            assert {"alice", "admin_baris", user_id} == set(runtime.resident_users())
+
+    def test_evicted_state_is_flushed_and_reloaded(self, tmp_path: Path) -> None:
+        runtime = _runtime(tmp_path, max_resident_users=8)
+        runtime.switch_active_user("Alice")
+        owner = runtime.current_state_owner()
+        owner.task_store.add("alice_task", "pending")
+        with owner.situational_state_store.batch():
+            owner.situational_state_store.upsert_entry("mood", {"value": "calm"})
+        brain = runtime.current_brain()
+        runtime.switch_active_user("Bruno")
+
+        assert runtime.evict_user("alice") is True
+        assert "alice" not in runtime.resident_users()
+        assert runtime.evict_user("alice") is False
+
+        reloaded = runtime.state_owner_for("alice")
+        assert reloaded is not owner
+        assert "alice_task" in str(reloaded.task_store.load())
+        assert "mood" in reloaded.situational_state_store.load_active_entries()
+        assert runtime.brain_for("alice") is not brain
+
+    def test_release_brain_detaches_the_cached_instance(self, tmp_path: Path) -> None:
+        brain = brain_module.get_brain(tmp_path)
+        brain.collection = object()
+        brain._vector_ready = True
+
+        assert brain_module.release_brain(tmp_path) is True
+        assert brain.vector_ready is False
+        assert brain_module.get_brain(tmp_path) is not brain
+        assert brain_module.release_brain(tmp_path / "missing") is False
@@ -0,0 +1,315 @@
+"""Guard tests for the in-process vision image downscale/encode path.
+
+These tests require no PowerShell and no model. The area-average resize and
+the data URL cache run on numpy alone; the JPEG tests need Pillow and are
+skipped without it, while the no-Pillow fallback to the subprocess resize is
+checked with Pillow hidden.
+"""
+
+from __future__ import annotations
+
+import base64
+import io
+import os
+import sys
+
+import numpy as np
+import pytest
+
+import tools.vision as vision
+from tools.vision_image import (
+    DataUrlCache,
+    DataUrlKey,
+    ImageDecodeUnavailable,
+    area_downscale,
+    downscale_to_jpeg,
+    fit_within,
+)
+
+
+# ── helpers ──────────────────────────────────────────────────────────
+
+
+def _psnr(a: np.ndarray, b: np.ndarray) -> float:
+    mse = float(np.mean((a.astype(np.float64) - b.astype(np.float64)) ** 2))
+    return float("inf") if mse == 0 else 10.0 * np.log10(255.0**2 / mse)
+
+
+def _reference_image(height: int, width: int, seed: int = 3) -> np.ndarray:
+    """Smooth gradients plus a few hard-edged shapes, like a UI screenshot."""
+    yy, xx = np.mgrid[0:height, 0:width].astype(np.float64)
+    image = np.stack(
+        [128 + 100 * np.sin(xx / 9.0), 60 + 150 * (yy / max(1, height - 1)), 200 - 120 * (xx / max(1, width - 1))],
+        axis=2,
+    )
+    rng = np.random.default_rng(seed)
+    for _ in range(4):
+        y0, x0 = rng.integers(0, max(1, height // 2)), rng.integers(0, max(1, width // 2))
+        image[y0 : y0 + height // 4, x0 : x0 + width // 5] = rng.integers(0, 256, size=3)
+    return np.clip(image, 0, 255).astype(np.uint8)
+
+
+def _slow_area_reference(pixels: np.ndarray, width: int, height: int) -> np.ndarray:
+    src = pixels.astype(np.float64)
+    src_h, src_w = src.shape[:2]
+    out = np.zeros((height, width) + src.shape[2:])
+    sy, sx = src_h / height, src_w / width
+    for oy in range(height):
+        for ox in range(width):
+            total = np.zeros(src.shape[2:])
+            for iy in range(int(oy * sy), min(src_h, int(np.ceil((oy + 1) * sy)))):
+                wy = min(iy + 1, (oy + 1) * sy) - max(iy, oy * sy)
+                for ix in range(int(ox * sx), min(src_w, int(np.ceil((ox + 1) * sx)))):
+                    wx = min(ix + 1, (ox + 1) * sx) - max(ix, ox * sx)
+                    total += src[iy, ix] * wy * wx
+            out[oy, ox] = total / (sy * sx)
+    return np.clip(np.rint(out), 0, 255).astype(np.uint8)
+
+
+def _write_image(path, pixels: np.ndarray) -> None:
+    Image = pytest.importorskip("PIL.Image")
+    Image.fromarray(pixels).save(path)
+
+
+def _jpeg_pixels(data: bytes) -> np.ndarray:
+    Image = pytest.importorskip("PIL.Image")
+    assert data[:2] == b"\xff\xd8"
+    with Image.open(io.BytesIO(data)) as image:
+        return np.asarray(image.convert("RGB"))
+
+
+@pytest.fixture
+def fresh_cache(monkeypatch: pytest.MonkeyPatch) -> DataUrlCache:
+    cache = DataUrlCache(max_entries=4)
+    monkeypatch.setattr(vision, "_DATA_URL_CACHE", cache)
+    return cache
+
+
+@pytest.fixture
+def without_pillow(monkeypatch: pytest.MonkeyPatch) -> None:
+    # A None entry makes `import PIL` raise ImportError.
+    monkeypatch.setitem(sys.modules, "PIL", None)
+
+
+# ── 1. downscale ─────────────────────────────────────────────────────
+
+
+class TestAreaDownscale:
+    def test_integer_factor_is_the_block_mean(self) -> None:
+        image = _reference_image(48, 64)
+        expected = image.reshape(12, 4, 16, 4, 3).mean(axis=(1, 3))
+
+        assert np.array_equal(area_downscale(image, 16, 12), np.clip(np.rint(expected), 0, 255).astype(np.uint8))
+
+    def test_fractional_factor_matches_reference(self) -> None:
+        image = _reference_image(37, 53, seed=9)
+        diff = area_downscale(image, 23, 16).astype(int) - _slow_area_reference(image, 23, 16)
+
+        assert np.abs(diff).max() <= 1
+        assert np.count_nonzero(diff) <= diff.size // 100
+
+    def test_flat_image_stays_flat_and_fit_never_upscales(self) -> None:
+        flat = np.full((30, 50, 3), 77, dtype=np.uint8)
+
+        assert np.all(area_downscale(flat, 17, 11) == 77)
+        assert fit_within(1920, 1080, 1280) == (1280, 720)
+        assert fit_within(640, 480, 1280) == (640, 480)
+
+
+# ── 2. JPEG encoding ─────────────────────────────────────────────────
+
+
+class TestDownscaleToJpeg:
+    def test_downscale_fits_max_dim_and_matches_the_area_average(self, tmp_path) -> None:
+        source = _reference_image(90, 160)
+        path = tmp_path / "screen.png"
+        _write_image(path, source)
+
+        decoded = _jpeg_pixels(downscale_to_jpeg(path, max_dim=64, quality=95))
+
+        assert decoded.shape == (36, 64, 3)
+        assert _psnr(decoded, area_downscale(source, 64, 36)) > 25.0
+
+    def test_quality_trades_size_for_fidelity(self, tmp_path) -> None:
+        source = _reference_image(64, 96, seed=5)
+        path = tmp_path / "shot.png"
+        _write_image(path, source)
+        low = downscale_to_jpeg(path, max_dim=0, quality=40)
+        high = downscale_to_jpeg(path, max_dim=0, quality=95)
+
+        assert len(low) < len(high)
+        assert _psnr(_jpeg_pixels(low), source) < _psnr(_jpeg_pixels(high), source)
+
+    def test_missing_pillow_is_reported_as_unavailable(self, tmp_path, without_pillow) -> None:
+        path = tmp_path / "screen.png"
+        path.write_bytes(b"\x89PNG not decoded")
+
+        with pytest.raises(ImageDecodeUnavailable):
+            downscale_to_jpeg(path, max_dim=64)
+
+
+# ── 3. data URL cache ────────────────────────────────────────────────
+
+
+class TestDataUrlCache:
+    def test_lru_evicts_oldest_and_respects_char_budget(self) -> None:
+        cache = DataUrlCache(max_entries=2, max_chars=100)
+        keys = [DataUrlKey(f"/img{i}", 1, 1, 0, 85) for i in range(3)]
+        cache.put(keys[0], "a" * 10)
+        cache.put(keys[1], "b" * 10)
+        cache.get(keys[0])
+        cache.put(keys[2], "c" * 10)
+
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) == "a" * 10
+        cache.put(DataUrlKey("/big", 1, 1, 0, 85), "x" * 95)
+        assert len(cache) == 1
+
+    def test_key_changes_when_the_file_is_rewritten(self, tmp_path) -> None:
+        path = tmp_path / "frame.png"
+        path.write_bytes(b"one")
+        before = DataUrlKey.for_path(path, max_dim=1280, quality=85)
+        path.write_bytes(b"second")
+        os.utime(path, ns=(before.mtime_ns + 10**9, before.mtime_ns + 10**9))
+
+        after = DataUrlKey.for_path(path, max_dim=1280, quality=85)
+        assert after != before
+        assert DataUrlKey.for_path(path, max_dim=768, quality=85) != after
+
+
+# ── 4. vision integration ────────────────────────────────────────────
+
+
+class TestEncodeImageDataUrl:
+    def test_raw_encoding_is_cached_per_file_version(self, tmp_path, fresh_cache) -> None:
+        path = tmp_path / "shot.png"
+        path.write_bytes(b"\x89PNG fake bytes")
+
+        first = vision.encode_image_data_url(path)
+        second = vision.encode_image_data_url(path)
+
+        assert first == second == "data:image/png;base64," + base64.b64encode(b"\x89PNG fake bytes").decode()
+        assert fresh_cache.hits == 1
+
+    def test_downscale_runs_in_process_without_temp_files(self, tmp_path, fresh_cache, monkeypatch) -> None:
+        source = _reference_image(90, 160)
+        path = tmp_path / "screen.bmp"
+        _write_image(path, source)
+        monkeypatch.setattr(vision, "_resize_image_to_temp_jpeg", lambda *_a, **_k: pytest.fail("subprocess path used"))
+        before = set(tmp_path.iterdir())
+
+        url = vision.encode_image_data_url(path, max_dim=64)
+
+        assert url.startswith("data:image/jpeg;base64,")
+        jpeg = _jpeg_pixels(base64.b64decode(url.split(",", 1)[1]))
+        assert jpeg.shape == (36, 64, 3)
+        assert _psnr(jpeg, area_downscale(source, 64, 36)) > 25.0
+        assert set(tmp_path.iterdir()) == before
+        assert vision.encode_image_data_url(path, max_dim=64) == url
+        assert fresh_cache.hits == 1
+
+    def test_without_pillow_the_subprocess_resize_is_used(self, tmp_path, fresh_cache, monkeypatch, without_pillow) -> None:
+        path = tmp_path / "screen.png"
+        path.write_bytes(b"\x89PNG capture")
+        resized = tmp_path / "resized.jpg"
+        calls = []
+
+        def _fake_resize(image_path, *, max_dim):
+            calls.append((image_path, max_dim))
+            resized.write_bytes(b"\xff\xd8small\xff\xd9")
+            return resized
+
+        monkeypatch.setattr(vision, "_resize_image_to_temp_jpeg", _fake_resize)
+
+        url = vision.encode_image_data_url(path, max_dim=1280)
+
+        assert base64.b64decode(url.split(",", 1)[1]) == b"\xff\xd8small\xff\xd9"
+        assert calls == [(path, 1280)]
+        assert not resized.exists()
+
+    def test_undecodable_image_falls_back_to_subprocess_resize(self, tmp_path, fresh_cache, monkeypatch) -> None:
+        path = tmp_path / "photo.webp"
+        path.write_bytes(b"RIFF not really webp")
+        resized = tmp_path / "resized.jpg"
+
+        def _fake_resize(image_path, *, max_dim):
+            resized.write_bytes(b"\xff\xd8jpeg\xff\xd9")
+            return resized
+
+        monkeypatch.setattr(vision, "_resize_image_to_temp_jpeg", _fake_resize)
+
+        url = vision.encode_image_data_url(path, max_dim=1024)
+
+        assert base64.b64decode(url.split(",", 1)[1]) == b"\xff\xd8jpeg\xff\xd9"
+        assert not resized.exists()
+
+
+# ── 5. attachment downscale retry ────────────────────────────────────
+
+
+class _ImageClient:
+    """Fails every request whose image is not a JPEG with *error*."""
+
+    def __init__(self, error: str) -> None:
+        self.error = error
+        self.calls = 0
+
+    def generate_stream(self, messages, **_kwargs):
+        self.calls += 1
+        if "data:image/jpeg" not in repr(messages[-1]["content"]):
+            raise vision.LLMClientError(self.error)
+        yield "ok"
+
+
+def _attach(client, path) -> str:
+    return "".join(
+        vision.generate_stream_with_image_attachment(
+            client,
+            messages=[{"role": "user", "content": "what is this?"}],
+            image_path=path,
+            attachment_text="",
+            temperature=0.0,
+        )
+    )
+
+
+class TestAttachmentDownscaleRetry:
+    def test_oversized_request_is_retried_downscaled(self, tmp_path, fresh_cache, monkeypatch, without_pillow) -> None:
+        path = tmp_path / "screen.png"
+        path.write_bytes(b"\x89PNG capture")
+        resized = tmp_path / "resized.jpg"
+
+        def _fake_resize(image_path, *, max_dim):
+            resized.write_bytes(b"\xff\xd8small\xff\xd9")
+            return resized
+
+        monkeypatch.setattr(vision, "_resize_image_to_temp_jpeg", _fake_resize)
+        client = _ImageClient("LLM_HTTP_413: request entity too large")
+
+        assert _attach(client, path) == "ok"
+        assert client.calls == 5
+
+    def test_unrelated_llm_errors_are_not_retried(self, tmp_path, fresh_cache, monkeypatch) -> None:
+        path = tmp_path / "screen.png"
+        path.write_bytes(b"\x89PNG capture")
+        monkeypatch.setattr(vision, "encode_image_data_url", lambda *_a, max_dim=0, **_k: pytest.fail("downscaled"))
+        monkeypatch.setattr(vision, "build_message_variants_with_image", lambda messages, **_k: [messages])
+        client = _ImageClient("LLM_REQUEST_FAILED: <urlopen error [Errno 111] Connection refused>")
+
+        with pytest.raises(vision.VisionError, match="Connection refused"):
+            _attach(client, path)
+        assert client.calls == 1
+
+    def test_failed_resizes_are_reported_and_skipped(self, tmp_path, fresh_cache, monkeypatch, without_pillow) -> None:
+        path = tmp_path / "screen.png"
+        path.write_bytes(b"\x89PNG capture")
+
+        def _no_resize(image_path, *, max_dim):
+            raise vision.VisionError("PowerShell.exe was not found for image resize fallback.")
+
+        monkeypatch.setattr(vision, "_resize_image_to_temp_jpeg", _no_resize)
+        client = _ImageClient("LLM_HTTP_413: request entity too large")
+
+        with pytest.raises(vision.VisionError, match="Resize fallback 768px failed"):
+            _attach(client, path)
+        assert client.calls == 4
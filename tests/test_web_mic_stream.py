@@ -0,0 +1,332 @@
+"""Round-trip tests for streamed Web UI mic audio.
+
+These tests require no ffmpeg, no Whisper model and no browser. PCM fixtures
+are generated with numpy; Opus fixtures are encoded with libsndfile and then
+re-wrapped (raw packets, Ogg, a hand-built WebM) the way browsers send them.
+Recognition is replaced by a fake transcriber that records when it ran.
+"""
+
+from __future__ import annotations
+
+import io
+import struct
+import time
+
+import numpy as np
+import pytest
+
+import tools.audio_decode as audio_decode
+from tools.audio_containers import (
+    ContainerUnsupported,
+    OggOpusDemuxer,
+    OpusHead,
+    WebmOpusDemuxer,
+    mux_ogg_opus,
+    opus_packet_samples,
+)
+from tools.audio_decode import (
+    AudioDecodeError,
+    ContainerStreamDecoder,
+    decode_audio_bytes,
+    open_stream_decoder,
+)
+from tools.mic_stream import MicSampleRing, MicStream
+from web_ui.bridge.adapter import parse_binary_frame
+from web_ui.bridge.message_schema import MicAudioFrame
+
+
+# ── helpers ──────────────────────────────────────────────────────────
+
+
+def _chirp(duration_s: float = 1.0, rate: int = 16000) -> np.ndarray:
+    """Non-periodic test tone, so a lag in decoding shows up as low correlation."""
+    t = np.arange(int(duration_s * rate)) / rate
+    return (0.5 * np.sin(2 * np.pi * (200 * t + 900 * t * t / duration_s))).astype(np.float32)
+
+
+def _pcm16(audio: np.ndarray) -> bytes:
+    return (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+
+
+def _correlation(a: np.ndarray, b: np.ndarray) -> float:
+    n = min(a.size, b.size)
+    return float(np.corrcoef(a[:n], b[:n])[0, 1])
+
+
+def _frame(kind: str, data: bytes = b"", *, codec: str = "pcm16", seq: int = 0, rate: int = 16000, channels: int = 1) -> bytes:
+    return MicAudioFrame(kind=kind, codec=codec, stream_id=7, seq=seq, sample_rate=rate, channels=channels, data=data).to_bytes()
+
+
+def _chunks(data: bytes, size: int) -> list[bytes]:
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+@pytest.fixture(scope="module")
+def opus_fixture() -> tuple[np.ndarray, bytes, list[bytes], OpusHead]:
+    sf = pytest.importorskip("soundfile")
+    if "OPUS" not in sf.available_subtypes("OGG"):
+        pytest.skip("libsndfile built without Opus")
+    source = _chirp(1.0)
+    buffer = io.BytesIO()
+    sf.write(buffer, source, 16000, format="OGG", subtype="OPUS")
+    ogg = buffer.getvalue()
+    demuxer = OggOpusDemuxer()
+    packets = demuxer.feed(ogg)
+    assert demuxer.head is not None
+    return source, ogg, packets, demuxer.head
+
+
+def _ebml(element_id: int, body: bytes) -> bytes:
+    id_bytes = element_id.to_bytes((element_id.bit_length() + 7) // 8, "big")
+    return id_bytes + (0x10000000 | len(body)).to_bytes(4, "big") + body
+
+
+_UNKNOWN_SIZE = b"\x01\xff\xff\xff\xff\xff\xff\xff"
+
+
+def _webm(packets: list[bytes], head: OpusHead, *, laced: bool = False) -> bytes:
+    """Minimal MediaRecorder-style WebM: unknown-size Segment and Cluster, one Opus track."""
+    track = _ebml(
+        0xAE,
+        _ebml(0xD7, b"\x01")
+        + _ebml(0x86, b"A_OPUS")
+        + _ebml(0x63A2, head.to_bytes())
+        + _ebml(0xE1, _ebml(0xB5, struct.pack(">f", 48000.0))),
+    )
+    blocks = b"".join(
+        _ebml(0xA3, b"\x81" + struct.pack(">h", index * 20) + (b"\x86" if laced else b"\x80") + packet)
+        for index, packet in enumerate(packets)
+    )
+    return (
+        _ebml(0x1A45DFA3, _ebml(0x4282, b"webm"))
+        + b"\x18\x53\x80\x67" + _UNKNOWN_SIZE
+        + _ebml(0x1549A966, _ebml(0x2AD7B1, (1_000_000).to_bytes(3, "big")))
+        + _ebml(0x1654AE6B, track)
+        + b"\x1f\x43\xb6\x75" + _UNKNOWN_SIZE
+        + _ebml(0xE7, b"\x00")
+        + blocks
+    )
+
+
+@pytest.fixture
+def no_ffmpeg(monkeypatch: pytest.MonkeyPatch) -> None:
+    def _unavailable(*_args, **_kwargs):
+        raise AssertionError("ffmpeg must not be used")
+
+    monkeypatch.setattr(audio_decode, "_find_ffmpeg", lambda: None)
+    monkeypatch.setattr(audio_decode.subprocess, "run", _unavailable)
+
+
+# ── 1. binary frames ─────────────────────────────────────────────────
+
+
+class TestBinaryFrames:
+    def test_frame_round_trips_through_the_adapter(self) -> None:
+        payload = _pcm16(_chirp(0.02))
+        action, parsed = parse_binary_frame(_frame("data", payload, seq=3, rate=48000, channels=2))
+
+        assert action == "mic_audio_frame"
+        assert parsed == {
+            "kind": "data",
+            "codec": "pcm16",
+            "streamId": 7,
+            "seq": 3,
+            "sampleRate": 48000,
+            "channels": 2,
+            "data": payload,
+        }
+
+    @pytest.mark.parametrize(
+        ("raw", "message"),
+        [
+            (b"PMIC", "shorter"),
+            (b"JSON" + bytes(16), "Unknown binary frame"),
+            (struct.pack("<4sBBBBIII", b"PMIC", 9, 1, 0, 1, 1, 0, 16000), "version"),
+            (struct.pack("<4sBBBBIII", b"PMIC", 1, 1, 9, 1, 1, 0, 16000), "codec"),
+            (struct.pack("<4sBBBBIII", b"PMIC", 1, 1, 0, 1, 1, 0, 100), "sample rate"),
+        ],
+    )
+    def test_malformed_frames_are_rejected(self, raw: bytes, message: str) -> None:
+        with pytest.raises(ValueError, match=message):
+            parse_binary_frame(raw)
+
+
+# ── 2. PCM16 round trips ─────────────────────────────────────────────
+
+
+class TestPcmRoundTrip:
+    @pytest.mark.parametrize("rate", [16000, 44100, 48000])
+    def test_streamed_pcm_matches_the_source(self, rate: int) -> None:
+        reference = _chirp(1.0)
+        stereo = np.repeat(_chirp(1.0, rate)[:, None], 2, axis=1)
+        decoder = open_stream_decoder("pcm16", sample_rate=rate, channels=2)
+
+        # Odd chunk sizes split samples and channel pairs across frames.
+        parts = [parse_binary_frame(_frame("data", chunk, rate=rate, channels=2))[1]["data"] for chunk in _chunks(_pcm16(stereo), 1001)]
+        decoded = np.concatenate([decoder.feed(part) for part in parts] + [decoder.finish()])
+
+        assert decoded.size == reference.size
+        assert np.max(np.abs(decoded[100:-100] - reference[100:-100])) < 0.02
+
+    def test_sample_ring_keeps_the_newest_samples(self) -> None:
+        ring = MicSampleRing(100)
+        ring.write(np.arange(70, dtype=np.float32))
+        ring.write(np.arange(70, 150, dtype=np.float32))
+
+        assert ring.total == 150
+        assert ring.oldest == 50
+        assert np.array_equal(ring.snapshot(), np.arange(50, 150, dtype=np.float32))
+        assert np.array_equal(ring.read(0, 60), np.arange(50, 60, dtype=np.float32))
+
+
+# ── 3. Opus round trips ──────────────────────────────────────────────
+
+
+class TestOpusRoundTrip:
+    def test_packet_durations_follow_the_toc_byte(self) -> None:
+        assert opus_packet_samples(bytes([(1 << 3) | 0])) == 960  # SILK 20 ms
+        assert opus_packet_samples(bytes([(31 << 3) | 1])) == 1920  # CELT 20 ms x2
+        assert opus_packet_samples(bytes([(16 << 3) | 3, 3])) == 360  # CELT 2.5 ms x3
+
+    def test_ogg_decodes_in_process(self, opus_fixture, no_ffmpeg) -> None:
+        source, ogg, _packets, _head = opus_fixture
+
+        decoded = decode_audio_bytes(ogg, "ogg")
+
+        assert abs(decoded.size - source.size) < 200
+        assert _correlation(decoded, source) > 0.98
+
+    def test_remuxed_ogg_is_byte_exact_for_the_demuxer(self, opus_fixture) -> None:
+        _source, _ogg, packets, head = opus_fixture
+        demuxer = OggOpusDemuxer()
+
+        assert demuxer.feed(mux_ogg_opus(packets, head)) == packets
+        assert demuxer.head == head
+
+    def test_raw_packets_stream_in_batches(self, opus_fixture, no_ffmpeg) -> None:
+        source, _ogg, packets, head = opus_fixture
+        decoder = open_stream_decoder("opus", sample_rate=16000)
+        outputs = []
+        for index in range(0, len(packets), 3):
+            body = b"".join(len(p).to_bytes(2, "little") + p for p in packets[index : index + 3])
+            outputs.append(decoder.feed(parse_binary_frame(_frame("data", body, codec="opus"))[1]["data"]))
+        outputs.append(decoder.finish())
+        decoded = np.concatenate(outputs)
+
+        assert sum(chunk.size > 0 for chunk in outputs[:-1]) >= 3  # audio before the end
+        assert decoded.size == sum(opus_packet_samples(p) for p in packets) // 3
+        # No OpusHead in raw mode, so the encoder's pre-skip is still in front.
+        assert _correlation(decoded[head.pre_skip // 3 :], source) > 0.99
+
+    def test_webm_decodes_in_process(self, opus_fixture, no_ffmpeg) -> None:
+        source, _ogg, packets, head = opus_fixture
+
+        decoded = decode_audio_bytes(_webm(packets, head), "webm")
+
+        assert _correlation(decoded, source) > 0.98
+
+    def test_webm_streams_from_mediarecorder_timeslices(self, opus_fixture, no_ffmpeg) -> None:
+        source, _ogg, packets, head = opus_fixture
+        decoder = ContainerStreamDecoder("webm")
+
+        outputs = [decoder.feed(chunk) for chunk in _chunks(_webm(packets, head), 997)]
+        outputs.append(decoder.finish())
+
+        assert decoder.streaming
+        assert sum(chunk.size > 0 for chunk in outputs[:-1]) >= 3
+        assert _correlation(np.concatenate(outputs), source) > 0.99
+
+    def test_unsupported_webm_falls_back_to_ffmpeg_over_pipes(self, opus_fixture, monkeypatch: pytest.MonkeyPatch) -> None:
+        _source, _ogg, packets, head = opus_fixture
+        laced = _webm(packets, head, laced=True)
+        calls = []
+
+        def _fake_run(cmd, **kwargs):
+            calls.append((cmd, kwargs.get("input")))
+            return type("Result", (), {"returncode": 0, "stdout": _pcm16(_chirp(0.5)), "stderr": b""})()
+
+        monkeypatch.setattr(audio_decode, "_find_ffmpeg", lambda: "ffmpeg")
+        monkeypatch.setattr(audio_decode.subprocess, "run", _fake_run)
+        decoder = ContainerStreamDecoder("webm")
+
+        assert all(decoder.feed(chunk).size == 0 for chunk in _chunks(laced, 4096))
+        assert not decoder.streaming
+        assert decoder.finish().size == 8000
+        assert len(calls) == 1
+        assert calls[0][0][-1] == "pipe:1" and calls[0][1] == laced
+
+    def test_demuxers_reject_what_they_do_not_understand(self) -> None:
+        with pytest.raises(ContainerUnsupported):
+            OggOpusDemuxer().feed(b"RIFF" + bytes(40))
+        webm = WebmOpusDemuxer()
+        track = _ebml(0xAE, _ebml(0xD7, b"\x01") + _ebml(0x86, b"A_VORBIS"))
+        with pytest.raises(ContainerUnsupported, match="A_VORBIS"):
+            webm.feed(b"\x18\x53\x80\x67" + _UNKNOWN_SIZE + _ebml(0x1654AE6B, track))
+
+
+# ── 4. streaming recognition ─────────────────────────────────────────
+
+
+class _FakeTranscriber:
+    def __init__(self) -> None:
+        self.calls: list[tuple[float, int]] = []
+
+    def __call__(self, audio: np.ndarray) -> str:
+        self.calls.append((time.monotonic(), audio.size))
+        return f"segment{len(self.calls)}"
+
+
+def _utterances() -> np.ndarray:
+    silence = np.zeros(int(0.8 * 16000), dtype=np.float32)
+    return np.concatenate([_chirp(1.2), silence, _chirp(1.0), np.zeros(1600, dtype=np.float32)])
+
+
+class TestMicStream:
+    def test_recognition_starts_before_the_mic_is_released(self) -> None:
+        transcriber = _FakeTranscriber()
+        stream = MicStream(open_stream_decoder("pcm16"), transcriber, silence_s=0.5, min_segment_s=0.5)
+
+        for chunk in _chunks(_pcm16(_utterances()), 6400):
+            stream.feed(chunk)
+        deadline = time.monotonic() + 5.0
+        while not transcriber.calls and time.monotonic() < deadline:
+            time.sleep(0.01)
+        released_at = time.monotonic()
+        result = stream.finish(timeout=5.0)
+
+        assert transcriber.calls[0][0] < released_at
+        assert result.early_segments == 1
+        assert result.segments == ("segment1", "segment2")
+        assert result.text == "segment1 segment2"
+        assert result.audio.size == _utterances().size
+        # The first segment ends inside the pause, before the second utterance.
+        assert 1.2 * 16000 <= transcriber.calls[0][1] <= 2.0 * 16000
+
+    def test_long_speech_is_cut_at_the_segment_limit(self) -> None:
+        transcriber = _FakeTranscriber()
+        stream = MicStream(open_stream_decoder("pcm16"), transcriber, max_segment_s=1.0, max_seconds=2.0)
+
+        stream.feed(_pcm16(np.tile(_chirp(1.0), 3)))
+        result = stream.finish(timeout=5.0)
+
+        assert [size for _at, size in transcriber.calls] == [16000, 16000, 16000]
+        assert result.audio.size == 32000  # ring keeps max_seconds
+        assert result.duration_s == pytest.approx(3.0)
+
+    def test_cancel_discards_without_transcribing(self) -> None:
+        transcriber = _FakeTranscriber()
+        stream = MicStream(open_stream_decoder("pcm16"), transcriber)
+
+        stream.feed(_pcm16(_chirp(0.5)))
+        stream.cancel()
+        stream._thread.join(5.0)
+
+        assert transcriber.calls == []
+
+    def test_decode_errors_surface_from_finish(self) -> None:
+        stream = MicStream(open_stream_decoder("opus"), _FakeTranscriber())
+
+        stream.feed(b"\x05\x00ab")  # length says 5, only 2 bytes follow
+
+        with pytest.raises(AudioDecodeError, match="Truncated"):
+            stream.finish(timeout=5.0)
@@ -0,0 +1,322 @@
+"""Tests for batched, preemptible world-model extraction.
+
+These tests require no model and no llama-server. ``_SlowClient`` keeps the
+real ``LlamaServerClient`` request lock and replaces only the HTTP stream
+with a fake that takes a configurable time per chunk, so queue waits and
+preemption behave as they do against a real server.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+from core.runtime_control import CancellationToken, OperationCancelled
+from llm.llm_server_client import LlamaServerClient, LlamaServerConfig, background_llm_request
+from memory import extraction_queue as extraction_queue_module
+from memory.extraction_queue import ExtractionQueue, merge_chat_windows
+from memory.stores import WorldModelStore
+from memory.world_model import WorldModelManager
+
+
+_PILOT_PATCH = json.dumps(
+    {
+        "entities": [
+            {
+                "id": "person:user",
+                "type": "person",
+                "label": "User",
+                "attributes": [{"name": "occupation", "value": "airline pilot", "mode": "add", "ttl": "forever"}],
+            }
+        ],
+        "relationships": [],
+    }
+)
+
+
+# ── helpers ──────────────────────────────────────────────────────────
+
+
+class _SlowClient(LlamaServerClient):
+    """Real request lock, fake stream: `chunks` deltas `chunk_s` apart."""
+
+    def __init__(self, *, reply: str = "ok", chunks: int = 10, chunk_s: float = 0.01) -> None:
+        super().__init__(LlamaServerConfig(base_url="http://stub", model="stub"))
+        self.reply = reply
+        self.chunks = chunks
+        self.chunk_s = chunk_s
+        self.completed: List[List[Dict[str, Any]]] = []
+
+    def _stream_deltas(
+        self, messages, *, temperature=None, max_tokens=None, cancel_token=None, extra_payload=None
+    ) -> Iterator[Tuple[str, str]]:
+        self._acquire_request_lock(cancel_token)
+        try:
+            for _ in range(self.chunks):
+                time.sleep(self.chunk_s)
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+            self.completed.append(messages)
+            yield "content", self.reply
+        finally:
+            self._release_request_lock()
+
+
+class _PreemptOnceClient:
+    """Answers every prompt, except that call number `preempt_call` is preempted once."""
+
+    def __init__(self, *, reply: str, preempt_call: int) -> None:
+        self.reply = reply
+        self.preempt_call = preempt_call
+        self.prompts: List[str] = []
+
+    def generate(self, messages, *, temperature=None, cancel_token=None, **_kwargs) -> str:
+        self.prompts.append(messages[0]["content"])
+        if len(self.prompts) == self.preempt_call:
+            raise OperationCancelled("preempted")
+        return self.reply
+
+
+def _turn(index: int) -> List[Dict[str, str]]:
+    return [
+        {"role": "user", "content": f"Message {index}: I work as an airline pilot."},
+        {"role": "assistant", "content": f"Reply {index}."},
+    ]
+
+
+def _window(end: int, size: int = 4) -> List[Dict[str, str]]:
+    messages = [message for index in range(end + 1) for message in _turn(index)]
+    return messages[-size:]
+
+
+def _manager(tmp_path: Path, llm: Any, *, debounce_s: float = 0.05, max_messages: int = 24) -> WorldModelManager:
+    return WorldModelManager(
+        tmp_path,
+        llm,
+        world_model_store=WorldModelStore(tmp_path / "world_model.json"),
+        extraction_debounce_s=debounce_s,
+        extraction_max_messages=max_messages,
+    )
+
+
+# ── 1. coalescing ────────────────────────────────────────────────────
+
+
+class TestCoalescing:
+    def test_sliding_windows_merge_without_duplicates(self) -> None:
+        merged = merge_chat_windows([_window(1), _window(2), _window(3), _window(3)])
+
+        assert merged == [message for index in range(4) for message in _turn(index)]
+        assert merge_chat_windows([]) == []
+
+    def test_submissions_inside_the_debounce_window_run_as_one_batch(self) -> None:
+        batches: List[List[List[Dict[str, str]]]] = []
+        queue = ExtractionQueue(lambda windows, _token: batches.append(windows), debounce_s=0.2)
+        for end in range(5):
+            queue.submit(_window(end))
+            time.sleep(0.02)
+
+        assert queue.flush(timeout_s=5.0)
+        assert [len(batch) for batch in batches] == [5]
+        assert queue.snapshot()["batches"] == 1
+
+    def test_batch_waits_for_the_llm_to_go_idle(self) -> None:
+        batches: List[Any] = []
+        idle = threading.Event()
+        llm = type("_Busy", (), {"idle_for_s": lambda self: 10.0 if idle.is_set() else 0.0})()
+        queue = ExtractionQueue(lambda windows, _token: batches.append(windows), llm_client=llm, debounce_s=0.0)
+
+        queue.submit(_window(0))
+        assert not queue.flush(timeout_s=0.3)
+        assert batches == []
+
+        idle.set()
+        assert queue.flush(timeout_s=5.0)
+        assert len(batches) == 1
+
+    def test_closed_queue_drains_then_refuses_new_windows(self) -> None:
+        batches: List[Any] = []
+        queue = ExtractionQueue(lambda windows, _token: batches.append(windows), debounce_s=60.0)
+        queue.submit(_window(0))
+        queue.close()
+        queue.submit(_window(1))
+
+        deadline = time.monotonic() + 5.0
+        while not batches and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert batches == [[_window(0)]]
+        assert queue.snapshot()["submitted"] == 1
+
+
+# ── 2. preemption ────────────────────────────────────────────────────
+
+
+class TestPreemption:
+    def test_interactive_request_cancels_the_background_holder(self) -> None:
+        client = _SlowClient(chunks=100, chunk_s=0.01)
+        token = CancellationToken()
+        outcome: Dict[str, Any] = {}
+
+        def _background() -> None:
+            try:
+                with background_llm_request(token):
+                    client.generate([{"role": "user", "content": "extract"}], cancel_token=token)
+            except OperationCancelled:
+                outcome["cancelled"] = True
+
+        worker = threading.Thread(target=_background)
+        worker.start()
+        time.sleep(0.1)
+        started = time.perf_counter()
+        client.chunks = 2
+        answer = client.generate([{"role": "user", "content": "hello"}])
+        waited_s = time.perf_counter() - started
+        worker.join(5.0)
+
+        assert answer == "ok"
+        assert outcome == {"cancelled": True}
+        assert client.background_preemptions == 1
+        assert waited_s < 0.5
+
+    def test_background_requests_never_preempt_each_other(self) -> None:
+        client = _SlowClient(chunks=20, chunk_s=0.01)
+        first, second = CancellationToken(), CancellationToken()
+
+        def _run(token: CancellationToken) -> None:
+            with background_llm_request(token):
+                client.generate([{"role": "user", "content": "extract"}], cancel_token=token)
+
+        threads = [threading.Thread(target=_run, args=(token,)) for token in (first, second)]
+        for thread in threads:
+            thread.start()
+            time.sleep(0.02)
+        for thread in threads:
+            thread.join(5.0)
+
+        assert len(client.completed) == 2
+        assert not first.is_cancelled and not second.is_cancelled
+
+    def test_idle_signal_tracks_the_request_lock(self) -> None:
+        client = _SlowClient(chunks=1)
+        assert client.idle_for_s() == float("inf")
+
+        client.generate([{"role": "user", "content": "hello"}])
+
+        assert 0.0 <= client.idle_for_s() < 1.0
+
+
+# ── 3. world model manager ───────────────────────────────────────────
+
+
+class TestWorldModelBatches:
+    def test_queued_refreshes_share_one_extraction_and_one_graph_write(self, tmp_path: Path) -> None:
+        client = _SlowClient(reply=_PILOT_PATCH, chunks=1)
+        manager = _manager(tmp_path, client, debounce_s=0.2)
+        saves: List[Dict[str, Any]] = []
+        manager.set_graph_saved_callback(saves.append)
+
+        for end in range(4):
+            manager.update_knowledge_async(_window(end))
+        assert manager.flush_pending_extraction(timeout_s=5.0)
+
+        assert len(client.completed) == 1
+        assert len(saves) == 1
+        prompt = client.completed[0][0]["content"]
+        assert "Message 0:" in prompt and "Message 3:" in prompt
+        assert "airline pilot" in manager.render_prompt_state("job")
+
+    def test_long_merged_history_is_split_but_saved_once(self, tmp_path: Path) -> None:
+        client = _SlowClient(reply=_PILOT_PATCH, chunks=1)
+        manager = _manager(tmp_path, client, debounce_s=10.0, max_messages=8)
+        saves: List[Dict[str, Any]] = []
+        manager.set_graph_saved_callback(saves.append)
+
+        manager.extraction_queue.submit([message for index in range(10) for message in _turn(index)])
+        assert manager.flush_pending_extraction(timeout_s=5.0)
+
+        assert len(client.completed) == 3
+        assert len(saves) == 1
+
+    def test_preempted_batch_is_retried_and_nothing_is_half_written(self, tmp_path: Path) -> None:
+        client = _SlowClient(reply=_PILOT_PATCH, chunks=60, chunk_s=0.01)
+        manager = _manager(tmp_path, client, debounce_s=0.0)
+        manager.extraction_queue.idle_grace_s = 0.05
+        saves: List[Dict[str, Any]] = []
+        manager.set_graph_saved_callback(saves.append)
+
+        manager.update_knowledge_async(_window(0))
+        time.sleep(0.15)
+        client.chunks = 1
+        assert client.generate([{"role": "user", "content": "interactive"}]) == _PILOT_PATCH
+        assert saves == []
+        assert manager.flush_pending_extraction(timeout_s=5.0)
+
+        stats = manager.extraction_queue.snapshot()
+        assert stats["preempted"] == 1
+        assert stats["batches"] == 1
+        assert stats["idle_grace_s"] == 0.05
+        assert len(saves) == 1
+
+    def test_each_preemption_doubles_the_idle_wait_until_a_batch_lands(self) -> None:
+        outcomes = iter([OperationCancelled("preempted"), OperationCancelled("preempted"), None])
+        seen_grace: List[float] = []
+        queue: ExtractionQueue
+
+        def _run(_windows, _token) -> None:
+            seen_grace.append(queue.snapshot()["idle_grace_s"])
+            outcome = next(outcomes)
+            if outcome is not None:
+                raise outcome
+
+        queue = ExtractionQueue(_run, debounce_s=0.0, idle_grace_s=0.1)
+        queue.submit(_window(0))
+
+        assert queue.flush(timeout_s=5.0)
+        assert seen_grace == [0.1, 0.2, 0.4]
+        assert queue.snapshot()["idle_grace_s"] == 0.1
+
+    def test_retry_resumes_at_the_first_unfinished_chunk(self, tmp_path: Path) -> None:
+        client = _PreemptOnceClient(reply=_PILOT_PATCH, preempt_call=2)
+        manager = _manager(tmp_path, client, debounce_s=10.0, max_messages=8)
+        saves: List[Dict[str, Any]] = []
+        manager.set_graph_saved_callback(saves.append)
+
+        manager.extraction_queue.submit([message for index in range(10) for message in _turn(index)])
+        assert manager.flush_pending_extraction(timeout_s=5.0)
+
+        # Chunks hold turns 0-3, 4-7 and 8-9; the second is preempted once.
+        assert len(client.prompts) == 4
+        assert "Message 4:" in client.prompts[2] and "Message 0:" not in client.prompts[2]
+        assert "Message 8:" in client.prompts[3]
+        assert len(saves) == 1
+        assert manager.extraction_queue.snapshot()["preempted"] == 1
+        assert "airline pilot" in manager.render_prompt_state("job")
+
+
+# ── 4. shutdown ──────────────────────────────────────────────────────
+
+
+class TestShutdownDrain:
+    def test_drain_all_runs_windows_still_inside_the_debounce(self) -> None:
+        batches: List[Any] = []
+        queue = ExtractionQueue(lambda windows, _token: batches.append(windows), debounce_s=60.0)
+        queue.submit(_window(0))
+
+        assert extraction_queue_module.drain_all(5.0)
+        assert batches == [[_window(0)]]
+        queue.submit(_window(1))
+        assert queue.pending_count == 0
+
+    def test_drain_all_gives_up_at_its_deadline(self) -> None:
+        release = threading.Event()
+        queue = ExtractionQueue(lambda _windows, _token: release.wait(5.0), debounce_s=0.0)
+        queue.submit(_window(0))
+        try:
+            started = time.monotonic()
+            assert not extraction_queue_module.drain_all(0.2)
+            assert time.monotonic() - started < 2.0
+        finally:
+            release.set()
@@ -0,0 +1,292 @@
+"""tools/audio_containers.py
+
+Byte-level helpers for the Opus containers browsers produce.
+
+- ``opus_packet_samples`` reads an Opus packet's TOC byte (RFC 6716 §3.1)
+  to get its duration in 48 kHz samples.
+- ``OggOpusDemuxer`` and ``WebmOpusDemuxer`` are incremental: ``feed()``
+  accepts arbitrary chunk boundaries (MediaRecorder timeslices) and returns
+  the Opus packets completed so far.
+- ``mux_ogg_opus`` wraps raw packets (e.g. from WebCodecs) in a minimal Ogg
+  Opus stream so libsndfile or ffmpeg can decode them.
+
+Only what Chrome/Firefox MediaRecorder emits for audio is supported: a single
+Opus track, no lacing in WebM blocks. Anything else raises
+``ContainerUnsupported`` so callers can fall back to ffmpeg.
+"""
+
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass
+
+
+class ContainerUnsupported(ValueError):
+    """The container uses a feature these demuxers do not handle."""
+
+
+OPUS_RATE = 48000
+
+# Frame sizes in 48 kHz samples per TOC config (SILK, hybrid, CELT ranges).
+_SILK_SIZES = (480, 960, 1920, 2880)
+_HYBRID_SIZES = (480, 960)
+_CELT_SIZES = (120, 240, 480, 960)
+
+
+def opus_packet_samples(packet: bytes) -> int:
+    """Duration of one Opus packet in 48 kHz samples (0 for an empty packet)."""
+    if not packet:
+        return 0
+    toc = packet[0]
+    config = toc >> 3
+    if config < 12:
+        frame_size = _SILK_SIZES[config & 3]
+    elif config < 16:
+        frame_size = _HYBRID_SIZES[config & 1]
+    else:
+        frame_size = _CELT_SIZES[config & 3]
+    code = toc & 3
+    if code == 0:
+        frames = 1
+    elif code in (1, 2):
+        frames = 2
+    else:
+        if len(packet) < 2:
+            raise ContainerUnsupported("truncated Opus code-3 packet")
+        frames = packet[1] & 0x3F
+    return frame_size * frames
+
+
+@dataclass(frozen=True)
+class OpusHead:
+    channels: int = 1
+    pre_skip: int = 0
+    input_rate: int = OPUS_RATE
+
+    @classmethod
+    def parse(cls, data: bytes) -> "OpusHead":
+        if len(data) < 19 or data[:8] != b"OpusHead":
+            raise ContainerUnsupported("missing OpusHead")
+        channels, pre_skip, input_rate = struct.unpack_from("<BHI", data, 9)
+        if channels > 2:
+            raise ContainerUnsupported(f"{channels}-channel Opus needs a channel mapping table")
+        return cls(channels=channels or 1, pre_skip=pre_skip, input_rate=input_rate or OPUS_RATE)
+
+    def to_bytes(self) -> bytes:
+        return b"OpusHead" + struct.pack("<BBHIhB", 1, self.channels, self.pre_skip, self.input_rate, 0, 0)
+
+
+# ── Ogg ───────────────────────────────────────────────────────────────
+
+
+def _crc_table() -> tuple[int, ...]:
+    table = []
+    for index in range(256):
+        crc = index << 24
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x04C11DB7) if crc & 0x80000000 else (crc << 1)
+        table.append(crc & 0xFFFFFFFF)
+    return tuple(table)
+
+
+_OGG_CRC = _crc_table()
+
+
+def _ogg_crc(data: bytes) -> int:
+    crc = 0
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFFFFFF) ^ _OGG_CRC[((crc >> 24) ^ byte) & 0xFF]
+    return crc
+
+
+def _ogg_page(packet: bytes, *, serial: int, sequence: int, granule: int, header_type: int) -> bytes:
+    lacing = [255] * (len(packet) // 255) + [len(packet) % 255]
+    if len(lacing) > 255:
+        raise ContainerUnsupported("Opus packet too large for one Ogg page")
+    header = struct.pack("<4sBBqIIIB", b"OggS", 0, header_type, granule, serial, sequence, 0, len(lacing))
+    page = bytearray(header + bytes(lacing) + packet)
+    struct.pack_into("<I", page, 22, _ogg_crc(bytes(page)))
+    return bytes(page)
+
+
+def mux_ogg_opus(packets: list[bytes], head: OpusHead, *, serial: int = 0x5049_5045) -> bytes:
+    """Minimal Ogg Opus stream: OpusHead, OpusTags, then one packet per page."""
+    tags = b"OpusTags" + struct.pack("<I", 5) + b"piper" + struct.pack("<I", 0)
+    pages = [
+        _ogg_page(head.to_bytes(), serial=serial, sequence=0, granule=0, header_type=0x02),
+        _ogg_page(tags, serial=serial, sequence=1, granule=0, header_type=0x00),
+    ]
+    granule = 0
+    for index, packet in enumerate(packets):
+        granule += opus_packet_samples(packet)
+        last = index == len(packets) - 1
+        pages.append(_ogg_page(packet, serial=serial, sequence=index + 2, granule=granule, header_type=0x04 if last else 0x00))
+    return b"".join(pages)
+
+
+class OggOpusDemuxer:
+    """Incremental Ogg page reader yielding Opus audio packets."""
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._partial = bytearray()
+        self._headers_seen = 0
+        self.head: OpusHead | None = None
+
+    def feed(self, data: bytes) -> list[bytes]:
+        self._buffer += data
+        packets: list[bytes] = []
+        while True:
+            if len(self._buffer) < 27:
+                break
+            if self._buffer[:4] != b"OggS":
+                raise ContainerUnsupported("lost Ogg page sync")
+            segments = self._buffer[26]
+            header_len = 27 + segments
+            if len(self._buffer) < header_len:
+                break
+            lacing = self._buffer[27:header_len]
+            body_len = sum(lacing)
+            if len(self._buffer) < header_len + body_len:
+                break
+            body = bytes(self._buffer[header_len : header_len + body_len])
+            del self._buffer[: header_len + body_len]
+            offset = 0
+            for size in lacing:
+                self._partial += body[offset : offset + size]
+                offset += size
+                if size < 255:
+                    packets.extend(self._packet(bytes(self._partial)))
+                    self._partial.clear()
+        return packets
+
+    def _packet(self, packet: bytes) -> list[bytes]:
+        if self._headers_seen == 0:
+            self.head = OpusHead.parse(packet)
+            self._headers_seen = 1
+            return []
+        if self._headers_seen == 1:
+            self._headers_seen = 2
+            if packet.startswith(b"OpusTags"):
+                return []
+        return [packet]
+
+
+# ── WebM / Matroska ───────────────────────────────────────────────────
+
+_SEGMENT = 0x18538067
+_CLUSTER = 0x1F43B675
+_TRACKS = 0x1654AE6B
+_TRACK_ENTRY = 0xAE
+_AUDIO = 0xE1
+_BLOCK_GROUP = 0xA0
+_BLOCK = 0xA1
+_SIMPLE_BLOCK = 0xA3
+_TRACK_NUMBER = 0xD7
+_CODEC_ID = 0x86
+_CODEC_PRIVATE = 0x63A2
+
+# Master elements whose children are read in place; everything else not
+# listed below is skipped by size.
+_ENTER = {_SEGMENT, _CLUSTER, _TRACKS, _TRACK_ENTRY, _AUDIO, _BLOCK_GROUP}
+_READ = {_SIMPLE_BLOCK, _BLOCK, _TRACK_NUMBER, _CODEC_ID, _CODEC_PRIVATE}
+
+
+def _read_vint(buffer: bytearray, pos: int, *, keep_marker: bool) -> tuple[int, int] | None:
+    """EBML variable-length integer at *pos*: (value, length), None if incomplete."""
+    if pos >= len(buffer):
+        return None
+    first = buffer[pos]
+    if first == 0:
+        raise ContainerUnsupported("invalid EBML length")
+    length = 8 - first.bit_length() + 1
+    if pos + length > len(buffer):
+        return None
+    value = first if keep_marker else first & ((1 << (8 - length)) - 1)
+    for byte in buffer[pos + 1 : pos + length]:
+        value = (value << 8) | byte
+    return value, length
+
+
+class WebmOpusDemuxer:
+    """Incremental WebM reader yielding the packets of the Opus audio track."""
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._skip = 0
+        self._track: int | None = None
+        self._entry_track: int | None = None
+        self._entry_codec = ""
+        self.head: OpusHead | None = None
+
+    def feed(self, data: bytes) -> list[bytes]:
+        self._buffer += data
+        packets: list[bytes] = []
+        while True:
+            if self._skip:
+                dropped = min(self._skip, len(self._buffer))
+                del self._buffer[:dropped]
+                self._skip -= dropped
+                if self._skip:
+                    break
+            element = _read_vint(self._buffer, 0, keep_marker=True)
+            if element is None:
+                break
+            element_id, id_len = element
+            size = _read_vint(self._buffer, id_len, keep_marker=False)
+            if size is None:
+                break
+            size_value, size_len = size
+            unknown_size = size_value == (1 << (7 * size_len)) - 1
+            header_len = id_len + size_len
+            if element_id in _ENTER:
+                del self._buffer[:header_len]
+                if element_id == _TRACK_ENTRY:
+                    self._entry_track, self._entry_codec = None, ""
+                continue
+            if unknown_size:
+                raise ContainerUnsupported(f"unknown-size element 0x{element_id:X}")
+            if element_id not in _READ:
+                del self._buffer[:header_len]
+                self._skip = size_value
+                continue
+            if len(self._buffer) < header_len + size_value:
+                break
+            body = bytes(self._buffer[header_len : header_len + size_value])
+            del self._buffer[: header_len + size_value]
+            packet = self._element(element_id, body)
+            if packet is not None:
+                packets.append(packet)
+        return packets
+
+    def _element(self, element_id: int, body: bytes) -> bytes | None:
+        if element_id == _TRACK_NUMBER:
+            self._entry_track = int.from_bytes(body, "big")
+            self._claim_track()
+        elif element_id == _CODEC_ID:
+            self._entry_codec = body.rstrip(b"\x00").decode("ascii", errors="replace")
+            self._claim_track()
+        elif element_id == _CODEC_PRIVATE and self._entry_codec == "A_OPUS":
+            self.head = OpusHead.parse(body)
+        elif element_id in (_SIMPLE_BLOCK, _BLOCK):
+            return self._block(body)
+        return None
+
+    def _claim_track(self) -> None:
+        if self._entry_codec and self._entry_track is not None:
+            if self._entry_codec == "A_OPUS" and self._track is None:
+                self._track = self._entry_track
+            elif self._entry_codec.startswith("A_") and self._entry_codec != "A_OPUS" and self._track is None:
+                raise ContainerUnsupported(f"WebM audio codec {self._entry_codec}")
+
+    def _block(self, body: bytes) -> bytes | None:
+        track = _read_vint(bytearray(body[:8]), 0, keep_marker=False)
+        if track is None:
+            raise ContainerUnsupported("truncated WebM block")
+        track_number, track_len = track
+        if self._track is None or track_number != self._track:
+            return None
+        flags = body[track_len + 2]
+        if flags & 0x06:
+            raise ContainerUnsupported("laced WebM blocks")
+        return body[track_len + 3 :]
@@ -2,30 +2,48 @@
 
 Local audio decoder for Web UI / WebView mic audio submission.
 
-Decodes base64-encoded WebM/Opus or WAV audio into normalized float32
-mono numpy arrays at 16 kHz, suitable for the STT pipeline.
+Decodes WebM/Opus, Ogg/Opus or WAV audio into normalized float32 mono
+numpy arrays at 16 kHz, suitable for the STT pipeline.
 
-Uses ffmpeg subprocess for container/codec support on Windows.
-Requires no cloud speech APIs.
+Decoding happens in process where possible: WAV through ``wave``, Opus
+through libsndfile (``soundfile``) after ``tools.audio_containers`` has
+demuxed the packets. ffmpeg is only a fallback for containers the demuxers
+reject, and is fed over stdin/stdout pipes rather than temp files.
+
+The stream decoders (``open_stream_decoder``) turn binary mic frames into
+16 kHz audio chunk by chunk so recognition can start while the user is
+still speaking. Requires no cloud speech APIs.
 """
 
 from __future__ import annotations
 
 import base64
+import io
 import logging
-import os
+import math
 import shutil
 import subprocess
-import tempfile
 import wave
-from typing import Literal
+from typing import Literal, Protocol
 
 import numpy as np
 
+from tools.audio_containers import (
+    OPUS_RATE,
+    ContainerUnsupported,
+    OggOpusDemuxer,
+    OpusHead,
+    WebmOpusDemuxer,
+    mux_ogg_opus,
+    opus_packet_samples,
+)
+
 _LOG = logging.getLogger(__name__)
 
 # Format whitelist for security.
-_SUPPORTED_FORMATS: set[str] = {"webm", "wav"}
+_SUPPORTED_FORMATS: set[str] = {"webm", "ogg", "wav"}
+
+TARGET_RATE = 16000
 
 
 def _find_ffmpeg() -> str | None:
@@ -41,20 +59,22 @@ def _find_ffmpeg() -> str | None:
     return None
 
 
-def _ffmpeg_normalize(input_path: str, output_path: str, ffmpeg_exe: str, timeout_s: float = 30.0) -> None:
-    """Run ffmpeg to produce a 16 kHz mono WAV."""
+def _ffmpeg_decode_pipe(raw_bytes: bytes, ffmpeg_exe: str, timeout_s: float = 30.0) -> np.ndarray:
+    """Pipe *raw_bytes* through ffmpeg and read back 16 kHz mono PCM16."""
     cmd = [
         ffmpeg_exe,
-        "-y",
-        "-i", input_path,
-        "-ar", "16000",
+        "-hide_banner",
+        "-loglevel", "error",
+        "-i", "pipe:0",
+        "-f", "s16le",
+        "-ar", str(TARGET_RATE),
         "-ac", "1",
-        "-f", "wav",
-        output_path,
+        "pipe:1",
     ]
     try:
         result = subprocess.run(
             cmd,
+            input=raw_bytes,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             check=False,
@@ -67,11 +87,13 @@ def _ffmpeg_normalize(input_path: str, output_path: str, ffmpeg_exe: str, timeou
     if result.returncode != 0:
         stderr = result.stderr.decode("utf-8", errors="replace")[:500]
         raise AudioDecodeError(f"ffmpeg failed (code {result.returncode}): {stderr}")
+    pcm = bytes(result.stdout or b"")
+    return pcm16_to_float(pcm[: len(pcm) - len(pcm) % 2])
 
 
-def _read_wav(path: str) -> tuple[np.ndarray, int]:
-    """Read a WAV file into a float32 numpy array and return (audio, sample_rate)."""
-    with wave.open(path, "rb") as wf:
+def _read_wav(source: str | io.BytesIO) -> tuple[np.ndarray, int]:
+    """Read a WAV file or buffer into a float32 numpy array and return (audio, sample_rate)."""
+    with wave.open(source, "rb") as wf:
         n_channels = wf.getnchannels()
         sample_width = wf.getsampwidth()
         sample_rate = wf.getframerate()
@@ -99,9 +121,135 @@ class AudioDecodeError(RuntimeError):
     pass
 
 
+
+
+def pcm16_to_float(pcm: bytes, channels: int = 1) -> np.ndarray:
+    """Little-endian PCM16 bytes to float32 mono in [-1, 1)."""
+    audio = np.frombuffer(pcm, dtype="<i2").astype(np.float32) / 32768.0
+    if channels > 1:
+        audio = audio[: audio.size - audio.size % channels].reshape(-1, channels).mean(axis=1)
+    return audio
+
+
+class StreamResampler:
+    """Stateful resampler to 16 kHz for audio that arrives in chunks.
+
+    Downsampling runs a windowed-sinc low-pass first so speech energy above
+    the new Nyquist does not alias; the fractional read position and filter
+    history carry over between chunks, so output is seamless across frames.
+    """
+
+    def __init__(self, sample_rate: int, target_rate: int = TARGET_RATE, taps: int = 63) -> None:
+        if sample_rate <= 0:
+            raise ValueError(f"Invalid sample rate: {sample_rate}")
+        self.sample_rate = int(sample_rate)
+        self.target_rate = int(target_rate)
+        self._step = self.sample_rate / self.target_rate
+        self._pos = 0.0
+        self._taps = taps
+        self._consumed = 0
+        self._produced = 0
+        self._tail = np.zeros(0, dtype=np.float32)
+        self._kernel: np.ndarray | None = None
+        self._history = np.zeros(0, dtype=np.float32)
+        self._delay = 0
+        if self.sample_rate > self.target_rate:
+            cutoff = 0.45 * self.target_rate / self.sample_rate
+            n = np.arange(taps) - (taps - 1) / 2.0
+            kernel = np.sinc(2.0 * cutoff * n) * np.hamming(taps)
+            self._kernel = (kernel / kernel.sum()).astype(np.float32)
+            self._history = np.zeros(taps - 1, dtype=np.float32)
+            self._delay = (taps - 1) // 2  # filter group delay, dropped once
+
+    def process(self, chunk: np.ndarray) -> np.ndarray:
+        chunk = np.asarray(chunk, dtype=np.float32)
+        if self.sample_rate == self.target_rate:
+            return chunk
+        self._consumed += chunk.size
+        return self._resample(chunk)
+
+    def flush(self) -> np.ndarray:
+        """Output still held back by the filter delay, trimmed to the exact length."""
+        if self.sample_rate == self.target_rate:
+            return np.zeros(0, dtype=np.float32)
+        expected = round(self._consumed * self.target_rate / self.sample_rate)
+        missing = max(0, expected - self._produced)
+        padding = np.zeros(self._taps + 2 * math.ceil(self._step), dtype=np.float32)
+        return self._resample(padding)[:missing]
+
+    def _resample(self, chunk: np.ndarray) -> np.ndarray:
+        if self._kernel is not None:
+            padded = np.concatenate([self._history, chunk])
+            self._history = padded[-(self._kernel.size - 1):]
+            chunk = np.convolve(padded, self._kernel, mode="valid").astype(np.float32)
+            if self._delay:
+                dropped = min(self._delay, chunk.size)
+                chunk = chunk[dropped:]
+                self._delay -= dropped
+        buffer = np.concatenate([self._tail, chunk])
+        span = buffer.size - 1 - self._pos
+        count = math.ceil(span / self._step) if span > 0 else 0
+        positions = self._pos + self._step * np.arange(count)
+        out = np.interp(positions, np.arange(buffer.size), buffer).astype(np.float32)
+        next_pos = self._pos + self._step * count
+        consumed = min(int(next_pos), buffer.size)
+        self._tail = buffer[consumed:]
+        self._pos = next_pos - consumed
+        self._produced += out.size
+        return out
+
+
+def resample_to_16k(audio: np.ndarray, sample_rate: int) -> np.ndarray:
+    resampler = StreamResampler(sample_rate)
+    head = resampler.process(audio)
+    return np.concatenate([head, resampler.flush()])
+
+
+def _soundfile_decode(raw_bytes: bytes) -> np.ndarray:
+    """Decode an Ogg/WAV/FLAC byte string with libsndfile into 16 kHz mono."""
+    import soundfile as sf  # type: ignore
+
+    audio, sample_rate = sf.read(io.BytesIO(raw_bytes), dtype="float32", always_2d=True)
+    return resample_to_16k(audio.mean(axis=1), int(sample_rate))
+
+
+def _decode_opus_packets(packets: list[bytes], head: OpusHead | None) -> np.ndarray:
+    if not packets:
+        raise ContainerUnsupported("no Opus packets found")
+    head = head or OpusHead()
+    # libsndfile decodes Opus at OpusHead's input rate; ask for 16 kHz directly.
+    return _soundfile_decode(mux_ogg_opus(packets, OpusHead(head.channels, head.pre_skip, TARGET_RATE)))
+
+
+def _decode_in_process(raw_bytes: bytes, fmt: str) -> np.ndarray:
+    if fmt == "wav":
+        audio, sample_rate = _read_wav(io.BytesIO(raw_bytes))
+        return resample_to_16k(audio, sample_rate)
+    demuxer = WebmOpusDemuxer() if fmt == "webm" else OggOpusDemuxer()
+    packets = demuxer.feed(raw_bytes)
+    return _decode_opus_packets(packets, demuxer.head)
+
+
+def decode_audio_bytes(raw_bytes: bytes, fmt: str, *, ffmpeg_timeout_s: float = 30.0) -> np.ndarray:
+    """Decode container bytes into float32 mono at 16 kHz.
+
+    Tries the in-process path first and falls back to ffmpeg over pipes when
+    the container or codec is not one the demuxers handle.
+    """
+    try:
+        return _decode_in_process(raw_bytes, fmt).astype(np.float32)
+    except (ContainerUnsupported, wave.Error, EOFError, ImportError, RuntimeError, ValueError) as exc:
+        _LOG.debug("In-process %s decode failed (%s); falling back to ffmpeg", fmt, exc)
+
+    ffmpeg_exe = _find_ffmpeg()
+    if ffmpeg_exe is None:
+        raise AudioDecodeError("ffmpeg not found; Web UI mic audio cannot be decoded.")
+    return _ffmpeg_decode_pipe(raw_bytes, ffmpeg_exe, timeout_s=ffmpeg_timeout_s).astype(np.float32)
+
+
 def decode_web_audio(
     base64_audio: str,
-    format: Literal["webm", "wav"],
+    format: Literal["webm", "ogg", "wav"],
     *,
     max_decoded_bytes: int = 10 * 1024 * 1024,
     ffmpeg_timeout_s: float = 30.0,
@@ -110,7 +258,7 @@ def decode_web_audio(
 
     Args:
         base64_audio: Base64-encoded audio bytes (no data URI prefix).
-        format: Container format — "webm" or "wav".
+        format: Container format — "webm", "ogg" or "wav".
         max_decoded_bytes: Reject decoded audio larger than this many bytes.
 
     Returns:
@@ -138,29 +286,167 @@ def decode_web_audio(
             f"Decoded audio size {len(raw_bytes)} bytes exceeds limit {max_decoded_bytes}"
         )
 
-    ffmpeg_exe = _find_ffmpeg()
-    if ffmpeg_exe is None:
-        raise AudioDecodeError("ffmpeg not found; Web UI mic audio cannot be decoded.")
+    return decode_audio_bytes(raw_bytes, fmt, ffmpeg_timeout_s=ffmpeg_timeout_s)
 
-    input_suffix = f".{fmt}"
-    output_path = ""
-    input_path = ""
-    try:
-        with tempfile.NamedTemporaryFile(suffix=input_suffix, delete=False) as f_in:
-            f_in.write(raw_bytes)
-            input_path = f_in.name
-
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f_out:
-            output_path = f_out.name
-
-        _ffmpeg_normalize(input_path, output_path, ffmpeg_exe, timeout_s=ffmpeg_timeout_s)
-        audio, _sr = _read_wav(output_path)
-        return audio.astype(np.float32)
-
-    finally:
-        for p in (input_path, output_path):
-            if p and os.path.exists(p):
-                try:
-                    os.unlink(p)
-                except Exception:
-                    pass
+
+# ── streaming decoders ────────────────────────────────────────────────
+
+
+class StreamDecoder(Protocol):
+    def feed(self, data: bytes) -> np.ndarray: ...
+
+    def finish(self) -> np.ndarray: ...
+
+
+_EMPTY = np.zeros(0, dtype=np.float32)
+
+
+class PcmStreamDecoder:
+    """Interleaved little-endian PCM16 at any rate and channel count."""
+
+    def __init__(self, sample_rate: int, channels: int = 1) -> None:
+        self._channels = max(1, int(channels))
+        self._frame_bytes = 2 * self._channels
+        self._carry = b""
+        self._resampler = StreamResampler(sample_rate)
+
+    def feed(self, data: bytes) -> np.ndarray:
+        data = self._carry + bytes(data)
+        usable = len(data) - len(data) % self._frame_bytes
+        self._carry = data[usable:]
+        if not usable:
+            return _EMPTY
+        return self._resampler.process(pcm16_to_float(data[:usable], self._channels))
+
+    def finish(self) -> np.ndarray:
+        return self._resampler.flush()
+
+
+def split_opus_packets(data: bytes) -> list[bytes]:
+    """Split a frame payload of ``<u16 length><packet>`` records."""
+    packets: list[bytes] = []
+    offset = 0
+    while offset < len(data):
+        if offset + 2 > len(data):
+            raise AudioDecodeError("Truncated Opus packet length")
+        size = int.from_bytes(data[offset : offset + 2], "little")
+        offset += 2
+        if offset + size > len(data):
+            raise AudioDecodeError("Truncated Opus packet")
+        packets.append(bytes(data[offset : offset + size]))
+        offset += size
+    return packets
+
+
+class OpusPacketDecoder:
+    """Decode Opus packets in ~``batch_ms`` batches through libsndfile.
+
+    Each batch is muxed into a short Ogg stream. The last
+    ``preroll_packets`` of the previous batch are decoded again in front of
+    it and their output discarded, which lets the fresh decoder converge so
+    batch boundaries are not audible to the recogniser. SILK needs roughly
+    300 ms to converge; 16 packets of 20 ms brings the seams to within
+    1e-4 of a single-pass decode.
+    """
+
+    def __init__(self, head: OpusHead | None = None, *, batch_ms: int = 200, preroll_packets: int = 16) -> None:
+        self.head = head
+        self._batch_samples = OPUS_RATE * batch_ms // 1000
+        self._preroll_packets = max(0, int(preroll_packets))
+        self._preroll: list[bytes] = []
+        self._pending: list[bytes] = []
+        self._pending_samples = 0
+        self._started = False
+
+    def feed_packets(self, packets: list[bytes]) -> np.ndarray:
+        for packet in packets:
+            if packet:
+                self._pending.append(packet)
+                self._pending_samples += opus_packet_samples(packet)
+        if self._pending_samples < self._batch_samples:
+            return _EMPTY
+        return self._decode_batch()
+
+    def feed(self, data: bytes) -> np.ndarray:
+        return self.feed_packets(split_opus_packets(data))
+
+    def finish(self) -> np.ndarray:
+        return self._decode_batch() if self._pending else _EMPTY
+
+    def _decode_batch(self) -> np.ndarray:
+        head = self.head or OpusHead()
+        pre_skip = 0 if self._started else head.pre_skip
+        preroll_samples = sum(opus_packet_samples(packet) for packet in self._preroll)
+        try:
+            audio = _decode_opus_packets(self._preroll + self._pending, OpusHead(head.channels, pre_skip, head.input_rate))
+        except (ContainerUnsupported, ImportError, RuntimeError) as exc:
+            raise AudioDecodeError(f"Opus decode failed: {exc}") from exc
+        audio = audio[round(preroll_samples * TARGET_RATE / OPUS_RATE):]
+        if self._preroll_packets:
+            self._preroll = (self._preroll + self._pending)[-self._preroll_packets:]
+        self._pending = []
+        self._pending_samples = 0
+        self._started = True
+        return audio
+
+
+class ContainerStreamDecoder:
+    """Incremental WebM/Ogg Opus decoding for MediaRecorder timeslices.
+
+    If the demuxer meets something it cannot handle, decoding switches to
+    buffering and the whole recording is decoded once at ``finish()``
+    (in process or through ffmpeg), so no audio is lost.
+    """
+
+    def __init__(self, fmt: str, *, max_bytes: int = 10 * 1024 * 1024, ffmpeg_timeout_s: float = 30.0) -> None:
+        if fmt not in ("webm", "ogg", "wav"):
+            raise ValueError(f"Unsupported audio format: {fmt!r}")
+        self.fmt = fmt
+        self._max_bytes = int(max_bytes)
+        self._ffmpeg_timeout_s = ffmpeg_timeout_s
+        self._raw = bytearray()
+        self._demuxer: WebmOpusDemuxer | OggOpusDemuxer | None = None
+        if fmt == "webm":
+            self._demuxer = WebmOpusDemuxer()
+        elif fmt == "ogg":
+            self._demuxer = OggOpusDemuxer()
+        self._opus: OpusPacketDecoder | None = None
+        self.streaming = self._demuxer is not None
+
+    def feed(self, data: bytes) -> np.ndarray:
+        if len(self._raw) + len(data) > self._max_bytes:
+            raise AudioDecodeError(f"Streamed audio exceeds limit {self._max_bytes} bytes")
+        self._raw += data
+        if not self.streaming or self._demuxer is None:
+            return _EMPTY
+        try:
+            packets = self._demuxer.feed(bytes(data))
+            if packets and self._opus is None:
+                self._opus = OpusPacketDecoder(self._demuxer.head)
+            return self._opus.feed_packets(packets) if self._opus is not None else _EMPTY
+        except (ContainerUnsupported, AudioDecodeError) as exc:
+            _LOG.debug("Streaming %s decode disabled: %s", self.fmt, exc)
+            self.streaming = False
+            self._opus = None
+            return _EMPTY
+
+    def finish(self) -> np.ndarray:
+        """Remaining audio; the whole recording if streaming was abandoned."""
+        if self.streaming and self._opus is not None:
+            try:
+                return self._opus.finish()
+            except AudioDecodeError as exc:
+                _LOG.debug("Streaming %s decode failed at finish: %s", self.fmt, exc)
+                self.streaming = False
+        if self.streaming or not self._raw:
+            return _EMPTY
+        return decode_audio_bytes(bytes(self._raw), self.fmt, ffmpeg_timeout_s=self._ffmpeg_timeout_s)
+
+
+def open_stream_decoder(codec: str, *, sample_rate: int = TARGET_RATE, channels: int = 1, **kwargs) -> StreamDecoder:
+    """Decoder for one mic stream; *codec* is ``pcm16``, ``opus``, ``webm``, ``ogg`` or ``wav``."""
+    if codec == "pcm16":
+        return PcmStreamDecoder(sample_rate, channels)
+    if codec == "opus":
+        return OpusPacketDecoder(OpusHead(channels=max(1, min(2, int(channels))), input_rate=sample_rate or OPUS_RATE))
+    return ContainerStreamDecoder(codec, **kwargs)
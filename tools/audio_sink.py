@@ -0,0 +1,326 @@
+"""tools/audio_sink.py
+
+Gapless playback sink for synthesized speech.
+
+One persistent output stream stays open for the whole session. The TTS play
+thread writes chunks into a single-producer/single-consumer ring buffer and
+the audio callback drains it, so consecutive chunks play back-to-back without
+reopening the device. Short crossfades smooth chunk seams, `flush()` drops
+everything queued within one callback period, and the callback keeps
+underrun / inter-chunk gap counters for the turn stats.
+
+A writer facing a full ring sleeps on a condition the callback signals after
+each read. If the callback stops arriving while audio is queued (device
+unplugged, default output switched, driver reset), the sink closes the dead
+stream and opens a fresh one through the same factory, keeping what was
+queued.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Optional
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+_LOG = logging.getLogger(__name__)
+
+StreamFactory = Callable[[int, Callable[..., None]], Any]
+
+
+def _default_stream_factory(sample_rate: int, callback: Callable[..., None]):
+    import sounddevice as sd  # type: ignore
+
+    return sd.OutputStream(
+        samplerate=int(sample_rate),
+        channels=1,
+        dtype="float32",
+        latency="low",
+        callback=callback,
+    )
+
+
+def _to_mono_float32(samples, source_rate: int, target_rate: int):
+    arr = np.asarray(samples, dtype=np.float32)
+    if arr.ndim > 1:
+        arr = arr.mean(axis=1)
+    arr = np.clip(arr.reshape(-1), -1.0, 1.0)
+    if int(source_rate) == int(target_rate) or arr.size < 2:
+        return np.ascontiguousarray(arr, dtype=np.float32)
+    target_len = max(1, int(round(arr.size * float(target_rate) / float(source_rate))))
+    positions = np.linspace(0.0, arr.size - 1, num=target_len, dtype=np.float64)
+    return np.interp(positions, np.arange(arr.size, dtype=np.float64), arr).astype(np.float32)
+
+
+class PcmRingBuffer:
+    """Lock-free SPSC ring of float32 frames.
+
+    Positions grow monotonically. Only the writer advances `write_pos` and only
+    the reader advances `read_pos`; each publishes its position after the
+    copy, which is enough ordering for one producer and one consumer under the
+    GIL.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if np is None:
+            raise RuntimeError("Missing audio dependency numpy.")
+        self.capacity = max(1, int(capacity))
+        self._data = np.zeros(self.capacity, dtype=np.float32)
+        self.write_pos = 0
+        self.read_pos = 0
+
+    def available(self) -> int:
+        return self.write_pos - self.read_pos
+
+    def free(self) -> int:
+        return self.capacity - self.available()
+
+    def write(self, frames) -> int:
+        count = min(int(frames.size), self.free())
+        if count <= 0:
+            return 0
+        start = self.write_pos % self.capacity
+        first = min(count, self.capacity - start)
+        self._data[start:start + first] = frames[:first]
+        if count > first:
+            self._data[: count - first] = frames[first:count]
+        self.write_pos += count
+        return count
+
+    def read_into(self, out) -> int:
+        count = min(int(out.size), self.available())
+        if count > 0:
+            start = self.read_pos % self.capacity
+            first = min(count, self.capacity - start)
+            out[:first] = self._data[start:start + first]
+            if count > first:
+                out[first:count] = self._data[: count - first]
+            self.read_pos += count
+        if count < out.size:
+            out[count:] = 0.0
+        return count
+
+    def discard(self) -> None:
+        self.read_pos = self.write_pos
+
+
+class StreamingAudioSink:
+    """Persistent output stream fed through a `PcmRingBuffer`."""
+
+    def __init__(
+        self,
+        sample_rate: int,
+        *,
+        buffer_s: float = 8.0,
+        crossfade_ms: float = 6.0,
+        stream_factory: Optional[StreamFactory] = None,
+        stall_timeout_s: float = 1.0,
+    ) -> None:
+        if np is None:
+            raise RuntimeError("Missing audio dependency numpy.")
+        self.sample_rate = int(sample_rate)
+        self.crossfade_frames = max(0, int(self.sample_rate * max(0.0, float(crossfade_ms)) / 1000.0))
+        self._ring = PcmRingBuffer(max(self.sample_rate // 2, int(self.sample_rate * max(0.5, float(buffer_s)))))
+        self._tail = None
+        self._generation = 0
+        self._flush_pending = False
+        self._segment_open = False
+        self._draining = False
+        self._starved = False
+        self._closed = False
+        self._stats_lock = threading.Lock()
+        self._underruns = 0
+        self._gap_frames = 0
+        self._chunks = 0
+        self._space = threading.Condition()
+        self._stream_factory = stream_factory or _default_stream_factory
+        self.stall_timeout_s = max(0.05, float(stall_timeout_s))
+        self.reopens = 0
+        self._callback_at = time.monotonic()
+        self._stream = self._stream_factory(self.sample_rate, self._callback)
+        self._stream.start()
+
+    # -- writer side (TTS play thread) -------------------------------------
+
+    def write(self, samples, sr: int, *, should_continue: Callable[[], bool] = lambda: True) -> bool:
+        """Queue one chunk; blocks only while the ring is full.
+
+        Returns False when the chunk was abandoned because of `flush()` or
+        because `should_continue` turned false.
+        """
+        if self._closed:
+            return False
+        self._await_flush()
+        generation = self._generation
+        chunk = _to_mono_float32(samples, int(sr), self.sample_rate)
+        if chunk.size == 0:
+            return True
+
+        xf = min(self.crossfade_frames, chunk.size // 2)
+        tail = self._tail
+        self._tail = None
+        if tail is not None and xf > 0:
+            xf = min(xf, tail.size)
+            ramp = np.linspace(0.0, 1.0, num=xf, dtype=np.float32)
+            chunk = chunk.copy()
+            chunk[:xf] = tail[-xf:] * (1.0 - ramp) + chunk[:xf] * ramp
+            pending = [tail[:-xf], chunk[:-xf] if xf else chunk]
+        else:
+            pending = ([tail] if tail is not None else []) + [chunk[:-xf] if xf else chunk]
+        if xf > 0:
+            self._tail = chunk[-xf:].copy()
+
+        self._segment_open = True
+        self._draining = False
+        for block in pending:
+            if not self._push(block, generation, should_continue):
+                self._tail = None
+                return False
+        with self._stats_lock:
+            self._chunks += 1
+        return True
+
+    def release_tail(self) -> None:
+        """Play out the held crossfade tail when no next chunk is coming soon."""
+        tail = self._tail
+        self._tail = None
+        if tail is None or tail.size == 0:
+            return
+        faded = tail * np.linspace(1.0, 0.0, num=tail.size, dtype=np.float32)
+        self._push(faded, self._generation, lambda: True)
+
+    def end_segment(self) -> None:
+        """Mark the utterance finished so draining to silence is not an underrun."""
+        self.release_tail()
+        self._draining = True
+
+    @property
+    def holding_tail(self) -> bool:
+        return self._tail is not None
+
+    def _push(self, block, generation: int, should_continue: Callable[[], bool]) -> bool:
+        offset = 0
+        while offset < block.size:
+            if self._closed or generation != self._generation or not should_continue():
+                return False
+            written = self._ring.write(block[offset:])
+            offset += written
+            if written == 0:
+                self._wait_for_space()
+        return True
+
+    def _wait_for_space(self) -> None:
+        with self._space:
+            if self._ring.free() > 0 or self._closed:
+                return
+            self._space.wait(self._stall_remaining_s())
+            stalled = self._ring.free() == 0 and not self._closed and self._stall_remaining_s() <= 0
+        if stalled:
+            self._reopen_stream()
+
+    def _await_flush(self) -> None:
+        with self._space:
+            self._space.wait_for(lambda: not self._flush_pending, timeout=0.25)
+        if self._flush_pending:
+            # Callback is not running (device paused or gone); apply it here.
+            self._ring.discard()
+            self._flush_pending = False
+
+    def _stall_remaining_s(self) -> float:
+        return self._callback_at + self.stall_timeout_s - time.monotonic()
+
+    def _reopen_stream(self) -> None:
+        """Replace a stream whose callback stopped; queued audio is kept."""
+        _LOG.warning("Audio output stalled for %.1f s; reopening the stream.", self.stall_timeout_s)
+        old, self._stream = self._stream, None
+        for action in ("stop", "close"):
+            try:
+                getattr(old, action)()
+            except Exception:
+                pass
+        self._callback_at = time.monotonic()
+        self.reopens += 1
+        stream = self._stream_factory(self.sample_rate, self._callback)
+        stream.start()
+        self._stream = stream
+
+    # -- control ------------------------------------------------------------
+
+    def flush(self) -> None:
+        """Drop everything queued; takes effect on the next audio callback."""
+        self._generation += 1
+        self._tail = None
+        self._segment_open = False
+        self._draining = False
+        self._flush_pending = True
+        self._notify_space()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self.flush()
+        stream, self._stream = self._stream, None
+        for action in ("stop", "close"):
+            try:
+                getattr(stream, action)()
+            except Exception:
+                pass
+
+    def buffered_s(self) -> float:
+        return self._ring.available() / float(self.sample_rate)
+
+    def is_playing(self) -> bool:
+        return self._ring.available() > 0 or self._tail is not None
+
+    # -- reader side (audio callback) --------------------------------------
+
+    def _notify_space(self) -> None:
+        with self._space:
+            self._space.notify_all()
+
+    def _callback(self, outdata, frames, time_info=None, status=None) -> None:
+        out = outdata.reshape(-1) if getattr(outdata, "ndim", 1) > 1 else outdata
+        self._callback_at = time.monotonic()
+        discarded = self._flush_pending
+        if discarded:
+            self._ring.discard()
+            self._flush_pending = False
+            self._starved = False
+        got = self._ring.read_into(out)
+        if got or discarded:
+            self._notify_space()
+        if got >= int(frames):
+            self._starved = False
+            return
+        if not self._segment_open:
+            return
+        if self._draining:
+            if self._ring.available() == 0:
+                self._segment_open = False
+                self._starved = False
+            return
+        missing = int(frames) - got
+        with self._stats_lock:
+            if not self._starved:
+                self._underruns += 1
+            self._gap_frames += missing
+        self._starved = True
+
+    def consume_metrics(self) -> dict[str, float | int]:
+        """Return counters accumulated since the previous call and reset them."""
+        with self._stats_lock:
+            metrics = {
+                "underruns": int(self._underruns),
+                "gap_ms": round(self._gap_frames * 1000.0 / float(self.sample_rate), 3),
+                "chunks": int(self._chunks),
+            }
+            self._underruns = 0
+            self._gap_frames = 0
+            self._chunks = 0
+        return metrics
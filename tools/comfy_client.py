@@ -0,0 +1,485 @@
+"""ComfyUI API client and warm server lifecycle.
+
+``ComfyAPI`` wraps the ComfyUI HTTP endpoints and follows job progress over
+the ``/ws`` event stream: prompts are queued back to back under one client id
+and their ``executing``/``executed``/``execution_error`` events are read as
+they happen, instead of sleeping between ``/history`` polls. If the websocket
+cannot be opened (``websockets`` missing, proxy, older server) it falls back
+to polling ``/history`` with a short backoff.
+
+``ComfyServerManager`` keeps the server warm between jobs:
+- jobs hold a lease; the server is only started when no healthy one answers
+- after ``idle_timeout_s`` without a lease the server is stopped
+- while idle, low free VRAM first unloads models (``POST /free``) and, if the
+  pressure persists, stops the server
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import urllib.parse
+import urllib.request
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from core.runtime_control import CancellationToken, OperationCancelled
+
+try:
+    from websockets.sync.client import connect as _ws_connect
+except ImportError:  # pragma: no cover
+    _ws_connect = None  # type: ignore[assignment]
+
+_LOG = logging.getLogger(__name__)
+
+_COPY_CHUNK_BYTES = 1024 * 1024
+
+ProgressCallback = Callable[[str, int, int], None]
+
+
+class ComfyError(RuntimeError):
+    pass
+
+
+@dataclass
+class ComfyJobResult:
+    prompt_id: str
+    images: List[Dict[str, Any]] = field(default_factory=list)
+    error: str = ""
+    done: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.done and not self.error
+
+
+def copy_output_file(src: Path, dest: Path) -> Path:
+    """Stream *src* into *dest* in chunks; the destination appears atomically."""
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(f".{dest.name}.part")
+    with open(src, "rb") as reader, open(tmp, "wb") as writer:
+        shutil.copyfileobj(reader, writer, _COPY_CHUNK_BYTES)
+    os.replace(tmp, dest)
+    return dest
+
+
+class ComfyAPI:
+    """HTTP + websocket access to one ComfyUI server."""
+
+    def __init__(self, base_url: str, *, ws_url: str | None = None, http_timeout_s: float = 60.0) -> None:
+        self.base_url = base_url.rstrip("/")
+        if ws_url is None:
+            parsed = urllib.parse.urlparse(self.base_url)
+            scheme = "wss" if parsed.scheme == "https" else "ws"
+            ws_url = f"{scheme}://{parsed.netloc}/ws"
+        self.ws_url = ws_url
+        self.http_timeout_s = float(http_timeout_s)
+
+    # ── HTTP ────────────────────────────────────────────────────────────────
+
+    def _request(self, path: str, *, payload: Any = None, timeout_s: float | None = None) -> Any:
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        req = urllib.request.Request(
+            f"{self.base_url}{path}",
+            data=data,
+            headers={"Content-Type": "application/json"} if data is not None else {},
+            method="POST" if data is not None else "GET",
+        )
+        with urllib.request.urlopen(req, timeout=timeout_s or self.http_timeout_s) as resp:
+            body = resp.read()
+        return json.loads(body) if body.strip() else {}
+
+    def system_stats(self, *, timeout_s: float = 1.0) -> Dict[str, Any]:
+        return self._request("/system_stats", timeout_s=timeout_s)
+
+    def is_healthy(self) -> bool:
+        try:
+            self.system_stats()
+            return True
+        except Exception:
+            return False
+
+    def vram_free_fraction(self) -> Optional[float]:
+        try:
+            devices = self.system_stats(timeout_s=2.0).get("devices") or []
+        except Exception:
+            return None
+        for device in devices:
+            total = float(device.get("vram_total") or 0)
+            if total > 0:
+                return float(device.get("vram_free") or 0) / total
+        return None
+
+    def submit(self, workflow: Dict[str, Any], *, client_id: str) -> str:
+        result = self._request("/prompt", payload={"prompt": workflow, "client_id": client_id})
+        prompt_id = str(result.get("prompt_id") or "")
+        if not prompt_id:
+            raise ComfyError(f"ComfyUI rejected the prompt: {result.get('error') or result}")
+        return prompt_id
+
+    def history(self, prompt_id: str) -> Dict[str, Any]:
+        return self._request(f"/history/{urllib.parse.quote(prompt_id)}", timeout_s=5.0)
+
+    def interrupt(self) -> None:
+        self._request("/interrupt", payload={}, timeout_s=5.0)
+
+    def delete_queued(self, prompt_ids: List[str]) -> None:
+        self._request("/queue", payload={"delete": list(prompt_ids)}, timeout_s=5.0)
+
+    def free(self, *, unload_models: bool = True, free_memory: bool = True) -> None:
+        self._request("/free", payload={"unload_models": unload_models, "free_memory": free_memory}, timeout_s=10.0)
+
+    def download(self, image: Dict[str, Any], dest: Path) -> Path:
+        """Stream an output image from ``/view`` into *dest*."""
+        query = urllib.parse.urlencode(
+            {
+                "filename": image.get("filename", ""),
+                "subfolder": image.get("subfolder", ""),
+                "type": image.get("type", "output"),
+            }
+        )
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(f".{dest.name}.part")
+        with urllib.request.urlopen(f"{self.base_url}/view?{query}", timeout=self.http_timeout_s) as resp:
+            with open(tmp, "wb") as writer:
+                shutil.copyfileobj(resp, writer, _COPY_CHUNK_BYTES)
+        os.replace(tmp, dest)
+        return dest
+
+    # ── Jobs ────────────────────────────────────────────────────────────────
+
+    def open_events(self, client_id: str):
+        if _ws_connect is None:
+            return None
+        try:
+            return _ws_connect(
+                f"{self.ws_url}?clientId={urllib.parse.quote(client_id)}",
+                open_timeout=5.0,
+                close_timeout=1.0,
+                max_size=None,
+            )
+        except Exception as e:
+            _LOG.info("[ComfyUI] Event stream unavailable, polling history instead: %s", e)
+            return None
+
+    def run_prompts(
+        self,
+        workflows: List[Dict[str, Any]],
+        *,
+        timeout_s: float = 180.0,
+        cancel_token: CancellationToken | None = None,
+        on_progress: ProgressCallback | None = None,
+    ) -> List[ComfyJobResult]:
+        """Queue *workflows* back to back and wait for all of them.
+
+        Results come back in submission order. Failed or timed-out jobs carry
+        an ``error``; cancellation interrupts the server and raises.
+        """
+        client_id = uuid.uuid4().hex
+        # Subscribe before queueing so no event for these prompts is missed.
+        events = self.open_events(client_id)
+        jobs: Dict[str, ComfyJobResult] = {}
+        order: List[str] = []
+        try:
+            for workflow in workflows:
+                prompt_id = self.submit(workflow, client_id=client_id)
+                jobs[prompt_id] = ComfyJobResult(prompt_id=prompt_id)
+                order.append(prompt_id)
+            deadline = time.monotonic() + float(timeout_s)
+            if events is not None:
+                try:
+                    self._follow_events(events, jobs, deadline, cancel_token, on_progress)
+                except OperationCancelled:
+                    raise
+                except Exception as e:
+                    _LOG.info("[ComfyUI] Event stream dropped, polling history: %s", e)
+            self._poll_history(jobs, deadline, cancel_token)
+        except OperationCancelled:
+            self._abandon([pid for pid, job in jobs.items() if not job.done])
+            raise
+        finally:
+            if events is not None:
+                try:
+                    events.close()
+                except Exception:
+                    pass
+
+        pending = [pid for pid in order if not jobs[pid].done]
+        if pending:
+            self._abandon(pending)
+        for prompt_id in order:
+            job = jobs[prompt_id]
+            if not job.done:
+                job.error = f"timed out after {timeout_s:.0f}s"
+            elif not job.error and not job.images:
+                self._read_history_outputs(job)
+        return [jobs[prompt_id] for prompt_id in order]
+
+    def _follow_events(
+        self,
+        events,
+        jobs: Dict[str, ComfyJobResult],
+        deadline: float,
+        cancel_token: CancellationToken | None,
+        on_progress: ProgressCallback | None,
+    ) -> None:
+        while any(not job.done for job in jobs.values()):
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                raw = events.recv(timeout=min(0.5, remaining))
+            except TimeoutError:
+                continue
+            if not isinstance(raw, str):
+                continue  # binary preview frames
+            try:
+                message = json.loads(raw)
+            except ValueError:
+                continue
+            kind = message.get("type")
+            data = message.get("data") or {}
+            job = jobs.get(str(data.get("prompt_id") or ""))
+            if job is None or job.done:
+                continue
+            if kind == "progress":
+                if on_progress is not None:
+                    on_progress(job.prompt_id, int(data.get("value") or 0), int(data.get("max") or 0))
+            elif kind == "executed":
+                job.images.extend((data.get("output") or {}).get("images") or [])
+            elif kind == "execution_error":
+                job.error = str(data.get("exception_message") or "execution error").strip()
+                job.done = True
+            elif kind == "execution_interrupted":
+                job.error = "interrupted"
+                job.done = True
+            elif kind == "execution_success" or (kind == "executing" and data.get("node") is None):
+                job.done = True
+
+    def _poll_history(
+        self,
+        jobs: Dict[str, ComfyJobResult],
+        deadline: float,
+        cancel_token: CancellationToken | None,
+    ) -> None:
+        delay_s = 0.25
+        while any(not job.done for job in jobs.values()) and time.monotonic() < deadline:
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            for job in jobs.values():
+                if not job.done:
+                    self._read_history_outputs(job)
+            if all(job.done for job in jobs.values()):
+                return
+            time.sleep(min(delay_s, max(0.0, deadline - time.monotonic())))
+            delay_s = min(delay_s * 2.0, 1.0)
+
+    def _read_history_outputs(self, job: ComfyJobResult) -> None:
+        try:
+            entry = self.history(job.prompt_id).get(job.prompt_id)
+        except Exception:
+            return
+        if not entry:
+            return
+        status = entry.get("status") or {}
+        if status.get("status_str") == "error":
+            job.error = job.error or "execution error"
+            job.done = True
+            return
+        if not status.get("completed", False):
+            return
+        job.done = True
+        if not job.images:
+            for output in (entry.get("outputs") or {}).values():
+                job.images.extend(output.get("images") or [])
+
+    def _abandon(self, prompt_ids: List[str]) -> None:
+        if not prompt_ids:
+            return
+        try:
+            self.delete_queued(prompt_ids)
+        except Exception:
+            pass
+        try:
+            self.interrupt()
+        except Exception:
+            pass
+
+
+class ComfyServerManager:
+    """Keeps one ComfyUI server warm across jobs and releases it when idle."""
+
+    def __init__(
+        self,
+        api: ComfyAPI,
+        *,
+        start_fn: Callable[[], None],
+        stop_fn: Callable[[], None],
+        keep_warm: bool = True,
+        idle_timeout_s: float = 300.0,
+        vram_min_free_fraction: float = 0.0,
+        monitor_interval_s: float = 5.0,
+        ready_timeout_s: float = 120.0,
+    ) -> None:
+        self.api = api
+        self._start_fn = start_fn
+        self._stop_fn = stop_fn
+        self.keep_warm = bool(keep_warm)
+        self.idle_timeout_s = max(0.0, float(idle_timeout_s))
+        self.vram_min_free_fraction = max(0.0, float(vram_min_free_fraction))
+        self.monitor_interval_s = max(0.01, float(monitor_interval_s))
+        self.ready_timeout_s = float(ready_timeout_s)
+        self._lock = threading.Lock()
+        # Serialises start/stop so a stop never kills a server a new lease just claimed.
+        self._transition = threading.Lock()
+        self._ready = False
+        self._leases = 0
+        self._last_release = time.monotonic()
+        self._models_evicted = False
+        self._monitor: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+        self._closed = False
+        self.starts = 0
+        self.stops = 0
+        self.restarts = 0
+        self.evictions = 0
+
+    def is_ready(self) -> bool:
+        with self._lock:
+            return self._ready
+
+    def ensure_ready(self, cancel_token: CancellationToken | None = None) -> bool:
+        with self._lock:
+            was_ready = self._ready and not self._closed
+        if was_ready:
+            # A warm server can die between jobs (crash, OOM kill, user closed
+            # it); probe it so the job restarts it instead of failing.
+            if self.api.is_healthy():
+                return True
+            _LOG.warning("[ImageGen] Warm ComfyUI server stopped responding, restarting.")
+            with self._lock:
+                self._ready = False
+            self.restarts += 1
+        with self._transition:
+            if not self.api.is_healthy():
+                _LOG.info("[ImageGen] Waiting for ComfyUI API...")
+                self._start_fn()
+                self.starts += 1
+                deadline = time.monotonic() + self.ready_timeout_s
+                while not self.api.is_healthy():
+                    if cancel_token is not None:
+                        cancel_token.raise_if_cancelled()
+                    if time.monotonic() >= deadline:
+                        return False
+                    time.sleep(0.25)
+                _LOG.info("[ImageGen] ComfyUI Ready.")
+            with self._lock:
+                self._ready = True
+                self._closed = False
+                if self.keep_warm and (self._monitor is None or not self._monitor.is_alive()):
+                    self._monitor = threading.Thread(target=self._monitor_loop, name="comfy-lifecycle", daemon=True)
+                    self._monitor.start()
+        return True
+
+    @contextmanager
+    def lease(self, cancel_token: CancellationToken | None = None) -> Iterator[ComfyAPI]:
+        """Hold the server for one job; raises ``ComfyError`` if it never starts."""
+        with self._lock:
+            self._leases += 1
+        try:
+            ready = self.ensure_ready(cancel_token)
+        except BaseException:
+            self._release()
+            raise
+        if not ready:
+            self._release()
+            # Don't leave a half-started process behind.
+            self.stop()
+            raise ComfyError("ComfyUI did not start.")
+        with self._lock:
+            self._models_evicted = False
+        try:
+            yield self.api
+        finally:
+            self._release()
+
+    def _release(self) -> None:
+        with self._lock:
+            self._leases -= 1
+            self._last_release = time.monotonic()
+            idle = self._leases == 0
+        if idle and not self.keep_warm:
+            self.stop()
+        self._wake.set()
+
+    def evict_models(self) -> bool:
+        try:
+            self.api.free(unload_models=True, free_memory=True)
+        except Exception as e:
+            _LOG.debug("[ImageGen] ComfyUI /free failed: %s", e)
+            return False
+        with self._lock:
+            self._models_evicted = True
+        self.evictions += 1
+        _LOG.info("[ImageGen] Unloaded ComfyUI models (VRAM pressure).")
+        return True
+
+    def stop(self) -> bool:
+        """Stop the server unless a job holds it; returns whether it was stopped."""
+        with self._transition:
+            with self._lock:
+                if self._leases:
+                    return False
+                self._ready = False
+            self._stop_fn()
+            self.stops += 1
+        return True
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._closed = True
+            was_ready = self._ready
+        self._wake.set()
+        if was_ready:
+            with self._transition:
+                with self._lock:
+                    self._ready = False
+                self._stop_fn()
+                self.stops += 1
+
+    def _monitor_loop(self) -> None:
+        while True:
+            self._wake.wait(self.monitor_interval_s)
+            self._wake.clear()
+            with self._lock:
+                if self._closed or not self._ready:
+                    return
+                if self._leases:
+                    continue
+                idle_s = time.monotonic() - self._last_release
+                models_evicted = self._models_evicted
+            if idle_s >= self.idle_timeout_s:
+                _LOG.info("[ImageGen] ComfyUI idle for %.0fs, stopping.", idle_s)
+                if self.stop():
+                    return
+                continue
+            if self.vram_min_free_fraction <= 0:
+                continue
+            free_fraction = self.api.vram_free_fraction()
+            if free_fraction is None or free_fraction >= self.vram_min_free_fraction:
+                continue
+            if not models_evicted:
+                self.evict_models()
+            else:
+                _LOG.info("[ImageGen] VRAM still low after unloading models, stopping ComfyUI.")
+                if self.stop():
+                    return
@@ -14,13 +14,14 @@ import shutil
 from pathlib import Path
 from config import CFG
 from core.runtime_control import CancellationToken, OperationCancelled
+from tools.comfy_client import ComfyAPI, ComfyJobResult, ComfyServerManager, copy_output_file
 
 # Configuration moved to config.py
 COMFY_PORT = 8188
 _LOG = logging.getLogger(__name__)
 
 class ImageGenerator:
-    def __init__(self, data_dir: Path):
+    def __init__(self, data_dir: Path, *, comfy: ComfyServerManager | None = None):
         self.data_dir = data_dir
         self.workspace = data_dir / "workspace"
         self.workspace.mkdir(parents=True, exist_ok=True)
@@ -28,27 +29,22 @@ class ImageGenerator:
         self.last_image_name = None
         # Load path from config
         self.comfy_dir = CFG.COMFY_DIR
+        self.job_timeout_s = float(getattr(CFG, "COMFY_JOB_TIMEOUT_S", 180.0))
+        # The server stays warm between jobs; the manager stops it when idle.
+        self.comfy = comfy or ComfyServerManager(
+            ComfyAPI(f"http://127.0.0.1:{COMFY_PORT}"),
+            start_fn=self.start_server,
+            stop_fn=self.stop_server,
+            keep_warm=bool(getattr(CFG, "COMFY_KEEP_WARM", True)),
+            idle_timeout_s=float(getattr(CFG, "COMFY_IDLE_TIMEOUT_S", 300.0)),
+            vram_min_free_fraction=float(getattr(CFG, "COMFY_VRAM_MIN_FREE_FRACTION", 0.10)),
+        )
 
     @staticmethod
     def _raise_if_cancelled(cancel_token: CancellationToken | None) -> None:
         if cancel_token is not None:
             cancel_token.raise_if_cancelled()
 
-    def _wait_for_server(self, cancel_token: CancellationToken | None = None):
-        _LOG.info("[ImageGen] Waiting for ComfyUI API...")
-        start = time.time()
-        while time.time() - start < 120:
-            self._raise_if_cancelled(cancel_token)
-            try:
-                req = urllib.request.Request(f"http://127.0.0.1:{COMFY_PORT}/system_stats", method='GET')
-                with urllib.request.urlopen(req, timeout=1) as resp:
-                    if resp.status == 200:
-                        _LOG.info("[ImageGen] ComfyUI Ready.")
-                        return True
-            except:
-                time.sleep(1)
-        return False
-
     def start_server(self):
         try:
             req = urllib.request.Request(f"http://127.0.0.1:{COMFY_PORT}/system_stats", method='GET')
@@ -70,6 +66,10 @@ class ImageGenerator:
         except Exception as e:
             _LOG.error("[ImageGen] Failed to start: %s", e)
 
+    def shutdown(self) -> None:
+        """Stop a warm ComfyUI server (app exit)."""
+        self.comfy.shutdown()
+
     def stop_server(self):
         if self.process:
             _LOG.info("[ImageGen] Stopping ComfyUI...")
@@ -155,17 +155,10 @@ class ImageGenerator:
             except Exception:
                 pass
 
-    def generate(self, prompt: str, *, cancel_token: CancellationToken | None = None) -> str:
-        """Generates an image using Z-Image (1248x1248)."""
-
-        self._raise_if_cancelled(cancel_token)
-        self.start_server()
-        if not self._wait_for_server(cancel_token=cancel_token):
-            self.stop_server()
-            return "Error: ComfyUI did not start."
-
+    @staticmethod
+    def _generation_workflow(prompt: str) -> dict:
         # Updated Workflow for Z-Image
-        workflow = {
+        return {
           "9": {"inputs": {"filename_prefix": "PiperGen", "images": ["43", 0]}, "class_type": "SaveImage"},
           "39": {"inputs": {"clip_name": "qwen_3_4b.safetensors", "type": "lumina2", "device": "default"}, "class_type": "CLIPLoader"},
           "40": {"inputs": {"vae_name": "ae.safetensors"}, "class_type": "VAELoader"},
@@ -185,30 +178,28 @@ class ImageGenerator:
           "58": {"inputs": {"width": 1248, "height": 1248, "batch_size": 1}, "class_type": "EmptySD3LatentImage"}
         }
 
-        try:
-            self._raise_if_cancelled(cancel_token)
-            url = f"http://127.0.0.1:{COMFY_PORT}/prompt"
-            data = json.dumps({"prompt": workflow}).encode('utf-8')
-            req = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
-            
-            with urllib.request.urlopen(req, timeout=60) as resp:
-                result = json.loads(resp.read())
-            
-            prompt_id = result.get('prompt_id')
-            _LOG.info("[ImageGen] Job queued (%s). Monitoring...", prompt_id)
-            
-            fname = self._poll_for_result(prompt_id, cancel_token=cancel_token)
-            if fname:
-                self.last_image_name = fname 
-                return f"Image saved to: {fname}"
-            return "Error: Generation failed or timed out."
+    def generate(self, prompt: str, *, cancel_token: CancellationToken | None = None) -> str:
+        """Generates an image using Z-Image (1248x1248)."""
+        return self.generate_batch([prompt], cancel_token=cancel_token)[0]
 
-        except OperationCancelled:
-            raise
-        except Exception as e:
-            return f"Error: {e}"
-        finally:
-            self.stop_server()
+    def generate_batch(self, prompts: list[str], *, cancel_token: CancellationToken | None = None) -> list[str]:
+        """Queues several Z-Image prompts back to back on one warm server."""
+
+        self._raise_if_cancelled(cancel_token)
+        if not prompts:
+            return []
+        workflows = [self._generation_workflow(prompt) for prompt in prompts]
+        outcomes = self._run_workflows(workflows, cancel_token=cancel_token)
+        if isinstance(outcomes, str):
+            return [outcomes] * len(prompts)
+        replies = []
+        for fname in outcomes:
+            if fname and not fname.startswith("Error:"):
+                self.last_image_name = fname
+                replies.append(f"Image saved to: {fname}")
+            else:
+                replies.append(fname or "Error: Generation failed or timed out.")
+        return replies
 
     def edit_image(self, instruction: str, *, cancel_token: CancellationToken | None = None) -> str:
         """Edits the last generated image using Qwen Image Edit."""
@@ -231,11 +222,6 @@ class ImageGenerator:
         shutil.copy(src_path, input_path)
         _LOG.info("[ImageGen] Prepared input image: %s", self.last_image_name)
 
-        self.start_server()
-        if not self._wait_for_server(cancel_token=cancel_token):
-            self.stop_server()
-            return "Error: ComfyUI did not start."
-
         # Qwen Image Edit Workflow
         workflow = {
           "60": {"inputs": {"filename_prefix": "PiperEdit", "images": ["102:8", 0]}, "class_type": "SaveImage"},
@@ -261,65 +247,59 @@ class ImageGenerator:
           }
         }
 
-        try:
-            self._raise_if_cancelled(cancel_token)
-            url = f"http://127.0.0.1:{COMFY_PORT}/prompt"
-            data = json.dumps({"prompt": workflow}).encode('utf-8')
-            req = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
-            
-            with urllib.request.urlopen(req, timeout=60) as resp:
-                result = json.loads(resp.read())
-            
-            prompt_id = result.get('prompt_id')
-            _LOG.info("[ImageGen] Edit Job queued (%s). Monitoring...", prompt_id)
-            
-            fname = self._poll_for_result(prompt_id, prefix="PiperEdit", cancel_token=cancel_token)
-            if fname:
-                self.last_image_name = fname 
-                return f"Edited image saved to: {fname}"
-            return "Error: Edit failed or timed out."
+        outcomes = self._run_workflows([workflow], cancel_token=cancel_token)
+        if isinstance(outcomes, str):
+            return outcomes
+        fname = outcomes[0]
+        if fname and not fname.startswith("Error:"):
+            self.last_image_name = fname
+            return f"Edited image saved to: {fname}"
+        return fname or "Error: Edit failed or timed out."
+
+    def _run_workflows(self, workflows: list[dict], *, cancel_token: CancellationToken | None = None) -> list[str | None] | str:
+        """Runs workflows on the warm server; returns one output filename per workflow.
 
+        A plain string is a failure that applies to the whole batch.
+        """
+        try:
+            with self.comfy.lease(cancel_token=cancel_token) as api:
+                self._raise_if_cancelled(cancel_token)
+                results = api.run_prompts(
+                    workflows,
+                    timeout_s=self.job_timeout_s,
+                    cancel_token=cancel_token,
+                    on_progress=self._log_progress,
+                )
+                return [self._collect_output(api, result) for result in results]
         except OperationCancelled:
             raise
         except Exception as e:
             return f"Error: {e}"
-        finally:
-            self.stop_server()
 
-    def _poll_for_result(self, prompt_id, prefix="PiperGen", timeout=180, cancel_token: CancellationToken | None = None):
-        """Helper to poll history for result."""
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            self._raise_if_cancelled(cancel_token)
-            time.sleep(2)
+    @staticmethod
+    def _log_progress(prompt_id: str, value: int, maximum: int) -> None:
+        _LOG.debug("[ImageGen] %s step %s/%s", prompt_id, value, maximum)
+
+    def _collect_output(self, api: ComfyAPI, result: ComfyJobResult) -> str | None:
+        """Copies the job's first output image into the workspace."""
+        if not result.ok:
+            _LOG.info("[ImageGen] Job %s failed: %s", result.prompt_id, result.error)
+            return f"Error: {result.error}" if result.error else None
+        for image in result.images:
+            filename = image.get("filename")
+            if not filename:
+                continue
+            subfolder = image.get("subfolder", "")
+            comfy_output = self.comfy_dir / "ComfyUI" / "output"
+            src = comfy_output / subfolder / filename if subfolder else comfy_output / filename
+            dest = self.workspace / filename
             try:
-                hist_req = urllib.request.Request(f"http://127.0.0.1:{COMFY_PORT}/history/{prompt_id}")
-                with urllib.request.urlopen(hist_req, timeout=5) as resp:
-                    self._raise_if_cancelled(cancel_token)
-                    history = json.loads(resp.read())
-                    
-                if prompt_id in history:
-                    status = history[prompt_id].get('status', {})
-                    if status.get('completed', False):
-                        outputs = history[prompt_id].get('outputs', {})
-                        for node_id, out_data in outputs.items():
-                            if 'images' in out_data:
-                                imgs = out_data['images']
-                                if imgs:
-                                    filename = imgs[0]['filename']
-                                    subfolder = imgs[0].get('subfolder', '')
-                                    
-                                    comfy_output = self.comfy_dir / "ComfyUI" / "output"
-                                    src = comfy_output / subfolder / filename if subfolder else comfy_output / filename
-                                    
-                                    if src.exists():
-                                        dest = self.workspace / filename
-                                        dest.write_bytes(src.read_bytes())
-                                        return filename
-                    if status.get('status_str') == 'error':
-                        return None
-            except OperationCancelled:
-                raise
-            except:
-                pass
+                if src.exists():
+                    copy_output_file(src, dest)
+                else:
+                    api.download(image, dest)
+            except Exception as e:
+                _LOG.info("[ImageGen] Could not copy %s: %s", filename, e)
+                continue
+            return filename
         return None
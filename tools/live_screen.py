@@ -1,10 +1,11 @@
 from __future__ import annotations
 
+import os
 import threading
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Callable, Optional, Tuple
 
 from config import CFG
 from tools.screen_capture import (
@@ -13,10 +14,13 @@ from tools.screen_capture import (
     ScreenCaptureError,
     capture_screen_view_to_path,
 )
+from tools.screen_diff import FrameChange, FrameSignature, compare_signatures, read_signature
 
 
 CaptureCallback = Callable[[Path], None]
 ErrorCallback = Callable[[str], None]
+CaptureFunction = Callable[..., Path]
+FrameReader = Callable[[Path], FrameSignature]
 
 
 @dataclass(frozen=True)
@@ -28,6 +32,10 @@ class LiveScreenState:
     interval_s: float
     last_capture_ts: float = 0.0
     last_error: str = ""
+    last_change_ts: float = 0.0
+    change_bbox: Optional[Tuple[int, int, int, int]] = None
+    next_interval_s: float = 0.0
+    suppressed_frames: int = 0
 
 
 class LiveScreenSession:
@@ -38,6 +46,8 @@ class LiveScreenSession:
         interval_s: float | None = None,
         max_stale_s: float | None = None,
         filename: str | None = None,
+        capture_fn: CaptureFunction | None = None,
+        frame_reader: FrameReader | None = None,
     ) -> None:
         self.data_dir = Path(data_dir)
         self._interval_s = float(interval_s if interval_s is not None else getattr(CFG, "LIVE_SCREEN_INTERVAL_S", 10.0))
@@ -58,6 +68,17 @@ class LiveScreenSession:
         self._thread: Optional[threading.Thread] = None
         self._on_capture: Optional[CaptureCallback] = None
         self._on_error: Optional[ErrorCallback] = None
+        self._capture_fn: CaptureFunction = capture_fn or capture_screen_view_to_path
+        self._frame_reader: FrameReader = frame_reader or read_signature
+        self._change_threshold = float(getattr(CFG, "LIVE_SCREEN_CHANGE_THRESHOLD", 0.002))
+        self._adaptive = bool(getattr(CFG, "LIVE_SCREEN_ADAPTIVE", True))
+        self._min_interval_s = float(getattr(CFG, "LIVE_SCREEN_MIN_INTERVAL_S", 1.0))
+        self._idle_max_factor = float(getattr(CFG, "LIVE_SCREEN_IDLE_MAX_FACTOR", 3.0))
+        self._signature: Optional[FrameSignature] = None
+        self._last_change: Optional[FrameChange] = None
+        self._last_change_ts = 0.0
+        self._next_interval_s = self._interval_s
+        self._suppressed_frames = 0
 
     def state(self) -> LiveScreenState:
         with self._lock:
@@ -69,6 +90,10 @@ class LiveScreenSession:
                 interval_s=self._interval_s,
                 last_capture_ts=self._last_capture_ts,
                 last_error=self._last_error,
+                last_change_ts=self._last_change_ts,
+                change_bbox=self._last_change.bbox if self._last_change is not None else None,
+                next_interval_s=self._next_interval_s,
+                suppressed_frames=self._suppressed_frames,
             )
 
     def is_enabled(self) -> bool:
@@ -95,6 +120,15 @@ class LiveScreenSession:
     def set_interval(self, interval_s: float) -> None:
         with self._lock:
             self._interval_s = max(float(interval_s), 0.5)
+            self._next_interval_s = self._interval_s
+
+    def next_interval_s(self) -> float:
+        with self._lock:
+            return self._next_interval_s
+
+    def last_change(self) -> Optional[FrameChange]:
+        with self._lock:
+            return self._last_change
 
     def set_mode(self, mode: str) -> None:
         normalized = str(mode or CAPTURE_MODE_DISPLAY).strip().lower() or CAPTURE_MODE_DISPLAY
@@ -113,6 +147,8 @@ class LiveScreenSession:
             self._on_capture = on_capture
             self._on_error = on_error
             self._stop_evt = threading.Event()
+            self._signature = None
+            self._next_interval_s = self._interval_s
         path = self.capture_once()
         with self._lock:
             if self._thread is None or not self._thread.is_alive():
@@ -139,21 +175,66 @@ class LiveScreenSession:
         return self._capture_to_path(self.focus_image_path, mode=CAPTURE_MODE_POINTER, notify=False)
 
     def _capture_to_path(self, output_path: Path, *, mode: str, notify: bool) -> Path:
+        if not notify:
+            with self._capture_lock:
+                return self._capture_fn(output_path, mode=mode)
         with self._capture_lock:
-            path = capture_screen_view_to_path(output_path, mode=mode)
+            path, change = self._capture_frame(output_path, mode=mode)
         callback: Optional[CaptureCallback] = None
         with self._lock:
-            if notify:
-                self._last_capture_ts = time.time()
-                self._last_error = ""
+            self._last_capture_ts = time.time()
+            self._last_error = ""
+            if change.changed:
+                self._last_change = change
+                self._last_change_ts = self._last_capture_ts
                 callback = self._on_capture
-        if notify and callback is not None:
+            else:
+                self._suppressed_frames += 1
+            self._next_interval_s = self._adapted_interval(changed=change.changed)
+        if callback is not None:
             try:
                 callback(path)
             except Exception:
                 pass
         return path
 
+    def _capture_frame(self, output_path: Path, *, mode: str) -> Tuple[Path, FrameChange]:
+        """Capture beside *output_path* and publish the frame only if it changed.
+
+        Unchanged frames leave the published file (and its mtime) alone, so the
+        vision data-URL cache keeps serving the frame that is already encoded.
+        Frames are compared with the last published one, so slow drift below
+        the threshold still adds up to a change eventually.
+        """
+        output_path = Path(output_path)
+        scratch = output_path.with_name(f"{output_path.stem}.next{output_path.suffix or '.jpg'}")
+        captured = Path(self._capture_fn(scratch, mode=mode))
+        try:
+            signature = self._frame_reader(captured)
+            with self._lock:
+                previous = self._signature if output_path.exists() else None
+            change = compare_signatures(previous, signature, threshold=self._change_threshold)
+            if change.changed:
+                os.replace(captured, output_path)
+                with self._lock:
+                    self._signature = signature
+        finally:
+            try:
+                captured.unlink(missing_ok=True)
+            except Exception:
+                pass
+        return output_path, change
+
+    def _adapted_interval(self, *, changed: bool) -> float:
+        base = self._interval_s
+        if not self._adaptive:
+            return base
+        if changed:
+            return max(min(self._min_interval_s, base), base * 0.5)
+        # Back off while the screen is idle, but stay well inside the freshness window.
+        ceiling = max(base, min(base * self._idle_max_factor, self._effective_max_stale(base) * 0.5))
+        return min(ceiling, self._next_interval_s * 1.5)
+
     def current_image_path(self, *, require_fresh: bool = True) -> Optional[Path]:
         with self._lock:
             enabled = self._enabled
@@ -174,7 +255,7 @@ class LiveScreenSession:
                 stop_evt = self._stop_evt
                 enabled = self._enabled
                 error_callback = self._on_error
-                interval_s = self._interval_s
+                interval_s = self._next_interval_s
             if not enabled or stop_evt.is_set():
                 return
             if stop_evt.wait(interval_s):
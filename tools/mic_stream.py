@@ -0,0 +1,207 @@
+"""tools/mic_stream.py
+
+Streaming recognition for Web UI mic audio sent as binary frames.
+
+Decoded 16 kHz audio lands in a fixed-size ``MicSampleRing``. A worker
+thread watches the signal level and hands each utterance to the recogniser
+as soon as the speaker pauses, so most of the transcript already exists when
+the user releases the mic and only the tail is recognised afterwards.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import numpy as np
+
+from tools.audio_decode import TARGET_RATE, AudioDecodeError, StreamDecoder
+
+_VAD_WINDOW = TARGET_RATE // 50  # 20 ms
+_END = object()
+_CANCEL = object()
+
+
+class MicSampleRing:
+    """Fixed-capacity float32 buffer addressed by absolute sample index."""
+
+    def __init__(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError("Ring buffer capacity must be positive")
+        self._data = np.zeros(int(capacity), dtype=np.float32)
+        self.total = 0  # samples ever written
+
+    @property
+    def capacity(self) -> int:
+        return self._data.size
+
+    @property
+    def oldest(self) -> int:
+        """Absolute index of the oldest sample still held."""
+        return max(0, self.total - self.capacity)
+
+    def write(self, samples: np.ndarray) -> None:
+        samples = np.asarray(samples, dtype=np.float32)[-self.capacity:]
+        start = self.total % self.capacity
+        first = min(samples.size, self.capacity - start)
+        self._data[start : start + first] = samples[:first]
+        self._data[: samples.size - first] = samples[first:]
+        self.total += samples.size
+
+    def read(self, start: int, end: int) -> np.ndarray:
+        """Samples ``[start, end)``, clipped to what the buffer still holds."""
+        start = max(int(start), self.oldest)
+        end = min(int(end), self.total)
+        if end <= start:
+            return np.zeros(0, dtype=np.float32)
+        first, last = start % self.capacity, end % self.capacity
+        if first < last:
+            return self._data[first:last].copy()
+        return np.concatenate([self._data[first:], self._data[:last]])
+
+    def snapshot(self) -> np.ndarray:
+        return self.read(self.oldest, self.total)
+
+
+@dataclass(frozen=True)
+class MicStreamResult:
+    text: str
+    audio: np.ndarray
+    segments: tuple[str, ...]
+    early_segments: int  # recognised before finish() was called
+    duration_s: float
+    tail_s: float  # time from finish() to the final transcript
+
+
+class MicStream:
+    """Decode mic frames into a ring buffer and transcribe at speech pauses.
+
+    ``transcribe`` receives float32 16 kHz mono segments. Decoding and
+    recognition run on one worker thread, so ``feed`` never blocks the
+    caller; errors surface from ``finish``.
+    """
+
+    def __init__(
+        self,
+        decoder: StreamDecoder,
+        transcribe: Callable[[np.ndarray], str],
+        *,
+        max_seconds: float = 120.0,
+        silence_s: float = 0.6,
+        min_segment_s: float = 1.0,
+        max_segment_s: float = 20.0,
+        silence_rms: float = 0.01,
+        on_segment: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        self._decoder = decoder
+        self._transcribe = transcribe
+        self._on_segment = on_segment
+        self._silence_samples = int(silence_s * TARGET_RATE)
+        self._min_segment = int(min_segment_s * TARGET_RATE)
+        self._max_segment = int(max_segment_s * TARGET_RATE)
+        self._silence_rms = float(silence_rms)
+        self._ring = MicSampleRing(max(int(max_seconds * TARGET_RATE), self._max_segment))
+        self._segment_start = 0
+        self._vad_cursor = 0
+        self._silence_run = 0
+        self._voiced = False
+        self._segments: list[str] = []
+        self._early = 0
+        self._finishing = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._queue: "queue.Queue[object]" = queue.Queue()
+        self._result: Optional[MicStreamResult] = None
+        self._finish_requested_at = 0.0
+        self._thread = threading.Thread(target=self._run, name="mic-stream", daemon=True)
+        self._thread.start()
+
+    @property
+    def samples(self) -> int:
+        return self._ring.total
+
+    def feed(self, data: bytes) -> None:
+        self._queue.put(bytes(data))
+
+    def finish(self, timeout: Optional[float] = None) -> MicStreamResult:
+        """Recognise the remaining audio and return the whole transcript."""
+        self._finish_requested_at = time.perf_counter()
+        self._finishing.set()
+        self._queue.put(_END)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            raise TimeoutError("Mic stream did not finish in time")
+        if self._error is not None:
+            raise self._error
+        assert self._result is not None
+        return self._result
+
+    def cancel(self) -> None:
+        self._queue.put(_CANCEL)
+
+    # ── worker ──────────────────────────────────────────────────────────
+
+    def _run(self) -> None:
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _CANCEL:
+                    return
+                if item is _END:
+                    self._append(self._decoder.finish())
+                    self._cut(self._ring.total)
+                    self._result = MicStreamResult(
+                        text=" ".join(self._segments).strip(),
+                        audio=self._ring.snapshot(),
+                        segments=tuple(self._segments),
+                        early_segments=self._early,
+                        duration_s=self._ring.total / TARGET_RATE,
+                        tail_s=time.perf_counter() - self._finish_requested_at,
+                    )
+                    return
+                self._append(self._decoder.feed(item))
+        except BaseException as exc:
+            self._error = exc if isinstance(exc, (AudioDecodeError, ValueError)) else AudioDecodeError(f"Mic stream failed: {exc}")
+
+    def _append(self, audio: np.ndarray) -> None:
+        # Segment-sized slices, so the VAD sees every sample before the ring wraps.
+        for start in range(0, audio.size, self._max_segment):
+            self._ring.write(audio[start : start + self._max_segment])
+            self._scan()
+
+    def _scan(self) -> None:
+        while self._ring.total - self._vad_cursor >= _VAD_WINDOW:
+            window = self._ring.read(self._vad_cursor, self._vad_cursor + _VAD_WINDOW)
+            self._vad_cursor += _VAD_WINDOW
+            if float(np.sqrt(np.mean(window**2))) >= self._silence_rms:
+                self._voiced = True
+                self._silence_run = 0
+            else:
+                self._silence_run += _VAD_WINDOW
+            length = self._vad_cursor - self._segment_start
+            if not self._voiced:
+                # Keep a little leading silence, drop the rest.
+                self._segment_start = max(self._segment_start, self._vad_cursor - self._silence_samples)
+            elif (self._silence_run >= self._silence_samples and length >= self._min_segment) or length >= self._max_segment:
+                self._cut(self._vad_cursor)
+
+    def _cut(self, end: int) -> None:
+        segment = self._ring.read(self._segment_start, end)
+        self._segment_start = end
+        self._voiced = False
+        self._silence_run = 0
+        if segment.size == 0:
+            return
+        text = str(self._transcribe(segment) or "").strip()
+        if not text:
+            return
+        self._segments.append(text)
+        if not self._finishing.is_set():
+            self._early += 1
+        if self._on_segment is not None:
+            try:
+                self._on_segment(text)
+            except Exception:
+                pass
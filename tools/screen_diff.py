@@ -0,0 +1,209 @@
+"""Frame-difference stage for live screen capture.
+
+Each captured frame gets a ``FrameSignature``: a byte digest, a 64-bit
+difference hash and a small luma grid (area-averaged thumbnail). Comparing two
+signatures says whether the screen changed enough to matter and where, as a
+bounding box in source pixels, so identical frames can be dropped.
+
+Frames are decoded with Pillow's draft mode. Without Pillow (or for a frame it
+cannot read) a frame gets a digest-only signature: identical bytes are
+suppressed, anything else counts as a full-frame change. That makes dedup far
+weaker (a ticking clock defeats it), so the first such frame logs a warning.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+from tools.vision_image import area_downscale
+
+_LOG = logging.getLogger(__name__)
+
+
+GRID_COLUMNS = 64
+HASH_SIZE = 8
+CELL_DELTA = 6.0
+HASH_DISTANCE = 6
+
+_DIGEST_ONLY_WARNED = False
+
+Box = Tuple[int, int, int, int]
+
+
+@dataclass(frozen=True, eq=False)
+class FrameSignature:
+    digest: str
+    width: int = 0
+    height: int = 0
+    dhash: int = 0
+    grid: Optional[np.ndarray] = None
+
+    @property
+    def has_pixels(self) -> bool:
+        return self.grid is not None
+
+
+@dataclass(frozen=True)
+class FrameChange:
+    changed: bool
+    identical: bool
+    changed_fraction: float
+    hash_distance: int
+    bbox: Optional[Box] = None
+
+
+def _luma(pixels: np.ndarray) -> np.ndarray:
+    values = np.asarray(pixels)
+    if values.ndim == 2:
+        return values.astype(np.uint8, copy=False)
+    rgb = values[:, :, :3].astype(np.float32)
+    return np.clip(np.rint(rgb @ np.array([0.299, 0.587, 0.114], dtype=np.float32)), 0, 255).astype(np.uint8)
+
+
+def _difference_hash(grid: np.ndarray) -> int:
+    small = area_downscale(grid, HASH_SIZE + 1, HASH_SIZE).astype(np.int16)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return int(np.packbits(bits).view(">u8")[0])
+
+
+def signature_from_pixels(
+    pixels: np.ndarray,
+    *,
+    digest: str = "",
+    frame_size: Optional[Tuple[int, int]] = None,
+) -> FrameSignature:
+    """Signature for an ``(H, W[, C])`` frame.
+
+    *digest* defaults to a hash of the pixels; *frame_size* is the full
+    ``(width, height)`` when *pixels* is a reduced-scale decode.
+    """
+    luma = _luma(pixels)
+    height, width = luma.shape
+    rows = max(1, int(round(GRID_COLUMNS * height / float(width))))
+    grid = area_downscale(luma, min(GRID_COLUMNS, width), min(rows, height))
+    full_width, full_height = frame_size or (width, height)
+    return FrameSignature(
+        digest=digest or hashlib.blake2b(luma.tobytes(), digest_size=16).hexdigest(),
+        width=int(full_width),
+        height=int(full_height),
+        dhash=_difference_hash(grid),
+        grid=grid,
+    )
+
+
+def _pillow_luma(path: Path) -> Optional[Tuple[np.ndarray, Tuple[int, int]]]:
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    try:
+        with Image.open(path) as image:
+            full_size = image.size
+            # JPEG draft mode decodes at 1/2..1/8 scale straight from the DCT.
+            image.draft("L", (max(1, full_size[0] // 8), max(1, full_size[1] // 8)))
+            return np.asarray(image.convert("L")), full_size
+    except Exception:
+        return None
+
+
+def _warn_digest_only(path: Path) -> None:
+    global _DIGEST_ONLY_WARNED
+    if _DIGEST_ONLY_WARNED:
+        return
+    _DIGEST_ONLY_WARNED = True
+    try:
+        import PIL  # noqa: F401
+
+        reason = f"Pillow could not read {Path(path).name}"
+    except ImportError:
+        reason = "Pillow is not installed"
+    _LOG.warning(
+        "[LiveScreen] %s; frames are compared by byte digest only, so any pixel change counts as a full-frame change.",
+        reason,
+    )
+
+
+def read_signature(path: Path) -> FrameSignature:
+    """Signature for the frame stored at *path*."""
+    data = Path(path).read_bytes()
+    digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+    decoded = _pillow_luma(Path(path))
+    if decoded is None:
+        _warn_digest_only(Path(path))
+        return FrameSignature(digest=digest)
+    luma, full_size = decoded
+    return signature_from_pixels(luma, digest=digest, frame_size=full_size)
+
+
+def _changed_box(mask: np.ndarray, width: int, height: int) -> Box:
+    rows = np.flatnonzero(mask.any(axis=1))
+    cols = np.flatnonzero(mask.any(axis=0))
+    grid_h, grid_w = mask.shape
+    # One cell of margin so text cut at a cell edge stays readable.
+    top, bottom = max(0, rows[0] - 1), min(grid_h, rows[-1] + 2)
+    left, right = max(0, cols[0] - 1), min(grid_w, cols[-1] + 2)
+    return (
+        int(np.floor(left * width / grid_w)),
+        int(np.floor(top * height / grid_h)),
+        int(np.ceil(right * width / grid_w)),
+        int(np.ceil(bottom * height / grid_h)),
+    )
+
+
+def compare_signatures(
+    previous: Optional[FrameSignature],
+    current: FrameSignature,
+    *,
+    threshold: float = 0.002,
+) -> FrameChange:
+    """Classify *current* against *previous*.
+
+    A frame counts as changed when at least *threshold* of the grid cells moved
+    by more than ``CELL_DELTA`` luma levels, or the difference hashes are
+    ``HASH_DISTANCE`` bits apart.
+    """
+    full = (0, 0, current.width, current.height) if current.width and current.height else None
+    whole_frame = FrameChange(
+        changed=True,
+        identical=False,
+        changed_fraction=1.0,
+        hash_distance=HASH_SIZE * HASH_SIZE,
+        bbox=full,
+    )
+    if previous is None:
+        return whole_frame
+    if previous.digest == current.digest:
+        return FrameChange(changed=False, identical=True, changed_fraction=0.0, hash_distance=0)
+    comparable = (
+        previous.has_pixels
+        and current.has_pixels
+        and previous.grid.shape == current.grid.shape
+        and (previous.width, previous.height) == (current.width, current.height)
+    )
+    if not comparable:
+        return whole_frame
+    distance = int(bin(previous.dhash ^ current.dhash).count("1"))
+    mask = np.abs(current.grid.astype(np.int16) - previous.grid.astype(np.int16)) > CELL_DELTA
+    fraction = float(mask.mean())
+    if not mask.any():
+        changed = distance >= HASH_DISTANCE
+        return FrameChange(
+            changed=changed,
+            identical=False,
+            changed_fraction=0.0,
+            hash_distance=distance,
+            bbox=full if changed else None,
+        )
+    changed = fraction >= float(threshold) or distance >= HASH_DISTANCE
+    return FrameChange(
+        changed=changed,
+        identical=False,
+        changed_fraction=fraction,
+        hash_distance=distance,
+        bbox=_changed_box(mask, current.width, current.height),
+    )
@@ -4,23 +4,42 @@ Online Search Tool using DuckDuckGo + Jina.ai Reader.
 """
 
 import logging
+import threading
 import time
 import urllib.request
 import urllib.parse
-import ssl
 import re
 import html
+import ipaddress
+import socket
 import warnings
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from html.parser import HTMLParser
 from pathlib import Path
 
+import requests
+from requests.adapters import HTTPAdapter
+
 # Maximum bytes to read from a single page during deep-dive
 _FETCH_MAX_BYTES = 1024 * 1024  # 1 MiB
 _READ_CHUNK_SIZE = 4 * 1024     # 4 KiB chunks
+_READER_PREFIX = "https://r.jina.ai/"  # remote fallback, see SEARCH_REMOTE_READER_FALLBACK
+_BROWSER_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/124.0 Safari/537.36"
+)
+_PAGE_ACCEPT = "text/html,application/xhtml+xml;q=0.9,text/plain;q=0.8,*/*;q=0.5"
+_DEEP_DIVE_STRAGGLER_GRACE_S = 1.0
+_MAX_REDIRECTS = 5
+_REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
 
+from core import tracing
 from core.runtime_control import CancellationToken, OperationCancelled
 from core.search_contracts import SEARCH_TOOL_ERROR_PREFIX
 from core.search.backends.searxng import SearXNGBackend
+from core.search import readability
+from core.search.page_cache import SearchPageCache
+from core.search.result_cache import SearchResultCache
 # 1. Search Library
 # Import lazily/fault-tolerantly so test harnesses can patch perform_search/DDGS
 # without requiring the live DuckDuckGo backend in every environment.
@@ -156,41 +175,246 @@ def _raise_if_cancelled(cancel_token: CancellationToken | None) -> None:
         cancel_token.raise_if_cancelled()
 
 
+class _LinkedCancellationToken(CancellationToken):
+    """Cancelled when either this token or its parent token is cancelled."""
+
+    def __init__(self, parent: CancellationToken | None = None) -> None:
+        super().__init__()
+        self._parent = parent
+
+    @property
+    def is_cancelled(self) -> bool:
+        return super().is_cancelled or (self._parent is not None and self._parent.is_cancelled)
+
+    def raise_if_cancelled(self, reason: str | None = None) -> None:
+        if self._parent is not None:
+            self._parent.raise_if_cancelled(reason)
+        super().raise_if_cancelled(reason)
+
+
+# Deep-dive fetches all go through the reader host, so one keep-alive pool per
+# host (sized to the deep-dive worker count) saves a TLS handshake per page.
+_HTTP_SESSION: requests.Session | None = None
+_HTTP_SESSION_LOCK = threading.Lock()
+_PAGE_CACHE: SearchPageCache | None = None
+_PAGE_CACHE_LOCK = threading.Lock()
+_RESULT_CACHE: SearchResultCache | None = None
+_RESULT_CACHE_LOCK = threading.Lock()
+
+
+def _http_session() -> requests.Session:
+    global _HTTP_SESSION
+    with _HTTP_SESSION_LOCK:
+        if _HTTP_SESSION is None:
+            pool_size = max(1, int(getattr(CFG, "SEARCH_DEEP_DIVE_WORKERS", 6) or 1))
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=pool_size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.verify = True
+            _HTTP_SESSION = session
+        return _HTTP_SESSION
+
+
+def _page_cache() -> SearchPageCache | None:
+    global _PAGE_CACHE
+    if not bool(getattr(CFG, "SEARCH_PAGE_CACHE_ENABLED", True)):
+        return None
+    root = Path(getattr(CFG, "SEARCH_PAGE_CACHE_DIR", Path(CFG.DATA_DIR) / "cache" / "search_pages"))
+    ttl_s = float(getattr(CFG, "SEARCH_PAGE_CACHE_TTL_S", 3600.0))
+    max_entries = int(getattr(CFG, "SEARCH_PAGE_CACHE_MAX_ENTRIES", 500))
+    with _PAGE_CACHE_LOCK:
+        cache = _PAGE_CACHE
+        if cache is None or cache.root != root:
+            cache = SearchPageCache(root, ttl_s=ttl_s, max_entries=max_entries)
+            _PAGE_CACHE = cache
+        cache.ttl_s = max(0.0, ttl_s)
+        cache.max_entries = max(1, max_entries)
+        return cache
+
+
+class _PooledResponse:
+    """urlopen-style view over a streamed `requests` response."""
+
+    def __init__(self, response: requests.Response) -> None:
+        self._response = response
+        self.status = int(response.status_code)
+        self.headers = response.headers
+        self._exhausted = self.status in (204, 304)
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            data = self._response.raw.read(decode_content=True) or b""
+            self._exhausted = True
+            return data
+        data = self._response.raw.read(size, decode_content=True) or b""
+        if not data:
+            self._exhausted = True
+        return data
+
+    def close(self) -> None:
+        # A fully read body hands the keep-alive connection back to the pool;
+        # an abandoned one has to drop the socket.
+        if self._exhausted:
+            self._response.raw.release_conn()
+        else:
+            self._response.close()
+
+    def __enter__(self) -> "_PooledResponse":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def _require_public_url(url: str) -> None:
+    """Refuse URLs that resolve to loopback, link-local, private or reserved hosts.
+
+    Result links come from the open web, so a page (or a redirect it issues)
+    must not be able to point the fetcher at the LAN or the local machine.
+    """
+    parts = urllib.parse.urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError(f"refusing to fetch non-http URL: {url!r}")
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    try:
+        infos = socket.getaddrinfo(parts.hostname, port, type=socket.SOCK_STREAM)
+    except socket.gaierror as e:
+        raise ValueError(f"cannot resolve {parts.hostname}: {e}") from e
+    for info in infos:
+        address = ipaddress.ip_address(str(info[4][0]).split("%", 1)[0])
+        mapped = getattr(address, "ipv4_mapped", None)
+        if mapped is not None:
+            address = mapped
+        if not address.is_global or address.is_multicast:
+            raise ValueError(f"refusing to fetch non-public address {address} for {parts.hostname}")
+
+
+def _open_page(url: str, *, headers: dict[str, str], timeout: float) -> _PooledResponse:
+    # Redirects are followed by hand so every hop passes the address check.
+    session = _http_session()
+    for _hop in range(_MAX_REDIRECTS + 1):
+        _require_public_url(url)
+        response = session.get(url, headers=headers, timeout=timeout, stream=True, allow_redirects=False)
+        location = response.headers.get("Location") if response.status_code in _REDIRECT_STATUSES else None
+        if not location:
+            return _PooledResponse(response)
+        response.close()
+        url = urllib.parse.urljoin(url, location)
+    raise RuntimeError(f"too many redirects (> {_MAX_REDIRECTS})")
+
+
+def _read_body(resp, *, deadline: float, cancel_token: CancellationToken | None) -> bytes:
+    chunks: list[bytes] = []
+    total = 0
+    read_fn = getattr(resp, "read1", resp.read)
+    while total < _FETCH_MAX_BYTES:
+        if time.monotonic() > deadline:
+            raise TimeoutError(
+                f"fetch wall timeout after {CFG.SEARCH_FETCH_WALL_TIMEOUT_S}s"
+            )
+        _raise_if_cancelled(cancel_token)
+        chunk = read_fn(_READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        total += len(chunk)
+    return b"".join(chunks)
+
+
+def _is_text_type(content_type: str) -> bool:
+    """Whether a body can be decoded locally; PDFs and other binaries cannot."""
+    kind = (content_type or "").split(";", 1)[0].strip().casefold()
+    if not kind or kind.startswith("text/"):
+        return True
+    return kind in ("application/xhtml+xml", "application/json") or kind.endswith("+json")
+
+
+def _page_text(raw: bytes, content_type: str) -> str:
+    """Readable text of a fetched page: HTML goes through the local extractor."""
+    text = readability.decode_html(raw, content_type)
+    if not readability.looks_like_html(text, content_type):
+        return text
+    with tracing.span("search.extract", cat="search", bytes=len(raw)):
+        return readability.extract_page(
+            text,
+            workers=max(0, int(getattr(CFG, "SEARCH_EXTRACT_WORKERS", 2) or 0)),
+            timeout_s=float(getattr(CFG, "SEARCH_EXTRACT_TIMEOUT_S", 3.0)),
+        )
+
+
+def _fetch_via_reader(url: str, *, deadline: float, cancel_token: CancellationToken | None) -> str:
+    with _open_page(
+        f"{_READER_PREFIX}{url}",
+        headers={"User-Agent": "Mozilla/5.0"},
+        timeout=CFG.SEARCH_URL_FETCH_TIMEOUT_S,
+    ) as resp:
+        _raise_if_cancelled(cancel_token)
+        status = int(getattr(resp, "status", 200) or 200)
+        if status >= 400:
+            raise RuntimeError(f"HTTP Error {status}")
+        return _read_body(resp, deadline=deadline, cancel_token=cancel_token).decode("utf-8", errors="ignore")
+
+
 def fetch_clean_text(url, *, cancel_token: CancellationToken | None = None):
     deadline = time.monotonic() + CFG.SEARCH_FETCH_WALL_TIMEOUT_S
+    cache = _page_cache()
+    cached = None
+    if cache is not None:
+        cached, fresh = cache.lookup(url)
+        if cached is not None and fresh:
+            return cached.content
+    remote_fallback = bool(getattr(CFG, "SEARCH_REMOTE_READER_FALLBACK", False))
     try:
         _raise_if_cancelled(cancel_token)
-        reader_url = f"https://r.jina.ai/{url}"
-        req = urllib.request.Request(reader_url, headers={'User-Agent': 'Mozilla/5.0'})
-        context = ssl.create_default_context()
-        context.check_hostname = False
-        context.verify_mode = ssl.CERT_NONE
+        headers = {"User-Agent": _BROWSER_USER_AGENT, "Accept": _PAGE_ACCEPT}
+        if cached is not None:
+            headers.update(cached.conditional_headers())
 
-        with urllib.request.urlopen(req, timeout=CFG.SEARCH_URL_FETCH_TIMEOUT_S, context=context) as resp:
-            _raise_if_cancelled(cancel_token)
-            chunks: list[bytes] = []
-            total = 0
-            read_fn = getattr(resp, "read1", resp.read)
-            while total < _FETCH_MAX_BYTES:
-                if time.monotonic() > deadline:
-                    raise TimeoutError(
-                        f"fetch wall timeout after {CFG.SEARCH_FETCH_WALL_TIMEOUT_S}s"
-                    )
+        data = ""
+        resp_headers = {}
+        try:
+            with _open_page(url, headers=headers, timeout=CFG.SEARCH_URL_FETCH_TIMEOUT_S) as resp:
                 _raise_if_cancelled(cancel_token)
-                chunk = read_fn(_READ_CHUNK_SIZE)
-                if not chunk:
-                    break
-                chunks.append(chunk)
-                total += len(chunk)
-            data = b"".join(chunks).decode('utf-8', errors='ignore')
+                status = int(getattr(resp, "status", 200) or 200)
+                if status == 304 and cached is not None and cache is not None:
+                    return cache.touch(cached).content
+                if status >= 400:
+                    raise RuntimeError(f"HTTP Error {status}")
+                resp_headers = getattr(resp, "headers", None) or {}
+                content_type = str(resp_headers.get("Content-Type") or "")
+                if not _is_text_type(content_type):
+                    # Left to the remote reader (it handles PDFs); never decoded or cached here.
+                    raise ValueError(f"unsupported content type {content_type.split(';', 1)[0].strip()}")
+                raw = _read_body(resp, deadline=deadline, cancel_token=cancel_token)
+            data = _page_text(raw, content_type)
+        except (OperationCancelled, TimeoutError):
+            raise
+        except Exception:
+            if not remote_fallback:
+                raise
 
-            if len(data) < CFG.SEARCH_MIN_CONTENT_LENGTH:
-                return "Error: Page content too short (likely blocked/empty)"
+        if remote_fallback and (len(data) < CFG.SEARCH_MIN_CONTENT_LENGTH or _looks_like_blocked_page(data)):
+            # Script-rendered and bot-walled pages: let the remote reader try.
+            data = _fetch_via_reader(url, deadline=deadline, cancel_token=cancel_token)
+            resp_headers = {}
 
-            return data
+        if len(data) < CFG.SEARCH_MIN_CONTENT_LENGTH:
+            return "Error: Page content too short (likely blocked/empty)"
+
+        if cache is not None and not _looks_like_blocked_page(data):
+            cache.put(
+                url,
+                data,
+                etag=str(resp_headers.get("ETag") or ""),
+                last_modified=str(resp_headers.get("Last-Modified") or ""),
+            )
+        return data
 
     except OperationCancelled:
         raise
+    except readability.ExtractionTimeout as e:
+        return f"Error reading page: {e}"
     except TimeoutError:
         return f"Error reading page: fetch wall timeout after {CFG.SEARCH_FETCH_WALL_TIMEOUT_S}s"
     except Exception as e:
@@ -528,6 +752,61 @@ def _run_searxng_search(
     ]
 
 
+def _result_cache() -> SearchResultCache | None:
+    global _RESULT_CACHE
+    if not bool(getattr(CFG, "SEARCH_RESULT_CACHE_ENABLED", True)):
+        return None
+    with _RESULT_CACHE_LOCK:
+        cache = _RESULT_CACHE
+        if cache is None:
+            cache = SearchResultCache()
+            _RESULT_CACHE = cache
+        cache.ttl_s = max(0.0, float(getattr(CFG, "SEARCH_RESULT_CACHE_TTL_S", 1800.0)))
+        cache.news_ttl_s = max(0.0, float(getattr(CFG, "SEARCH_RESULT_CACHE_NEWS_TTL_S", 300.0)))
+        cache.max_entries = max(1, int(getattr(CFG, "SEARCH_RESULT_CACHE_MAX_ENTRIES", 256)))
+        return cache
+
+
+def search_result_cache_stats() -> dict:
+    """Hit/miss counters and hit rate of the search result cache."""
+    cache = _RESULT_CACHE
+    if cache is None:
+        return {"hits": 0, "misses": 0, "stores": 0, "expired": 0, "evictions": 0, "entries": 0, "hit_rate": 0.0}
+    return cache.snapshot()
+
+
+def _search_attempt(
+    *,
+    backend: str,
+    mode: str,
+    query: str,
+    run,
+    log,
+) -> tuple[list[dict], list[dict]]:
+    """Run one backend query, reusing a cached answer and its relevance filter."""
+    cache = _result_cache()
+    if cache is not None:
+        cached = cache.get("attempt", backend, mode, query)
+        if cached is not None:
+            log(f"Search cache hit ({mode}): {query}")
+            results, relevant_results = cached
+            return results, relevant_results
+    with tracing.span("search.query", cat="search", backend=backend, mode=mode) as query_span:
+        results = list(run() or [])
+        query_span.set(results=len(results))
+    relevant_results = _filter_relevant_results(results, query) if results else []
+    if cache is not None and results:
+        cache.put(
+            "attempt",
+            backend,
+            mode,
+            query,
+            (results, relevant_results),
+            news=_query_looks_like_news(query),
+        )
+    return results, relevant_results
+
+
 def _searxng_query_variants(original_query: str) -> list[str]:
     clean = " ".join(str(original_query or "").split()).strip()
     relaxed = _normalize_search_query(clean)
@@ -563,10 +842,49 @@ def _collect_search_results(
     cancel_token: CancellationToken | None = None,
 ) -> tuple[list[dict], str, str]:
     original_query = " ".join(str(query or "").split()).strip()
+    backend = "searxng" if str(CFG.SEARCH_BACKEND or "").strip().lower() == "searxng" else "duckduckgo"
+    cache = _result_cache()
+    if cache is not None:
+        cached = cache.get("collected", backend, "all", original_query)
+        if cached is not None:
+            results, query_label, mode_label = cached
+            log(f"Search cache hit ({backend}): reusing {len(results)} collected result(s) for: {original_query}")
+            return results, query_label, mode_label
+
+    collected, query_label, mode_label = _collect_uncached_search_results(
+        original_query,
+        backend=backend,
+        log=log,
+        cancel_token=cancel_token,
+    )
+    if cache is not None:
+        if collected:
+            cache.put(
+                "collected",
+                backend,
+                "all",
+                original_query,
+                (collected, query_label, mode_label),
+                news=_query_looks_like_news(original_query) or "news" in mode_label.split("+"),
+            )
+        stats = cache.snapshot()
+        log(
+            f"Search cache: hits={stats['hits']} misses={stats['misses']} "
+            f"hit_rate={stats['hit_rate']:.0%}"
+        )
+    return collected, query_label, mode_label
 
+
+def _collect_uncached_search_results(
+    original_query: str,
+    *,
+    backend: str,
+    log,
+    cancel_token: CancellationToken | None = None,
+) -> tuple[list[dict], str, str]:
     # SearXNG path: keep asking with nearby query variants until there is
     # enough source material to report, rather than accepting a thin first page.
-    if str(CFG.SEARCH_BACKEND or "").strip().lower() == "searxng":
+    if backend == "searxng":
         seen_results: set[tuple[str, str]] = set()
         collected: list[dict] = []
         used_queries: list[str] = []
@@ -576,7 +894,13 @@ def _collect_search_results(
         for attempt_query in _searxng_query_variants(original_query):
             log(f"Search attempt (searxng): {attempt_query}")
             try:
-                results = _run_searxng_search(query=attempt_query, cancel_token=cancel_token)
+                results, relevant_results = _search_attempt(
+                    backend=backend,
+                    mode="searxng",
+                    query=attempt_query,
+                    run=lambda: _run_searxng_search(query=attempt_query, cancel_token=cancel_token),
+                    log=log,
+                )
             except OperationCancelled:
                 raise
             except Exception as exc:
@@ -588,7 +912,6 @@ def _collect_search_results(
             if not results:
                 log(f"No results via searxng for: {attempt_query}")
                 continue
-            relevant_results = _filter_relevant_results(results, attempt_query)
             if not relevant_results:
                 log(f"Search results via searxng did not match the core query terms for: {attempt_query}")
                 continue
@@ -661,10 +984,16 @@ def _collect_search_results(
         seen_queries.add(dedupe_key)
         log(f"Search attempt ({mode}): {normalized_attempt}")
         try:
-            results = _run_search_query(
-                query=normalized_attempt,
+            results, relevant_results = _search_attempt(
+                backend=backend,
                 mode=mode,
-                cancel_token=cancel_token,
+                query=normalized_attempt,
+                run=lambda: _run_search_query(
+                    query=normalized_attempt,
+                    mode=mode,
+                    cancel_token=cancel_token,
+                ),
+                log=log,
             )
         except OperationCancelled:
             raise
@@ -675,7 +1004,6 @@ def _collect_search_results(
         _raise_if_cancelled(cancel_token)
         completed_attempt = True
         if results:
-            relevant_results = _filter_relevant_results(results, normalized_attempt)
             if not relevant_results:
                 log(f"Search results via {mode} did not match the core query terms for: {normalized_attempt}")
                 continue
@@ -717,6 +1045,143 @@ def _collect_search_results(
         raise RuntimeError(last_error)
     return [], "", ""
 
+
+def _deep_dive_candidates(results: list[dict], *, log, clean_url) -> list[str]:
+    limit = max(
+        int(CFG.SEARCH_DEEP_DIVE_LINKS_LIMIT),
+        int(getattr(CFG, "SEARCH_DEEP_DIVE_CANDIDATES", CFG.SEARCH_DEEP_DIVE_LINKS_LIMIT)),
+    )
+    links: list[str] = []
+    seen: set[str] = set()
+    for result in results:
+        if len(links) >= limit:
+            break
+        link = _result_url(result)
+        if not link or link in seen:
+            continue
+        if _should_skip_deep_dive(link):
+            log(f"Skipped (media target): {clean_url(link)}")
+            continue
+        seen.add(link)
+        links.append(link)
+    return links
+
+
+def _timed_fetch(link: str, cancel_token: CancellationToken) -> tuple[str, float]:
+    t0 = time.monotonic()
+    with tracing.span("search.fetch", cat="search", url=link):
+        content = fetch_clean_text(link, cancel_token=cancel_token)
+    return str(content or ""), time.monotonic() - t0
+
+
+def _accept_deep_dive_page(link: str, content: str, elapsed: float, query: str, *, log, clean_url) -> bool:
+    if "Error reading page" in content:
+        reason = content.replace("Error reading page: ", "")
+        log(f"Skipped (fetch error): {clean_url(link)} reason={reason} elapsed={elapsed:.1f}s")
+        return False
+    if _looks_like_blocked_page(content):
+        log(f"Skipped (blocked): {clean_url(link)} elapsed={elapsed:.1f}s")
+        return False
+    if not _content_matches_query(content, query):
+        log(f"Skipped (low relevance): {clean_url(link)} elapsed={elapsed:.1f}s")
+        return False
+    if len(content) < CFG.SEARCH_MIN_CONTENT_LENGTH:
+        log(f"Skipped (too short): {clean_url(link)} chars={len(content)} elapsed={elapsed:.1f}s")
+        return False
+    log(f"Fetched: {clean_url(link)} chars={len(content)} elapsed={elapsed:.1f}s")
+    return True
+
+
+def _deep_dive_settled(verdicts: list[str | None], limit: int) -> bool:
+    """True once the first `limit` accepted pages in rank order are known."""
+    accepted = 0
+    for verdict in verdicts:
+        if verdict is None:
+            return False
+        if verdict:
+            accepted += 1
+            if accepted >= limit:
+                return True
+    return True
+
+
+def _deep_dive_pages(
+    results: list[dict],
+    query: str,
+    *,
+    log,
+    clean_url,
+    cancel_token: CancellationToken | None = None,
+) -> list[tuple[str, str]]:
+    """Fetch the top candidates concurrently and keep the first readable ones in rank order.
+
+    Every candidate is fetched at once under one global deadline, so a turn
+    costs roughly the slowest page that is actually needed rather than the sum
+    of all pages. Once the top `SEARCH_DEEP_DIVE_LINKS_LIMIT` accepted pages
+    are settled, or the deadline passes, pages still in flight are dropped.
+    A slow higher-ranked page is waited on for at most a short grace once
+    enough readable lower-ranked pages have arrived.
+    """
+    limit = int(CFG.SEARCH_DEEP_DIVE_LINKS_LIMIT)
+    if limit <= 0:
+        return []
+    links = _deep_dive_candidates(results, log=log, clean_url=clean_url)
+    if not links:
+        return []
+    _raise_if_cancelled(cancel_token)
+
+    deadline_s = float(getattr(CFG, "SEARCH_DEEP_DIVE_DEADLINE_S", CFG.SEARCH_FETCH_WALL_TIMEOUT_S))
+    deadline = time.monotonic() + max(0.0, deadline_s)
+    workers = max(1, min(int(getattr(CFG, "SEARCH_DEEP_DIVE_WORKERS", 6) or 1), len(links)))
+    batch_token = _LinkedCancellationToken(cancel_token)
+    verdicts: list[str | None] = [None] * len(links)
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="piper-search-fetch")
+    futures = {}
+    deadline_hit = False
+    try:
+        for index, link in enumerate(links):
+            log(f"Fetching: {clean_url(link)}")
+            futures[executor.submit(tracing.wrap(_timed_fetch), link, batch_token)] = index
+        pending = set(futures)
+        while pending and not _deep_dive_settled(verdicts, limit):
+            _raise_if_cancelled(cancel_token)
+            if sum(1 for verdict in verdicts if verdict) >= limit:
+                # Enough readable pages are in hand; higher-ranked stragglers
+                # only get a short grace before lower-ranked pages fill in.
+                deadline = min(deadline, time.monotonic() + _DEEP_DIVE_STRAGGLER_GRACE_S)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                deadline_hit = True
+                break
+            done, pending = wait(pending, timeout=min(remaining, 0.25), return_when=FIRST_COMPLETED)
+            for future in done:
+                index = futures[future]
+                link = links[index]
+                try:
+                    content, elapsed = future.result()
+                except OperationCancelled:
+                    _raise_if_cancelled(cancel_token)
+                    content, elapsed = "Error reading page: cancelled", 0.0
+                except Exception as exc:
+                    content, elapsed = f"Error reading page: {exc}", 0.0
+                accepted = _accept_deep_dive_page(link, content, elapsed, query, log=log, clean_url=clean_url)
+                verdicts[index] = content if accepted else ""
+        _raise_if_cancelled(cancel_token)
+    finally:
+        batch_token.cancel("Search deep-dive finished.")
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    unresolved = [links[index] for index, verdict in enumerate(verdicts) if verdict is None]
+    if deadline_hit:
+        for link in unresolved:
+            log(f"Skipped (deadline): {clean_url(link)} budget={deadline_s:.1f}s")
+    elif unresolved:
+        log(f"Deep-dive settled early; dropped {len(unresolved)} lower-ranked fetch(es) still in flight.")
+
+    pages = [(links[index], verdict) for index, verdict in enumerate(verdicts) if verdict]
+    return pages[:limit]
+
+
 def perform_search(query: str, data_dir, log_callback=None, cancel_token: CancellationToken | None = None):
     # Helper to log to both Console and UI
     def log(msg):
@@ -766,47 +1231,20 @@ def perform_search(query: str, data_dir, log_callback=None, cancel_token: Cancel
     for r in filtered[:CFG.SEARCH_SNIPPETS_LIMIT]:
         output_parts.append(f"Title: {r.get('title')}\nSnippet: {r.get('body')}")
 
-    # 3. Greedy Deep Dive (Top 6 Links)
+    # 3. Concurrent Deep Dive (first readable pages in rank order)
     output_parts.append("\n--- DEEP DIVE (Full Content) ---")
     log(f"Deep-diving up to {CFG.SEARCH_DEEP_DIVE_LINKS_LIMIT} links.")
 
-    links_visited = 0
-
-    for r in filtered:
-        _raise_if_cancelled(cancel_token)
-        if links_visited >= CFG.SEARCH_DEEP_DIVE_LINKS_LIMIT:
-            break
-
-        link = _result_url(r)
-        if not link:
-            continue
-
-        if _should_skip_deep_dive(link):
-            log(f"Skipped (media target): {clean_url(link)}")
-            continue
-
-        t0 = time.monotonic()
-        log(f"Fetching: {clean_url(link)}")
-        content = fetch_clean_text(link, cancel_token=cancel_token)
-        elapsed = time.monotonic() - t0
-
-        if "Error reading page" in content:
-            reason = content.replace("Error reading page: ", "")
-            log(f"Skipped (fetch error): {clean_url(link)} reason={reason} elapsed={elapsed:.1f}s")
-            continue
-        if _looks_like_blocked_page(content):
-            log(f"Skipped (blocked): {clean_url(link)} elapsed={elapsed:.1f}s")
-            continue
-        if not _content_matches_query(content, used_query):
-            log(f"Skipped (low relevance): {clean_url(link)} elapsed={elapsed:.1f}s")
-            continue
-        if len(content) < CFG.SEARCH_MIN_CONTENT_LENGTH:
-            log(f"Skipped (too short): {clean_url(link)} chars={len(content)} elapsed={elapsed:.1f}s")
-            continue
-
-        log(f"Fetched: {clean_url(link)} chars={len(content)} elapsed={elapsed:.1f}s")
+    pages = _deep_dive_pages(
+        filtered,
+        used_query,
+        log=log,
+        clean_url=clean_url,
+        cancel_token=cancel_token,
+    )
+    for link, content in pages:
         output_parts.append(f"\nSource: {link}\nContent: {content[:CFG.SEARCH_CONTENT_SLICE_LENGTH]}")
-        links_visited += 1
+    links_visited = len(pages)
 
     output_parts.append(
         f"\nSOURCE COVERAGE: {links_visited} readable source(s) from {len(filtered)} candidate result(s)."
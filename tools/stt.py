@@ -346,20 +346,43 @@ class STTEngine:
         else:
             audio_downsampled = audio_mono.astype(np.float32)
 
+        return self._transcribe_float_16k(audio_downsampled, identify=True, label="transcribe_buffer")
+
+    def transcribe_segment(self, audio_16k: np.ndarray) -> str:
+        """Transcribe one float32 16 kHz mono segment of a streamed recording.
+
+        Applies the same RMS gate as ``transcribe_buffer`` but skips the voice
+        identity hook; call ``identify_voice`` once on the whole recording.
+        """
+        if audio_16k is None or audio_16k.size == 0:
+            return ""
+        return self._transcribe_float_16k(np.asarray(audio_16k, dtype=np.float32), identify=False, label="transcribe_segment")
+
+    def identify_voice(self, audio_16k: np.ndarray) -> None:
+        """Run the voice identity hook on a float32 16 kHz mono recording."""
+        if audio_16k is None or audio_16k.size == 0:
+            return
+        try:
+            _run_voice_identity_hook(self, np.asarray(audio_16k, dtype=np.float32))
+        except Exception as e:
+            _LOG.warning("[STT] identify_voice error: %s", e)
+
+    def _transcribe_float_16k(self, audio: np.ndarray, *, identify: bool, label: str) -> str:
         # RMS gate using the same threshold as native stop_recording.
         # Compute RMS on the normalized float32 array (scale back to int16-equivalent for comparison).
-        int16_equiv = (audio_downsampled * 32768.0).astype(np.float32)
+        int16_equiv = (audio * 32768.0).astype(np.float32)
         rms = float(np.sqrt(np.mean(int16_equiv ** 2)))
         if rms < self._min_rms:
             return ""
 
         try:
             self._load_model()
-            text = _transcribe_audio_array(self.model, audio_downsampled)
-            _run_voice_identity_hook(self, audio_downsampled)
+            text = _transcribe_audio_array(self.model, audio)
+            if identify:
+                _run_voice_identity_hook(self, audio)
             return text
         except Exception as e:
-            _LOG.warning("[STT] transcribe_buffer error: %s", e)
+            _LOG.warning("[STT] %s error: %s", label, e)
             return ""
 
     def set_active_voice_profile(self, user_id: str, *, is_unknown: bool = False) -> None:
@@ -9,6 +9,7 @@ Design goals:
 - stop() support
 - Overlap synthesis and playback (pipeline)
 - Sequential SFX playback (Strict Ordering)
+- Gapless playback through one persistent output stream
 """
 
 from __future__ import annotations
@@ -25,13 +26,14 @@ import queue
 import time
 import types
 import re
+from contextlib import nullcontext
 import traceback
 import wave
 import struct
-import json
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, List, Tuple, Union
+from typing import Optional, List, Sequence, Tuple, Union
 
 try:
     import numpy as np
@@ -39,6 +41,10 @@ except ImportError:
     np = None
 
 from config import CFG
+from core import tracing
+from tools.audio_sink import StreamingAudioSink
+from tools.tts_audio_cache import TTSAudioCache, audio_cache_key, model_fingerprint
+from tools.tts_worker_ipc import WorkerClient, WorkerError
 
 # =============================================================
 # TWEAK THIS: How loud should SFX be compared to normal?
@@ -48,6 +54,11 @@ from config import CFG
 # =============================================================
 SFX_VOLUME_BOOST = 3.5
 
+# Release a held crossfade tail this long before the sink would run dry.
+_SINK_TAIL_MARGIN_S = 0.02
+# Background pre-synthesis re-checks for live speech this often.
+_PRESYNTH_POLL_S = 0.05
+
 
 @dataclass
 class TTSConfig:
@@ -59,6 +70,17 @@ class TTSConfig:
     voice: str = "af_heart"
     speed: float = 0.85
     sample_rate: int = 24000
+    streaming_sink: bool = True
+    sink_buffer_s: float = 8.0
+    sink_crossfade_ms: float = 6.0
+    audio_cache: bool = True
+    audio_cache_dir: Optional[Path] = None
+    audio_cache_max_mb: float = 64.0
+    audio_cache_max_chars: int = 160
+    audio_cache_disk_entries: int = 2000
+    synth_ahead: int = 2
+    synth_workers: int = 0
+    onnx_intra_op_threads: int = 0
 
 
 class TTSError(RuntimeError):
@@ -78,6 +100,41 @@ def log_tts_error(msg: str) -> None:
         pass
 
 
+def _lower_current_thread_priority() -> None:
+    # Best effort: Linux applies a nice value to a single thread id.
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 10)
+    except (AttributeError, OSError):
+        pass
+
+
+def plan_synth_threads(
+    *,
+    ahead: int,
+    workers: int = 0,
+    intra_op_threads: int = 0,
+    cpu_count: Optional[int] = None,
+) -> Tuple[int, int]:
+    """Size the synth-ahead pool together with ONNX intra-op threading.
+
+    Returns ``(workers, intra_op_threads)``. Zero means auto: each parallel
+    synthesis gets an equal share of the cores, so `workers * intra_op`
+    never oversubscribes the machine. One worker means strictly sequential
+    synthesis on the dispatch thread.
+    """
+    cpus = max(1, int(cpu_count or os.cpu_count() or 1))
+    ahead = max(1, int(ahead))
+    workers = int(workers)
+    intra = int(intra_op_threads)
+    if workers <= 0:
+        if intra <= 0:
+            intra = max(1, cpus // ahead)
+        workers = max(1, min(ahead, cpus // intra))
+    elif intra <= 0:
+        intra = max(1, cpus // workers)
+    return max(1, min(workers, ahead)), intra
+
+
 def _load_kokoro_torch_model_class():
     existing = sys.modules.get("kokoro.model")
     if existing is not None and hasattr(existing, "KModel"):
@@ -151,13 +208,22 @@ def _patch_platform_for_windows_torch_import() -> None:
 class _KokoroEngine:
     """Thin wrapper over kokoro-onnx with lazy imports."""
 
+    # Synth-ahead may call `synthesize` from several workers at once.
+    parallel_synthesis = True
+
     def __init__(self, cfg: TTSConfig):
         self.cfg = cfg
         self._kokoro = None
         self._sd = None
         self._loaded = False
         self._load_lock = threading.Lock()
+        # The espeak-backed phonemizer and the CLI fallback are not thread-safe;
+        # only the ONNX session run may overlap between synth-ahead workers.
+        self._phonemize_lock = threading.Lock()
         self._disabled_reason: str = ""
+        # ONNX intra-op threads per session call; 0 keeps the runtime default.
+        # TTS sizes this together with its synth-ahead pool.
+        self.intra_op_threads = 1 if os.name == "nt" else 0
         self._voice_fallback_engine = _KokoroTorchEngine(cfg) if os.name == "nt" else None
         self._fallback_engine = _WindowsSystemSpeechEngine(cfg) if _WindowsSystemSpeechEngine.is_available() else None
         self._espeak_cli_path: str | None = None
@@ -229,7 +295,7 @@ class _KokoroEngine:
 
                     session_options = rt.SessionOptions()
                     try:
-                        session_options.intra_op_num_threads = 1
+                        session_options.intra_op_num_threads = max(1, int(self.intra_op_threads))
                         session_options.inter_op_num_threads = 1
                         session_options.execution_mode = rt.ExecutionMode.ORT_SEQUENTIAL
                         session_options.enable_cpu_mem_arena = False
@@ -246,6 +312,21 @@ class _KokoroEngine:
                         self._kokoro = Kokoro(str(self.cfg.model_path), str(self.cfg.voices_path))
                 except Exception:
                     self._kokoro = Kokoro(str(self.cfg.model_path), str(self.cfg.voices_path))
+            elif self.intra_op_threads > 0 and hasattr(Kokoro, "from_session"):
+                try:
+                    import onnxruntime as rt  # type: ignore
+
+                    session_options = rt.SessionOptions()
+                    session_options.intra_op_num_threads = int(self.intra_op_threads)
+                    session_options.inter_op_num_threads = 1
+                    session = rt.InferenceSession(
+                        str(self.cfg.model_path),
+                        sess_options=session_options,
+                        providers=rt.get_available_providers(),
+                    )
+                    self._kokoro = Kokoro.from_session(session, str(self.cfg.voices_path))
+                except Exception:
+                    self._kokoro = Kokoro(str(self.cfg.model_path), str(self.cfg.voices_path))
             else:
                 self._kokoro = Kokoro(str(self.cfg.model_path), str(self.cfg.voices_path))
             self._loaded = True
@@ -313,6 +394,10 @@ class _KokoroEngine:
         except Exception:
             pass
 
+    def close(self) -> None:
+        if self._voice_fallback_engine is not None:
+            self._voice_fallback_engine.close()
+
     @staticmethod
     def _run_with_timeout(fn, timeout_s: float):
         done = threading.Event()
@@ -439,13 +524,22 @@ class _KokoroEngine:
 
         if hasattr(self._kokoro, "create"):
             try:
-                samples, sr = self._kokoro.create(text, voice=v, speed=spd, lang=self.cfg.lang)
+                phonemes = self._phonemize(text)
+                if phonemes:
+                    samples, sr = self._kokoro.create(
+                        phonemes, voice=v, speed=spd, lang=self.cfg.lang, is_phonemes=True
+                    )
+                else:
+                    # No separate phonemize step: create() phonemizes internally.
+                    with self._phonemize_lock:
+                        samples, sr = self._kokoro.create(text, voice=v, speed=spd, lang=self.cfg.lang)
                 return samples, int(sr)
             except Exception as exc:
                 log_tts_error(f"KOKORO TEXT CREATE ERROR: {exc}")
                 if os.name == "nt":
                     try:
-                        phonemes = self._phonemize_windows_cli(text, self.cfg.lang)
+                        with self._phonemize_lock:
+                            phonemes = self._phonemize_windows_cli(text, self.cfg.lang)
                         if phonemes:
                             samples, sr = self._kokoro.create(
                                 phonemes,
@@ -459,13 +553,25 @@ class _KokoroEngine:
                         log_tts_error(f"KOKORO CLI PHONEME FALLBACK ERROR: {fallback_exc}")
 
         if hasattr(self._kokoro, "tts"):
-            out = self._kokoro.tts(text, voice=v, speed=spd)
+            with self._phonemize_lock:
+                out = self._kokoro.tts(text, voice=v, speed=spd)
             if isinstance(out, tuple) and len(out) == 2:
                 return out[0], int(out[1])
             return out, int(self.cfg.sample_rate)
 
         raise TTSError("Unsupported kokoro-onnx API.")
 
+    def _phonemize(self, text: str) -> str:
+        """Phonemes from kokoro-onnx's own tokenizer, one caller at a time.
+
+        Returns "" when this kokoro-onnx build has no separate phonemize step.
+        """
+        phonemize = getattr(getattr(self._kokoro, "tokenizer", None), "phonemize", None)
+        if not callable(phonemize):
+            return ""
+        with self._phonemize_lock:
+            return str(phonemize(text, self.cfg.lang) or "")
+
     def play(self, samples, sr: int) -> None:
         if os.name == "nt":
             if np is None:
@@ -533,73 +639,36 @@ class _KokoroTorchEngine:
         self._last_stack_dump_log_s: float = 0.0
         self._voices: dict[str, object] = {}
         self._espeak_cli_path: str | None = None
-        self._worker_proc: subprocess.Popen[str] | None = None
-        self._worker_stdout_thread: threading.Thread | None = None
-        self._worker_stderr_thread: threading.Thread | None = None
-        self._worker_events: "queue.Queue[dict[str, object]]" = queue.Queue()
-        self._worker_io_lock = threading.Lock()
-        self._worker_request_counter = 0
-        self._worker_ready = False
+        # Windows runs the model in a worker subprocess; audio comes back as
+        # framed float32 PCM over its pipes (see tools/tts_worker_ipc.py).
+        self._worker: WorkerClient | None = None
+
+    @property
+    def _worker_ready(self) -> bool:
+        worker = self._worker
+        return worker is not None and worker.ready
 
     def _worker_script_path(self) -> Path:
         return Path(__file__).resolve().parents[1] / "scripts" / "kokoro_torch_worker.py"
 
-    def _drain_worker_stdout(self, proc: subprocess.Popen[str]) -> None:
-        assert proc.stdout is not None
-        for raw in proc.stdout:
-            line = str(raw or "").strip()
-            if not line:
-                continue
-            try:
-                event = json.loads(line)
-                self._worker_events.put(event)
-            except Exception:
-                log_tts_error(f"KOKORO TORCH WORKER STDOUT: {line}")
-
-    def _drain_worker_stderr(self, proc: subprocess.Popen[str]) -> None:
-        assert proc.stderr is not None
-        for raw in proc.stderr:
-            line = str(raw or "").rstrip()
-            if line:
-                log_tts_error(f"KOKORO TORCH WORKER STDERR: {line}")
-
     def _start_worker_process(self) -> None:
         if os.name != "nt":
             return
         with self._async_lock:
-            proc = self._worker_proc
-            if proc is not None and proc.poll() is None:
+            if self._worker is None:
+                script_path = self._worker_script_path()
+                if not script_path.exists():
+                    raise TTSError(f"Kokoro worker script missing: {script_path}")
+                self._worker = WorkerClient([str(Path(sys.executable)), "-u", str(script_path)], log=log_tts_error)
+            if self._worker.running:
                 return
-            script_path = self._worker_script_path()
-            if not script_path.exists():
-                raise TTSError(f"Kokoro worker script missing: {script_path}")
-            self._worker_ready = False
-            while not self._worker_events.empty():
-                try:
-                    self._worker_events.get_nowait()
-                except queue.Empty:
-                    break
-            proc = subprocess.Popen(
-                [str(Path(sys.executable)), "-u", str(script_path)],
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,
-            )
-            self._worker_proc = proc
-            self._worker_stdout_thread = threading.Thread(target=self._drain_worker_stdout, args=(proc,), daemon=True)
-            self._worker_stderr_thread = threading.Thread(target=self._drain_worker_stderr, args=(proc,), daemon=True)
-            self._worker_stdout_thread.start()
-            self._worker_stderr_thread.start()
+            try:
+                self._worker.start()
+            except WorkerError as exc:
+                raise TTSError(f"Pure Kokoro worker unavailable: {exc}") from exc
             self._load_started_at = time.time()
             self._last_still_loading_log_s = 0.0
             self._last_stack_dump_log_s = 0.0
-            log_tts_error("KOKORO TORCH WORKER PROCESS START")
-
-    def _next_worker_id(self) -> str:
-        self._worker_request_counter += 1
-        return str(self._worker_request_counter)
 
     def _repo_id(self) -> str:
         return str(getattr(CFG, "TTS_KOKORO_HF_REPO_ID", "hexgrad/Kokoro-82M") or "hexgrad/Kokoro-82M").strip()
@@ -778,28 +847,16 @@ class _KokoroTorchEngine:
         if timeout_s <= 0:
             return self._loaded or self._worker_ready
         if os.name == "nt":
-            deadline = time.time() + timeout_s
-            while time.time() < deadline:
-                proc = self._worker_proc
-                if proc is None:
-                    break
-                if proc.poll() is not None:
-                    raise TTSError(f"Pure Kokoro worker exited with code {proc.returncode}")
-                remaining = max(0.05, deadline - time.time())
+            worker = self._worker
+            if worker is not None:
                 try:
-                    event = self._worker_events.get(timeout=min(0.5, remaining))
-                except queue.Empty:
-                    pass
-                else:
-                    event_type = str(event.get("type") or "")
-                    if event_type == "ready":
-                        self._worker_ready = True
+                    if worker.wait_ready(timeout_s):
                         self._loaded = True
                         return True
-                    if event_type == "error":
-                        error_text = str(event.get("error") or "Pure Kokoro worker failed.")
-                        self._load_error = TTSError(error_text)
-                        raise TTSError(error_text)
+                except WorkerError as exc:
+                    if worker.load_error:
+                        self._load_error = TTSError(worker.load_error)
+                    raise TTSError(f"Pure Kokoro worker failed: {exc}") from exc
             done = False
         else:
             done = self._load_done.wait(timeout_s)
@@ -832,19 +889,15 @@ class _KokoroTorchEngine:
         self._load()
 
     def stop(self) -> None:
-        proc = self._worker_proc
-        self._worker_proc = None
-        self._worker_ready = False
-        if proc is not None and proc.poll() is None:
-            try:
-                proc.terminate()
-                proc.wait(timeout=2)
-            except Exception:
-                try:
-                    proc.kill()
-                except Exception:
-                    pass
-        return
+        # Cancel queued requests but keep the warm worker for the next reply.
+        worker = self._worker
+        if worker is not None:
+            worker.cancel_all()
+
+    def close(self) -> None:
+        worker, self._worker = self._worker, None
+        if worker is not None:
+            worker.close()
 
     def _load_voice_pack(self, voice: str):
         if os.name == "nt":
@@ -867,94 +920,35 @@ class _KokoroTorchEngine:
         self._voices[cache_key] = pack
         return pack
 
-    def _request_worker_wav(
+    def _request_worker_pcm(
         self,
         text: str,
         *,
         voice: Optional[str],
         speed: Optional[float],
         timeout_s: Optional[float] = None,
-    ) -> Path:
+    ):
         if not self._wait_until_ready(self._dynamic_foreground_ready_wait_s()):
             raise TTSError("Pure Kokoro warm-up is still in progress.")
-        proc = self._worker_proc
-        if proc is None or proc.poll() is not None or proc.stdin is None:
+        worker = self._worker
+        if worker is None or not worker.running:
             raise TTSError("Pure Kokoro worker is not available.")
-        req_id = self._next_worker_id()
-        temp_path = Path(tempfile.gettempdir()) / f"piper_kokoro_worker_{req_id}.wav"
-        payload = {
-            "id": req_id,
-            "text": str(text or ""),
-            "voice": str(voice or self.cfg.voice or "").strip() or self.cfg.voice,
-            "speed": float(speed if speed is not None else self.cfg.speed),
-            "wav_path": str(temp_path),
-        }
-        with self._worker_io_lock:
-            try:
-                proc.stdin.write(json.dumps(payload) + "\n")
-                proc.stdin.flush()
-            except Exception as exc:
-                raise TTSError(f"Pure Kokoro worker request failed: {exc}") from exc
-
-            deadline = time.time() + float(timeout_s or self._voice_fallback_timeout_s(background=False))
-            while time.time() < deadline:
-                if proc.poll() is not None:
-                    raise TTSError(f"Pure Kokoro worker exited with code {proc.returncode}")
-                remaining = max(0.05, deadline - time.time())
-                try:
-                    event = self._worker_events.get(timeout=min(0.5, remaining))
-                except queue.Empty:
-                    continue
-                event_type = str(event.get("type") or "")
-                if event_type == "ready":
-                    self._worker_ready = True
-                    self._loaded = True
-                    continue
-                if event_type != "result":
-                    continue
-                if str(event.get("id") or "") != req_id:
-                    continue
-                if not bool(event.get("ok")):
-                    raise TTSError(str(event.get("error") or "Pure Kokoro worker synthesis failed."))
-                wav_path = Path(str(event.get("wav_path") or temp_path))
-                if not wav_path.exists():
-                    raise TTSError(f"Pure Kokoro worker output missing: {wav_path}")
-                return wav_path
-        raise TTSError("Pure Kokoro worker synthesis timed out.")
-
-    @staticmethod
-    def _read_wav_float32(path: Path):
-        if np is None:
-            raise TTSError("Missing audio dependency numpy.")
-        with wave.open(str(path), "rb") as wf:
-            sr = wf.getframerate()
-            n_channels = wf.getnchannels()
-            sampwidth = wf.getsampwidth()
-            raw_data = wf.readframes(wf.getnframes())
-        if sampwidth == 2:
-            audio = np.frombuffer(raw_data, dtype=np.int16)
-            samples = audio.astype(np.float32) / 32767.0
-        elif sampwidth == 4:
-            samples = np.frombuffer(raw_data, dtype=np.float32)
-        else:
-            raise TTSError(f"Unsupported WAV sample width: {sampwidth}")
-        if n_channels == 2:
-            samples = samples.reshape(-1, 2).mean(axis=1)
-        return samples, int(sr)
+        try:
+            return worker.synthesize(
+                str(text or ""),
+                voice=str(voice or self.cfg.voice or "").strip() or self.cfg.voice,
+                speed=float(speed if speed is not None else self.cfg.speed),
+                timeout_s=float(timeout_s or self._voice_fallback_timeout_s(background=False)),
+            )
+        except WorkerError as exc:
+            raise TTSError(f"Pure Kokoro worker synthesis failed: {exc}") from exc
 
     def list_voices(self) -> List[str]:
         return sorted(self._voices.keys())
 
     def synthesize(self, text: str, voice: Optional[str], speed: Optional[float]):
         if os.name == "nt":
-            wav_path = self._request_worker_wav(text, voice=voice, speed=speed)
-            try:
-                return self._read_wav_float32(wav_path)
-            finally:
-                try:
-                    wav_path.unlink(missing_ok=True)
-                except Exception:
-                    pass
+            return self._request_worker_pcm(text, voice=voice, speed=speed)
         else:
             self._load()
         assert self._model is not None
@@ -1404,11 +1398,46 @@ class TTS:
 
         # The Job Queue: handles both text synthesis and SFX loading in order
         # Item: (epoch, type, payload)
-        # type: "text" -> payload: (text, voice, speed)
+        # type: "text" -> payload: (text, voice, speed, backend, trace, queued_at)
         # type: "sfx"  -> payload: path_str
         self._job_q: "queue.Queue[Tuple[int, str, object]]" = queue.Queue()
         self._audio_q: "queue.Queue[Tuple[int, object, int]]" = queue.Queue()
 
+        # Synthesized-speech cache. Pre-synthesis runs on its own low-priority
+        # thread, starts a phrase only while no live speech is queued, streaming
+        # or playing, and never counts as busy. Engines that are not safe to
+        # call concurrently share `_serial_synth_lock` with the synth loop.
+        # Item: (text, voice, speed, backend)
+        self._audio_cache = TTSAudioCache(
+            self.cfg.audio_cache_dir,
+            max_bytes=int(float(self.cfg.audio_cache_max_mb) * 1024 * 1024) if self.cfg.audio_cache else 0,
+            max_chars=int(self.cfg.audio_cache_max_chars),
+            max_disk_entries=int(self.cfg.audio_cache_disk_entries),
+        )
+        self._audio_model_ids: dict[str, str] = {}
+        self._presynth_q: "queue.Queue[Tuple[str, Optional[str], Optional[float], str]]" = queue.Queue()
+        self._presynth_thread: Optional[threading.Thread] = None
+        self._serial_synth_lock = threading.Lock()
+
+        # Synth-ahead: with more than one worker, text jobs are synthesized up
+        # to `synth_ahead` chunks ahead of playback and re-sequenced before
+        # they reach the play queue. Sequence numbers restart with each epoch
+        # so stale in-flight work never holds back new speech.
+        self._synth_workers, intra_op_threads = plan_synth_threads(
+            ahead=self.cfg.synth_ahead,
+            workers=self.cfg.synth_workers,
+            intra_op_threads=self.cfg.onnx_intra_op_threads or (1 if os.name == "nt" else 0),
+        )
+        if isinstance(self.engine, _KokoroEngine):
+            self.engine.intra_op_threads = intra_op_threads
+        self._synth_pool: Optional[ThreadPoolExecutor] = None
+        self._ahead_cv = threading.Condition()
+        self._ahead_epoch = 0
+        self._ahead_seq = 0
+        self._ahead_next = 0
+        self._ahead_inflight = 0
+        self._ahead_ready: dict[int, Optional[Tuple[object, int]]] = {}
+
         self._stop_evt = threading.Event()
         self._started = False
         self._state_lock = threading.Lock()
@@ -1424,6 +1453,10 @@ class TTS:
         self._synth_thread = threading.Thread(target=self._synth_loop, daemon=True)
         self._play_thread = threading.Thread(target=self._play_loop, daemon=True)
 
+        # Persistent playback stream (opened lazily on the first chunk)
+        self._sink: Optional[StreamingAudioSink] = None
+        self._sink_failed = False
+
         # Streaming state
         self._stream_lock = threading.Lock()
         self._stream_epoch: Optional[int] = None
@@ -1471,6 +1504,19 @@ class TTS:
     def shutdown(self) -> None:
         self._stop_evt.set()
         self.stop()
+        sink, self._sink = self._sink, None
+        if sink is not None:
+            sink.close()
+        pool, self._synth_pool = self._synth_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+        close_engine = getattr(self.engine, "close", None)
+        if callable(close_engine):
+            try:
+                close_engine()
+            except Exception:
+                pass
+        self._audio_cache.close()
 
     def warm_up(
         self,
@@ -1550,14 +1596,131 @@ class TTS:
         with self._state_lock:
             synth_active = self._synth_active
             play_active = self._play_active
+        sink = self._sink
         return (
             stream_active
             or synth_active
             or play_active
             or not self._job_q.empty()
             or not self._audio_q.empty()
+            or (sink is not None and sink.is_playing())
         )
 
+    def _playback_idle(self) -> bool:
+        """True when no more audio for the current utterance is on its way."""
+        with self._stream_lock:
+            stream_active = self._stream_epoch is not None
+        with self._state_lock:
+            synth_active = self._synth_active
+        return not stream_active and not synth_active and self._job_q.empty() and self._audio_q.empty()
+
+    def consume_playback_metrics(self) -> dict[str, float | int]:
+        """Underrun / inter-chunk gap and audio cache counters since the previous call."""
+        sink = self._sink
+        metrics: dict[str, float | int] = dict(sink.consume_metrics()) if sink is not None else {}
+        cache = self._audio_cache.consume_metrics()
+        if cache["hits"] or cache["misses"]:
+            metrics["cache_hits"] = cache["hits"]
+            metrics["cache_misses"] = cache["misses"]
+            metrics["cache_saved_ms"] = cache["saved_ms"]
+        return metrics
+
+    def audio_cache_stats(self) -> dict[str, float | int]:
+        return self._audio_cache.snapshot()
+
+    def _audio_model_id(self, backend: str) -> str:
+        model_id = self._audio_model_ids.get(backend)
+        if model_id is None:
+            engine = self.engine
+            if backend == "torch" and getattr(engine, "_voice_fallback_engine", None) is not None:
+                torch_engine = engine._voice_fallback_engine
+                model_id = "torch:" + model_fingerprint(
+                    torch_engine._local_torch_model_path(), torch_engine._local_torch_config_path()
+                )
+            elif isinstance(engine, _KokoroEngine):
+                model_id = "onnx:" + model_fingerprint(self.cfg.model_path, self.cfg.voices_path)
+            else:
+                model_id = type(engine).__name__
+            self._audio_model_ids[backend] = model_id
+        return model_id
+
+    def _audio_cache_key(self, text: str, voice: Optional[str], speed: Optional[float], backend: str) -> Optional[str]:
+        """Cache key for a text segment, or None when its audio cannot be cached."""
+        if backend == "system" or isinstance(self.engine, _WindowsSystemSpeechEngine):
+            return None
+        if not self._audio_cache.cacheable(text):
+            return None
+        return audio_cache_key(
+            text,
+            voice=str(voice or self.cfg.voice or ""),
+            speed=float(speed if speed is not None else self.cfg.speed),
+            backend=backend,
+            model_id=self._audio_model_id(backend),
+        )
+
+    def presynthesize(
+        self,
+        phrases: Sequence[str],
+        *,
+        voice: Optional[str] = None,
+        speed: Optional[float] = None,
+    ) -> int:
+        """Queue common phrases for background synthesis into the audio cache.
+
+        Returns the number of phrases queued. A background thread synthesizes
+        them one at a time, only while no live speech is queued or playing.
+        """
+        if not self.cfg.enabled or not self._audio_cache.enabled:
+            return 0
+        if not self._started:
+            self.start()
+        backend = self._choose_backend_for_utterance(self._next_utterance_id(), voice, speed)
+        queued = 0
+        for phrase in phrases:
+            text = self._clean_tts_text(str(phrase or "")).strip()
+            if text and self._audio_cache.cacheable(text):
+                self._presynth_q.put((text, voice, speed, backend))
+                queued += 1
+        if queued and self._presynth_thread is None:
+            self._presynth_thread = threading.Thread(target=self._presynth_loop, name="tts-presynth", daemon=True)
+            self._presynth_thread.start()
+        return queued
+
+    def _presynth_loop(self) -> None:
+        _lower_current_thread_priority()
+        while not self._stop_evt.is_set():
+            try:
+                item = self._presynth_q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            while not self._stop_evt.is_set() and self.is_busy():
+                self._stop_evt.wait(_PRESYNTH_POLL_S)
+            if not self._stop_evt.is_set():
+                self._presynthesize(*item)
+
+    def _presynthesize(self, text: str, voice: Optional[str], speed: Optional[float], backend: str) -> None:
+        key = self._audio_cache_key(text, voice, speed, backend)
+        if key is None or key in self._audio_cache:
+            return
+        serial = not self._parallel_synth_backend(backend)
+        with self._serial_synth_lock if serial else nullcontext():
+            if serial and self.is_busy():
+                # Live speech got in first; try again once it has played.
+                self._presynth_q.put((text, voice, speed, backend))
+                return
+            started = time.perf_counter()
+            try:
+                if backend == "torch" and getattr(self.engine, "_voice_fallback_engine", None) is not None:
+                    samples, sr = self.engine._voice_fallback_engine.synthesize(text, voice=voice, speed=speed)
+                elif hasattr(self.engine, "synthesize"):
+                    samples, sr = self.engine.synthesize(text, voice=voice, speed=speed)
+                else:
+                    return
+            except Exception as exc:
+                log_tts_error(f"TTS PRESYNTH ERROR: {exc}")
+                return
+        self._audio_cache.put(key, samples, sr, (time.perf_counter() - started) * 1000.0)
+
     def stop(self) -> None:
         self._bump_epoch()
 
@@ -1584,6 +1747,10 @@ class TTS:
         except queue.Empty:
             pass
 
+        sink = self._sink
+        if sink is not None:
+            sink.flush()
+
         try:
             self.engine.stop()
         except Exception:
@@ -1711,11 +1878,13 @@ class TTS:
         if not clean_text:
             return
         backend = self._choose_backend_for_utterance(utterance_id, voice, speed)
+        # Streaming pushes arrive on the UI thread, outside the turn's context.
+        trace = tracing.current_trace() or tracing.active_turn()
         for segment in self._segment_text_for_backend(clean_text, backend):
             segment = str(segment or "").strip()
             if not segment:
                 continue
-            self._job_q.put((epoch, "text", (segment, voice, speed, backend)))
+            self._job_q.put((epoch, "text", (segment, voice, speed, backend, trace, time.perf_counter())))
 
     # -----------------
     # NEW: Sequential SFX support
@@ -1736,7 +1905,12 @@ class TTS:
     # -----------------
 
     def _synth_loop(self) -> None:
-        """Processes jobs in order: either synthesizing text or loading WAVs."""
+        """Dispatches jobs in order: either synthesizing text or loading WAVs.
+
+        With more than one synth worker, text chunks are synthesized on the
+        pool up to `synth_ahead` jobs ahead of playback; `_ahead_complete`
+        puts results back in sequence before they reach the play queue.
+        """
         while not self._stop_evt.is_set():
             try:
                 epoch, job_type, payload = self._job_q.get(timeout=0.1)
@@ -1746,103 +1920,219 @@ class TTS:
             if epoch != self._get_epoch():
                 continue
 
+            seq = self._ahead_admit(epoch)
+            if seq is None:
+                continue
+            if job_type == "text":
+                if self._synth_workers > 1 and self._parallel_synth_backend(payload[3]):
+                    self._synth_executor().submit(self._run_text_job, epoch, seq, payload)
+                    continue
+                if self._synth_workers > 1:
+                    # Blocking speech plays by itself; let earlier chunks go first.
+                    self._ahead_wait_turn(epoch, seq)
+                with self._serial_synth_lock:
+                    self._run_text_job(epoch, seq, payload)
+            elif job_type == "sfx":
+                self._ahead_complete(epoch, seq, self._load_sfx(str(payload)))
+            else:
+                self._ahead_complete(epoch, seq, None)
+
+    def _parallel_synth_backend(self, backend: str) -> bool:
+        # Engines opt in once their synthesize() is safe to call concurrently;
+        # the system voice speaks by itself and the torch worker is one pipe.
+        if backend in {"system", "torch"}:
+            return False
+        return bool(getattr(self.engine, "parallel_synthesis", False)) and hasattr(self.engine, "synthesize")
+
+    def _synth_executor(self) -> ThreadPoolExecutor:
+        if self._synth_pool is None:
+            self._synth_pool = ThreadPoolExecutor(max_workers=self._synth_workers, thread_name_prefix="tts-synth")
+        return self._synth_pool
+
+    # -----------------
+    # Synth-ahead sequencing
+    # -----------------
+
+    def _ahead_admit(self, epoch: int) -> Optional[int]:
+        """Reserve the next sequence number, waiting while the window is full.
+
+        Returns None when the job went stale while waiting.
+        """
+        window = max(1, int(self.cfg.synth_ahead))
+        with self._ahead_cv:
+            if epoch != self._ahead_epoch:
+                # New epoch: forget stale in-flight work instead of waiting on it.
+                self._ahead_epoch = epoch
+                self._ahead_seq = 0
+                self._ahead_next = 0
+                self._ahead_inflight = 0
+                self._ahead_ready.clear()
+            while self._ahead_inflight >= window:
+                if self._stop_evt.is_set() or epoch != self._get_epoch():
+                    return None
+                self._ahead_cv.wait(0.05)
+            seq = self._ahead_seq
+            self._ahead_seq += 1
+            self._ahead_inflight += 1
             self._set_synth_active(True)
-            try:
-                # Handle Text Job
-                if job_type == "text":
-                    text, voice, speed, backend = payload
-                    try:
-                        if os.name == "nt" and isinstance(self.engine, _KokoroEngine):
-                            if backend == "torch" and self.engine._voice_fallback_engine is not None:
-                                samples, sr = self.engine._voice_fallback_engine.synthesize(text, voice=voice, speed=speed)
-                            elif backend == "system" and self.engine._fallback_engine is not None:
-                                self.engine._fallback_engine.speak_text_blocking(text, voice=voice, speed=speed)
-                                continue
-                            else:
-                                samples, sr = self.engine.synthesize(text, voice=voice, speed=speed)
-                        elif hasattr(self.engine, "synthesize"):
-                            samples, sr = self.engine.synthesize(text, voice=voice, speed=speed)
-                        elif hasattr(self.engine, "speak_text_blocking"):
-                            self.engine.speak_text_blocking(text, voice=voice, speed=speed)
-                            continue
-                        else:
-                            raise TTSError("TTS engine cannot synthesize or speak text.")
-                    except Exception as e:
-                        log_tts_error(f"TTS SYNTH ERROR: {e}")
-                        if os.name == "nt" and isinstance(self.engine, _KokoroEngine):
-                            fallback_backend = backend
-                            try:
-                                self.engine._disable_with_reason(f"Kokoro synth error: {e}")
-                                if backend not in {"torch", "system"}:
-                                    fallback_backend = self.engine.choose_reply_backend(voice=voice, speed=speed)
-                                if fallback_backend == "torch" and self.engine._voice_fallback_engine is not None:
-                                    samples, sr = self.engine._voice_fallback_engine.synthesize(text, voice=voice, speed=speed)
-                                elif fallback_backend == "system" and self.engine._fallback_engine is not None:
-                                    self.engine._fallback_engine.speak_text_blocking(text, voice=voice, speed=speed)
-                                    continue
-                                else:
-                                    continue
-                            except Exception as fallback_exc:
-                                log_tts_error(f"TTS STREAM FALLBACK ERROR: {fallback_exc}")
-                                continue
-                        else:
-                            continue
+        return seq
 
-                    if epoch != self._get_epoch():
-                        continue
+    def _ahead_wait_turn(self, epoch: int, seq: int) -> None:
+        with self._ahead_cv:
+            while self._ahead_epoch == epoch and self._ahead_next < seq:
+                if self._stop_evt.is_set() or epoch != self._get_epoch():
+                    return
+                self._ahead_cv.wait(0.05)
 
-                    # Put audio in play queue
-                    while not self._stop_evt.is_set():
-                        if epoch != self._get_epoch():
-                            break
+    def _ahead_complete(self, epoch: int, seq: int, result: Optional[Tuple[object, int]]) -> None:
+        """Record a finished job and release every result that is now in order."""
+        with self._ahead_cv:
+            if epoch != self._ahead_epoch:
+                return
+            self._ahead_ready[seq] = result
+            while self._ahead_next in self._ahead_ready:
+                ready = self._ahead_ready.pop(self._ahead_next)
+                self._ahead_next += 1
+                self._ahead_inflight -= 1
+                if ready is not None and epoch == self._get_epoch():
+                    samples, sr = ready
+                    self._audio_q.put((epoch, samples, sr))
+            if self._ahead_inflight <= 0:
+                self._set_synth_active(False)
+            self._ahead_cv.notify_all()
+
+    def _run_text_job(self, epoch: int, seq: int, payload: object) -> None:
+        result: Optional[Tuple[object, int]] = None
+        try:
+            if epoch == self._get_epoch():
+                result = self._synthesize_text_job(payload)
+        except Exception as exc:
+            log_tts_error(f"TTS SYNTH ERROR: {exc}")
+        finally:
+            self._ahead_complete(epoch, seq, result)
+
+    def _synthesize_text_job(self, payload: object) -> Optional[Tuple[object, int]]:
+        """Audio for one text job, or None when nothing should be queued."""
+        text, voice, speed, backend, trace, queued_at = payload
+        synth_span = tracing.NOOP_SPAN
+        if trace is not None:
+            tracing.complete("tts.queue_wait", queued_at, cat="tts", trace=trace)
+            synth_span = tracing.span("tts.synth", cat="tts", trace=trace, chars=len(text), backend=backend)
+        try:
+            cache_key = self._audio_cache_key(text, voice, speed, backend)
+            cached = self._audio_cache.get(cache_key) if cache_key else None
+            if cached is not None:
+                samples, sr = cached
+                synth_span.set(cache_hit=True)
+            else:
+                synth_started = time.perf_counter()
+                try:
+                    if os.name == "nt" and isinstance(self.engine, _KokoroEngine):
+                        if backend == "torch" and self.engine._voice_fallback_engine is not None:
+                            samples, sr = self.engine._voice_fallback_engine.synthesize(text, voice=voice, speed=speed)
+                        elif backend == "system" and self.engine._fallback_engine is not None:
+                            self.engine._fallback_engine.speak_text_blocking(text, voice=voice, speed=speed)
+                            return None
+                        else:
+                            samples, sr = self.engine.synthesize(text, voice=voice, speed=speed)
+                    elif hasattr(self.engine, "synthesize"):
+                        samples, sr = self.engine.synthesize(text, voice=voice, speed=speed)
+                    elif hasattr(self.engine, "speak_text_blocking"):
+                        self.engine.speak_text_blocking(text, voice=voice, speed=speed)
+                        return None
+                    else:
+                        raise TTSError("TTS engine cannot synthesize or speak text.")
+                except Exception as e:
+                    cache_key = None
+                    log_tts_error(f"TTS SYNTH ERROR: {e}")
+                    if os.name == "nt" and isinstance(self.engine, _KokoroEngine):
+                        fallback_backend = backend
                         try:
-                            self._audio_q.put((epoch, samples, sr), timeout=0.1)
-                            break
-                        except queue.Full:
-                            continue
-
-                # Handle SFX Job
-                elif job_type == "sfx":
-                    path_str = payload
-                    try:
-                        if np is None:
-                            raise TTSError("Missing audio dependency numpy.")
-                        with wave.open(path_str, 'rb') as wf:
-                            sr = wf.getframerate()
-                            n_channels = wf.getnchannels()
-                            raw_data = wf.readframes(wf.getnframes())
-
-                            if wf.getsampwidth() == 2:
-                                audio = np.frombuffer(raw_data, dtype=np.int16)
-                                samples = audio.astype(np.float32) / 32767.0
-                            elif wf.getsampwidth() == 4:
-                                samples = np.frombuffer(raw_data, dtype=np.float32)
+                            self.engine._disable_with_reason(f"Kokoro synth error: {e}")
+                            if backend not in {"torch", "system"}:
+                                fallback_backend = self.engine.choose_reply_backend(voice=voice, speed=speed)
+                            if fallback_backend == "torch" and self.engine._voice_fallback_engine is not None:
+                                samples, sr = self.engine._voice_fallback_engine.synthesize(text, voice=voice, speed=speed)
+                            elif fallback_backend == "system" and self.engine._fallback_engine is not None:
+                                self.engine._fallback_engine.speak_text_blocking(text, voice=voice, speed=speed)
+                                return None
                             else:
-                                continue
+                                return None
+                        except Exception as fallback_exc:
+                            log_tts_error(f"TTS STREAM FALLBACK ERROR: {fallback_exc}")
+                            return None
+                    else:
+                        return None
+                if cache_key:
+                    synth_ms = (time.perf_counter() - synth_started) * 1000.0
+                    self._audio_cache.put(cache_key, samples, sr, synth_ms)
+            return samples, sr
+        finally:
+            synth_span.end()
+
+    def _load_sfx(self, path_str: str) -> Optional[Tuple[object, int]]:
+        try:
+            if np is None:
+                raise TTSError("Missing audio dependency numpy.")
+            with wave.open(path_str, 'rb') as wf:
+                sr = wf.getframerate()
+                n_channels = wf.getnchannels()
+                raw_data = wf.readframes(wf.getnframes())
+
+                if wf.getsampwidth() == 2:
+                    audio = np.frombuffer(raw_data, dtype=np.int16)
+                    samples = audio.astype(np.float32) / 32767.0
+                elif wf.getsampwidth() == 4:
+                    samples = np.frombuffer(raw_data, dtype=np.float32)
+                else:
+                    return None
 
-                            if n_channels == 2:
-                                samples = samples.reshape(-1, 2).mean(axis=1)
+                if n_channels == 2:
+                    samples = samples.reshape(-1, 2).mean(axis=1)
 
-                            # APPLY GAIN
-                            samples = samples * SFX_VOLUME_BOOST
+                # APPLY GAIN
+                samples = samples * SFX_VOLUME_BOOST
 
-                            # CLIP (Prevent distortion if too loud)
-                            samples = np.clip(samples, -1.0, 1.0)
+                # CLIP (Prevent distortion if too loud)
+                samples = np.clip(samples, -1.0, 1.0)
+                return samples, sr
 
-                            # Put audio in play queue
-                            if epoch == self._get_epoch():
-                                self._audio_q.put((epoch, samples, sr))
+        except Exception as e:
+            log_tts_error(f"WAV LOAD ERROR: {path_str} - {e}")
+            return None
 
-                    except Exception as e:
-                        log_tts_error(f"WAV LOAD ERROR: {path_str} - {e}")
-            finally:
-                self._set_synth_active(False)
+    def _playback_sink(self, sr: int) -> Optional[StreamingAudioSink]:
+        if self._sink is not None:
+            return self._sink
+        if self._sink_failed or not getattr(self.cfg, "streaming_sink", True) or np is None:
+            return None
+        try:
+            self._sink = StreamingAudioSink(
+                int(sr),
+                buffer_s=float(getattr(self.cfg, "sink_buffer_s", 8.0)),
+                crossfade_ms=float(getattr(self.cfg, "sink_crossfade_ms", 6.0)),
+            )
+        except Exception as exc:
+            # No usable output stream; fall back to per-chunk engine playback.
+            self._sink_failed = True
+            log_tts_error(f"TTS SINK OPEN ERROR: {exc}")
+            return None
+        return self._sink
 
     def _play_loop(self) -> None:
         while not self._stop_evt.is_set():
+            sink = self._sink
+            timeout = 0.1
+            if sink is not None and sink.holding_tail:
+                timeout = min(timeout, max(0.0, sink.buffered_s() - _SINK_TAIL_MARGIN_S))
             try:
-                epoch, samples, sr = self._audio_q.get(timeout=0.1)
+                epoch, samples, sr = self._audio_q.get(timeout=timeout)
             except queue.Empty:
+                if sink is not None:
+                    if self._playback_idle():
+                        sink.end_segment()
+                    else:
+                        sink.release_tail()
                 continue
 
             if epoch != self._get_epoch():
@@ -1850,7 +2140,11 @@ class TTS:
 
             self._set_play_active(True)
             try:
-                self.engine.play(samples, sr)
+                sink = self._playback_sink(sr)
+                if sink is not None:
+                    sink.write(samples, sr, should_continue=lambda: epoch == self._get_epoch())
+                else:
+                    self.engine.play(samples, sr)
             except Exception as e:
                 log_tts_error(f"TTS PLAY ERROR: {e}")
                 time.sleep(0.05)
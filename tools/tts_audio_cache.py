@@ -0,0 +1,257 @@
+"""tools/tts_audio_cache.py
+
+Content-addressed cache of synthesized speech.
+
+Piper says the same short strings over and over: acknowledgements, event
+notices, reminder preambles. Entries are keyed by the normalized text, the
+voice, speed and synthesis backend, and a fingerprint of the model files, so
+swapping a model or voice never replays stale audio.
+
+Float32 PCM is held in memory under an LRU byte bound. When a cache
+directory is configured, every entry is also written off the synthesis
+thread to a compressed on-disk store. The disk copy is 16-bit PCM, the
+depth the output device plays anyway. Memory misses fall back to that
+store, so phrases survive restarts. Only segments up to `max_chars` are
+cached, since long replies rarely repeat.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_LOG = logging.getLogger(__name__)
+
+_WS_RE = re.compile(r"\s+")
+_PRUNE_EVERY_WRITES = 32
+
+
+def normalize_tts_text(text: str) -> str:
+    return _WS_RE.sub(" ", str(text or "")).strip()
+
+
+def audio_cache_key(text: str, *, voice: str, speed: float, backend: str, model_id: str) -> str:
+    payload = json.dumps(
+        [normalize_tts_text(text), str(voice or ""), round(float(speed), 3), str(backend or ""), str(model_id or "")],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:40]
+
+
+def model_fingerprint(*paths: Optional[Path]) -> str:
+    """Cheap identity of model files: name, size and mtime (no content hashing)."""
+    parts: list[str] = []
+    for path in paths:
+        if path is None:
+            continue
+        try:
+            stat = Path(path).stat()
+            parts.append(f"{Path(path).name}:{stat.st_size}:{stat.st_mtime_ns}")
+        except OSError:
+            parts.append(f"{Path(path).name}:missing")
+    return "|".join(parts)
+
+
+class TTSAudioCache:
+    """LRU of synthesized PCM with an optional compressed disk tier."""
+
+    def __init__(
+        self,
+        root: Optional[Path] = None,
+        *,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_chars: int = 160,
+        max_disk_entries: int = 2000,
+    ) -> None:
+        self.root = Path(root) if root is not None else None
+        self.max_bytes = max(0, int(max_bytes))
+        self.max_chars = max(0, int(max_chars))
+        self.max_disk_entries = max(1, int(max_disk_entries))
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[Any, int, float]]" = OrderedDict()
+        self._bytes = 0
+        self._writes = 0
+        self._writer: ThreadPoolExecutor | None = None
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "saved_ms": 0.0, "stored": 0}
+        self._unreported = {"hits": 0, "misses": 0, "saved_ms": 0.0}
+
+    @property
+    def enabled(self) -> bool:
+        return np is not None and self.max_bytes > 0 and self.max_chars > 0
+
+    def cacheable(self, text: str) -> bool:
+        return self.enabled and 0 < len(normalize_tts_text(text)) <= self.max_chars
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            if key in self._entries:
+                return True
+        path = self._disk_path(key)
+        return path is not None and path.exists()
+
+    # -- lookup ------------------------------------------------------------
+
+    def get(self, key: str) -> Optional[Tuple[Any, int]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._record_hit("memory_hits", entry[2])
+                return entry[0], entry[1]
+        entry = self._load(key)
+        with self._lock:
+            if entry is None:
+                self.stats["misses"] += 1
+                self._unreported["misses"] += 1
+                return None
+            self._remember(key, entry)
+            self._record_hit("disk_hits", entry[2])
+        return entry[0], entry[1]
+
+    def _record_hit(self, kind: str, synth_ms: float) -> None:
+        self.stats[kind] += 1
+        self.stats["saved_ms"] = round(self.stats["saved_ms"] + synth_ms, 3)
+        self._unreported["hits"] += 1
+        self._unreported["saved_ms"] += synth_ms
+
+    def put(self, key: str, samples: Any, sr: int, synth_ms: float) -> None:
+        if not self.enabled:
+            return
+        pcm = np.array(samples, dtype=np.float32).reshape(-1)
+        pcm.setflags(write=False)
+        entry = (pcm, int(sr), round(float(synth_ms), 3))
+        with self._lock:
+            self._remember(key, entry)
+            self.stats["stored"] += 1
+        if self.root is not None:
+            self._writer_pool().submit(self._write, key, entry)
+
+    def _remember(self, key: str, entry: Tuple[Any, int, float]) -> None:
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous[0].nbytes
+        self._entries[key] = entry
+        self._bytes += entry[0].nbytes
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _stale_key, stale = self._entries.popitem(last=False)
+            self._bytes -= stale[0].nbytes
+
+    # -- metrics -----------------------------------------------------------
+
+    def hit_ratio(self) -> float:
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        total = hits + self.stats["misses"]
+        return round(hits / total, 4) if total else 0.0
+
+    def snapshot(self) -> dict[str, float | int]:
+        with self._lock:
+            return {
+                **self.stats,
+                "entries": len(self._entries),
+                "bytes": int(self._bytes),
+                "hit_ratio": self.hit_ratio(),
+            }
+
+    def consume_metrics(self) -> dict[str, float | int]:
+        """Hits, misses and saved synthesis time since the previous call."""
+        with self._lock:
+            metrics = {
+                "hits": int(self._unreported["hits"]),
+                "misses": int(self._unreported["misses"]),
+                "saved_ms": round(float(self._unreported["saved_ms"]), 3),
+            }
+            self._unreported = {"hits": 0, "misses": 0, "saved_ms": 0.0}
+        return metrics
+
+    # -- disk tier ---------------------------------------------------------
+
+    def _disk_path(self, key: str) -> Optional[Path]:
+        return self.root / f"{key}.npz" if self.root is not None else None
+
+    def _writer_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._writer is None:
+                self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts-audio-cache")
+            return self._writer
+
+    def _load(self, key: str) -> Optional[Tuple[Any, int, float]]:
+        path = self._disk_path(key)
+        if path is None or np is None:
+            return None
+        try:
+            with np.load(path) as data:
+                pcm = data["pcm"].astype(np.float32) / 32767.0
+                entry = (pcm, int(data["sr"]), float(data["synth_ms"]))
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except Exception as exc:
+            _LOG.debug("[TTS] Dropping unreadable audio cache entry %s: %s", path.name, exc)
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            return None
+        entry[0].setflags(write=False)
+        return entry
+
+    def _write(self, key: str, entry: Tuple[Any, int, float]) -> None:
+        path = self._disk_path(key)
+        if path is None:
+            return
+        pcm, sr, synth_ms = entry
+        buffer = io.BytesIO()
+        quantized = np.round(np.clip(pcm, -1.0, 1.0) * 32767.0).astype(np.int16)
+        np.savez_compressed(buffer, pcm=quantized, sr=np.int32(sr), synth_ms=np.float32(synth_ms))
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(prefix=f".{key[:8]}-", suffix=".tmp", dir=str(path.parent))
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(buffer.getvalue())
+            os.replace(tmp_name, path)
+        except OSError as exc:
+            _LOG.debug("[TTS] Could not write audio cache entry %s: %s", path.name, exc)
+            return
+        self._writes += 1
+        if self._writes % _PRUNE_EVERY_WRITES == 0:
+            self._prune()
+
+    def _prune(self) -> None:
+        if self.root is None:
+            return
+        try:
+            files = sorted(self.root.glob("*.npz"), key=lambda item: item.stat().st_mtime)
+        except OSError:
+            return
+        for stale in files[: max(0, len(files) - self.max_disk_entries)]:
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+
+    def flush(self) -> None:
+        """Wait for queued disk writes (tests and shutdown)."""
+        writer = self._writer
+        if writer is not None:
+            writer.submit(lambda: None).result()
+
+    def close(self) -> None:
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.shutdown(wait=True)
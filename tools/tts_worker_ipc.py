@@ -0,0 +1,432 @@
+"""tools/tts_worker_ipc.py
+
+Binary transport between TTS and a synthesis worker subprocess.
+
+Both directions of the worker's stdin/stdout pipes carry length-prefixed
+frames: a fixed header (magic, metadata length, payload length), a UTF-8
+JSON metadata object, then an optional raw payload. Results carry mono
+little-endian float32 PCM as the payload, so audio never touches the disk
+and needs no decoding beyond a zero-copy `np.frombuffer`.
+
+Requests are pipelined: the client may submit several before the first
+result arrives, and results are matched back by request id. A `cancel`
+frame makes the worker skip a request it has not started yet; the client
+drops late results for cancelled ids. When the worker process dies
+unexpectedly, pending requests fail and the client restarts it, within a
+restart budget.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import queue
+import struct
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Callable, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+FRAME_MAGIC = b"PKF1"
+_HEADER = struct.Struct("<4sII")
+MAX_META_BYTES = 1 << 20
+MAX_PAYLOAD_BYTES = 256 << 20
+
+
+class WorkerProtocolError(RuntimeError):
+    """The pipe carried something that is not a valid frame."""
+
+
+class WorkerError(RuntimeError):
+    """A request failed: worker error, crash, timeout or cancellation."""
+
+
+# -- framing ---------------------------------------------------------------
+
+
+def write_frame(stream: BinaryIO, meta: dict[str, Any], payload: bytes = b"") -> None:
+    meta_bytes = json.dumps(meta, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    stream.write(_HEADER.pack(FRAME_MAGIC, len(meta_bytes), len(payload)))
+    stream.write(meta_bytes)
+    if payload:
+        stream.write(payload)
+    stream.flush()
+
+
+def _read_exact(stream: BinaryIO, size: int) -> Optional[bytes]:
+    chunks: list[bytes] = []
+    remaining = size
+    while remaining > 0:
+        chunk = stream.read(remaining)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def read_frame(stream: BinaryIO) -> Optional[Tuple[dict[str, Any], bytes]]:
+    """Next `(meta, payload)` from the stream, or None at end of stream."""
+    header = _read_exact(stream, _HEADER.size)
+    if header is None:
+        return None
+    magic, meta_len, payload_len = _HEADER.unpack(header)
+    if magic != FRAME_MAGIC:
+        raise WorkerProtocolError(f"bad frame magic {magic!r}")
+    if meta_len > MAX_META_BYTES or payload_len > MAX_PAYLOAD_BYTES:
+        raise WorkerProtocolError(f"oversized frame ({meta_len} + {payload_len} bytes)")
+    meta_bytes = _read_exact(stream, meta_len) if meta_len else b"{}"
+    payload = _read_exact(stream, payload_len) if payload_len else b""
+    if meta_bytes is None or payload is None:
+        raise WorkerProtocolError("truncated frame")
+    meta = json.loads(meta_bytes.decode("utf-8"))
+    if not isinstance(meta, dict):
+        raise WorkerProtocolError("frame metadata is not an object")
+    return meta, payload
+
+
+def pcm_to_bytes(samples: Any) -> bytes:
+    arr = np.asarray(samples, dtype=np.float32)
+    if arr.ndim > 1:
+        arr = arr.mean(axis=1)
+    return arr.astype("<f4", copy=False).reshape(-1).tobytes()
+
+
+def pcm_from_bytes(payload: bytes):
+    return np.frombuffer(payload, dtype="<f4")
+
+
+# -- worker side -----------------------------------------------------------
+
+
+def claim_stdout() -> BinaryIO:
+    """Take over the real stdout for frames and point fd 1 at stderr.
+
+    Libraries that print (model loaders, warnings) would otherwise corrupt
+    the frame stream.
+    """
+    sys.stdout.flush()
+    out = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    sys.stdout = sys.stderr
+    return out
+
+
+def serve(
+    synthesize: Callable[[str, str, float], Tuple[Any, int]],
+    *,
+    stdin: Optional[BinaryIO] = None,
+    stdout: Optional[BinaryIO] = None,
+) -> int:
+    """Worker main loop: answer `request` frames until stdin closes.
+
+    A reader thread keeps consuming frames while a request is being
+    synthesized, so `cancel` frames for queued requests take effect before
+    they start.
+    """
+    stdin = stdin if stdin is not None else sys.stdin.buffer
+    out = stdout if stdout is not None else claim_stdout()
+    pending: "queue.Queue[Optional[dict[str, Any]]]" = queue.Queue()
+    cancelled: "OrderedDict[str, None]" = OrderedDict()
+    cancel_lock = threading.Lock()
+
+    def _read_requests() -> None:
+        try:
+            while True:
+                frame = read_frame(stdin)
+                if frame is None:
+                    break
+                meta, _payload = frame
+                if meta.get("type") == "cancel":
+                    with cancel_lock:
+                        cancelled[str(meta.get("id") or "")] = None
+                        while len(cancelled) > 256:
+                            cancelled.popitem(last=False)
+                elif meta.get("type") == "request":
+                    pending.put(meta)
+        except Exception:
+            traceback.print_exc(file=sys.stderr)
+        finally:
+            pending.put(None)
+
+    threading.Thread(target=_read_requests, name="tts-worker-reader", daemon=True).start()
+    write_frame(out, {"type": "ready"})
+    while True:
+        req = pending.get()
+        if req is None:
+            return 0
+        req_id = str(req.get("id") or "")
+        with cancel_lock:
+            skip = req_id in cancelled
+            cancelled.pop(req_id, None)
+        if skip:
+            continue
+        try:
+            text = str(req.get("text") or "").strip()
+            if not text:
+                raise RuntimeError("empty_text")
+            samples, sample_rate = synthesize(text, str(req.get("voice") or ""), float(req.get("speed") or 1.0))
+            payload = pcm_to_bytes(samples)
+            if not payload:
+                raise RuntimeError("empty_audio")
+            write_frame(out, {"type": "result", "id": req_id, "ok": True, "sample_rate": int(sample_rate)}, payload)
+        except Exception as exc:
+            traceback.print_exc(file=sys.stderr)
+            write_frame(out, {"type": "result", "id": req_id, "ok": False, "error": str(exc)})
+
+
+# -- parent side -----------------------------------------------------------
+
+
+@dataclass
+class _PendingRequest:
+    request_id: str
+    done: threading.Event = field(default_factory=threading.Event)
+    samples: Any = None
+    sample_rate: int = 0
+    error: str = ""
+
+
+class WorkerClient:
+    """Owns the worker subprocess and multiplexes requests over its pipes."""
+
+    def __init__(
+        self,
+        argv: Sequence[str],
+        *,
+        log: Callable[[str], None] = lambda _msg: None,
+        max_restarts: int = 3,
+        restart_window_s: float = 60.0,
+        env: Optional[dict[str, str]] = None,
+    ) -> None:
+        self.argv = list(argv)
+        self.log = log
+        self.max_restarts = max(0, int(max_restarts))
+        self.restart_window_s = float(restart_window_s)
+        self.env = env
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._proc: Optional[subprocess.Popen[bytes]] = None
+        self._ready = threading.Event()
+        self._load_error = ""
+        self._pending: dict[str, _PendingRequest] = {}
+        self._serial = 0
+        self._spawned = 0
+        self._restarts: list[float] = []
+        self._closed = False
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set() and self.running
+
+    @property
+    def running(self) -> bool:
+        proc = self._proc
+        return proc is not None and proc.poll() is None
+
+    @property
+    def spawn_count(self) -> int:
+        return self._spawned
+
+    @property
+    def load_error(self) -> str:
+        return self._load_error
+
+    def start(self) -> None:
+        """Spawn the worker unless one is already running."""
+        with self._lock:
+            if self._closed:
+                raise WorkerError("worker client is closed")
+            if self.running:
+                return
+            if self._spawned:
+                now = time.monotonic()
+                self._restarts = [at for at in self._restarts if now - at < self.restart_window_s]
+                if len(self._restarts) >= self.max_restarts:
+                    raise WorkerError(f"worker restarted {len(self._restarts)} times in {self.restart_window_s:.0f}s")
+                self._restarts.append(now)
+            self._spawn()
+
+    def _spawn(self) -> None:
+        self._ready.clear()
+        self._load_error = ""
+        proc = subprocess.Popen(
+            self.argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=self.env,
+        )
+        self._proc = proc
+        self._spawned += 1
+        threading.Thread(target=self._read_results, args=(proc,), name="tts-worker-results", daemon=True).start()
+        threading.Thread(target=self._drain_stderr, args=(proc,), name="tts-worker-stderr", daemon=True).start()
+        self.log(f"TTS WORKER PROCESS START (pid {proc.pid})")
+
+    def wait_ready(self, timeout_s: float) -> bool:
+        """Wait for the worker's ready frame; raises when it failed to load."""
+        self.start()
+        deadline = time.monotonic() + max(0.0, timeout_s)
+        while True:
+            if self._ready.wait(min(0.05, max(0.0, deadline - time.monotonic()))):
+                return True
+            if self._load_error:
+                raise WorkerError(self._load_error)
+            proc = self._proc
+            if proc is not None and proc.poll() is not None:
+                raise WorkerError(f"worker exited with code {proc.returncode}")
+            if time.monotonic() >= deadline:
+                return False
+
+    def submit(self, text: str, *, voice: str, speed: float) -> str:
+        """Send a request without waiting for earlier ones; returns its id."""
+        self.start()
+        with self._lock:
+            self._serial += 1
+            request_id = str(self._serial)
+            self._pending[request_id] = _PendingRequest(request_id)
+            proc = self._proc
+        meta = {"type": "request", "id": request_id, "text": str(text or ""), "voice": voice, "speed": float(speed)}
+        try:
+            self._send(proc, meta)
+        except WorkerError:
+            with self._lock:
+                self._pending.pop(request_id, None)
+            raise
+        return request_id
+
+    def result(self, request_id: str, timeout_s: float) -> Tuple[Any, int]:
+        """Audio for a submitted request; cancels it on timeout."""
+        with self._lock:
+            pending = self._pending.get(request_id)
+        if pending is None:
+            raise WorkerError(f"unknown or cancelled request {request_id}")
+        if not pending.done.wait(max(0.0, timeout_s)):
+            self.cancel(request_id)
+            raise WorkerError("worker synthesis timed out")
+        with self._lock:
+            self._pending.pop(request_id, None)
+        if pending.error:
+            raise WorkerError(pending.error)
+        return pending.samples, pending.sample_rate
+
+    def synthesize(self, text: str, *, voice: str, speed: float, timeout_s: float) -> Tuple[Any, int]:
+        return self.result(self.submit(text, voice=voice, speed=speed), timeout_s)
+
+    def cancel(self, request_id: str) -> None:
+        with self._lock:
+            pending = self._pending.pop(request_id, None)
+            proc = self._proc
+        if pending is None:
+            return
+        pending.error = "cancelled"
+        pending.done.set()
+        try:
+            self._send(proc, {"type": "cancel", "id": request_id})
+        except WorkerError:
+            pass
+
+    def cancel_all(self) -> None:
+        with self._lock:
+            request_ids = list(self._pending)
+        for request_id in request_ids:
+            self.cancel(request_id)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            proc, self._proc = self._proc, None
+        self._fail_pending("worker stopped")
+        if proc is None or proc.poll() is not None:
+            return
+        try:
+            if proc.stdin is not None:
+                proc.stdin.close()
+            proc.wait(timeout=2)
+        except Exception:
+            try:
+                proc.kill()
+            except Exception:
+                pass
+
+    def _send(self, proc: Optional[subprocess.Popen[bytes]], meta: dict[str, Any]) -> None:
+        if proc is None or proc.stdin is None or proc.poll() is not None:
+            raise WorkerError("worker is not running")
+        try:
+            with self._write_lock:
+                write_frame(proc.stdin, meta)
+        except (OSError, ValueError) as exc:
+            raise WorkerError(f"worker request failed: {exc}") from exc
+
+    def _read_results(self, proc: subprocess.Popen[bytes]) -> None:
+        assert proc.stdout is not None
+        try:
+            while True:
+                frame = read_frame(proc.stdout)
+                if frame is None:
+                    break
+                self._dispatch(*frame)
+        except Exception as exc:
+            self.log(f"TTS WORKER STREAM ERROR: {exc}")
+            try:
+                proc.kill()
+            except Exception:
+                pass
+        code = proc.wait()
+        with self._lock:
+            current = proc is self._proc
+            if current:
+                self._proc = None
+            restart = current and not self._closed and not self._load_error
+        if not current:
+            return
+        self._ready.clear()
+        self._fail_pending(f"worker exited with code {code}")
+        if restart:
+            self.log(f"TTS WORKER EXITED (code {code}); restarting")
+            try:
+                self.start()
+            except Exception as exc:
+                self.log(f"TTS WORKER RESTART FAILED: {exc}")
+
+    def _dispatch(self, meta: dict[str, Any], payload: bytes) -> None:
+        frame_type = meta.get("type")
+        if frame_type == "ready":
+            self._ready.set()
+        elif frame_type == "error":
+            self._load_error = str(meta.get("error") or "worker failed to load")
+            self.log(f"TTS WORKER ERROR: {self._load_error}")
+        elif frame_type == "result":
+            with self._lock:
+                pending = self._pending.get(str(meta.get("id") or ""))
+            if pending is None:
+                return  # cancelled or timed out; drop the late result
+            if meta.get("ok"):
+                pending.samples = pcm_from_bytes(payload)
+                pending.sample_rate = int(meta.get("sample_rate") or 0)
+            else:
+                pending.error = str(meta.get("error") or "worker synthesis failed")
+            pending.done.set()
+
+    def _drain_stderr(self, proc: subprocess.Popen[bytes]) -> None:
+        assert proc.stderr is not None
+        for raw in proc.stderr:
+            line = raw.decode("utf-8", errors="replace").rstrip()
+            if line:
+                self.log(f"TTS WORKER STDERR: {line}")
+
+    def _fail_pending(self, reason: str) -> None:
+        with self._lock:
+            pending, self._pending = list(self._pending.values()), {}
+        for request in pending:
+            request.error = reason
+            request.done.set()
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import base64
 import mimetypes
 import os
 import re
@@ -14,6 +13,14 @@ from config import CFG
 from core.instructions_loader import InstructionLoader
 from llm.llm_server_client import LLMClientError
 from core.runtime_control import CancellationToken, OperationCancelled
+from tools.vision_image import (
+    DEFAULT_JPEG_QUALITY,
+    DataUrlCache,
+    DataUrlKey,
+    ImageDecodeUnavailable,
+    data_url,
+    downscale_to_jpeg,
+)
 
 
 class VisionError(RuntimeError):
@@ -42,6 +49,12 @@ _IMAGE_SUFFIXES = {
     ".gif",
 }
 _ATTACHMENT_FALLBACK_MAX_DIMS = (1600, 1280, 1024, 768)
+# Failures a smaller image can fix: oversized request bodies, prompts that
+# overflow the context once the image is tokenized, and image decode errors.
+_DOWNSCALE_ERROR_MARKERS = ("llm_http_413", "too large", "payload", "exceed", "context size", "image")
+# Repeated questions about the same live-screen frame or attachment reuse the
+# encoded payload; entries are keyed by file version and resize settings.
+_DATA_URL_CACHE = DataUrlCache()
 
 
 def _coerce_existing_path(raw_path: str) -> Optional[Path]:
@@ -122,11 +135,35 @@ def _guess_mime_type(path: Path) -> str:
     return "application/octet-stream"
 
 
-def encode_image_data_url(path: Path) -> str:
-    mime_type = _guess_mime_type(path)
-    raw = path.read_bytes()
-    encoded = base64.b64encode(raw).decode("ascii")
-    return f"data:{mime_type};base64,{encoded}"
+def encode_image_data_url(path: Path, *, max_dim: int = 0, quality: int = DEFAULT_JPEG_QUALITY) -> str:
+    """Data URL for *path*; with *max_dim* the image is downscaled to a JPEG first."""
+    max_dim = max(0, int(max_dim))
+    key = DataUrlKey.for_path(path, max_dim=max_dim, quality=quality if max_dim else 0)
+    cached = _DATA_URL_CACHE.get(key)
+    if cached is not None:
+        return cached
+    if max_dim:
+        encoded = data_url("image/jpeg", _downscaled_jpeg_bytes(path, max_dim=max_dim, quality=quality))
+    else:
+        encoded = data_url(_guess_mime_type(path), path.read_bytes())
+    _DATA_URL_CACHE.put(key, encoded)
+    return encoded
+
+
+def _downscaled_jpeg_bytes(path: Path, *, max_dim: int, quality: int) -> bytes:
+    try:
+        return downscale_to_jpeg(path, max_dim=max_dim, quality=quality)
+    except ImageDecodeUnavailable:
+        pass
+    # Pillow is not installed or cannot read this file.
+    resized = _resize_image_to_temp_jpeg(path, max_dim=max_dim)
+    try:
+        return resized.read_bytes()
+    finally:
+        try:
+            resized.unlink(missing_ok=True)
+        except Exception:
+            pass
 
 
 def _to_windows_path(path: Path) -> str:
@@ -304,8 +341,9 @@ def build_message_variants_with_image(
     *,
     image_path: Path,
     attachment_text: str,
+    max_dim: int = 0,
 ) -> List[List[Dict[str, Any]]]:
-    data_url = encode_image_data_url(image_path)
+    image_url = encode_image_data_url(image_path, max_dim=max_dim)
     target_index: Optional[int] = None
     target_text = attachment_text.strip()
     for index in range(len(messages) - 1, -1, -1):
@@ -327,7 +365,7 @@ def build_message_variants_with_image(
         updated: List[Dict[str, Any]] = [dict(message) for message in messages]
         content = [
             {"type": text_type, "text": target_text},
-            _image_part(image_type, data_url, url_as_object=url_as_object),
+            _image_part(image_type, image_url, url_as_object=url_as_object),
         ]
         if target_index is None:
             updated.append({"role": "user", "content": content})
@@ -348,12 +386,14 @@ def _stream_with_single_image_candidate(
     temperature: float,
     max_tokens: int | None = None,
     cancel_token: CancellationToken | None = None,
+    max_dim: int = 0,
 ) -> Iterator[str]:
     errors: List[str] = []
     for candidate in build_message_variants_with_image(
         messages,
         image_path=image_path,
         attachment_text=attachment_text,
+        max_dim=max_dim,
     ):
         try:
             for delta in llm_client.generate_stream(
@@ -376,6 +416,11 @@ def _stream_with_single_image_candidate(
     raise VisionError(f"Vision request failed. {joined}")
 
 
+def _downscale_may_help(error: str) -> bool:
+    lowered = error.casefold()
+    return any(marker in lowered for marker in _DOWNSCALE_ERROR_MARKERS)
+
+
 def generate_stream_with_image_attachment(
     llm_client,
     *,
@@ -386,45 +431,34 @@ def generate_stream_with_image_attachment(
     max_tokens: int | None = None,
     cancel_token: CancellationToken | None = None,
 ) -> Iterator[str]:
-    cleanup_paths: List[Path] = []
-    candidate_paths: List[Path] = [image_path]
     errors: List[str] = []
-    try:
-        for candidate_path in candidate_paths:
+    # Original image first, then progressively smaller JPEG downscales.
+    for max_dim in (0, *_ATTACHMENT_FALLBACK_MAX_DIMS):
+        if max_dim:
             try:
-                for delta in _stream_with_single_image_candidate(
-                    llm_client,
-                    messages=messages,
-                    image_path=candidate_path,
-                    attachment_text=attachment_text,
-                    temperature=temperature,
-                    max_tokens=max_tokens,
-                    cancel_token=cancel_token,
-                ):
-                    yield delta
-                return
-            except OperationCancelled:
+                encode_image_data_url(image_path, max_dim=max_dim)
+            except (VisionError, OSError, subprocess.SubprocessError) as exc:
+                errors.append(f"Resize fallback {max_dim}px failed: {exc}")
+                continue
+        try:
+            for delta in _stream_with_single_image_candidate(
+                llm_client,
+                messages=messages,
+                image_path=image_path,
+                attachment_text=attachment_text,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                cancel_token=cancel_token,
+                max_dim=max_dim,
+            ):
+                yield delta
+            return
+        except VisionError as exc:
+            if not _downscale_may_help(str(exc)):
                 raise
-            except VisionError as exc:
-                errors.append(str(exc))
-                if candidate_path != image_path:
-                    continue
-                for max_dim in _ATTACHMENT_FALLBACK_MAX_DIMS:
-                    try:
-                        resized = _resize_image_to_temp_jpeg(image_path, max_dim=max_dim)
-                    except Exception as resize_exc:
-                        errors.append(f"Resize fallback {max_dim}px failed: {resize_exc}")
-                        continue
-                    cleanup_paths.append(resized)
-                    candidate_paths.append(resized)
-        joined = " | ".join(error for error in errors if error) or "Unknown multimodal error."
-        raise VisionError(joined if joined.startswith("Vision request failed.") else f"Vision request failed. {joined}")
-    finally:
-        for path in cleanup_paths:
-            try:
-                path.unlink(missing_ok=True)
-            except Exception:
-                pass
+            errors.append(str(exc))
+    joined = " | ".join(error for error in errors if error) or "Unknown multimodal error."
+    raise VisionError(joined if joined.startswith("Vision request failed.") else f"Vision request failed. {joined}")
 
 
 def generate_with_image_attachment(
@@ -0,0 +1,185 @@
+"""In-process image downscale + JPEG encoding for vision attachments.
+
+Vision requests send images as base64 data URLs. Large screenshots are
+downscaled before they are sent, and the same live-screen frame or attachment
+is often asked about several times in a row, so the encoded data URL is kept
+in a small LRU cache.
+
+Pillow decodes, box-filters (area average) and encodes the JPEG in memory.
+Without Pillow, or for a file Pillow cannot read, ``downscale_to_jpeg`` raises
+``ImageDecodeUnavailable`` so callers can fall back to the PowerShell /
+System.Drawing resize path. ``area_downscale`` is a numpy area-average resize
+for callers that already hold pixels (the live-screen frame differ).
+"""
+from __future__ import annotations
+
+import base64
+import io
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class ImageDecodeUnavailable(RuntimeError):
+    """No in-process decoder can read this image."""
+
+
+DEFAULT_JPEG_QUALITY = 85
+
+# ── area-average downscale ───────────────────────────────────────────
+
+
+def fit_within(width: int, height: int, max_dim: int) -> Tuple[int, int]:
+    """Target size that fits *max_dim* on the long side; never upscales."""
+    if max_dim <= 0:
+        return width, height
+    scale = min(1.0, max_dim / float(width), max_dim / float(height))
+    return max(1, int(round(width * scale))), max(1, int(round(height * scale)))
+
+
+def _area_taps(src: int, dst: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Source indices and coverage weights for each destination pixel along one axis."""
+    scale = src / float(dst)
+    edges = np.arange(dst + 1, dtype=np.float64) * scale
+    lower, upper = edges[:-1], edges[1:]
+    first = np.floor(lower).astype(np.int64)
+    index = first[:, None] + np.arange(int(np.ceil(scale)) + 1)[None, :]
+    coverage = np.minimum(index + 1, upper[:, None]) - np.maximum(index, lower[:, None])
+    weights = np.clip(coverage, 0.0, None) / scale
+    return np.minimum(index, src - 1), weights.astype(np.float32)
+
+
+def _area_resize_axis(values: np.ndarray, dst: int, axis: int) -> np.ndarray:
+    if values.shape[axis] == dst:
+        return values
+    index, weights = _area_taps(values.shape[axis], dst)
+    shape = [1] * values.ndim
+    shape[axis] = dst
+    out = np.zeros(values.shape[:axis] + (dst,) + values.shape[axis + 1 :], dtype=np.float32)
+    for tap in range(index.shape[1]):
+        out += np.take(values, index[:, tap], axis=axis) * weights[:, tap].reshape(shape)
+    return out
+
+
+def area_downscale(pixels: np.ndarray, width: int, height: int) -> np.ndarray:
+    """Resize an ``(H, W[, C])`` uint8 image to ``width`` x ``height`` by area averaging."""
+    src = np.asarray(pixels)
+    if src.shape[0] == height and src.shape[1] == width:
+        return src.astype(np.uint8, copy=False)
+    out = _area_resize_axis(src.astype(np.float32), height, 0)
+    out = _area_resize_axis(out, width, 1)
+    return np.clip(np.rint(out), 0, 255).astype(np.uint8)
+
+# ── Pillow downscale ─────────────────────────────────────────────────
+
+def _pillow_downscale_to_jpeg(path: Path, *, max_dim: int, quality: int) -> Optional[bytes]:
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        return None
+    try:
+        with Image.open(path) as opened:
+            image = ImageOps.exif_transpose(opened).convert("RGB")
+    except Exception as exc:
+        raise ImageDecodeUnavailable(f"Pillow could not decode {Path(path).name}: {exc}") from exc
+    target = fit_within(image.width, image.height, max_dim)
+    if target != image.size:
+        image = image.resize(target, Image.Resampling.BOX)
+    out = io.BytesIO()
+    image.save(out, format="JPEG", quality=int(quality))
+    return out.getvalue()
+
+
+def downscale_to_jpeg(
+    path: Path,
+    *,
+    max_dim: int,
+    quality: int = DEFAULT_JPEG_QUALITY,
+) -> bytes:
+    """Box-downscale *path* with Pillow to fit *max_dim* and return JPEG bytes.
+
+    Raises ``ImageDecodeUnavailable`` when Pillow is missing or cannot read the file.
+    """
+    encoded = _pillow_downscale_to_jpeg(Path(path), max_dim=max_dim, quality=quality)
+    if encoded is None:
+        raise ImageDecodeUnavailable("Pillow is not installed")
+    return encoded
+
+
+# ── data URL cache ───────────────────────────────────────────────────
+
+
+@dataclass(frozen=True)
+class DataUrlKey:
+    path: str
+    mtime_ns: int
+    size: int
+    max_dim: int
+    quality: int
+
+    @classmethod
+    def for_path(cls, path: Path, *, max_dim: int, quality: int) -> "DataUrlKey":
+        resolved = Path(path).resolve()
+        stat = resolved.stat()
+        return cls(
+            str(resolved),
+            int(stat.st_mtime_ns),
+            int(stat.st_size),
+            int(max_dim),
+            int(quality),
+        )
+
+
+class DataUrlCache:
+    """Thread-safe LRU of encoded data URLs, bounded by entries and total chars."""
+
+    def __init__(self, *, max_entries: int = 16, max_chars: int = 48 * 1024 * 1024) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self.max_chars = max(1, int(max_chars))
+        self._entries: "OrderedDict[DataUrlKey, str]" = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: DataUrlKey) -> Optional[str]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: DataUrlKey, value: str) -> None:
+        if len(value) > self.max_chars:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._chars -= len(previous)
+            self._entries[key] = value
+            self._chars += len(value)
+            while len(self._entries) > self.max_entries or self._chars > self.max_chars:
+                _evicted_key, evicted = self._entries.popitem(last=False)
+                self._chars -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._chars = 0
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+def data_url(mime_type: str, payload: bytes) -> str:
+    return f"data:{mime_type};base64,{base64.b64encode(payload).decode('ascii')}"
@@ -252,6 +252,7 @@ class PiperController:
         self._proactive_reminder_inflight_ids: set[str] = set()
         self.pending_autoscrolls: dict[str, int] = {}
         self.mic_state = "idle"
+        self._web_mic_stream: tuple[int, object, object] | None = None
         self.restart_requested = False
         self.boot_ready = False
         self.runtime_mode = "IDLE"
@@ -931,6 +932,7 @@ class PiperController:
         }
         if llm_reconnect_fields.intersection(changed_keys):
             from llm.llm_server_client import LlamaServerConfig
+            from llm.response_cache import model_identity
 
             new_llm_cfg = LlamaServerConfig(
                 base_url=str(getattr(CFG, "LLAMA_SERVER_URL", "http://127.0.0.1:8080")),
@@ -940,6 +942,7 @@ class PiperController:
                 timeout_s=float(getattr(CFG, "LLAMA_SERVER_TIMEOUT_S", 300.0)),
                 stream_read_timeout_s=float(getattr(CFG, "LLAMA_SERVER_STREAM_READ_TIMEOUT_S", 30.0)),
                 debug_path=CFG.LLM_HTTP_PAYLOAD_DEBUG_PATH if getattr(CFG, "DEBUG_LLM_HTTP_PAYLOADS", False) else None,
+                model_key=model_identity(str(getattr(CFG, "LLAMA_SERVER_MODEL", "qwen")), getattr(CFG, "MODEL_PATH", None)),
             )
             self.llm.reconnect(new_llm_cfg)
             _LOG.info("LLM client reconnected with updated config")
@@ -1328,7 +1331,6 @@ class PiperController:
         """
         from tools.audio_decode import AudioDecodeError, decode_web_audio
         from tools.stt import get_stt_engine
-        from ui.controller_actions import _apply_voice_identity_match
 
         audio_b64 = str(payload.get("audio") or "").strip()
         fmt = str(payload.get("format") or "").strip().lower()
@@ -1337,7 +1339,7 @@ class PiperController:
         if not audio_b64:
             self.ui_queue.put(("mic_status", {"state": "error", "error": "Empty audio payload"}))
             return
-        if fmt not in ("webm", "wav"):
+        if fmt not in ("webm", "ogg", "wav"):
             self.ui_queue.put(("mic_status", {"state": "error", "error": f"Unsupported format: {fmt}"}))
             return
 
@@ -1384,20 +1386,7 @@ class PiperController:
                 stt_elapsed = time.perf_counter() - stt_start
                 _LOG.info("Web mic: STT complete elapsed=%.3fs empty=%s", stt_elapsed, not transcript)
 
-                self.ui_queue.put(("mic_status", {"state": "transcribing", "stage": "identity", "message": "Checking voice identity...", "error": ""}))
-                identity_start = time.perf_counter()
-                _apply_voice_identity_match(self, engine)
-                identity_elapsed = time.perf_counter() - identity_start
-                _LOG.info("Web mic: identity complete elapsed=%.3fs", identity_elapsed)
-
-                self.ui_queue.put(("mic_status", {"state": "transcribing", "stage": "submitting", "message": "Submitting transcript...", "error": ""}))
-                if transcript:
-                    self._pending_input_modality = "voice"
-                    self.submit_user_text(transcript)
-                else:
-                    self.chat_append("system", "[No speech detected]")
-
-                self.ui_queue.put(("mic_status", {"state": "idle", "error": ""}))
+                self._complete_web_mic_transcript(engine, transcript)
             except AudioDecodeError as exc:
                 _LOG.warning("Web mic audio decode failed: %s", exc)
                 self.ui_queue.put(("mic_status", {"state": "error", "error": str(exc)}))
@@ -1407,6 +1396,126 @@ class PiperController:
 
         threading.Thread(target=_worker, daemon=True).start()
 
+    def _complete_web_mic_transcript(self, engine, transcript: str, identity_audio=None) -> None:
+        """Shared tail of the Web UI mic paths: voice identity, then submit."""
+        from ui.controller_actions import _apply_voice_identity_match
+
+        self.ui_queue.put(("mic_status", {"state": "transcribing", "stage": "identity", "message": "Checking voice identity...", "error": ""}))
+        identity_start = time.perf_counter()
+        if identity_audio is not None:
+            engine.identify_voice(identity_audio)
+        _apply_voice_identity_match(self, engine)
+        identity_elapsed = time.perf_counter() - identity_start
+        _LOG.info("Web mic: identity complete elapsed=%.3fs", identity_elapsed)
+
+        self.ui_queue.put(("mic_status", {"state": "transcribing", "stage": "submitting", "message": "Submitting transcript...", "error": ""}))
+        if transcript:
+            self._pending_input_modality = "voice"
+            self.submit_user_text(transcript)
+        else:
+            self.chat_append("system", "[No speech detected]")
+
+        self.ui_queue.put(("mic_status", {"state": "idle", "error": ""}))
+
+    def _handle_web_mic_audio_frame(self, payload: dict) -> None:
+        """Handle a binary mic audio frame (start/data/end/abort) from the Web UI.
+
+        Frames are decoded into a ring buffer and recognised at speech pauses
+        while the user is still talking, so ``end`` only waits for the tail.
+        """
+        from tools.audio_decode import AudioDecodeError, open_stream_decoder
+        from tools.mic_stream import MicStream
+        from tools.stt import get_stt_engine
+
+        kind = str(payload.get("kind") or "")
+        stream_id = int(payload.get("streamId") or 0)
+        data = payload.get("data") or b""
+        current = self._web_mic_stream
+
+        if kind == "start":
+            if current is not None:
+                current[1].cancel()
+                self._web_mic_stream = None
+            if self.has_active_operations() or self.has_active_code_session() or self.document_ingest_active or self.live_screen_pending:
+                self.ui_queue.put(("mic_status", {"state": "error", "error": "Piper is busy"}))
+                return
+            try:
+                engine = get_stt_engine()
+                try:
+                    profile = self.user_runtime.active_profile()
+                    if hasattr(engine, "set_active_voice_profile"):
+                        engine.set_active_voice_profile(profile.user_id, is_unknown=getattr(profile, "is_unknown", False))
+                except Exception:
+                    pass
+                decoder = open_stream_decoder(
+                    str(payload.get("codec") or "pcm16"),
+                    sample_rate=int(payload.get("sampleRate") or 16000),
+                    channels=int(payload.get("channels") or 1),
+                    max_bytes=CFG.WEB_MIC_MAX_DECODED_BYTES,
+                    ffmpeg_timeout_s=float(getattr(CFG, "WEB_MIC_FFMPEG_TIMEOUT_S", 30)),
+                )
+                mic_stream = MicStream(
+                    decoder,
+                    engine.transcribe_segment,
+                    max_seconds=float(CFG.WEB_MIC_MAX_SECONDS),
+                    silence_s=float(getattr(CFG, "WEB_MIC_STREAM_SILENCE_S", 0.6)),
+                    on_segment=lambda text: _LOG.info("Web mic: partial transcript chars=%d", len(text)),
+                )
+            except Exception as exc:
+                _LOG.warning("Web mic stream start failed: %s", exc)
+                self.ui_queue.put(("mic_status", {"state": "error", "error": f"Mic error: {exc}"}))
+                return
+            self._web_mic_stream = (stream_id, mic_stream, engine)
+            _LOG.info("Web mic: stream %d started codec=%s", stream_id, payload.get("codec"))
+            self.ui_queue.put(("mic_status", {"state": "listening", "message": "Listening...", "error": ""}))
+            if data:
+                mic_stream.feed(data)
+            return
+
+        if current is None or current[0] != stream_id:
+            _LOG.debug("Web mic: dropping %s frame for inactive stream %d", kind, stream_id)
+            return
+        _stream_id, mic_stream, engine = current
+
+        if kind == "abort":
+            self._web_mic_stream = None
+            mic_stream.cancel()
+            self.ui_queue.put(("mic_status", {"state": "idle", "error": ""}))
+            return
+
+        if data:
+            mic_stream.feed(data)
+        if mic_stream.samples > CFG.WEB_MIC_MAX_SECONDS * 16000:
+            self._web_mic_stream = None
+            mic_stream.cancel()
+            self.ui_queue.put(("mic_status", {"state": "error", "error": "Audio duration exceeds limit"}))
+            return
+        if kind != "end":
+            return
+        self._web_mic_stream = None
+        self.ui_queue.put(("mic_status", {"state": "transcribing", "stage": "stt", "message": "Running local STT...", "error": ""}))
+
+        def _worker() -> None:
+            try:
+                result = mic_stream.finish(timeout=float(getattr(CFG, "WEB_MIC_FFMPEG_TIMEOUT_S", 30)) + 60.0)
+                _LOG.info(
+                    "Web mic: stream %d complete duration=%.3fs segments=%d early=%d tail=%.3fs",
+                    stream_id,
+                    result.duration_s,
+                    len(result.segments),
+                    result.early_segments,
+                    result.tail_s,
+                )
+                self._complete_web_mic_transcript(engine, result.text, identity_audio=result.audio)
+            except AudioDecodeError as exc:
+                _LOG.warning("Web mic stream decode failed: %s", exc)
+                self.ui_queue.put(("mic_status", {"state": "error", "error": str(exc)}))
+            except Exception as exc:
+                _LOG.exception("Web mic stream failed")
+                self.ui_queue.put(("mic_status", {"state": "error", "error": f"STT error: {exc}"}))
+
+        threading.Thread(target=_worker, daemon=True).start()
+
     def _handle_web_mic_start(self) -> None:
         """Start native mic recording from Web UI / WebView."""
         from tools.stt import get_stt_engine
@@ -1483,6 +1592,8 @@ class PiperController:
         elif action_name == "mic_audio_submit":
             _LOG.info("Web mic: action received")
             self._handle_web_mic_audio_submit(payload)
+        elif action_name == "mic_audio_frame":
+            self._handle_web_mic_audio_frame(payload)
         elif action_name == "stats_refresh":
             try:
                 snapshot = self.stats_collector.build_dashboard_snapshot()
@@ -18,6 +18,7 @@ from typing import Any
 
 from web_ui.bridge.message_schema import (
     EventFrame,
+    MicAudioFrame,
     get_frontend_event_name,
     is_known_action_name,
     is_known_event_kind as _is_known_event_kind,
@@ -586,3 +587,15 @@ def parse_action_frame(raw_json: str) -> tuple[str, dict[str, Any]]:
 
     payload = dict(data.get("payload") or {})
     return action_name, payload
+
+
+def parse_binary_frame(raw: bytes) -> tuple[str, dict[str, Any]]:
+    """Parse an incoming binary frame and return (action_name, payload).
+
+    The only binary frame type is mic audio (``MicAudioFrame``); its payload
+    keeps the audio as ``bytes`` under ``"data"``.
+
+    Raises ValueError for malformed or unknown frames.
+    """
+    frame = MicAudioFrame.from_bytes(bytes(raw))
+    return "mic_audio_frame", frame.to_payload()
@@ -8,6 +8,7 @@ This module is pure schema/contract code only.
 
 from __future__ import annotations
 
+import struct
 from dataclasses import dataclass, field
 from typing import Any, Literal
 
@@ -211,3 +212,88 @@ class ErrorFrame:
             "message": self.message,
             "payload": self.payload,
         }
+
+
+# ---------------------------------------------------------------------------
+# Binary mic audio frames
+# ---------------------------------------------------------------------------
+#
+# Browser -> backend binary WebSocket messages carrying mic audio while the
+# user is still speaking. Layout (little-endian, 20-byte header + payload):
+#
+#   magic "PMIC" | version u8 | kind u8 | codec u8 | channels u8
+#   stream_id u32 | seq u32 | sample_rate u32 | payload...
+
+MIC_FRAME_MAGIC = b"PMIC"
+MIC_FRAME_VERSION = 1
+_MIC_FRAME_HEADER = struct.Struct("<4sBBBBIII")
+MIC_FRAME_HEADER_SIZE = _MIC_FRAME_HEADER.size
+
+MIC_FRAME_KINDS: tuple[str, ...] = ("start", "data", "end", "abort")
+# "opus" payloads are raw packets, each prefixed with a u16 length.
+MIC_FRAME_CODECS: tuple[str, ...] = ("pcm16", "opus", "webm", "ogg", "wav")
+
+
+@dataclass(frozen=True, slots=True)
+class MicAudioFrame:
+    """One binary mic audio frame (start/data/end/abort for a stream)."""
+
+    kind: str = "data"
+    codec: str = "pcm16"
+    stream_id: int = 0
+    seq: int = 0
+    sample_rate: int = 16000
+    channels: int = 1
+    data: bytes = b""
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> "MicAudioFrame":
+        """Parse a binary frame; raises ValueError on malformed input."""
+        if len(raw) < MIC_FRAME_HEADER_SIZE:
+            raise ValueError("Binary frame shorter than mic frame header")
+        magic, version, kind, codec, channels, stream_id, seq, sample_rate = _MIC_FRAME_HEADER.unpack_from(raw)
+        if magic != MIC_FRAME_MAGIC:
+            raise ValueError("Unknown binary frame type")
+        if version != MIC_FRAME_VERSION:
+            raise ValueError(f"Unsupported mic frame version: {version}")
+        if kind >= len(MIC_FRAME_KINDS):
+            raise ValueError(f"Unknown mic frame kind: {kind}")
+        if codec >= len(MIC_FRAME_CODECS):
+            raise ValueError(f"Unknown mic frame codec: {codec}")
+        if not 1 <= channels <= 8:
+            raise ValueError(f"Invalid mic frame channel count: {channels}")
+        if not 8000 <= sample_rate <= 192000:
+            raise ValueError(f"Invalid mic frame sample rate: {sample_rate}")
+        return cls(
+            kind=MIC_FRAME_KINDS[kind],
+            codec=MIC_FRAME_CODECS[codec],
+            stream_id=stream_id,
+            seq=seq,
+            sample_rate=sample_rate,
+            channels=channels,
+            data=bytes(raw[MIC_FRAME_HEADER_SIZE:]),
+        )
+
+    def to_bytes(self) -> bytes:
+        header = _MIC_FRAME_HEADER.pack(
+            MIC_FRAME_MAGIC,
+            MIC_FRAME_VERSION,
+            MIC_FRAME_KINDS.index(self.kind),
+            MIC_FRAME_CODECS.index(self.codec),
+            self.channels,
+            self.stream_id,
+            self.seq,
+            self.sample_rate,
+        )
+        return header + bytes(self.data)
+
+    def to_payload(self) -> dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "codec": self.codec,
+            "streamId": self.stream_id,
+            "seq": self.seq,
+            "sampleRate": self.sample_rate,
+            "channels": self.channels,
+            "data": self.data,
+        }
@@ -31,7 +31,7 @@ from urllib.parse import urlparse
 import websockets
 from websockets.exceptions import ConnectionClosedOK
 
-from web_ui.bridge.adapter import parse_action_frame, ui_tuple_to_ws_frame
+from web_ui.bridge.adapter import parse_action_frame, parse_binary_frame, ui_tuple_to_ws_frame
 
 # Suppress noisy "opening handshake failed" ERROR logs from the websockets
 # library. These are usually caused by browsers refreshing or closing tabs
@@ -559,7 +559,10 @@ class BridgeServer:
                     break
 
                 try:
-                    action_name, payload = parse_action_frame(message)
+                    if isinstance(message, (bytes, bytearray)):
+                        action_name, payload = parse_binary_frame(message)
+                    else:
+                        action_name, payload = parse_action_frame(message)
                     self._action_queue.put((action_name, payload))
                 except ValueError as exc:
                     error_frame = ErrorFrame(
@@ -2,8 +2,8 @@
 
 Deterministic tests for the Web UI audio decoder.
 
-Mocks ffmpeg subprocess to avoid requiring a real ffmpeg installation.
-Uses stdlib wave to produce deterministic test WAV data.
+Mocks the ffmpeg fallback subprocess to avoid requiring a real ffmpeg
+installation. Uses stdlib wave to produce deterministic test WAV data.
 """
 
 from __future__ import annotations
@@ -35,20 +35,26 @@ def _make_test_wav_bytes(sample_rate: int = 16000, duration_s: float = 0.1) -> b
     return buf.getvalue()
 
 
+def _make_test_pcm_bytes(duration_s: float = 0.1) -> bytes:
+    """Raw 16 kHz mono s16le, as ffmpeg writes it to stdout."""
+    t = np.arange(int(16000 * duration_s)) / 16000
+    return (np.sin(2 * np.pi * 440 * t) * 16000).astype("<i2").tobytes()
+
+
 class TestDecodeWebAudio:
     @patch("tools.audio_decode._find_ffmpeg")
     @patch("tools.audio_decode.subprocess.run")
     def test_decode_webm_produces_float32_mono(self, mock_run, mock_find_ffmpeg):
         mock_find_ffmpeg.return_value = "ffmpeg"
-        # ffmpeg writes a WAV file; simulate by making the mock write one.
-        wav_bytes = _make_test_wav_bytes()
+        # Bytes the in-process demuxer rejects fall back to ffmpeg over pipes.
+        pcm = _make_test_pcm_bytes()
+        seen: dict = {}
 
         def _fake_run(cmd, **kwargs):
-            # cmd is: ffmpeg -y -i input.webm -ar 16000 -ac 1 -f wav output.wav
-            output_path = cmd[-1]
-            with open(output_path, "wb") as f:
-                f.write(wav_bytes)
-            return MagicMock(returncode=0, stderr=b"")
+            # cmd is: ffmpeg ... -i pipe:0 -f s16le -ar 16000 -ac 1 pipe:1
+            seen["cmd"] = cmd
+            seen["input"] = kwargs.get("input")
+            return MagicMock(returncode=0, stdout=pcm, stderr=b"")
 
         mock_run.side_effect = _fake_run
 
@@ -56,27 +62,31 @@ class TestDecodeWebAudio:
         assert isinstance(audio, np.ndarray)
         assert audio.dtype == np.float32
         assert audio.ndim == 1
-        assert audio.size > 0
+        assert audio.size == len(pcm) // 2
+        assert seen["cmd"][seen["cmd"].index("-i") + 1] == "pipe:0"
+        assert seen["cmd"][-1] == "pipe:1"
+        assert seen["input"] == b"dummy_webm"
 
     @patch("tools.audio_decode._find_ffmpeg")
     @patch("tools.audio_decode.subprocess.run")
     def test_decode_wav_produces_float32_mono(self, mock_run, mock_find_ffmpeg):
         mock_find_ffmpeg.return_value = "ffmpeg"
-        wav_bytes = _make_test_wav_bytes()
-
-        def _fake_run(cmd, **kwargs):
-            output_path = cmd[-1]
-            with open(output_path, "wb") as f:
-                f.write(wav_bytes)
-            return MagicMock(returncode=0, stderr=b"")
-
-        mock_run.side_effect = _fake_run
+        mock_run.return_value = MagicMock(returncode=0, stdout=_make_test_pcm_bytes(), stderr=b"")
 
         audio = decode_web_audio(base64.b64encode(b"dummy_wav").decode(), "wav")
         assert isinstance(audio, np.ndarray)
         assert audio.dtype == np.float32
         assert audio.ndim == 1
 
+    @patch("tools.audio_decode._find_ffmpeg")
+    @patch("tools.audio_decode.subprocess.run")
+    def test_valid_wav_decodes_in_process(self, mock_run, mock_find_ffmpeg):
+        mock_find_ffmpeg.return_value = None
+        audio = decode_web_audio(base64.b64encode(_make_test_wav_bytes(sample_rate=48000)).decode(), "wav")
+        mock_run.assert_not_called()
+        assert audio.dtype == np.float32
+        assert abs(audio.size - 1600) <= 2  # 0.1 s resampled to 16 kHz
+
     def test_empty_audio_raises(self):
         with pytest.raises(ValueError, match="Audio payload is missing"):
             decode_web_audio("", "wav")
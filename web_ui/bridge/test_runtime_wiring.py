@@ -930,6 +930,9 @@ def _make_realish_controller() -> MagicMock:
 
     ctrl.chat_append = _chat_append  # type: ignore[method-assign]
     ctrl._handle_web_mic_audio_submit = PiperController._handle_web_mic_audio_submit.__get__(ctrl, MagicMock)  # type: ignore[method-assign]
+    ctrl._handle_web_mic_audio_frame = PiperController._handle_web_mic_audio_frame.__get__(ctrl, MagicMock)  # type: ignore[method-assign]
+    ctrl._complete_web_mic_transcript = PiperController._complete_web_mic_transcript.__get__(ctrl, MagicMock)  # type: ignore[method-assign]
+    ctrl._web_mic_stream = None
 
     return ctrl
 
@@ -1332,6 +1335,99 @@ def _drain_ui_queue(q: "queue.Queue[tuple[str, Any]]") -> list[tuple[str, Any]]:
     return items
 
 
+def _wait_for_mic_state(q: "queue.Queue[tuple[str, Any]]", states: set[str], timeout: float = 5.0) -> list[tuple[str, Any]]:
+    """Collect ui_queue events until a mic_status in *states* arrives (worker threads are real)."""
+    items: list[tuple[str, Any]] = []
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            item = q.get(timeout=0.05)
+        except queue.Empty:
+            continue
+        items.append(item)
+        if item[0] == "mic_status" and item[1].get("state") in states:
+            break
+    return items
+
+
+def _mic_frame(kind: str, data: bytes = b"", *, stream_id: int = 1) -> dict:
+    from web_ui.bridge.adapter import parse_binary_frame
+    from web_ui.bridge.message_schema import MicAudioFrame
+
+    raw = MicAudioFrame(kind=kind, codec="pcm16", stream_id=stream_id, sample_rate=48000, data=data).to_bytes()
+    name, payload = parse_binary_frame(raw)
+    assert name == "mic_audio_frame"
+    return payload
+
+
+class TestWebMicAudioFrameDispatch:
+    """Test backend dispatch of binary mic_audio_frame streams."""
+
+    @staticmethod
+    def _speech_pcm48k(seconds: float = 1.0) -> bytes:
+        t = np.arange(int(48000 * seconds)) / 48000
+        return (np.sin(2 * np.pi * 300 * t) * 12000).astype("<i2").tobytes()
+
+    def _engine(self) -> MagicMock:
+        engine = MagicMock()
+        engine.transcribe_segment.return_value = "hello from stream"
+        engine.consume_last_voice_match.return_value = None
+        return engine
+
+    def test_streamed_frames_are_transcribed_and_submitted(self) -> None:
+        ctrl = _make_realish_controller()
+        submitted: list[str] = []
+        ctrl.submit_user_text = submitted.append  # type: ignore[method-assign]
+        engine = self._engine()
+        pcm = self._speech_pcm48k()
+
+        with patch("tools.stt.get_stt_engine", return_value=engine):
+            ctrl._dispatch_web_action("mic_audio_frame", _mic_frame("start"))
+            for offset in range(0, len(pcm), 9600):
+                ctrl._dispatch_web_action("mic_audio_frame", _mic_frame("data", pcm[offset : offset + 9600]))
+            ctrl._dispatch_web_action("mic_audio_frame", _mic_frame("end"))
+            events = _wait_for_mic_state(ctrl.ui_queue, {"idle", "error"})
+
+        states = [e[1]["state"] for e in events if e[0] == "mic_status"]
+        assert states[0] == "listening"
+        assert states[-1] == "idle"
+        assert submitted == ["hello from stream"]
+        assert ctrl._pending_input_modality == "voice"
+        identity_audio = engine.identify_voice.call_args.args[0]
+        assert abs(identity_audio.size - 16000) <= 2
+        assert ctrl._web_mic_stream is None
+
+    def test_abort_and_stale_frames_do_not_submit(self) -> None:
+        ctrl = _make_realish_controller()
+        submitted: list[str] = []
+        ctrl.submit_user_text = submitted.append  # type: ignore[method-assign]
+        engine = self._engine()
+
+        with patch("tools.stt.get_stt_engine", return_value=engine):
+            ctrl._dispatch_web_action("mic_audio_frame", _mic_frame("start", stream_id=1))
+            ctrl._dispatch_web_action("mic_audio_frame", _mic_frame("end", stream_id=99))
+            assert ctrl._web_mic_stream is not None
+            ctrl._dispatch_web_action("mic_audio_frame", _mic_frame("data", self._speech_pcm48k(0.5), stream_id=1))
+            ctrl._dispatch_web_action("mic_audio_frame", _mic_frame("abort", stream_id=1))
+
+        events = _drain_ui_queue(ctrl.ui_queue)
+        assert [e[1]["state"] for e in events if e[0] == "mic_status"] == ["listening", "idle"]
+        assert submitted == []
+        assert ctrl._web_mic_stream is None
+
+    def test_busy_piper_rejects_stream_start(self) -> None:
+        ctrl = _make_realish_controller()
+        ctrl.has_active_operations = lambda: True  # type: ignore[method-assign]
+
+        ctrl._dispatch_web_action("mic_audio_frame", _mic_frame("start"))
+
+        events = _drain_ui_queue(ctrl.ui_queue)
+        status_events = [e for e in events if e[0] == "mic_status"]
+        assert len(status_events) == 1
+        assert "busy" in status_events[0][1]["error"].lower()
+        assert ctrl._web_mic_stream is None
+
+
 # ---------------------------------------------------------------------------
 # Phase 6 — Regression lock tests (live smoke fixes)
 # ---------------------------------------------------------------------------
@@ -103,6 +103,21 @@ export class PiperBridge {
     return true;
   }
 
+  sendBinary(data: ArrayBuffer | Uint8Array): boolean {
+    if (!this.ws || this.ws.readyState !== WebSocket.OPEN) {
+      this.callbacks.onError?.("WebSocket is not open");
+      return false;
+    }
+    try {
+      this.ws.send(data);
+    } catch (err) {
+      const msg = err instanceof Error ? err.message : String(err);
+      this.callbacks.onError?.(`Failed to send binary frame: ${msg}`);
+      return false;
+    }
+    return true;
+  }
+
   getState(): ConnectionState {
     return this.state;
   }
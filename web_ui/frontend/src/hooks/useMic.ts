@@ -1,6 +1,7 @@
 import { useCallback, useEffect, useRef, useState } from "react";
 import type { PiperBridge } from "../bridge";
 import type { MicStatus } from "../types";
+import { encodeMicFrame, type MicFrameKind } from "../micFrames";
 import { blobToBase64, chooseMimeType, formatFromMimeType } from "../utils";
 
 export type MicState = "idle" | "requesting_permission" | "listening" | "transcribing" | "error";
@@ -36,8 +37,12 @@ export function useMic({ bridgeRef, appendActivity }: UseMicOptions): UseMicRetu
   const audioChunksRef = useRef<Blob[]>([]);
   const micWatchdogTimerRef = useRef<ReturnType<typeof setTimeout> | null>(null);
   const micSubmitTimeoutRef = useRef<ReturnType<typeof setTimeout> | null>(null);
+  const micStreamIdRef = useRef(0);
+  const micSendChainRef = useRef<Promise<void>>(Promise.resolve());
 
   const experimentalMicUpload = import.meta.env.VITE_PIPER_EXPERIMENTAL_MIC_UPLOAD === "true";
+  // Stream MediaRecorder chunks as binary frames so the backend transcribes while the user speaks.
+  const micStreaming = experimentalMicUpload && import.meta.env.VITE_PIPER_MIC_STREAMING === "true";
 
   useEffect(() => {
     micStateRef.current = micState;
@@ -80,6 +85,17 @@ export function useMic({ bridgeRef, appendActivity }: UseMicOptions): UseMicRetu
     audioChunksRef.current = [];
   }, []);
 
+  const armMicSubmitTimeout = useCallback(() => {
+    // Local timeout: if backend doesn't respond within 10s, show error
+    if (micSubmitTimeoutRef.current) clearTimeout(micSubmitTimeoutRef.current);
+    micSubmitTimeoutRef.current = setTimeout(() => {
+      if (micStateRef.current === "transcribing") {
+        setMicState("error");
+        setMicError("Backend did not acknowledge mic audio");
+      }
+    }, 10000);
+  }, []);
+
   const abortMicRecording = useCallback((discard = true) => {
     if (discard) {
       discardNextMicStopRef.current = true;
@@ -136,6 +152,63 @@ export function useMic({ bridgeRef, appendActivity }: UseMicOptions): UseMicRetu
       mediaRecorderRef.current = recorder;
       audioChunksRef.current = [];
 
+      if (micStreaming) {
+        const format = formatFromMimeType(chosenMime || recorder.mimeType || "audio/webm");
+        const streamId = (micStreamIdRef.current + 1) >>> 0;
+        micStreamIdRef.current = streamId;
+        let seq = 0;
+        const sendFrame = (kind: MicFrameKind, payload?: Uint8Array): boolean =>
+          bridgeRef.current?.sendBinary(encodeMicFrame(kind, format, streamId, seq++, payload)) ?? false;
+        // Blob reads are async; chain sends so frames leave in recording order.
+        const enqueue = (task: () => Promise<void> | void) => {
+          micSendChainRef.current = micSendChainRef.current.then(task).catch(() => undefined);
+        };
+
+        recorder.ondataavailable = (ev) => {
+          if (ev.data.size === 0) return;
+          const chunk = ev.data;
+          enqueue(async () => {
+            if (discardNextMicStopRef.current) return;
+            sendFrame("data", new Uint8Array(await chunk.arrayBuffer()));
+          });
+        };
+
+        recorder.onstop = () => {
+          enqueue(() => {
+            if (discardNextMicStopRef.current) {
+              discardNextMicStopRef.current = false;
+              sendFrame("abort");
+              return;
+            }
+            if (!sendFrame("end")) {
+              setMicState("error");
+              setMicError("Failed to send audio to backend");
+              return;
+            }
+            setMicState("transcribing");
+            setMicStageMessage("Waiting for backend...");
+            armMicSubmitTimeout();
+          });
+        };
+
+        recorder.onerror = () => {
+          discardNextMicStopRef.current = true;
+          abortMicRecording(true);
+          setMicState("error");
+          setMicError("Recording error");
+        };
+
+        if (!sendFrame("start")) {
+          cleanupMediaRecorder();
+          setMicState("error");
+          setMicError("Failed to send audio to backend");
+          return;
+        }
+        recorder.start(250);
+        setMicState("listening");
+        return;
+      }
+
       recorder.ondataavailable = (ev) => {
         if (ev.data.size > 0) {
           audioChunksRef.current.push(ev.data);
@@ -175,14 +248,7 @@ export function useMic({ bridgeRef, appendActivity }: UseMicOptions): UseMicRetu
             return;
           }
           setMicStageMessage("Waiting for backend...");
-          // Local timeout: if backend doesn't respond within 10s, show error
-          if (micSubmitTimeoutRef.current) clearTimeout(micSubmitTimeoutRef.current);
-          micSubmitTimeoutRef.current = setTimeout(() => {
-            if (micStateRef.current === "transcribing") {
-              setMicState("error");
-              setMicError("Backend did not acknowledge mic audio");
-            }
-          }, 10000);
+          armMicSubmitTimeout();
         } catch {
           setMicState("error");
           setMicError("Failed to encode audio");
@@ -203,12 +269,20 @@ export function useMic({ bridgeRef, appendActivity }: UseMicOptions): UseMicRetu
       setMicState("error");
       setMicError("Microphone permission denied or unavailable");
     }
-  }, [abortMicRecording, appendActivity, bridgeRef, experimentalMicUpload]);
+  }, [abortMicRecording, appendActivity, armMicSubmitTimeout, bridgeRef, cleanupMediaRecorder, experimentalMicUpload, micStreaming]);
 
   const handleBackendMicStatus = useCallback((status: MicStatus) => {
     if (experimentalMicUpload) {
       // In experimental mode, backend acks are only expected during transcribing
       // because the frontend manages the recording directly.
+      if (micStreaming && micStateRef.current === "listening" && status.state === "error") {
+        // Backend rejected the stream (busy, bad frame); stop recording.
+        discardNextMicStopRef.current = true;
+        cleanupMediaRecorder();
+        setMicState("error");
+        setMicError(status.error || status.message || "Mic error");
+        return;
+      }
       if (micStateRef.current === "listening") return;
       if (micStateRef.current === "requesting_permission") return;
       if (micStateRef.current === "transcribing") {
@@ -255,7 +329,7 @@ export function useMic({ bridgeRef, appendActivity }: UseMicOptions): UseMicRetu
       setMicState("transcribing");
       setMicStageMessage("Transcribing...");
     }
-  }, [experimentalMicUpload]);
+  }, [cleanupMediaRecorder, experimentalMicUpload, micStreaming]);
 
   const stopMicRecording = useCallback(() => {
     if (micStateRef.current !== "listening") return;
@@ -0,0 +1,30 @@
+// Binary mic frame layout; must match web_ui/bridge/message_schema.py MicAudioFrame.
+const MIC_FRAME_HEADER_SIZE = 20;
+const MIC_FRAME_KINDS = ["start", "data", "end", "abort"] as const;
+const MIC_FRAME_CODECS = ["pcm16", "opus", "webm", "ogg", "wav"] as const;
+
+export type MicFrameKind = (typeof MIC_FRAME_KINDS)[number];
+export type MicFrameCodec = (typeof MIC_FRAME_CODECS)[number];
+
+export function encodeMicFrame(
+  kind: MicFrameKind,
+  codec: MicFrameCodec,
+  streamId: number,
+  seq: number,
+  payload: Uint8Array = new Uint8Array(0),
+  sampleRate = 48000,
+  channels = 1,
+): Uint8Array {
+  const frame = new Uint8Array(MIC_FRAME_HEADER_SIZE + payload.byteLength);
+  const view = new DataView(frame.buffer);
+  frame.set([0x50, 0x4d, 0x49, 0x43], 0); // "PMIC"
+  view.setUint8(4, 1);
+  view.setUint8(5, MIC_FRAME_KINDS.indexOf(kind));
+  view.setUint8(6, MIC_FRAME_CODECS.indexOf(codec));
+  view.setUint8(7, channels);
+  view.setUint32(8, streamId >>> 0, true);
+  view.setUint32(12, seq >>> 0, true);
+  view.setUint32(16, sampleRate >>> 0, true);
+  frame.set(payload, MIC_FRAME_HEADER_SIZE);
+  return frame;
+}
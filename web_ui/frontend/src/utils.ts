@@ -40,7 +40,8 @@ export function chooseMimeType(): string {
   return "";
 }
 
-export function formatFromMimeType(mime: string): "webm" | "wav" {
+export function formatFromMimeType(mime: string): "webm" | "ogg" | "wav" {
   if (mime.includes("wav")) return "wav";
+  if (mime.includes("ogg")) return "ogg";
   return "webm";
 }
@@ -3,6 +3,7 @@
 interface ImportMetaEnv {
   readonly VITE_PIPER_WS_URL?: string;
   readonly VITE_PIPER_EXPERIMENTAL_MIC_UPLOAD?: string;
+  readonly VITE_PIPER_MIC_STREAMING?: string;
 }
 
 interface ImportMeta {